@@ -0,0 +1,165 @@
+"""
+Asset Build - Incremental, parallel driver for the asset pipelines
+==================================================================
+Used by tools/build_paintings.py, build_plates.py, build_coins.py,
+build_pottery.py, build_flags.py and build_signs.py, which turn
+downloaded source images into the small PNGs under assets/.
+
+Jobs
+    One Job per manifest entry: its output path, the processing
+    parameters that shape it (crop, colour correction, the builder's
+    PIPELINE version) and where its source image is. `cached` is the
+    source when it is already on disk; `fetch` downloads it otherwise.
+
+BuildCache
+    The digests each output was last built from, kept as JSON in the
+    builder's download cache: a hash of the parameters and a SHA-256 of
+    the source file's content. An output is rebuilt when it is missing,
+    its parameters changed, or its cached source's content changed. An
+    output already on disk with no record (a fresh checkout, or a cache
+    wiped by --clean) is adopted as built rather than re-downloaded.
+
+build()
+    Decides what is stale, fetches those sources one at a time in this
+    process (downloads keep their own rate limiting) and hands each to a
+    process pool as soon as it is on disk, so the PIL work runs on every
+    core while the next download is in flight. work(source, params) runs
+    in the worker and returns the encoded output, which is written with
+    write_bytes_atomic(); the cache is saved as results come in, so an
+    interrupted build keeps what it finished.
+"""
+
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from atomic_io import write_bytes_atomic, write_json_atomic
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def params_digest(params):
+    """Stable hash of a JSON-able parameter dict."""
+    text = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def png_bytes(img):
+    """A PIL image encoded as PNG bytes (what work() usually returns)."""
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+class Job:
+    """One output to keep up to date."""
+
+    __slots__ = ('key', 'out', 'params', 'cached', 'fetch')
+
+    def __init__(self, key, out, params, cached=None, fetch=None):
+        self.key = key
+        self.out = Path(out)
+        self.params = params
+        self.cached = cached        # source path if already on disk
+        self.fetch = fetch          # () -> source path or None
+
+
+class BuildCache:
+    """{job key: {"params": digest, "source": digest}} on disk."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                self.records = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+
+    def stale(self, job):
+        """Whether job's output needs building; adopts untracked outputs."""
+        if not job.out.exists():
+            return True
+        params = params_digest(job.params)
+        record = self.records.get(job.key)
+        if record is not None and record["params"] != params:
+            return True
+        source = file_digest(job.cached) if job.cached else None
+        if record is None or record.get("source") is None:
+            self.records[job.key] = {"params": params, "source": source}
+            return False
+        return source is not None and source != record["source"]
+
+    def record(self, job, source):
+        self.records[job.key] = {"params": params_digest(job.params),
+                                 "source": file_digest(source)}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.path, self.records)
+
+
+def build(jobs, work, cache_path, workers=None, force=False):
+    """Build the stale jobs; returns (built, failed, up to date) key lists.
+    workers=1 runs work() in this process."""
+    cache = BuildCache(cache_path)
+    todo, fresh = [], []
+    for job in jobs:
+        (todo if force or cache.stale(job) else fresh).append(job)
+    cache.save()
+    built, failed = [], []
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers) if todo and workers > 1 else None
+    pending = []
+
+    def finish(job, source, future):
+        try:
+            data = future.result()
+        except Exception as exc:
+            print(f"  FAIL {job.key}: {exc!r}")
+            failed.append(job.key)
+            return
+        job.out.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(job.out, data)
+        cache.record(job, source)
+        cache.save()
+        built.append(job.key)
+
+    def drain(wait):
+        for item in pending[:]:
+            if wait or item[2].done():
+                pending.remove(item)
+                finish(*item)
+
+    try:
+        for job in todo:
+            source = job.cached or (job.fetch() if job.fetch else None)
+            if not source:
+                failed.append(job.key)
+                continue
+            if pool:
+                future = pool.submit(work, source, job.params)
+            else:
+                future = Future()
+                try:
+                    future.set_result(work(source, job.params))
+                except Exception as exc:
+                    future.set_exception(exc)
+            pending.append((job, source, future))
+            drain(wait=False)
+        drain(wait=True)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return built, failed, [j.key for j in fresh]
@@ -9,7 +9,8 @@ write_json_atomic writes to a temp file in the SAME directory, fsyncs it to
 physical media, then os.replace()s it over the target. os.replace is atomic on
 POSIX, so a reader (or a power cut) sees either the whole old file or the whole
 new one, never a half-written one. This mirrors the pattern already used for
-the atlas download in visuals/atlas.py.
+the atlas download in visuals/atlas.py. write_bytes_atomic does the same for
+binary files (the packed emulator atlases).
 """
 
 import json
@@ -19,12 +20,21 @@ import tempfile
 
 def write_json_atomic(path, obj, indent=2):
     """Atomically serialize `obj` to `path` as JSON. Raises on failure."""
+    _write_atomic(path, "w", ".json", lambda f: json.dump(obj, f, indent=indent))
+
+
+def write_bytes_atomic(path, data):
+    """Atomically write `data` (bytes-like) to `path`. Raises on failure."""
+    _write_atomic(path, "wb", ".tmp", lambda f: f.write(data))
+
+
+def _write_atomic(path, mode, suffix, write):
     path = os.fspath(path)
     directory = os.path.dirname(path) or "."
-    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=suffix)
     try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(obj, f, indent=indent)
+        with os.fdopen(fd, mode) as f:
+            write(f)
             f.flush()
             os.fsync(f.fileno())
         os.replace(tmp, path)
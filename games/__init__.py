@@ -15,12 +15,12 @@ from .jezzball import JezzBall
 from .frogger import Frogger
 from .pacman import PacMan
 from .mspacman import MsPacMan
-from .chess import Chess
+from .chess import Chess, ChessCPU
 from .trashblaster import TrashBlaster
 from .spacecruise import SpaceCruise
-from .connect4 import Connect4
-from .checkers import Checkers
-from .othello import Othello
+from .connect4 import Connect4, Connect4CPU
+from .checkers import Checkers, CheckersCPU
+from .othello import Othello, OthelloCPU
 from .game2048 import Game2048
 from .lightsout import LightsOut
 from .pipedream import PipeDream
@@ -34,9 +34,9 @@ from .agario import Agario
 from .galaga import Galaga
 from .defender import Defender
 from .centipede import Centipede
-from .mancala import Mancala
+from .mancala import Mancala, MancalaCPU
 from .monstermaze import MonsterMaze
-from .go import Go
+from .go import Go, GoCPU
 from .digdug import DigDug
 from .loderunner import LodeRunner
 from .donkeykong import DonkeyKong
@@ -82,11 +82,15 @@ ALL_GAMES = [
     PacMan,
     MsPacMan,
     Chess,
+    ChessCPU,
     TrashBlaster,
     SpaceCruise,
     Connect4,
+    Connect4CPU,
     Checkers,
+    CheckersCPU,
     Othello,
+    OthelloCPU,
     Game2048,
     LightsOut,
     PipeDream,
@@ -101,8 +105,10 @@ ALL_GAMES = [
     Defender,
     Centipede,
     Mancala,
+    MancalaCPU,
     MonsterMaze,
     Go,
+    GoCPU,
     DigDug,
     LodeRunner,
     DonkeyKong,
@@ -156,11 +162,15 @@ __all__ = [
     'PacMan',
     'MsPacMan',
     'Chess',
+    'ChessCPU',
     'TrashBlaster',
     'SpaceCruise',
     'Connect4',
+    'Connect4CPU',
     'Checkers',
+    'CheckersCPU',
     'Othello',
+    'OthelloCPU',
     'Game2048',
     'LightsOut',
     'PipeDream',
@@ -175,8 +185,10 @@ __all__ = [
     'Defender',
     'Centipede',
     'Mancala',
+    'MancalaCPU',
     'MonsterMaze',
     'Go',
+    'GoCPU',
     'DigDug',
     'LodeRunner',
     'DonkeyKong',
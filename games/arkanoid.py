@@ -18,6 +18,7 @@ Controls:
 import random
 import math
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.table_physics import BroadphaseGrid
 from games.arkanoid_levels import LEVEL_DATA
 
 
@@ -123,8 +124,9 @@ class Arkanoid(Game):
         self.lasers = []  # {'x', 'y'}
         self.laser_cooldown = 0
 
-        # Bricks
+        # Bricks, bucketed so balls and lasers only test the ones they are near
         self.bricks = []
+        self.brick_grid = BroadphaseGrid(cell_size=4)
         self.load_level(self.level)
 
     def get_level_base_speed(self):
@@ -197,6 +199,7 @@ class Arkanoid(Game):
         silver_hits = 2 + (self.level // 8)  # +1 hit every 8 stages
         level_data = self.levels[level_idx]
         self.bricks = []
+        self.brick_grid.clear()
         for brick_def in level_data['bricks']:
             brick = dict(brick_def)  # Copy to avoid modifying template
             if brick['type'] == self.BRICK_HARD:
@@ -204,6 +207,8 @@ class Arkanoid(Game):
             elif brick['type'] == self.BRICK_INDESTRUCTIBLE:
                 brick['hits'] = 999
             self.bricks.append(brick)
+            self.brick_grid.insert(brick, brick['x'], brick['y'],
+                                   brick['x'] + brick['w'], brick['y'] + brick['h'])
 
     def launch_ball(self, ball):
         """Launch a ball from the paddle."""
@@ -372,8 +377,9 @@ class Arkanoid(Game):
                 ball['dy'] = -abs(math.cos(angle) * ball['speed'])
                 ball['y'] = self.paddle_y - 2
 
-            # Brick collisions
-            for brick in self.bricks[:]:
+            # Brick collisions (only bricks sharing a grid cell with the ball)
+            bx, by = int(ball['x']), int(ball['y'])
+            for brick in self.brick_grid.query(bx, by, bx + 1, by + 1):
                 if self.ball_brick_collision(ball, brick):
                     brick['hits'] -= 1
                     # Increase ball speed slightly on each hit (like original Arkanoid)
@@ -388,6 +394,7 @@ class Arkanoid(Game):
                     if brick['hits'] <= 0 and brick['type'] != self.BRICK_INDESTRUCTIBLE:
                         self.maybe_drop_capsule(brick)
                         self.bricks.remove(brick)
+                        self.brick_grid.remove(brick)
                         self.score += self.brick_score(brick)
                     elif brick['type'] == self.BRICK_HARD:
                         # Darken hard brick on first hit
@@ -402,7 +409,7 @@ class Arkanoid(Game):
                 continue
 
             # Laser-brick collision
-            for brick in self.bricks[:]:
+            for brick in self.brick_grid.query(laser['x'], laser['y'], laser['x'], laser['y']):
                 if (brick['x'] <= laser['x'] <= brick['x'] + brick['w'] and
                     brick['y'] <= laser['y'] <= brick['y'] + brick['h']):
                     if brick['type'] != self.BRICK_INDESTRUCTIBLE:
@@ -410,6 +417,7 @@ class Arkanoid(Game):
                         if brick['hits'] <= 0:
                             self.maybe_drop_capsule(brick)
                             self.bricks.remove(brick)
+                            self.brick_grid.remove(brick)
                             self.score += self.brick_score(brick)
                     self.lasers.remove(laser)
                     break
@@ -0,0 +1,362 @@
+"""
+Board Search - Shared game-tree search for the CPU opponents
+============================================================
+Shared by the single-player versions of the 2-player board games:
+games/checkers.py, connect4.py, othello.py, mancala.py, go.py and
+chess.py (which brings its own engine, games/chess_engine.py).
+
+Positions
+    Each game supplies a small immutable position class (bitboards for
+    Connect Four, Reversi and Checkers, arrays for Mancala and Go) with
+        side         player to move
+        moves()      legal moves, best guesses first; [] once the game
+                     is over (may be a cached list: the searchers
+                     reorder copies, never the list itself)
+        play(move)   the position after move (side may stay the same,
+                     e.g. a Mancala extra turn)
+        evaluate()   score for the side to move; exact (+/-WIN or 0)
+                     when the game is over
+        key()        hashable transposition key (Negamax)
+        playout(rng) winner of a random game from here (MonteCarlo)
+
+Negamax
+    Alpha-beta with a transposition table, iterative deepening under a
+    time budget, TT move first. Wins score WIN minus the ply they happen
+    at, so the quickest win (and slowest loss) is preferred.
+
+MonteCarlo
+    Flat Monte Carlo for Go: random playouts from every root move, the
+    next playout going to the move with the best UCB1 bound; the most
+    visited move is played.
+
+SearchWorker
+    Runs any searcher's search() on a daemon thread so update() only
+    polls for the result (inline where threads can't start).
+
+CPUOpponent
+    Mixin for a game's CPU subclass: the level select screen (levels
+    are search time), starting the search on the CPU's turn and playing
+    its move when it arrives.
+"""
+
+import math
+import random
+import threading
+import time
+
+from arcade import GameState, Colors
+
+WIN = 1000000
+WIN_BOUND = WIN - 1000   # scores beyond this are forced wins/losses
+INF = WIN + 1
+
+# TT entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def result_score(margin):
+    """Final score for the side to move given its winning margin."""
+    return WIN if margin > 0 else -WIN if margin < 0 else 0
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Negamax:
+    """Iterative-deepening alpha-beta over a position class. The TT
+    persists between searches of the same game."""
+
+    TT_ENTRIES = 1 << 18    # cleared once it grows past this
+    CHECK_EVERY = 127       # nodes between clock / abort checks
+
+    def __init__(self):
+        self.tt = {}
+        self.abort = False
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self._deadline = 0.0
+        self._horizon = False
+
+    def search(self, position, time_limit=1.0, max_depth=64):
+        """Best move for position.side, or None if the game is over."""
+        moves = list(position.moves())
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+        start = time.monotonic()
+        self._deadline = start + time_limit
+        self.abort = False
+        self.nodes = 0
+        self.depth = 0
+        if len(self.tt) > self.TT_ENTRIES:
+            self.tt.clear()
+
+        best = moves[0]
+        for depth in range(1, max_depth + 1):
+            self._root_best = None
+            self._horizon = False
+            try:
+                self.score = self._search_root(position, moves, depth)
+            except _Timeout:
+                # Keep a move that beat the previous best before time ran
+                # out; the previous best was searched first.
+                if self._root_best is not None:
+                    best = self._root_best
+                break
+            best = self._root_best
+            self.depth = depth
+            moves.remove(best)
+            moves.insert(0, best)
+            # Solved, or every line reached the end of the game
+            if abs(self.score) > WIN_BOUND or not self._horizon:
+                break
+            if time.monotonic() - start > time_limit * 0.5:
+                break
+        return best
+
+    def _search_root(self, position, moves, depth):
+        alpha = -INF
+        for i, m in enumerate(moves):
+            child = position.play(m)
+            if child.side == position.side:
+                score = self._negamax(child, depth - 1, alpha, INF, 1)
+            else:
+                score = -self._negamax(child, depth - 1, -INF, -alpha, 1)
+            if score > alpha or i == 0:
+                alpha = score
+                self._root_best = m
+        return alpha
+
+    def _negamax(self, pos, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & self.CHECK_EVERY:
+            if self.abort or time.monotonic() > self._deadline:
+                raise _Timeout
+        moves = pos.moves()
+        if not moves:
+            score = pos.evaluate()
+            if score > WIN_BOUND:
+                return score - ply
+            if score < -WIN_BOUND:
+                return score + ply
+            return score
+        if depth <= 0:
+            self._horizon = True
+            return pos.evaluate()
+
+        key = pos.key()
+        entry = self.tt.get(key)
+        if entry is not None:
+            e_depth, e_score, e_bound, tt_move = entry
+            if e_depth >= depth:
+                if e_score > WIN_BOUND:
+                    e_score -= ply
+                elif e_score < -WIN_BOUND:
+                    e_score += ply
+                if e_bound == EXACT or (e_bound == LOWER and e_score >= beta) \
+                        or (e_bound == UPPER and e_score <= alpha):
+                    if -WIN_BOUND <= e_score <= WIN_BOUND:
+                        self._horizon = True    # may be a depth-limited score
+                    return e_score
+            if tt_move in moves and moves[0] != tt_move:
+                moves = [tt_move] + [m for m in moves if m != tt_move]
+
+        alpha0 = alpha
+        best, best_move = -INF, moves[0]
+        for m in moves:
+            child = pos.play(m)
+            if child.side == pos.side:
+                score = self._negamax(child, depth - 1, alpha, beta, ply + 1)
+            else:
+                score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best, best_move = score, m
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        bound = LOWER if best >= beta else UPPER if best <= alpha0 else EXACT
+        stored = best + ply if best > WIN_BOUND else best - ply if best < -WIN_BOUND else best
+        self.tt[key] = (depth, stored, bound, best_move)
+        return best
+
+
+class MonteCarlo:
+    """Flat Monte Carlo move choice with UCB1 playout allocation."""
+
+    EXPLORE = 1.0
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.abort = False
+        self.playouts = 0
+        self.win_rate = 0.0
+
+    def search(self, position, time_limit=1.0, max_playouts=None):
+        """Most promising move for position.side, or None if the game is
+        over."""
+        moves = position.moves()
+        if not moves:
+            return None
+        self.abort = False
+        children = [position.play(m) for m in moves]
+        n = len(moves)
+        wins = [0] * n
+        visits = [0] * n
+        total = 0
+        deadline = time.monotonic() + time_limit
+        rng = self.rng
+        while not self.abort and (max_playouts is None or total < max_playouts):
+            if total >= n and time.monotonic() > deadline:
+                break
+            if total < n:
+                i = total
+            else:
+                log_total = math.log(total)
+                i = max(range(n), key=lambda j: wins[j] / visits[j] + self.EXPLORE
+                        * math.sqrt(log_total / visits[j]))
+            if children[i].playout(rng) == position.side:
+                wins[i] += 1
+            visits[i] += 1
+            total += 1
+        self.playouts = total
+        best = max(range(n), key=lambda j: (visits[j], wins[j]))
+        self.win_rate = wins[best] / visits[best] if visits[best] else 0.0
+        return moves[best]
+
+
+class SearchWorker:
+    """A searcher's search() on a background thread.
+
+    start() returns at once; poll() is None while the search runs and
+    (move,) once it finishes (move is None when there was nothing to
+    play). The searcher stops early when its abort flag is set.
+    """
+
+    def __init__(self, searcher):
+        self.searcher = searcher
+        self._thread = None
+        self._result = None
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, position, **search_args):
+        self.cancel()
+        self._result = None
+        self._thread = threading.Thread(
+            target=self._run, args=(position, search_args),
+            name="board-search", daemon=True)
+        try:
+            self._thread.start()
+        except RuntimeError:
+            # No threads (the web emulator's Pyodide): search inline
+            self._thread = None
+            self._run(position, search_args)
+
+    def _run(self, position, search_args):
+        self._result = (self.searcher.search(position, **search_args),)
+
+    def poll(self):
+        """(move,) once the search is done, else None."""
+        if self._thread is not None and self._thread.is_alive():
+            return None
+        result, self._result, self._thread = self._result, None, None
+        return result
+
+    def cancel(self):
+        """Stop a running search and wait for the thread to exit."""
+        if self.busy:
+            self.searcher.abort = True
+            self._thread.join()
+        self._thread = None
+        self._result = None
+
+
+# ── Playing against the CPU ───────────────────────────────────────
+
+class CPUOpponent:
+    """Mixin for a board game's single-player subclass; list it before
+    the game class. The subclass provides:
+
+        CPU_PLAYER         player value the computer plays
+        make_searcher()    Negamax(), MonteCarlo(), ...
+        cpu_position()     snapshot for the searcher, or None while the
+                           CPU can't move yet (an animation is running)
+        play_cpu_move(m)   apply the searcher's move to the game
+
+    and calls reset_cpu() from reset(), update_cpu() at the top of
+    update() and draw_cpu() at the end of draw().
+    """
+
+    # (label, seconds of search per move)
+    LEVELS = (("EASY", 0.1), ("MEDIUM", 0.8), ("HARD", 3.0))
+    MIN_THINK = 0.4  # Never reply faster than this, so the move is seen
+    CPU_PLAYER = 2
+    level = 1
+
+    def reset_cpu(self):
+        worker = getattr(self, 'worker', None)
+        if worker is None:
+            self.worker = SearchWorker(self.make_searcher())
+        else:
+            worker.cancel()
+        self.choosing_level = True
+        self.thinking = False
+        self.think_timer = 0.0
+
+    def cpu_to_move(self):
+        return self.current_player == self.CPU_PLAYER
+
+    def update_cpu(self, input_state, dt) -> bool:
+        """Level select and the CPU's turn. True when this frame was
+        handled here and the game's own update should not run."""
+        if self.choosing_level:
+            if input_state.left_pressed:
+                self.level = max(0, self.level - 1)
+            elif input_state.right_pressed:
+                self.level = min(len(self.LEVELS) - 1, self.level + 1)
+            elif input_state.action_l or input_state.action_r:
+                self.choosing_level = False
+            return True
+        if self.state != GameState.PLAYING or not self.cpu_to_move():
+            return False
+
+        if not self.thinking:
+            position = self.cpu_position()
+            if position is None:
+                return False
+            self.worker.start(position, time_limit=self.LEVELS[self.level][1])
+            self.thinking = True
+            self.think_timer = 0.0
+        self.think_timer += dt
+        if self.think_timer < self.MIN_THINK:
+            return True
+        result = self.worker.poll()
+        if result is None:
+            return True
+        self.thinking = False
+        if result[0] is not None:
+            self.play_cpu_move(result[0])
+        return True
+
+    def draw_cpu(self):
+        """Level select panel over the board."""
+        if not self.choosing_level:
+            return
+        d = self.display
+        d.draw_rect(6, 20, 52, 24, Colors.BLACK)
+        d.draw_rect(6, 20, 52, 24, Colors.GRAY, filled=False)
+        d.draw_text_small(12, 23, "CPU LEVEL", Colors.WHITE)
+        label = self.LEVELS[self.level][0]
+        x = (64 - len(label) * 4) // 2
+        d.draw_text_small(x, 33, label, Colors.YELLOW)
+        if self.level > 0:
+            d.draw_text_small(9, 33, "<", Colors.GRAY)
+        if self.level < len(self.LEVELS) - 1:
+            d.draw_text_small(52, 33, ">", Colors.GRAY)
@@ -13,6 +13,7 @@ Controls:
 
 import math
 from arcade import Game, GameState, Display, Colors, InputState
+from games.table_physics import resolve_pair, resolve_pairs, slide
 
 # Phases
 PHASE_MODE_SELECT = 0
@@ -80,7 +81,7 @@ PIN_COLLISION_DIST = 3.0
 BALL_PIN_COLLISION_DIST = 3.0
 PIN_FRICTION = 40.0         # px/s^2 deceleration
 BALL_FRICTION = 5.0
-PIN_RESTITUTION = 0.8
+PIN_RESTITUTION = 0.6       # pin-to-pin (80% of the closing speed changes hands)
 BALL_PIN_RESTITUTION = 0.85
 PIN_KNOCKED_DIST = 2.5      # displacement threshold
 MIN_SPEED = 2.0
@@ -117,6 +118,16 @@ def _build_pin_positions():
 PIN_POSITIONS = _build_pin_positions()
 
 
+class Ball:
+    __slots__ = ['x', 'y', 'vx', 'vy']
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+
+
 class Pin:
     __slots__ = ['x', 'y', 'vx', 'vy', 'home_x', 'home_y', 'knocked', 'active']
 
@@ -190,10 +201,7 @@ class Bowling(Game):
         self.spin_value = 0.0
 
         # Ball state
-        self.ball_x = 0.0
-        self.ball_y = 0.0
-        self.ball_vx = 0.0
-        self.ball_vy = 0.0
+        self.ball = Ball()
         self.ball_active = False
 
         # Phase timer
@@ -234,7 +242,7 @@ class Bowling(Game):
 
     def _all_stopped(self):
         if self.ball_active:
-            bspd = math.sqrt(self.ball_vx ** 2 + self.ball_vy ** 2)
+            bspd = math.sqrt(self.ball.vx ** 2 + self.ball.vy ** 2)
             if bspd > MIN_SPEED:
                 return False
         return not self._any_pin_moving()
@@ -255,11 +263,11 @@ class Bowling(Game):
         self.power_dir = 1
 
     def _launch_ball(self):
-        self.ball_x = self.sweep_pos
-        self.ball_y = float(APPROACH_TOP)
+        self.ball.x = self.sweep_pos
+        self.ball.y = float(APPROACH_TOP)
         ball_speed = MIN_BALL_SPEED + (MAX_BALL_SPEED - MIN_BALL_SPEED) * self.power_value
-        self.ball_vx = math.sin(self.aim_angle) * ball_speed
-        self.ball_vy = -ball_speed  # upward
+        self.ball.vx = math.sin(self.aim_angle) * ball_speed
+        self.ball.vy = -ball_speed  # upward
         self.ball_active = True
         self.pins_before_roll = self._standing_count()
         self.phase = PHASE_ROLLING
@@ -280,51 +288,30 @@ class Bowling(Game):
         # --- Move ball ---
         if self.ball_active:
             # Spin curves the ball laterally
-            self.ball_vx += self.spin_value * SPIN_LATERAL_ACCEL * dt
-
-            self.ball_x += self.ball_vx * dt
-            self.ball_y += self.ball_vy * dt
+            self.ball.vx += self.spin_value * SPIN_LATERAL_ACCEL * dt
 
             # Ball friction (gentle)
-            bspd = math.sqrt(self.ball_vx ** 2 + self.ball_vy ** 2)
-            if bspd > 0:
-                decel = BALL_FRICTION * dt
-                new_spd = max(0, bspd - decel)
-                factor = new_spd / bspd
-                self.ball_vx *= factor
-                self.ball_vy *= factor
+            slide(self.ball, dt, BALL_FRICTION)
 
             # Ball in gutter
-            if self.ball_x < LANE_LEFT or self.ball_x > LANE_RIGHT:
+            if self.ball.x < LANE_LEFT or self.ball.x > LANE_RIGHT:
                 self.ball_active = False
-                self.ball_vx = 0.0
-                self.ball_vy = 0.0
+                self.ball.vx = 0.0
+                self.ball.vy = 0.0
 
             # Ball past pin deck
-            if self.ball_y < PIN_DECK_TOP - 4:
+            if self.ball.y < PIN_DECK_TOP - 4:
                 self.ball_active = False
-                self.ball_vx = 0.0
-                self.ball_vy = 0.0
+                self.ball.vx = 0.0
+                self.ball.vy = 0.0
 
         # --- Move pins ---
         for pin in self.pins:
             if not pin.active or not pin.moving():
                 continue
 
-            pin.x += pin.vx * dt
-            pin.y += pin.vy * dt
-
             # Pin friction
-            spd = pin.speed()
-            if spd > 0:
-                decel = PIN_FRICTION * dt
-                new_spd = max(0, spd - decel)
-                factor = new_spd / spd
-                pin.vx *= factor
-                pin.vy *= factor
-                if new_spd < MIN_SPEED:
-                    pin.vx = 0.0
-                    pin.vy = 0.0
+            slide(pin, dt, PIN_FRICTION, MIN_SPEED)
 
             # Pin off lane -> deactivate
             if (pin.x < LANE_WALL_LEFT or pin.x > LANE_WALL_RIGHT or
@@ -337,66 +324,13 @@ class Bowling(Game):
         # --- Ball-to-pin collisions (unequal mass) ---
         if self.ball_active:
             for pin in self.pins:
-                if not pin.active:
-                    continue
-                dx = pin.x - self.ball_x
-                dy = pin.y - self.ball_y
-                dist_sq = dx * dx + dy * dy
-                min_dist = BALL_PIN_COLLISION_DIST
-                if dist_sq < min_dist * min_dist and dist_sq > 0:
-                    dist = math.sqrt(dist_sq)
-                    nx = dx / dist
-                    ny = dy / dist
-
-                    # Separate overlap
-                    overlap = min_dist - dist
-                    total_mass = BALL_MASS + PIN_MASS
-                    self.ball_x -= nx * overlap * (PIN_MASS / total_mass)
-                    self.ball_y -= ny * overlap * (PIN_MASS / total_mass)
-                    pin.x += nx * overlap * (BALL_MASS / total_mass)
-                    pin.y += ny * overlap * (BALL_MASS / total_mass)
-
-                    # Impulse
-                    rel_vx = pin.vx - self.ball_vx
-                    rel_vy = pin.vy - self.ball_vy
-                    rel_vn = rel_vx * nx + rel_vy * ny
-
-                    if rel_vn < 0:  # approaching
-                        j = -(1 + BALL_PIN_RESTITUTION) * rel_vn / (1 / BALL_MASS + 1 / PIN_MASS)
-                        self.ball_vx -= (j / BALL_MASS) * nx
-                        self.ball_vy -= (j / BALL_MASS) * ny
-                        pin.vx += (j / PIN_MASS) * nx
-                        pin.vy += (j / PIN_MASS) * ny
+                if pin.active:
+                    resolve_pair(self.ball, pin, BALL_PIN_COLLISION_DIST,
+                                 BALL_PIN_RESTITUTION, BALL_MASS, PIN_MASS)
 
         # --- Pin-to-pin collisions (equal mass) ---
-        active_pins = [p for p in self.pins if p.active]
-        for i in range(len(active_pins)):
-            for j in range(i + 1, len(active_pins)):
-                a = active_pins[i]
-                b = active_pins[j]
-                dx = b.x - a.x
-                dy = b.y - a.y
-                dist_sq = dx * dx + dy * dy
-                min_dist = PIN_COLLISION_DIST
-                if dist_sq < min_dist * min_dist and dist_sq > 0:
-                    dist = math.sqrt(dist_sq)
-                    nx = dx / dist
-                    ny = dy / dist
-
-                    # Separate overlap
-                    overlap = min_dist - dist
-                    a.x -= nx * overlap * 0.5
-                    a.y -= ny * overlap * 0.5
-                    b.x += nx * overlap * 0.5
-                    b.y += ny * overlap * 0.5
-
-                    # Elastic collision
-                    rel_vn = (b.vx - a.vx) * nx + (b.vy - a.vy) * ny
-                    if rel_vn < 0:
-                        a.vx += rel_vn * nx * PIN_RESTITUTION
-                        a.vy += rel_vn * ny * PIN_RESTITUTION
-                        b.vx -= rel_vn * nx * PIN_RESTITUTION
-                        b.vy -= rel_vn * ny * PIN_RESTITUTION
+        resolve_pairs([p for p in self.pins if p.active],
+                      PIN_COLLISION_DIST, PIN_RESTITUTION)
 
     # ==== SCORING ====
 
@@ -778,8 +712,8 @@ class Bowling(Game):
                 self.display.set_pixel(px, py + 1, (180, 180, 180))
 
     def _draw_ball(self):
-        bx = int(round(self.ball_x))
-        by = int(round(self.ball_y))
+        bx = int(round(self.ball.x))
+        by = int(round(self.ball.y))
         self.display.set_pixel(bx, by, BALL_COLOR)
         self.display.set_pixel(bx - 1, by, (150, 150, 160))
         self.display.set_pixel(bx + 1, by, (150, 150, 160))
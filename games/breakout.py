@@ -19,6 +19,7 @@ Controls:
 import random
 import math
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.table_physics import BroadphaseGrid
 
 # Playfield layout (64px total)
 # [4px wall][4px x 14 columns = 56px bricks][4px wall]
@@ -89,13 +90,15 @@ class Breakout(Game):
         self.ball_speed = self.SPEED_INITIAL
         self.ball_launched = False
 
-        # Bricks
+        # Bricks, bucketed so the ball only tests the ones it is near
         self.bricks = []
+        self.brick_grid = BroadphaseGrid(cell_size=4)
         self.setup_bricks()
 
     def setup_bricks(self):
         """Create the authentic 8-row brick layout."""
         self.bricks = []
+        self.brick_grid.clear()
 
         brick_width = 4
         brick_height = 2
@@ -115,6 +118,8 @@ class Breakout(Game):
                     'row': row,  # Track which row for speed changes
                 }
                 self.bricks.append(brick)
+                self.brick_grid.insert(brick, brick['x'], brick['y'],
+                                       brick['x'] + brick['w'], brick['y'] + brick['h'])
 
     def launch_ball(self):
         """Launch the ball from the paddle."""
@@ -226,10 +231,12 @@ class Breakout(Game):
             self.ball_dy = -abs(math.cos(angle) * self.ball_speed)
             self.ball_y = self.paddle_y - 2
 
-        # Brick collisions
-        for brick in self.bricks[:]:
+        # Brick collisions (only bricks sharing a grid cell with the ball)
+        bx, by = int(self.ball_x), int(self.ball_y)
+        for brick in self.brick_grid.query(bx, by, bx + 1, by + 1):
             if self.ball_brick_collision(brick):
                 self.bricks.remove(brick)
+                self.brick_grid.remove(brick)
                 self.score += brick['points']
                 self.hit_count += 1
                 # Persistent speed triggers: first orange / red brick hit
@@ -3,12 +3,16 @@ Checkers - Two Player Strategy Game
 ====================================
 Classic checkers on a 64x64 LED display!
 
+CheckersCPU plays the top side against you with the shared alpha-beta
+search (games/board_search.py) on bitboards; a multi-jump is one move.
+
 Controls:
   Arrow Keys - Move cursor
   Space      - Select piece / Confirm move
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.board_search import CPUOpponent, Negamax, WIN
 
 
 # Players
@@ -16,6 +20,141 @@ PLAYER_1 = 1  # Red (bottom)
 PLAYER_2 = 2  # White (top)
 
 
+# Bitboards: bit row * 8 + col. _STEPS[sq] lists (row step, neighbour,
+# landing square of a jump over it or -1) for each diagonal.
+def _steps(sq):
+    row, col = sq >> 3, sq & 7
+    out = []
+    for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+        r, c = row + dr, col + dc
+        if 0 <= r < 8 and 0 <= c < 8:
+            jr, jc = r + dr, c + dc
+            land = jr * 8 + jc if 0 <= jr < 8 and 0 <= jc < 8 else -1
+            out.append((dr, r * 8 + c, land))
+    return tuple(out)
+
+
+_STEPS = tuple(_steps(sq) for sq in range(64))
+_FORWARD = {PLAYER_1: -1, PLAYER_2: 1}
+_CROWN_ROW = {PLAYER_1: 0, PLAYER_2: 7}
+_HOME_ROW = {PLAYER_1: 7, PLAYER_2: 0}
+
+
+def _squares(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CheckersPosition:
+    """Bitboard position: each side's pieces and the kings among them.
+    A move is the tuple of squares a piece visits; jumps are forced and
+    run until no further jump is possible, and a man crowned mid-jump
+    carries on jumping as a king, as in Checkers.make_move()."""
+
+    __slots__ = ('men', 'kings', 'side', '_moves')
+
+    def __init__(self, men, kings, side):
+        self.men = men          # {player: bitboard of all their pieces}
+        self.kings = kings
+        self.side = side
+        self._moves = None
+
+    @classmethod
+    def from_game(cls, game):
+        men = {PLAYER_1: 0, PLAYER_2: 0}
+        kings = 0
+        for row in range(8):
+            for col in range(8):
+                piece = game.board[row][col]
+                if piece:
+                    men[piece.player] |= 1 << (row * 8 + col)
+                    if piece.is_king:
+                        kings |= 1 << (row * 8 + col)
+        return cls(men, kings, game.current_player)
+
+    def moves(self):
+        if self._moves is None:
+            self._moves = self._generate()
+        return self._moves
+
+    def _generate(self):
+        side = self.side
+        mine, theirs = self.men[side], self.men[3 - side]
+        empty = ~(mine | theirs)
+        forward = _FORWARD[side]
+        jumps = []
+        for sq in _squares(mine):
+            self._jumps(jumps, (sq,), sq, bool(self.kings >> sq & 1),
+                        theirs, empty | (1 << sq))
+        if jumps:
+            jumps.sort(key=len, reverse=True)
+            return jumps
+        steps = []
+        for sq in _squares(mine):
+            king = self.kings >> sq & 1
+            for dr, to, _ in _STEPS[sq]:
+                if (king or dr == forward) and empty >> to & 1:
+                    steps.append((sq, to))
+        return steps
+
+    def _jumps(self, out, path, sq, king, theirs, empty):
+        side = self.side
+        found = False
+        for dr, over, land in _STEPS[sq]:
+            if land < 0 or not (king or dr == _FORWARD[side]):
+                continue
+            if theirs >> over & 1 and empty >> land & 1:
+                found = True
+                self._jumps(out, path + (land,), land,
+                            king or land >> 3 == _CROWN_ROW[side],
+                            theirs & ~(1 << over),
+                            (empty | (1 << over)) & ~(1 << land))
+        if not found and len(path) > 1:
+            out.append(path)
+
+    def play(self, path):
+        side = self.side
+        frm, to = path[0], path[-1]
+        mine = self.men[side] & ~(1 << frm) | (1 << to)
+        theirs = self.men[3 - side]
+        kings = self.kings
+        crowned = kings >> frm & 1
+        kings &= ~(1 << frm)
+        for a, b in zip(path, path[1:]):
+            if abs((a >> 3) - (b >> 3)) == 2:
+                over = (a + b) >> 1
+                theirs &= ~(1 << over)
+                kings &= ~(1 << over)
+            if b >> 3 == _CROWN_ROW[side]:
+                crowned = 1
+        if crowned:
+            kings |= 1 << to
+        return CheckersPosition({side: mine, 3 - side: theirs}, kings, 3 - side)
+
+    def evaluate(self):
+        if not self.moves():
+            return -WIN
+        side = self.side
+        score = 0
+        for player, sign in ((side, 1), (3 - side, -1)):
+            pieces = self.men[player]
+            kings = pieces & self.kings
+            crown_row = _CROWN_ROW[player]
+            value = 160 * kings.bit_count()
+            for sq in _squares(pieces & ~kings):
+                # Men gain as they advance; the back row guards the crown
+                value += 100 + 2 * (7 - abs(crown_row - (sq >> 3)))
+                if sq >> 3 == _HOME_ROW[player]:
+                    value += 6
+            score += sign * value
+        return score
+
+    def key(self):
+        return (self.men[PLAYER_1], self.men[PLAYER_2], self.kings, self.side)
+
+
 class Piece:
     """Represents a checker piece."""
 
@@ -487,3 +626,54 @@ class Checkers(Game):
             int(c1[1] * (1 - factor) + c2[1] * factor),
             int(c1[2] * (1 - factor) + c2[2] * factor),
         )
+
+
+class CheckersCPU(CPUOpponent, Checkers):
+    """Checkers against the computer: you are Red and move first."""
+
+    name = "CHECKERS CPU"
+    description = "1P vs CPU"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'Checkers against an alpha-beta search on bitboards, forced jumps and all. Pick EASY, MEDIUM or HARD; harder levels think longer.',
+    }
+
+    CPU_PLAYER = PLAYER_2
+    HOP_DELAY = 0.35  # Pause between the hops of a multi-jump
+
+    def reset(self):
+        super().reset()
+        self.cpu_path = []
+        self.hop_timer = 0.0
+        self.reset_cpu()
+
+    def make_searcher(self):
+        return Negamax()
+
+    def cpu_position(self):
+        return CheckersPosition.from_game(self)
+
+    def play_cpu_move(self, path):
+        self.cpu_path = [(sq & 7, sq >> 3) for sq in path]
+        self.hop_timer = self.HOP_DELAY
+
+    def update(self, input_state: InputState, dt: float):
+        # Play out the CPU's move one hop at a time
+        if self.cpu_path:
+            self.hop_timer += dt
+            if self.hop_timer >= self.HOP_DELAY:
+                self.hop_timer = 0.0
+                (fc, fr), (tc, tr) = self.cpu_path[0], self.cpu_path[1]
+                self.cursor_x, self.cursor_y = tc, tr
+                self.make_move(fc, fr, tc, tr)
+                self.cpu_path.pop(0)
+                if len(self.cpu_path) < 2:
+                    self.cpu_path = []
+            return
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
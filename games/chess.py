@@ -3,12 +3,19 @@ Chess - Two Player Strategy Game
 ================================
 Classic chess on a 64x64 LED display!
 
+ChessCPU is the single-player variant: you play White against the
+shared alpha-beta engine (games/chess_engine.py), which searches on a
+background thread so the board keeps drawing while it thinks. The CPU
+level sets its search time per move.
+
 Controls:
   Joystick - Move cursor
   Button   - Select piece / Confirm move (press same piece to deselect)
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.board_search import CPUOpponent
+from games.chess_engine import Board, Engine, to_coords
 
 
 # Piece types
@@ -109,6 +116,9 @@ class Chess(Game):
     CHECK_COLOR = Colors.RED
     LAST_MOVE_COLOR = (100, 100, 180)
 
+    # HUD label for the side to move
+    TURN_LABELS = {WHITE: "P1", BLACK: "P2"}
+
     def __init__(self, display: Display):
         super().__init__(display)
         self.reset()
@@ -528,9 +538,9 @@ class Chess(Game):
 
         # Draw HUD
         if self.current_turn == WHITE:
-            self.display.draw_text_small(1, 1, "P1", self.WHITE_PIECE)
+            self.display.draw_text_small(1, 1, self.TURN_LABELS[WHITE], self.WHITE_PIECE)
         else:
-            self.display.draw_text_small(1, 1, "P2", self.BLACK_PIECE)
+            self.display.draw_text_small(1, 1, self.TURN_LABELS[BLACK], self.BLACK_PIECE)
 
         if self.in_check:
             self.display.draw_text_small(32, 1, "CHECK", Colors.RED)
@@ -691,3 +701,54 @@ class Chess(Game):
             self.display.draw_text_small(2, 32, self.game_over_reason, Colors.WHITE)
 
         self.display.draw_text_small(2, 50, "BTN:AGAIN", Colors.GRAY)
+
+
+class ChessCPU(CPUOpponent, Chess):
+    """Chess against the engine: the player is White, the CPU Black."""
+
+    name = "CHESS CPU"
+    description = "1P vs Engine"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'You play White against an alpha-beta engine with a transposition table. It thinks on a background thread while the board stays live.',
+    }
+
+    TURN_LABELS = {WHITE: "YOU", BLACK: "CPU"}
+    CPU_PLAYER = BLACK
+
+    def reset(self):
+        super().reset()
+        self.positions = []  # Zobrist hash after every move, for repetition
+        self._record_position()
+        self.reset_cpu()
+
+    def _record_position(self):
+        self.positions.append(Board.from_game(self).hash)
+
+    def end_turn(self):
+        super().end_turn()
+        self._record_position()
+
+    def make_searcher(self):
+        return Engine()
+
+    def cpu_to_move(self):
+        return self.current_turn == self.CPU_PLAYER
+
+    def cpu_position(self):
+        return Board.from_game(self, self.positions[:-1])
+
+    def play_cpu_move(self, move):
+        (fx, fy), (tx, ty), promo = to_coords(move)
+        self.make_move(fx, fy, tx, ty)
+        if self.promoting_pawn:
+            self.promote_pawn(promo)
+
+    def update(self, input_state: InputState, dt: float):
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
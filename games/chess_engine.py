@@ -0,0 +1,737 @@
+"""
+Chess Engine - Shared alpha-beta search for chess
+=================================================
+Shared by games/chess.py (ChessCPU, the single-player opponent) and
+visuals/chessdemo.py (AI vs AI attract mode). Both run it on a
+games.board_search.SearchWorker thread and poll for the move each
+frame.
+
+Board
+    A 0x88 mailbox: 128 squares, square = y * 16 + x in the same
+    coordinates as Chess.board[y][x] (row 0 is Black's back rank), so any
+    off-board step has a bit of 0x88 set. make()/unmake() update the
+    Zobrist hash, material + piece-square score and game phase
+    incrementally, so evaluate() is a few additions instead of a board
+    scan. Board.from_game() snapshots a games.chess.Chess position;
+    from_fen() is for tests.
+
+Engine
+    Negamax alpha-beta with a quiescence search over captures, iterative
+    deepening under a time budget and a transposition table keyed by the
+    Zobrist hash. Moves are ordered TT move first, then captures by
+    MVV-LVA (most valuable victim, least valuable attacker), then the two
+    killer moves of the ply. Positions already seen since the last pawn
+    move or capture score as a draw.
+
+Moves are ints: from | to << 7 | promotion type << 14 | flags << 19.
+to_coords() turns one into ((fx, fy), (tx, ty), promotion letter) for
+Chess.make_move() / promote_pawn().
+"""
+
+import random
+import time
+
+# Piece codes: type | color bit
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE_BIT, BLACK_BIT = 8, 16
+LETTERS = '.PNBRQK'             # games.chess type letter for each code
+
+# Move flags
+EN_PASSANT, CASTLE, DOUBLE_PUSH = 1, 2, 4
+
+# Castling rights
+WK, WQ, BK, BQ = 1, 2, 4, 8
+
+KNIGHT_STEPS = (-33, -31, -18, -14, 14, 18, 31, 33)
+KING_STEPS = (-17, -16, -15, -1, 1, 15, 16, 17)
+BISHOP_STEPS = (-17, -15, 15, 17)
+ROOK_STEPS = (-16, -1, 1, 16)
+
+SQUARES = tuple(y * 16 + x for y in range(8) for x in range(8))
+
+MATE = 100000
+MATE_BOUND = MATE - 1000        # scores above this are forced mates
+INF = MATE + 1
+MAX_PLY = 64
+
+# TT entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Centipawn values (king is never captured)
+VALUES = (0, 100, 320, 330, 500, 900, 0)
+# Game phase weight: 24 with all minor and major pieces on the board
+PHASE = (0, 0, 1, 1, 2, 4, 0)
+FULL_PHASE = 24
+
+# Piece-square tables from White's side, row 0 = Black's back rank
+# (Michniewski's simplified evaluation). The king has separate
+# middlegame and endgame tables, blended by phase.
+_PST_ROWS = {
+    PAWN: (
+        (0, 0, 0, 0, 0, 0, 0, 0),
+        (50, 50, 50, 50, 50, 50, 50, 50),
+        (10, 10, 20, 30, 30, 20, 10, 10),
+        (5, 5, 10, 25, 25, 10, 5, 5),
+        (0, 0, 0, 20, 20, 0, 0, 0),
+        (5, -5, -10, 0, 0, -10, -5, 5),
+        (5, 10, 10, -20, -20, 10, 10, 5),
+        (0, 0, 0, 0, 0, 0, 0, 0),
+    ),
+    KNIGHT: (
+        (-50, -40, -30, -30, -30, -30, -40, -50),
+        (-40, -20, 0, 0, 0, 0, -20, -40),
+        (-30, 0, 10, 15, 15, 10, 0, -30),
+        (-30, 5, 15, 20, 20, 15, 5, -30),
+        (-30, 0, 15, 20, 20, 15, 0, -30),
+        (-30, 5, 10, 15, 15, 10, 5, -30),
+        (-40, -20, 0, 5, 5, 0, -20, -40),
+        (-50, -40, -30, -30, -30, -30, -40, -50),
+    ),
+    BISHOP: (
+        (-20, -10, -10, -10, -10, -10, -10, -20),
+        (-10, 0, 0, 0, 0, 0, 0, -10),
+        (-10, 0, 5, 10, 10, 5, 0, -10),
+        (-10, 5, 5, 10, 10, 5, 5, -10),
+        (-10, 0, 10, 10, 10, 10, 0, -10),
+        (-10, 10, 10, 10, 10, 10, 10, -10),
+        (-10, 5, 0, 0, 0, 0, 5, -10),
+        (-20, -10, -10, -10, -10, -10, -10, -20),
+    ),
+    ROOK: (
+        (0, 0, 0, 0, 0, 0, 0, 0),
+        (5, 10, 10, 10, 10, 10, 10, 5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (-5, 0, 0, 0, 0, 0, 0, -5),
+        (0, 0, 0, 5, 5, 0, 0, 0),
+    ),
+    QUEEN: (
+        (-20, -10, -10, -5, -5, -10, -10, -20),
+        (-10, 0, 0, 0, 0, 0, 0, -10),
+        (-10, 0, 5, 5, 5, 5, 0, -10),
+        (-5, 0, 5, 5, 5, 5, 0, -5),
+        (0, 0, 5, 5, 5, 5, 0, -5),
+        (-10, 5, 5, 5, 5, 5, 0, -10),
+        (-10, 0, 5, 0, 0, 0, 0, -10),
+        (-20, -10, -10, -5, -5, -10, -10, -20),
+    ),
+    KING: (
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-30, -40, -40, -50, -50, -40, -40, -30),
+        (-20, -30, -30, -40, -40, -30, -30, -20),
+        (-10, -20, -20, -20, -20, -20, -20, -10),
+        (20, 20, 0, 0, 0, 0, 20, 20),
+        (20, 30, 10, 0, 0, 10, 30, 20),
+    ),
+}
+
+_KING_ENDGAME = (
+    (-50, -40, -30, -20, -20, -30, -40, -50),
+    (-30, -20, -10, 0, 0, -10, -20, -30),
+    (-30, -10, 20, 30, 30, 20, -10, -30),
+    (-30, -10, 30, 40, 40, 30, -10, -30),
+    (-30, -10, 30, 40, 40, 30, -10, -30),
+    (-30, -10, 20, 30, 30, 20, -10, -30),
+    (-30, -30, 0, 0, 0, 0, -30, -30),
+    (-50, -30, -30, -30, -30, -30, -30, -50),
+)
+
+
+def _signed_table(rows, piece, value=0):
+    """128-entry table of rows[y][x] + value for piece, mirrored and
+    negated for Black so every entry is from White's side."""
+    table = [0] * 128
+    for s in SQUARES:
+        y, x = s >> 4, s & 7
+        if piece & WHITE_BIT:
+            table[s] = value + rows[y][x]
+        else:
+            table[s] = -(value + rows[7 - y][x])
+    return table
+
+
+# PST[piece][square]: material + middlegame position, White positive
+PST = [[0] * 128 for _ in range(BLACK_BIT | KING + 1)]
+# KING_EG[piece][square]: endgame minus middlegame king table
+KING_EG = [[0] * 128 for _ in range(BLACK_BIT | KING + 1)]
+for _bit in (WHITE_BIT, BLACK_BIT):
+    for _t, _rows in _PST_ROWS.items():
+        PST[_bit | _t] = _signed_table(_rows, _bit | _t, VALUES[_t])
+    _mg = _signed_table(_PST_ROWS[KING], _bit | KING)
+    _eg = _signed_table(_KING_ENDGAME, _bit | KING)
+    KING_EG[_bit | KING] = [e - m for e, m in zip(_eg, _mg)]
+
+# Zobrist keys, fixed seed so hashes are stable between runs
+_rng = random.Random(0x88)
+ZOBRIST = [[_rng.getrandbits(64) for _ in range(128)]
+           for _ in range(BLACK_BIT | KING + 1)]
+Z_SIDE = _rng.getrandbits(64)
+Z_CASTLE = [_rng.getrandbits(64) for _ in range(16)]
+Z_EP = [_rng.getrandbits(64) for _ in range(8)]
+del _rng
+
+# Rights kept when a move touches a square (king or rook home squares)
+CASTLE_MASK = [15] * 128
+CASTLE_MASK[0x74] = 15 & ~(WK | WQ)
+CASTLE_MASK[0x77] = 15 & ~WK
+CASTLE_MASK[0x70] = 15 & ~WQ
+CASTLE_MASK[0x04] = 15 & ~(BK | BQ)
+CASTLE_MASK[0x07] = 15 & ~BK
+CASTLE_MASK[0x00] = 15 & ~BQ
+
+
+def encode(frm, to, promo=0, flags=0):
+    return frm | to << 7 | promo << 14 | flags << 19
+
+
+def to_coords(move):
+    """((fx, fy), (tx, ty), promotion letter or None) for a move."""
+    frm, to, promo = move & 127, (move >> 7) & 127, (move >> 14) & 31
+    return ((frm & 7, frm >> 4), (to & 7, to >> 4),
+            LETTERS[promo] if promo else None)
+
+
+class Board:
+    """0x88 position with incremental hash and evaluation.
+
+    sq        128 piece codes (0 empty)
+    side      0 White to move, 1 Black
+    castle    WK | WQ | BK | BQ rights
+    ep        en passant target square, or -1
+    hash      Zobrist hash
+    score     material + piece-square total, White positive
+    king_eg   endgame king correction, scaled by (24 - phase) / 24
+    phase     minor/major material left, 0..24+
+    halfmove  plies since the last pawn move or capture
+    history   hashes of earlier positions, for repetition checks
+    """
+
+    __slots__ = ('sq', 'side', 'castle', 'ep', 'hash', 'score', 'king_eg',
+                 'phase', 'halfmove', 'kings', 'history', '_undo')
+
+    def __init__(self):
+        self.sq = [0] * 128
+        self.side = 0
+        self.castle = 0
+        self.ep = -1
+        self.halfmove = 0
+        self.kings = [-1, -1]
+        self.history = []
+        self._undo = []
+        self.refresh()
+
+    # ── Setup ──────────────────────────────────────────────────────
+
+    def refresh(self):
+        """Recompute hash, score and phase from scratch."""
+        h = Z_CASTLE[self.castle]
+        score = king_eg = phase = 0
+        for s in SQUARES:
+            p = self.sq[s]
+            if p:
+                h ^= ZOBRIST[p][s]
+                score += PST[p][s]
+                king_eg += KING_EG[p][s]
+                phase += PHASE[p & 7]
+                if p & 7 == KING:
+                    self.kings[0 if p & WHITE_BIT else 1] = s
+        if self.side:
+            h ^= Z_SIDE
+        if self.ep >= 0:
+            h ^= Z_EP[self.ep & 7]
+        self.hash, self.score, self.king_eg, self.phase = h, score, king_eg, phase
+
+    @classmethod
+    def from_game(cls, game, history=()):
+        """Snapshot of a games.chess.Chess position. Castling rights come
+        from the kings' and rooks' has_moved flags."""
+        b = cls()
+        for y in range(8):
+            for x in range(8):
+                piece = game.board[y][x]
+                if piece is not None:
+                    bit = WHITE_BIT if piece.color == 'w' else BLACK_BIT
+                    b.sq[y * 16 + x] = bit | LETTERS.index(piece.type)
+        b.side = 0 if game.current_turn == 'w' else 1
+        for rank, bit, rights in ((7, WHITE_BIT, (WK, WQ)), (0, BLACK_BIT, (BK, BQ))):
+            king = game.board[rank][4]
+            if king is None or king.type != 'K' or king.has_moved \
+                    or b.sq[rank * 16 + 4] != bit | KING:
+                continue
+            for rx, right in ((7, rights[0]), (0, rights[1])):
+                rook = game.board[rank][rx]
+                if rook is not None and not rook.has_moved \
+                        and b.sq[rank * 16 + rx] == bit | ROOK:
+                    b.castle |= right
+        if game.en_passant_target is not None:
+            ex, ey = game.en_passant_target
+            b.ep = ey * 16 + ex
+        b.history = list(history)
+        b.halfmove = len(b.history)
+        b.refresh()
+        return b
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Position from a FEN string (move counters are ignored)."""
+        fields = fen.split()
+        b = cls()
+        for y, row in enumerate(fields[0].split('/')):
+            x = 0
+            for ch in row:
+                if ch.isdigit():
+                    x += int(ch)
+                    continue
+                bit = WHITE_BIT if ch.isupper() else BLACK_BIT
+                b.sq[y * 16 + x] = bit | LETTERS.index(ch.upper())
+                x += 1
+        b.side = 0 if fields[1] == 'w' else 1
+        for ch, right in zip('KQkq', (WK, WQ, BK, BQ)):
+            if ch in fields[2]:
+                b.castle |= right
+        if len(fields) > 3 and fields[3] != '-':
+            b.ep = (8 - int(fields[3][1])) * 16 + 'abcdefgh'.index(fields[3][0])
+        b.refresh()
+        return b
+
+    @classmethod
+    def start(cls):
+        return cls.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -')
+
+    def copy(self):
+        b = Board.__new__(Board)
+        b.sq = self.sq[:]
+        b.side, b.castle, b.ep = self.side, self.castle, self.ep
+        b.hash, b.score, b.king_eg = self.hash, self.score, self.king_eg
+        b.phase, b.halfmove = self.phase, self.halfmove
+        b.kings = self.kings[:]
+        b.history = self.history[:]
+        b._undo = []
+        return b
+
+    # ── Queries ────────────────────────────────────────────────────
+
+    def evaluate(self):
+        """Static score in centipawns for the side to move."""
+        phase = min(self.phase, FULL_PHASE)
+        s = self.score + self.king_eg * (FULL_PHASE - phase) // FULL_PHASE
+        return -s if self.side else s
+
+    def attacked(self, s, by):
+        """Is square s attacked by side by (0 White, 1 Black)?"""
+        sq = self.sq
+        bit = BLACK_BIT if by else WHITE_BIT
+        # Pawns attack toward the far rank, so look back toward their own
+        for d in ((-15, -17) if by else (15, 17)):
+            t = s + d
+            if not t & 0x88 and sq[t] == bit | PAWN:
+                return True
+        knight, king = bit | KNIGHT, bit | KING
+        for d in KNIGHT_STEPS:
+            t = s + d
+            if not t & 0x88 and sq[t] == knight:
+                return True
+        for d in KING_STEPS:
+            t = s + d
+            if not t & 0x88 and sq[t] == king:
+                return True
+        queen = bit | QUEEN
+        for steps, slider in ((ROOK_STEPS, bit | ROOK), (BISHOP_STEPS, bit | BISHOP)):
+            for d in steps:
+                t = s + d
+                while not t & 0x88:
+                    p = sq[t]
+                    if p:
+                        if p == slider or p == queen:
+                            return True
+                        break
+                    t += d
+        return False
+
+    def in_check(self):
+        return self.attacked(self.kings[self.side], self.side ^ 1)
+
+    def is_repetition(self):
+        """Has this position occurred since the last irreversible move?"""
+        if self.halfmove < 4:
+            return False
+        return self.hash in self.history[-self.halfmove:]
+
+    def moves(self, captures_only=False):
+        """Pseudo-legal moves (may leave the king in check; make() rejects
+        those). captures_only also keeps queen promotions."""
+        sq = self.sq
+        out = []
+        append = out.append
+        us = BLACK_BIT if self.side else WHITE_BIT
+        them = us ^ (WHITE_BIT | BLACK_BIT)
+        fwd = 16 if self.side else -16
+        start_rank = 1 if self.side else 6
+        promo_rank = 7 if self.side else 0
+        ep = self.ep
+        for s in SQUARES:
+            p = sq[s]
+            if not p & us:
+                continue
+            kind = p & 7
+            if kind == PAWN:
+                t = s + fwd
+                if not sq[t]:
+                    if t >> 4 == promo_rank:
+                        append(encode(s, t, QUEEN))
+                        if not captures_only:
+                            for promo in (KNIGHT, ROOK, BISHOP):
+                                append(encode(s, t, promo))
+                    elif not captures_only:
+                        append(s | t << 7)
+                        if s >> 4 == start_rank and not sq[t + fwd]:
+                            append(encode(s, t + fwd, 0, DOUBLE_PUSH))
+                for t in (s + fwd - 1, s + fwd + 1):
+                    if t & 0x88:
+                        continue
+                    if sq[t] & them:
+                        if t >> 4 == promo_rank:
+                            append(encode(s, t, QUEEN))
+                            if not captures_only:
+                                for promo in (KNIGHT, ROOK, BISHOP):
+                                    append(encode(s, t, promo))
+                        else:
+                            append(s | t << 7)
+                    elif t == ep:
+                        append(encode(s, t, 0, EN_PASSANT))
+            elif kind == KNIGHT or kind == KING:
+                for d in (KNIGHT_STEPS if kind == KNIGHT else KING_STEPS):
+                    t = s + d
+                    if t & 0x88:
+                        continue
+                    q = sq[t]
+                    if q & them or (not q and not captures_only):
+                        append(s | t << 7)
+            else:
+                steps = (ROOK_STEPS if kind == ROOK else BISHOP_STEPS
+                         if kind == BISHOP else KING_STEPS)
+                for d in steps:
+                    t = s + d
+                    while not t & 0x88:
+                        q = sq[t]
+                        if q:
+                            if q & them:
+                                append(s | t << 7)
+                            break
+                        if not captures_only:
+                            append(s | t << 7)
+                        t += d
+        if not captures_only:
+            self._castling_moves(append)
+        return out
+
+    def _castling_moves(self, append):
+        if self.side:
+            home, king_side, queen_side = 0x04, BK, BQ
+        else:
+            home, king_side, queen_side = 0x74, WK, WQ
+        rights = self.castle & (king_side | queen_side)
+        if not rights or self.sq[home] & 7 != KING:
+            return
+        sq, enemy = self.sq, self.side ^ 1
+        if self.attacked(home, enemy):
+            return
+        if rights & king_side and not sq[home + 1] and not sq[home + 2] \
+                and not self.attacked(home + 1, enemy) \
+                and not self.attacked(home + 2, enemy):
+            append(encode(home, home + 2, 0, CASTLE))
+        if rights & queen_side and not sq[home - 1] and not sq[home - 2] \
+                and not sq[home - 3] and not self.attacked(home - 1, enemy) \
+                and not self.attacked(home - 2, enemy):
+            append(encode(home, home - 2, 0, CASTLE))
+
+    def legal_moves(self):
+        legal = []
+        for m in self.moves():
+            if self.make(m):
+                self.unmake()
+                legal.append(m)
+        return legal
+
+    # ── Make / unmake ──────────────────────────────────────────────
+
+    def make(self, m):
+        """Play move m. Returns False (and leaves the board unchanged) if
+        it would leave the mover's king in check."""
+        sq = self.sq
+        frm, to = m & 127, (m >> 7) & 127
+        promo, flags = (m >> 14) & 31, m >> 19
+        piece, captured = sq[frm], sq[to]
+        self._undo.append((m, captured, self.castle, self.ep, self.hash,
+                           self.score, self.king_eg, self.phase, self.halfmove))
+        self.history.append(self.hash)
+
+        h = self.hash ^ Z_SIDE ^ ZOBRIST[piece][frm]
+        score = self.score - PST[piece][frm]
+        if self.ep >= 0:
+            h ^= Z_EP[self.ep & 7]
+        sq[frm] = 0
+        if captured:
+            h ^= ZOBRIST[captured][to]
+            score -= PST[captured][to]
+            self.phase -= PHASE[captured & 7]
+        elif flags & EN_PASSANT:
+            cap_sq = to - (16 if self.side else -16)
+            pawn = sq[cap_sq]
+            sq[cap_sq] = 0
+            h ^= ZOBRIST[pawn][cap_sq]
+            score -= PST[pawn][cap_sq]
+        placed = (piece & (WHITE_BIT | BLACK_BIT)) | promo if promo else piece
+        if promo:
+            self.phase += PHASE[promo]
+        sq[to] = placed
+        h ^= ZOBRIST[placed][to]
+        score += PST[placed][to]
+
+        if piece & 7 == KING:
+            self.kings[self.side] = to
+            self.king_eg += KING_EG[piece][to] - KING_EG[piece][frm]
+            if flags & CASTLE:
+                rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+                rook = sq[rook_from]
+                sq[rook_from], sq[rook_to] = 0, rook
+                h ^= ZOBRIST[rook][rook_from] ^ ZOBRIST[rook][rook_to]
+                score += PST[rook][rook_to] - PST[rook][rook_from]
+
+        castle = self.castle & CASTLE_MASK[frm] & CASTLE_MASK[to]
+        if castle != self.castle:
+            h ^= Z_CASTLE[self.castle] ^ Z_CASTLE[castle]
+            self.castle = castle
+        if flags & DOUBLE_PUSH:
+            self.ep = (frm + to) >> 1
+            h ^= Z_EP[self.ep & 7]
+        else:
+            self.ep = -1
+        self.halfmove = 0 if captured or piece & 7 == PAWN else self.halfmove + 1
+        self.hash, self.score = h, score
+        self.side ^= 1
+
+        if self.attacked(self.kings[self.side ^ 1], self.side):
+            self.unmake()
+            return False
+        return True
+
+    def unmake(self):
+        """Take back the last make()."""
+        (m, captured, self.castle, self.ep, self.hash, self.score,
+         self.king_eg, self.phase, self.halfmove) = self._undo.pop()
+        self.history.pop()
+        self.side ^= 1
+        sq = self.sq
+        frm, to = m & 127, (m >> 7) & 127
+        promo, flags = (m >> 14) & 31, m >> 19
+        piece = sq[to]
+        if promo:
+            piece = (piece & (WHITE_BIT | BLACK_BIT)) | PAWN
+        sq[frm], sq[to] = piece, captured
+        if flags & EN_PASSANT:
+            them = WHITE_BIT if self.side else BLACK_BIT
+            sq[to - (16 if self.side else -16)] = them | PAWN
+        if piece & 7 == KING:
+            self.kings[self.side] = frm
+            if flags & CASTLE:
+                rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+                sq[rook_from], sq[rook_to] = sq[rook_to], 0
+
+    def perft(self, depth):
+        """Leaf count of the legal move tree (move generator check)."""
+        if depth == 0:
+            return 1
+        total = 0
+        for m in self.moves():
+            if self.make(m):
+                total += self.perft(depth - 1)
+                self.unmake()
+        return total
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Engine:
+    """Iterative-deepening alpha-beta searcher. The transposition table
+    and killer moves persist between searches, so a game's next move
+    starts from what the last search learned."""
+
+    TT_ENTRIES = 1 << 18    # cleared once it grows past this
+    CHECK_EVERY = 255       # nodes between clock / abort checks
+
+    def __init__(self):
+        self.tt = {}
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.abort = False
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self._deadline = 0.0
+
+    def search(self, board, time_limit=1.0, max_depth=MAX_PLY - 1, variety=0, rng=None):
+        """Best legal move for the side to move, or None if there is none.
+
+        Deepens one ply at a time until time_limit seconds, max_depth or
+        abort. variety > 0 adds a random 0..variety centipawn bonus to
+        each root move, so repeated games don't replay the same line.
+        """
+        b = board.copy()
+        root = b.legal_moves()
+        if not root:
+            return None
+        start = time.monotonic()
+        self._deadline = start + time_limit
+        self.abort = False
+        self.nodes = 0
+        self.depth = 0
+        for k in self.killers:
+            k[0] = k[1] = 0
+        if len(self.tt) > self.TT_ENTRIES:
+            self.tt.clear()
+        rng = rng or random
+        bonus = {m: rng.randint(0, variety) if variety else 0 for m in root}
+
+        entry = self.tt.get(b.hash)
+        if entry and entry[3] in bonus:
+            root.remove(entry[3])
+            root.insert(0, entry[3])
+        else:
+            root.sort(key=lambda m: -self._order_score(b, m, 0, 0))
+
+        best = root[0]
+        for depth in range(1, max_depth + 1):
+            self._root_best = None
+            try:
+                self.score = self._search_root(b, depth, root, bonus)
+            except _Timeout:
+                # A move that beat the previous best before time ran out
+                # is kept; the previous best was searched first.
+                if self._root_best is not None:
+                    best = self._root_best
+                break
+            best = self._root_best
+            self.depth = depth
+            root.remove(best)
+            root.insert(0, best)
+            if abs(self.score) > MATE_BOUND or len(root) == 1:
+                break
+            # The next iteration costs several times this one
+            if time.monotonic() - start > time_limit * 0.5:
+                break
+        return best
+
+    def _search_root(self, b, depth, root, bonus):
+        alpha, beta = -INF, INF
+        for i, m in enumerate(root):
+            extra = bonus[m]
+            b.make(m)
+            score = -self._negamax(b, depth - 1, -(beta - extra), -(alpha - extra), 1) + extra
+            b.unmake()
+            if score > alpha or i == 0:
+                alpha = score
+                self._root_best = m
+        # Move only: root scores carry the variety bonus
+        self.tt[b.hash] = (0, 0, UPPER, self._root_best)
+        return alpha
+
+    def _tick(self):
+        if self.abort or time.monotonic() > self._deadline:
+            raise _Timeout
+
+    def _order_score(self, b, m, tt_move, ply):
+        if m == tt_move:
+            return 1 << 20
+        victim = b.sq[(m >> 7) & 127] & 7
+        if victim or (m >> 19) & EN_PASSANT:
+            # MVV-LVA
+            return (1 << 16) + VALUES[victim or PAWN] * 16 - VALUES[b.sq[m & 127] & 7] // 16
+        if (m >> 14) & 31:
+            return 1 << 15
+        killers = self.killers[ply]
+        if m == killers[0]:
+            return 1 << 14
+        if m == killers[1]:
+            return (1 << 14) - 1
+        return 0
+
+    def _negamax(self, b, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & self.CHECK_EVERY:
+            self._tick()
+        if b.is_repetition():
+            return 0
+        in_check = b.in_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(b, alpha, beta, ply)
+
+        tt_move = 0
+        entry = self.tt.get(b.hash)
+        if entry is not None:
+            e_depth, e_score, e_bound, tt_move = entry
+            if e_depth >= depth:
+                if e_score > MATE_BOUND:
+                    e_score -= ply
+                elif e_score < -MATE_BOUND:
+                    e_score += ply
+                if e_bound == EXACT or (e_bound == LOWER and e_score >= beta) \
+                        or (e_bound == UPPER and e_score <= alpha):
+                    return e_score
+
+        moves = b.moves()
+        moves.sort(key=lambda m: self._order_score(b, m, tt_move, ply), reverse=True)
+        alpha0 = alpha
+        best, best_move, legal = -INF, 0, 0
+        for m in moves:
+            if not b.make(m):
+                continue
+            legal += 1
+            score = -self._negamax(b, depth - 1, -beta, -alpha, ply + 1)
+            b.unmake()
+            if score > best:
+                best, best_move = score, m
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not b.sq[(m >> 7) & 127] and not (m >> 14) & 31:
+                            killers = self.killers[ply]
+                            if killers[0] != m:
+                                killers[1], killers[0] = killers[0], m
+                        break
+        if not legal:
+            return -MATE + ply if in_check else 0
+
+        bound = LOWER if best >= beta else UPPER if best <= alpha0 else EXACT
+        stored = best + ply if best > MATE_BOUND else best - ply if best < -MATE_BOUND else best
+        self.tt[b.hash] = (depth, stored, bound, best_move)
+        return best
+
+    def _quiesce(self, b, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & self.CHECK_EVERY:
+            self._tick()
+        stand = b.evaluate()
+        if stand >= beta:
+            return stand
+        if stand > alpha:
+            alpha = stand
+        moves = b.moves(captures_only=True)
+        moves.sort(key=lambda m: self._order_score(b, m, 0, ply), reverse=True)
+        for m in moves:
+            if not b.make(m):
+                continue
+            score = -self._quiesce(b, -beta, -alpha, ply + 1)
+            b.unmake()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
@@ -3,12 +3,16 @@ Connect 4 - Two Player Strategy Game
 =====================================
 Drop pieces to connect 4 in a row!
 
+Connect4CPU plays Yellow against you with the shared alpha-beta search
+(games/board_search.py) on a bitboard position.
+
 Controls:
   Left/Right - Choose column
   Space      - Drop piece
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.board_search import CPUOpponent, Negamax, WIN
 
 
 # Players
@@ -16,6 +20,93 @@ PLAYER_1 = 1  # Red
 PLAYER_2 = 2  # Yellow
 
 
+# Bitboard: column c, row r up from the bottom is bit c * 7 + r; the
+# spare seventh bit per column stops lines wrapping between columns.
+_H = 7
+_BOTTOM = sum(1 << (c * _H) for c in range(7))
+_FULL = _BOTTOM * ((1 << 6) - 1)
+_CENTER_FIRST = (3, 2, 4, 1, 5, 0, 6)
+
+
+def _connected(bits):
+    """Does bits hold four in a row?"""
+    for shift in (1, _H, _H - 1, _H + 1):
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def _threats(bits, mask):
+    """Empty cells that would complete four for bits."""
+    r = (bits << 1) & (bits << 2) & (bits << 3)
+    for shift in (_H, _H - 1, _H + 1):
+        p = (bits << shift) & (bits << (2 * shift))
+        r |= p & (bits << (3 * shift))
+        r |= p & (bits >> shift)
+        p = (bits >> shift) & (bits >> (2 * shift))
+        r |= p & (bits << shift)
+        r |= p & (bits >> (3 * shift))
+    return r & (_FULL ^ mask)
+
+
+class Connect4Position:
+    """Bitboard position: mine holds the side to move's discs, mask all
+    discs. won is set when the previous move connected four."""
+
+    __slots__ = ('mine', 'mask', 'side', 'won')
+
+    def __init__(self, mine, mask, side, won=False):
+        self.mine = mine
+        self.mask = mask
+        self.side = side
+        self.won = won
+
+    @classmethod
+    def from_game(cls, game):
+        mine = mask = 0
+        for row in range(game.ROWS):
+            for col in range(game.COLS):
+                player = game.board[row][col]
+                if player:
+                    bit = 1 << (col * _H + game.ROWS - 1 - row)
+                    mask |= bit
+                    if player == game.current_player:
+                        mine |= bit
+        return cls(mine, mask, game.current_player)
+
+    def moves(self):
+        if self.won:
+            return []
+        return [c for c in _CENTER_FIRST if not self.mask & (1 << (c * _H + 5))]
+
+    def play(self, col):
+        mask = self.mask | (self.mask + (1 << (col * _H)))
+        theirs = self.mine ^ self.mask
+        moved = self.mine | (mask ^ self.mask)
+        return Connect4Position(theirs, mask, 3 - self.side, _connected(moved))
+
+    def evaluate(self):
+        if self.won:
+            return -WIN
+        empty = _FULL ^ self.mask
+        if not empty:
+            return 0
+        theirs = self.mine ^ self.mask
+        mine_t = _threats(self.mine, self.mask)
+        theirs_t = _threats(theirs, self.mask)
+        # A threat we can fill next move wins
+        playable = (self.mask + _BOTTOM) & _FULL
+        if mine_t & playable:
+            return WIN // 2
+        center = 0x7F << (3 * _H)
+        return (mine_t.bit_count() - theirs_t.bit_count()) * 20 \
+            + ((self.mine & center).bit_count() - (theirs & center).bit_count()) * 3
+
+    def key(self):
+        return self.mine + self.mask
+
+
 class Connect4(Game):
     name = "CONNECT FOUR"
     description = "2P Strategy"
@@ -290,3 +381,44 @@ class Connect4(Game):
         # Draw winner text at top
         text_x = (GRID_SIZE - len(winner_text) * 4) // 2
         self.display.draw_text_small(text_x, 2, winner_text, color)
+
+
+class Connect4CPU(CPUOpponent, Connect4):
+    """Connect Four against the computer: you are Red and drop first."""
+
+    name = "CONNECT 4 CPU"
+    description = "1P vs CPU"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'Connect Four against an alpha-beta search on a bitboard. Pick EASY, MEDIUM or HARD; harder levels think longer.',
+    }
+
+    CPU_PLAYER = PLAYER_2
+
+    def reset(self):
+        super().reset()
+        self.reset_cpu()
+
+    def make_searcher(self):
+        return Negamax()
+
+    def cpu_position(self):
+        if self.dropping:
+            return None
+        return Connect4Position.from_game(self)
+
+    def play_cpu_move(self, col):
+        self.cursor_col = col
+        self.dropping = True
+        self.drop_col = col
+        self.drop_row = self.get_drop_row(col)
+        self.drop_y = self.BOARD_Y - self.CELL_SIZE
+
+    def update(self, input_state: InputState, dt: float):
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
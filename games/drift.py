@@ -107,10 +107,11 @@ class Drift(Game):
             self.display.set_pixel(x, SIM_TOP - 1, (40, 40, 40))
 
         # Render terrain + water
-        for y in range(SIM_TOP, H):
-            for x in range(W):
-                c = self.sim.get_combined_color(x, y)
-                self.display.set_pixel(x, y, c)
+        set_pixel = self.display.set_pixel
+        rows = self.sim.combined_colors()[SIM_TOP:H].tolist()
+        for y, row in enumerate(rows, SIM_TOP):
+            for x, c in enumerate(row):
+                set_pixel(x, y, tuple(c))
 
         # Draw springs as pulsing cyan dots
         pulse = int((math.sin(self.blink_timer * 6.0) + 1.0) * 60) + 100
@@ -3,16 +3,109 @@ Go - Ancient Strategy Board Game
 ================================
 Surround territory and capture stones!
 
+Stones, groups, ko/superko and area scoring live in games/go_board.py.
+GoCPU plays White against you with flat Monte Carlo search
+(games/board_search.py): random playouts on copies of that board.
+
 Controls:
   Joystick   - Move cursor (up past top = PASS zone)
   Button     - Place stone / Confirm pass
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
-
-
-BLACK = 1
-WHITE = 2
+from games.board_search import CPUOpponent, MonteCarlo
+from games.go_board import BLACK, WHITE, PASS, GoBoard
+
+
+KOMI = 6.5
+_MAX_PLAYOUT = 3 * 9 * 9   # moves before a playout is scored anyway
+
+
+class GoPosition:
+    """Playout position: a GoBoard, the side to move and consecutive
+    passes. Moves are board points; a side with nothing but its own eyes
+    to fill has the single move PASS."""
+
+    __slots__ = ('board', 'side', 'passes')
+
+    def __init__(self, board, side, passes=0):
+        self.board = board
+        self.side = side
+        self.passes = passes
+
+    @classmethod
+    def from_game(cls, game):
+        # The root keeps the game's history so its moves respect superko
+        return cls(game.board.copy(history=True), game.current_player,
+                   game.consecutive_passes)
+
+    def moves(self):
+        if self.passes >= 2:
+            return []
+        board, color = self.board, self.side
+        legal = [p for p in board.points
+                 if not board.is_eye(p, color) and board.is_legal(p, color)]
+        return legal or [PASS]
+
+    def play(self, p):
+        board = self.board.copy()
+        if p == PASS:
+            board.pass_turn(self.side)
+            return GoPosition(board, 3 - self.side, self.passes + 1)
+        board.play(p, self.side)
+        return GoPosition(board, 3 - self.side)
+
+    def playout(self, rng):
+        """Play random non-eye-filling moves to two passes and return the
+        winner by area and komi."""
+        board = self.board.copy()
+        cells = board.cells
+        color, passes = self.side, self.passes
+        empties = [p for p in board.points if not cells[p]]
+        for _ in range(_MAX_PLAYOUT):
+            if passes >= 2:
+                break
+            # Try empty points in random order until one is playable
+            n = len(empties)
+            played = PASS
+            while n:
+                i = rng.randrange(n)
+                p = empties[i]
+                if not board.is_eye(p, color) and board.is_legal(p, color):
+                    played = p
+                    break
+                n -= 1
+                empties[i], empties[n] = empties[n], empties[i]
+            if played == PASS:
+                passes += 1
+                board.pass_turn(color)
+            else:
+                passes = 0
+                empties.remove(played)
+                empties += board.play(played, color)
+            color = 3 - color
+        return self.winner(board)
+
+    @staticmethod
+    def winner(board):
+        # A finished playout leaves only single-point eyes, so a point's
+        # neighbours tell whose area it is (score() would flood-fill)
+        cells, neighbours = board.cells, board.neighbours
+        area = [0, 0, 0, 0]
+        for p in board.points:
+            v = cells[p]
+            if v:
+                area[v] += 1
+                continue
+            seen = 0
+            for d in neighbours:
+                seen |= 1 << cells[p + d]
+            seen &= (1 << BLACK) | (1 << WHITE)
+            if seen == 1 << BLACK:
+                area[BLACK] += 1
+            elif seen == 1 << WHITE:
+                area[WHITE] += 1
+        return BLACK if area[BLACK] > area[WHITE] + KOMI else WHITE
 
 
 class Go(Game):
@@ -37,8 +130,9 @@ class Go(Game):
         self.state = GameState.PLAYING
         self.score = 0
 
-        # Board: 0 = empty, BLACK = 1, WHITE = 2
-        self.board = [[0] * self.BOARD_SIZE for _ in range(self.BOARD_SIZE)]
+        # Stones, groups, ko and superko history; board.at(x, y) is
+        # 0 = empty, BLACK = 1, WHITE = 2
+        self.board = GoBoard(self.BOARD_SIZE)
 
         self.current_player = BLACK
         self.cursor_x = 4
@@ -51,138 +145,39 @@ class Go(Game):
         # Pass tracking
         self.consecutive_passes = 0
 
-        # Ko rule - prevent immediate recapture
-        self.ko_point = None
-
-        # Previous board state for ko detection
-        self.previous_board = None
-
         self.winner = None
         self.input_cooldown = 0
         self.move_delay = 0.12
 
     def get_group(self, x: int, y: int) -> set:
         """Get all stones connected to the stone at (x, y)."""
-        if self.board[y][x] == 0:
+        if self.board.at(x, y) == 0:
             return set()
-
-        color = self.board[y][x]
-        group = set()
-        to_check = [(x, y)]
-
-        while to_check:
-            cx, cy = to_check.pop()
-            if (cx, cy) in group:
-                continue
-            if not (0 <= cx < self.BOARD_SIZE and 0 <= cy < self.BOARD_SIZE):
-                continue
-            if self.board[cy][cx] != color:
-                continue
-
-            group.add((cx, cy))
-            to_check.extend([(cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)])
-
-        return group
+        return {self.board.xy(p) for p in self.board.group(self.board.point(x, y))}
 
     def get_liberties(self, group: set) -> set:
         """Get all liberties (empty adjacent points) of a group."""
-        liberties = set()
-
-        for x, y in group:
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.BOARD_SIZE and 0 <= ny < self.BOARD_SIZE:
-                    if self.board[ny][nx] == 0:
-                        liberties.add((nx, ny))
-
-        return liberties
-
-    def remove_group(self, group: set) -> int:
-        """Remove a group from the board. Returns number of stones removed."""
-        for x, y in group:
-            self.board[y][x] = 0
-        return len(group)
+        if not group:
+            return set()
+        x, y = next(iter(group))
+        return {self.board.xy(p) for p in self.board.liberties(self.board.point(x, y))}
 
     def is_valid_move(self, x: int, y: int) -> bool:
-        """Check if placing a stone at (x, y) is valid."""
-        # Must be empty
-        if self.board[y][x] != 0:
-            return False
-
-        # Ko rule
-        if self.ko_point == (x, y):
-            return False
-
-        # Simulate the move
-        original_board = [row[:] for row in self.board]
-        self.board[y][x] = self.current_player
-
-        # Check for captures first
-        opponent = WHITE if self.current_player == BLACK else BLACK
-        captured_any = False
-
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.BOARD_SIZE and 0 <= ny < self.BOARD_SIZE:
-                if self.board[ny][nx] == opponent:
-                    adj_group = self.get_group(nx, ny)
-                    if len(self.get_liberties(adj_group)) == 0:
-                        captured_any = True
-
-        # If no captures, check if own group has liberties (suicide rule)
-        if not captured_any:
-            own_group = self.get_group(x, y)
-            if len(self.get_liberties(own_group)) == 0:
-                # Suicide - not allowed
-                self.board = original_board
-                return False
-
-        self.board = original_board
-        return True
+        """Check if placing a stone at (x, y) is valid: empty, not
+        suicide, and not repeating an earlier position (superko, which
+        covers the simple ko recapture)."""
+        return self.board.is_legal(self.board.point(x, y), self.current_player)
 
     def place_stone(self, x: int, y: int) -> bool:
         """Place a stone and handle captures."""
         if not self.is_valid_move(x, y):
             return False
 
-        # Save board for ko detection
-        self.previous_board = [row[:] for row in self.board]
-
-        # Place stone
-        self.board[y][x] = self.current_player
-
-        # Check for captures
-        opponent = WHITE if self.current_player == BLACK else BLACK
-        total_captured = 0
-        captured_point = None
-
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.BOARD_SIZE and 0 <= ny < self.BOARD_SIZE:
-                if self.board[ny][nx] == opponent:
-                    adj_group = self.get_group(nx, ny)
-                    if len(self.get_liberties(adj_group)) == 0:
-                        captured = self.remove_group(adj_group)
-                        total_captured += captured
-                        if captured == 1:
-                            captured_point = list(adj_group)[0]
-
-        # Update captures
+        captured = len(self.board.play(self.board.point(x, y), self.current_player))
         if self.current_player == BLACK:
-            self.black_captures += total_captured
+            self.black_captures += captured
         else:
-            self.white_captures += total_captured
-
-        # Set ko point if exactly one stone was captured
-        if total_captured == 1 and captured_point:
-            # Check if this creates a ko situation
-            own_group = self.get_group(x, y)
-            if len(own_group) == 1 and len(self.get_liberties(own_group)) == 1:
-                self.ko_point = captured_point
-            else:
-                self.ko_point = None
-        else:
-            self.ko_point = None
+            self.white_captures += captured
 
         # Reset pass counter and switch player
         self.consecutive_passes = 0
@@ -193,7 +188,7 @@ class Go(Game):
     def pass_turn(self):
         """Pass the turn."""
         self.consecutive_passes += 1
-        self.ko_point = None
+        self.board.pass_turn(self.current_player)
         self.current_player = WHITE if self.current_player == BLACK else BLACK
 
         if self.consecutive_passes >= 2:
@@ -201,26 +196,7 @@ class Go(Game):
 
     def end_game(self):
         """End the game and calculate scores."""
-        # Simple scoring: captures + territory (empty points surrounded)
-        black_score = self.black_captures
-        white_score = self.white_captures + 6.5  # Komi for white
-
-        # Count territory (simplified - just count empty points with only one color adjacent)
-        for y in range(self.BOARD_SIZE):
-            for x in range(self.BOARD_SIZE):
-                if self.board[y][x] == 0:
-                    adjacent_colors = set()
-                    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < self.BOARD_SIZE and 0 <= ny < self.BOARD_SIZE:
-                            if self.board[ny][nx] != 0:
-                                adjacent_colors.add(self.board[ny][nx])
-
-                    if adjacent_colors == {BLACK}:
-                        black_score += 1
-                    elif adjacent_colors == {WHITE}:
-                        white_score += 1
-
+        black_score, white_score = self.count_score()
         if black_score > white_score:
             self.winner = BLACK
         else:
@@ -230,6 +206,11 @@ class Go(Game):
         self.white_score = white_score
         self.state = GameState.GAME_OVER
 
+    def count_score(self) -> tuple:
+        """(black, white) area score if the game ended now: stones plus
+        surrounded empty regions, komi to White."""
+        return self.board.score(KOMI)
+
     def update(self, input_state: InputState, dt: float):
         if self.state != GameState.PLAYING:
             return
@@ -309,8 +290,8 @@ class Go(Game):
         # Draw stones
         for y in range(self.BOARD_SIZE):
             for x in range(self.BOARD_SIZE):
-                if self.board[y][x] != 0:
-                    self.draw_stone(x, y, self.board[y][x])
+                if self.board.at(x, y) != 0:
+                    self.draw_stone(x, y, self.board.at(x, y))
 
         # Draw cursor
         self.draw_cursor()
@@ -354,7 +335,7 @@ class Go(Game):
         self.display.set_pixel(px + 2, py + 2, cursor_color)
 
         # Show valid move indicator
-        if self.board[self.cursor_y][self.cursor_x] == 0:
+        if self.board.at(self.cursor_x, self.cursor_y) == 0:
             if self.is_valid_move(self.cursor_x, self.cursor_y):
                 # Ghost stone
                 ghost_color = (60, 60, 60) if self.current_player == BLACK else (200, 200, 200)
@@ -397,3 +378,46 @@ class Go(Game):
         self.display.draw_text_small(32, 32, f"W:{self.white_score:.1f}", Colors.GRAY)
 
         self.display.draw_text_small(2, 50, "BTN:RETRY", Colors.DARK_GRAY)
+
+
+class GoCPU(CPUOpponent, Go):
+    """Go against the computer: you are Black and move first."""
+
+    name = "GO CPU"
+    description = "1P vs CPU"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'Go against a Monte Carlo player that tries every move with random games to the end. Pick EASY, MEDIUM or HARD; harder levels play out more games.',
+    }
+
+    CPU_PLAYER = WHITE
+
+    def reset(self):
+        super().reset()
+        self.reset_cpu()
+
+    def make_searcher(self):
+        return MonteCarlo()
+
+    def cpu_position(self):
+        return GoPosition.from_game(self)
+
+    def play_cpu_move(self, p):
+        # Answer a pass with a pass when that already wins
+        if self.consecutive_passes:
+            black, white = self.count_score()
+            if white > black:
+                p = PASS
+        if p == PASS:
+            self.pass_turn()
+            return
+        self.place_stone(*self.board.xy(p))
+
+    def update(self, input_state: InputState, dt: float):
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
@@ -0,0 +1,298 @@
+"""
+Go Board - Incremental board core for Go
+========================================
+Shared by games/go.py: the game itself and GoCPU's random playouts.
+
+Layout
+    A 1D array of (size + 2)^2 points with a one-point EDGE border, so
+    point (x, y) is (y + 1) * W + x + 1 and its neighbours are p +/- 1
+    and p +/- W with no bounds checks.
+
+Groups
+    Union-find over the stones. Each group's root holds its stone count,
+    a circular list of its stones (for removal), the xor of its stones'
+    Zobrist keys and its pseudo-liberties: one per (stone, empty
+    neighbour) pair, with their sum and sum of squares. The count is
+    zero exactly when the group is dead, and all pseudo-liberties are
+    the same point (one real liberty: atari) exactly when
+    count * sum of squares == sum ** 2. All of it updates in O(1) per
+    stone placed, so is_legal() never flood-fills.
+
+Ko
+    ko is the point a lone stone just took a single stone from (the
+    simple ko rule). With a history, every position is also Zobrist
+    hashed together with the side to move, and a move that would repeat
+    one (situational superko) is illegal; is_legal() gets the new hash
+    from the captured groups' xors without playing the move.
+
+Scoring
+    score() is area scoring with numpy: stones plus empty regions that
+    reach only one colour, regions found by repeated dilation.
+"""
+
+import random
+
+import numpy as np
+
+EMPTY, BLACK, WHITE, EDGE = 0, 1, 2, 3
+PASS = -1
+
+_zobrist = {}
+
+
+def _keys(points):
+    """(stone keys per colour, side-to-move key) for a board of points."""
+    keys = _zobrist.get(points)
+    if keys is None:
+        rng = random.Random(points)
+        stones = [None] + [[rng.getrandbits(64) for _ in range(points)]
+                           for _ in (BLACK, WHITE)]
+        keys = _zobrist[points] = (stones, rng.getrandbits(64))
+    return keys
+
+
+class GoBoard:
+    """Stones, groups, ko and position history for one game of Go."""
+
+    def __init__(self, size=9, superko=True):
+        self.size = size
+        self.W = W = size + 2
+        self.points = tuple((y + 1) * W + x + 1 for y in range(size) for x in range(size))
+        self.neighbours = (1, -1, W, -W)
+        self.diagonals = (W + 1, W - 1, -W + 1, -W - 1)
+        n = W * W
+        self.cells = [EDGE] * n
+        for p in self.points:
+            self.cells[p] = EMPTY
+        self.parent = list(range(n))
+        self.next = list(range(n))        # circular stone list per group
+        self.stones = [0] * n
+        self.libs = [0] * n               # pseudo-liberties
+        self.lib_sum = [0] * n
+        self.lib_sq = [0] * n
+        self.group_hash = [0] * n
+        self.zobrist, self.z_white = _keys(n)
+        self.hash = 0
+        self.ko = PASS
+        # Hashes of the positions so far (stones and side to move)
+        self.history = {self.hash} if superko else None
+
+    def copy(self, history=False):
+        """A copy for playing ahead; without the history (simple ko
+        only) unless asked."""
+        b = GoBoard.__new__(GoBoard)
+        b.__dict__.update(self.__dict__)
+        for name in ('cells', 'parent', 'next', 'stones', 'libs',
+                     'lib_sum', 'lib_sq', 'group_hash'):
+            setattr(b, name, getattr(self, name)[:])
+        b.history = set(self.history) if history and self.history is not None else None
+        return b
+
+    def point(self, x, y):
+        return (y + 1) * self.W + x + 1
+
+    def xy(self, p):
+        return p % self.W - 1, p // self.W - 1
+
+    def at(self, x, y):
+        return self.cells[(y + 1) * self.W + x + 1]
+
+    def find(self, p):
+        parent = self.parent
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    def group(self, p):
+        """The stones of p's group."""
+        stones = [p]
+        q = self.next[p]
+        while q != p:
+            stones.append(q)
+            q = self.next[q]
+        return stones
+
+    def liberties(self, p):
+        """The real liberties of p's group."""
+        cells = self.cells
+        return {q + d for q in self.group(p) for d in self.neighbours if cells[q + d] == EMPTY}
+
+    def is_eye(self, p, color):
+        """Empty p is a single-point eye of color: filling it only
+        takes a liberty from its own stones."""
+        cells = self.cells
+        for d in self.neighbours:
+            v = cells[p + d]
+            if v != color and v != EDGE:
+                return False
+        bad = 0
+        edge = False
+        for d in self.diagonals:
+            v = cells[p + d]
+            if v == EDGE:
+                edge = True
+            elif v and v != color:
+                bad += 1
+        return bad < (1 if edge else 2)
+
+    def _atari_at(self, root, p):
+        """Is p the group's only liberty?"""
+        n = self.libs[root]
+        return n and self.lib_sum[root] == n * p and self.lib_sq[root] == n * p * p
+
+    def is_legal(self, p, color):
+        cells = self.cells
+        if cells[p] != EMPTY or p == self.ko:
+            return False
+        history = self.history
+        if history is None:
+            # Without superko an empty neighbour settles it
+            for d in self.neighbours:
+                if cells[p + d] == EMPTY:
+                    return True
+        other = 3 - color
+        alive = False
+        h = self.hash ^ self.zobrist[color][p]
+        taken = set()
+        for d in self.neighbours:
+            q = p + d
+            v = cells[q]
+            if v == EMPTY:
+                alive = True
+            elif v == color:
+                if not self._atari_at(self.find(q), p):
+                    alive = True
+            elif v == other:
+                root = self.find(q)
+                if root not in taken and self._atari_at(root, p):
+                    taken.add(root)
+                    h ^= self.group_hash[root]
+                    alive = True
+        if not alive:
+            return False            # suicide
+        if history is not None:
+            if other == WHITE:
+                h ^= self.z_white
+            if h in history:
+                return False
+        return True
+
+    def legal_moves(self, color):
+        return [p for p in self.points if self.is_legal(p, color)]
+
+    def play(self, p, color):
+        """Place a stone (the move must be legal). Returns the captured
+        points."""
+        cells, libs, lib_sum, lib_sq = self.cells, self.libs, self.lib_sum, self.lib_sq
+        find = self.find
+        z = self.zobrist[color][p]
+        cells[p] = color
+        self.hash ^= z
+        self.parent[p] = p
+        self.next[p] = p
+        self.stones[p] = 1
+        libs[p] = lib_sum[p] = lib_sq[p] = 0
+        self.group_hash[p] = z
+
+        for d in self.neighbours:
+            q = p + d
+            if cells[q] == EMPTY:
+                libs[p] += 1
+                lib_sum[p] += q
+                lib_sq[p] += q * q
+        other = 3 - color
+        root = p
+        enemies = []
+        for d in self.neighbours:
+            q = p + d
+            v = cells[q]
+            if v == color or v == other:
+                r = find(q)
+                libs[r] -= 1
+                lib_sum[r] -= p
+                lib_sq[r] -= p * p
+                if v == other:
+                    enemies.append(r)
+                elif r != root:
+                    root = self._union(root, r)
+
+        # Enemy groups don't merge here, so r is still each one's root
+        captured = []
+        for r in enemies:
+            if cells[r] == other and libs[r] == 0:
+                captured += self._remove(r)
+
+        if len(captured) == 1 and self.stones[root] == 1 and libs[root] == 1:
+            self.ko = captured[0]
+        else:
+            self.ko = PASS
+        self._record(other)
+        return captured
+
+    def pass_turn(self, color):
+        self.ko = PASS
+        self._record(3 - color)
+
+    def _record(self, to_move):
+        if self.history is not None:
+            self.history.add(self.hash ^ self.z_white if to_move == WHITE else self.hash)
+
+    def _union(self, a, b):
+        """Merge two groups by their roots; returns the new root."""
+        if self.stones[a] < self.stones[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.stones[a] += self.stones[b]
+        self.libs[a] += self.libs[b]
+        self.lib_sum[a] += self.lib_sum[b]
+        self.lib_sq[a] += self.lib_sq[b]
+        self.group_hash[a] ^= self.group_hash[b]
+        nxt = self.next
+        nxt[a], nxt[b] = nxt[b], nxt[a]
+        return a
+
+    def _remove(self, root):
+        stones = self.group(root)
+        cells = self.cells
+        for s in stones:
+            cells[s] = EMPTY
+        self.hash ^= self.group_hash[root]
+        find, libs, lib_sum, lib_sq = self.find, self.libs, self.lib_sum, self.lib_sq
+        for s in stones:
+            for d in self.neighbours:
+                q = s + d
+                if cells[q] == BLACK or cells[q] == WHITE:
+                    r = find(q)
+                    libs[r] += 1
+                    lib_sum[r] += s
+                    lib_sq[r] += s * s
+        return stones
+
+    def grid(self):
+        """The stones as a size x size array (row y, column x)."""
+        W = self.W
+        return np.array(self.cells, dtype=np.int8).reshape(W, W)[1:-1, 1:-1]
+
+    def score(self, komi=0.0):
+        """(black, white) area: stones plus empty points that reach
+        stones of that colour only, komi added to White."""
+        grid = self.grid()
+        empty = grid == EMPTY
+        reach = {}
+        for color in (BLACK, WHITE):
+            r = grid == color
+            while True:
+                grown = r.copy()
+                grown[1:] |= r[:-1]
+                grown[:-1] |= r[1:]
+                grown[:, 1:] |= r[:, :-1]
+                grown[:, :-1] |= r[:, 1:]
+                grown &= empty | (grid == color)
+                if (grown == r).all():
+                    break
+                r = grown
+            reach[color] = r & empty
+        black = int((grid == BLACK).sum() + (reach[BLACK] & ~reach[WHITE]).sum())
+        white = int((grid == WHITE).sum() + (reach[WHITE] & ~reach[BLACK]).sum())
+        return black, white + komi
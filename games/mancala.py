@@ -3,17 +3,93 @@ Mancala - Ancient Strategy Game
 ===============================
 Sow seeds around the board and capture the most!
 
+MancalaCPU plays the top row against you with the shared alpha-beta
+search (games/board_search.py); an extra turn keeps the same side to
+move, which the search handles without flipping sign.
+
 Controls:
   Left/Right - Select pit
   Space      - Sow seeds from selected pit
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.board_search import CPUOpponent, Negamax, result_score
 
 
 PLAYER_1 = 1  # Bottom row
 PLAYER_2 = 2  # Top row
 
+# Board positions in sowing order: 0-5 P1 pits, 6 P1 store, 7-12 P2 pits
+# (pits array index + 1), 13 P2 store
+_STORE = {PLAYER_1: 6, PLAYER_2: 13}
+_PITS = {PLAYER_1: range(0, 6), PLAYER_2: range(7, 13)}
+
+
+class MancalaPosition:
+    """The 14 counts in sowing order plus the side to move. Moves are
+    Mancala.pits indices, like sow_seeds() takes."""
+
+    __slots__ = ('board', 'side', 'over')
+
+    def __init__(self, board, side, over=False):
+        self.board = board
+        self.side = side
+        self.over = over
+
+    @classmethod
+    def from_game(cls, game):
+        p = game.pits
+        return cls(tuple(p[:6]) + (game.store1,) + tuple(p[6:]) + (game.store2,),
+                   game.current_player)
+
+    def moves(self):
+        if self.over:
+            return []
+        board, store = self.board, _STORE[self.side]
+        pits = [p for p in _PITS[self.side] if board[p]]
+        # Sowing that ends in our store (an extra turn) first
+        pits.sort(key=lambda p: (board[p] % 13) != store - p)
+        return [p if p < 6 else p - 1 for p in pits]
+
+    def play(self, pit):
+        board = list(self.board)
+        side = self.side
+        store = _STORE[side]
+        skip = _STORE[3 - side]
+        pos = pit if pit < 6 else pit + 1
+        seeds, board[pos] = board[pos], 0
+        while seeds:
+            pos = (pos + 1) % 14
+            if pos == skip:
+                continue
+            board[pos] += 1
+            seeds -= 1
+
+        if pos != store and pos in _PITS[side] and board[pos] == 1 and board[12 - pos]:
+            board[store] += 1 + board[12 - pos]
+            board[pos] = board[12 - pos] = 0
+
+        over = not any(board[0:6]) or not any(board[7:13])
+        if over:
+            board[6] += sum(board[0:6])
+            board[13] += sum(board[7:13])
+            board[0:6] = [0] * 6
+            board[7:13] = [0] * 6
+        next_side = side if pos == store else 3 - side
+        return MancalaPosition(tuple(board), next_side, over)
+
+    def evaluate(self):
+        board, side = self.board, self.side
+        mine, theirs = board[_STORE[side]], board[_STORE[3 - side]]
+        if self.over:
+            return result_score(mine - theirs)
+        on_mine = sum(board[p] for p in _PITS[side])
+        on_theirs = sum(board[p] for p in _PITS[3 - side])
+        return (mine - theirs) * 4 + on_mine - on_theirs
+
+    def key(self):
+        return (self.board, self.side)
+
 
 class Mancala(Game):
     name = "MANCALA"
@@ -403,3 +479,39 @@ class Mancala(Game):
         else:
             self.display.draw_text_small(4, 38, " PLAY AGAIN", Colors.GRAY)
             self.display.draw_text_small(4, 48, ">MENU", Colors.YELLOW)
+
+
+class MancalaCPU(CPUOpponent, Mancala):
+    """Mancala against the computer: you sow the bottom row first."""
+
+    name = "MANCALA CPU"
+    description = "1P vs CPU"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'Mancala against an alpha-beta search that plans around extra turns and captures. Pick EASY, MEDIUM or HARD; harder levels think longer.',
+    }
+
+    CPU_PLAYER = PLAYER_2
+
+    def reset(self):
+        super().reset()
+        self.reset_cpu()
+
+    def make_searcher(self):
+        return Negamax()
+
+    def cpu_position(self):
+        return MancalaPosition.from_game(self)
+
+    def play_cpu_move(self, pit):
+        self.selected_pit = pit - 6
+        self.sow_seeds(pit)
+
+    def update(self, input_state: InputState, dt: float):
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
@@ -3,12 +3,16 @@ Othello (Reversi) - Two Player Strategy Game
 =============================================
 Flip your opponent's pieces by sandwiching them!
 
+OthelloCPU plays White against you with the shared alpha-beta search
+(games/board_search.py) on a pair of 64-bit bitboards.
+
 Controls:
   Arrow Keys - Move cursor
   Space      - Place piece
 """
 
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from games.board_search import CPUOpponent, Negamax, result_score
 
 
 # Players
@@ -16,6 +20,128 @@ PLAYER_1 = 1  # Red (goes first)
 PLAYER_2 = 2  # White
 
 
+# Bitboards: bit row * 8 + col. Each direction is a shift plus the mask
+# that drops discs which wrapped around a board edge.
+_ALL = (1 << 64) - 1
+_NOT_A = 0xFEFEFEFEFEFEFEFE   # clear column 0 (after a shift right-wards)
+_NOT_H = 0x7F7F7F7F7F7F7F7F   # clear column 7
+_DIRECTIONS = ((1, _NOT_A), (-1, _NOT_H), (8, _ALL), (-8, _ALL),
+               (9, _NOT_A), (7, _NOT_H), (-7, _NOT_A), (-9, _NOT_H))
+_PASS = -1
+
+_CORNERS = 0x8100000000000081
+# Squares diagonally next to an empty corner give it away
+_X_SQUARES = ((0, 9), (7, 14), (56, 49), (63, 54))
+# Static square weights, corners high and their neighbours low
+_WEIGHTS = (
+    (100, -20, 10, 5, 5, 10, -20, 100),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (10, -2, 1, 1, 1, 1, -2, 10),
+    (5, -2, 1, 0, 0, 1, -2, 5),
+    (5, -2, 1, 0, 0, 1, -2, 5),
+    (10, -2, 1, 1, 1, 1, -2, 10),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (100, -20, 10, 5, 5, 10, -20, 100),
+)
+# Move order: by square weight, best first
+_ORDER = sorted(range(64), key=lambda sq: -_WEIGHTS[sq >> 3][sq & 7])
+# _ROW_SUMS[row][byte]: total weight of the discs in one row's byte
+_ROW_SUMS = [[sum(w for col, w in enumerate(weights) if byte >> col & 1)
+              for byte in range(256)] for weights in _WEIGHTS]
+
+
+def _shift(bits, n, mask):
+    return ((bits << n) if n > 0 else (bits >> -n)) & mask
+
+
+def _move_mask(mine, theirs):
+    """Bitboard of the empty squares mine can play on."""
+    empty = _ALL ^ (mine | theirs)
+    moves = 0
+    for n, mask in _DIRECTIONS:
+        x = _shift(mine, n, mask) & theirs
+        for _ in range(5):
+            x |= _shift(x, n, mask) & theirs
+        moves |= _shift(x, n, mask) & empty
+    return moves
+
+
+def _flips(mine, theirs, bit):
+    flips = 0
+    for n, mask in _DIRECTIONS:
+        line = 0
+        x = _shift(bit, n, mask)
+        while x & theirs:
+            line |= x
+            x = _shift(x, n, mask)
+        if x & mine:
+            flips |= line
+    return flips
+
+
+class OthelloPosition:
+    """Bitboard position from the side to move: mine / theirs discs.
+    A side with no move but whose opponent can move has the single move
+    _PASS; the game is over when neither can move."""
+
+    __slots__ = ('mine', 'theirs', 'side')
+
+    def __init__(self, mine, theirs, side):
+        self.mine = mine
+        self.theirs = theirs
+        self.side = side
+
+    @classmethod
+    def from_game(cls, game):
+        mine = theirs = 0
+        for row in range(8):
+            for col in range(8):
+                player = game.board[row][col]
+                if player == game.current_player:
+                    mine |= 1 << (row * 8 + col)
+                elif player:
+                    theirs |= 1 << (row * 8 + col)
+        return cls(mine, theirs, game.current_player)
+
+    def moves(self):
+        legal = _move_mask(self.mine, self.theirs)
+        if legal:
+            return [sq for sq in _ORDER if legal >> sq & 1]
+        if _move_mask(self.theirs, self.mine):
+            return [_PASS]
+        return []
+
+    def play(self, sq):
+        if sq == _PASS:
+            return OthelloPosition(self.theirs, self.mine, 3 - self.side)
+        bit = 1 << sq
+        flips = _flips(self.mine, self.theirs, bit)
+        return OthelloPosition(self.theirs ^ flips, self.mine | flips | bit,
+                               3 - self.side)
+
+    def evaluate(self):
+        mine, theirs = self.mine, self.theirs
+        my_moves = _move_mask(mine, theirs)
+        their_moves = _move_mask(theirs, mine)
+        if not my_moves and not their_moves:
+            return result_score(mine.bit_count() - theirs.bit_count())
+        score = 0
+        for row, sums in enumerate(_ROW_SUMS):
+            score += sums[mine >> (row * 8) & 255] - sums[theirs >> (row * 8) & 255]
+        # X-squares only hurt while their corner is still open
+        for corner, x in _X_SQUARES:
+            if (mine | theirs) >> corner & 1:
+                if mine >> x & 1:
+                    score += 50
+                elif theirs >> x & 1:
+                    score -= 50
+        score += 8 * (my_moves.bit_count() - their_moves.bit_count())
+        return score
+
+    def key(self):
+        return (self.mine, self.theirs)
+
+
 class Othello(Game):
     name = "REVERSI"
     description = "2P Strategy"
@@ -379,3 +505,44 @@ class Othello(Game):
 
         self.display.draw_text_small(2, 34, self.game_over_reason, Colors.WHITE)
         self.display.draw_text_small(2, 50, "BTN:AGAIN", Colors.DARK_GRAY)
+
+
+class OthelloCPU(CPUOpponent, Othello):
+    """Reversi against the computer: you are Red and move first."""
+
+    name = "REVERSI CPU"
+    description = "1P vs CPU"
+    category = "2_player"
+    GUIDE = {
+        'desc': 'Reversi against an alpha-beta search on bitboards that values corners and mobility. Pick EASY, MEDIUM or HARD; harder levels think longer.',
+    }
+
+    CPU_PLAYER = PLAYER_2
+
+    def reset(self):
+        super().reset()
+        self.reset_cpu()
+
+    def make_searcher(self):
+        return Negamax()
+
+    def cpu_position(self):
+        if self.flipping:
+            return None
+        return OthelloPosition.from_game(self)
+
+    def play_cpu_move(self, sq):
+        # The game passes for a side with no moves, so the CPU always
+        # has a square to play here
+        col, row = sq & 7, sq >> 3
+        self.cursor_x, self.cursor_y = col, row
+        self.make_move(col, row)
+
+    def update(self, input_state: InputState, dt: float):
+        if self.update_cpu(input_state, dt):
+            return
+        super().update(input_state, dt)
+
+    def draw(self):
+        super().draw()
+        self.draw_cpu()
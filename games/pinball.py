@@ -16,6 +16,7 @@ Controls:
 import math
 import random
 from arcade import Game, GameState, Display, Colors, InputState
+from games.table_physics import StaticGeometry, closest_point_on_segment, move_ball
 
 # Phases
 PHASE_PLUNGER = 0
@@ -104,15 +105,6 @@ CAMERA_LEAD = 0.15
 # Geometry helpers
 # ---------------------------------------------------------------------------
 
-def _closest_point_on_seg(px, py, x0, y0, x1, y1):
-    dx, dy = x1 - x0, y1 - y0
-    len_sq = dx * dx + dy * dy
-    if len_sq < 0.0001:
-        return x0, y0
-    t = max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / len_sq))
-    return x0 + t * dx, y0 + t * dy
-
-
 def _dot(ax, ay, bx, by):
     return ax * bx + ay * by
 
@@ -199,6 +191,22 @@ def _build_wall_segments():
 
 WALL_SEGMENTS = _build_wall_segments()
 
+# Ball center keeps this far from wall center lines
+WALL_CONTACT = BALL_RADIUS + 0.5
+
+
+def _build_wall_geometry():
+    geometry = StaticGeometry(cell_size=16)
+    for seg in WALL_SEGMENTS:
+        geometry.add_segment(*seg)
+    return geometry
+
+WALL_GEOMETRY = _build_wall_geometry()
+
+
+def _wall_bounce(shape, nx, ny, bvx, bvy):
+    return _basic_collision(bvx, bvy, nx, ny, WALL_ELASTICITY, WALL_SMOOTHNESS)
+
 
 # ===========================================================================
 # Flipper
@@ -240,7 +248,7 @@ class Flipper:
     def collide_ball(self, bx, by, bvx, bvy):
         """SC-style: distance-scaled momentum, front/back distinction."""
         tx, ty = self.tip()
-        cx, cy = _closest_point_on_seg(bx, by, self.px, self.py, tx, ty)
+        cx, cy = closest_point_on_segment(bx, by, self.px, self.py, tx, ty)
         dx, dy = bx - cx, by - cy
         dist = _mag(dx, dy)
         min_dist = BALL_RADIUS + 1.5
@@ -517,10 +525,6 @@ class Pinball(Game):
         # Field effect (gravity + drag)
         self._field_effect(dt)
 
-        # Move ball
-        self.ball_x += self.ball_vx * dt
-        self.ball_y += self.ball_vy * dt
-
         # Speed cap
         spd = _mag(self.ball_vx, self.ball_vy)
         if spd > SPEED_CAP:
@@ -528,6 +532,16 @@ class Pinball(Game):
             self.ball_vx *= f
             self.ball_vy *= f
 
+        # Move ball. On the playfield it is swept against the walls, so
+        # even at the speed cap it cannot step across a thin one
+        if self.in_chute:
+            self.ball_x += self.ball_vx * dt
+            self.ball_y += self.ball_vy * dt
+        else:
+            self.ball_x, self.ball_y, self.ball_vx, self.ball_vy = move_ball(
+                WALL_GEOMETRY, self.ball_x, self.ball_y,
+                self.ball_vx, self.ball_vy, dt, WALL_CONTACT, _wall_bounce)
+
         # Collisions
         self._collide_walls()
         self._collide_bumpers()
@@ -564,21 +578,15 @@ class Pinball(Game):
                     self.skill_shot_active = False
             return
 
-        # Main playfield walls — use line segment collisions for everything
-        for x0, y0, x1, y1 in WALL_SEGMENTS:
-            cx, cy = _closest_point_on_seg(
-                self.ball_x, self.ball_y, x0, y0, x1, y1)
-            dx, dy = self.ball_x - cx, self.ball_y - cy
-            dist = _mag(dx, dy)
-            min_dist = BALL_RADIUS + 0.5
-            if dist < min_dist and dist > 0.001:
-                nx, ny = dx / dist, dy / dist
-                overlap = min_dist - dist
-                self.ball_x += nx * overlap
-                self.ball_y += ny * overlap
-                self.ball_vx, self.ball_vy = _basic_collision(
-                    self.ball_vx, self.ball_vy, nx, ny,
-                    WALL_ELASTICITY, WALL_SMOOTHNESS)
+        # Main playfield walls — push out of any the ball was shoved into
+        # by a flipper or bumper; the sweep in _physics_step handles travel
+        for _, nx, ny, overlap in WALL_GEOMETRY.overlaps(
+                self.ball_x, self.ball_y, WALL_CONTACT):
+            self.ball_x += nx * overlap
+            self.ball_y += ny * overlap
+            self.ball_vx, self.ball_vy = _basic_collision(
+                self.ball_vx, self.ball_vy, nx, ny,
+                WALL_ELASTICITY, WALL_SMOOTHNESS)
 
         # Extra: right boundary below chute top (the divider wall)
         if self.ball_y >= PLUNGER_CHUTE_TOP:
@@ -664,7 +672,7 @@ class Pinball(Game):
         # Left slingshot — only fires when ball approaches from right (vx < 0)
         if (8 < self.ball_x < 14 and 140 < self.ball_y < 168 and
                 self.sling_l_timer <= 0 and self.ball_vx < -5):
-            cx, cy = _closest_point_on_seg(
+            cx, cy = closest_point_on_segment(
                 self.ball_x, self.ball_y, 8, 152, 14, 168)
             dx, dy = self.ball_x - cx, self.ball_y - cy
             dist = _mag(dx, dy)
@@ -678,7 +686,7 @@ class Pinball(Game):
         # Right slingshot — only fires when ball approaches from left (vx > 0)
         if (49 < self.ball_x < 55 and 140 < self.ball_y < 168 and
                 self.sling_r_timer <= 0 and self.ball_vx > 5):
-            cx, cy = _closest_point_on_seg(
+            cx, cy = closest_point_on_segment(
                 self.ball_x, self.ball_y, 55, 152, 49, 168)
             dx, dy = self.ball_x - cx, self.ball_y - cy
             dist = _mag(dx, dy)
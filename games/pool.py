@@ -13,6 +13,7 @@ Controls:
 import math
 import random
 from arcade import Game, GameState, Display, Colors, InputState
+from games.table_physics import resolve_pairs, slide
 
 # Phases (internal, all under GameState.PLAYING)
 PHASE_MODE_SELECT = 0
@@ -193,21 +194,8 @@ class Pool(Game):
             if not ball.active or not ball.moving():
                 continue
 
-            # Move
-            ball.x += ball.vx * dt
-            ball.y += ball.vy * dt
-
-            # Friction
-            spd = ball.speed()
-            if spd > 0:
-                decel = FRICTION * dt
-                new_spd = max(0, spd - decel)
-                factor = new_spd / spd
-                ball.vx *= factor
-                ball.vy *= factor
-                if new_spd < MIN_SPEED:
-                    ball.vx = 0.0
-                    ball.vy = 0.0
+            # Move, with rolling friction
+            slide(ball, dt, FRICTION, MIN_SPEED)
 
             # Cushion bounces (skip near pockets)
             if not self._near_pocket(ball.x, ball.y):
@@ -260,34 +248,7 @@ class Pool(Game):
                     self.pocketed_this_shot.append(ball.num)
 
         # Ball-to-ball collisions (elastic, equal mass)
-        active = [b for b in self.balls if b.active]
-        for i in range(len(active)):
-            for j in range(i + 1, len(active)):
-                a = active[i]
-                b = active[j]
-                dx = b.x - a.x
-                dy = b.y - a.y
-                dist_sq = dx * dx + dy * dy
-                min_dist = BALL_COLLISION_DIST
-                if dist_sq < min_dist * min_dist and dist_sq > 0:
-                    dist = math.sqrt(dist_sq)
-                    nx = dx / dist
-                    ny = dy / dist
-
-                    # Separate overlapping balls
-                    overlap = min_dist - dist
-                    a.x -= nx * overlap * 0.5
-                    a.y -= ny * overlap * 0.5
-                    b.x += nx * overlap * 0.5
-                    b.y += ny * overlap * 0.5
-
-                    # Elastic collision (equal mass: swap normal components)
-                    rel_vn = (b.vx - a.vx) * nx + (b.vy - a.vy) * ny
-                    if rel_vn < 0:  # approaching
-                        a.vx += rel_vn * nx
-                        a.vy += rel_vn * ny
-                        b.vx -= rel_vn * nx
-                        b.vy -= rel_vn * ny
+        resolve_pairs([b for b in self.balls if b.active], BALL_COLLISION_DIST)
 
     def _fire_shot(self):
         cue = self._cue_ball()
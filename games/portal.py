@@ -14,7 +14,11 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from arcade import Game, GameState, InputState, Display, Colors, GRID_SIZE
+from raycast import cast, ray_offsets, row_distances, shade, wall_rows
 
 # ═══════════════════════════════════════════════════════════════════
 #  Constants
@@ -317,13 +321,15 @@ class Portal(Game):
         self.elevation = 0.0
 
         # Ray offsets (precomputed)
-        self.ray_offsets = [(col / GRID_SIZE - 0.5) * FOV for col in range(GRID_SIZE)]
+        self.ray_offsets = ray_offsets(GRID_SIZE, FOV)
 
         # Current room state
         self.map = []
         self.map_w = 12
         self.map_h = 12
         self.floor_marks = {}
+        self.grid = np.zeros((12, 12), dtype=np.uint8)
+        self.mark_grid = np.zeros((12, 12), dtype=np.uint8)
 
         # Portals: None or (cell_x, cell_y, face, height)
         self.blue_portal = None
@@ -366,6 +372,12 @@ class Portal(Game):
         self.floor_marks[(ex, ey)] = EXIT_MARK
         self.exit_pos = (ex, ey)
 
+        # Array copies for the raycaster
+        self.grid = np.array(self.map, dtype=np.uint8)
+        self.mark_grid = np.zeros_like(self.grid)
+        for (mx, my), mark in self.floor_marks.items():
+            self.mark_grid[my, mx] = mark
+
         # Player spawn
         px, py, pa = defn['entry']
         self.px = px + 0.5
@@ -431,61 +443,18 @@ class Portal(Game):
 
     def _shoot_portal(self, color):
         """Cast ray and place portal on first portalable wall hit."""
-        cos_a = math.cos(self.pa)
-        sin_a = math.sin(self.pa)
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        map_x = int(self.px)
-        map_y = int(self.py)
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
+        hits = cast(self.grid, self.px, self.py, [self.pa])
+        if not hits.hit[0] or hits.cell[0] != P:
+            return
+        portal = (int(hits.map_x[0]), int(hits.map_y[0]), int(hits.face[0]), 0.0)
+        if color == 'blue':
+            if self.orange_portal != portal:
+                self.blue_portal = portal
         else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        side = 0
-        for _ in range(64):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-
-            if map_x < 0 or map_x >= self.map_w or map_y < 0 or map_y >= self.map_h:
-                break
-            if self._cell(map_x, map_y) != 0:
-                if self._is_portalable(map_x, map_y):
-                    if side == 0:
-                        face = 3 if step_x > 0 else 1
-                    else:
-                        face = 0 if step_y > 0 else 2
-                    portal = (map_x, map_y, face, 0.0)
-                    if color == 'blue':
-                        if self.orange_portal != portal:
-                            self.blue_portal = portal
-                    else:
-                        if self.blue_portal != portal:
-                            self.orange_portal = portal
-                    self.shoot_flash = 0.15
-                    self.shoot_color = BLUE_PORTAL if color == 'blue' else ORANGE_PORTAL
-                break
+            if self.blue_portal != portal:
+                self.orange_portal = portal
+        self.shoot_flash = 0.15
+        self.shoot_color = BLUE_PORTAL if color == 'blue' else ORANGE_PORTAL
 
     def _has_portal(self, cell_x, cell_y, face):
         if self.blue_portal and self.blue_portal[:3] == (cell_x, cell_y, face):
@@ -734,10 +703,10 @@ class Portal(Game):
             return
 
         # Render 3D view
-        eye_h = self.elevation + 0.5
-        for col in range(GRID_SIZE):
-            ray_angle = self.pa + self.ray_offsets[col]
-            self._cast_ray(col, ray_angle, eye_h)
+        set_pixel = self.display.set_pixel
+        for y, row in enumerate(self._render_view().tolist()):
+            for x, rgb in enumerate(row):
+                set_pixel(x, y, tuple(rgb))
 
         # Bullets
         if self.bullets:
@@ -807,200 +776,128 @@ class Portal(Game):
         # Minimap
         self._draw_minimap()
 
-    def _cast_ray(self, col, angle, eye_h):
-        """DDA raycaster — renders one column."""
-        cos_a = math.cos(angle)
-        sin_a = math.sin(angle)
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        map_x = int(self.px)
-        map_y = int(self.py)
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
-        else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        hit = False
-        side = 0
-        hit_cell = 0
-        for _ in range(64):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-
-            if map_x < 0 or map_x >= self.map_w or map_y < 0 or map_y >= self.map_h:
-                break
-            cell = self._cell(map_x, map_y)
-            if cell != 0:
-                hit = True
-                hit_cell = cell
-                break
-
-        if not hit:
-            for y in range(HALF):
-                self.display.set_pixel(col, y, (30, 30, 45))
-            for y in range(HALF, GRID_SIZE):
-                self._floor_pixel(col, y, cos_a, sin_a, eye_h)
-            return
+    def _render_view(self):
+        """Raycast every column at once into a (GRID_SIZE, GRID_SIZE, 3)
+        frame: ceiling, fogged procedural walls, and the cast floor."""
+        hits = cast(self.grid, self.px, self.py, self.pa + self.ray_offsets)
+        dist = hits.dist
 
-        # Perpendicular distance
-        if side == 0:
-            perp_dist = (map_x - self.px + (1 - step_x) / 2) / cos_a
-        else:
-            perp_dist = (map_y - self.py + (1 - step_y) / 2) / sin_a
-        if perp_dist < 0.01:
-            perp_dist = 0.01
+        # Floor everywhere below the horizon, ceiling above; walls on top
+        frame = self._floor_rows(hits.cos, hits.sin, self.elevation + 0.5)
+        frame[:HALF] = (30, 30, 45)
 
         wh = WALL_HEIGHT
-        scale = GRID_SIZE / perp_dist
-        screen_top = int(HALF - wh * scale / 2)
-        screen_bot = int(HALF + wh * scale / 2)
-        draw_start = max(0, screen_top)
-        draw_end = min(GRID_SIZE - 1, screen_bot)
-        line_height = max(1, screen_bot - screen_top)
-
-        # Texture u
-        if side == 0:
-            wall_x = self.py + perp_dist * sin_a
-        else:
-            wall_x = self.px + perp_dist * cos_a
-        wall_x -= int(wall_x)
+        scale = GRID_SIZE / dist
+        screen_top = (HALF - wh * scale / 2).astype(np.int64)
+        screen_bot = (HALF + wh * scale / 2).astype(np.int64)
+        line_height = np.maximum(1, screen_bot - screen_top)
+        wall = wall_rows(np.maximum(0, screen_top),
+                         np.minimum(GRID_SIZE - 1, screen_bot),
+                         GRID_SIZE) & hits.hit
 
         # Fog + side shading
-        fog = min(1.0, 2.5 / (perp_dist + 0.5))
-        if side == 1:
-            fog *= 0.75
-
-        # Portal check
-        if side == 0:
-            face = 3 if step_x > 0 else 1
-        else:
-            face = 0 if step_y > 0 else 2
-        portal_info = None
-        portal_hit = self._has_portal(map_x, map_y, face)
-        if portal_hit and wh > 0:
-            p_color, p_height = portal_hit
-            pv_top = max(0.0, (wh - (p_height + 1.0)) / wh)
-            pv_bot = min(1.0, (wh - p_height) / wh)
-            portal_info = (p_color, pv_top, pv_bot)
-
-        # Ceiling
-        for y in range(0, draw_start):
-            self.display.set_pixel(col, y, (30, 30, 45))
-
-        # Wall
-        for y in range(draw_start, draw_end + 1):
-            v = (y - screen_top) / line_height if line_height > 0 else 0.5
-            r, g, b = self._wall_pixel(hit_cell, wall_x, v, portal_info)
-            self.display.set_pixel(col, y, (int(r * fog), int(g * fog), int(b * fog)))
-
-        # Floor
-        for y in range(draw_end + 1, GRID_SIZE):
-            self._floor_pixel(col, y, cos_a, sin_a, eye_h)
-
-    def _floor_pixel(self, col, y, cos_a, sin_a, eye_h):
-        """Render one floor pixel with floor casting."""
-        p = y - HALF
-        if p <= 0:
-            self.display.set_pixel(col, y, (13, 10, 8))
-            return
-        row_dist = eye_h * GRID_SIZE / p
-        if row_dist <= 0:
-            self.display.set_pixel(col, y, (5, 2, 2))
-            return
+        fog = np.minimum(1.0, 2.5 / (dist + 0.5))
+        fog[hits.side == 1] *= 0.75
+
+        u = np.broadcast_to(hits.wall_x, (GRID_SIZE, GRID_SIZE))
+        v = (np.arange(GRID_SIZE)[:, np.newaxis] - screen_top) / line_height
+        rgb = self._wall_pixels(hits, u, v)
+        frame[wall] = shade(rgb, fog)[wall]
+        return frame
+
+    def _floor_rows(self, cos_a, sin_a, eye_h):
+        """Floor casting for every pixel: each row sees the floor at one
+        distance, so the world position is a row-by-column outer product."""
+        frame = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        frame[:] = (13, 10, 8)            # the horizon row itself
+        if eye_h <= 0:
+            frame[HALF + 1:] = (5, 2, 2)
+            return frame
+        row_dist = row_distances(GRID_SIZE, HALF, eye_h)[HALF + 1:, np.newaxis]
         fx = self.px + cos_a * row_dist
         fy = self.py + sin_a * row_dist
-        fcx, fcy = int(fx), int(fy)
-        mark = self.floor_marks.get((fcx, fcy))
-        fog_f = min(1.0, 2.0 / (row_dist + 0.5))
-        if mark == GOO:
+        fcx = fx.astype(np.int64)
+        fcy = fy.astype(np.int64)
+        fog_f = np.minimum(1.0, 2.0 / (row_dist + 0.5))
+
+        checker = (fcx + fcy) % 2
+        base = np.where(checker == 0, 45, 35)
+        floor = np.empty(fx.shape + (3,), dtype=np.uint8)
+        floor[..., 0] = (base + 5) * fog_f
+        floor[..., 1] = (base + 2) * fog_f
+        floor[..., 2] = base * fog_f
+
+        inside = (fcx >= 0) & (fcx < self.map_w) & (fcy >= 0) & (fcy < self.map_h)
+        mark = np.zeros(fx.shape, dtype=np.uint8)
+        mark[inside] = self.mark_grid[fcy[inside], fcx[inside]]
+        if mark.any():
             # Toxic green goo — bright and pulsing
-            pulse = 0.8 + 0.2 * math.sin(self.time * 6.0 + fx * 2)
-            r = int(30 * fog_f * pulse)
-            g = int(200 * fog_f * pulse)
-            b = int(40 * fog_f * pulse)
-        elif mark == EXIT_MARK:
+            goo = mark == GOO
+            pulse = 0.8 + 0.2 * np.sin(self.time * 6.0 + fx[goo] * 2)
+            fg = fog_f[np.nonzero(goo)[0], 0]
+            floor[goo] = np.stack([30 * fg * pulse, 200 * fg * pulse,
+                                   40 * fg * pulse], axis=-1).astype(np.uint8)
+            exit_ = mark == EXIT_MARK
             pulse = 0.7 + 0.3 * math.sin(self.time * 4.0)
-            r = int(30 * fog_f * pulse)
-            g = int(220 * fog_f * pulse)
-            b = int(30 * fog_f * pulse)
-        else:
-            checker = (fcx + fcy) % 2
-            base = 45 if checker == 0 else 35
-            r = int((base + 5) * fog_f)
-            g = int((base + 2) * fog_f)
-            b = int(base * fog_f)
-        self.display.set_pixel(col, y, (r, g, b))
-
-    def _wall_pixel(self, cell_type, u, v, portal_info):
-        """Get wall pixel color."""
-        # Portal rendering
-        if portal_info:
-            p_color, pv_top, pv_bot = portal_info
-            pv_center = (pv_top + pv_bot) * 0.5
-            pv_half = (pv_bot - pv_top) * 0.5
-            if pv_half > 0.01 and 0.2 <= u <= 0.8 and pv_top + 0.02 <= v <= pv_bot - 0.02:
-                du = (u - 0.5) / 0.3
-                dv = (v - pv_center) / (pv_half * 0.85)
-                if du * du + dv * dv <= 1.0:
-                    base = BLUE_PORTAL if p_color == 'blue' else ORANGE_PORTAL
-                    dist = du * du + dv * dv
-                    if dist > 0.7:
-                        return (min(255, base[0] + 80),
-                                min(255, base[1] + 80),
-                                min(255, base[2] + 80))
-                    return base
-
-        if cell_type == P:
-            # White Aperture panels — bright and clean
-            r, g, b = 200, 200, 210
-            pu = int(u * 4)
-            pv = int(v * 4)
-            fu = u * 4 - pu
-            fv = v * 4 - pv
-            if fu < 0.08 or fu > 0.92 or fv < 0.08 or fv > 0.92:
-                return (170, 170, 180)
-            return (r, g, b)
-
-        if cell_type == TW:
-            # Turret wall — gray with pulsing red eye
-            if 0.3 <= u <= 0.7 and 0.25 <= v <= 0.45:
-                pulse = 0.5 + 0.5 * math.sin(self.time * 8.0)
-                r = int(180 + 75 * pulse)
-                return (r, 10, 10)
-            if u < 0.05 or u > 0.95 or v < 0.05 or v > 0.95:
-                return (50, 50, 55)
-            return (80, 80, 90)
+            fg = fog_f[np.nonzero(exit_)[0], 0]
+            floor[exit_] = np.stack([30 * fg * pulse, 220 * fg * pulse,
+                                     30 * fg * pulse], axis=-1).astype(np.uint8)
+        frame[HALF + 1:] = floor
+        return frame
+
+    def _wall_pixels(self, hits, u, v):
+        """Wall colors for every (row, column): procedural panels by cell
+        type, with portal ellipses over the faces that hold one."""
+        cell = np.broadcast_to(hits.cell, u.shape)
+        rgb = np.empty(u.shape + (3,), dtype=np.uint8)
 
         # Concrete (default) — dark
-        r, g, b = 90, 90, 100
-        gu = int(u * 8)
-        gv = int(v * 8)
-        fu = u * 8 - gu
-        fv = v * 8 - gv
-        if fu < 0.06 or fv < 0.06:
-            return (70, 70, 80)
-        return (r, g, b)
+        fu = u * 8 - (u * 8).astype(np.int64)
+        fv = v * 8 - (v * 8).astype(np.int64)
+        rgb[:] = (90, 90, 100)
+        rgb[(fu < 0.06) | (fv < 0.06)] = (70, 70, 80)
+
+        # White Aperture panels — bright and clean
+        panel = cell == P
+        fu = u * 4 - (u * 4).astype(np.int64)
+        fv = v * 4 - (v * 4).astype(np.int64)
+        rgb[panel] = (200, 200, 210)
+        rgb[panel & ((fu < 0.08) | (fu > 0.92) | (fv < 0.08) | (fv > 0.92))] = (170, 170, 180)
+
+        # Turret wall — gray with pulsing red eye
+        turret = cell == TW
+        if turret.any():
+            rgb[turret] = (80, 80, 90)
+            rgb[turret & ((u < 0.05) | (u > 0.95) | (v < 0.05) | (v > 0.95))] = (50, 50, 55)
+            pulse = 0.5 + 0.5 * math.sin(self.time * 8.0)
+            eye = turret & (0.3 <= u) & (u <= 0.7) & (0.25 <= v) & (v <= 0.45)
+            rgb[eye] = (int(180 + 75 * pulse), 10, 10)
+
+        # Portals, blue drawn over orange when both share a face
+        face = hits.face
+        wh = WALL_HEIGHT
+        for portal, color in ((self.orange_portal, ORANGE_PORTAL),
+                              (self.blue_portal, BLUE_PORTAL)):
+            if not portal or wh <= 0:
+                continue
+            cx, cy, pface, p_height = portal
+            on = hits.hit & (hits.map_x == cx) & (hits.map_y == cy) & (face == pface)
+            if not on.any():
+                continue
+            pv_top = max(0.0, (wh - (p_height + 1.0)) / wh)
+            pv_bot = min(1.0, (wh - p_height) / wh)
+            pv_center = (pv_top + pv_bot) * 0.5
+            pv_half = (pv_bot - pv_top) * 0.5
+            if pv_half <= 0.01:
+                continue
+            du = (u - 0.5) / 0.3
+            dv = (v - pv_center) / (pv_half * 0.85)
+            d = du * du + dv * dv
+            inside = (on & (0.2 <= u) & (u <= 0.8)
+                      & (pv_top + 0.02 <= v) & (v <= pv_bot - 0.02) & (d <= 1.0))
+            rgb[inside] = color
+            rgb[inside & (d > 0.7)] = tuple(min(255, c + 80) for c in color)
+        return rgb
 
     # ─────────────────────────────────────────────────────────────
     #  Minimap
@@ -0,0 +1,748 @@
+"""
+Sand Engine - Vectorized falling-sand material simulation
+==========================================================
+Simulation core for sandgame.py (POWDER GAME).
+
+Every per-cell property lives in a NumPy grid indexed [y, x]:
+
+    mat      material id
+    life     fire burn-down / lit-fuse countdown
+    var      per-particle color variation
+    temp     temperature (room temp = 20)
+    wind_x   wind force, carried by the cell position, not the particle
+    wind_y
+
+and each frame is a fixed pipeline of whole-grid passes instead of a
+Python visit per cell:
+
+    wind      heat sources gust, then a 4-neighbor advection/diffusion
+              stencil spreads it and drag pushes particles
+    heat      conduction as a conductivity-weighted 4-neighbor average,
+              then the PHASES table melts, freezes, ignites and detonates
+    life      fire burns down, steam condenses away, lit fuses burn,
+              plants and vines grow
+    movement  Margolus 2x2 blocks at the four block offsets (in random
+              order): straight fall/rise, then diagonal, then sideways
+              flow. Inside a block every move pairs two distinct cells,
+              so a whole pass is a handful of masked swaps.
+    contact   the REACTIONS table applied across the four neighbor
+              directions
+
+The material tables below are compiled once into lookup arrays indexed by
+material id (or by a pair of ids), so a rule is a table entry, not a
+branch.
+"""
+
+import numpy as np
+
+# Material IDs
+EMPTY     = 0
+SAND      = 1
+WATER     = 2
+STONE     = 3
+FIRE      = 4
+OIL       = 5
+GUNPOWDER = 6
+ACID      = 7
+LAVA      = 8
+ICE       = 9
+STEAM     = 10
+WOOD      = 11
+PLANT     = 12
+GAS       = 13
+METAL     = 14
+NITRO     = 15
+FUSE      = 16
+VINE      = 17
+ERASE     = 18
+
+# Material properties: (name, color_rgb, behavior, density)
+# behavior: 'none','powder','liquid','gas_up','solid','grow','vine','fuse','erase'
+MATERIALS = [
+    ("EMPTY",     (0, 0, 0),         'none',   0),
+    ("SAND",      (194, 178, 128),    'powder', 90),
+    ("WATER",     (40, 80, 200),      'liquid', 50),
+    ("STONE",     (128, 128, 128),    'solid',  100),
+    ("FIRE",      (255, 140, 20),     'gas_up', -5),
+    ("OIL",       (80, 50, 20),       'liquid', 30),
+    ("GUNPOWDER", (60, 60, 60),       'powder', 85),
+    ("ACID",      (80, 255, 40),      'liquid', 55),
+    ("LAVA",      (255, 80, 10),      'liquid', 95),
+    ("ICE",       (160, 220, 255),    'solid',  45),
+    ("STEAM",     (200, 200, 210),    'gas_up', -10),
+    ("WOOD",      (120, 70, 30),      'solid',  100),
+    ("PLANT",     (30, 160, 30),      'grow',   100),
+    ("GAS",       (220, 180, 200),    'gas_up', -8),
+    ("METAL",     (90, 95, 105),      'solid',  100),
+    ("NITRO",     (100, 200, 80),     'liquid', 60),
+    ("FUSE",      (140, 100, 60),     'fuse',   100),
+    ("VINE",      (20, 200, 20),      'vine',   100),
+    ("ERASE",     (255, 255, 255),    'erase',  0),
+]
+
+WIND_MAX = 10.0  # clamp wind values
+AMBIENT = 20.0   # room temperature
+
+# Thermal properties: material -> (emit_temp or None, conductivity)
+THERMAL = {
+    EMPTY:     (None, 0.6),
+    SAND:      (None, 0.25),
+    WATER:     (None, 0.4),
+    STONE:     (None, 0.2),
+    FIRE:      (400,  1.0),
+    OIL:       (None, 0.15),
+    GUNPOWDER: (None, 0.2),
+    ACID:      (None, 0.4),
+    LAVA:      (600,  0.8),
+    ICE:       (-30,  0.5),
+    STEAM:     (105,  0.4),
+    WOOD:      (None, 0.1),
+    PLANT:     (None, 0.1),
+    GAS:       (None, 0.5),
+    METAL:     (None, 0.9),
+    NITRO:     (None, 0.35),
+    FUSE:      (None, 0.1),
+    VINE:      (None, 0.1),
+}
+
+# Temperature a freshly placed particle starts at (others keep the cell's)
+SPAWN_TEMP = {FIRE: 400.0, LAVA: 600.0, ICE: -20.0}
+
+# Wind drag: material-specific overrides and behavior defaults
+WIND_DRAG = {GAS: 0.8, STEAM: 0.7, FIRE: 0.6, LAVA: 0.0}
+DRAG_POWDER = 0.65
+DRAG_LIQUID = 0.2
+
+# Heat sources that gust upward: material -> (sideways jitter, lift)
+HEAT_WIND = {FIRE: (0.8, -1.2), LAVA: (1.4, -1.8), STEAM: (0.3, -0.6)}
+
+# Movement: (chance to act per frame, straight, diagonal, sideways).
+# Powders and liquids fall, 'gas_up' materials rise into empty cells, and
+# sideways moves only go into empty cells. Behavior defaults first, then
+# per-material overrides.
+MOTION_POWDER = (0.6, 1.0, 1.0, 0.0)
+MOTION_LIQUID = (0.6, 1.0, 1.0, 1.0)
+MOTION = {
+    FIRE:  (0.7, 0.6, 0.3, 0.2),
+    STEAM: (0.7, 0.05, 0.05, 0.03),   # mostly hangs in place
+    GAS:   (0.7, 1.0, 1.0, 1.0),
+}
+
+# Short-lived materials: id -> (min, max) frames of life when placed
+LIFETIME = {FIRE: (3, 8)}
+# Chance per active frame that a material simply disappears
+VANISH = {STEAM: 0.10}
+FUSE_BURN = (8, 15)   # frames a lit fuse segment burns
+SPARK_CHANCE = 0.3
+
+# Contact reactions between 4-neighbors:
+# (material, neighbor, chance, neighbor becomes, self chance, self becomes).
+# "self chance" is rolled only when the reaction fires.
+_DISSOLVES = (WOOD, SAND, ICE, PLANT, GUNPOWDER, OIL, FUSE, VINE, NITRO)
+REACTIONS = [
+    (WATER, FIRE,  1.0,   STEAM, 0.0, EMPTY),
+    (WATER, LAVA,  1.0,   STONE, 1.0, STEAM),
+    (WATER, METAL, 0.005, SAND,  0.0, EMPTY),   # rust
+    (LAVA,  WATER, 1.0,   STEAM, 1.0, STONE),
+    (LAVA,  STONE, 0.02,  LAVA,  0.0, EMPTY),
+    (LAVA,  METAL, 0.03,  LAVA,  0.0, EMPTY),
+    (ACID,  METAL, 0.03,  EMPTY, 0.5, EMPTY),
+    (ACID,  WATER, 0.20,  EMPTY, 0.0, EMPTY),
+    (ACID,  LAVA,  0.08,  EMPTY, 1.0, EMPTY),
+] + [(ACID, m, 0.15, EMPTY, 0.3, EMPTY) for m in _DISSOLVES]
+
+# Reaction products that start at a set temperature
+REACTION_TEMP = {STEAM: 100.0, STONE: 80.0}
+
+# Phase transitions: (material, 'above' | 'below', temperature, becomes).
+# BLAST detonates with the material's BLAST_RADIUS; IGNITE lights a fuse.
+BLAST = -1
+IGNITE = -2
+PHASES = [
+    (ICE,       'above', 5,   WATER),
+    (WATER,     'below', -5,  ICE),
+    (WATER,     'above', 105, STEAM),
+    (STEAM,     'below', 60,  WATER),
+    (WOOD,      'above', 250, FIRE),
+    (OIL,       'above', 180, FIRE),
+    (GAS,       'above', 120, FIRE),
+    (GUNPOWDER, 'above', 200, BLAST),
+    (NITRO,     'above', 100, BLAST),
+    (PLANT,     'above', 220, FIRE),
+    (VINE,      'above', 180, FIRE),
+    (FUSE,      'above', 200, IGNITE),
+    (SAND,      'above', 700, LAVA),
+]
+BLAST_RADIUS = {GUNPOWDER: 5, NITRO: 7}
+BLAST_SURVIVORS = (STONE, METAL)
+
+# Growth
+PLANT_SUPPORT = (STONE, WOOD, SAND, PLANT, METAL)
+PLANT_CHANCE = 0.015
+PLANT_CHANCE_WET = 0.08
+VINE_CHANCE = 0.06
+VINE_BLOCKED = (STONE, METAL, VINE, WOOD)
+PLANT_DIRS = [(0, -1), (0, -1), (0, -1), (-1, 0), (1, 0), (-1, -1), (1, -1)]
+VINE_DIRS = [(0, -1), (0, 1), (-1, 0), (1, 0),
+             (-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+NEIGHBORS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+_AROUND = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+# ── Compiled lookup tables (indexed by material id) ───────────────
+
+def _compile():
+    n = len(MATERIALS)
+    ids = np.arange(n)
+    kind = np.array([m[2] for m in MATERIALS])
+    t = {}
+    t['density'] = np.array([m[3] for m in MATERIALS], dtype=np.int16)
+    t['rgb'] = np.array([m[1] for m in MATERIALS], dtype=np.int16)
+    fluid = np.isin(kind, ('liquid', 'gas_up'))
+    t['falls'] = np.isin(kind, ('powder', 'liquid'))
+    t['rises'] = kind == 'gas_up'
+
+    dens = t['density']
+    a, b = np.meshgrid(ids, ids, indexing='ij')
+    # displace[a, b]: a falling a trades places with b below it
+    t['displace'] = (b == EMPTY) | (fluid[b] & (dens[a] > dens[b]))
+    # wind_push[a, b]: wind shoves a into b's cell
+    rigid = np.isin(kind, ('solid', 'fuse'))
+    t['wind_push'] = (b == EMPTY) | ((dens[b] < dens[a]) & ~rigid[b])
+    t['blocks_wind'] = rigid & (ids != ICE)
+
+    drag = np.zeros(n)
+    drag[kind == 'powder'] = DRAG_POWDER
+    drag[kind == 'liquid'] = DRAG_LIQUID
+    for m, d in WIND_DRAG.items():
+        drag[m] = d
+    t['drag'] = drag
+
+    motion = np.zeros((n, 4))
+    motion[:, 0] = 1.0
+    motion[kind == 'powder'] = MOTION_POWDER
+    motion[kind == 'liquid'] = MOTION_LIQUID
+    for m, row in MOTION.items():
+        motion[m] = row
+    t['activity'], t['straight'], t['diagonal'], t['sideways'] = motion.T.copy()
+
+    t['emit'] = np.full(n, np.nan)
+    t['conduct'] = np.full(n, 0.3)
+    for m, (emit, cond) in THERMAL.items():
+        t['emit'][m] = np.nan if emit is None else emit
+        t['conduct'][m] = cond
+
+    t['spawn_temp'] = np.full(n, np.nan)
+    for m, temp in SPAWN_TEMP.items():
+        t['spawn_temp'][m] = temp
+    t['react_temp'] = t['spawn_temp'].copy()
+    for m, temp in REACTION_TEMP.items():
+        t['react_temp'][m] = temp
+
+    t['gust_jitter'] = np.zeros(n)
+    t['gust_lift'] = np.zeros(n)
+    for m, (jitter, lift) in HEAT_WIND.items():
+        t['gust_jitter'][m] = jitter
+        t['gust_lift'][m] = lift
+
+    t['life_lo'] = np.zeros(n, dtype=np.int16)
+    t['life_hi'] = np.zeros(n, dtype=np.int16)
+    for m, (lo, hi) in LIFETIME.items():
+        t['life_lo'][m], t['life_hi'][m] = lo, hi
+    t['vanish'] = np.zeros(n)
+    for m, chance in VANISH.items():
+        t['vanish'][m] = chance
+
+    t['react_chance'] = np.zeros((n, n))
+    t['react_other'] = np.zeros((n, n), dtype=np.int16)
+    t['react_self_chance'] = np.zeros((n, n))
+    t['react_self'] = np.zeros((n, n), dtype=np.int16)
+    for m, nb, chance, other, self_chance, self_to in REACTIONS:
+        t['react_chance'][m, nb] = chance
+        t['react_other'][m, nb] = other
+        t['react_self_chance'][m, nb] = self_chance
+        t['react_self'][m, nb] = self_to
+
+    t['hot_at'] = np.full(n, np.inf)
+    t['hot_to'] = np.zeros(n, dtype=np.int16)
+    t['cold_at'] = np.full(n, -np.inf)
+    t['cold_to'] = np.zeros(n, dtype=np.int16)
+    for m, side, temp, to in PHASES:
+        key = 'hot' if side == 'above' else 'cold'
+        t[key + '_at'][m] = temp
+        t[key + '_to'][m] = to
+    t['blast'] = np.zeros(n, dtype=np.int16)
+    for m, r in BLAST_RADIUS.items():
+        t['blast'][m] = r
+    t['survives_blast'] = np.isin(ids, BLAST_SURVIVORS)
+
+    t['plant_support'] = np.isin(ids, PLANT_SUPPORT)
+    t['vine_takes'] = (ids == EMPTY) | (~np.isin(ids, VINE_BLOCKED) &
+                                        (kind != 'solid'))
+    return t
+
+
+T = _compile()
+
+
+def _axis(d, n):
+    if d > 0:
+        return slice(0, n - d), slice(d, n)
+    if d < 0:
+        return slice(-d, n), slice(0, n + d)
+    return slice(0, n), slice(0, n)
+
+
+def offset_views(dx, dy, width, height):
+    """(src, dst) slice pairs: dst[i] is the (dx, dy) neighbor of src[i],
+    for every cell whose neighbor is on the grid."""
+    sy, ty = _axis(dy, height)
+    sx, tx = _axis(dx, width)
+    return (sy, sx), (ty, tx)
+
+
+_DISCS = {}
+
+
+def _disc(radius):
+    """(dy, dx) offsets of a filled circle, cached per radius."""
+    if radius not in _DISCS:
+        dy, dx = np.mgrid[-radius:radius+1, -radius:radius+1]
+        inside = dx * dx + dy * dy <= radius * radius
+        _DISCS[radius] = dy[inside], dx[inside]
+    return _DISCS[radius]
+
+
+class SandSim:
+    """Falling-sand world of width x height cells (row 0 at the top)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        shape = (height, width)
+        self.mat = np.zeros(shape, dtype=np.int16)
+        self.life = np.zeros(shape, dtype=np.int16)
+        self.var = np.zeros(shape, dtype=np.int16)
+        self.temp = np.full(shape, AMBIENT)
+        self.wind_x = np.zeros(shape)
+        self.wind_y = np.zeros(shape)
+        # Per-frame: cells that already moved or were replaced
+        self.moved = np.zeros(shape, dtype=bool)
+        self.active = np.zeros(shape, dtype=bool)
+        # Fields that travel with a particle when it moves (including
+        # this frame's activity roll)
+        self._carried = (self.mat, self.life, self.var, self.temp, self.active)
+        self._views = {d: offset_views(d[0], d[1], width, height)
+                       for d in VINE_DIRS}
+        h, w = height, width
+        self._blocks = [
+            (slice(p, h - 1, 2), slice(p + 1, h, 2),
+             slice(q, w - 1, 2), slice(q + 1, w, 2))
+            for p in (0, 1) for q in (0, 1)]
+
+    def count(self, mat_id):
+        return int(np.count_nonzero(self.mat == mat_id))
+
+    # ── Placing cells ──
+
+    def spawn(self, ys, xs, mats, temps=None):
+        """Place fresh particles of `mats` at (ys, xs): new life, color
+        variation and, where the temps table has one, temperature."""
+        ys = np.asarray(ys)
+        count = ys.size
+        if not count:
+            return
+        mats = np.broadcast_to(np.asarray(mats, dtype=np.int16), (count,))
+        self.mat[ys, xs] = mats
+        lo, hi = T['life_lo'][mats], T['life_hi'][mats]
+        self.life[ys, xs] = lo + (np.random.random(count) * (hi - lo + 1)).astype(np.int16)
+        start = (T['spawn_temp'] if temps is None else temps)[mats]
+        self.temp[ys, xs] = np.where(np.isnan(start), self.temp[ys, xs], start)
+        self.var[ys, xs] = np.random.randint(-15, 16, count)
+        self.moved[ys, xs] = True
+
+    def paint(self, x, y, mat_id):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.spawn([y], [x], mat_id)
+
+    def _spawn_in(self, view, mask, mats, temps=None):
+        """spawn() for a boolean mask over a slice view of the grid."""
+        ys, xs = np.nonzero(mask)
+        self.spawn(ys + view[0].start, xs + view[1].start, mats, temps)
+
+    def _near(self, mask):
+        """Cells with at least one 4-neighbor set in mask."""
+        out = np.zeros_like(mask)
+        for d in NEIGHBORS:
+            src, dst = self._views[d]
+            out[src] |= mask[dst]
+        return out
+
+    def explode(self, cx, cy, radius):
+        """Blast at (cx, cy): everything but stone/metal in radius turns to
+        fire or nothing, and wind blows outward."""
+        dy, dx = _disc(radius)
+        ys, xs = cy + dy, cx + dx
+        on = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        ys, xs, dy, dx = ys[on], xs[on], dy[on], dx[on]
+        soft = ~T['survives_blast'][self.mat[ys, xs]]
+        fire = np.random.random(len(ys)) < 0.4
+        self.spawn(ys[soft], xs[soft], np.where(fire[soft], FIRE, EMPTY))
+        dist = np.maximum(1.0, np.sqrt(dx * dx + dy * dy))
+        strength = 2.0 / dist
+        wx = self.wind_x[ys, xs] + dx / dist * strength
+        wy = self.wind_y[ys, xs] + dy / dist * strength
+        self.wind_x[ys, xs] = np.clip(wx, -WIND_MAX, WIND_MAX)
+        self.wind_y[ys, xs] = np.clip(wy, -WIND_MAX, WIND_MAX)
+
+    def _swap(self, a, b, mask):
+        """Swap the particles of views a and b where mask is set."""
+        if not mask.any():
+            return
+        for field in self._carried:
+            fa, fb = field[a], field[b]
+            held = fa[mask]
+            fa[mask] = fb[mask]
+            fb[mask] = held
+
+    # ── Frame ──
+
+    def step(self):
+        """Advance one frame."""
+        self.moved[:] = False
+        np.less(np.random.random(self.mat.shape), T['activity'][self.mat],
+                out=self.active)
+
+        self._generate_wind()
+        self._propagate_wind()
+        self._apply_wind()
+
+        self._conduct_heat()
+        self._phase_changes()
+
+        self._burn()
+        self._burn_fuses()
+        self._grow_plants()
+        self._grow_vines()
+
+        self._move()
+        self._react()
+
+    # ── Wind ──
+
+    def _generate_wind(self):
+        """Heat sources inject upward wind with sideways turbulence."""
+        jitter = T['gust_jitter'][self.mat]
+        hot = jitter > 0
+        if not hot.any():
+            return
+        gust = np.random.uniform(-1.0, 1.0, int(hot.sum())) * jitter[hot]
+        self.wind_x[hot] = np.clip(self.wind_x[hot] + gust, -WIND_MAX, WIND_MAX)
+        lift = T['gust_lift'][self.mat[hot]]
+        self.wind_y[hot] = np.clip(self.wind_y[hot] + lift, -WIND_MAX, WIND_MAX)
+
+    def _propagate_wind(self):
+        """Advect wind along its own direction plus a little isotropic
+        diffusion (which makes eddies); solids block it."""
+        wx, wy = self.wind_x, self.wind_y
+        live = (np.abs(wx) >= 0.05) | (np.abs(wy) >= 0.05)
+        if not live.any():
+            return
+        mag = np.sqrt(wx * wx + wy * wy)
+        flowing = mag > 0.01
+        safe = np.where(flowing, mag, 1.0)
+        dir_x = np.where(flowing, wx / safe, 0.0)
+        dir_y = np.where(flowing, wy / safe, 0.0)
+        open_cell = ~T['blocks_wind'][self.mat]
+
+        new_wx = np.zeros_like(wx)
+        new_wy = np.zeros_like(wy)
+        sent = np.zeros_like(wx)
+        for dx, dy in NEIGHBORS:
+            src, dst = self._views[(dx, dy)]
+            share = 0.08 + 0.45 * np.maximum(dir_x[src] * dx + dir_y[src] * dy, 0.0)
+            share *= live[src] & open_cell[dst]
+            new_wx[dst] += wx[src] * share
+            new_wy[dst] += wy[src] * share
+            sent[src] += share
+        # Keep the remainder (more is kept when blocked on the sides)
+        kept = np.where(live, np.maximum(1.0 - sent, 0.0), 0.0)
+        new_wx += wx * kept
+        new_wy += wy * kept
+
+        # Decay, then turbulence: wind drifts randomly as it flows
+        new_wx *= 0.94
+        new_wy *= 0.94
+        gusty = (np.abs(new_wx) > 0.1) | (np.abs(new_wy) > 0.1)
+        n = int(gusty.sum())
+        if n:
+            new_wx[gusty] += np.random.uniform(-0.15, 0.15, n)
+            new_wy[gusty] += np.random.uniform(-0.15, 0.15, n)
+        np.clip(new_wx, -WIND_MAX, WIND_MAX, out=new_wx)
+        np.clip(new_wy, -WIND_MAX, WIND_MAX, out=new_wy)
+        new_wx[np.abs(new_wx) < 0.05] = 0.0
+        new_wy[np.abs(new_wy) < 0.05] = 0.0
+        self.wind_x, self.wind_y = new_wx, new_wy
+
+    def _apply_wind(self):
+        """Wind shoves particles by their drag: horizontally, then
+        vertically, one cell at most per frame."""
+        h, w = self.height, self.width
+        drag = T['drag']
+        push_ok = T['wind_push']
+        for wind, pairs in (
+                (self.wind_x, [((slice(0, h), slice(q, w - 1, 2)),
+                                (slice(0, h), slice(q + 1, w, 2))) for q in (0, 1)]),
+                (self.wind_y, [((slice(p, h - 1, 2), slice(0, w)),
+                                (slice(p + 1, h, 2), slice(0, w))) for p in (0, 1)])):
+            if not wind.any():
+                continue
+            for lo, hi in pairs:
+                m_lo, m_hi = self.mat[lo], self.mat[hi]
+                w_lo, w_hi = wind[lo], wind[hi]
+                p_lo = np.abs(w_lo) * drag[m_lo]
+                p_hi = np.abs(w_hi) * drag[m_hi]
+                rnd = np.random.random(m_lo.shape)
+                fwd = ((p_lo > 0.05) & (rnd < p_lo) & (w_lo > 0) &
+                       ~self.moved[lo] & push_ok[m_lo, m_hi])
+                back = ((p_hi > 0.05) & (rnd < p_hi) & (w_hi < 0) &
+                        ~self.moved[hi] & push_ok[m_hi, m_lo])
+                go = fwd | back
+                self._swap(lo, hi, go)
+                self.moved[lo] |= go
+                self.moved[hi] |= go
+
+    # ── Heat ──
+
+    def _conduct_heat(self):
+        """Heat sources drive toward their emit temperature; everything
+        relaxes toward its conductivity-weighted neighbor average."""
+        mat, temp = self.mat, self.temp
+        cond = T['conduct'][mat]
+        emit = T['emit'][mat]
+        t = np.where(np.isnan(emit), temp, temp + (emit - temp) * 0.3)
+
+        weighted = temp * cond
+        n_sum = np.zeros_like(temp)
+        c_sum = np.zeros_like(temp)
+        for d in NEIGHBORS:
+            src, dst = self._views[d]
+            n_sum[src] += weighted[dst]
+            c_sum[src] += cond[dst]
+        t += (n_sum / c_sum - t) * 0.15
+
+        # Empty cells cool toward ambient
+        empty = mat == EMPTY
+        t[empty] += (AMBIENT - t[empty]) * 0.05
+        np.clip(t, -50.0, 800.0, out=self.temp)
+
+    def _phase_changes(self):
+        mat, temp = self.mat, self.temp
+        hot = temp > T['hot_at'][mat]
+        cold = temp < T['cold_at'][mat]
+        change = hot | cold
+        if not change.any():
+            return
+        to = np.where(hot, T['hot_to'][mat], T['cold_to'][mat])
+
+        ignite = change & (to == IGNITE) & (self.life == 0)
+        n = int(ignite.sum())
+        if n:
+            self.life[ignite] = np.random.randint(FUSE_BURN[0], FUSE_BURN[1] + 1, n)
+
+        blasts = change & (to == BLAST)
+        by, bx = np.nonzero(blasts)
+        radii = T['blast'][mat[by, bx]]
+
+        plain = change & (to >= 0)
+        ys, xs = np.nonzero(plain)
+        self.spawn(ys, xs, to[ys, xs])
+
+        for y, x, r in zip(by.tolist(), bx.tolist(), radii.tolist()):
+            if T['blast'][self.mat[y, x]]:   # not already blown away
+                self.explode(x, y, r)
+
+    # ── Life cycles ──
+
+    def _burn(self):
+        """Fire burns down; steam condenses away."""
+        mat, active = self.mat, self.active
+        burning = active & (T['life_hi'][mat] > 0)
+        self.life[burning] -= 1
+        gone = burning & (self.life <= 0)
+        vanish = T['vanish'][mat]
+        gone |= active & (vanish > 0) & (np.random.random(mat.shape) < vanish)
+        ys, xs = np.nonzero(gone)
+        self.spawn(ys, xs, EMPTY)
+
+    def _burn_fuses(self):
+        """Lit fuses count down, throw sparks, light neighboring fuse and
+        set off neighboring explosives; a spent segment turns to fire."""
+        mat, life = self.mat, self.life
+        lit = (mat == FUSE) & (life > 0)
+        if not lit.any():
+            return
+        life[lit] -= 1
+        spent = lit & (life <= 0)
+        burning = lit & ~spent
+
+        sparks = burning & (np.random.random(mat.shape) < SPARK_CHANCE)
+        if sparks.any():
+            # Each spark picks one of the 9 cells around (and including) it
+            pick = np.random.randint(0, len(_AROUND), mat.shape)
+            for k, d in enumerate(_AROUND):
+                if d == (0, 0):
+                    continue
+                src, dst = self._views[d]
+                hit = sparks[src] & (pick[src] == k) & (mat[dst] == EMPTY)
+                self._spawn_in(dst, hit, FIRE)
+
+        near = self._near(burning)
+        catch = near & (mat == FUSE) & (life == 0)
+        n = int(catch.sum())
+        if n:
+            life[catch] = np.random.randint(FUSE_BURN[0], FUSE_BURN[1] + 1, n)
+            self.moved |= catch
+        by, bx = np.nonzero(near & (T['blast'][mat] > 0))
+        radii = T['blast'][mat[by, bx]]
+
+        ys, xs = np.nonzero(spent)
+        self.spawn(ys, xs, FIRE)
+        for y, x, r in zip(by.tolist(), bx.tolist(), radii.tolist()):
+            if T['blast'][self.mat[y, x]]:
+                self.explode(x, y, r)
+
+    def _grow_plants(self):
+        """Plants climb: mostly upward, sideways/down only with support,
+        much faster next to water (which they drink)."""
+        mat = self.mat
+        plant = mat == PLANT
+        if not plant.any():
+            return
+        water = mat == WATER
+        wet = self._near(water)
+        chance = np.where(wet, PLANT_CHANCE_WET, PLANT_CHANCE)
+        grow = plant & (np.random.random(mat.shape) < chance)
+        if not grow.any():
+            return
+        support = self._near(T['plant_support'][mat])
+        below = np.zeros_like(support)
+        below[:-1] = mat[1:] != EMPTY
+        support |= below
+
+        grown = np.zeros_like(grow)
+        for i in np.random.permutation(len(PLANT_DIRS)):
+            dx, dy = PLANT_DIRS[i]
+            src, dst = self._views[(dx, dy)]
+            ok = grow[src] & (mat[dst] == EMPTY)
+            if dy >= 0:
+                ok &= support[src]
+            self._spawn_in(dst, ok, PLANT)
+            grow[src] &= ~ok
+            grown[src] |= ok
+
+        # Each plant that grew drinks one neighboring water cell
+        drink = grown & wet
+        for d in NEIGHBORS:
+            src, dst = self._views[d]
+            hit = drink[src] & (mat[dst] == WATER)
+            self._spawn_in(dst, hit, EMPTY)
+            drink[src] &= ~hit
+
+    def _grow_vines(self):
+        """Vines overgrow anything that isn't solid."""
+        mat = self.mat
+        vine = mat == VINE
+        if not vine.any():
+            return
+        grow = vine & (np.random.random(mat.shape) < VINE_CHANCE)
+        takes = T['vine_takes']
+        for i in np.random.permutation(len(VINE_DIRS)):
+            src, dst = self._views[VINE_DIRS[i]]
+            ok = grow[src] & takes[mat[dst]]
+            self._spawn_in(dst, ok, VINE)
+            grow[src] &= ~ok
+
+    # ── Movement ──
+
+    def _move(self):
+        """Margolus pass: in each 2x2 block (a b / c d) particles fall
+        a->c, b->d (or rise c->a, d->b), then slide diagonally, then flow
+        sideways. Every move inside a block touches a distinct pair, so
+        each is one masked swap over all blocks at once."""
+        mat, moved, active = self.mat, self.moved, self.active
+        falls, rises = T['falls'], T['rises']
+        displace = T['displace']
+        straight, diagonal, sideways = T['straight'], T['diagonal'], T['sideways']
+        shape = mat.shape
+        r_straight = np.random.random(shape)
+        r_diag = np.random.random(shape)
+        r_side = np.random.random(shape)
+
+        for i in np.random.permutation(4):
+            top, bot, left, right = self._blocks[i]
+            a, b = (top, left), (top, right)
+            c, d = (bot, left), (bot, right)
+
+            # Straight down (fall) or up into empty (rise)
+            for up, down in ((a, c), (b, d)):
+                mu, md = mat[up], mat[down]
+                fall = (active[up] & ~moved[up] & falls[mu] &
+                        (r_straight[up] < straight[mu]) & displace[mu, md])
+                rise = (active[down] & ~moved[down] & rises[md] &
+                        (r_straight[down] < straight[md]) & (mu == EMPTY))
+                go = fall | rise
+                self._swap(up, down, go)
+                moved[up] |= go
+                moved[down] |= go
+
+            # Diagonals, for particles that could not go straight
+            ma, mb, mc, md = mat[a], mat[b], mat[c], mat[d]
+            free_a, free_b = active[a] & ~moved[a], active[b] & ~moved[b]
+            free_c, free_d = active[c] & ~moved[c], active[d] & ~moved[d]
+            a_to_d = (free_a & falls[ma] & (r_diag[a] < diagonal[ma]) &
+                      ~displace[ma, mc] & displace[ma, md])
+            b_to_c = (free_b & falls[mb] & (r_diag[b] < diagonal[mb]) &
+                      ~displace[mb, md] & displace[mb, mc] & ~a_to_d)
+            c_to_b = (free_c & rises[mc] & (r_diag[c] < diagonal[mc]) &
+                      (ma != EMPTY) & (mb == EMPTY))
+            d_to_a = (free_d & rises[md] & (r_diag[d] < diagonal[md]) &
+                      (mb != EMPTY) & (ma == EMPTY))
+            ad = a_to_d | d_to_a
+            bc = b_to_c | c_to_b
+            self._swap(a, d, ad)
+            self._swap(b, c, bc)
+            for v, m in ((a, ad), (d, ad), (b, bc), (c, bc)):
+                moved[v] |= m
+
+            # Sideways flow into empty cells (can repeat across blocks,
+            # so liquids level out a few cells per frame)
+            for lft, rgt in ((a, b), (c, d)):
+                ml, mr = mat[lft], mat[rgt]
+                go = ((active[lft] & ~moved[lft] & (mr == EMPTY) &
+                       (r_side[lft] < sideways[ml])) |
+                      (active[rgt] & ~moved[rgt] & (ml == EMPTY) &
+                       (r_side[rgt] < sideways[mr])))
+                self._swap(lft, rgt, go)
+
+    # ── Contact reactions ──
+
+    def _react(self):
+        mat = self.mat
+        chances = T['react_chance']
+        for d in NEIGHBORS:
+            src, dst = self._views[d]
+            m_src, m_dst = mat[src], mat[dst]
+            chance = chances[m_src, m_dst]
+            if not chance.any():
+                continue
+            hit = np.random.random(chance.shape) < chance
+            if not hit.any():
+                continue
+            other = T['react_other'][m_src, m_dst][hit]
+            self_hit = hit & (np.random.random(chance.shape) <
+                              T['react_self_chance'][m_src, m_dst])
+            self_to = T['react_self'][m_src, m_dst][self_hit]
+            self._spawn_in(dst, hit, other, T['react_temp'])
+            self._spawn_in(src, self_hit, self_to, T['react_temp'])
@@ -13,6 +13,7 @@ Controls:
 import math
 import random
 from arcade import Game, GameState, Display, Colors, InputState
+from games.table_physics import resolve_pairs, slide
 
 # Phases
 PHASE_MODE_SELECT = 0
@@ -69,7 +70,7 @@ SOLO_PUCK_COLOR = Colors.YELLOW
 # Physics
 FRICTION = 18.0          # px/s^2 deceleration
 SIDE_RESTITUTION = 0.4   # low bounce off side rails
-PUCK_RESTITUTION = 0.85  # puck-to-puck
+PUCK_RESTITUTION = 0.7   # puck-to-puck (85% of the closing speed changes hands)
 MIN_SPEED = 2.0          # below this, puck stops
 MAX_POWER = 90.0
 SUBSTEPS = 3
@@ -202,20 +203,8 @@ class Shuffleboard(Game):
             if not puck.active or not puck.moving():
                 continue
 
-            puck.x += puck.vx * dt
-            puck.y += puck.vy * dt
-
-            # Friction
-            spd = puck.speed()
-            if spd > 0:
-                decel = FRICTION * dt
-                new_spd = max(0, spd - decel)
-                factor = new_spd / spd
-                puck.vx *= factor
-                puck.vy *= factor
-                if new_spd < MIN_SPEED:
-                    puck.vx = 0.0
-                    puck.vy = 0.0
+            # Move, with sliding friction
+            slide(puck, dt, FRICTION, MIN_SPEED)
 
             # Side edges — puck falls off the table
             if puck.x <= TABLE_LEFT or puck.x >= TABLE_RIGHT:
@@ -239,34 +228,8 @@ class Shuffleboard(Game):
             # Below foul line = stays but scores 0 (handled in scoring)
 
         # Puck-to-puck collisions
-        active = [p for p in self.pucks if p.active]
-        for i in range(len(active)):
-            for j in range(i + 1, len(active)):
-                a = active[i]
-                b = active[j]
-                dx = b.x - a.x
-                dy = b.y - a.y
-                dist_sq = dx * dx + dy * dy
-                min_dist = PUCK_COLLISION_DIST
-                if dist_sq < min_dist * min_dist and dist_sq > 0:
-                    dist = math.sqrt(dist_sq)
-                    nx = dx / dist
-                    ny = dy / dist
-
-                    # Separate overlap
-                    overlap = min_dist - dist
-                    a.x -= nx * overlap * 0.5
-                    a.y -= ny * overlap * 0.5
-                    b.x += nx * overlap * 0.5
-                    b.y += ny * overlap * 0.5
-
-                    # Elastic collision
-                    rel_vn = (b.vx - a.vx) * nx + (b.vy - a.vy) * ny
-                    if rel_vn < 0:
-                        a.vx += rel_vn * nx * PUCK_RESTITUTION
-                        a.vy += rel_vn * ny * PUCK_RESTITUTION
-                        b.vx -= rel_vn * nx * PUCK_RESTITUTION
-                        b.vy -= rel_vn * ny * PUCK_RESTITUTION
+        resolve_pairs([p for p in self.pucks if p.active],
+                      PUCK_COLLISION_DIST, PUCK_RESTITUTION)
 
     def _calculate_round_scores(self):
         """Tally scores for all pucks currently on the table."""
@@ -0,0 +1,315 @@
+"""
+Table Physics - Shared ball-and-table collision helpers
+=======================================================
+Shared by pinball.py, pool.py, shuffleboard.py, bowling.py, breakout.py
+and arkanoid.py.
+
+Pure Python on purpose: these games move one to ten balls, where the
+per-call overhead of NumPy costs more than the arithmetic it saves.
+
+BroadphaseGrid - uniform grid of buckets over axis-aligned boxes. Static
+    geometry (pinball walls, a brick wall) is bucketed once; a query only
+    looks at the shapes in the cells it overlaps, returned in the order
+    they were inserted so first-hit rules stay the same as a list scan.
+
+StaticGeometry - line segments and circles in a BroadphaseGrid, with
+    sweep() for continuous collision: the earliest time a moving circle
+    touches any shape along its path this sub-step. A fast ball can no
+    longer step clean across a thin wall between two overlap checks.
+
+move_ball() - advance a ball through StaticGeometry for one sub-step,
+    stopping at each contact, letting the game answer with its own bounce
+    rule, and spending the rest of the step along the new velocity.
+
+resolve_pair() / resolve_pairs() - ball-ball contacts: separate and
+    exchange momentum with restitution. resolve_pairs() takes a whole rack
+    at once, sorting by x and sweeping for pairs whose x-spans overlap at
+    the start of the call.
+
+slide() - move a body and apply constant rolling friction.
+"""
+
+import math
+from collections import namedtuple
+
+SEGMENT = 0
+CIRCLE = 1
+
+# A static shape. Segments use (x0, y0)-(x1, y1); circles use (x0, y0)
+# as center and r as radius. tag is whatever the game wants back.
+Shape = namedtuple('Shape', 'kind x0 y0 x1 y1 r tag')
+
+# Result of a sweep: fraction t of the move at first touch, ball center
+# there, unit normal pointing from the shape to the ball, and the shape.
+Contact = namedtuple('Contact', 't x y nx ny shape')
+
+# Gap left between ball and surface after a contact, so the next sweep
+# does not start touching
+SKIN = 1e-4
+
+
+def closest_point_on_segment(px, py, x0, y0, x1, y1):
+    """Point of segment (x0, y0)-(x1, y1) nearest to (px, py)."""
+    dx, dy = x1 - x0, y1 - y0
+    len_sq = dx * dx + dy * dy
+    if len_sq < 0.0001:
+        return x0, y0
+    t = max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / len_sq))
+    return x0 + t * dx, y0 + t * dy
+
+
+# ── Broadphase ────────────────────────────────────────────────────
+
+class BroadphaseGrid:
+    """Buckets of items by the grid cells their bounding box covers."""
+
+    def __init__(self, cell_size=8):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._boxes = {}   # id(item) -> (seq, item, cell keys)
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def clear(self):
+        self.cells.clear()
+        self._boxes.clear()
+        self._seq = 0
+
+    def _keys(self, xmin, ymin, xmax, ymax):
+        cs = self.cell_size
+        return [(cx, cy)
+                for cy in range(int(math.floor(ymin / cs)), int(math.floor(ymax / cs)) + 1)
+                for cx in range(int(math.floor(xmin / cs)), int(math.floor(xmax / cs)) + 1)]
+
+    def insert(self, item, xmin, ymin, xmax, ymax):
+        keys = self._keys(xmin, ymin, xmax, ymax)
+        entry = (self._seq, item)
+        self._seq += 1
+        for key in keys:
+            self.cells.setdefault(key, []).append(entry)
+        self._boxes[id(item)] = (entry, keys)
+
+    def remove(self, item):
+        found = self._boxes.pop(id(item), None)
+        if found is None:
+            return
+        entry, keys = found
+        for key in keys:
+            bucket = self.cells[key]
+            bucket.remove(entry)
+            if not bucket:
+                del self.cells[key]
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """Items whose box shares a cell with the query box, in insertion
+        order."""
+        cells = self.cells
+        found = {}
+        for key in self._keys(xmin, ymin, xmax, ymax):
+            bucket = cells.get(key)
+            if bucket:
+                for seq, item in bucket:
+                    found[seq] = item
+        return [found[seq] for seq in sorted(found)]
+
+
+# ── Static geometry and continuous collision ──────────────────────
+
+def _sweep_circle(px, py, dx, dy, cx, cy, r):
+    """Earliest t in [0, 1] at which p + t*d is within r of (cx, cy) while
+    approaching, or None."""
+    mx, my = px - cx, py - cy
+    b = mx * dx + my * dy
+    if b >= 0:
+        return None            # moving away (or not moving)
+    c = mx * mx + my * my - r * r
+    if c <= 0:
+        return 0.0             # already touching
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def _sweep_segment(px, py, dx, dy, s, r):
+    """Earliest touch of a circle of radius r moving p -> p + d with
+    segment s: the flat faces first, then the rounded ends. Returns
+    (t, nx, ny) or None."""
+    ex, ey = s.x1 - s.x0, s.y1 - s.y0
+    len_sq = ex * ex + ey * ey
+    best = None
+    if len_sq > 1e-12:
+        inv = 1.0 / math.sqrt(len_sq)
+        nx, ny = -ey * inv, ex * inv
+        side = (px - s.x0) * nx + (py - s.y0) * ny
+        if side < 0:
+            nx, ny, side = -nx, -ny, -side
+        rate = dx * nx + dy * ny
+        if rate < 0:
+            t = (r - side) / rate if side > r else 0.0
+            if t <= 1.0:
+                hx, hy = px + t * dx, py + t * dy
+                u = ((hx - s.x0) * ex + (hy - s.y0) * ey) / len_sq
+                if 0.0 <= u <= 1.0:
+                    best = (t, nx, ny)
+    if best is not None:
+        return best
+    for ex_, ey_ in ((s.x0, s.y0), (s.x1, s.y1)):
+        t = _sweep_circle(px, py, dx, dy, ex_, ey_, r)
+        if t is not None and (best is None or t < best[0]):
+            hx, hy = px + t * dx - ex_, py + t * dy - ey_
+            d = math.sqrt(hx * hx + hy * hy) or 1.0
+            best = (t, hx / d, hy / d)
+    return best
+
+
+class StaticGeometry:
+    """Fixed segments and circles behind a BroadphaseGrid."""
+
+    def __init__(self, cell_size=8):
+        self.grid = BroadphaseGrid(cell_size)
+        self.shapes = []
+
+    def add_segment(self, x0, y0, x1, y1, tag=None):
+        shape = Shape(SEGMENT, float(x0), float(y0), float(x1), float(y1), 0.0, tag)
+        self.shapes.append(shape)
+        self.grid.insert(shape, min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        return shape
+
+    def add_circle(self, x, y, r, tag=None):
+        shape = Shape(CIRCLE, float(x), float(y), float(x), float(y), float(r), tag)
+        self.shapes.append(shape)
+        self.grid.insert(shape, x - r, y - r, x + r, y + r)
+        return shape
+
+    def sweep(self, x, y, dx, dy, radius):
+        """First Contact of a circle moving from (x, y) by (dx, dy), or
+        None. Shapes the ball is already touching only count if it is
+        moving into them."""
+        best = None
+        for s in self.grid.query(min(x, x + dx) - radius, min(y, y + dy) - radius,
+                                 max(x, x + dx) + radius, max(y, y + dy) + radius):
+            if s.kind == SEGMENT:
+                hit = _sweep_segment(x, y, dx, dy, s, radius)
+            else:
+                t = _sweep_circle(x, y, dx, dy, s.x0, s.y0, s.r + radius)
+                hit = None
+                if t is not None:
+                    hx, hy = x + t * dx - s.x0, y + t * dy - s.y0
+                    d = math.sqrt(hx * hx + hy * hy) or 1.0
+                    hit = (t, hx / d, hy / d)
+            if hit is not None and (best is None or hit[0] < best.t):
+                t, nx, ny = hit
+                best = Contact(t, x + t * dx, y + t * dy, nx, ny, s)
+        return best
+
+    def overlaps(self, x, y, radius):
+        """(shape, nx, ny, depth) for every shape closer than radius to
+        (x, y), normal pointing at the ball."""
+        out = []
+        for s in self.grid.query(x - radius, y - radius, x + radius, y + radius):
+            if s.kind == SEGMENT:
+                cx, cy = closest_point_on_segment(x, y, s.x0, s.y0, s.x1, s.y1)
+                reach = radius
+            else:
+                cx, cy = s.x0, s.y0
+                reach = radius + s.r
+            dx, dy = x - cx, y - cy
+            dist = math.sqrt(dx * dx + dy * dy)
+            if 0.001 < dist < reach:
+                out.append((s, dx / dist, dy / dist, reach - dist))
+        return out
+
+
+def move_ball(geometry, x, y, vx, vy, dt, radius, respond, max_contacts=4):
+    """Move a ball for dt through static geometry with continuous
+    collision. At each contact respond(shape, nx, ny, vx, vy) returns the
+    new velocity and the ball carries on for the rest of the step.
+    Returns (x, y, vx, vy)."""
+    remaining = dt
+    for _ in range(max_contacts):
+        dx, dy = vx * remaining, vy * remaining
+        hit = geometry.sweep(x, y, dx, dy, radius)
+        if hit is None:
+            return x + dx, y + dy, vx, vy
+        x = hit.x + hit.nx * SKIN
+        y = hit.y + hit.ny * SKIN
+        vx, vy = respond(hit.shape, hit.nx, hit.ny, vx, vy)
+        remaining *= 1.0 - hit.t
+    # Out of contacts for this step: stay put at the last one
+    return x, y, vx, vy
+
+
+# ── Moving bodies ─────────────────────────────────────────────────
+
+def slide(body, dt, friction, min_speed=0.0):
+    """Move body (.x, .y, .vx, .vy) by its velocity, then slow it by
+    friction * dt; below min_speed it stops."""
+    body.x += body.vx * dt
+    body.y += body.vy * dt
+    spd = math.sqrt(body.vx * body.vx + body.vy * body.vy)
+    if spd > 0:
+        new_spd = max(0, spd - friction * dt)
+        factor = new_spd / spd
+        body.vx *= factor
+        body.vy *= factor
+        if new_spd < min_speed:
+            body.vx = 0.0
+            body.vy = 0.0
+
+
+def resolve_pair(a, b, min_dist, restitution=1.0, mass_a=1.0, mass_b=1.0):
+    """Separate two overlapping round bodies and, if they are closing,
+    exchange momentum along the line of centers. Returns True on contact."""
+    dx = b.x - a.x
+    dy = b.y - a.y
+    dist_sq = dx * dx + dy * dy
+    if dist_sq >= min_dist * min_dist or dist_sq <= 0:
+        return False
+    dist = math.sqrt(dist_sq)
+    nx = dx / dist
+    ny = dy / dist
+
+    # Separate overlap, the lighter body moving further
+    overlap = min_dist - dist
+    total = mass_a + mass_b
+    a.x -= nx * overlap * (mass_b / total)
+    a.y -= ny * overlap * (mass_b / total)
+    b.x += nx * overlap * (mass_a / total)
+    b.y += ny * overlap * (mass_a / total)
+
+    rel_vn = (b.vx - a.vx) * nx + (b.vy - a.vy) * ny
+    if rel_vn < 0:  # approaching
+        j = -(1 + restitution) * rel_vn / (1 / mass_a + 1 / mass_b)
+        a.vx -= (j / mass_a) * nx
+        a.vy -= (j / mass_a) * ny
+        b.vx += (j / mass_b) * nx
+        b.vy += (j / mass_b) * ny
+    return True
+
+
+def resolve_pairs(bodies, min_dist, restitution=1.0):
+    """resolve_pair() for every close pair among equal-mass bodies. Pairs
+    are found by sorting on x and sweeping instead of testing all of them,
+    then resolved in list order, the same order a nested loop would use.
+
+    Unlike the nested loop, the candidates are picked from the positions
+    at the start of the call (resolve_pair() still re-tests each one). A
+    pair that an earlier separation in the same call pushes into contact
+    is resolved on the next call, one sub-step later.
+    """
+    order = sorted(range(len(bodies)), key=lambda i: bodies[i].x)
+    pairs = []
+    for k, i in enumerate(order):
+        xi = bodies[i].x
+        for j in order[k + 1:]:
+            if bodies[j].x - xi >= min_dist:
+                break
+            pairs.append((i, j) if i < j else (j, i))
+    pairs.sort()
+    for i, j in pairs:
+        resolve_pair(bodies[i], bodies[j], min_dist, restitution)
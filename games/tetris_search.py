@@ -0,0 +1,165 @@
+"""
+Tetris Search - Bitboard placement search for Tetris
+====================================================
+Used by visuals/tetrisdemo.py (AI attract mode) to pick where each
+piece goes, looking one piece ahead through the next-piece preview.
+
+Stack
+    The locked cells as one int per row (bit x = column x, row 0 at the
+    top), with each column's height and the hole count (empty cells under
+    a filled one) kept alongside. Dropping a piece reads the heights;
+    placing it ORs its row masks in and, unless a line clears, updates
+    heights and holes for its own columns only. Stack.from_game()
+    snapshots a games.tetris.Tetris board (rows still waiting to be
+    cleared are dropped).
+
+Shapes
+    Each piece's distinct rotations precomputed as row masks plus the
+    top and bottom cell of every column it covers, from TETROMINOS.
+
+best_placement()
+    Every (rotation, column) for the current piece, each followed by
+    every placement of the next piece, scored on lines cleared, holes,
+    stack height, bumpiness and landing height.
+"""
+
+from games.tetris import TETROMINOS, Tetris
+
+WIDTH, HEIGHT = Tetris.BOARD_WIDTH, Tetris.BOARD_HEIGHT
+FULL = (1 << WIDTH) - 1
+
+# Placement score weights
+LINE, HOLE, MAX_HEIGHT, BUMP, LANDING = 100, 50, 10, 5, 2
+TOPPED_OUT = -10 ** 9
+
+
+class Shape:
+    """One rotation of a piece: its row masks and column profile."""
+
+    __slots__ = ('rotation', 'min_dx', 'width', 'rows', 'columns')
+
+    def __init__(self, rotation, cells):
+        self.rotation = rotation
+        self.min_dx = min(dx for dx, _ in cells)
+        self.width = max(dx for dx, _ in cells) - self.min_dx + 1
+        masks = {}
+        for dx, dy in cells:
+            masks[dy] = masks.get(dy, 0) | 1 << (dx - self.min_dx)
+        self.rows = tuple(sorted(masks.items()))
+        # (column offset, topmost dy, bottommost dy)
+        self.columns = tuple(
+            (c, min(dy for dx, dy in cells if dx - self.min_dx == c),
+             max(dy for dx, dy in cells if dx - self.min_dx == c))
+            for c in range(self.width))
+
+
+def _shapes(rotations):
+    shapes, seen = [], set()
+    for rotation, cells in enumerate(rotations):
+        key = frozenset(cells)
+        if key not in seen:
+            seen.add(key)
+            shapes.append(Shape(rotation, cells))
+    return tuple(shapes)
+
+
+SHAPES = {piece: _shapes(rotations) for piece, rotations in TETROMINOS.items()}
+
+
+class Stack:
+    """Row bitmasks of the locked cells with column heights and holes."""
+
+    __slots__ = ('rows', 'heights', 'holes')
+
+    def __init__(self, rows, heights=None, holes=None):
+        self.rows = rows
+        if heights is None:
+            heights, holes = _scan(rows)
+        self.heights = heights
+        self.holes = holes
+
+    @classmethod
+    def from_game(cls, game):
+        rows = [sum(1 << x for x, cell in enumerate(row) if cell is not None)
+                for row in game.board]
+        kept = [r for r in rows if r != FULL]
+        return cls([0] * (len(rows) - len(kept)) + kept)
+
+    def drop(self, shape, col):
+        """Row the shape's origin lands at in column col (negative when it
+        would stick out of the top)."""
+        heights = self.heights
+        base = col + shape.min_dx
+        return min(HEIGHT - heights[base + c] - 1 - bottom for c, _, bottom in shape.columns)
+
+    def place(self, shape, col, y):
+        """(new stack, lines cleared) with the shape locked at col, y."""
+        rows = self.rows[:]
+        shift = col + shape.min_dx
+        lines = 0
+        for dy, mask in shape.rows:
+            r = rows[y + dy] | mask << shift
+            rows[y + dy] = r
+            if r == FULL:
+                lines += 1
+        if lines:
+            kept = [r for r in rows if r != FULL]
+            return Stack([0] * lines + kept), lines
+        heights = self.heights[:]
+        holes = self.holes
+        for c, top, bottom in shape.columns:
+            x = shift + c
+            # Empty cells between the piece and the old column top
+            holes += HEIGHT - heights[x] - 1 - (y + bottom)
+            heights[x] = HEIGHT - (y + top)
+        return Stack(rows, heights, holes), 0
+
+    def placements(self, piece):
+        """(shape, col, landing row) for every drop that stays in the
+        well."""
+        for shape in SHAPES[piece]:
+            for col in range(-shape.min_dx, WIDTH - shape.width - shape.min_dx + 1):
+                y = self.drop(shape, col)
+                if y + shape.rows[0][0] >= 0:
+                    yield shape, col, y
+
+    def evaluate(self, lines, landing):
+        heights = self.heights
+        bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+        return (lines * LINE - self.holes * HOLE - max(heights) * MAX_HEIGHT
+                - bumpiness * BUMP - landing * LANDING)
+
+
+def _scan(rows):
+    """Column heights and hole count of a whole stack."""
+    heights = [0] * WIDTH
+    holes = 0
+    seen = 0
+    for y, r in enumerate(rows):
+        holes += (seen & ~r).bit_count()
+        new = r & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = HEIGHT - y
+            new ^= low
+        seen |= r
+    return heights, holes
+
+
+def best_placement(stack, piece, next_piece=None):
+    """(rotation, column) of the best placement of piece, looking ahead
+    to next_piece if given; None when nothing fits."""
+    best, best_score = None, None
+    for shape, col, y in stack.placements(piece):
+        child, lines = stack.place(shape, col, y)
+        landing = HEIGHT - y
+        if next_piece is None:
+            score = child.evaluate(lines, landing)
+        else:
+            score = TOPPED_OUT
+            for shape2, col2, y2 in child.placements(next_piece):
+                grandchild, lines2 = child.place(shape2, col2, y2)
+                score = max(score, grandchild.evaluate(lines + lines2, landing + HEIGHT - y2))
+        if best_score is None or score > best_score:
+            best, best_score = (shape.rotation, col), score
+    return best
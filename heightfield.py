@@ -0,0 +1,432 @@
+"""
+Heightfield - Shared terrain library
+=====================================
+Vectorized heightfield operations for terrain-based content:
+games/drift_sim.py (DRIFT, DRIFT 3D) and visuals/erosion.py.
+
+Noise
+    perlin() / fbm() evaluate the Drift WebDemo noise.js Perlin noise
+    (same permutation table and gradients) over whole coordinate arrays.
+    fbm_grid() renders a full fBm field and memoizes it per octave, so
+    a terrain that shares octaves with an earlier one (same grid, scale
+    and seed) reuses them.
+    diamond_square() is midpoint-displacement value noise, one array
+    expression per subdivision level.
+
+Water and sediment
+    pressure_flow() moves water between 8-neighbors toward lower water
+    surface, with the Drift wall check and flow cap, for every cell at
+    once.
+    Droplets is a pool of hydraulic-erosion droplets stepped in
+    lockstep: each step picks up or drops sediment for all live droplets
+    with one scatter-add.
+
+Shading
+    hillshade() is Lambert lighting of the surface normals, computed once
+    per terrain change and reused by every draw.
+
+All grids are NumPy arrays indexed [y, x].
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# -----------------------------------------------------------------------
+# Perlin noise — permutation table from Drift WebDemo noise.js
+# -----------------------------------------------------------------------
+PERM = [
+    151,160,137,91,90,15,131,13,201,95,96,53,194,233,7,225,140,36,103,30,69,142,
+    8,99,37,240,21,10,23,190,6,148,247,120,234,75,0,26,197,62,94,252,219,203,117,
+    35,11,32,57,177,33,88,237,149,56,87,174,20,125,136,171,168,68,175,74,165,71,
+    134,139,48,27,166,77,146,158,231,83,111,229,122,60,211,133,230,220,105,92,41,
+    55,46,245,40,244,102,143,54,65,25,63,161,1,216,80,73,209,76,132,187,208,89,
+    18,169,200,196,135,130,116,188,159,86,164,100,109,198,173,186,3,64,52,217,226,
+    250,124,123,5,202,38,147,118,126,255,82,85,212,207,206,59,227,47,16,58,17,182,
+    189,28,42,223,183,170,213,119,248,152,2,44,154,163,70,221,153,101,155,167,43,
+    172,9,129,22,39,253,19,98,108,110,79,113,224,232,178,185,112,104,218,246,97,
+    228,251,34,242,193,238,210,144,12,191,179,162,241,81,51,145,235,249,14,239,
+    107,49,192,214,31,181,199,106,157,184,84,204,176,115,121,50,45,127,4,150,254,
+    138,236,205,93,222,114,67,29,24,72,243,141,128,195,78,66,215,61,156,180,
+]
+_P = np.array(PERM + PERM, dtype=np.intp)  # doubled for wrapping
+
+# noise.js gradient for hash h & 3 is +-u +-v with (u, v) = (x, y) for
+# h < 2 and (y, x) otherwise, i.e. x+y, y-x, y-x, -x-y
+_GRAD_X = np.array([1.0, -1.0, -1.0, -1.0])   # weight of x, by h & 3
+_GRAD_Y = np.array([1.0, 1.0, 1.0, -1.0])     # weight of y, by h & 3
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _grad(h, x, y):
+    h = h & 3
+    return _GRAD_X[h] * x + _GRAD_Y[h] * y
+
+
+def perlin(x, y):
+    """2D Perlin noise (noise.js) at every point of the arrays x, y."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    fx = np.floor(x)
+    fy = np.floor(y)
+    X = fx.astype(np.intp) & 255
+    Y = fy.astype(np.intp) & 255
+    x = x - fx
+    y = y - fy
+    u = _fade(x)
+    v = _fade(y)
+    A = _P[X] + Y
+    B = _P[X + 1] + Y
+    n00 = _grad(_P[A], x, y)
+    n10 = _grad(_P[B], x - 1, y)
+    n01 = _grad(_P[A + 1], x, y - 1)
+    n11 = _grad(_P[B + 1], x - 1, y - 1)
+    nx0 = n00 + u * (n10 - n00)
+    nx1 = n01 + u * (n11 - n01)
+    return nx0 + v * (nx1 - nx0)
+
+
+def fbm(x, y, octaves=4, persistence=0.5):
+    """Fractal brownian motion over arrays, normalized as in noise.js."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    total = np.zeros(np.broadcast(x, y).shape)
+    frequency = 1.0
+    amplitude = 1.0
+    max_value = 0.0
+    for _ in range(octaves):
+        total += perlin(x * frequency, y * frequency) * amplitude
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2.0
+    return total / max_value
+
+
+@lru_cache(maxsize=32)
+def _octave(width, height, scale, offset_x, offset_y, frequency):
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float64)
+    layer = perlin((xs + offset_x) * scale * frequency,
+                   (ys + offset_y) * scale * frequency)
+    layer.flags.writeable = False
+    return layer
+
+
+def fbm_grid(width, height, scale, octaves=4, persistence=0.5,
+             offset=(0.0, 0.0)):
+    """fbm() sampled at ((x + ox) * scale, (y + oy) * scale) for every
+    cell of a width x height grid. Octave layers are cached."""
+    total = np.zeros((height, width))
+    frequency = 1.0
+    amplitude = 1.0
+    max_value = 0.0
+    for _ in range(octaves):
+        total += amplitude * _octave(width, height, float(scale),
+                                     float(offset[0]), float(offset[1]),
+                                     frequency)
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2.0
+    return total / max_value
+
+
+def diamond_square(levels, scale=0.5, rng=np.random):
+    """(2**levels + 1)-square midpoint-displacement heightfield.
+
+    Corners start random in [0, 1); each level displaces new points by
+    up to +-scale/2 and halves scale.
+    """
+    size = (1 << levels) + 1
+    grid = np.zeros((size, size))
+    grid[::size - 1, ::size - 1] = rng.random_sample((2, 2))
+    step = size - 1
+    while step > 1:
+        half = step // 2
+        # Diamond step: block centers from their four corners
+        centers = (grid[:-1:step, :-1:step] + grid[:-1:step, step::step] +
+                   grid[step::step, :-1:step] + grid[step::step, step::step]) / 4.0
+        grid[half::step, half::step] = centers + (rng.random_sample(centers.shape) - 0.5) * scale
+        # Square step: edge midpoints from the (up to four) points at
+        # +-half; NaN padding marks the ones off the grid
+        pad = np.pad(grid, half, mode='constant', constant_values=np.nan)
+        for rows, cols in ((slice(0, size, step), slice(half, size, step)),
+                           (slice(half, size, step), slice(0, size, step))):
+            ys = np.arange(size)[rows][:, np.newaxis] + half
+            xs = np.arange(size)[cols][np.newaxis, :] + half
+            around = np.stack([pad[ys - half, xs], pad[ys + half, xs],
+                               pad[ys, xs - half], pad[ys, xs + half]])
+            count = np.sum(~np.isnan(around), axis=0)
+            avg = np.nansum(around, axis=0) / count
+            grid[rows, cols] = avg + (rng.random_sample(avg.shape) - 0.5) * scale
+        step = half
+        scale *= 0.5
+    return grid
+
+
+def normalize(grid):
+    """Rescale to 0..1 (a flat grid maps to 0)."""
+    lo, hi = grid.min(), grid.max()
+    rng = hi - lo if hi > lo else 1.0
+    return (grid - lo) / rng
+
+
+# -----------------------------------------------------------------------
+# Neighborhoods
+# -----------------------------------------------------------------------
+
+# 8-directional neighbors: (dx, dy, distance_multiplier) — from water.js
+NEIGHBORS8 = [
+    (-1,  0, 1.0),    # West
+    ( 1,  0, 1.0),    # East
+    ( 0, -1, 1.0),    # North
+    ( 0,  1, 1.0),    # South
+    (-1, -1, 1.414),  # NW
+    ( 1, -1, 1.414),  # NE
+    (-1,  1, 1.414),  # SW
+    ( 1,  1, 1.414),  # SE
+]
+
+
+def _span(d, n):
+    if d > 0:
+        return slice(0, n - d), slice(d, n)
+    if d < 0:
+        return slice(-d, n), slice(0, n + d)
+    return slice(0, n), slice(0, n)
+
+
+def neighbor_views(dx, dy, shape):
+    """(here, there) slice pairs: there[i] is the (dx, dy) neighbor of
+    here[i], for every cell whose neighbor is on the grid."""
+    sy, ty = _span(dy, shape[0])
+    sx, tx = _span(dx, shape[1])
+    return (sy, sx), (ty, tx)
+
+
+# -----------------------------------------------------------------------
+# Water flow (water.js simulate)
+# -----------------------------------------------------------------------
+
+def pressure_flow(terrain, water, velocity_x, velocity_y, flow_rate,
+                  min_depth, min_flow=0.0001):
+    """One pressure-driven flow step; returns the new water grid.
+
+    Every cell with at least min_depth of water sends
+    min(surface drop * flow_rate / distance, depth / 4) to each
+    8-neighbor with a lower water surface, unless the neighbor's ground
+    rises more than half the depth (a wall). All transfers use the water
+    levels from before the step. velocity_x/y (updated in place) follow
+    the net outflow direction of flowing cells and decay in still ones.
+    """
+    surface = terrain + water
+    wet = water >= min_depth
+    next_water = water.copy()
+    total = np.zeros_like(water)
+    flow_vx = np.zeros_like(water)
+    flow_vy = np.zeros_like(water)
+    for dx, dy, dist in NEIGHBORS8:
+        here, there = neighbor_views(dx, dy, water.shape)
+        depth = water[here]
+        flow = np.minimum((surface[here] - surface[there]) * (flow_rate / dist),
+                          depth * 0.25)
+        moving = (wet[here] & (flow > min_flow) &
+                  (terrain[there] - terrain[here] <= depth * 0.5))
+        flow = np.where(moving, flow, 0.0)
+        next_water[here] -= flow
+        next_water[there] += flow
+        total[here] += flow
+        flow_vx[here] += dx * flow
+        flow_vy[here] += dy * flow
+
+    flowing = total > 0
+    still = wet & ~flowing
+    velocity_x[flowing] = velocity_x[flowing] * 0.8 + flow_vx[flowing] * 0.2
+    velocity_y[flowing] = velocity_y[flowing] * 0.8 + flow_vy[flowing] * 0.2
+    velocity_x[still] *= 0.95
+    velocity_y[still] *= 0.95
+    return next_water
+
+
+# -----------------------------------------------------------------------
+# Hydraulic erosion (sediment-carrying droplets)
+# -----------------------------------------------------------------------
+
+def sample(height, fx, fy):
+    """Bilinear height and gradient at float positions (clamped to the
+    grid's last full cell). Returns (gx, gy, h)."""
+    rows, cols = height.shape
+    ix = np.minimum(np.maximum(fx.astype(np.intp), 0), cols - 2)
+    iy = np.minimum(np.maximum(fy.astype(np.intp), 0), rows - 2)
+    u = fx - ix
+    v = fy - iy
+    flat = height.ravel()
+    k = iy * cols + ix
+    h00 = flat[k]
+    h10 = flat[k + 1]
+    h01 = flat[k + cols]
+    h11 = flat[k + cols + 1]
+    top = h10 - h00
+    bottom = h11 - h01
+    gx = top + (bottom - top) * v
+    gy = (h01 - h00) + (bottom - top) * u
+    h = h00 + top * u + (h01 - h00) * v + (bottom - top) * u * v
+    return gx, gy, h
+
+
+class Droplets:
+    """Pool of hydraulic-erosion droplets rolling over a 0..1 heightfield.
+
+    Each droplet runs downhill with some inertia, eroding where it can
+    carry more sediment than it holds and depositing where it carries
+    too much, for up to max_steps steps or until it leaves the grid.
+    All live droplets step together and each step's height changes land
+    in one bincount scatter, so a call costs the same for 5 droplets or
+    500; callers add rain as it falls and advance the pool a few steps
+    per frame.
+    """
+
+    def __init__(self, max_steps=64, inertia=0.3, gravity=4.0,
+                 friction=0.05, evaporation=0.01, deposit_rate=0.3,
+                 min_capacity=0.01, rng=np.random):
+        self.max_steps = max_steps
+        self.inertia = inertia
+        self.gravity = gravity
+        self.friction = friction
+        self.evaporation = evaporation
+        self.deposit_rate = deposit_rate
+        self.min_capacity = min_capacity
+        self.rng = rng
+        self.clear()
+
+    def clear(self):
+        empty = np.zeros(0)
+        self.px = self.py = self.dx = self.dy = empty
+        self.speed = self.volume = self.sediment = empty
+        self.age = np.zeros(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.px)
+
+    def add(self, xs, ys):
+        """Drop new droplets (at rest, carrying nothing) at xs, ys."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        n = len(xs)
+        self.px = np.concatenate((self.px, xs))
+        self.py = np.concatenate((self.py, ys))
+        self.dx = np.concatenate((self.dx, np.zeros(n)))
+        self.dy = np.concatenate((self.dy, np.zeros(n)))
+        self.speed = np.concatenate((self.speed, np.ones(n)))
+        self.volume = np.concatenate((self.volume, np.ones(n)))
+        self.sediment = np.concatenate((self.sediment, np.zeros(n)))
+        self.age = np.concatenate((self.age, np.zeros(n, dtype=np.intp)))
+
+    def _keep(self, mask):
+        self.px, self.py = self.px[mask], self.py[mask]
+        self.dx, self.dy = self.dx[mask], self.dy[mask]
+        self.speed, self.volume = self.speed[mask], self.volume[mask]
+        self.sediment, self.age = self.sediment[mask], self.age[mask]
+
+    def step(self, height, hardness, steps=1, flow=None):
+        """Advance every droplet up to `steps` steps. height (and flow,
+        a per-cell visit count, if given) must be C-contiguous; both are
+        updated in place."""
+        rows, cols = height.shape
+        cells = rows * cols
+        flat = height.ravel()
+        inertia = self.inertia
+        keep_dir = 1.0 - inertia
+
+        for _ in range(steps):
+            ix = self.px.astype(np.intp)
+            iy = self.py.astype(np.intp)
+            alive = ((self.age < self.max_steps) & (self.px >= 0) & (ix < cols) &
+                     (self.py >= 0) & (iy < rows))
+            if not alive.all():
+                self._keep(alive)
+                ix, iy = ix[alive], iy[alive]
+            if not len(self.px):
+                break
+            k = iy * cols + ix
+            if flow is not None:
+                visits = flow.ravel()
+                visits += np.bincount(k, minlength=cells)
+
+            px, py = self.px, self.py
+            gx, gy, old_h = sample(height, px, py)
+            dx = self.dx * inertia - gx * keep_dir
+            dy = self.dy * inertia - gy * keep_dir
+            dl = np.sqrt(dx * dx + dy * dy)
+            stuck = dl < 1e-6
+            if stuck.any():
+                angle = self.rng.random_sample(int(stuck.sum())) * (2.0 * math.pi)
+                dx[stuck] = np.cos(angle)
+                dy[stuck] = np.sin(angle)
+                dl[stuck] = 1.0
+            dx /= dl
+            dy /= dl
+            self.dx, self.dy = dx, dy
+
+            new_px = px + dx
+            new_py = py + dy
+            on = ((new_px >= 0) & (new_px < cols - 1) &
+                  (new_py >= 0) & (new_py < rows - 1))
+            if not on.all():
+                self._keep(on)
+                new_px, new_py = new_px[on], new_py[on]
+                k, old_h = k[on], old_h[on]
+                if not len(self.px):
+                    break
+
+            speed, volume, sediment = self.speed, self.volume, self.sediment
+            height_diff = sample(height, new_px, new_py)[2] - old_h
+            capacity = np.maximum(np.maximum(-height_diff, 0.0) * speed * volume,
+                                  self.min_capacity)
+
+            # Erode (carrying less than capacity) or deposit (more)
+            limit = np.where(height_diff < 0, -height_diff, capacity * 0.1)
+            take = np.maximum(0.0, np.minimum((capacity - sediment) * (1.0 - hardness),
+                                              limit))
+            change = np.where(sediment < capacity, -take,
+                              self.deposit_rate * (sediment - capacity))
+            flat += np.bincount(k, weights=change, minlength=cells)
+            sediment -= change
+
+            speed = np.sqrt(np.maximum(0.0, speed * speed + height_diff * self.gravity))
+            speed *= 1.0 - self.friction
+            self.speed = np.maximum(speed, 0.1)
+
+            self.px, self.py = new_px, new_py
+            self.age += 1
+            volume -= self.evaporation
+            dry = volume < 0.01
+            if dry.any():
+                # Evaporated: drop the load where it stands
+                k = new_py[dry].astype(np.intp) * cols + new_px[dry].astype(np.intp)
+                flat += np.bincount(k, weights=sediment[dry], minlength=cells)
+                self._keep(~dry)
+
+            np.clip(height, 0.0, 1.0, out=height)
+
+
+# -----------------------------------------------------------------------
+# Shading
+# -----------------------------------------------------------------------
+
+def hillshade(height, z_scale=1.0, azimuth=315.0, altitude=45.0):
+    """Lambert shade 0..1 of a heightfield lit from azimuth (degrees
+    clockwise from north, i.e. up) at altitude degrees. A flat cell
+    gets sin(altitude)."""
+    gy, gx = np.gradient(height * z_scale)
+    az = math.radians(azimuth)
+    alt = math.radians(altitude)
+    # Light direction in grid coordinates (y grows downward)
+    lx = math.cos(alt) * math.sin(az)
+    ly = -math.cos(alt) * math.cos(az)
+    lz = math.sin(alt)
+    norm = np.sqrt(gx * gx + gy * gy + 1.0)
+    shade = (-gx * lx - gy * ly + lz) / norm
+    return np.clip(shade, 0.0, 1.0)
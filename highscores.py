@@ -12,7 +12,8 @@ import time
 from typing import List, Tuple, Optional
 from pathlib import Path
 
-from atomic_io import write_json_atomic
+import persistence
+from play_history import PlayHistory
 
 
 class HighScoreManager:
@@ -79,6 +80,7 @@ class HighScoreManager:
         self.scores = {}  # {game_name: [(initials, score, timestamp), ...]}
         self.load_scores()
         self._migrate_renamed_games()
+        self.history = self._open_play_history()
         self._migrate_play_history()
 
     @staticmethod
@@ -126,12 +128,12 @@ class HighScoreManager:
             self.scores = {}
 
     def save_scores(self):
-        """Save scores to JSON file."""
-        try:
-            write_json_atomic(self.filepath, self.scores)
-        except (IOError, OSError):
-            # Can't save, fail silently (scores still work in memory)
-            pass
+        """Queue a snapshot of the scores for the background writer.
+
+        Failed writes are swallowed there (scores still work in memory).
+        """
+        snapshot = {game: list(entries) for game, entries in self.scores.items()}
+        persistence.get_writer().submit(self.filepath, snapshot)
 
     def _migrate_renamed_games(self):
         """Migrate scores from old game names to new names (one-time on init)."""
@@ -151,26 +153,29 @@ class HighScoreManager:
         if changed:
             self.save_scores()
 
+    def _open_play_history(self) -> Optional[PlayHistory]:
+        """Open the play-history store next to the scores file.
+
+        A legacy play_history.jsonl is imported once on first open.
+        """
+        data_dir = self.filepath.parent
+        try:
+            return PlayHistory(data_dir / "play_history",
+                               legacy_path=data_dir / "play_history.jsonl")
+        except (IOError, OSError):
+            # Read-only or full disk: plays just aren't recorded
+            return None
+
     def _migrate_play_history(self):
-        """One-time migration of play_history.jsonl game names."""
-        history_path = self.filepath.parent / "play_history.jsonl"
-        if not history_path.exists():
+        """Apply game renames to the play history's name table.
+
+        Only the small index is touched, so this costs the same no matter how
+        many plays have been logged.
+        """
+        if self.history is None:
             return
         try:
-            lines = history_path.read_text().splitlines()
-            changed = False
-            new_lines = []
-            for line in lines:
-                if not line.strip():
-                    continue
-                entry = json.loads(line)
-                old_name = entry.get("game", "")
-                if old_name in self._RENAME_MAP:
-                    entry["game"] = self._RENAME_MAP[old_name]
-                    changed = True
-                new_lines.append(json.dumps(entry))
-            if changed:
-                history_path.write_text("\n".join(new_lines) + "\n")
+            self.history.rename_games(self._RENAME_MAP)
         except Exception:
             pass
 
@@ -277,18 +282,12 @@ class HighScoreManager:
         return -1
 
     def log_play(self, game_name: str, score: int, initials: str = ""):
-        """Log a game play to the play history file (JSONL, one line per play)."""
+        """Log a game play to the append-only play history store."""
+        if self.history is None:
+            return
         try:
-            history_path = self.filepath.parent / "play_history.jsonl"
-            entry = json.dumps({
-                "game": game_name,
-                "score": score,
-                "initials": initials,
-                "ts": int(time.time()),
-            })
-            with open(history_path, 'a') as f:
-                f.write(entry + "\n")
-        except IOError:
+            self.history.append(game_name, score, initials)
+        except (IOError, OSError):
             pass
 
 
@@ -0,0 +1,151 @@
+"""
+Write-Behind Persistence
+========================
+Coalesces JSON saves onto a background thread so the frame loop never waits
+on the SD card.
+
+settings.set used to call write_json_atomic on every change, and each call
+fsyncs. Holding the joystick on BRIGHTNESS or GAMMA in the settings screen
+fires a change every few frames — dozens of fsyncs a second, each one a
+visible hitch and a little more flash wear.
+
+Callers now hand a snapshot of their state to submit(). Only the newest
+snapshot per path is kept; it is written DEBOUNCE_S after the last change
+(or MAX_DELAY_S after the first, so a held button still lands on disk).
+Every write still goes through write_json_atomic, so a power cut leaves
+either the old file or the new one, never a torn one — at worst the last
+MAX_DELAY_S of changes are lost.
+
+Pending writes are flushed at interpreter exit and on SIGTERM (what systemd
+sends on `systemctl stop` and at shutdown).
+"""
+
+import atexit
+import os
+import signal
+import threading
+import time
+
+from atomic_io import write_json_atomic
+
+DEBOUNCE_S = 0.75
+MAX_DELAY_S = 5.0
+
+
+class WriteBehind:
+    """Debounced, coalescing writer for whole-file JSON snapshots."""
+
+    def __init__(self, delay=DEBOUNCE_S, max_delay=MAX_DELAY_S,
+                 write=write_json_atomic):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._write = write
+        self._pending = {}          # path -> (obj, first_submit, last_submit)
+        self._cond = threading.Condition()
+        # Held while taking a batch AND writing it, so a flush() can never be
+        # overtaken by an older snapshot the worker picked up earlier.
+        self._io_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, path, obj):
+        """Queue `obj` to be written to `path`. `obj` must not be mutated
+        afterwards — pass a copy of live state."""
+        path = os.fspath(path)
+        now = time.monotonic()
+        with self._cond:
+            prev = self._pending.get(path)
+            first = prev[1] if prev is not None else now
+            self._pending[path] = (obj, first, now)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self):
+        """Paths with a snapshot not yet on disk."""
+        with self._cond:
+            return sorted(self._pending)
+
+    def flush(self):
+        """Write every pending snapshot now, on the calling thread."""
+        with self._io_lock:
+            with self._cond:
+                batch = {p: e[0] for p, e in self._pending.items()}
+                self._pending.clear()
+            self._write_batch(batch)
+
+    def _due(self, entry):
+        _obj, first, last = entry
+        return min(last + self.delay, first + self.max_delay)
+
+    def _take_due(self):
+        now = time.monotonic()
+        ready = [p for p, e in self._pending.items() if self._due(e) <= now]
+        return {p: self._pending.pop(p)[0] for p in ready}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    wait = min(self._due(e) for e in self._pending.values()) - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+            with self._io_lock:
+                with self._cond:
+                    batch = self._take_due()
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        for path, obj in batch.items():
+            try:
+                self._write(path, obj)
+            except (IOError, OSError, TypeError, ValueError):
+                # Can't save; state still works in memory (same as before)
+                pass
+
+
+# Process-wide writer shared by settings.py and highscores.py
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> WriteBehind:
+    """Get the shared writer, installing the exit/SIGTERM flush on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehind()
+            atexit.register(_writer.flush)
+            _install_sigterm_flush()
+    return _writer
+
+
+def flush():
+    """Flush the shared writer, if it has been created."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def _install_sigterm_flush():
+    # signal.signal only works from the main thread; leave any handler the
+    # shell installed itself alone.
+    if threading.current_thread() is not threading.main_thread():
+        return
+    try:
+        if signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+            return
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    except (ValueError, OSError):
+        pass
+
+
+def _on_sigterm(signum, _frame):
+    flush()
+    signal.signal(signum, signal.SIG_DFL)
+    # SystemExit unwinds the main loop's finally blocks (matrix/GPIO cleanup)
+    raise SystemExit(128 + signum)
@@ -0,0 +1,329 @@
+"""
+Play History Store
+==================
+Append-only log of every game played on the cabinet, plus a small index of
+running aggregates (plays per game, plays per day, best score per game).
+
+The old format was a single play_history.jsonl that grew forever: boot
+rewrote it to migrate renamed games, and the STATS screen re-parsed every
+line each time it opened. On a busy cabinet that is tens of thousands of
+lines of JSON on an SD card.
+
+Layout (under data/play_history/):
+
+    index.json        aggregates + game-name table, written atomically
+    seg-000000.bin    fixed-size binary records, SEGMENT_RECORDS per file
+    seg-000001.bin    ...
+
+Each record is RECORD.size bytes: timestamp, score, game id (an index into
+the name table) and the player's initials. Records are never rewritten —
+a game rename only edits the name table, so migration is O(games), not
+O(history). Readers that just want totals (the STATS screen) only touch
+index.json, so their cost does not depend on how long the cabinet has run.
+
+Crash safety: a record is appended to its segment before the index is
+updated. If power is lost between the two, the next open finds more
+records on disk than the index has counted and folds just that tail back
+into the aggregates. A torn (partial) trailing record is truncated away.
+"""
+
+import json
+import os
+import struct
+import time
+from collections import Counter
+from pathlib import Path
+
+from atomic_io import write_json_atomic
+
+# ts (uint32), score (int32), game id (uint16), initials (3 bytes ASCII)
+RECORD = struct.Struct("<IiH3s")
+SEGMENT_RECORDS = 4096
+INDEX_VERSION = 1
+
+_INDEX_NAME = "index.json"
+
+
+def _segment_name(seg):
+    return f"seg-{seg:06d}.bin"
+
+
+def _day_key(ts):
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+
+def _clamp_score(score):
+    return max(-0x80000000, min(0x7FFFFFFF, int(score)))
+
+
+class PlayHistory:
+    """Segmented binary play log with incrementally maintained aggregates."""
+
+    def __init__(self, directory, legacy_path=None):
+        """Open (or create) the store in `directory`.
+
+        Args:
+            directory: Folder holding index.json and the segment files.
+            legacy_path: Optional play_history.jsonl to import once. It is
+                renamed to *.migrated afterwards so it is never re-read;
+                an interrupted import resumes where it stopped.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.directory / _INDEX_NAME
+        self._load_index()
+        self._recover_tail()
+        if legacy_path is not None:
+            self._import_legacy(Path(legacy_path))
+
+    # ── Index ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _empty_index():
+        return {
+            "version": INDEX_VERSION,
+            "records": 0,       # total records covered by the aggregates
+            "games": [],        # game id -> name (renames may alias ids)
+            "plays": {},        # name -> play count
+            "best": {},         # name -> best score
+            "days": {},         # "YYYY-MM-DD" -> play count
+        }
+
+    def _load_index(self):
+        self.index = self._empty_index()
+        if self._index_path.exists():
+            try:
+                with open(self._index_path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.index.update(data)
+            except (json.JSONDecodeError, OSError, AttributeError):
+                # Lost index: recount from the segments (one full scan).
+                # Totals survive; names only the index knew read as "?"
+                # and keep their ids.
+                self.index = self._empty_index()
+        self._ids = {}
+        for gid, name in enumerate(self.index["games"]):
+            self._ids.setdefault(name, gid)
+
+    def _save_index(self):
+        try:
+            write_json_atomic(self._index_path, self.index)
+        except (IOError, OSError):
+            # Aggregates stay correct in memory; the next open recovers the
+            # uncounted tail from the segments.
+            pass
+
+    def _game_id(self, name):
+        gid = self._ids.get(name)
+        if gid is None:
+            gid = len(self.index["games"])
+            self.index["games"].append(name)
+            self._ids[name] = gid
+        return gid
+
+    def _count(self, name, score, ts):
+        idx = self.index
+        idx["records"] += 1
+        idx["plays"][name] = idx["plays"].get(name, 0) + 1
+        if name not in idx["best"] or score > idx["best"][name]:
+            idx["best"][name] = score
+        day = _day_key(ts)
+        idx["days"][day] = idx["days"].get(day, 0) + 1
+
+    # ── Segments ──────────────────────────────────────────────────
+
+    def _segment_path(self, seg):
+        return self.directory / _segment_name(seg)
+
+    def _read_records(self, start):
+        """Yield (ts, score, game_id, initials) for records from `start` on."""
+        seg, offset = divmod(start, SEGMENT_RECORDS)
+        while True:
+            path = self._segment_path(seg)
+            if not path.exists():
+                return
+            with open(path, "rb") as f:
+                f.seek(offset * RECORD.size)
+                data = f.read()
+            usable = len(data) - len(data) % RECORD.size
+            for rec in RECORD.iter_unpack(data[:usable]):
+                ts, score, gid, initials = rec
+                yield ts, score, gid, initials.rstrip(b"\0").decode("ascii", "replace")
+            if offset + usable // RECORD.size < SEGMENT_RECORDS:
+                return
+            seg, offset = seg + 1, 0
+
+    def _recover_tail(self):
+        """Fold records written after the last index save into the aggregates."""
+        self._trim_torn_record()
+        games = self.index["games"]
+        top = -1
+        for ts, score, gid, _initials in self._read_records(self.index["records"]):
+            self._count(games[gid] if gid < len(games) else "?", score, ts)
+            top = max(top, gid)
+        if top < 0:
+            return
+        # Ids the index lost still belong to their old records: pad the
+        # name table so a new game never reuses one
+        for gid in range(len(games), top + 1):
+            games.append("?")
+            self._ids.setdefault("?", gid)
+        self._save_index()
+
+    def _trim_torn_record(self):
+        """Drop a partial trailing record left by a power cut mid-append."""
+        seg = self.index["records"] // SEGMENT_RECORDS
+        while self._segment_path(seg + 1).exists():
+            seg += 1
+        path = self._segment_path(seg)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if size % RECORD.size:
+            try:
+                with open(path, "r+b") as f:
+                    f.truncate(size - size % RECORD.size)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _pack(ts, score, gid, initials):
+        return RECORD.pack(ts, score, gid, initials.encode("ascii", "replace")[:3])
+
+    def _write_segment(self, seg, data):
+        with open(self._segment_path(seg), "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_record(self, ts, score, gid, initials):
+        seg = self.index["records"] // SEGMENT_RECORDS
+        self._write_segment(seg, self._pack(ts, score, gid, initials))
+
+    # ── Legacy import ─────────────────────────────────────────────
+
+    def _import_legacy(self, legacy_path):
+        """Import play_history.jsonl, one fsync and index save per segment.
+
+        The file is renamed to *.importing before the first record is
+        written and to *.migrated once all of it is in, so it is never
+        imported twice. An import cut short (power loss, full card) resumes
+        on the next open, skipping the lines whose records already landed
+        after the index's "legacy_start".
+        """
+        pending = legacy_path.with_suffix(".jsonl.importing")
+        try:
+            if legacy_path.exists():
+                self.index["legacy_start"] = self.index["records"]
+                self._save_index()
+                os.replace(legacy_path, pending)
+            if not pending.exists():
+                return
+            games = self.index["games"]
+            landed = Counter(
+                (ts, score, games[gid] if gid < len(games) else "?", initials)
+                for ts, score, gid, initials
+                in self._read_records(self.index.get("legacy_start", 0)))
+            rows = []
+            with open(pending, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        row = (int(entry.get("ts", 0)), _clamp_score(entry.get("score", 0)),
+                               entry.get("game", "?"),
+                               entry.get("initials", "").encode("ascii", "replace")[:3].decode())
+                    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+                        continue
+                    if not 0 <= row[0] < 1 << 32:
+                        continue
+                    if landed[row]:
+                        landed[row] -= 1
+                    else:
+                        rows.append(row)
+            # Names go into the index before any record refers to them
+            gids = {game: self._game_id(game) for _ts, _score, game, _initials in rows}
+            self._save_index()
+            while rows:
+                seg, offset = divmod(self.index["records"], SEGMENT_RECORDS)
+                batch, rows = rows[:SEGMENT_RECORDS - offset], rows[SEGMENT_RECORDS - offset:]
+                self._write_segment(seg, b"".join(
+                    self._pack(ts, score, gids[game], initials)
+                    for ts, score, game, initials in batch))
+                for ts, score, game, _initials in batch:
+                    self._count(game, score, ts)
+                self._save_index()
+            os.replace(pending, legacy_path.with_suffix(".jsonl.migrated"))
+            self.index.pop("legacy_start", None)
+            self._save_index()
+        except (IOError, OSError):
+            pass
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def append(self, game, score, initials="", ts=None):
+        """Log one play. Raises OSError if the segment can't be written."""
+        ts = int(time.time()) if ts is None else int(ts)
+        score = _clamp_score(score)
+        gid = self._game_id(game)
+        self._append_record(ts, score, gid, initials)
+        self._count(game, score, ts)
+        self._save_index()
+
+    def rename_games(self, rename_map):
+        """Apply {old_name: new_name} to the name table and aggregates.
+
+        Records are untouched: every id that pointed at `old_name` now reads
+        as `new_name`, and the old aggregates merge into the new ones.
+        """
+        idx = self.index
+        changed = False
+        for gid, name in enumerate(idx["games"]):
+            new = rename_map.get(name)
+            if new is None:
+                continue
+            idx["games"][gid] = new
+            changed = True
+        for old, new in rename_map.items():
+            if old in idx["plays"]:
+                idx["plays"][new] = idx["plays"].get(new, 0) + idx["plays"].pop(old)
+            if old in idx["best"]:
+                best = idx["best"].pop(old)
+                idx["best"][new] = max(best, idx["best"].get(new, best))
+        if changed:
+            self._ids = {}
+            for gid, name in enumerate(idx["games"]):
+                self._ids.setdefault(name, gid)
+            self._save_index()
+        return changed
+
+    @property
+    def total_plays(self):
+        return self.index["records"]
+
+    def plays_per_game(self):
+        """Counter of game name -> play count."""
+        return Counter(self.index["plays"])
+
+    def plays_per_day(self):
+        """Dict of "YYYY-MM-DD" -> play count."""
+        return dict(self.index["days"])
+
+    def best_scores(self):
+        """Dict of game name -> best score ever logged."""
+        return dict(self.index["best"])
+
+    def iter_plays(self):
+        """Yield every play as a dict, oldest first (full scan)."""
+        games = self.index["games"]
+        for ts, score, gid, initials in self._read_records(0):
+            yield {
+                "game": games[gid] if gid < len(games) else "?",
+                "score": score,
+                "initials": initials,
+                "ts": ts,
+            }
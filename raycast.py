@@ -0,0 +1,204 @@
+"""
+Raycast - Shared first-person column renderer
+=============================================
+Vectorized raycasting for first-person content: the 3D galleries
+(visuals/gallery3d.py), visuals/win95maze.py, games/portal.py, and the
+voxel terrain march in visuals/drift3d.py.
+
+Grid walls
+    cast() runs the Wolfenstein DDA for every screen column at once: all
+    rays step together, one NumPy pass per grid step, and finished rays
+    drop out. It returns Hits - per-column arrays of the wall cell, face,
+    distance along the ray and texture u - for the caller to shade.
+    A redirect callback can send rays that hit some face (a portal) on
+    from a new origin and heading; their distance keeps accumulating.
+
+Columns to pixels
+    wall_rows() turns per-column wall spans into an (H, W) row mask.
+    shade() applies per-column fog with the same truncation as int().
+    row_distances() is the floor-casting perspective table: the distance
+    to the floor seen by each screen row, for a given eye height.
+    column_fill() resolves front-to-back strips (voxel terrain), giving
+    each pixel the nearest sample whose strip covers it.
+
+All frames are (H, W, 3) arrays indexed [y, x]; callers put them on the
+display (visuals with framebuffer.blit_rgb, games with set_pixel).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Face a ray hit, by the direction it was travelling:
+# side 0 (x step) +x -> west face 3, -x -> east face 1
+# side 1 (y step) +y -> north face 0, -y -> south face 2
+FACE_N, FACE_E, FACE_S, FACE_W = 0, 1, 2, 3
+
+
+def ray_offsets(width, fov):
+    """Angle of each screen column relative to the view direction."""
+    return (np.arange(width) / width - 0.5) * fov
+
+
+class Hits:
+    """Per-column results of cast(). hit marks columns that found a wall
+    within range; the other fields are only meaningful where hit is set.
+
+    cell    grid value of the wall
+    map_x   wall cell column
+    map_y   wall cell row
+    side    0 when an x edge was crossed, 1 for a y edge
+    step_x  +1 / -1 x direction of the last leg
+    step_y  +1 / -1 y direction of the last leg
+    dist    distance along the ray (summed over redirected legs), >= 0.01
+    wall_x  texture u in [0, 1) along the face
+    cos     ray direction of the last leg
+    sin
+    """
+
+    __slots__ = ('hit', 'cell', 'map_x', 'map_y', 'side', 'step_x', 'step_y',
+                 'dist', 'wall_x', 'cos', 'sin')
+
+    @property
+    def face(self):
+        return np.where(self.side == 0,
+                        np.where(self.step_x > 0, FACE_W, FACE_E),
+                        np.where(self.step_y > 0, FACE_N, FACE_S))
+
+
+def cast(grid, px, py, angles, max_steps=64, redirect=None, max_redirects=2):
+    """Cast one ray per angle from (px, py) through grid[y, x] (nonzero is
+    solid). px/py may be scalars or per-ray arrays.
+
+    redirect(hits, rays) is called with the finished hits and the indices
+    of rays that hit something; it returns None or (rays, x, y, angles) for
+    the rays to continue from a new origin and heading.
+    """
+    grid = np.asarray(grid)
+    gh, gw = grid.shape
+    angles = np.asarray(angles, dtype=np.float64)
+    n = len(angles)
+    px = np.broadcast_to(np.asarray(px, dtype=np.float64), (n,))
+    py = np.broadcast_to(np.asarray(py, dtype=np.float64), (n,))
+
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    cos_a[np.abs(cos_a) < 1e-8] = 1e-8
+    sin_a[np.abs(sin_a) < 1e-8] = 1e-8
+
+    map_x = px.astype(np.int64)
+    map_y = py.astype(np.int64)
+    delta_x = np.abs(1.0 / cos_a)
+    delta_y = np.abs(1.0 / sin_a)
+    step_x = np.where(cos_a < 0, -1, 1)
+    step_y = np.where(sin_a < 0, -1, 1)
+    side_x = np.where(cos_a < 0, px - map_x, map_x + 1.0 - px) * delta_x
+    side_y = np.where(sin_a < 0, py - map_y, map_y + 1.0 - py) * delta_y
+
+    hit = np.zeros(n, dtype=bool)
+    side = np.zeros(n, dtype=np.int64)
+    cell = np.zeros(n, dtype=grid.dtype)
+
+    live = np.arange(n)
+    for _ in range(max_steps):
+        take_x = side_x[live] < side_y[live]
+        rx = live[take_x]
+        ry = live[~take_x]
+        side_x[rx] += delta_x[rx]
+        map_x[rx] += step_x[rx]
+        side[rx] = 0
+        side_y[ry] += delta_y[ry]
+        map_y[ry] += step_y[ry]
+        side[ry] = 1
+
+        mx = map_x[live]
+        my = map_y[live]
+        inside = (mx >= 0) & (mx < gw) & (my >= 0) & (my < gh)
+        live = live[inside]
+        found = grid[my[inside], mx[inside]]
+        solid = found != 0
+        done = live[solid]
+        hit[done] = True
+        cell[done] = found[solid]
+        live = live[~solid]
+        if not len(live):
+            break
+
+    dist = np.where(side == 0,
+                    (map_x - px + (1 - step_x) / 2) / cos_a,
+                    (map_y - py + (1 - step_y) / 2) / sin_a)
+    np.maximum(dist, 0.01, out=dist)
+    wall_x = np.where(side == 0, py + dist * sin_a, px + dist * cos_a)
+    wall_x -= np.trunc(wall_x)
+
+    hits = Hits()
+    hits.hit, hits.cell, hits.map_x, hits.map_y = hit, cell, map_x, map_y
+    hits.side, hits.step_x, hits.step_y = side, step_x, step_y
+    hits.dist, hits.wall_x, hits.cos, hits.sin = dist, wall_x, cos_a, sin_a
+
+    if redirect is not None and max_redirects > 0:
+        sent = redirect(hits, np.flatnonzero(hit))
+        if sent is not None:
+            rays, nx, ny, nangles = sent
+            rays = np.asarray(rays, dtype=np.int64)
+            if len(rays):
+                more = cast(grid, nx, ny, nangles, max_steps, redirect,
+                            max_redirects - 1)
+                more.dist += hits.dist[rays]
+                for name in Hits.__slots__:
+                    getattr(hits, name)[rays] = getattr(more, name)
+    return hits
+
+
+# ── Columns to pixels ─────────────────────────────────────────────
+
+def wall_rows(start, end, height):
+    """(height, W) mask of rows start <= y <= end for each column."""
+    ys = np.arange(height)[:, np.newaxis]
+    return (ys >= start) & (ys <= end)
+
+
+def shade(rgb, fog):
+    """rgb * fog truncated to uint8, fog broadcast against rgb's leading
+    axes (one value per column for an (H, W, 3) wall)."""
+    return (rgb * np.asarray(fog)[..., np.newaxis]).astype(np.uint8)
+
+
+@lru_cache(maxsize=8)
+def _row_offsets(height, horizon):
+    # Rows below the horizon; inf on and above it so they divide to 0
+    p = (np.arange(height) - horizon).astype(np.float64)
+    p[p <= 0] = np.inf
+    p.flags.writeable = False
+    return p
+
+
+def row_distances(height, horizon, eye_h=0.5, scale=None):
+    """Floor distance seen by each screen row: eye_h * scale / (y - horizon)
+    below the horizon, 0 on and above it. scale defaults to height."""
+    return (eye_h * (height if scale is None else scale)) / _row_offsets(height, horizon)
+
+
+def column_fill(tops, colors, height):
+    """Resolve front-to-back strips into an (height, W, 3) frame.
+
+    tops[s, c] is the screen row where sample s of column c starts its
+    strip (height or more for no strip); samples are ordered near to far,
+    and each covers from its top down to the previous sample's. Pixels no
+    strip reaches are left zero; the second return value marks the filled
+    ones.
+    """
+    tops = np.asarray(tops)
+    s, w = tops.shape
+    reach = np.minimum.accumulate(tops, axis=0)
+    ys = np.arange(height)
+    # First sample whose running top reaches each row: reach is
+    # non-increasing, so count the samples still below the row.
+    first = np.empty((height, w), dtype=np.int64)
+    for c in range(w):
+        first[:, c] = np.searchsorted(-reach[:, c], -ys, side='left')
+    filled = first < s
+    frame = np.zeros((height, w, 3), dtype=np.uint8)
+    cols = np.broadcast_to(np.arange(w), (height, w))
+    frame[filled] = colors[first[filled], cols[filled]]
+    return frame, filled
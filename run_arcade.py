@@ -19,6 +19,7 @@ import random
 from enum import Enum, auto
 from arcade import Display, InputHandler, Colors, GRID_SIZE, Game, GameState, TERMINAL_STATES
 import update_checker
+import selfplay
 from catalog import (
     register_games, register_visuals, get_all_categories,
     GAME_CATEGORIES, VISUAL_CATEGORIES, VISUAL_CATEGORY_MAP
@@ -525,7 +526,10 @@ def _pick_idle_visual(display):
         return None
     cls = random.choice(candidates)
     vis = cls(display)
-    vis.reset()
+    # Demos with recorded highlights replay one of them; that resets the
+    # visual, so the style is randomized afterwards
+    if not selfplay.start_highlight(vis):
+        vis.reset()
     _randomize_style(vis)
     # Preload: call draw() once to trigger any lazy loading (GIF frames, etc.)
     # This ensures smooth transitions without loading hitches
@@ -679,7 +683,7 @@ def main():
                         idle_transition.draw(display)
                         # Also update new visual during transition
                         if idle_visual:
-                            idle_visual.update(dt)
+                            selfplay.advance(idle_visual, dt)
                     else:
                         idle_cycle_timer += dt
                         import settings as _s
@@ -695,7 +699,7 @@ def main():
                             idle_visual = new_visual
                             idle_cycle_timer = 0.0
                         if idle_visual and not idle_transition.transitioning:
-                            idle_visual.update(dt)
+                            selfplay.advance(idle_visual, dt)
                             idle_visual.draw()
             elif konami_active:
                 konami_timer += dt
@@ -0,0 +1,238 @@
+"""
+Self-Play - Headless runs of the game demos
+===========================================
+Every visuals/*demo.py wraps a games.* class and drives it with an AI
+policy through synthesized InputState. This module steps those demos
+without drawing, at a fixed DT and as fast as the CPU allows (thousands
+of frames a second for most), so demo AIs and game difficulty can be
+tuned offline — tools/selfplay.py is the command line — and runs worth
+showing can be replayed on the cabinet.
+
+Episodes
+    run_episode() seeds random and numpy's global generator, resets the
+    demo and calls update(DT) until its game reaches a terminal state or
+    max_seconds of game time pass. The result records the score, length,
+    level, the frames lives were lost on and how the run ended
+    ('game_over', 'win', 'timeout', or 'error: ...' when the demo raised).
+    A seed gives the same run every time as long as the demo draws its
+    randomness from those generators and doesn't think on the wall clock
+    (chessdemo's timed search does).
+
+Batches
+    run_batch() runs a list of seeds, in a process pool when workers > 1;
+    summarize() reduces the results to score and length statistics and
+    counts of how runs ended.
+
+Highlights
+    An episode's highlight is the HIGHLIGHT_SECONDS window in which it
+    gained the most score. pick_highlights() keeps a demo's best windows
+    and save_highlights() merges them into HIGHLIGHTS_PATH. On the idle
+    screen start_highlight() re-seeds a freshly picked demo with one,
+    fast-forwards towards the window (for at most FAST_FORWARD seconds of
+    real time, so slow demos just start earlier in the run) and hands it
+    a private RNG state; advance() then steps it at the same fixed DT, so the run plays
+    out as recorded whatever else draws random numbers meanwhile.
+    Highlights recorded against older demo code just replay as some
+    other run.
+"""
+
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from arcade import Display, TERMINAL_STATES
+from atomic_io import write_json_atomic
+
+DT = 1 / 30                 # the cabinet's frame time
+HIGHLIGHT_SECONDS = 30.0
+LEAD_IN = 3.0               # seconds replayed before the window
+FAST_FORWARD = 0.3          # most real seconds start_highlight() skips for
+MAX_CATCH_UP = 4            # fixed steps per advance() after a hitch
+KEEP = 5                    # highlights kept per demo
+
+HIGHLIGHTS_PATH = Path(__file__).resolve().parent / "assets" / "selfplay_highlights.json"
+
+_highlights = None
+
+
+def seed_rngs(seed):
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+
+def _window(samples, per_second):
+    """(start frame, score gained) of the best HIGHLIGHT_SECONDS window
+    in per-second score samples."""
+    w = int(HIGHLIGHT_SECONDS)
+    scores = [0] + samples
+    if len(scores) <= w:
+        return 0, scores[-1]
+    start = max(range(len(scores) - w), key=lambda i: scores[i + w] - scores[i])
+    return start * per_second, scores[start + w] - scores[start]
+
+
+def run_episode(demo_cls, seed, max_seconds=300.0, dt=DT):
+    """Play one headless episode of a demo visual; returns a dict."""
+    seed_rngs(seed)
+    demo = demo_cls(Display())
+    seed_rngs(seed)
+    demo.reset()
+    game = demo.game
+    per_second = max(1, round(1 / dt))
+    max_frames = int(max_seconds / dt)
+    lives = getattr(game, 'lives', None)
+    deaths, samples = [], []
+    frames, end = 0, 'timeout'
+    try:
+        while frames < max_frames:
+            demo.update(dt)
+            frames += 1
+            if demo.game is not game or game.state in TERMINAL_STATES:
+                end = 'game_over' if demo.game is not game else game.state.name.lower()
+                break
+            now = getattr(game, 'lives', None)
+            if lives is not None and now is not None and now < lives:
+                deaths.append(frames)
+            lives = now
+            if frames % per_second == 0:
+                samples.append(game.score)
+    except Exception as exc:
+        end = f"error: {exc!r}"
+    start, gain = _window(samples + [game.score], per_second)
+    return {
+        'demo': demo_cls.__name__,
+        'seed': seed,
+        'score': game.score,
+        'frames': frames,
+        'seconds': round(frames * dt, 2),
+        'level': getattr(game, 'level', None),
+        'deaths': deaths,
+        'end': end,
+        'highlight': [start, gain],
+    }
+
+
+def run_batch(demo_cls, seeds, workers=1, **episode_args):
+    """run_episode() for every seed, across worker processes if asked."""
+    play = partial(run_episode, demo_cls, **episode_args)
+    if workers <= 1:
+        return [play(seed) for seed in seeds]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(play, seeds))
+
+
+def _stats(values):
+    if not values:
+        return {}
+    return {'mean': round(statistics.fmean(values), 2), 'median': round(statistics.median(values), 2),
+            'min': min(values), 'max': max(values)}
+
+
+def summarize(results):
+    """Score, length and death statistics over episodes."""
+    firsts = [r['deaths'][0] for r in results if r['deaths']]
+    return {
+        'episodes': len(results),
+        'score': _stats([r['score'] for r in results]),
+        'seconds': _stats([r['seconds'] for r in results]),
+        'deaths': _stats([len(r['deaths']) for r in results]),
+        'first_death_frame': _stats(firsts),
+        'ends': dict(Counter(r['end'] for r in results)),
+    }
+
+
+def pick_highlights(results, keep=KEEP):
+    """The episodes with the best highlight windows, best first."""
+    ok = [r for r in results if not r['end'].startswith('error') and r['highlight'][1] > 0]
+    ok.sort(key=lambda r: r['highlight'][1], reverse=True)
+    return [{'seed': r['seed'], 'start': r['highlight'][0], 'gain': r['highlight'][1],
+             'score': r['score']} for r in ok[:keep]]
+
+
+def load_highlights(path=None):
+    """{demo class name: [highlight, ...]}; the default file is read once."""
+    global _highlights
+    if path is None and _highlights is not None:
+        return _highlights
+    try:
+        with open(path or HIGHLIGHTS_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if path is None:
+        _highlights = data
+    return data
+
+
+def save_highlights(by_demo, path=None):
+    """Merge {demo class name: highlights} into the highlights file."""
+    global _highlights
+    path = path or HIGHLIGHTS_PATH
+    data = dict(load_highlights(path))
+    data.update(by_demo)
+    write_json_atomic(path, dict(sorted(data.items())))
+    if path == HIGHLIGHTS_PATH:
+        _highlights = data
+
+
+# ── Replaying on the cabinet ──────────────────────────────────────
+
+class _Replay:
+    """A replaying demo's fixed-step clock and private RNG states."""
+
+    def __init__(self):
+        self.time = 0.0
+        self.state = random.getstate()
+        self.np_state = np.random.get_state()
+
+
+def start_highlight(vis, highlights=None):
+    """Restart a demo visual on one of its highlights. False (and the
+    visual untouched) when it has none."""
+    entries = (highlights if highlights is not None else load_highlights()).get(type(vis).__name__)
+    if not entries or not hasattr(vis, 'game'):
+        return False
+    entry = random.choice(entries)
+    outer, np_outer = random.getstate(), np.random.get_state()
+    seed_rngs(entry['seed'])
+    vis.reset()
+    deadline = time.monotonic() + FAST_FORWARD
+    for _ in range(entry['start'] - int(LEAD_IN / DT)):
+        vis.update(DT)
+        if time.monotonic() > deadline:
+            break
+    vis.selfplay_replay = _Replay()
+    random.setstate(outer)
+    np.random.set_state(np_outer)
+    return True
+
+
+def advance(vis, dt):
+    """The shell's update() for a visual that may be replaying."""
+    replay = getattr(vis, 'selfplay_replay', None)
+    if replay is None:
+        vis.update(dt)
+        return
+    replay.time += dt
+    steps = min(int(replay.time / DT), MAX_CATCH_UP)
+    replay.time = min(replay.time - steps * DT, DT)
+    if not steps:
+        return
+    outer, np_outer = random.getstate(), np.random.get_state()
+    random.setstate(replay.state)
+    np.random.set_state(replay.np_state)
+    try:
+        for _ in range(steps):
+            vis.update(DT)
+    finally:
+        replay.state = random.getstate()
+        replay.np_state = np.random.get_state()
+        random.setstate(outer)
+        np.random.set_state(np_outer)
@@ -3,12 +3,16 @@ Persistent User Settings
 ========================
 Saves and loads user preferences to a JSON file.
 Settings persist across restarts.
+
+Reads come from the in-memory cache. Saves go through the write-behind
+writer in persistence.py, so a held joystick on a slider doesn't fsync
+every frame.
 """
 
 import os
 import json
 
-from atomic_io import write_json_atomic
+import persistence
 
 # Settings file location (same directory as this script)
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -49,13 +53,15 @@ def _load():
 
 
 def _save():
-    """Save settings to disk."""
+    """Queue a snapshot of the settings for the background writer."""
     if _settings is None:
         return
-    try:
-        write_json_atomic(SETTINGS_FILE, _settings)
-    except Exception:
-        pass
+    persistence.get_writer().submit(SETTINGS_FILE, dict(_settings))
+
+
+def flush():
+    """Write any pending settings change to disk now."""
+    persistence.flush()
 
 
 def get(key, default=None):
@@ -69,7 +75,7 @@ def get(key, default=None):
 
 
 def set(key, value):
-    """Set a setting value and save to disk."""
+    """Set a setting value and schedule a save to disk."""
     global _settings
     if _settings is None:
         _load()
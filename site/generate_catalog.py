@@ -13,6 +13,11 @@ import os
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Top-level modules the emulator provides itself (as shims or stubs);
+# any other top-level module a game or visual imports is loaded as a dep.
+EMULATOR_MODULES = {'arcade', 'highscores', 'settings', 'transitions',
+                    'catalog', 'persistence'}
+
 # Category definitions matching catalog.py exactly
 GAME_CATEGORIES = [
     {"name": "ARCADE GAMES", "color": [230, 35, 35], "key": "arcade"},
@@ -113,6 +118,16 @@ def extract_bool(node):
     return None
 
 
+def root_module(name):
+    """'raycast.py' for an import of a top-level module of this repo that
+    the emulator has to load, else None."""
+    if '.' in name or name in EMULATOR_MODULES:
+        return None
+    if os.path.isfile(os.path.join(ROOT, name + '.py')):
+        return name + '.py'
+    return None
+
+
 def scan_file(filepath, pkg, exported_classes=None):
     """Scan a Python file for Game/Visual classes and cross-package deps.
 
@@ -138,6 +153,14 @@ def scan_file(filepath, pkg, exported_classes=None):
             for alias in node.names:
                 if alias.name == 'numpy' or alias.name.startswith('numpy.'):
                     needs_numpy = True
+        # Shared top-level modules: import raycast / from heightfield import ...
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = ([a.name for a in node.names] if isinstance(node, ast.Import)
+                     else [node.module] if node.module and not node.level else [])
+            for name in names:
+                dep_path = root_module(name)
+                if dep_path and dep_path not in deps:
+                    deps.append(dep_path)
         # Detect numpy imports: from numpy import ...
         if isinstance(node, ast.ImportFrom) and node.module:
             if node.module == 'numpy' or node.module.startswith('numpy.'):
@@ -291,7 +314,12 @@ def scan_painting_entries():
 
 
 def resolve_transitive_deps(file_deps):
-    """Expand deps transitively: if A needs B and B needs C, A needs [B, C]."""
+    """Expand deps transitively: if A needs B and B needs C, A needs [C, B].
+
+    Each dep is listed after the deps it imports itself, because the
+    emulator loads them in list order and a module's imports must already
+    be registered when it runs.
+    """
     resolved = {}
     def _resolve(path, visiting=None):
         if path in resolved:
@@ -301,10 +329,9 @@ def resolve_transitive_deps(file_deps):
         if path in visiting:
             return []
         visiting.add(path)
-        direct = file_deps.get(path, [])
-        full = list(direct)
-        for dep in direct:
-            for sub in _resolve(dep, visiting):
+        full = []
+        for dep in file_deps.get(path, []):
+            for sub in _resolve(dep, visiting) + [dep]:
                 if sub not in full:
                     full.append(sub)
         resolved[path] = full
@@ -447,9 +474,10 @@ def main():
             filepath = os.path.join(pkg_dir, fname)
             module_path = f"{pkg}/{fname}"
             mod_name = fname.replace('.py', '')
-            if pkg_exports and mod_name not in pkg_exports:
-                continue
-            exported = pkg_exports.get(mod_name) if pkg_exports else None
+            # Unregistered modules are still scanned: shared helpers (e.g.
+            # paint_store.py) carry deps and numpy use of their own that
+            # must reach the items importing them.
+            exported = pkg_exports.get(mod_name, set()) if pkg_exports else None
             classes, deps, needs_numpy = scan_file(filepath, pkg, exported)
             if deps:
                 file_deps[module_path] = deps
@@ -466,6 +494,18 @@ def main():
                 }
                 items_by_cat.setdefault(cat_key, []).append(entry)
 
+    # Shared top-level modules pulled in above, and any they import
+    pending = [d for deps in list(file_deps.values()) for d in deps if '/' not in d]
+    while pending:
+        module_path = pending.pop()
+        if module_path in file_deps or module_path in file_numpy:
+            continue
+        _, deps, needs_numpy = scan_file(os.path.join(ROOT, module_path), '', set())
+        file_deps[module_path] = deps
+        if needs_numpy:
+            file_numpy[module_path] = True
+        pending += [d for d in deps if '/' not in d]
+
     # Add dynamically-generated painting visual entries
     for entry in scan_painting_entries():
         items_by_cat.setdefault('art', []).append(entry)
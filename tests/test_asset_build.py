@@ -0,0 +1,72 @@
+"""Tests for asset_build.py — the asset pipelines' driver rebuilds only
+outputs whose source content or parameters changed, adopts outputs it has
+no record of, and keeps going past failures in serial and pooled runs."""
+
+import pytest
+
+import asset_build
+from asset_build import Job, build
+
+
+def _work(src, params):
+    text = open(src).read()
+    if text == "broken":
+        raise ValueError("bad source")
+    return f"{text}:{params['level']}".encode()
+
+
+def _jobs(tmp_path, levels, fetched):
+    jobs = []
+    for name, level in levels.items():
+        src = tmp_path / "src" / name
+        jobs.append(Job(name, tmp_path / "out" / f"{name}.txt", {"level": level},
+                        cached=src if src.exists() else None,
+                        fetch=lambda name=name: fetched.append(name)))
+    return jobs
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_builds_only_what_changed(tmp_path, workers):
+    (tmp_path / "src").mkdir()
+    for name in "abc":
+        (tmp_path / "src" / name).write_text(name)
+    cache = tmp_path / "cache" / "build.json"
+    levels = {"a": 1, "b": 1, "c": 1}
+    fetched = []
+
+    def run():
+        return build(_jobs(tmp_path, levels, fetched), _work, cache, workers=workers)
+
+    assert run() == (["a", "b", "c"], [], [])
+    assert (tmp_path / "out" / "b.txt").read_bytes() == b"b:1"
+    assert run() == ([], [], ["a", "b", "c"])
+
+    levels["a"] = 2                                   # parameters changed
+    (tmp_path / "src" / "b").write_text("b2")         # source changed
+    built, failed, fresh = run()
+    assert (sorted(built), failed, fresh) == (["a", "b"], [], ["c"])
+    assert (tmp_path / "out" / "a.txt").read_bytes() == b"a:2"
+
+    (tmp_path / "out" / "c.txt").unlink()             # output lost
+    (tmp_path / "src" / "a").write_text("broken")     # processing fails
+    levels["a"] = 3
+    built, failed, fresh = run()
+    assert (built, failed, fresh) == (["c"], ["a"], ["b"])
+    assert (tmp_path / "out" / "a.txt").read_bytes() == b"a:2"
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["a.txt", "b.txt", "c.txt"]
+    assert fetched == []
+
+
+def test_adopts_untracked_outputs_and_fetches_missing_sources(tmp_path):
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "old.txt").write_text("built elsewhere")
+    fetched = []
+    jobs = _jobs(tmp_path, {"old": 1, "new": 1}, fetched)
+    cache = tmp_path / "build.json"
+    # No source on disk: the existing output is kept, the missing one is
+    # fetched (and fails here, as fetch returns nothing)
+    assert build(jobs, _work, cache, workers=1) == ([], ["new"], ["old"])
+    assert fetched == ["new"]
+    assert asset_build.BuildCache(cache).records["old"]["source"] is None
+    # Forcing rebuilds regardless, fetching what isn't cached
+    assert build(jobs, _work, cache, workers=1, force=True) == ([], ["old", "new"], [])
@@ -0,0 +1,62 @@
+"""Tests for visuals/atlas_pack.py — packed emulator atlases round-trip
+through the builders' writer, stay views into their buffer, and feed the
+visuals that used to decode base64 JSON."""
+
+import numpy as np
+import pytest
+
+from arcade import Display
+from atomic_io import write_bytes_atomic
+from visuals import painting
+from visuals.atlas_pack import PackedAtlas, pack_atlas
+
+
+def _entries():
+    rng = np.random.default_rng(4)
+    flag = np.zeros((4, 6, 3), np.uint8)
+    flag[:2] = (200, 16, 46)
+    flag[2:] = (255, 255, 255)
+    photo = rng.integers(0, 256, (16, 16, 3), dtype=np.uint8)
+    sprite = [rng.integers(0, 4, (8, 8, 3), dtype=np.uint8) * 60 for _ in range(3)]
+    return {"Art/flag": [flag], "Art/photo": [photo], "Sprites/2": sprite, "plain": [flag[:1]]}
+
+
+def test_roundtrip_views_and_sections(tmp_path):
+    entries = _entries()
+    path = tmp_path / "a.bin"
+    write_bytes_atomic(path, pack_atlas(entries.items()))
+    atlas = PackedAtlas.open(path)
+    assert list(atlas) == list(entries) and "plain" in atlas and atlas.get("nope") is None
+
+    # Few colours are stored exactly; rgb() and rows() agree with array()
+    for key in ("Art/flag", "Sprites/2", "plain"):
+        entry = atlas[key]
+        assert np.array_equal(entry.array(), np.stack(entries[key]))
+        for i in range(len(entry)):
+            assert entry.rgb(i) == entry.array(i).tobytes()
+            assert entry.rows(i) == [[tuple(px) for px in row] for row in entry.array(i).tolist()]
+    assert (atlas["plain"].width, atlas["plain"].height) == (6, 1)
+
+    # 256 random colours are quantized, not dropped
+    photo = atlas["Art/photo"]
+    assert len(photo.palette) // 3 <= 256
+    assert np.abs(photo.array(0).astype(int) - entries["Art/photo"][0]).mean() < 12
+
+    # Index views share the file buffer
+    sprite = atlas["Sprites/2"]
+    assert sprite.indices().shape == (3, 8, 8)
+    assert sprite.indices(1).base is not None and not sprite.indices(1).flags.writeable
+    assert {k: sorted(v) for k, v in atlas.sections().items()} == {
+        "Art": ["flag", "photo"], "Sprites": ["2"]}
+
+    with pytest.raises(ValueError):
+        PackedAtlas(b"not an atlas at all")
+
+
+def test_painting_reads_the_preloaded_atlas(monkeypatch):
+    art = np.zeros((64, 64, 3), np.uint8)
+    art[:, 32:] = (10, 20, 30)
+    monkeypatch.setattr(painting, "_PRELOADED", PackedAtlas(pack_atlas([("mona_lisa", [art])])))
+    monkeypatch.setattr(painting, "ASSETS_DIR", "")
+    vis = painting.PaintingMonaLisa(Display())
+    assert vis.pixels[5][:33] == [(0, 0, 0)] * 32 + [(10, 20, 30)]
@@ -7,7 +7,7 @@ import os
 
 import pytest
 
-from atomic_io import write_json_atomic
+from atomic_io import write_bytes_atomic, write_json_atomic
 
 
 def test_roundtrip(tmp_path):
@@ -38,3 +38,11 @@ def test_failed_serialization_preserves_old_file_and_no_litter(tmp_path):
     assert json.loads(p.read_text()) == {"good": 1}
     # And the aborted write left no temp file behind.
     assert sorted(f.name for f in tmp_path.iterdir()) == ["d.json"]
+
+
+def test_bytes_roundtrip_leaves_no_temp_files(tmp_path):
+    p = tmp_path / "d.bin"
+    write_bytes_atomic(p, b"\x00old")
+    write_bytes_atomic(p, memoryview(b"\x00\xffnew"))
+    assert p.read_bytes() == b"\x00\xffnew"
+    assert [f.name for f in tmp_path.iterdir()] == ["d.bin"]
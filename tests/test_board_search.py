@@ -0,0 +1,202 @@
+"""Tests for games/board_search.py and the board games' search positions —
+Negamax and MonteCarlo on small games, each position class's moves
+against the game's own rules, and the CPU opponent turn flow."""
+
+import random
+import time
+
+from arcade import Display, GameState, InputState
+from games.board_search import WIN, WIN_BOUND, MonteCarlo, Negamax, SearchWorker
+from games.checkers import Checkers, CheckersPosition
+from games.connect4 import Connect4, Connect4CPU, Connect4Position
+from games.go import Go, GoPosition
+from games.go_board import BLACK, PASS, GoBoard
+from games.mancala import Mancala, MancalaPosition
+from games.othello import Othello, OthelloPosition
+
+
+class _Nim:
+    """Take 1-3 sticks; whoever takes the last stick wins."""
+
+    def __init__(self, sticks, side=1):
+        self.sticks = sticks
+        self.side = side
+
+    def moves(self):
+        return [n for n in (3, 2, 1) if n <= self.sticks]
+
+    def play(self, n):
+        return _Nim(self.sticks - n, 3 - self.side)
+
+    def evaluate(self):
+        return -WIN if not self.sticks else 0
+
+    def key(self):
+        return self.sticks
+
+
+def test_negamax_solves_nim_and_prefers_quick_wins():
+    search = Negamax()
+    # Leave a multiple of four
+    for sticks in (5, 6, 7, 13):
+        assert search.search(_Nim(sticks), time_limit=5.0) == sticks % 4
+        assert search.score > WIN_BOUND
+    # Lost positions still return a move
+    assert search.search(_Nim(8), time_limit=5.0) in (1, 2, 3)
+    assert search.score < -WIN_BOUND
+    assert search.search(_Nim(3), time_limit=5.0) == 3
+    assert search.search(_Nim(0)) is None
+
+
+class _CachedNim(_Nim):
+    """moves() hands out one shared list per stick count."""
+
+    CACHE = {}
+
+    def moves(self):
+        return self.CACHE.setdefault(self.sticks, super().moves())
+
+    def play(self, n):
+        return _CachedNim(self.sticks - n, 3 - self.side)
+
+
+def test_search_leaves_moves_lists_alone(monkeypatch):
+    assert Negamax().search(_CachedNim(13), time_limit=5.0) == 1
+    assert all(moves == sorted(moves, reverse=True) for moves in _CachedNim.CACHE.values())
+
+    def no_threads(self):
+        raise RuntimeError("can't start new thread")
+    monkeypatch.setattr("games.board_search.threading.Thread.start", no_threads)
+    worker = SearchWorker(Negamax())
+    worker.start(_Nim(6), time_limit=5.0)
+    assert not worker.busy and worker.poll() == (2,) and worker.poll() is None
+
+
+def test_mancala_extra_turns_keep_the_side():
+    pos = MancalaPosition.from_game(Mancala(Display()))
+    # Four seeds from the third pit end in the store
+    assert pos.moves()[0] == 2
+    again = pos.play(2)
+    assert again.side == pos.side and again.board[6] == 1
+    assert pos.play(0).side != pos.side
+
+    # The position follows the game's sowing, captures and sweep
+    rng = random.Random(5)
+    game = Mancala(Display())
+    while game.state == GameState.PLAYING:
+        pos = MancalaPosition.from_game(game)
+        pit = rng.choice(pos.moves())
+        child = pos.play(pit)
+        game.sow_seeds(pit)
+        assert MancalaPosition.from_game(game).board == child.board
+        assert child.over == (game.state != GameState.PLAYING)
+        if not child.over:
+            assert child.side == game.current_player
+
+
+def test_connect4_search_takes_and_blocks_wins():
+    game = Connect4(Display())
+    for row, col, player in ((5, 0, 1), (5, 1, 1), (5, 2, 1),
+                             (5, 4, 2), (4, 4, 2), (3, 4, 2)):
+        game.board[row][col] = player
+    # Red to move wins at once on the bottom row
+    game.current_player = 1
+    assert Negamax().search(Connect4Position.from_game(game), time_limit=2.0) == 3
+    # Yellow wins on top of its column rather than blocking
+    game.current_player = 2
+    assert Negamax().search(Connect4Position.from_game(game), time_limit=2.0) == 4
+    game.board[2][4] = 1
+    assert Negamax().search(Connect4Position.from_game(game), time_limit=2.0) == 3
+
+
+def test_othello_and_checkers_moves_agree_with_games():
+    rng = random.Random(11)
+    game = Othello(Display())
+    while game.state == GameState.PLAYING:
+        pos = OthelloPosition.from_game(game)
+        moves = pos.moves()
+        assert {(sq & 7, sq >> 3) for sq in moves} == set(game.get_valid_moves(game.current_player))
+        sq = rng.choice(moves)
+        child = pos.play(sq)
+        game.make_move(sq & 7, sq >> 3)
+        game.finish_flip()
+        if game.state == GameState.PLAYING and game.current_player == child.side:
+            assert OthelloPosition.from_game(game).key() == child.key()
+
+    game = Checkers(Display())
+    for _ in range(60):
+        pos = CheckersPosition.from_game(game)
+        moves = pos.moves()
+        if not moves or game.state != GameState.PLAYING:
+            break
+        # First hops match the game's pieces and targets, jumps forced
+        first = {((m[0] & 7, m[0] >> 3), (m[1] & 7, m[1] >> 3)) for m in moves}
+        jumps = game.get_all_jumps(game.current_player)
+        expected = set()
+        for row in range(8):
+            for col in range(8):
+                piece = game.get_piece(col, row)
+                if piece and piece.player == game.current_player:
+                    steps, hops = game.get_moves_for_piece(col, row)
+                    expected |= {((col, row), to) for to in (hops if jumps else steps)}
+        assert first == expected
+        path = rng.choice(moves)
+        for a, b in zip(path, path[1:]):
+            game.make_move(a & 7, a >> 3, b & 7, b >> 3)
+        assert CheckersPosition.from_game(game).key() == pos.play(path).key()
+
+
+def test_monte_carlo_plays_legal_go_moves():
+    game = Go(Display())
+    search = MonteCarlo(seed=1)
+    rng = random.Random(2)
+    for _ in range(6):
+        pos = GoPosition.from_game(game)
+        p = search.search(pos, time_limit=5.0, max_playouts=120)
+        assert search.playouts == 120 and 0.0 <= search.win_rate <= 1.0
+        assert game.place_stone(*game.board.xy(p))
+        assert game.board.cells == pos.play(p).board.cells
+        # A random reply for the other side
+        reply = rng.choice(GoPosition.from_game(game).moves())
+        assert game.place_stone(*game.board.xy(reply))
+    # Only own eyes left to fill: pass
+    board = GoBoard()
+    for y in range(9):
+        for x in range(9):
+            if (x + y) % 3:
+                board.play(board.point(x, y), BLACK)
+    assert GoPosition(board, BLACK).moves() == [PASS]
+    assert GoPosition(board, BLACK, passes=2).moves() == []
+
+
+def _pressed(**buttons):
+    inp = InputState()
+    for name, value in buttons.items():
+        setattr(inp, name, value)
+    return inp
+
+
+def test_cpu_opponent_level_select_and_reply():
+    game = Connect4CPU(Display())
+    assert game.choosing_level and game.level == 1
+    game.update(_pressed(right_pressed=True), 1 / 30)
+    assert game.level == 2
+    game.update(_pressed(action_l=True), 1 / 30)
+    assert not game.choosing_level
+
+    game.LEVELS, game.MIN_THINK = (("TEST", 0.05),), 0.0
+    game.level = 0
+    game.board[5][3] = 1
+    game.current_player = 2
+    for _ in range(500):
+        game.update(InputState(), 1 / 30)
+        if game.current_player == 1 and not game.dropping:
+            break
+        time.sleep(0.01)
+    assert sum(row.count(2) for row in game.board) == 1
+
+    # A long search stops as soon as it is cancelled
+    worker = SearchWorker(Negamax())
+    worker.start(_Nim(200), time_limit=30.0)
+    worker.cancel()
+    assert not worker.busy and worker.poll() is None
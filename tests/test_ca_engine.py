@@ -0,0 +1,164 @@
+"""Tests for visuals/ca_engine.py — the vectorized rules must match the
+per-cell loops the AUTOMATA visuals used before — and for the
+visuals/framebuffer.py blits they draw with."""
+
+import numpy as np
+
+from arcade import Display, GRID_SIZE
+from visuals.framebuffer import blit_points, blit_rgb, read_rgb
+from visuals.ca_engine import (
+    Automaton, LifeRule, CyclicRule, HodgepodgeRule, ElementaryRule,
+    ColonyRule, colony_frame, neighbor_sum, topple, WRAP, OPEN,
+)
+
+
+def _ref_neighbors(grid, x, y, wrap=True):
+    h, w = len(grid), len(grid[0])
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if wrap:
+                yield grid[ny % h][nx % w]
+            elif 0 <= nx < w and 0 <= ny < h:
+                yield grid[ny][nx]
+
+
+def _ref_life(grid):
+    h, w = len(grid), len(grid[0])
+    out = [[0] * w for _ in range(h)]
+    for y in range(h):
+        for x in range(w):
+            n = sum(_ref_neighbors(grid, x, y))
+            out[y][x] = int(n == 3 or (grid[y][x] and n == 2))
+    return out
+
+
+def _ref_hodge(grid, n, k1, k2, g):
+    h, w = len(grid), len(grid[0])
+    out = [[0] * w for _ in range(h)]
+    for y in range(h):
+        for x in range(w):
+            nbs = list(_ref_neighbors(grid, x, y))
+            state = grid[y][x]
+            if state == 0:
+                ill = sum(1 for v in nbs if v == n)
+                infected = sum(1 for v in nbs if 0 < v < n)
+                out[y][x] = min(infected // k1 + ill // k2, n)
+            elif state == n:
+                out[y][x] = 0
+            else:
+                out[y][x] = min((state + sum(nbs)) // 9 + int(g), n)
+    return out
+
+
+def test_neighbor_sum_boundaries():
+    grid = np.zeros((4, 4), dtype=np.uint8)
+    grid[0, 0] = 1
+    assert neighbor_sum(grid, WRAP)[3, 3] == 1
+    assert neighbor_sum(grid, OPEN)[3, 3] == 0
+    assert neighbor_sum(grid, OPEN)[1, 1] == 1
+
+
+def test_life_matches_reference():
+    rng = np.random.default_rng(1)
+    grid = rng.random((16, 16)) < 0.35
+    ref = grid.astype(int).tolist()
+    rule = LifeRule()
+    for _ in range(5):
+        grid = rule.step(grid)
+        ref = _ref_life(ref)
+        assert grid.astype(int).tolist() == ref
+
+
+def test_life_blinker():
+    ca = Automaton(LifeRule(), shape=(5, 5), dtype=bool)
+    ca.grid[2, 1:4] = True
+    ca.step()
+    assert ca.grid[1:4, 2].all() and ca.population() == 3
+    ca.step()
+    assert ca.grid[2, 1:4].all() and ca.generation == 2
+
+
+def test_hodgepodge_matches_reference():
+    rng = np.random.default_rng(2)
+    n = 63
+    grid = np.where(rng.random((12, 12)) < 0.3,
+                    rng.integers(1, n + 1, (12, 12)), 0).astype(np.uint8)
+    ref = grid.tolist()
+    rule = HodgepodgeRule(n, 2, 3, 5.0)
+    for _ in range(6):
+        grid = rule.step(grid)
+        ref = _ref_hodge(ref, n, 2, 3, 5.0)
+        assert grid.tolist() == ref
+
+
+def test_cyclic_advances_on_successor_neighbor():
+    grid = np.zeros((5, 5), dtype=np.uint8)
+    grid[2, 2] = 1
+    out = CyclicRule(states=3, threshold=1).step(grid)
+    # Neighbors of the 1 advance to 1; the 1 itself has no 2s around it
+    assert out[1:4, 1:4].sum() == 9 and out.sum() == 9
+    assert CyclicRule(states=3, threshold=2).step(grid).sum() == 1
+
+
+def test_elementary_rule_90_sierpinski():
+    row = np.zeros(9, dtype=np.uint8)
+    row[4] = 1
+    rule = ElementaryRule(90)
+    row = rule.step(row)
+    assert row.tolist() == [0, 0, 0, 1, 0, 1, 0, 0, 0]
+    row = rule.step(row)
+    assert row.tolist() == [0, 0, 1, 0, 0, 0, 1, 0, 0]
+
+
+def test_topple_conserves_and_sheds_grains():
+    grid = np.zeros((9, 9), dtype=np.int32)
+    grid[4, 4] = 64
+    assert topple(grid, 1000)
+    assert grid.max() < 4 and grid.sum() == 64
+    # Symmetric pile from a center drop
+    assert (grid == grid[::-1]).all() and (grid == grid.T).all()
+
+    edge = np.zeros((3, 3), dtype=np.int32)
+    edge[0, 0] = 4
+    topple(edge, 10)
+    assert edge.sum() == 2  # two grains fell off the open edges
+
+
+def test_colony_step_keeps_invariants():
+    rule = ColonyRule(4, rng=np.random.default_rng(3))
+    grid = np.zeros((32, 32), dtype=np.uint8)
+    strength = np.zeros((32, 32), dtype=np.float32)
+    age = np.zeros((32, 32), dtype=np.float32)
+    rule.seed(grid, strength, age)
+    assert set(np.unique(grid)) <= {0, 1, 2, 3, 4}
+    start = np.count_nonzero(grid)
+    for _ in range(30):
+        rule.step(grid, strength, age, rule.counts(grid))
+    assert np.count_nonzero(grid) > start
+    assert (strength[grid == 0] == 0).all()
+    assert (strength[grid > 0] >= 0.05).all() and strength.max() <= 1.0
+
+    frame = colony_frame(grid, strength, np.full((4, 3), 200, dtype=np.uint8))
+    assert frame.shape == (32, 32, 3)
+    assert (frame[grid == 0] == 0).all()
+
+
+class _FlatDisplay:
+    """The web emulator's Display keeps a flat RGB bytearray."""
+
+    def __init__(self):
+        self.buffer = bytearray(GRID_SIZE * GRID_SIZE * 3)
+
+
+def test_framebuffer_blits_to_flat_and_list_buffers():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+    for display in (Display(), _FlatDisplay()):
+        blit_rgb(display, frame)
+        assert (read_rgb(display) == frame).all()
+        blit_points(display, [0, 5, GRID_SIZE], [1, 2, 0], [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        out = read_rgb(display)
+        assert tuple(out[1, 0]) == (1, 2, 3) and tuple(out[2, 5]) == (4, 5, 6)
@@ -0,0 +1,107 @@
+"""Tests for games/chess_engine.py — perft counts for the 0x88 move
+generator, incremental hash/evaluation against a rebuild, agreement with
+games.chess move rules, and tactical searches."""
+
+import random
+import time
+
+from arcade import Display, InputState
+from games.chess import WHITE, Chess, ChessCPU, QUEEN
+from games.board_search import SearchWorker
+from games.chess_engine import Board, Engine, to_coords
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -"
+ENDGAME = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -"
+PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+
+
+def test_perft_matches_reference_counts():
+    assert Board.start().perft(3) == 8902
+    # Castling, en passant and pins
+    assert Board.from_fen(KIWIPETE).perft(2) == 2039
+    assert Board.from_fen(ENDGAME).perft(3) == 2812
+    # Promotions, including capture-promotions
+    assert Board.from_fen(PROMOTIONS).perft(2) == 264
+
+
+def test_incremental_state_matches_rebuild():
+    rng = random.Random(3)
+    b = Board.from_fen(KIWIPETE)
+    before = (b.hash, b.score, b.king_eg, b.phase, list(b.sq))
+    played = 0
+    for _ in range(60):
+        moves = b.legal_moves()
+        if not moves:
+            break
+        b.make(rng.choice(moves))
+        played += 1
+        fresh = b.copy()
+        fresh.refresh()
+        assert (b.hash, b.score, b.king_eg, b.phase) == \
+            (fresh.hash, fresh.score, fresh.king_eg, fresh.phase)
+    for _ in range(played):
+        b.unmake()
+    assert (b.hash, b.score, b.king_eg, b.phase, b.sq) == before
+
+
+def test_legal_moves_agree_with_game_rules():
+    display = Display()
+    rng = random.Random(7)
+    game = Chess(display)
+    for _ in range(40):
+        board = Board.from_game(game)
+        engine_moves = {to_coords(m)[:2] for m in board.legal_moves()}
+        game_moves = {((x, y), to)
+                      for y in range(8) for x in range(8)
+                      if game.board[y][x] and game.board[y][x].color == game.current_turn
+                      for to in game.get_legal_moves(x, y)}
+        assert engine_moves == game_moves
+        if not engine_moves:
+            break
+        (fx, fy), (tx, ty) = rng.choice(sorted(engine_moves))
+        game.make_move(fx, fy, tx, ty)
+        if game.promoting_pawn:
+            game.promote_pawn(QUEEN)
+        # The snapshot after a move hashes like the position it came from
+        # with the move made incrementally
+        moved = Board.from_game(game)
+        board.make(next(m for m in board.legal_moves()
+                        if to_coords(m)[:2] == ((fx, fy), (tx, ty))))
+        assert moved.hash == board.hash and moved.score == board.score
+
+
+def test_search_finds_mates_and_wins_material():
+    engine = Engine()
+    # Back-rank mate: Ra8#
+    mate = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - -")
+    assert to_coords(engine.search(mate, time_limit=5.0, max_depth=3))[:2] == ((0, 7), (0, 0))
+    assert engine.score > 0 and engine.depth <= 3
+    # Knight fork of king and queen
+    fork = Board.from_fen("q3k3/8/8/3N4/8/8/8/4K3 w - -")
+    assert to_coords(engine.search(fork, time_limit=5.0, max_depth=4))[:2] == ((3, 3), (2, 1))
+    # No legal moves
+    assert engine.search(Board.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - -")) is None
+
+
+def test_worker_searches_in_background():
+    worker = SearchWorker(Engine())
+    worker.start(Board.start(), time_limit=0.2)
+    while worker.poll() is None:
+        pass
+    # Cancelling a long search returns promptly with the thread gone
+    worker.start(Board.start(), time_limit=30.0)
+    worker.cancel()
+    assert not worker.busy and worker.poll() is None
+
+    # The CPU opponent answers on its own thread
+    game = ChessCPU(Display())
+    game.LEVELS, game.MIN_THINK = (("TEST", 0.05),), 0.0
+    game.level, game.choosing_level = 0, False
+    game.make_move(4, 6, 4, 4)
+    for _ in range(500):
+        game.update(InputState(), 1 / 30)
+        if game.current_turn != game.CPU_PLAYER:
+            break
+        time.sleep(0.01)
+    (_, _), (tx, ty) = game.last_move
+    assert game.current_turn == WHITE and game.board[ty][tx].color == game.CPU_PLAYER
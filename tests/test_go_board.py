@@ -0,0 +1,98 @@
+"""Tests for games/go_board.py — incremental groups and liberties against
+a flood fill, ko and superko, area scoring, and the Go game on top."""
+
+import random
+
+from arcade import Display, GameState
+from games.go import KOMI, Go
+from games.go_board import BLACK, EMPTY, PASS, WHITE, GoBoard
+
+
+def _flood_liberties(board, p):
+    color, stones, libs = board.cells[p], {p}, set()
+    todo = [p]
+    while todo:
+        q = todo.pop()
+        for d in board.neighbours:
+            r = q + d
+            if board.cells[r] == EMPTY:
+                libs.add(r)
+            elif board.cells[r] == color and r not in stones:
+                stones.add(r)
+                todo.append(r)
+    return stones, libs
+
+
+def test_groups_and_liberties_match_flood_fill():
+    rng = random.Random(4)
+    for _ in range(10):
+        board, color = GoBoard(), BLACK
+        for _ in range(150):
+            moves = board.legal_moves(color)
+            if not moves:
+                break
+            board.play(rng.choice(moves), color)
+            color = 3 - color
+            h = 0
+            for p in board.points:
+                if board.cells[p] in (BLACK, WHITE):
+                    h ^= board.zobrist[board.cells[p]][p]
+                    stones, libs = _flood_liberties(board, p)
+                    root = board.find(p)
+                    assert set(board.group(p)) == stones and board.liberties(p) == libs
+                    assert board.libs[root] > 0
+                    assert bool(board._atari_at(root, min(libs))) == (len(libs) == 1)
+            assert board.hash == h
+
+
+def test_ko_and_superko():
+    board = GoBoard()
+    for i, (x, y) in enumerate(((1, 0), (2, 0), (0, 1), (3, 1), (2, 1), (2, 2), (1, 2))):
+        board.play(board.point(x, y), WHITE if i % 2 else BLACK)
+    take, retake = board.point(1, 1), board.point(2, 1)
+    assert board.is_legal(take, WHITE)
+    assert board.play(take, WHITE) == [retake]
+    assert board.ko == retake and not board.is_legal(retake, BLACK)
+    # Superko alone still forbids recreating the earlier position
+    board.ko = PASS
+    assert not board.is_legal(retake, BLACK)
+    # A playout copy has no history, so only the simple ko rule
+    assert board.copy().is_legal(retake, BLACK)
+    # After a move elsewhere the position is new again
+    board.play(board.point(8, 8), BLACK)
+    board.play(board.point(7, 7), WHITE)
+    assert board.is_legal(retake, BLACK)
+    # Suicide
+    corner = GoBoard()
+    corner.play(corner.point(1, 0), WHITE)
+    corner.play(corner.point(0, 1), WHITE)
+    assert not corner.is_legal(corner.point(0, 0), BLACK)
+    assert corner.is_eye(corner.point(0, 0), WHITE)
+
+
+def test_area_score_counts_stones_and_enclosed_regions():
+    board = GoBoard()
+    for y in range(9):
+        board.play(board.point(3, y), BLACK)
+        board.play(board.point(5, y), WHITE)
+    # Column 4 touches both colours and is no one's
+    assert board.score(KOMI) == (36, 36 + KOMI)
+    board.play(board.point(4, 4), BLACK)
+    assert board.score() == (37, 36)
+    # A white stone inside Black's area makes that region neutral
+    board.play(board.point(0, 0), WHITE)
+    assert board.score() == (10, 37)
+
+
+def test_game_uses_board_rules_and_score():
+    game = Go(Display())
+    assert game.place_stone(4, 4) and not game.place_stone(4, 4)
+    assert game.board.at(4, 4) == BLACK and game.current_player == WHITE
+    assert game.get_group(4, 4) == {(4, 4)}
+    assert game.get_liberties({(4, 4)}) == {(3, 4), (5, 4), (4, 3), (4, 5)}
+    game.pass_turn()
+    game.pass_turn()
+    # One stone owns the whole empty board
+    assert game.state == GameState.GAME_OVER
+    assert (game.black_score, game.white_score) == (81, KOMI)
+    assert game.winner == BLACK
@@ -0,0 +1,136 @@
+"""Tests for heightfield.py — vectorized noise, 8-neighbor water flow and
+droplet erosion against plain per-cell loops, plus the DriftSim port."""
+
+import math
+
+import numpy as np
+
+from heightfield import (NEIGHBORS8, Droplets, diamond_square, fbm, fbm_grid,
+                         hillshade, perlin, pressure_flow, sample)
+from games.drift_sim import DriftSim, MIN_DEPTH, _terrain_color, terrain_colors
+
+
+def _reference_flow(terrain, water, flow_rate=0.15, min_depth=0.01):
+    h, w = water.shape
+    out = water.copy()
+    for y in range(h):
+        for x in range(w):
+            depth = water[y, x]
+            if depth < min_depth:
+                continue
+            surface = terrain[y, x] + depth
+            for dx, dy, dist in NEIGHBORS8:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                pd = surface - terrain[ny, nx] - water[ny, nx]
+                if pd <= 0 or terrain[ny, nx] - terrain[y, x] > depth * 0.5:
+                    continue
+                flow = min(pd * flow_rate / dist, depth * 0.25)
+                if flow > 0.0001:
+                    out[y, x] -= flow
+                    out[ny, nx] += flow
+    return out
+
+
+def _reference_droplet(height, px, py, hardness, steps=64):
+    size = height.shape[0]
+    dx = dy = 0.0
+    speed, volume, sediment = 1.0, 1.0, 0.0
+    for _ in range(steps):
+        ix, iy = int(px), int(py)
+        gx, gy, old_h = (float(v[0]) for v in sample(height, np.array([px]), np.array([py])))
+        dx = dx * 0.3 - gx * 0.7
+        dy = dy * 0.3 - gy * 0.7
+        dl = math.sqrt(dx * dx + dy * dy)
+        dx /= dl
+        dy /= dl
+        nx, ny = px + dx, py + dy
+        if nx < 0 or nx >= size - 1 or ny < 0 or ny >= size - 1:
+            break
+        diff = float(sample(height, np.array([nx]), np.array([ny]))[2][0]) - old_h
+        capacity = max(max(-diff, 0.0) * speed * volume, 0.01)
+        if sediment < capacity:
+            amount = max(0.0, min((capacity - sediment) * (1.0 - hardness),
+                                  -diff if diff < 0 else capacity * 0.1))
+            height[iy, ix] = max(0.0, height[iy, ix] - amount)
+            sediment += amount
+        else:
+            amount = 0.3 * (sediment - capacity)
+            height[iy, ix] = min(1.0, height[iy, ix] + amount)
+            sediment -= amount
+        speed = max(math.sqrt(max(0.0, speed * speed + diff * 4.0)) * 0.95, 0.1)
+        volume -= 0.01
+        px, py = nx, ny
+
+
+def test_perlin_lattice_and_fbm_grid():
+    xs = np.arange(-3.0, 4.0)
+    assert np.allclose(perlin(xs, xs[::-1]), 0.0)
+    ys, xs = np.mgrid[0:16, 0:16]
+    grid = fbm_grid(16, 16, 0.06, octaves=4, offset=(12.5, 12.5))
+    assert np.allclose(grid, fbm((xs + 12.5) * 0.06, (ys + 12.5) * 0.06, 4))
+    # Octaves are cached; the result is a fresh array
+    again = fbm_grid(16, 16, 0.06, octaves=4, offset=(12.5, 12.5))
+    assert again is not grid and np.array_equal(again, grid)
+    assert np.abs(grid).max() < 1.0
+
+
+def test_pressure_flow_matches_reference():
+    rng = np.random.default_rng(4)
+    terrain = rng.random((12, 12)) * 3.0
+    water = rng.random((12, 12)) * (rng.random((12, 12)) < 0.6)
+    vx = np.zeros_like(water)
+    vy = np.zeros_like(water)
+    out = pressure_flow(terrain, water, vx, vy, 0.15, 0.01)
+    assert np.allclose(out, _reference_flow(terrain, water))
+    assert math.isclose(out.sum(), water.sum())
+    assert np.abs(vx).max() > 0
+
+
+def test_droplet_matches_reference_path():
+    rng = np.random.default_rng(5)
+    base = np.linspace(1.0, 0.0, 32)[np.newaxis, :] * 0.8 + rng.random((32, 32)) * 0.1
+    ours = base.copy()
+    _reference_droplet(base, 5.3, 17.6, 0.5)
+    drops = Droplets()
+    drops.add([5.3], [17.6])
+    flow = np.zeros_like(ours)
+    drops.step(ours, 0.5, steps=64, flow=flow)
+    assert np.allclose(ours, base)
+    assert len(drops) == 0 and flow[17, 5] == 1.0
+
+
+def test_droplet_pool_steps_incrementally():
+    height = np.tile(np.linspace(1.0, 0.0, 32), (32, 1))
+    drops = Droplets(max_steps=10)
+    drops.add(np.full(8, 2.5), np.arange(8) * 3.0 + 4.5)
+    drops.step(height, 0.3, steps=4)
+    assert len(drops) == 8 and np.allclose(drops.px, 6.5)
+    drops.step(height, 0.3, steps=20)
+    assert len(drops) == 0
+    assert height.min() >= 0.0 and height.max() <= 1.0
+
+
+def test_diamond_square_and_hillshade():
+    np.random.seed(6)
+    grid = diamond_square(4)
+    assert grid.shape == (17, 17) and np.isfinite(grid).all()
+    assert math.isclose(hillshade(np.zeros((4, 4)))[1, 1], math.sin(math.radians(45)))
+    # Lit from the northwest: a slope rising to the east faces the light
+    ramp = np.tile(np.arange(8.0), (8, 1))
+    assert hillshade(ramp)[4, 4] > hillshade(ramp[:, ::-1])[4, 4]
+
+
+def test_drift_sim_colors_and_peaks():
+    sim = DriftSim(32, 32)
+    sim.generate_terrain('hills', seed=42)
+    heights = np.array([-120.0, 0.0, 35.0, 200.0, 400.0])
+    assert terrain_colors(heights).tolist() == [list(_terrain_color(h)) for h in heights]
+    assert np.array_equal(sim.combined_colors(), terrain_colors(sim.terrain))
+    for px, py in sim.find_peaks(3):
+        assert sim.terrain[py, px] == sim.terrain[py - 1:py + 2, px - 1:px + 2].max()
+    sim.apply_brush(16, 16, 'water', radius=3, strength=10.0)
+    sim.simulate(0.1)
+    assert (sim.water >= MIN_DEPTH).any()
+    assert not np.array_equal(sim.combined_colors(), terrain_colors(sim.terrain))
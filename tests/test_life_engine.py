@@ -0,0 +1,94 @@
+"""Tests for visuals/life_engine.py — bit-packed Life, XOR-delta rewind and
+the HashLife torus fast-forward, checked against the NumPy reference rule."""
+
+import numpy as np
+import pytest
+
+from visuals.ca_engine import LifeRule
+from visuals.life_engine import BitLife, HashLife, pack, unpack
+
+
+def _reference(grid, gens):
+    rule = LifeRule()
+    for _ in range(gens):
+        grid = rule.step(grid)
+    return grid
+
+
+@pytest.mark.parametrize("shape", [(64, 64), (10, 12), (7, 64), (64, 5)])
+def test_matches_reference_and_rewinds(shape):
+    rng = np.random.default_rng(sum(shape))
+    start = rng.random(shape) < 0.3
+    assert (unpack(pack(start), *shape) == start).all()
+
+    engine = BitLife(*shape)
+    engine.set_grid(start)
+    ref = start
+    for _ in range(30):
+        engine.step()
+        ref = _reference(ref, 1)
+        assert (engine.grid == ref).all()
+    assert engine.population() == int(ref.sum())
+
+    while engine.step_back():
+        pass
+    assert engine.generation == 0
+    assert (engine.grid == start).all()
+
+
+def test_history_is_bounded_and_compact():
+    engine = BitLife(history=50)
+    grid = np.zeros((64, 64), dtype=bool)
+    grid[10, 10:13] = True      # one blinker
+    engine.set_grid(grid)
+    engine.step(100)            # recorded as a single step
+    for _ in range(100):
+        engine.step()
+    assert len(engine.history) == 50
+    # A blinker touches three rows per generation
+    assert engine.history_bytes() <= 50 * (3 * 8 + 8)
+
+
+def test_find_cycle_detects_blinker_period():
+    engine = BitLife()
+    grid = np.zeros((64, 64), dtype=bool)
+    grid[5, 5:8] = True
+    engine.set_grid(grid)
+    assert engine.find_cycle(10) == 2
+
+
+def test_find_cycle_is_resumable():
+    engine = BitLife()
+    grid = np.zeros((64, 64), dtype=bool)
+    grid[1, 2] = grid[2, 3] = grid[3, 1:4] = True    # glider
+    engine.set_grid(grid)
+    seen = {}
+    # A glider on a 64-torus returns home after 4 * 64 generations
+    assert engine.find_cycle(100, seen) is None
+    period = None
+    while period is None:
+        period = engine.find_cycle(100, seen)
+    assert period == 256
+
+
+@pytest.mark.parametrize("gens", [64, 100, 1000])
+def test_hashlife_matches_direct_stepping(gens):
+    rng = np.random.default_rng(gens)
+    start = rng.random((64, 64)) < 0.3
+    out = HashLife().advance_torus(start, gens)
+    assert (out == _reference(start, gens)).all()
+
+
+def test_fast_forward_is_one_rewind_step():
+    engine = BitLife()
+    grid = np.zeros((64, 64), dtype=bool)
+    grid[20:22, 20:22] = True   # block
+    grid[40, 40:43] = True      # blinker
+    engine.set_grid(grid)
+    engine.fast_forward(1 << 20)
+    assert engine.generation == 1 << 20
+    assert (engine.grid == grid).all()   # even generation: blinker is home
+    engine.fast_forward(1)
+    assert not (engine.grid == grid).all()
+    assert engine.step_back() and engine.step_back()
+    assert engine.generation == 0 and (engine.grid == grid).all()
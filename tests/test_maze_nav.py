@@ -0,0 +1,108 @@
+"""Tests for visuals/maze_nav.py — the all-pairs tables and incremental
+distance fields against plain BFS, A* and nearest-cell search, and the
+Pac-Man demo steering by them."""
+
+import random
+from collections import deque
+
+from arcade import Display, GameState
+from games.pacman import PacMan
+from visuals.maze_nav import FAR, DistanceField, MazeGraph, astar, nearest_path
+from visuals.pacmandemo import PacManDemo
+
+
+def _pacman_graph():
+    return MazeGraph.for_grid(PacMan(Display()).maze, lambda t: t not in (1, 4), wrap=True)
+
+
+def _bfs(graph, sources):
+    dist = [FAR] * len(graph.cells)
+    queue = deque()
+    for cell in sources:
+        dist[graph.index[cell]] = 0
+        queue.append(graph.index[cell])
+    while queue:
+        i = queue.popleft()
+        for j, _ in graph.links[i]:
+            if dist[j] == FAR:
+                dist[j] = dist[i] + 1
+                queue.append(j)
+    return dist
+
+
+def test_tables_match_bfs_and_steps_go_downhill():
+    graph = _pacman_graph()
+    assert graph is _pacman_graph()
+    # The side tunnel wraps
+    assert ((20, 9), (-1, 0)) in graph.neighbours((0, 9))
+    rng = random.Random(3)
+    for b in rng.sample(graph.cells, 25):
+        field = _bfs(graph, [b])
+        assert graph.field(b) == field
+        for a in graph.cells:
+            d = field[graph.index[a]]
+            assert graph.distance(a, b) == d
+            step = graph.step(a, b)
+            if d in (0, FAR):
+                assert step is None
+            else:
+                nxt, move = step
+                assert field[graph.index[nxt]] == d - 1
+                assert (nxt, move) in graph.neighbours(a)
+
+
+def test_distance_field_follows_sources():
+    graph = _pacman_graph()
+    rng = random.Random(8)
+    sources = set(rng.sample(graph.cells, 40))
+    field = DistanceField(graph, sources)
+    for _ in range(120):
+        cell = rng.choice(graph.cells)
+        if cell in sources:
+            sources.discard(cell)
+            field.remove(cell)
+        else:
+            sources.add(cell)
+            field.add(cell)
+        assert field.dist == _bfs(graph, sources)
+        probe = rng.choice(graph.cells)
+        if sources:
+            assert graph.distance(probe, field.nearest(probe)) == field[probe]
+    field.update(list(sources)[:3])
+    assert field.dist == _bfs(graph, list(sources)[:3])
+    field.update([])
+    assert field[graph.cells[0]] == FAR and field.step(graph.cells[0]) is None
+
+
+def test_astar_and_nearest_path():
+    grid = ["#########",
+            "#...#...#",
+            "#.#.#.#.#",
+            "#.#...#.#",
+            "#########"]
+
+    def passable(x, y):
+        return grid[y][x] == '.'
+
+    path = astar((1, 1), (7, 1), passable)
+    assert len(path) == 10 and path[-1] == (7, 1)
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip([(1, 1)] + path, path))
+    assert astar((1, 1), (1, 1), passable) == []
+    assert astar((1, 1), (4, 1), passable) is None
+    assert nearest_path((1, 1), lambda x, y: y == 3, passable) == [(1, 2), (1, 3)]
+    assert nearest_path((1, 1), lambda x, y: False, passable) is None
+    # Wrapping rows
+    assert astar((0, 0), (4, 0), lambda x, y: y == 0, wrap_width=5) == [(4, 0)]
+
+
+def test_pacman_demo_clears_pellets():
+    demo = PacManDemo(Display())
+    demo.reset()
+    start = demo.game.dots_remaining
+    for _ in range(30 * 20):
+        demo.update(1 / 30)
+        if demo.game.state == GameState.GAME_OVER:
+            break
+        demo._sync_fields()
+        assert len(demo.pellets.sources) == demo.game.dots_remaining
+    assert demo.game.dots_remaining < start - 40
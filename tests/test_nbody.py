@@ -0,0 +1,137 @@
+"""Tests for visuals/nbody.py — vectorized and Barnes-Hut gravity against a
+pairwise loop, leapfrog energy conservation, sweep-and-prune pairs,
+momentum-conserving merges, and the 3 BODY PROBLEM star cluster that runs
+on Barnes-Hut."""
+
+import math
+
+import numpy as np
+
+import visuals.nbody
+from arcade import Display, InputState
+from visuals.nbody import (NBodySystem, barnes_hut_accel, direct_accel,
+                           potential_at, sweep_pairs)
+
+
+def _reference_accel(x, y, mass, g, soft2):
+    n = len(x)
+    ax = [0.0] * n
+    ay = [0.0] * n
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            dx = x[j] - x[i]
+            dy = y[j] - y[i]
+            d2 = dx * dx + dy * dy + soft2
+            f = g * mass[j] / (d2 * math.sqrt(d2))
+            ax[i] += f * dx
+            ay[i] += f * dy
+    return np.array(ax), np.array(ay)
+
+
+def _cluster(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.normal(32, 8, n), rng.normal(32, 8, n), rng.uniform(0.5, 2.0, n)
+
+
+def test_direct_matches_pairwise_loop():
+    x, y, m = _cluster(40, 0)
+    ax, ay = direct_accel(x, y, m, 800.0, 4.0)
+    rx, ry = _reference_accel(x, y, m, 800.0, 4.0)
+    assert np.allclose(ax, rx) and np.allclose(ay, ry)
+    # Newton's third law: no net force
+    assert abs((m * ax).sum()) < 1e-8 * np.abs(m * ax).sum()
+
+
+def test_barnes_hut_exact_at_zero_theta_and_close_by_default():
+    x, y, m = _cluster(600, 1)
+    # Coincident bodies share the finest cell
+    x[1], y[1] = x[0], y[0]
+    ax, ay = direct_accel(x, y, m, 800.0, 4.0)
+    bx, by = barnes_hut_accel(x, y, m, 800.0, 4.0, theta=0.0)
+    assert np.allclose(bx, ax) and np.allclose(by, ay)
+    bx, by = barnes_hut_accel(x, y, m, 800.0, 4.0)
+    err = np.hypot(bx - ax, by - ay) / np.hypot(ax, ay)
+    assert np.median(err) < 0.03
+
+
+def test_leapfrog_conserves_energy():
+    system = NBodySystem(800.0, 4.0)
+    system.add(32.0, 32.0, 0.0, 0.0, 50.0)
+    for r, phase in ((8.0, 0.0), (15.0, 2.0), (22.0, 4.0)):
+        v = math.sqrt(800.0 * 50.0 / r)
+        system.add(32 + r * math.cos(phase), 32 + r * math.sin(phase),
+                   -v * math.sin(phase), v * math.cos(phase), 0.5)
+    e0 = system.energy()
+    for _ in range(500):
+        system.step(0.0005, 8)
+    assert abs(system.energy() - e0) < 1e-3 * abs(e0)
+    b = system.bodies
+    # Still bound, on roughly the orbits they started on
+    assert np.allclose(np.hypot(b.x[1:] - b.x[0], b.y[1:] - b.y[0]), (8, 15, 22), atol=2.0)
+
+
+def test_sweep_pairs_matches_brute_force():
+    rng = np.random.default_rng(2)
+    x, y = rng.uniform(0, 64, (2, 300))
+    i, j, d2 = sweep_pairs(x, y, 2.5)
+    found = set(zip(i.tolist(), j.tolist()))
+    expect = {(a, b) for a in range(300) for b in range(a + 1, 300)
+              if (x[a] - x[b]) ** 2 + (y[a] - y[b]) ** 2 < 2.5 ** 2}
+    assert found == expect and len(i) == len(found)
+    assert np.allclose(d2, (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2)
+
+
+def test_merge_conserves_mass_and_momentum():
+    system = NBodySystem(800.0, 4.0)
+    system.add(np.array([10.0, 10.5, 11.0, 40.0]), np.array([10.0, 10.0, 10.2, 40.0]),
+               np.array([1.0, -2.0, 0.5, 3.0]), np.array([0.0, 1.0, -1.0, 0.0]),
+               np.array([1.0, 2.0, 3.0, 4.0]), color=np.array([5, 6, 7, 8]))
+    b = system.bodies
+    mass, px, py = b.mass.sum(), (b.mass * b.vx).sum(), (b.mass * b.vy).sum()
+    com = (b.mass * b.x).sum() / mass
+    keep = system.merge(*system.touching(3.0))
+    assert keep.tolist() == [True, False, False, True]
+    assert len(system) == 2 and b.color.tolist() == [5, 8]
+    assert math.isclose(b.mass.sum(), mass)
+    assert math.isclose((b.mass * b.vx).sum(), px)
+    assert math.isclose((b.mass * b.vy).sum(), py)
+    assert math.isclose((b.mass * b.x).sum() / mass, com)
+    assert b.radius[0] == system.radius_for(6.0)
+    assert system.merge(*system.touching(3.0)) is None
+
+
+def test_potential_at_samples():
+    v = potential_at(np.array([3.0, 0.0]), np.array([4.0, -4.0]),
+                     np.array([0.0, 0.0]), np.array([0.0, 4.0]), np.array([10.0, -6.0]), 0.0)
+    assert np.allclose(v, [10.0 / 5 - 6.0 / 3, 10.0 / 4 - 6.0 / 8])
+
+
+def test_cluster_mode_runs_on_barnes_hut(monkeypatch):
+    from visuals.orbits import OrbitsMulti
+
+    walks = []
+    tree = visuals.nbody.barnes_hut_accel
+    monkeypatch.setattr(visuals.nbody, "barnes_hut_accel",
+                        lambda *a, **kw: walks.append(len(a[0])) or tree(*a, **kw))
+    np.random.seed(0)
+    vis = OrbitsMulti(Display())
+    vis.reset()
+    press = InputState()
+    press.action_l = True
+    vis.handle_input(press)
+    assert vis.cluster and len(vis.system) == 800
+    e0 = vis.system.energy()
+    for _ in range(150):
+        vis.update(1 / 30)
+    vis.draw()
+    b = vis.system.bodies
+    assert len(walks) == 300 and set(walks) == {800}
+    assert np.isfinite(b.x).all() and np.isfinite(b.vx).all()
+    # Collapsed and still on screen; the edge push is the only energy leak
+    assert np.median(np.hypot(b.x - 32, b.y - 32)) < 14
+    assert abs(vis.system.energy() - e0) < 0.05 * abs(e0)
+
+    vis.handle_input(press)
+    assert not vis.cluster and len(vis.system) == 3
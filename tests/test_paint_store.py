@@ -0,0 +1,94 @@
+"""Tests for visuals/paint_store.py — delta-based undo and the off-thread
+export used by PAINT and PAINT GIF."""
+
+from PIL import Image
+
+from visuals.paint_store import UndoHistory, ExportJob, copy_canvas
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def _blank(n=8):
+    return [[None] * n for _ in range(n)]
+
+
+def test_undo_redo_roundtrip():
+    canvas = _blank()
+    h = UndoHistory(limit=8)
+    h.checkpoint(canvas)
+    canvas[1][2] = RED
+    h.checkpoint(canvas)
+    canvas[3][4] = BLUE
+    after = copy_canvas(canvas)
+
+    assert h.undo(canvas)
+    assert canvas[3][4] is None and canvas[1][2] == RED
+    assert h.undo(canvas)
+    assert canvas == _blank()
+    assert not h.undo(canvas)
+
+    assert h.redo(canvas) and h.redo(canvas)
+    assert canvas == after
+    assert not h.redo(canvas)
+
+
+def test_steps_store_only_changed_pixels():
+    canvas = _blank()
+    h = UndoHistory(limit=8)
+    h.checkpoint(canvas)
+    canvas[0][0] = RED
+    h.checkpoint(canvas)  # commits the first step
+    assert h.undo_stack == [((0, 0, None, RED),)]
+
+
+def test_undo_after_canvas_replaced():
+    canvas = _blank()
+    canvas[2][2] = RED
+    h = UndoHistory(limit=8)
+    h.checkpoint(canvas)
+    canvas = _blank()  # CLEAR swaps in a fresh canvas
+    assert h.undo(canvas)
+    assert canvas[2][2] == RED
+
+
+def test_limit_drops_oldest():
+    canvas = _blank()
+    h = UndoHistory(limit=2)
+    for x in range(4):
+        h.checkpoint(canvas)
+        canvas[0][x] = RED
+    h.checkpoint(canvas)
+    assert len(h.undo_stack) == 2
+
+
+def test_gif_export_is_atomic_and_complete(tmp_path):
+    frames = []
+    for i in range(4):
+        f = _blank()
+        f[i][i] = RED
+        frames.append(f)
+    path = tmp_path / "anim.gif"
+    job = ExportJob("gif", frames, str(path), duration=100).start()
+    assert job.wait(10)
+    assert job.error is None and job.progress == 1.0
+    assert [p.name for p in tmp_path.iterdir()] == ["anim.gif"]
+    with Image.open(path) as img:
+        assert img.n_frames == 4
+
+
+def test_project_export_writes_frames_dir(tmp_path):
+    path = tmp_path / "proj_001"
+    job = ExportJob("frames", [_blank(), _blank()], str(path)).start()
+    assert job.wait(10) and job.error is None
+    assert sorted(p.name for p in path.iterdir()) == ["frame_000.png", "frame_001.png"]
+    assert [p.name for p in tmp_path.iterdir()] == ["proj_001"]
+
+
+def test_export_runs_inline_without_threads(tmp_path, monkeypatch):
+    def no_threads(self):
+        raise RuntimeError("can't start new thread")
+    monkeypatch.setattr("visuals.paint_store.threading.Thread.start", no_threads)
+    job = ExportJob("png", [_blank()], str(tmp_path / "a.png")).start()
+    assert job.done and job.error is None and job.wait()
+    assert (tmp_path / "a.png").exists()
@@ -0,0 +1,54 @@
+"""Tests for visuals/particles.py — SoA particle store: spawn/kill
+compaction, write-through field views, integrate/wrap and batched draw."""
+
+import numpy as np
+
+from arcade import Display
+from visuals import GRID_SIZE
+from visuals.particles import ParticleStore
+
+
+def test_spawn_grows_and_kill_keeps_order():
+    store = ParticleStore(capacity=2)
+    store.spawn(5, x=np.arange(5.0), species=3)
+    assert len(store) == 5 and store.capacity >= 5
+    assert store.species.tolist() == [3] * 5
+
+    assert store.kill(store.x % 2 == 1) == 2
+    assert store.x.tolist() == [0.0, 2.0, 4.0]
+    store.spawn(x=9.0)
+    assert store.x.tolist() == [0.0, 2.0, 4.0, 9.0]
+
+    store.keep_newest(2)
+    assert store.x.tolist() == [4.0, 9.0]
+
+
+def test_field_assignment_writes_through():
+    store = ParticleStore(extra=('z',))
+    store.spawn(3, vx=1.0, z=[1.0, 2.0, 3.0])
+    store.vx *= 2
+    store.z = 0.5
+    assert store.vx.tolist() == [2.0] * 3
+    assert store.z.tolist() == [0.5] * 3
+    assert store.n == 3
+
+
+def test_integrate_wrap_and_limit_speed():
+    store = ParticleStore()
+    store.spawn(2, x=[GRID_SIZE - 1.0, 1.0], vx=[3.0, -4.0], vy=[4.0, 0.0])
+    store.limit_speed(2.0, min_speed=0.5)
+    assert np.allclose(store.speed(), 2.0)
+    store.integrate(1.0)
+    store.wrap()
+    assert np.allclose(store.x, [(GRID_SIZE - 1.0 + 1.2) % GRID_SIZE, GRID_SIZE - 1.0])
+    assert np.allclose(store.age, 1.0)
+
+
+def test_draw_uses_palette_and_later_wins():
+    display = Display()
+    store = ParticleStore()
+    store.spawn(3, x=[1.5, 1.2, 70.0], y=[2.0, 2.9, 3.0], color=[0, 1, 1])
+    palette = np.array([[255, 0, 0], [0, 255, 0]], dtype=np.uint8)
+    store.draw(display, palette)
+    assert display.buffer[2][1] == (0, 255, 0)
+    assert display.buffer[3][70 % GRID_SIZE] == (0, 255, 0)
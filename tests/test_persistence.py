@@ -0,0 +1,70 @@
+"""Tests for persistence.WriteBehind — the debounced writer that settings.py
+and highscores.py save through. A burst of changes must collapse into one
+atomic write of the newest state, and flush() must never be overtaken by an
+older snapshot."""
+
+import json
+import time
+
+from persistence import WriteBehind
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path, obj):
+        self.calls.append((path, obj))
+
+
+def _wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_burst_coalesces_to_one_write(tmp_path):
+    rec = _Recorder()
+    w = WriteBehind(delay=0.05, max_delay=5.0, write=rec)
+    p = str(tmp_path / "s.json")
+    for v in range(50):
+        w.submit(p, {"brightness": v})
+    assert _wait_for(lambda: rec.calls)
+    time.sleep(0.1)
+    assert rec.calls == [(p, {"brightness": 49})]
+    assert w.pending() == []
+
+
+def test_max_delay_bounds_a_held_button(tmp_path):
+    rec = _Recorder()
+    w = WriteBehind(delay=0.2, max_delay=0.1, write=rec)
+    p = str(tmp_path / "s.json")
+    w.submit(p, {"v": 0})
+    end = time.monotonic() + 0.5
+    v = 0
+    while time.monotonic() < end and not rec.calls:
+        v += 1
+        w.submit(p, {"v": v})  # never idle long enough to debounce
+        time.sleep(0.02)
+    assert rec.calls, "continuous changes were never written"
+
+
+def test_flush_writes_atomically_and_clears(tmp_path):
+    w = WriteBehind(delay=60.0, max_delay=60.0)
+    p = tmp_path / "s.json"
+    w.submit(p, {"gamma": 2.2})
+    w.submit(p, {"gamma": 2.4})
+    w.flush()
+    assert json.loads(p.read_text()) == {"gamma": 2.4}
+    assert w.pending() == []
+    assert [f.name for f in tmp_path.iterdir()] == ["s.json"]
+
+
+def test_write_errors_are_swallowed(tmp_path):
+    w = WriteBehind(delay=60.0, max_delay=60.0)
+    w.submit(tmp_path / "missing-dir" / "s.json", {"v": 1})
+    w.flush()  # must not raise
+    assert w.pending() == []
@@ -0,0 +1,119 @@
+"""Tests for play_history.PlayHistory — the append-only play log behind
+HighScoreManager.log_play and the STATS screen. The aggregates in index.json
+must stay exact across segment rotation, renames, legacy import, and a power
+cut between a record append and the index save."""
+
+import json
+
+import play_history
+from play_history import PlayHistory, RECORD
+
+
+def test_append_updates_aggregates(tmp_path):
+    h = PlayHistory(tmp_path / "h")
+    h.append("PING", 10, "ABC", ts=1_700_000_000)
+    h.append("PING", 30, "XYZ", ts=1_700_000_100)
+    h.append("SNAKE", 5, ts=1_700_000_200)
+    assert h.total_plays == 3
+    assert h.plays_per_game() == {"PING": 2, "SNAKE": 1}
+    assert h.best_scores() == {"PING": 30, "SNAKE": 5}
+    assert sum(h.plays_per_day().values()) == 3
+
+    reopened = PlayHistory(tmp_path / "h")
+    assert reopened.plays_per_game() == {"PING": 2, "SNAKE": 1}
+    assert [p["initials"] for p in reopened.iter_plays()] == ["ABC", "XYZ", ""]
+
+
+def test_segments_rotate(tmp_path, monkeypatch):
+    monkeypatch.setattr(play_history, "SEGMENT_RECORDS", 4)
+    h = PlayHistory(tmp_path / "h")
+    for i in range(10):
+        h.append("PING", i, ts=1_700_000_000 + i)
+    segs = sorted(p.name for p in (tmp_path / "h").glob("seg-*.bin"))
+    assert segs == ["seg-000000.bin", "seg-000001.bin", "seg-000002.bin"]
+    assert [p["score"] for p in PlayHistory(tmp_path / "h").iter_plays()] == list(range(10))
+
+
+def test_uncounted_tail_and_torn_record_recovered(tmp_path):
+    h = PlayHistory(tmp_path / "h")
+    h.append("PING", 1, ts=1_700_000_000)
+    # Simulate a power cut: a full record landed but the index didn't,
+    # followed by half of another record.
+    h._append_record(1_700_000_050, 99, h._game_id("PING"), "QQQ")
+    seg = tmp_path / "h" / "seg-000000.bin"
+    with open(seg, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    recovered = PlayHistory(tmp_path / "h")
+    assert recovered.total_plays == 2
+    assert recovered.best_scores() == {"PING": 99}
+    assert seg.stat().st_size == 2 * RECORD.size
+
+
+def test_lost_index_keeps_old_game_ids(tmp_path):
+    h = PlayHistory(tmp_path / "h")
+    h.append("PING", 1, ts=1_700_000_000)
+    h.append("SNAKE", 2, ts=1_700_000_000)
+    (tmp_path / "h" / "index.json").write_text("{not json")
+
+    h = PlayHistory(tmp_path / "h")
+    assert h.plays_per_game() == {"?": 2}
+    h.append("TETRIS", 3, ts=1_700_000_000)
+    reopened = PlayHistory(tmp_path / "h")
+    assert reopened.plays_per_game() == {"?": 2, "TETRIS": 1}
+    assert [p["game"] for p in reopened.iter_plays()] == ["?", "?", "TETRIS"]
+
+
+def test_rename_merges_aggregates(tmp_path):
+    h = PlayHistory(tmp_path / "h")
+    h.append("PONG", 50, ts=1_700_000_000)
+    h.append("PING", 20, ts=1_700_000_000)
+    assert h.rename_games({"PONG": "PING"})
+    assert h.plays_per_game() == {"PING": 2}
+    assert h.best_scores() == {"PING": 50}
+    assert {p["game"] for p in h.iter_plays()} == {"PING"}
+    assert not h.rename_games({"PONG": "PING"})
+
+
+def test_legacy_jsonl_imported_once(tmp_path):
+    legacy = tmp_path / "play_history.jsonl"
+    legacy.write_text("\n".join(json.dumps(e) for e in [
+        {"game": "SNAKE", "score": 4, "initials": "", "ts": 1_700_000_000},
+        {"game": "SNAKE", "score": 9, "initials": "", "ts": 1_700_000_001},
+    ]) + "\n")
+    h = PlayHistory(tmp_path / "h", legacy_path=legacy)
+    assert h.plays_per_game() == {"SNAKE": 2}
+    assert not legacy.exists()
+    again = PlayHistory(tmp_path / "h", legacy_path=legacy)
+    assert again.total_plays == 2
+
+
+def test_legacy_import_is_bulk_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(play_history, "SEGMENT_RECORDS", 4)
+    entries = [{"game": "PING", "score": i, "initials": "AB", "ts": 1_700_000_000 + i}
+               for i in range(10)]
+    legacy = tmp_path / "play_history.jsonl"
+    legacy.write_text("\n".join(json.dumps(e) for e in entries) + "\n")
+    writes = []
+    write = PlayHistory._write_segment
+    monkeypatch.setattr(PlayHistory, "_write_segment",
+                        lambda self, seg, data: writes.append(seg) or write(self, seg, data))
+    h = PlayHistory(tmp_path / "h", legacy_path=legacy)
+    assert h.total_plays == 10 and writes == [0, 1, 2]  # one write + fsync per segment
+
+    # Power lost partway through: the file was already claimed and three
+    # records landed, but the index never counted them
+    legacy.write_text("\n".join(json.dumps(e) for e in entries) + "\n")
+    h = PlayHistory(tmp_path / "h2")
+    gid = h._game_id("PING")
+    h.index["legacy_start"] = 0
+    h._save_index()
+    legacy.rename(legacy.with_suffix(".jsonl.importing"))
+    for e in entries[:3]:
+        h._append_record(e["ts"], e["score"], gid, "AB")
+        h.index["records"] += 1
+    resumed = PlayHistory(tmp_path / "h2", legacy_path=legacy)
+    assert [p["score"] for p in resumed.iter_plays()] == list(range(10))
+    assert resumed.plays_per_game() == {"PING": 10}
+    assert legacy.with_suffix(".jsonl.migrated").exists()
+    assert "legacy_start" not in resumed.index
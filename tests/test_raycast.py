@@ -0,0 +1,123 @@
+"""Tests for raycast.py — vectorized DDA against a per-ray loop, redirected
+rays, the floor row table and front-to-back strip filling."""
+
+import math
+
+import numpy as np
+
+from raycast import FACE_E, FACE_W, cast, column_fill, ray_offsets, row_distances
+
+
+def _reference_ray(grid, px, py, angle, max_steps):
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    if abs(cos_a) < 1e-8:
+        cos_a = 1e-8
+    if abs(sin_a) < 1e-8:
+        sin_a = 1e-8
+    map_x, map_y = int(px), int(py)
+    delta_x, delta_y = abs(1.0 / cos_a), abs(1.0 / sin_a)
+    step_x = -1 if cos_a < 0 else 1
+    step_y = -1 if sin_a < 0 else 1
+    side_x = ((px - map_x) if cos_a < 0 else (map_x + 1.0 - px)) * delta_x
+    side_y = ((py - map_y) if sin_a < 0 else (map_y + 1.0 - py)) * delta_y
+    for _ in range(max_steps):
+        if side_x < side_y:
+            side_x += delta_x
+            map_x += step_x
+            side = 0
+        else:
+            side_y += delta_y
+            map_y += step_y
+            side = 1
+        if not (0 <= map_x < len(grid[0]) and 0 <= map_y < len(grid)):
+            return None
+        if grid[map_y][map_x]:
+            if side == 0:
+                dist = (map_x - px + (1 - step_x) / 2) / cos_a
+            else:
+                dist = (map_y - py + (1 - step_y) / 2) / sin_a
+            dist = max(dist, 0.01)
+            wall_x = py + dist * sin_a if side == 0 else px + dist * cos_a
+            return grid[map_y][map_x], map_x, map_y, side, dist, wall_x - int(wall_x)
+    return None
+
+
+def _room(w=16, h=12, seed=0):
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((h, w)) < 0.15).astype(np.uint8) * rng.integers(1, 5, (h, w))
+    grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = 1
+    grid[5:7, 5:7] = 0
+    return grid.astype(np.uint8)
+
+
+def test_cast_matches_per_ray_loop():
+    grid = _room()
+    rows = grid.tolist()
+    for px, py, heading in ((5.5, 5.5, 0.0), (6.2, 5.1, 2.4), (5.01, 6.99, -math.pi / 2)):
+        angles = heading + ray_offsets(64, math.pi / 3)
+        for steps in (64, 3):
+            hits = cast(grid, px, py, angles, steps)
+            for c, angle in enumerate(angles):
+                ref = _reference_ray(rows, px, py, angle, steps)
+                assert hits.hit[c] == (ref is not None)
+                if ref is not None:
+                    cell, mx, my, side, dist, wall_x = ref
+                    assert (hits.cell[c], hits.map_x[c], hits.map_y[c], hits.side[c]) == \
+                        (cell, mx, my, side)
+                    assert hits.dist[c] == dist and hits.wall_x[c] == wall_x
+
+
+def test_redirect_continues_rays_and_sums_distance():
+    grid = np.ones((9, 20), dtype=np.uint8)
+    grid[1:8, 1:8] = 0      # room A
+    grid[1:8, 11:19] = 0    # room B
+    grid[4, 8] = 2          # portal on A's east wall
+    grid[4, 18] = 3         # marker at the far end of B
+
+    def through_portal(hits, rays):
+        sent = rays[hits.cell[rays] == 2]
+        if not len(sent):
+            return None
+        # Exit from B's west wall, same row offset, same heading
+        y = 4.0 + hits.wall_x[sent]
+        return sent, np.full(len(sent), 11.0), y, np.arctan2(hits.sin[sent], hits.cos[sent])
+
+    angles = np.array([0.0, 0.0, math.pi / 2])
+    hits = cast(grid, np.array([4.0, 4.0, 4.0]), np.array([4.5, 2.5, 4.5]), angles,
+                redirect=through_portal)
+    # 4 units to the portal plus 7 across room B to the marker
+    assert hits.cell[0] == 3 and math.isclose(hits.dist[0], 4.0 + 7.0)
+    assert hits.face[0] == FACE_W
+    # Rays that missed the portal are untouched
+    assert hits.cell[1] == 1 and math.isclose(hits.dist[1], 4.0)
+    assert hits.cell[2] == 1 and math.isclose(hits.dist[2], 3.5)
+    # Without the hook the portal is just a wall
+    plain = cast(grid, 4.0, 4.5, [0.0, math.pi])
+    assert plain.cell.tolist() == [2, 1] and plain.face[1] == FACE_E
+
+
+def test_row_distances():
+    d = row_distances(64, 32, eye_h=0.5)
+    assert (d[:33] == 0).all()
+    assert d[33] == 0.5 * 64 / 1 and d[63] == 0.5 * 64 / 31
+    assert (np.diff(d[33:]) < 0).all()
+    ys = np.arange(33, 64)
+    assert np.array_equal(row_distances(64, 32, 0.75, scale=40)[33:], 30.0 / (ys - 32))
+
+
+def test_column_fill_matches_strip_loop():
+    rng = np.random.default_rng(3)
+    tops = rng.integers(-5, 80, (40, 16))
+    colors = rng.integers(0, 256, (40, 16, 3)).astype(np.uint8)
+    frame, filled = column_fill(tops, colors, 64)
+    ref = np.zeros((64, 16, 3), dtype=np.uint8)
+    ref_filled = np.zeros((64, 16), dtype=bool)
+    for c in range(16):
+        max_y = 64
+        for s in range(40):
+            top = max(0, tops[s, c])
+            if top < max_y:
+                ref[top:max_y, c] = colors[s, c]
+                ref_filled[top:max_y, c] = True
+                max_y = top
+    assert np.array_equal(filled, ref_filled) and np.array_equal(frame, ref)
@@ -0,0 +1,77 @@
+"""Tests for visuals/rd_engine.py — float32 Gray-Scott and Lenia models
+against the plain float64 formulas, and the palette LUT draw path."""
+
+import numpy as np
+
+from arcade import Display
+from visuals import GRID_SIZE as N
+from visuals.rd_engine import (GrayScottModel, LeniaModel, draw_field,
+                               palette_lut, ring_kernel)
+
+
+def _lap(x):
+    return (np.roll(x, 1, 0) + np.roll(x, -1, 0) +
+            np.roll(x, 1, 1) + np.roll(x, -1, 1) - 4.0 * x)
+
+
+def _reference_gray_scott(u, v, f, k, steps, du=0.16, dv=0.08):
+    for _ in range(steps):
+        uvv = u * v * v
+        u, v = (u + du * _lap(u) - uvv + f * (1.0 - u),
+                v + dv * _lap(v) + uvv - (f + k) * v)
+    return u, v
+
+
+def test_gray_scott_matches_reference():
+    rng = np.random.default_rng(1)
+    model = GrayScottModel()
+    inner = (slice(1, N + 1), slice(1, N + 1))
+    model.u[inner] = 1.0 - 0.5 * rng.random((N, N))
+    model.v[inner] = 0.5 * rng.random((N, N))
+    u0 = model.u[inner].astype(np.float64)
+    v0 = model.v[inner].astype(np.float64)
+
+    model.step(0.035, 0.065, steps=50)
+    u, v = _reference_gray_scott(u0, v0, 0.035, 0.065, 50)
+    assert model.uv.dtype == np.float32
+    assert np.abs(model.v[inner] - v).max() < 1e-3
+    assert np.abs(model.u[inner] - u).max() < 1e-3
+    # Border holds the wrapped copy of the opposite edge
+    assert np.array_equal(model.v[0, 1:N+1], model.v[N, 1:N+1])
+
+
+def test_lenia_step_matches_reference():
+    rng = np.random.default_rng(2)
+    model = LeniaModel(size=64, radius=7)
+    grid = rng.random((64, 64)) * (rng.random((64, 64)) < 0.35)
+    model.grid[:] = grid
+
+    kfft = np.fft.rfft2(ring_kernel(7, 64))
+    for _ in range(3):
+        pot = np.fft.irfft2(np.fft.rfft2(grid) * kfft, s=grid.shape)
+        growth = 2.0 * np.exp(-((pot - 0.15) ** 2) / (2 * 0.022 ** 2)) - 1.0
+        grid = np.clip(grid + 0.1 * growth, 0.0, 1.0)
+    model.step(0.15, 0.022, 0.1, steps=3)
+    assert model.grid.dtype == np.float32
+    # Table lookup error scales with dt * growth slope / table size
+    assert np.abs(model.grid - grid).max() < 5e-3
+
+
+def test_growth_lut_is_cached_per_params():
+    model = LeniaModel(size=32, radius=5)
+    lut = model.growth_lut(0.15, 0.022, 0.1)
+    assert model.growth_lut(0.15, 0.022, 0.1) is lut
+    assert model.growth_lut(0.16, 0.022, 0.1) is not lut
+    assert model.downsample(16).shape == (16, 16)
+
+
+def test_draw_field_gathers_palette():
+    display = Display()
+    lut = palette_lut([(0, 0, 0), (255, 0, 0)])
+    field = np.zeros((N, N), dtype=np.float32)
+    field[3, 5] = 1.0
+    field[4, 5] = 2.0   # clipped
+    draw_field(display, field, lut)
+    assert display.buffer[3][5] == (255, 0, 0)
+    assert display.buffer[4][5] == (255, 0, 0)
+    assert display.buffer[0][0] == (0, 0, 0)
@@ -0,0 +1,102 @@
+"""Tests for visuals/render3d.py — composed rotations against the scalar
+viewer transform, z-buffered spheres, lines and triangles, and pre-shaded
+sprite stamps."""
+
+import math
+
+import numpy as np
+
+from visuals.render3d import (ZBuffer, ball_sprites, project, rot_x, rot_y, rot_z,
+                              transform)
+
+
+def _scalar_transform(x, y, z, rz, tilt, ry):
+    # The per-point code the molecule viewers used
+    x1 = x * math.cos(rz) - y * math.sin(rz)
+    y1 = x * math.sin(rz) + y * math.cos(rz)
+    y2 = y1 * math.cos(tilt) - z * math.sin(tilt)
+    z2 = y1 * math.sin(tilt) + z * math.cos(tilt)
+    x2 = x1 * math.cos(ry) + z2 * math.sin(ry)
+    z3 = -x1 * math.sin(ry) + z2 * math.cos(ry)
+    return 32 + x2, 28 - y2, z3
+
+
+def test_composed_matrix_matches_scalar_rotations():
+    pts = np.random.default_rng(0).normal(size=(50, 3)) * 5
+    offset, scale = (0.5, -1.0, 2.0), 3.0
+    rz, tilt, ry = 0.7, -0.4, 2.1
+    cam = transform(pts, rot_y(ry) @ rot_x(tilt) @ rot_z(rz), offset, scale)
+    sx, sy, sz = project(cam, 32, 28)
+    for i, (x, y, z) in enumerate(pts):
+        ref = _scalar_transform((x - offset[0]) * scale, (y - offset[1]) * scale,
+                                (z - offset[2]) * scale, rz, tilt, ry)
+        assert np.allclose((sx[i], sy[i], sz[i]), ref)
+
+
+def test_nearest_fragment_wins_regardless_of_order():
+    for order in ((0, 1), (1, 0)):
+        zb = ZBuffer()
+        spheres = [((20, 20, 5.0, 4, (255, 0, 0))), ((22, 20, 0.0, 4, (0, 0, 255)))]
+        for i in order:
+            x, y, z, r, c = spheres[i]
+            zb.spheres(x, y, z, r, c)
+        # The near red ball covers the blue one where they overlap
+        assert zb.color[20, 21, 0] > 0 and zb.color[20, 21, 2] == 0
+        assert zb.color[20, 26, 2] > 0
+        assert zb.depth[20, 20] == 5.0 + 4.0
+    # Equal depth: the later primitive wins, like a stable painter's sort
+    zb = ZBuffer()
+    zb.points([5, 5], [5, 5], [1.0, 1.0], [(10, 10, 10), (20, 20, 20)])
+    assert tuple(zb.color[5, 5]) == (20, 20, 20)
+    zb.points(5, 5, 0.5, (30, 30, 30))
+    assert tuple(zb.color[5, 5]) == (20, 20, 20)
+
+
+def test_lines_cover_endpoints_and_interpolate_depth():
+    zb = ZBuffer(rows=40)
+    zb.lines([0, 10], [0, 30], [0.0, 0.0], [9, 10], [3, 60], [9.0, 0.0], (255, 255, 255))
+    drawn = zb.color[..., 0] > 0
+    # Ten pixels along the x-major line, one per column
+    assert drawn[:4, :10].sum() == 10 and drawn[0, 0] and drawn[3, 9]
+    assert np.allclose(zb.depth[0, 0], 0.0) and np.allclose(zb.depth[3, 9], 9.0)
+    # The vertical line stops at the viewport
+    assert drawn[30:40, 10].all() and not drawn[40:, :].any()
+    dotted = ZBuffer()
+    dotted.lines(0, 0, 0.0, 8, 0, 0.0, (255, 0, 0), step=2)
+    assert np.flatnonzero(dotted.color[0, :, 0]).tolist() == [0, 2, 4, 6, 8]
+
+
+def test_triangles_fill_and_occlude():
+    zb = ZBuffer(bg=(1, 2, 3))
+    quad = np.array([[10, 10, 0.0], [20, 10, 0.0], [20, 20, 0.0], [10, 20, 0.0]])
+    tilted = quad + [5, 5, 0]
+    tilted[:, 2] = [-10.0, 10.0, 10.0, -10.0]     # right half in front
+    for q, c in ((quad, (200, 0, 0)), (tilted, (0, 200, 0))):
+        zb.triangles(q[[0, 0]], q[[1, 2]], q[[2, 3]], [c, c])
+    assert (zb.color[10:21, 10:15, 0] == 200).all()
+    assert (zb.color[15:21, 21:26, 1] == 200).all()
+    # Overlap: the tilted quad crosses z = 0 at x = 20
+    assert zb.color[17, 14, 0] == 200 and zb.color[17, 18, 0] == 200
+    assert zb.color[17, 22, 1] == 200
+    assert tuple(zb.color[0, 0]) == (1, 2, 3)
+    # Edge-on triangles still draw as a line
+    flat = ZBuffer()
+    flat.triangles([[0, 5, 1.0]], [[4, 5, 1.0]], [[8, 5, 1.0]], (9, 9, 9))
+    assert (flat.color[5, :9, 0] == 9).all() and flat.color[5, 9, 0] == 0
+
+
+def test_sprites_match_shaded_spheres():
+    rng = np.random.default_rng(4)
+    n = 40
+    x, y = rng.uniform(-3, 67, n), rng.uniform(-3, 67, n)
+    z = rng.normal(size=n) * 10
+    radii = rng.integers(1, 5, n)
+    palette = np.array([(255, 30, 30), (160, 160, 160), (50, 80, 248)])
+    colors = palette[rng.integers(0, 3, n)]
+    direct, stamped = ZBuffer(), ZBuffer()
+    direct.spheres(x, y, z, radii, colors)
+    sheet, which = ball_sprites(radii, colors)
+    assert len(sheet) <= 12
+    stamped.sprites(sheet, which, x, y, z)
+    assert np.array_equal(direct.color, stamped.color)
+    assert np.array_equal(direct.depth, stamped.depth)
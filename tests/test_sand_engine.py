@@ -0,0 +1,65 @@
+"""Tests for games/sand_engine.py — vectorized falling-sand passes:
+Margolus movement, table-driven reactions and phase changes, heat and
+wind stencils."""
+
+import numpy as np
+
+from games.sand_engine import (SandSim, SAND, WATER, OIL, STONE, FIRE,
+                               STEAM, GUNPOWDER, ICE, EMPTY, AMBIENT)
+
+
+def test_movement_conserves_and_sorts_by_density():
+    np.random.seed(0)
+    sim = SandSim(32, 32)
+    sim.mat[:10] = SAND
+    sim.mat[10:20] = WATER
+    sim.mat[20:22] = OIL
+    for _ in range(300):
+        sim.step()
+    assert (sim.count(SAND), sim.count(WATER), sim.count(OIL)) == (320, 320, 64)
+    # Sand sank to the bottom, oil floats above the water
+    assert (sim.mat[-8:] == SAND).all()
+    oil_rows = np.nonzero(sim.mat == OIL)[0]
+    water_rows = np.nonzero(sim.mat == WATER)[0]
+    assert oil_rows.mean() < water_rows.mean() < 24
+
+
+def test_sand_falls_and_rests_on_stone():
+    np.random.seed(1)
+    sim = SandSim(8, 8)
+    sim.mat[7, :] = STONE
+    sim.paint(4, 0, SAND)
+    for _ in range(40):
+        sim.step()
+    assert sim.mat[6, 4] == SAND and sim.count(SAND) == 1
+
+
+def test_contact_reaction_from_table():
+    sim = SandSim(8, 8)
+    sim.mat[5, :] = STONE
+    sim.mat[6, :] = STONE
+    sim.mat[7, :] = WATER
+    sim.paint(3, 6, FIRE)
+    sim.step()
+    assert sim.mat[6, 3] == STEAM and sim.temp[6, 3] == 100.0
+
+
+def test_heat_melts_and_detonates():
+    np.random.seed(2)
+    sim = SandSim(20, 20)
+    sim.paint(5, 5, ICE)
+    sim.temp[5, 5] = 30.0
+    sim.mat[10, 10] = GUNPOWDER
+    sim.temp[10, 10] = 300.0
+    sim.step()
+    assert sim.count(GUNPOWDER) == 0
+    assert sim.count(FIRE) > 0 and np.abs(sim.wind_x).max() > 0
+    assert sim.mat[5, 5] != ICE
+
+
+def test_empty_room_stays_at_ambient_and_calm():
+    sim = SandSim(16, 16)
+    sim.step()
+    assert np.allclose(sim.temp, AMBIENT)
+    assert not sim.wind_x.any() and not sim.wind_y.any()
+    assert (sim.mat == EMPTY).all()
@@ -0,0 +1,56 @@
+"""Tests for selfplay.py — headless episodes are reproducible per seed,
+batches summarize, and a highlight replays the recorded run on the idle
+screen's clock whatever else draws random numbers."""
+
+import random
+
+import selfplay
+from arcade import Display
+from visuals.pacmandemo import PacManDemo
+from visuals.snakedemo import SnakeDemo
+
+
+def test_episodes_repeat_per_seed_and_summarize():
+    a = selfplay.run_episode(PacManDemo, 3, max_seconds=40)
+    assert a == selfplay.run_episode(PacManDemo, 3, max_seconds=40)
+    assert a['demo'] == 'PacManDemo' and a['score'] > 0
+    assert a['end'] in ('timeout', 'game_over') and a['frames'] <= 1200
+    assert all(0 < f <= a['frames'] for f in a['deaths'])
+
+    results = selfplay.run_batch(SnakeDemo, range(3), max_seconds=10)
+    summary = selfplay.summarize(results)
+    assert summary['episodes'] == 3
+    assert summary['score']['max'] == max(r['score'] for r in results)
+    assert sum(summary['ends'].values()) == 3
+    best = selfplay.pick_highlights(results + [dict(results[0], end="error: boom")], keep=2)
+    assert len(best) <= 2 and all(h['seed'] in range(3) for h in best)
+
+
+def test_highlight_window():
+    # Score per second: flat, then 40 seconds of +10
+    samples = [0] * 50 + [10 * i for i in range(1, 41)]
+    start, gain = selfplay._window(samples, 30)
+    assert gain == 300 and start >= 50 * 30
+    assert selfplay._window([5, 7], 30) == (0, 7)
+
+
+def test_highlight_replays_the_recorded_run(tmp_path):
+    frames = 600
+    recorded = selfplay.run_episode(PacManDemo, 11, max_seconds=frames * selfplay.DT)
+    path = tmp_path / "highlights.json"
+    selfplay.save_highlights({'PacManDemo': [{'seed': 11, 'start': 0, 'gain': 1, 'score': 1}]}, path)
+    highlights = selfplay.load_highlights(path)
+
+    demo = PacManDemo(Display())
+    assert selfplay.start_highlight(demo, highlights)
+    # Uneven frame times, and other code using random in between
+    rng = random.Random(1)
+    while demo.time < frames * selfplay.DT - 1e-6:
+        random.random()
+        selfplay.advance(demo, rng.choice((0.02, 0.033, 0.05)))
+    assert demo.game.score == recorded['score']
+
+    plain = SnakeDemo(Display())
+    assert not selfplay.start_highlight(plain, highlights)
+    selfplay.advance(plain, 0.1)
+    assert plain.time == 0.1
@@ -0,0 +1,44 @@
+"""Tests for visuals/spatial.py — the cell list must find exactly the pairs
+an all-pairs scan would, on the torus and in a walled box."""
+
+import numpy as np
+import pytest
+
+from visuals.spatial import CellList
+
+
+def _brute_pairs(xs, ys, radius, size, wrap):
+    dx = xs[None, :] - xs[:, None]
+    dy = ys[None, :] - ys[:, None]
+    if wrap:
+        dx -= size * np.round(dx / size)
+        dy -= size * np.round(dy / size)
+    d2 = dx * dx + dy * dy
+    np.fill_diagonal(d2, np.inf)
+    return set(zip(*(a.tolist() for a in np.nonzero(d2 < radius * radius))))
+
+
+@pytest.mark.parametrize("wrap", [True, False])
+@pytest.mark.parametrize("n, radius, cell", [
+    (300, 10.0, 10.0),   # 64 is not a multiple of 10: checks the wrap seam
+    (60, 9.0, 9.0),
+    (40, 30.0, 10.0),    # search window wider than the grid
+])
+def test_pairs_match_brute_force(wrap, n, radius, cell):
+    rng = np.random.default_rng(n)
+    xs = rng.uniform(0, 64, n)
+    ys = rng.uniform(0, 64, n)
+    cl = CellList(cell, wrap=wrap).rebuild(xs, ys)
+    i, j, dx, dy, d2 = cl.pairs(radius)
+    assert set(zip(i.tolist(), j.tolist())) == _brute_pairs(xs, ys, radius, 64, wrap)
+    assert len(i) == len(set(zip(i.tolist(), j.tolist())))   # no duplicates
+    assert np.allclose(dx * dx + dy * dy, d2)
+    assert np.allclose(np.bincount(i, minlength=n), cl.neighbor_counts(radius))
+
+
+def test_toroidal_delta_takes_short_way():
+    cl = CellList(8.0).rebuild(np.array([1.0, 63.0]), np.array([32.0, 32.0]))
+    i, j, dx, _dy, _d2 = cl.pairs(4.0)
+    assert sorted(zip(i.tolist(), dx.tolist())) == [(0, -2.0), (1, 2.0)]
+    assert sorted(cl.query(0.0, 32.0, 2.0).tolist()) == [0, 1]
+
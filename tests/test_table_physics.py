@@ -0,0 +1,105 @@
+"""Tests for games/table_physics.py — grid broadphase against a brute-force
+box test, swept collision against thin walls and circles, and pair
+resolution against a nested loop."""
+
+import math
+import random
+
+from games.table_physics import (BroadphaseGrid, StaticGeometry, move_ball,
+                                 resolve_pair, resolve_pairs)
+
+
+class _Body:
+    def __init__(self, x, y, vx, vy):
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+
+
+def _reflect(shape, nx, ny, vx, vy):
+    vn = vx * nx + vy * ny
+    return vx - 2 * vn * nx, vy - 2 * vn * ny
+
+
+def test_grid_query_finds_every_overlapping_box_in_order():
+    rng = random.Random(0)
+    grid = BroadphaseGrid(cell_size=4)
+    boxes = []
+    for i in range(200):
+        x, y = rng.uniform(0, 60), rng.uniform(0, 60)
+        box = (x, y, x + rng.uniform(0, 6), y + rng.uniform(0, 6))
+        boxes.append([i, box])
+        grid.insert(boxes[-1], *box)
+    for item in boxes[::3]:
+        grid.remove(item)
+    live = [item for k, item in enumerate(boxes) if k % 3]
+    assert len(grid) == len(live)
+    for _ in range(100):
+        qx, qy = rng.uniform(0, 60), rng.uniform(0, 60)
+        found = grid.query(qx, qy, qx + 2, qy + 2)
+        expect = [item for item in live
+                  if item[1][0] <= qx + 2 and qx <= item[1][2]
+                  and item[1][1] <= qy + 2 and qy <= item[1][3]]
+        assert all(item in found for item in expect)
+        assert [item[0] for item in found] == sorted(item[0] for item in found)
+
+
+def test_fast_ball_cannot_cross_thin_wall():
+    walls = StaticGeometry(cell_size=16)
+    walls.add_segment(30, 0, 30, 64)
+    # 12 px in one step against a zero-thickness wall with a 2 px contact
+    hit = walls.sweep(20.0, 10.0, 12.0, 0.0, 2.0)
+    assert math.isclose(hit.t, 8.0 / 12.0) and (hit.nx, hit.ny) == (-1.0, 0.0)
+    x, y, vx, vy = move_ball(walls, 20.0, 10.0, 1200.0, 0.0, 0.01, 2.0, _reflect)
+    assert x < 28.0 and vx == -1200.0 and math.isclose(x, 28.0 - 4.0, abs_tol=1e-3)
+    # Moving away, or already past the far end, never hits
+    assert walls.sweep(20.0, 10.0, -12.0, 0.0, 2.0) is None
+    assert walls.sweep(20.0, 70.0, 12.0, 0.0, 2.0) is None
+
+
+def test_sweep_hits_segment_ends_and_circles():
+    shapes = StaticGeometry(cell_size=8)
+    shapes.add_segment(10, 10, 20, 10, tag='rail')
+    post = shapes.add_circle(40, 10, 3, tag='post')
+    # Grazing the rounded end of the rail
+    hit = shapes.sweep(5.0, 11.0, 10.0, 0.0, 2.0)
+    assert hit.shape.tag == 'rail' and hit.nx < 0
+    assert math.isclose(math.hypot(hit.x - 10, hit.y - 10), 2.0)
+    # Head-on into the post: touches at center distance 3 + 1
+    hit = shapes.sweep(30.0, 10.0, 10.0, 0.0, 1.0)
+    assert hit.shape is post and math.isclose(hit.x, 36.0)
+    assert shapes.overlaps(36.5, 10.0, 1.0)[0][0] is post
+
+
+def test_resolve_pairs_matches_nested_loop_and_conserves_momentum():
+    rng = random.Random(1)
+    start = [(rng.uniform(0, 12), rng.uniform(0, 12), rng.uniform(-30, 30),
+              rng.uniform(-30, 30)) for _ in range(10)]
+    ours = [_Body(*s) for s in start]
+    ref = [_Body(*s) for s in start]
+    resolve_pairs(ours, 3.0, 0.7)
+    for i in range(len(ref)):
+        for j in range(i + 1, len(ref)):
+            resolve_pair(ref[i], ref[j], 3.0, 0.7)
+    for a, b in zip(ours, ref):
+        assert (a.x, a.y, a.vx, a.vy) == (b.x, b.y, b.vx, b.vy)
+    assert math.isclose(sum(b.vx for b in ours), sum(s[2] for s in start), abs_tol=1e-9)
+    assert math.isclose(sum(b.vy for b in ours), sum(s[3] for s in start), abs_tol=1e-9)
+
+
+def test_resolve_pairs_leaves_pushed_contacts_for_the_next_call():
+    # Separating a and b pushes b into c, which wasn't close at the start
+    a, b, c = _Body(0.0, 0.0, 0.0, 0.0), _Body(1.0, 0.0, 0.0, 0.0), _Body(4.2, 0.0, 0.0, 0.0)
+    resolve_pairs([a, b, c], 3.0)
+    assert (a.x, b.x, c.x) == (-1.0, 2.0, 4.2)
+    resolve_pairs([a, b, c], 3.0)
+    assert math.isclose(c.x - b.x, 3.0)
+
+
+def test_resolve_pair_unequal_masses():
+    ball = _Body(0.0, 0.0, 50.0, 0.0)
+    pin = _Body(2.0, 0.0, 0.0, 0.0)
+    assert resolve_pair(ball, pin, 3.0, 1.0, 3.0, 1.0)
+    # Heavier ball moves a quarter of the overlap, pin three quarters
+    assert math.isclose(ball.x, -0.25) and math.isclose(pin.x, 2.75)
+    assert math.isclose(3.0 * ball.vx + pin.vx, 150.0)
+    assert math.isclose(ball.vx, 25.0) and math.isclose(pin.vx, 75.0)
+    assert not resolve_pair(ball, pin, 3.0)
@@ -0,0 +1,70 @@
+"""Tests for games/tetris_search.py — bitboard drops, incremental features
+and line clears against a plain board simulation, and the search
+choosing line clears."""
+
+import random
+
+from arcade import Display
+from games.tetris import TETROMINOS, Tetris
+from games.tetris_search import HEIGHT, WIDTH, SHAPES, Stack, best_placement
+
+
+def _drop(board, cells, col):
+    y = 0
+    while all(y + dy + 1 < HEIGHT and not board[y + dy + 1][col + dx] for dx, dy in cells):
+        y += 1
+    return y
+
+
+def _features(board):
+    heights = [next((HEIGHT - y for y in range(HEIGHT) if board[y][x]), 0) for x in range(WIDTH)]
+    holes = sum(1 for x in range(WIDTH) for y in range(HEIGHT)
+                if not board[y][x] and HEIGHT - y < heights[x])
+    return heights, holes
+
+
+def _stack(board):
+    return Stack([sum(1 << x for x in range(WIDTH) if row[x]) for row in board])
+
+
+def test_placements_match_board_simulation():
+    rng = random.Random(6)
+    for _ in range(30):
+        board = [[y > 12 and rng.random() < 0.6 for _ in range(WIDTH)] for y in range(HEIGHT)]
+        for row in board:
+            if all(row):
+                row[rng.randrange(WIDTH)] = False
+        stack = _stack(board)
+        assert (stack.heights, stack.holes) == _features(board)
+        for piece in TETROMINOS:
+            for shape, col, y in stack.placements(piece):
+                cells = TETROMINOS[piece][shape.rotation]
+                assert y == _drop(board, cells, col)
+                placed = [row[:] for row in board]
+                for dx, dy in cells:
+                    placed[y + dy][col + dx] = True
+                kept = [row for row in placed if not all(row)]
+                placed = [[False] * WIDTH for _ in range(HEIGHT - len(kept))] + kept
+                child, lines = stack.place(shape, col, y)
+                assert lines == HEIGHT - len(kept)
+                assert child.rows == _stack(placed).rows
+                assert (child.heights, child.holes) == _features(placed)
+    # Rotations that are the same cells are tried once
+    assert len(SHAPES['O']) == 1 and len(SHAPES['T']) == 4
+
+
+def test_search_takes_the_line_and_reads_the_game():
+    game = Tetris(Display())
+    for x in range(WIDTH):
+        if x not in (4, 5, 6, 7):
+            game.board[HEIGHT - 1][x] = (255, 0, 0)
+    stack = Stack.from_game(game)
+    assert stack.heights == [1, 1, 1, 1, 0, 0, 0, 0, 1, 1] and stack.holes == 0
+    # Flat I fills the gap: rotation 0 cells start at dx 0
+    assert best_placement(stack, 'I') == (0, 4)
+    assert best_placement(stack, 'I', 'O') == (0, 4)
+    # A full row still waiting to clear doesn't count
+    game.board[HEIGHT - 2] = [(0, 255, 0)] * WIDTH
+    assert Stack.from_game(game).rows == stack.rows
+    # Nothing fits in a well filled to the top (column 0 open)
+    assert best_placement(Stack([(1 << WIDTH) - 2] * HEIGHT), 'T') is None
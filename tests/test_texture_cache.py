@@ -0,0 +1,77 @@
+"""Tests for visuals/texture_cache.py — packed mip chains, per-pixel level
+sampling, the byte-bounded LRU and on-disk baked loops."""
+
+import os
+
+import numpy as np
+
+from visuals.texture_cache import (MIP_LEVELS, Texture, TextureCache, bake_frames,
+                                   load_baked, mip_level)
+
+
+def _frames(n=2, size=64, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (n, size, size, 3)).astype(np.uint8)
+
+
+def test_mip_chain_is_rounded_box_average():
+    frames = _frames()
+    tex = Texture(frames)
+    assert len(tex) == 2 and tex.texels.flags.c_contiguous
+    assert tex.widths.tolist() == [64, 32, 16, 8][:MIP_LEVELS]
+    assert np.array_equal(tex.level(0, 1), frames[1])
+    f = frames[1].astype(np.int64)
+    box = (f[0::2, 0::2] + f[1::2, 0::2] + f[0::2, 1::2] + f[1::2, 1::2] + 2) // 4
+    assert np.array_equal(tex.level(1, 1), box)
+    # A flat texture stays flat at every level
+    flat = Texture(np.full((64, 64, 3), 77, dtype=np.uint8))
+    assert (flat.texels == 77).all()
+
+
+def test_sample_mixes_levels_per_pixel():
+    tex = Texture(_frames(seed=1))
+    ty = np.arange(64)[:, np.newaxis]
+    tx = np.arange(64)[np.newaxis, :]
+    lod = np.array([0, 1, 2, 3] * 16)
+    out = tex.sample(1, ty, tx, lod)
+    for level in range(MIP_LEVELS):
+        cols = np.flatnonzero(lod == level)
+        expect = tex.level(level, 1)[ty >> level, cols >> level]
+        assert np.array_equal(out[:, cols], expect)
+    assert mip_level(np.array([0.3, 1.0, 1.9, 2.0, 5.0, 100.0])).tolist() == [0, 0, 0, 1, 2, 3]
+
+
+def test_lru_keeps_recent_textures_under_budget():
+    one = Texture(_frames(1)).nbytes
+    cache = TextureCache(max_bytes=3 * one)
+    calls = []
+
+    def loader(k):
+        def load():
+            calls.append(k)
+            return _frames(1, seed=k)
+        return load
+
+    for k in range(3):
+        cache.get(k, loader(k))
+    cache.get(0, loader(0))          # touch 0: 1 is now the oldest
+    cache.get(3, loader(3))
+    assert 1 not in cache and all(k in cache for k in (0, 2, 3))
+    assert cache.nbytes == 3 * one and calls == [0, 1, 2, 3]
+    # Something bigger than the whole budget is still returned and kept
+    big = cache.get('big', lambda: _frames(8))
+    assert len(big) == 8 and len(cache) == 1 and 'big' in cache
+
+
+def test_baked_frames_round_trip_and_go_stale(tmp_path):
+    frames = _frames(3)
+    src = tmp_path / "visual.py"
+    src.write_text("# source")
+    path = str(tmp_path / "cache" / "visual.npy")
+    assert load_baked(path, str(src)) is None
+    bake_frames(path, frames)
+    assert os.listdir(tmp_path / "cache") == ["visual.npy"]
+    assert np.array_equal(load_baked(path, str(src)), frames)
+    # Editing the source visual invalidates the bake
+    later = os.path.getmtime(path) + 10
+    os.utime(src, (later, later))
+    assert load_baked(path, str(src)) is None
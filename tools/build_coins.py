@@ -6,11 +6,14 @@ Metropolitan Museum of Art Open Access API, process for 64x64 LED display.
 All images are CC0, CC BY, or CC BY-SA (attribution preserved in manifest).
 
 Usage:
-    python tools/build_coins.py                # Build all
+    python tools/build_coins.py                # Build new or changed
     python tools/build_coins.py --list         # Show status
     python tools/build_coins.py --preview      # Contact sheet
     python tools/build_coins.py --rebuild      # Force rebuild all
     python tools/build_coins.py lydian_stater  # Build specific item
+
+Only coins whose source image or shape changed are rebuilt
+(asset_build.py), with the PIL work spread over all cores.
 """
 
 import json, os, sys, functools, time, math
@@ -26,11 +29,15 @@ except ImportError:
     sys.exit("Pillow and numpy required: pip install Pillow numpy")
 
 ROOT     = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import asset_build  # noqa: E402
+
 MANIFEST = ROOT / "tools" / "coins_manifest.json"
 CACHE    = ROOT / "tools" / ".coins_cache"
 OUT_DIR  = ROOT / "assets" / "coins"
 SIZE     = 64
 UA       = "LEDArcadeCoinPipeline/1.0 (educational LED art project)"
+PIPELINE = 1    # bump when processing changes, to rebuild every coin
 
 # Polite delay between network requests (seconds)
 REQUEST_DELAY = 2.0
@@ -73,15 +80,21 @@ def _met_image_url(met_id):
 
 # ── Download ──────────────────────────────────────────────────────
 
-def download(pid, entry):
-    """Download source image, with caching and polite delays."""
-    CACHE.mkdir(parents=True, exist_ok=True)
-
-    # Check cache
+def cached_source(pid):
+    """Source image already in the download cache, if any."""
     for ext in (".jpg", ".png", ".JPG", ".PNG", ".tif"):
         p = CACHE / f"{pid}{ext}"
         if p.exists():
             return p
+    return None
+
+
+def download(pid, entry):
+    """Download source image, with caching and polite delays."""
+    CACHE.mkdir(parents=True, exist_ok=True)
+    cached = cached_source(pid)
+    if cached:
+        return cached
 
     # Resolve image URL based on source
     source = entry.get("source", "wikimedia")
@@ -264,30 +277,22 @@ def process_coin(img, entry):
 
 # ── Build ─────────────────────────────────────────────────────────
 
-def build_one(pid, entry, force=False):
-    """Download, process, save one coin image."""
-    title = entry.get("title", pid)
-    out = OUT_DIR / f"{pid}.png"
-    if out.exists() and not force:
-        return True
+def process(src, params):
+    """Full pipeline for one coin's source image; PNG bytes."""
+    img = Image.open(src).convert("RGB")
+    return asset_build.png_bytes(process_coin(img, params))
 
-    print(f"[{pid}] {title}")
-    src = download(pid, entry)
-    if not src:
-        return False
 
-    try:
-        img = Image.open(src).convert("RGB")
-    except Exception as e:
-        print(f"  FAIL opening image: {e}")
-        return False
+def fetch(entry):
+    print(f"[{entry['id']}] {entry.get('title', entry['id'])}")
+    return download(entry["id"], entry)
 
-    img = process_coin(img, entry)
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    img.save(out, "PNG")
-    print(f"  OK -> {out.name} ({out.stat().st_size:,} bytes)")
-    return True
+def job(entry):
+    params = {"shape": entry.get("shape", "round"), "pipeline": PIPELINE}
+    return asset_build.Job(entry["id"], OUT_DIR / f"{entry['id']}.png", params,
+                           cached=cached_source(entry["id"]),
+                           fetch=functools.partial(fetch, entry))
 
 
 # ── Commands ──────────────────────────────────────────────────────
@@ -301,13 +306,11 @@ def cmd_build(ids=None, force=False):
     if ids:
         coins = [c for c in coins if c["id"] in ids]
 
-    ok = fail = 0
-    for entry in coins:
-        if build_one(entry["id"], entry, force=force):
-            ok += 1
-        else:
-            fail += 1
-    print(f"\nDone: {ok} built, {fail} failed")
+    built, failed, fresh = asset_build.build(
+        [job(c) for c in coins], process, CACHE / "build.json", force=force)
+    for pid in built:
+        print(f"  OK -> {pid}.png")
+    print(f"\nDone: {len(built)} built, {len(failed)} failed, {len(fresh)} up to date")
 
 
 def cmd_list():
@@ -1,8 +1,12 @@
 """
 Download flag images from flagcdn.com and pre-render to pixel data.
-Generates visuals/flag_data.py with RGB pixel arrays for each flag.
+Writes assets/flags/<iso>.png and assets/flags/manifest.py.
+
+Only flags whose download or processing changed are re-rendered
+(asset_build.py), spread over all cores; --rebuild re-renders all.
 """
 
+import functools
 import json
 import math
 import os
@@ -10,11 +14,16 @@ import sys
 import urllib.request
 from collections import Counter
 from PIL import Image
-from io import BytesIO
+from io import BytesIO, StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asset_build  # noqa: E402
+from atomic_io import write_bytes_atomic  # noqa: E402
 
 # Output dimensions
 FLAG_W = 60
 FLAG_H = 40
+PIPELINE = 1    # bump when processing changes, to re-render every flag
 
 # Map our display names to ISO 3166-1 alpha-2 codes
 NAME_TO_ISO = {
@@ -358,78 +367,80 @@ def process_flag(png_data, name):
     return _cleanup_minor_colors(snapped)
 
 
+def render(src, params):
+    """process_flag() on a downloaded flag, as PNG bytes."""
+    with open(src, 'rb') as f:
+        pixels = process_flag(f.read(), params['name'])
+    img = Image.new('RGB', (FLAG_W, FLAG_H))
+    img.putdata([color for row in pixels for color in row])
+    return asset_build.png_bytes(img)
+
+
+def fetch(name, iso, cache_file):
+    print(f"  Downloading {name} ({iso})...")
+    png_data = download_flag(iso)
+    if png_data is None:
+        return None
+    with open(cache_file, 'wb') as f:
+        f.write(png_data)
+    return cache_file
+
+
 def main():
+    force = '--rebuild' in sys.argv[1:]
     cache_dir = os.path.join(os.path.dirname(__file__), '.flag_cache')
     os.makedirs(cache_dir, exist_ok=True)
 
-    output_path = os.path.join(os.path.dirname(__file__), '..', 'visuals', 'flag_data.py')
-
-    flags = {}
-    failed = []
+    assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'flags')
+    os.makedirs(assets_dir, exist_ok=True)
 
     names = sorted(NAME_TO_ISO.keys())
     print(f"Processing {len(names)} flags at {FLAG_W}x{FLAG_H}...")
 
-    for i, name in enumerate(names):
+    jobs = []
+    for name in names:
         iso = NAME_TO_ISO[name]
         cache_file = os.path.join(cache_dir, f"{iso}.png")
-
-        # Use cache if available
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                png_data = f.read()
-        else:
-            print(f"  [{i+1}/{len(names)}] Downloading {name} ({iso})...")
-            png_data = download_flag(iso)
-            if png_data is None:
-                failed.append(name)
-                continue
-            with open(cache_file, 'wb') as f:
-                f.write(png_data)
-
-        pixels = process_flag(png_data, name)
-        continent = NAME_TO_CONTINENT[name]
-        flags[name] = (continent, pixels)
+        jobs.append(asset_build.Job(
+            iso, os.path.join(assets_dir, f"{iso}.png"),
+            {'name': name, 'pipeline': PIPELINE},
+            cached=cache_file if os.path.exists(cache_file) else None,
+            fetch=functools.partial(fetch, name, iso, cache_file)))
+    built, failed, fresh = asset_build.build(
+        jobs, render, os.path.join(cache_dir, 'build.json'), force=force)
+    print(f"  {len(built)} rendered, {len(fresh)} up to date")
 
     if failed:
-        print(f"\nFailed to download: {failed}")
+        print(f"\nFailed: {failed}")
 
-    # Write PNGs to assets/flags/
-    assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'flags')
-    os.makedirs(assets_dir, exist_ok=True)
-
-    for name, (continent, pixels) in flags.items():
-        iso = NAME_TO_ISO[name]
-        img = Image.new('RGB', (FLAG_W, FLAG_H))
-        for y, row in enumerate(pixels):
-            for x, color in enumerate(row):
-                img.putpixel((x, y), color)
-        img.save(os.path.join(assets_dir, f"{iso}.png"))
+    ok = set(built) | set(fresh)
+    flags = {name: NAME_TO_CONTINENT[name] for name in names if NAME_TO_ISO[name] in ok}
 
     # Write manifest with flag metadata
     manifest_path = os.path.join(assets_dir, 'manifest.py')
-    with open(manifest_path, 'w') as f:
-        f.write(f'"""Flag manifest — generated by tools/build_flags.py"""\n\n')
-        f.write(f"FLAG_W = {FLAG_W}\n")
-        f.write(f"FLAG_H = {FLAG_H}\n\n")
-        f.write("# (display_name, continent, iso_code)\n")
-        f.write("FLAGS = [\n")
-        for continent in ['AFRICA', 'AMERICAS', 'ASIA', 'EUROPE', 'OCEANIA']:
-            f.write(f"    # ===== {continent} =====\n")
-            continent_flags = sorted(
-                [(n, c) for n, (c, _) in flags.items() if c == continent]
-            )
-            for name, cont in continent_flags:
-                iso = NAME_TO_ISO[name]
-                f.write(f"    ({name!r}, {cont!r}, {iso!r}),\n")
-            f.write("\n")
-        f.write("]\n")
+    f = StringIO()
+    f.write(f'"""Flag manifest — generated by tools/build_flags.py"""\n\n')
+    f.write(f"FLAG_W = {FLAG_W}\n")
+    f.write(f"FLAG_H = {FLAG_H}\n\n")
+    f.write("# (display_name, continent, iso_code)\n")
+    f.write("FLAGS = [\n")
+    for continent in ['AFRICA', 'AMERICAS', 'ASIA', 'EUROPE', 'OCEANIA']:
+        f.write(f"    # ===== {continent} =====\n")
+        continent_flags = sorted(
+            [(n, c) for n, c in flags.items() if c == continent]
+        )
+        for name, cont in continent_flags:
+            iso = NAME_TO_ISO[name]
+            f.write(f"    ({name!r}, {cont!r}, {iso!r}),\n")
+        f.write("\n")
+    f.write("]\n")
+    write_bytes_atomic(manifest_path, f.getvalue().encode())
 
     total_size = sum(
         os.path.getsize(os.path.join(assets_dir, f))
         for f in os.listdir(assets_dir) if f.endswith('.png')
     )
-    print(f"Done! {len(flags)} PNGs written to assets/flags/ ({total_size / 1024:.0f} KB total)")
+    print(f"Done! {len(flags)} PNGs in assets/flags/ ({total_size / 1024:.0f} KB total)")
 
 
 if __name__ == '__main__':
@@ -1,56 +1,55 @@
 #!/usr/bin/env python3
-"""Generate gallery_atlas.json for the web emulator.
+"""Generate gallery_atlas.bin for the web emulator.
 
 Pre-extracts and encodes all Gallery3D textures so the raycaster
 can run in the browser without filesystem access.
 
 Handles:
-- GalleryArt: PNG paintings → 64×64 base64 RGB
-- GallerySprites: PNG sequences + GIFs → 64×64 base64 RGB frames
-- GallerySMB3/Kirby/Zelda/KidIcarus: BFS sprite extraction → 64×64 base64 RGB
+- GalleryArt: PNG paintings → 64×64 textures
+- GallerySprites: PNG sequences + GIFs → 64×64 texture frames
+- GallerySMB3/Kirby/Zelda/KidIcarus: BFS sprite extraction → 64×64 textures
 
-Salon paintings are served from the existing paintings_atlas.json.
+Textures are written as packed atlases (visuals/atlas_pack.py) keyed
+"<gallery class>/<cell id>".
+
+Salon paintings are served from the existing paintings_atlas.bin.
 Adventure Time is deferred (too large).
 Immersive-only galleries (Automata, Science, Digital, Effects) are skipped.
 
 Usage: python tools/build_gallery_atlas.py
 """
 
-import base64
-import json
-import os
 import sys
 from collections import deque
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from atomic_io import write_bytes_atomic  # noqa: E402
+from visuals.atlas_pack import pack_atlas  # noqa: E402
+
 ASSETS = ROOT / "assets"
-OUT_PATH = ROOT / "site" / "gallery_atlas.json"
+OUT_PATH = ROOT / "site" / "gallery_atlas.bin"
 GRID_SIZE = 64
+DARK = np.array((20, 20, 30), dtype=np.uint8)  # background for transparent pixels
 
 
 def encode_texture(img):
-    """Encode a PIL Image as base64 RGB bytes (64×64)."""
+    """A PIL Image as a 64×64×3 RGB array."""
     if img.size != (GRID_SIZE, GRID_SIZE):
         img = img.resize((GRID_SIZE, GRID_SIZE), Image.NEAREST)
-    raw = bytearray()
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            pixel = img.getpixel((x, y))
-            if len(pixel) == 4:
-                r, g, b, a = pixel
-                if a <= 128:
-                    r, g, b = 20, 20, 30  # dark background for transparent
-            else:
-                r, g, b = pixel[:3]
-            raw.extend([r, g, b])
-    return base64.b64encode(bytes(raw)).decode('ascii')
+    pixels = np.asarray(img, dtype=np.uint8)
+    if pixels.shape[2] == 4:
+        return np.where(pixels[..., 3:] > 128, pixels[..., :3], DARK)
+    return pixels[..., :3]
 
 
 def process_png(path):
-    """Load a single PNG and return [base64_frame]."""
+    """Load a single PNG and return [frame]."""
     if not path.exists():
         return None
     img = Image.open(path).convert("RGB")
@@ -58,7 +57,7 @@ def process_png(path):
 
 
 def process_png_sequence(paths):
-    """Load multiple PNGs and return [base64_frame, ...]."""
+    """Load multiple PNGs and return [frame, ...]."""
     frames = []
     for p in paths:
         if not p.exists():
@@ -69,36 +68,23 @@ def process_png_sequence(paths):
 
 
 def process_gif(path, max_frames=12):
-    """Extract GIF frames and return [base64_frame, ...]."""
+    """Extract GIF frames and return [frame, ...]."""
     if not path.exists():
         return None
-    bg = (20, 20, 30)
     gif = Image.open(path)
     n_frames = getattr(gif, 'n_frames', 1)
     step = max(1, n_frames // max_frames)
     frames = []
     for i in range(0, n_frames, step):
         gif.seek(i)
-        frame = gif.convert("RGBA")
-        frame = frame.resize((GRID_SIZE, GRID_SIZE), Image.NEAREST)
-        raw = bytearray()
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                r, g, b, a = frame.getpixel((x, y))
-                if a > 128:
-                    raw.extend([r, g, b])
-                else:
-                    raw.extend(bg)
-        frames.append(base64.b64encode(bytes(raw)).decode('ascii'))
+        frames.append(encode_texture(gif.convert("RGBA")))
         if len(frames) >= max_frames:
             break
     return frames if frames else None
 
 
 def extract_sprites_from_sheet(path, max_sprite_dim=120):
-    """BFS-extract sprites from a sprite sheet, return list of base64 textures."""
-    import numpy as np
-
+    """BFS-extract sprites from a sprite sheet, return list of textures."""
     if not path.exists():
         return []
 
@@ -115,7 +101,6 @@ def extract_sprites_from_sheet(path, max_sprite_dim=120):
 
     pixels = np.array(img)
     bg = pixels[0, 0, :3].astype(np.int16)
-    bg_rgb = tuple(int(v) for v in bg)
 
     diff = np.abs(pixels[:, :, :3].astype(np.int16) - bg[None, None, :])
     alpha = pixels[:, :, 3]
@@ -148,25 +133,16 @@ def extract_sprites_from_sheet(path, max_sprite_dim=120):
 
     components.sort(key=lambda c: (c[1], c[0]))
 
-    dark = (20, 20, 30)
     textures = []
     for (cx, cy, cw, ch, _) in components:
         crop = img.crop((cx, cy, cx + cw, cy + ch))
         sz = max(cw, ch)
         sq = Image.new("RGBA", (sz, sz), (0, 0, 0, 0))
         sq.paste(crop, ((sz - cw) // 2, (sz - ch) // 2))
-        sized = sq.resize((GRID_SIZE, GRID_SIZE), Image.NEAREST)
-        raw = bytearray()
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                r, g, b, a = sized.getpixel((x, y))
-                if (a > 128 and not (abs(r - bg_rgb[0]) < 30
-                                     and abs(g - bg_rgb[1]) < 30
-                                     and abs(b - bg_rgb[2]) < 30)):
-                    raw.extend([r, g, b])
-                else:
-                    raw.extend(dark)
-        textures.append(base64.b64encode(bytes(raw)).decode('ascii'))
+        sized = np.asarray(sq.resize((GRID_SIZE, GRID_SIZE), Image.NEAREST))
+        near_bg = (np.abs(sized[..., :3].astype(np.int16) - bg).max(axis=2) < 30)
+        keep = (sized[..., 3] > 128) & ~near_bg
+        textures.append(np.where(keep[..., None], sized[..., :3], DARK))
     return textures
 
 
@@ -227,7 +203,7 @@ def build_fixed_gallery(name, paintings_dict):
 
 
 def build_sprite_museum(cls_name, sheets):
-    """Extract sprites from all sheets, return {cell_id_str: [b64_frame]}."""
+    """Extract sprites from all sheets, return {cell_id_str: [frame]}."""
     all_textures = []
     for sheet_file in sheets:
         path = ASSETS / sheet_file
@@ -237,14 +213,21 @@ def build_sprite_museum(cls_name, sheets):
         all_textures.extend(textures)
 
     result = {}
-    for i, tex_b64 in enumerate(all_textures):
+    for i, texture in enumerate(all_textures):
         cell_id = i + 2  # cell_ids start at 2
-        result[str(cell_id)] = [tex_b64]
+        result[str(cell_id)] = [texture]
     return result
 
 
+def write_atlas(path, galleries):
+    """Pack {gallery class: {cell id: frames}} into one atlas file."""
+    write_bytes_atomic(path, pack_atlas(
+        (f"{cls_name}/{cell_id}", frames)
+        for cls_name, cells in galleries.items()
+        for cell_id, frames in cells.items()))
+
+
 def main():
-    os.makedirs(OUT_PATH.parent, exist_ok=True)
     atlas = {}
 
     # GalleryArt
@@ -262,8 +245,7 @@ def main():
         print(f"  {len(sprites)} textures")
 
     # Main gallery atlas (small galleries only)
-    with open(OUT_PATH, 'w') as f:
-        json.dump(atlas, f)
+    write_atlas(OUT_PATH, atlas)
     size_kb = OUT_PATH.stat().st_size / 1024
     print(f"\nGallery atlas: {OUT_PATH} ({size_kb:.0f} KB)")
 
@@ -272,9 +254,8 @@ def main():
         print(f"\nBuilding {cls_name}...")
         museum = build_sprite_museum(cls_name, sheets)
         if museum:
-            out_file = OUT_PATH.parent / f"gallery_{cls_name}.json"
-            with open(out_file, 'w') as f:
-                json.dump({cls_name: museum}, f)
+            out_file = OUT_PATH.parent / f"gallery_{cls_name}.bin"
+            write_atlas(out_file, {cls_name: museum})
             size_kb = out_file.stat().st_size / 1024
             print(f"  {len(museum)} sprites → {out_file.name} ({size_kb:.0f} KB)")
 
@@ -4,16 +4,21 @@ Build pipeline: download paintings from Wikimedia Commons,
 crop to square, resize to 64x64, color-correct for LED display.
 
 Usage:
-    python tools/build_paintings.py                # Build all
+    python tools/build_paintings.py                # Build new or changed
     python tools/build_paintings.py starry_night   # Build specific
+    python tools/build_paintings.py --rebuild [id ...]  # Force rebuild
     python tools/build_paintings.py --list         # Show status
     python tools/build_paintings.py --meta         # Print Python dict
     python tools/build_paintings.py --preview      # Contact sheet
     python tools/build_paintings.py --search "van gogh starry"
     python tools/build_paintings.py --atlas         # Build web emulator atlas
     python tools/build_paintings.py --clean         # Clear download cache
+
+Only paintings whose source image or crop/colour settings changed are
+rebuilt (asset_build.py), with the PIL work spread over all cores.
 """
 
+import functools
 import json, os, sys, time
 import urllib.request, urllib.parse
 from pathlib import Path
@@ -24,11 +29,16 @@ except ImportError:
     sys.exit("Pillow required: pip install Pillow")
 
 ROOT     = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import asset_build  # noqa: E402
+
 MANIFEST = ROOT / "tools" / "paintings.json"
 OUT_DIR  = ROOT / "assets" / "paintings"
 CACHE    = ROOT / "tools" / ".painting_cache"
 SIZE     = 64
 UA       = "LEDArcadePaintingPipeline/1.0"
+PIPELINE = 1    # bump when processing changes, to rebuild every painting
+PARAMS   = ("crop", "saturation", "contrast", "brightness")
 
 
 # ── Wikimedia Commons API ──────────────────────────────────────────
@@ -77,15 +87,21 @@ def wikimedia_search(query, limit=8):
 
 # ── Download ───────────────────────────────────────────────────────
 
-def download(pid, entry):
-    """Download source image, with caching."""
-    CACHE.mkdir(parents=True, exist_ok=True)
-
-    # Check cache (any extension)
+def cached_source(pid):
+    """Source image already in the download cache, if any."""
     for ext in (".jpg", ".png", ".gif", ".jpeg"):
         p = CACHE / f"{pid}{ext}"
         if p.exists():
             return p
+    return None
+
+
+def download(pid, entry):
+    """Download source image, with caching."""
+    CACHE.mkdir(parents=True, exist_ok=True)
+    cached = cached_source(pid)
+    if cached:
+        return cached
 
     # Resolve URL
     if "url" in entry:
@@ -175,32 +191,37 @@ def color_correct(img, entry):
 
 # ── Build ─────────────────────────────────────────────────────────
 
-def build_one(pid, entry):
-    """Download, process, save one painting."""
+def process(src, params):
+    """Crop, colour-correct and shrink one source image; PNG bytes."""
+    img = Image.open(src).convert("RGB")
+    img = crop_square(img, params.get("crop", "center"))
+    img = color_correct(img, params)
+    img = img.resize((SIZE, SIZE), Image.LANCZOS)
+    return asset_build.png_bytes(img)
+
+
+def fetch(pid, entry):
+    """Download one painting's source (the build's only network step)."""
     title = entry.get("title", pid)
     artist = entry.get("artist", "?")
     year = entry.get("year", "?")
     print(f"[{pid}] {title} — {artist}, {year}")
-
     src = download(pid, entry)
-    if not src:
-        return False
+    time.sleep(0.3)  # polite to Wikimedia
+    return src
 
-    img = Image.open(src).convert("RGB")
-    img = crop_square(img, entry.get("crop", "center"))
-    img = color_correct(img, entry)
-    img = img.resize((SIZE, SIZE), Image.LANCZOS)
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    out = OUT_DIR / f"{pid}.png"
-    img.save(out, "PNG")
-    print(f"  OK → {out.name} ({out.stat().st_size:,} bytes)")
-    return True
+def job(pid, entry):
+    params = {k: entry[k] for k in PARAMS if k in entry}
+    params["pipeline"] = PIPELINE
+    return asset_build.Job(pid, OUT_DIR / f"{pid}.png", params,
+                           cached=cached_source(pid),
+                           fetch=functools.partial(fetch, pid, entry))
 
 
 # ── Commands ──────────────────────────────────────────────────────
 
-def cmd_build(ids=None):
+def cmd_build(ids=None, force=False):
     manifest = json.loads(MANIFEST.read_text())
     targets = {k: v for k, v in manifest.items() if not ids or k in ids}
     if ids:
@@ -208,16 +229,13 @@ def cmd_build(ids=None):
         for m in missing:
             print(f"Unknown painting: {m}")
 
-    ok = fail = 0
-    for pid, entry in targets.items():
-        if build_one(pid, entry):
-            ok += 1
-        else:
-            fail += 1
-        time.sleep(0.3)  # polite to Wikimedia
-
-    print(f"\nDone: {ok} built, {fail} failed out of {ok + fail}")
-    if ok:
+    built, failed, fresh = asset_build.build(
+        [job(pid, entry) for pid, entry in targets.items()], process,
+        CACHE / "build.json", force=force)
+    for pid in built:
+        print(f"  OK → {pid}.png")
+    print(f"\nDone: {len(built)} built, {len(failed)} failed, {len(fresh)} up to date")
+    if built:
         print(f"Output: {OUT_DIR}/")
 
 
@@ -280,14 +298,17 @@ def cmd_search(query):
 
 
 def cmd_atlas():
-    """Generate paintings atlas JSON for the web emulator.
+    """Generate the paintings atlas for the web emulator.
 
-    Packs all built 64x64 painting PNGs into a single JSON file
-    with base64-encoded raw RGB data per painting.
+    Packs all built 64x64 painting PNGs into one packed atlas
+    (visuals/atlas_pack.py), one palette-indexed entry per painting.
     """
-    import base64
+    import numpy as np
+    from atomic_io import write_bytes_atomic
+    from visuals.atlas_pack import pack_atlas
+
     manifest = json.loads(MANIFEST.read_text())
-    atlas = {}
+    entries = []
     for pid in manifest:
         png_path = OUT_DIR / f"{pid}.png"
         if not png_path.exists():
@@ -295,17 +316,11 @@ def cmd_atlas():
         img = Image.open(png_path).convert("RGB")
         if img.size != (SIZE, SIZE):
             img = img.resize((SIZE, SIZE), Image.NEAREST)
-        raw = bytearray()
-        for y in range(SIZE):
-            for x in range(SIZE):
-                r, g, b = img.getpixel((x, y))
-                raw.extend([r, g, b])
-        atlas[pid] = base64.b64encode(bytes(raw)).decode('ascii')
+        entries.append((pid, [np.asarray(img)]))
 
-    out_path = ROOT / "site" / "paintings_atlas.json"
-    with open(out_path, 'w') as f:
-        json.dump(atlas, f)
-    print(f"Atlas: {out_path} ({len(atlas)} paintings, {out_path.stat().st_size:,} bytes)")
+    out_path = ROOT / "site" / "paintings_atlas.bin"
+    write_bytes_atomic(out_path, pack_atlas(entries))
+    print(f"Atlas: {out_path} ({len(entries)} paintings, {out_path.stat().st_size:,} bytes)")
 
 
 def cmd_clean():
@@ -333,6 +348,8 @@ def main():
         cmd_atlas()
     elif args[0] == "--clean":
         cmd_clean()
+    elif args[0] == "--rebuild":
+        cmd_build(set(args[1:]) or None, force=True)
     else:
         cmd_build(set(args))
 
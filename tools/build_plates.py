@@ -4,7 +4,7 @@ Build pipeline: download naturalist plates from Wikimedia Commons,
 resize to 64px wide (maintaining aspect ratio), color-correct for LED display.
 
 Usage:
-    python tools/build_plates.py haeckel              # Build all Haeckel plates
+    python tools/build_plates.py haeckel              # Build new or changed Haeckel plates
     python tools/build_plates.py audubon              # Build all Audubon plates
     python tools/build_plates.py merian               # Build all Merian plates
     python tools/build_plates.py haeckel --list        # Show status
@@ -12,10 +12,14 @@ Usage:
     python tools/build_plates.py haeckel --atlas       # Build web emulator atlas
     python tools/build_plates.py haeckel --search "jellyfish"
     python tools/build_plates.py haeckel discomedusae  # Build specific plate
+    python tools/build_plates.py haeckel --rebuild     # Force rebuild all
     python tools/build_plates.py --clean               # Clear download cache
+
+Only plates whose source image or colour settings changed are rebuilt
+(asset_build.py), with the PIL work spread over all cores.
 """
 
-import json, os, sys, time, base64, functools
+import json, os, sys, time, functools
 import urllib.request, urllib.parse, urllib.error
 
 # Unbuffered print so background builds show progress
@@ -29,42 +33,49 @@ except ImportError:
     sys.exit("Pillow and numpy required: pip install Pillow numpy")
 
 ROOT     = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import asset_build  # noqa: E402
+
 CACHE    = ROOT / "tools" / ".plates_cache"
 WIDTH    = 64
 UA       = "LEDArcadePlatePipeline/1.0"
+PIPELINE = 1    # bump when processing changes, to rebuild every plate
+# Collection settings and per-plate overrides that shape the output
+PARAMS   = ("auto_white_balance", "wb_percentile", "wb_threshold",
+            "saturation", "contrast", "brightness")
 
 COLLECTIONS = {
     "haeckel": {
         "manifest": ROOT / "tools" / "haeckel_plates.json",
         "out_dir":  ROOT / "assets" / "haeckel",
-        "atlas":    ROOT / "site" / "haeckel_atlas.json",
+        "atlas":    ROOT / "site" / "haeckel_atlas.bin",
         "auto_white_balance": True,  # slight green tint on some plates
         "contrast": 1.2,             # many plates are low-contrast
     },
     "audubon": {
         "manifest": ROOT / "tools" / "audubon_plates.json",
         "out_dir":  ROOT / "assets" / "audubon",
-        "atlas":    ROOT / "site" / "audubon_atlas.json",
+        "atlas":    ROOT / "site" / "audubon_atlas.bin",
         # Clean white paper, no correction needed
     },
     "merian": {
         "manifest": ROOT / "tools" / "merian_plates.json",
         "out_dir":  ROOT / "assets" / "merian",
-        "atlas":    ROOT / "site" / "merian_atlas.json",
+        "atlas":    ROOT / "site" / "merian_atlas.bin",
         "auto_white_balance": True,
         "saturation": 1.3,
     },
     "redoute": {
         "manifest": ROOT / "tools" / "redoute_plates.json",
         "out_dir":  ROOT / "assets" / "redoute",
-        "atlas":    ROOT / "site" / "redoute_atlas.json",
+        "atlas":    ROOT / "site" / "redoute_atlas.bin",
         "auto_white_balance": True,  # strong sepia on aged paper
         "saturation": 1.3,           # roses need vivid color
     },
     "gould": {
         "manifest": ROOT / "tools" / "gould_plates.json",
         "out_dir":  ROOT / "assets" / "gould",
-        "atlas":    ROOT / "site" / "gould_atlas.json",
+        "atlas":    ROOT / "site" / "gould_atlas.bin",
         "auto_white_balance": True,  # heavy sepia from aged paper
         "saturation": 1.35,          # hummingbird iridescence needs punch
         "contrast": 1.2,
@@ -163,16 +174,22 @@ def wikimedia_search(query, limit=8):
 
 # ── Download ───────────────────────────────────────────────────────
 
-def download(pid, entry):
-    """Download source image, with caching."""
-    global _backoff_delay
-    CACHE.mkdir(parents=True, exist_ok=True)
-
-    # Check cache (any extension)
+def cached_source(pid):
+    """Source image already in the download cache, if any."""
     for ext in (".jpg", ".png", ".gif", ".jpeg"):
         p = CACHE / f"{pid}{ext}"
         if p.exists():
             return p
+    return None
+
+
+def download(pid, entry):
+    """Download source image, with caching."""
+    global _backoff_delay
+    CACHE.mkdir(parents=True, exist_ok=True)
+    cached = cached_source(pid)
+    if cached:
+        return cached
 
     # Resolve URL
     if "url" in entry:
@@ -271,32 +288,41 @@ def color_correct(img, entry, collection_cfg=None):
 
 # ── Build ─────────────────────────────────────────────────────────
 
-def build_one(pid, entry, out_dir, collection_cfg=None):
-    """Download, process, save one plate (64px wide, variable height)."""
-    title = entry.get("title", pid)
-
-    # Skip if already built
-    out = out_dir / f"{pid}.png"
-    if out.exists():
-        return True
-
-    print(f"[{pid}] {title}")
-    src = download(pid, entry)
-    if not src:
-        return False
-
+def process(src, params):
+    """Resize one source image to 64px wide and colour-correct; PNG bytes."""
     img = Image.open(src).convert("RGB")
     # Resize to 64px wide, maintaining aspect ratio
     w, h = img.size
     new_h = int(h * WIDTH / w)
     img = img.resize((WIDTH, new_h), Image.LANCZOS)
-    img = color_correct(img, entry, collection_cfg)
+    img = color_correct(img, {}, params)
+    return asset_build.png_bytes(img)
+
+
+_downloads = 0   # network fetches this run, for the politeness delay
+
+
+def fetch(entry):
+    """Download one plate's source, waiting out the backoff delay
+    between Wikimedia downloads."""
+    global _downloads
+    if _downloads and "file" in entry and "url" not in entry:
+        print(f"  Waiting {_backoff_delay:.0f}s...")
+        time.sleep(_backoff_delay)
+    _downloads += 1
+    print(f"[{entry['id']}] {entry.get('title', entry['id'])}")
+    return download(entry["id"], entry)
+
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out = out_dir / f"{pid}.png"
-    img.save(out, "PNG")
-    print(f"  OK → {out.name} ({WIDTH}x{new_h}, {out.stat().st_size:,} bytes)")
-    return True
+def job(entry, cfg):
+    """The plate's output with its effective settings (plate overrides
+    beat collection defaults)."""
+    params = {k: entry.get(k, cfg.get(k)) for k in PARAMS
+              if k in entry or k in cfg}
+    params["pipeline"] = PIPELINE
+    return asset_build.Job(entry["id"], cfg["out_dir"] / f"{entry['id']}.png", params,
+                           cached=cached_source(entry["id"]),
+                           fetch=functools.partial(fetch, entry))
 
 
 # ── Commands ──────────────────────────────────────────────────────
@@ -306,7 +332,7 @@ def load_manifest(collection):
     return json.loads(cfg["manifest"].read_text())
 
 
-def cmd_build(collection, ids=None):
+def cmd_build(collection, ids=None, force=False):
     cfg = COLLECTIONS[collection]
     plates = load_manifest(collection)
     if ids:
@@ -315,50 +341,16 @@ def cmd_build(collection, ids=None):
         for m in ids - found:
             print(f"Unknown plate: {m}")
 
-    # Filter to plates that actually need building
-    to_build = [p for p in plates
-                if not (cfg["out_dir"] / f"{p['id']}.png").exists()]
-    already_done = len(plates) - len(to_build)
-    if already_done:
-        print(f"Skipping {already_done} already-built plates")
-    if not to_build:
-        print("All plates already built.")
-        return
-
-    # Only delay for uncached Wikimedia sources (rate-limit politeness)
-    uses_wikimedia = any("file" in p and "url" not in p for p in to_build)
-    if uses_wikimedia:
-        print(f"Building {len(to_build)} plates "
-              f"(Wikimedia sources will delay ~{_backoff_delay:.0f}s between downloads)...")
-    else:
-        print(f"Building {len(to_build)} plates...")
-
-    ok = fail = 0
-    last_downloaded = False  # track if previous plate hit the network
-    for i, entry in enumerate(to_build):
-        if last_downloaded and uses_wikimedia:
-            print(f"  Waiting {_backoff_delay:.0f}s...")
-            time.sleep(_backoff_delay)
-        last_downloaded = not _is_cached(entry["id"])
-        if build_one(entry["id"], entry, cfg["out_dir"],
-                     collection_cfg=cfg):
-            ok += 1
-        else:
-            fail += 1
-
-    print(f"\nDone: {ok} built, {fail} failed out of {ok + fail}")
-    if ok:
+    built, failed, fresh = asset_build.build(
+        [job(p, cfg) for p in plates], process,
+        CACHE / f"{collection}_build.json", force=force)
+    for pid in built:
+        print(f"  OK → {pid}.png")
+    print(f"\nDone: {len(built)} built, {len(failed)} failed, {len(fresh)} up to date")
+    if built:
         print(f"Output: {cfg['out_dir']}/")
 
 
-def _is_cached(pid):
-    """Check if a plate's source image is already in the download cache."""
-    for ext in (".jpg", ".png", ".gif", ".jpeg"):
-        if (CACHE / f"{pid}{ext}").exists():
-            return True
-    return False
-
-
 def cmd_list(collection):
     cfg = COLLECTIONS[collection]
     plates = load_manifest(collection)
@@ -415,14 +407,18 @@ def cmd_search(query):
 
 
 def cmd_atlas(collection):
-    """Generate plates atlas JSON for the web emulator.
+    """Generate the plates atlas for the web emulator.
 
-    Packs all built plate PNGs into a single JSON file
-    with base64-encoded raw RGB data per plate, plus height info.
+    Packs all built plate PNGs into one packed atlas
+    (visuals/atlas_pack.py), one palette-indexed entry per plate
+    at its own height.
     """
+    from atomic_io import write_bytes_atomic
+    from visuals.atlas_pack import pack_atlas
+
     cfg = COLLECTIONS[collection]
     plates = load_manifest(collection)
-    atlas = {}
+    entries = []
     for p in plates:
         png_path = cfg["out_dir"] / f"{p['id']}.png"
         if not png_path.exists():
@@ -432,20 +428,11 @@ def cmd_atlas(collection):
         if w != WIDTH:
             h = int(h * WIDTH / w)
             img = img.resize((WIDTH, h), Image.NEAREST)
-        raw = bytearray()
-        for y in range(h):
-            for x in range(WIDTH):
-                r, g, b = img.getpixel((x, y))
-                raw.extend([r, g, b])
-        atlas[p["id"]] = {
-            "h": h,
-            "data": base64.b64encode(bytes(raw)).decode('ascii'),
-        }
+        entries.append((p["id"], [np.asarray(img)]))
 
     out_path = cfg["atlas"]
-    with open(out_path, 'w') as f:
-        json.dump(atlas, f)
-    print(f"Atlas: {out_path} ({len(atlas)} plates, {out_path.stat().st_size:,} bytes)")
+    write_bytes_atomic(out_path, pack_atlas(entries))
+    print(f"Atlas: {out_path} ({len(entries)} plates, {out_path.stat().st_size:,} bytes)")
 
 
 def cmd_clean():
@@ -462,7 +449,7 @@ def main():
     if not args:
         print("Usage: python tools/build_plates.py <collection> [options]")
         print("Collections: haeckel, audubon, merian, redoute, seba, gould")
-        print("Options: --list, --preview, --atlas, --search <query>, --clean")
+        print("Options: --list, --preview, --atlas, --rebuild, --search <query>, --clean")
         return
 
     if args[0] == "--clean":
@@ -488,6 +475,8 @@ def main():
         cmd_preview(collection)
     elif rest[0] == "--atlas":
         cmd_atlas(collection)
+    elif rest[0] == "--rebuild":
+        cmd_build(collection, set(rest[1:]) or None, force=True)
     elif rest[0] == "--search" and len(rest) > 1:
         cmd_search(" ".join(rest[1:]))
     else:
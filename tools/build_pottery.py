@@ -6,10 +6,14 @@ Open Access API, resize to 64x64, color-correct for LED display.
 All objects are CC0 (public domain).
 
 Usage:
-    python tools/build_pottery.py                # Build all
+    python tools/build_pottery.py                # Build new or changed
     python tools/build_pottery.py --list         # Show status
     python tools/build_pottery.py --preview      # Contact sheet
     python tools/build_pottery.py greek_amphora  # Build specific item
+    python tools/build_pottery.py --rebuild      # Force rebuild all
+
+Only objects whose source image changed are rebuilt (asset_build.py),
+with the PIL work spread over all cores.
 """
 
 import json, os, sys, functools
@@ -25,11 +29,15 @@ except ImportError:
     sys.exit("Pillow and numpy required: pip install Pillow numpy")
 
 ROOT     = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import asset_build  # noqa: E402
+
 MANIFEST = ROOT / "tools" / "pottery_manifest.json"
 CACHE    = ROOT / "tools" / ".pottery_cache"
 OUT_DIR  = ROOT / "assets" / "pottery"
 SIZE     = 64
 UA       = "LEDArcadePotteryPipeline/1.0"
+PIPELINE = 1    # bump when processing changes, to rebuild every object
 
 
 # ── Met Museum API ────────────────────────────────────────────────
@@ -47,15 +55,21 @@ def met_image_url(met_id):
 
 # ── Download ──────────────────────────────────────────────────────
 
-def download(pid, entry):
-    """Download source image, with caching."""
-    CACHE.mkdir(parents=True, exist_ok=True)
-
-    # Check cache
+def cached_source(pid):
+    """Source image already in the download cache, if any."""
     for ext in (".jpg", ".png"):
         p = CACHE / f"{pid}{ext}"
         if p.exists():
             return p
+    return None
+
+
+def download(pid, entry):
+    """Download source image, with caching."""
+    CACHE.mkdir(parents=True, exist_ok=True)
+    cached = cached_source(pid)
+    if cached:
+        return cached
 
     # Resolve URL from Met API
     met_id = entry["met_id"]
@@ -133,18 +147,8 @@ def color_correct(img):
     return img
 
 
-def build_one(pid, entry):
-    """Download, process, save one pottery image (64x64)."""
-    title = entry.get("title", pid)
-    out = OUT_DIR / f"{pid}.png"
-    if out.exists():
-        return True
-
-    print(f"[{pid}] {title}")
-    src = download(pid, entry)
-    if not src:
-        return False
-
+def process(src, params):
+    """Fit one source image to 64x64 and prepare it for LEDs; PNG bytes."""
     img = Image.open(src).convert("RGB")
 
     # Fit to 64x64 with black padding (preserves aspect ratio)
@@ -153,11 +157,19 @@ def build_one(pid, entry):
     # Remove museum background, boost for LED
     img = remove_background(img)
     img = color_correct(img)
+    return asset_build.png_bytes(img)
+
+
+def fetch(entry):
+    print(f"[{entry['id']}] {entry.get('title', entry['id'])}")
+    return download(entry["id"], entry)
+
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    img.save(out, "PNG")
-    print(f"  OK -> {out.name} ({out.stat().st_size:,} bytes)")
-    return True
+def job(entry):
+    return asset_build.Job(entry["id"], OUT_DIR / f"{entry['id']}.png",
+                           {"pipeline": PIPELINE},
+                           cached=cached_source(entry["id"]),
+                           fetch=functools.partial(fetch, entry))
 
 
 # ── Commands ──────────────────────────────────────────────────────
@@ -166,18 +178,16 @@ def load_manifest():
     return json.loads(MANIFEST.read_text())
 
 
-def cmd_build(ids=None):
+def cmd_build(ids=None, force=False):
     plates = load_manifest()
     if ids:
         plates = [p for p in plates if p["id"] in ids]
 
-    ok = fail = 0
-    for entry in plates:
-        if build_one(entry["id"], entry):
-            ok += 1
-        else:
-            fail += 1
-    print(f"\nDone: {ok} built, {fail} failed")
+    built, failed, fresh = asset_build.build(
+        [job(p) for p in plates], process, CACHE / "build.json", force=force)
+    for pid in built:
+        print(f"  OK -> {pid}.png")
+    print(f"\nDone: {len(built)} built, {len(failed)} failed, {len(fresh)} up to date")
 
 
 def cmd_list():
@@ -229,6 +239,8 @@ if __name__ == "__main__":
         if CACHE.exists():
             shutil.rmtree(CACHE)
             print("Cache cleared")
+    elif "--rebuild" in args:
+        cmd_build(force=True)
     else:
         ids = {a for a in args if not a.startswith("-")} or None
         cmd_build(ids)
@@ -3,9 +3,13 @@ Download traffic sign images from Wikimedia Commons and pre-render to
 tiny PNGs in assets/signs/.  Uses Wikimedia's CDN for downloads and
 the search API to verify filenames.
 
+Only signs whose download or processing changed are re-rendered
+(asset_build.py), spread over all cores; --rebuild re-renders all.
+
 Requirements: pip install Pillow
 """
 
+import functools
 import hashlib
 import json
 import os
@@ -18,8 +22,13 @@ from io import BytesIO
 
 from PIL import Image
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asset_build  # noqa: E402
+from atomic_io import write_bytes_atomic  # noqa: E402
+
 # Output dimensions — square canvas (signs are various shapes)
 SIGN_SIZE = 44
+PIPELINE = 1    # bump when processing changes, to re-render every sign
 
 # ---------------------------------------------------------------------------
 # Curated sign sources: (display_name, country_code, sign_type, wikimedia_filename)
@@ -121,17 +130,29 @@ def _wikimedia_thumb_url(filename, width=256):
     )
 
 
-def _download_thumb(filename, cache_dir, width=256):
-    """Download a Wikimedia Commons thumbnail PNG via CDN."""
-    # Check both new and old cache naming conventions
-    cache_candidates = [
+def _cache_candidates(filename, cache_dir, width=256):
+    """New and old cache file names for a thumbnail, new first."""
+    return [
         os.path.join(cache_dir, filename.replace('/', '_') + f'.{width}px.png'),
         os.path.join(cache_dir, filename.replace('/', '_') + '.thumb.png'),
     ]
-    for cp in cache_candidates:
+
+
+def _cached_thumb(filename, cache_dir, width=256):
+    """Path of an already downloaded thumbnail, if any."""
+    for cp in _cache_candidates(filename, cache_dir, width):
         if os.path.exists(cp):
-            with open(cp, 'rb') as f:
-                return f.read()
+            return cp
+    return None
+
+
+def _download_thumb(filename, cache_dir, width=256):
+    """Download a Wikimedia Commons thumbnail PNG via CDN."""
+    cache_candidates = _cache_candidates(filename, cache_dir, width)
+    cached = _cached_thumb(filename, cache_dir, width)
+    if cached:
+        with open(cached, 'rb') as f:
+            return f.read()
 
     url = _wikimedia_thumb_url(filename, 200)  # 200px is a standard Wikimedia step
     # Retry with exponential backoff
@@ -316,55 +337,55 @@ def process_sign(png_data):
     return _cleanup_minor_colors(snapped)
 
 
+def render(src, params):
+    """process_sign() on a downloaded thumbnail, as PNG bytes."""
+    with open(src, 'rb') as f:
+        pixels = process_sign(f.read())
+    img = Image.new('RGB', (SIGN_SIZE, SIGN_SIZE))
+    img.putdata([color for row in pixels for color in row])
+    return asset_build.png_bytes(img)
+
+
+def fetch(display_name, sign_type, wiki_fn, cache_dir):
+    print(f"  {display_name} {sign_type}...")
+    if _download_thumb(wiki_fn, cache_dir) is None:
+        return None
+    return _cached_thumb(wiki_fn, cache_dir)
+
+
 def main():
+    force = '--rebuild' in sys.argv[1:]
     cache_dir = os.path.join(os.path.dirname(__file__), '.sign_cache')
     os.makedirs(cache_dir, exist_ok=True)
 
     assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'signs')
     os.makedirs(assets_dir, exist_ok=True)
 
-    succeeded = []
-    failed = []
     total = len(SIGN_SOURCES)
-
     print(f"Processing {total} signs...")
 
-    for i, (display_name, country_code, sign_type, wiki_fn) in enumerate(SIGN_SOURCES):
+    jobs = []
+    for display_name, country_code, sign_type, wiki_fn in SIGN_SOURCES:
         stem = f"{country_code}_{sign_type}"
-        out_path = os.path.join(assets_dir, f"{stem}.png")
-
-        # Skip if already processed
-        if os.path.exists(out_path):
-            print(f"  [{i+1}/{total}] [cached] {stem}")
+        jobs.append(asset_build.Job(
+            stem, os.path.join(assets_dir, f"{stem}.png"), {'pipeline': PIPELINE},
+            cached=_cached_thumb(wiki_fn, cache_dir),
+            fetch=functools.partial(fetch, display_name, sign_type, wiki_fn, cache_dir)))
+    built, failed_stems, fresh = asset_build.build(
+        jobs, render, os.path.join(cache_dir, 'build.json'), force=force)
+
+    ok = set(built) | set(fresh)
+    succeeded = []
+    failed = []
+    for display_name, country_code, sign_type, wiki_fn in SIGN_SOURCES:
+        stem = f"{country_code}_{sign_type}"
+        if stem in ok:
             succeeded.append((display_name, sign_type, stem))
-            continue
-
-        print(f"  [{i+1}/{total}] {display_name} {sign_type}...")
-
-        # Download thumbnail from CDN
-        png_data = _download_thumb(wiki_fn, cache_dir)
-        if png_data is None:
+        else:
             failed.append((display_name, sign_type, wiki_fn))
-            continue
-
-        # Process: resize, palette-snap, clean
-        try:
-            pixels = process_sign(png_data)
-        except Exception as e:
-            print(f"    Process failed: {e}")
-            failed.append((display_name, sign_type, wiki_fn))
-            continue
-
-        # Save PNG
-        img = Image.new('RGB', (SIGN_SIZE, SIGN_SIZE))
-        for y, row in enumerate(pixels):
-            for x, color in enumerate(row):
-                img.putpixel((x, y), color)
-        img.save(out_path)
-        succeeded.append((display_name, sign_type, stem))
 
     # Summary
-    print(f"\nDone! {len(succeeded)} signs processed, {len(failed)} failed.")
+    print(f"\nDone! {len(built)} signs rendered, {len(fresh)} up to date, {len(failed)} failed.")
     if failed:
         print("Failed:")
         for name, stype, fn in failed:
@@ -384,8 +405,7 @@ def main():
     manifest_lines.append('')
 
     manifest_path = os.path.join(assets_dir, 'manifest.py')
-    with open(manifest_path, 'w') as f:
-        f.write('\n'.join(manifest_lines))
+    write_bytes_atomic(manifest_path, '\n'.join(manifest_lines).encode())
 
     total_size = sum(
         os.path.getsize(os.path.join(assets_dir, f))
@@ -1,45 +1,41 @@
 #!/usr/bin/env python3
-"""Generate signs_atlas.json for the web emulator.
+"""Generate signs_atlas.bin for the web emulator.
 
-Packs all sign PNGs (44x44) into a single JSON file with
-base64-encoded raw RGB data per sign.
+Packs all sign PNGs (44x44) into a single packed atlas
+(visuals/atlas_pack.py), one palette-indexed entry per sign.
 
 Usage: python tools/build_signs_atlas.py
 """
 
-import base64
-import json
-import os
 import sys
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from atomic_io import write_bytes_atomic  # noqa: E402
+from visuals.atlas_pack import pack_atlas  # noqa: E402
+
 ASSETS_DIR = ROOT / "assets" / "signs"
-OUT_PATH = ROOT / "site" / "signs_atlas.json"
+OUT_PATH = ROOT / "site" / "signs_atlas.bin"
 
 SIGN_SIZE = 44
 
 
 def main():
-    atlas = {}
+    entries = []
     for png in sorted(ASSETS_DIR.glob("*.png")):
         stem = png.stem
         img = Image.open(png).convert("RGB")
         if img.size != (SIGN_SIZE, SIGN_SIZE):
             img = img.resize((SIGN_SIZE, SIGN_SIZE), Image.NEAREST)
-        raw = bytearray()
-        for y in range(SIGN_SIZE):
-            for x in range(SIGN_SIZE):
-                r, g, b = img.getpixel((x, y))
-                raw.extend([r, g, b])
-        atlas[stem] = base64.b64encode(bytes(raw)).decode('ascii')
-
-    os.makedirs(OUT_PATH.parent, exist_ok=True)
-    with open(OUT_PATH, 'w') as f:
-        json.dump(atlas, f)
-    print(f"Signs atlas: {OUT_PATH} ({len(atlas)} signs, {OUT_PATH.stat().st_size:,} bytes)")
+        entries.append((stem, [np.asarray(img)]))
+
+    write_bytes_atomic(OUT_PATH, pack_atlas(entries))
+    print(f"Signs atlas: {OUT_PATH} ({len(entries)} signs, {OUT_PATH.stat().st_size:,} bytes)")
 
 
 if __name__ == "__main__":
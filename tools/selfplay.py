@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Run the game demos headless and report how their AIs do.
+
+Plays each demo visual (visuals/*demo.py) for a batch of seeds with no
+drawing, prints score / length / death statistics and how runs ended, and
+with --save stores each demo's best highlight windows in
+assets/selfplay_highlights.json for the idle screen to replay. Highlights
+are only kept for seeds that replay identically.
+
+Usage:
+    python tools/selfplay.py pacmandemo tetrisdemo     # 16 seeds each
+    python tools/selfplay.py --all -n 64 -j 4 --save   # every demo, 4 processes
+    python tools/selfplay.py snakedemo --seconds 60 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import selfplay  # noqa: E402
+
+
+def demo_classes():
+    """Every demo visual, keyed by module name (pacmandemo, ...)."""
+    from visuals import ALL_VISUALS
+    from visuals.slideshow import Slideshow
+    return {v.__module__.rsplit('.', 1)[-1]: v for v in ALL_VISUALS
+            if getattr(v, 'category', '') == 'demos' and not issubclass(v, Slideshow)}
+
+
+def verified(demo_cls, highlights, seconds):
+    """The highlights whose seeds play the same run again."""
+    kept = []
+    for h in highlights:
+        again = selfplay.run_episode(demo_cls, h['seed'], max_seconds=seconds)
+        if [again['highlight'][0], again['highlight'][1]] == [h['start'], h['gain']]:
+            kept.append(h)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless self-play for the game demos")
+    parser.add_argument("demos", nargs="*", help="demo module names, e.g. pacmandemo")
+    parser.add_argument("--all", action="store_true", help="run every demo")
+    parser.add_argument("-n", "--episodes", type=int, default=16, help="seeds per demo")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=300.0, help="game time cap per episode")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--save", action="store_true", help="store highlights for the idle screen")
+    parser.add_argument("--json", action="store_true", help="print every episode as JSON")
+    args = parser.parse_args()
+
+    available = demo_classes()
+    names = sorted(available) if args.all else args.demos
+    unknown = [n for n in names if n not in available]
+    if unknown or not names:
+        parser.error(f"unknown demos {unknown}; choose from {', '.join(sorted(available))}")
+
+    seeds = range(args.first_seed, args.first_seed + args.episodes)
+    picked = {}
+    for name in names:
+        cls = available[name]
+        start = time.monotonic()
+        results = selfplay.run_batch(cls, seeds, workers=args.workers, max_seconds=args.seconds)
+        elapsed = time.monotonic() - start
+        frames = sum(r['frames'] for r in results)
+        summary = selfplay.summarize(results)
+        if args.json:
+            for r in results:
+                print(json.dumps(r))
+        print(f"{name}: {summary['episodes']} episodes, {frames / elapsed:.0f} frames/s")
+        for key in ('score', 'seconds', 'deaths', 'first_death_frame'):
+            if summary[key]:
+                s = summary[key]
+                print(f"  {key:18s} mean {s['mean']:>9}  median {s['median']:>9}  "
+                      f"min {s['min']:>9}  max {s['max']:>9}")
+        print(f"  {'ends':18s} {summary['ends']}")
+        if args.save:
+            highlights = verified(cls, selfplay.pick_highlights(results), args.seconds)
+            if highlights:
+                picked[cls.__name__] = highlights
+            print(f"  highlights kept    {len(highlights)}")
+
+    if picked:
+        selfplay.save_highlights(picked)
+        print(f"Saved highlights for {len(picked)} demos to {selfplay.HIGHLIGHTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Atlas Pack - Packed image atlases for the web emulator
+======================================================
+Used by painting.py, plates.py, flags.py, signs.py and gallery3d.py for
+the site/*_atlas.bin files the emulator fetches, and by the atlas
+builders in tools/ (build_paintings.py --atlas, build_plates.py --atlas,
+build_flags_atlas.py, build_signs_atlas.py, build_gallery_atlas.py)
+that write them.
+
+Format
+    MAGIC, then version and index length as little-endian uint32s, then
+    a JSON index, zero-padded to a multiple of 8 bytes, then the data.
+    The index maps each key, in build order, to its width, height,
+    palette (offset, colours) and frames (offset, count); offsets are
+    from the start of the data. An entry's palette is up to 256 RGB
+    triples and its frames are one palette index byte per pixel, stored
+    back to back, so any entry can be range-read once the index is
+    known. Images with at most 256 colours are stored exactly; richer
+    ones are median-cut to 256 (a few levels of error per channel, well
+    under what the LEDs show).
+
+PackedAtlas
+    Reads the format from bytes or a file (mapped, not read). Entries
+    are views into the buffer: indices() is a zero-copy numpy view of
+    the frames, rgb() expands a frame with bytes.translate() and needs
+    no numpy, rows() gives the [[(r, g, b), ...], ...] lists the list
+    based visuals draw from. Keys holding a "/" group into sections(),
+    which is how the gallery atlas keeps "GalleryArt/2" per gallery.
+
+pack_atlas()
+    Builds the bytes from (key, frames) pairs of HxWx3 uint8 arrays.
+    Needs numpy and PIL, so only the builders call it.
+"""
+
+import json
+import struct
+
+MAGIC = b"LEDATLAS"
+VERSION = 1
+_HEADER = struct.Struct("<II")
+_DATA_ALIGN = 8
+
+
+def _data_start(index_len):
+    end = len(MAGIC) + _HEADER.size + index_len
+    return -(-end // _DATA_ALIGN) * _DATA_ALIGN
+
+
+class AtlasEntry:
+    """One image (or animation) of a packed atlas, viewing its buffer."""
+
+    __slots__ = ('key', 'width', 'height', 'palette', 'frames')
+
+    def __init__(self, key, width, height, palette, frames):
+        self.key = key
+        self.width = width
+        self.height = height
+        self.palette = palette      # memoryview, 3 bytes per colour
+        self.frames = frames        # memoryview, width * height per frame
+
+    def __len__(self):
+        return len(self.frames) // (self.width * self.height)
+
+    def frame(self, i=0):
+        """Palette indices of frame i (a memoryview, row-major)."""
+        size = self.width * self.height
+        return self.frames[i * size:(i + 1) * size]
+
+    def indices(self, i=None):
+        """Zero-copy numpy view of the palette indices: (h, w) for frame
+        i, (frames, h, w) for all of them."""
+        import numpy as np
+        if i is None:
+            return np.frombuffer(self.frames, np.uint8).reshape(len(self), self.height, self.width)
+        return np.frombuffer(self.frame(i), np.uint8).reshape(self.height, self.width)
+
+    def array(self, i=None):
+        """RGB uint8 array of frame i, (h, w, 3), or all frames."""
+        import numpy as np
+        palette = np.frombuffer(self.palette, np.uint8).reshape(-1, 3)
+        return palette[self.indices(i)]
+
+    def rgb(self, i=0):
+        """Frame i as packed RGB bytes."""
+        indices = self.frame(i).tobytes()
+        palette = bytes(self.palette).ljust(768, b"\0")
+        out = bytearray(3 * len(indices))
+        for c in range(3):
+            out[c::3] = indices.translate(palette[c::3])
+        return bytes(out)
+
+    def rows(self, i=0):
+        """Frame i as height rows of width (r, g, b) tuples."""
+        d = self.rgb(i)
+        w3 = self.width * 3
+        rows = []
+        for y in range(self.height):
+            row = d[y * w3:(y + 1) * w3]
+            rows.append(list(zip(row[0::3], row[1::3], row[2::3])))
+        return rows
+
+
+class PackedAtlas:
+    """Read-only mapping of key -> AtlasEntry over a packed atlas buffer."""
+
+    def __init__(self, data):
+        view = memoryview(data).cast("B")
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("not a packed atlas")
+        version, index_len = _HEADER.unpack_from(view, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"unsupported packed atlas version {version}")
+        start = len(MAGIC) + _HEADER.size
+        self.index = json.loads(bytes(view[start:start + index_len]))
+        self.data_start = _data_start(index_len)
+        self._data = view[self.data_start:]
+        self._entries = {}
+
+    @classmethod
+    def open(cls, path):
+        """Map an atlas file; entries are read from disk as they are used."""
+        import mmap
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def keys(self):
+        return self.index.keys()
+
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            info = self.index[key]
+            w, h = info["w"], info["h"]
+            p_off, colours = info["palette"]
+            f_off, count = info["frames"]
+            entry = AtlasEntry(key, w, h, self._data[p_off:p_off + 3 * colours],
+                               self._data[f_off:f_off + count * w * h])
+            self._entries[key] = entry
+        return entry
+
+    def get(self, key, default=None):
+        return self[key] if key in self.index else default
+
+    def sections(self, sep="/"):
+        """{prefix: {rest of key: entry}} for the keys holding sep."""
+        out = {}
+        for key in self.index:
+            if sep in key:
+                prefix, rest = key.split(sep, 1)
+                out.setdefault(prefix, {})[rest] = self[key]
+        return out
+
+
+def _quantize(pixels):
+    """(palette bytes, index bytes) for an (n, 3) uint8 pixel array."""
+    import numpy as np
+    packed = (pixels[:, 0].astype(np.uint32) << 16) | (pixels[:, 1].astype(np.uint32) << 8) | pixels[:, 2]
+    colours, indices = np.unique(packed, return_inverse=True)
+    if len(colours) <= 256:
+        palette = np.stack([colours >> 16, (colours >> 8) & 255, colours & 255], axis=1)
+        return palette.astype(np.uint8).tobytes(), indices.astype(np.uint8).tobytes()
+    from PIL import Image
+    img = Image.fromarray(np.ascontiguousarray(pixels).reshape(1, -1, 3), "RGB")
+    quantized = img.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    indices = np.asarray(quantized, dtype=np.uint8).reshape(-1)
+    used = int(indices.max()) + 1
+    return bytes(quantized.getpalette()[:3 * used]), indices.tobytes()
+
+
+def pack_atlas(entries):
+    """Packed atlas bytes from (key, frames) pairs; frames is a list of
+    equally sized HxWx3 uint8 arrays (one per animation frame)."""
+    import numpy as np
+    index, chunks, offset = {}, [], 0
+    for key, frames in entries:
+        stack = np.stack([np.asarray(f, dtype=np.uint8)[..., :3] for f in frames])
+        count, h, w = stack.shape[:3]
+        palette, indices = _quantize(stack.reshape(-1, 3))
+        index[key] = {"w": w, "h": h,
+                      "palette": [offset, len(palette) // 3],
+                      "frames": [offset + len(palette), count]}
+        chunks += [palette, indices]
+        offset += len(palette) + len(indices)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode()
+    head = MAGIC + _HEADER.pack(VERSION, len(index_bytes)) + index_bytes
+    return head.ljust(_data_start(len(index_bytes)), b"\0") + b"".join(chunks)
@@ -17,25 +17,13 @@ Controls:
 
 import random
 import math
-from . import Visual, Display, Colors, GRID_SIZE
-
-
-class Boid:
-    """A single boid agent with position and velocity."""
-
-    def __init__(self, x: float, y: float, vx: float, vy: float):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
 
-    def heading(self) -> float:
-        """Return heading angle in radians."""
-        return math.atan2(self.vy, self.vx)
+import numpy as np
 
-    def speed(self) -> float:
-        """Return current speed."""
-        return math.sqrt(self.vx * self.vx + self.vy * self.vy)
+from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points
+from .particles import ParticleStore
+from .spatial import CellList
 
 
 class Boids(Visual):
@@ -80,8 +68,11 @@ class Boids(Visual):
         self.disruption_interval = 3.0  # Check for mega flocks every 3 seconds
         self.mega_flock_threshold = 12  # If this many boids cluster, disrupt some
 
+        # Neighbor index, rebuilt from boid positions each frame
+        self.cells = CellList(self.PERCEPTION_RADIUS)
+
         # Create initial boids spawned randomly
-        self.boids = []
+        self.boids = ParticleStore(self.NUM_BOIDS * 2)
         for _ in range(self.NUM_BOIDS // 2):
             self._spawn_random()
 
@@ -93,7 +84,7 @@ class Boids(Visual):
         speed = random.uniform(1.5, 2.5)
         vx = math.cos(angle) * speed
         vy = math.sin(angle) * speed
-        self.boids.append(Boid(x, y, vx, vy))
+        self.boids.spawn(x=x, y=y, vx=vx, vy=vy)
 
     def _disrupt_mega_flocks(self):
         """Find and break up large clusters of boids to keep population dynamic."""
@@ -101,16 +92,18 @@ class Boids(Visual):
             return
 
         # Find boids with many neighbors (part of a mega flock)
-        for boid in self.boids:
-            neighbors = self._get_neighbors(boid, self.PERCEPTION_RADIUS * 0.8)
-            if len(neighbors) >= self.mega_flock_threshold:
-                # This boid is in a mega flock - give it a random velocity burst
-                # to scatter some of the flock
-                if random.random() < 0.3:  # Only disrupt 30% of mega-flock members
-                    angle = random.uniform(0, 2 * math.pi)
-                    speed = random.uniform(2.5, 3.5)
-                    boid.vx = math.cos(angle) * speed
-                    boid.vy = math.sin(angle) * speed
+        self._index_positions()
+        counts = self.cells.neighbor_counts(self.PERCEPTION_RADIUS * 0.8)
+        # Boids in a mega flock get a random velocity burst to scatter
+        # some of the flock (only 30% of mega-flock members)
+        burst = (counts >= self.mega_flock_threshold) & (np.random.random(len(counts)) < 0.3)
+        k = int(burst.sum())
+        if k:
+            angle = np.random.uniform(0, 2 * math.pi, k)
+            speed = np.random.uniform(2.5, 3.5, k)
+            boids = self.boids
+            boids.vx[burst] = np.cos(angle) * speed
+            boids.vy[burst] = np.sin(angle) * speed
 
     def handle_input(self, input_state) -> bool:
         """Handle user input for adjusting parameters."""
@@ -146,102 +139,43 @@ class Boids(Visual):
         for _ in range(5):
             self._spawn_random()
 
-    def _distance(self, b1: Boid, b2: Boid) -> float:
-        """Calculate toroidal distance between two boids."""
-        dx = abs(b1.x - b2.x)
-        dy = abs(b1.y - b2.y)
-
-        # Wrap around for toroidal distance
-        if dx > GRID_SIZE / 2:
-            dx = GRID_SIZE - dx
-        if dy > GRID_SIZE / 2:
-            dy = GRID_SIZE - dy
-
-        return math.sqrt(dx * dx + dy * dy)
-
-    def _toroidal_diff(self, from_val: float, to_val: float) -> float:
-        """Calculate the shortest difference on a toroidal axis."""
-        diff = to_val - from_val
-        if diff > GRID_SIZE / 2:
-            diff -= GRID_SIZE
-        elif diff < -GRID_SIZE / 2:
-            diff += GRID_SIZE
-        return diff
-
-    def _get_neighbors(self, boid: Boid, radius: float) -> list:
-        """Get all boids within radius of the given boid."""
-        neighbors = []
-        for other in self.boids:
-            if other is not boid:
-                dist = self._distance(boid, other)
-                if dist < radius:
-                    neighbors.append((other, dist))
-        return neighbors
-
-    def _separation(self, boid: Boid, neighbors: list) -> tuple:
-        """Rule 1: Steer to avoid crowding local flockmates."""
-        steer_x, steer_y = 0.0, 0.0
-
-        for other, dist in neighbors:
-            if dist < self.SEPARATION_RADIUS and dist > 0:
-                # Steer away from neighbor
-                diff_x = self._toroidal_diff(other.x, boid.x)
-                diff_y = self._toroidal_diff(other.y, boid.y)
-
-                # Weight by inverse distance (closer = stronger repulsion)
-                weight = 1.0 / dist
-                steer_x += diff_x * weight
-                steer_y += diff_y * weight
-
-        return steer_x, steer_y
-
-    def _alignment(self, boid: Boid, neighbors: list) -> tuple:
-        """Rule 2: Steer toward average heading of local flockmates."""
-        if not neighbors:
-            return 0.0, 0.0
-
-        avg_vx, avg_vy = 0.0, 0.0
-        for other, _ in neighbors:
-            avg_vx += other.vx
-            avg_vy += other.vy
-
-        avg_vx /= len(neighbors)
-        avg_vy /= len(neighbors)
-
-        # Steer toward average velocity
-        steer_x = avg_vx - boid.vx
-        steer_y = avg_vy - boid.vy
-
-        return steer_x, steer_y
-
-    def _cohesion(self, boid: Boid, neighbors: list) -> tuple:
-        """Rule 3: Steer toward average position of local flockmates."""
-        if not neighbors:
-            return 0.0, 0.0
-
-        # Calculate center of mass using toroidal coordinates
-        avg_x, avg_y = 0.0, 0.0
-        for other, _ in neighbors:
-            avg_x += self._toroidal_diff(boid.x, other.x)
-            avg_y += self._toroidal_diff(boid.y, other.y)
-
-        avg_x /= len(neighbors)
-        avg_y /= len(neighbors)
-
-        # Steer toward center of mass
-        return avg_x, avg_y
-
-    def _limit_speed(self, boid: Boid):
-        """Limit boid speed to min/max bounds."""
-        speed = boid.speed()
-
-        if speed > 0:
-            if speed < self.MIN_SPEED:
-                boid.vx = (boid.vx / speed) * self.MIN_SPEED
-                boid.vy = (boid.vy / speed) * self.MIN_SPEED
-            elif speed > self.MAX_SPEED:
-                boid.vx = (boid.vx / speed) * self.MAX_SPEED
-                boid.vy = (boid.vy / speed) * self.MAX_SPEED
+    def _index_positions(self):
+        """Rebuild the neighbor index from the current boid positions."""
+        self.cells.rebuild(self.boids.x, self.boids.y)
+
+    def _steering(self):
+        """Separation, alignment and cohesion for every boid at once.
+
+        Neighbors are all boids within PERCEPTION_RADIUS (toroidal
+        distance), found through the cell list rather than all pairs.
+        Returns three (sx, sy) pairs of per-boid arrays.
+        """
+        n = len(self.boids)
+        self._index_positions()
+        i, j, dx, dy, d2 = self.cells.pairs(self.PERCEPTION_RADIUS)
+        vx, vy = self.boids.vx, self.boids.vy
+
+        def per_boid(values):
+            return np.bincount(i, weights=values, minlength=n)
+
+        count = np.bincount(i, minlength=n)
+        has = count > 0
+        inv_count = np.where(has, 1.0 / np.maximum(count, 1), 0.0)
+
+        # Rule 1: steer away from close neighbors, weighted by 1/dist
+        # (dx/dy point toward the neighbor, so negate them)
+        dist = np.sqrt(d2)
+        close = (dist < self.SEPARATION_RADIUS) & (dist > 0)
+        w = np.where(close, 1.0 / np.where(close, dist, 1.0), 0.0)
+        sep = (per_boid(-dx * w), per_boid(-dy * w))
+
+        # Rule 2: steer toward the neighbors' average velocity
+        ali = ((per_boid(vx[j]) * inv_count - vx) * has,
+               (per_boid(vy[j]) * inv_count - vy) * has)
+
+        # Rule 3: steer toward the neighbors' center of mass
+        coh = (per_boid(dx) * inv_count, per_boid(dy) * inv_count)
+        return sep, ali, coh
 
     def update(self, dt: float):
         """Update all boids."""
@@ -264,123 +198,90 @@ class Boids(Visual):
         effective_dt = dt * self.speed_multiplier
 
         # Calculate new velocities for all boids
-        new_velocities = []
-
-        for boid in self.boids:
-            # Get neighbors within perception radius
-            neighbors = self._get_neighbors(boid, self.PERCEPTION_RADIUS)
-
-            # Calculate steering forces from the three rules
-            sep_x, sep_y = self._separation(boid, neighbors)
-            ali_x, ali_y = self._alignment(boid, neighbors)
-            coh_x, coh_y = self._cohesion(boid, neighbors)
-
-            # Combine forces with weights
-            accel_x = (sep_x * self.separation_weight +
-                       ali_x * self.alignment_weight +
-                       coh_x * self.cohesion_weight)
-            accel_y = (sep_y * self.separation_weight +
-                       ali_y * self.alignment_weight +
-                       coh_y * self.cohesion_weight)
-
-            # Apply acceleration to velocity
-            new_vx = boid.vx + accel_x * effective_dt
-            new_vy = boid.vy + accel_y * effective_dt
-
-            new_velocities.append((new_vx, new_vy))
-
-        # Update all boids
-        for i, boid in enumerate(self.boids):
-            boid.vx, boid.vy = new_velocities[i]
-
-            # Limit speed
-            self._limit_speed(boid)
-
-            # Update position
-            boid.x += boid.vx * effective_dt
-            boid.y += boid.vy * effective_dt
-
-            # Soft boundary steering - gentle nudge back toward center near edges
-            # Weak enough that some boids still escape, keeping population dynamic
-            margin = 6
-            turn_factor = 0.15
-            if boid.x < margin:
-                boid.vx += turn_factor
-            elif boid.x > GRID_SIZE - margin:
-                boid.vx -= turn_factor
-            if boid.y < margin:
-                boid.vy += turn_factor
-            elif boid.y > GRID_SIZE - margin:
-                boid.vy -= turn_factor
+        (sep_x, sep_y), (ali_x, ali_y), (coh_x, coh_y) = self._steering()
+
+        # Combine forces with weights
+        accel_x = (sep_x * self.separation_weight +
+                   ali_x * self.alignment_weight +
+                   coh_x * self.cohesion_weight)
+        accel_y = (sep_y * self.separation_weight +
+                   ali_y * self.alignment_weight +
+                   coh_y * self.cohesion_weight)
+
+        # Apply acceleration to velocity, limit speed, then move
+        boids = self.boids
+        boids.vx += accel_x * effective_dt
+        boids.vy += accel_y * effective_dt
+        boids.limit_speed(self.MAX_SPEED, self.MIN_SPEED)
+        boids.integrate(effective_dt)
+
+        # Soft boundary steering - gentle nudge back toward center near edges
+        # Weak enough that some boids still escape, keeping population dynamic
+        margin = 6
+        turn_factor = 0.15
+        for pos, vel in ((boids.x, boids.vx), (boids.y, boids.vy)):
+            vel += turn_factor * ((pos < margin).astype(float)
+                                  - (pos > GRID_SIZE - margin))
 
         # Remove boids that go off screen - tight boundary so population stays fresh
-        self.boids = [b for b in self.boids if -2 < b.x < GRID_SIZE + 2 and -2 < b.y < GRID_SIZE + 2]
+        x, y = boids.x, boids.y
+        boids.kill((x <= -2) | (x >= GRID_SIZE + 2) | (y <= -2) | (y >= GRID_SIZE + 2))
 
         # Soft cap to prevent runaway growth
-        if len(self.boids) > self.NUM_BOIDS * 1.5:
-            # Remove oldest boids (first in list)
-            self.boids = self.boids[-(self.NUM_BOIDS):]
+        if len(boids) > self.NUM_BOIDS * 1.5:
+            # Remove oldest boids (front of the store)
+            boids.keep_newest(self.NUM_BOIDS)
 
-    def _heading_to_color(self, heading: float) -> tuple:
-        """Convert heading angle to rainbow color."""
+    @staticmethod
+    def _heading_colors(vx, vy):
+        """Per-boid rainbow color from heading angle, (N, 3) float 0-255."""
         # Normalize heading to 0-1 range
-        hue = (heading + math.pi) / (2 * math.pi)
+        hue = (np.arctan2(vy, vx) + math.pi) / (2 * math.pi)
 
         # HSV to RGB conversion (saturation=1, value=1)
         h = hue * 6.0
-        i = int(h)
+        i = h.astype(int)
         f = h - i
-
-        if i == 0:
-            r, g, b = 1.0, f, 0.0
-        elif i == 1:
-            r, g, b = 1.0 - f, 1.0, 0.0
-        elif i == 2:
-            r, g, b = 0.0, 1.0, f
-        elif i == 3:
-            r, g, b = 0.0, 1.0 - f, 1.0
-        elif i == 4:
-            r, g, b = f, 0.0, 1.0
-        else:
-            r, g, b = 1.0, 0.0, 1.0 - f
-
-        return (int(r * 255), int(g * 255), int(b * 255))
+        one, zero = np.ones_like(f), np.zeros_like(f)
+        sector = np.minimum(i, 5)[:, None]
+        rgb = np.select(
+            [sector == k for k in range(5)],
+            [np.stack(c, axis=1) for c in ((one, f, zero), (1.0 - f, one, zero),
+                                           (zero, one, f), (zero, 1.0 - f, one),
+                                           (f, zero, one))],
+            np.stack((one, zero, 1.0 - f), axis=1))
+        return (rgb * 255).astype(int)
 
     def draw(self):
         """Draw all boids to the display."""
         self.display.clear(Colors.BLACK)
 
-        for boid in self.boids:
-            # Get pixel position
-            px = int(boid.x)
-            py = int(boid.y)
-
-            # Color based on heading angle
-            heading = boid.heading()
-            color = self._heading_to_color(heading)
-            dim_color = (color[0] // 2, color[1] // 2, color[2] // 2)
-
-            # Draw boid as 2x2 block for visibility
-            for dy in range(2):
-                for dx in range(2):
-                    bx, by = (px + dx) % GRID_SIZE, (py + dy) % GRID_SIZE
-                    if 0 <= bx < GRID_SIZE and 0 <= by < GRID_SIZE:
-                        self.display.set_pixel(bx, by, color)
-
-            # Draw trail behind the boid (3-4 pixels showing direction)
-            speed = boid.speed()
-            if speed > 0.1:
-                # Normalize velocity for trail direction
-                trail_dx = -boid.vx / speed
-                trail_dy = -boid.vy / speed
-
-                for i in range(1, 4):
-                    trail_x = int(px + trail_dx * i * 1.2) % GRID_SIZE
-                    trail_y = int(py + trail_dy * i * 1.2) % GRID_SIZE
-                    # Fade trail
-                    fade = 1.0 - (i / 4.0)
-                    trail_color = (int(color[0] * fade * 0.5),
-                                   int(color[1] * fade * 0.5),
-                                   int(color[2] * fade * 0.5))
-                    if 0 <= trail_x < GRID_SIZE and 0 <= trail_y < GRID_SIZE:
-                        self.display.set_pixel(trail_x, trail_y, trail_color)
+        boids = self.boids
+        n = len(boids)
+        if not n:
+            return
+
+        # Pixel position and heading color
+        px = boids.x.astype(int)
+        py = boids.y.astype(int)
+        color = self._heading_colors(boids.vx, boids.vy)
+
+        # Each boid is a 2x2 block for visibility, followed by a fading
+        # 3-pixel trail behind it showing direction. Built as one (n, 7)
+        # batch so overlaps layer as if drawn boid by boid.
+        speed = boids.speed()
+        moving = speed > 0.1
+        safe = np.where(moving, speed, 1.0)
+        trail_dx = -boids.vx / safe
+        trail_dy = -boids.vy / safe
+        steps = np.arange(1, 4) * 1.2
+        xs = np.concatenate((px[:, None] + [0, 1, 0, 1],
+                             np.trunc(px[:, None] + trail_dx[:, None] * steps)), axis=1)
+        ys = np.concatenate((py[:, None] + [0, 0, 1, 1],
+                             np.trunc(py[:, None] + trail_dy[:, None] * steps)), axis=1)
+        fade = np.array([1.0, 1.0, 1.0, 1.0, 0.375, 0.25, 0.125])
+        rgb = (color[:, None, :] * fade[:, None]).astype(int)
+        show = np.ones((n, 7), dtype=bool)
+        show[:, 4:] = moving[:, None]
+        blit_points(self.display, xs[show].astype(int) % GRID_SIZE,
+                    ys[show].astype(int) % GRID_SIZE, rgb[show])
@@ -13,8 +13,8 @@ AI Strategy:
 - Collect powerups when safe
 """
 
-from collections import deque
 from . import Visual, Display, Colors, GRID_SIZE
+from .maze_nav import astar, nearest_path
 from arcade import InputState, GameState
 
 # Import the actual game
@@ -23,6 +23,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from games.bomberman import Bomberman
 
+DIRECTIONS = {(0, -1): 'up', (0, 1): 'down', (-1, 0): 'left', (1, 0): 'right'}
+
 
 class BombermanDemo(Visual):
     name = "BOMBMAN"
@@ -42,6 +44,7 @@ class BombermanDemo(Visual):
         self.game_over_timer = 0.0
         self.escape_target = None  # Target tile when escaping danger
         self.last_bomb_time = 0.0  # Track when we last placed a bomb
+        self.bomb_tiles = set()  # Bomb positions, refreshed each decision
 
     def handle_input(self, input_state):
         # Demo doesn't respond to input (auto-plays)
@@ -91,6 +94,7 @@ class BombermanDemo(Visual):
         """AI decision-making for Bomberman movement and bomb placement."""
         game = self.game
         px, py = game.player_x, game.player_y
+        self.bomb_tiles = {(bomb['x'], bomb['y']) for bomb in game.active_bombs}
 
         # Calculate danger zones from active bombs
         danger_zones = self._get_danger_zones()
@@ -184,26 +188,10 @@ class BombermanDemo(Visual):
                 return direction
 
         # BFS to find nearest safe tile
-        queue = deque([(px, py, None, 0)])  # x, y, first_direction, distance
-        visited = {(px, py)}
-
-        while queue:
-            x, y, first_dir, dist = queue.popleft()
-
-            # Check if this tile is safe
-            if (x, y) not in danger_zones and dist > 0:
-                self.escape_target = (x, y)
-                return first_dir
-
-            # Explore neighbors
-            for direction, (dx, dy) in [('up', (0, -1)), ('down', (0, 1)),
-                                         ('left', (-1, 0)), ('right', (1, 0))]:
-                nx, ny = x + dx, y + dy
-
-                if (nx, ny) not in visited and self._can_walk(nx, ny):
-                    visited.add((nx, ny))
-                    dir_to_use = first_dir if first_dir else direction
-                    queue.append((nx, ny, dir_to_use, dist + 1))
+        path = self._escape_path(px, py, danger_zones)
+        if path:
+            self.escape_target = path[-1]
+            return self._first_step(px, py, path)
 
         # No safe path found, try any direction
         for direction, (dx, dy) in [('up', (0, -1)), ('down', (0, 1)),
@@ -223,37 +211,25 @@ class BombermanDemo(Visual):
         tile = game.grid[y][x]
         if tile in [game.EMPTY, game.EXIT, game.POWERUP_BOMB, game.POWERUP_FIRE, game.POWERUP_SPEED]:
             # Also check for bombs
-            for bomb in game.active_bombs:
-                if bomb['x'] == x and bomb['y'] == y:
-                    return False
-            return True
+            return (x, y) not in self.bomb_tiles
         return False
 
+    def _first_step(self, px, py, path):
+        """Direction name of a path's first tile."""
+        if not path:
+            return None
+        return DIRECTIONS[(path[0][0] - px, path[0][1] - py)]
+
     def _pathfind_to(self, start_x, start_y, target_x, target_y, danger_zones):
-        """BFS pathfinding to target, avoiding danger zones."""
+        """A* pathfinding to target, avoiding danger zones."""
         if start_x == target_x and start_y == target_y:
             return None
 
-        queue = deque([(start_x, start_y, None)])
-        visited = {(start_x, start_y)}
-
-        while queue:
-            x, y, first_dir = queue.popleft()
-
-            if x == target_x and y == target_y:
-                return first_dir
-
-            for direction, (dx, dy) in [('up', (0, -1)), ('down', (0, 1)),
-                                         ('left', (-1, 0)), ('right', (1, 0))]:
-                nx, ny = x + dx, y + dy
-
-                if (nx, ny) not in visited and self._can_walk(nx, ny):
-                    if (nx, ny) not in danger_zones:
-                        visited.add((nx, ny))
-                        dir_to_use = first_dir if first_dir else direction
-                        queue.append((nx, ny, dir_to_use))
+        def passable(x, y):
+            return self._can_walk(x, y) and (x, y) not in danger_zones
 
-        return None
+        path = astar((start_x, start_y), (target_x, target_y), passable)
+        return self._first_step(start_x, start_y, path)
 
     def _collect_powerup(self, px, py, danger_zones):
         """Move toward nearby powerups if safe."""
@@ -334,62 +310,28 @@ class BombermanDemo(Visual):
                             break
 
             # Check if we can escape
-            escape_dir = self._find_escape_route(px, py, test_danger)
-            if escape_dir:
+            if self._escape_path(px, py, test_danger):
                 self.last_bomb_time = self.time
                 return 'bomb'
 
         return None
 
-    def _find_escape_route(self, px, py, danger_zones):
-        """Check if there's an escape route from danger."""
-        queue = deque([(px, py, None, 0)])
-        visited = {(px, py)}
-
-        while queue:
-            x, y, first_dir, dist = queue.popleft()
-
-            if (x, y) not in danger_zones and dist > 0:
-                return first_dir
-
-            for direction, (dx, dy) in [('up', (0, -1)), ('down', (0, 1)),
-                                         ('left', (-1, 0)), ('right', (1, 0))]:
-                nx, ny = x + dx, y + dy
-
-                if (nx, ny) not in visited and self._can_walk(nx, ny):
-                    visited.add((nx, ny))
-                    dir_to_use = first_dir if first_dir else direction
-                    queue.append((nx, ny, dir_to_use, dist + 1))
-
-        return None
+    def _escape_path(self, px, py, danger_zones):
+        """BFS path to the nearest tile outside danger_zones, or None."""
+        return nearest_path((px, py), lambda x, y: (x, y) not in danger_zones, self._can_walk)
 
     def _explore_strategy(self, px, py, danger_zones):
         """Move toward unexplored areas (bricks to destroy)."""
         game = self.game
 
-        # Find nearest brick we could bomb
-        nearest_brick_pos = None
-        nearest_dist = float('inf')
+        def next_to_brick(x, y):
+            return any(game.grid[y + dy][x + dx] == game.BRICK for dx, dy in DIRECTIONS)
 
-        for y in range(1, game.GRID_HEIGHT - 1):
-            for x in range(1, game.GRID_WIDTH - 1):
-                if game.grid[y][x] == game.BRICK:
-                    # Check if there's an adjacent empty tile we could stand on
-                    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                        ax, ay = x + dx, y + dy
-                        if self._can_walk(ax, ay) and (ax, ay) not in danger_zones:
-                            dist = abs(ax - px) + abs(ay - py)
-                            if dist < nearest_dist:
-                                nearest_dist = dist
-                                nearest_brick_pos = (ax, ay)
-
-        if nearest_brick_pos:
-            tx, ty = nearest_brick_pos
-            direction = self._pathfind_to(px, py, tx, ty, danger_zones)
-            if direction:
-                return direction
+        def safe(x, y):
+            return self._can_walk(x, y) and (x, y) not in danger_zones
 
-        return None
+        # Walk to the nearest tile beside a brick we could bomb
+        return self._first_step(px, py, nearest_path((px, py), next_to_brick, safe))
 
     def _wander_safely(self, px, py, danger_zones):
         """Wander to a safe adjacent tile."""
@@ -0,0 +1,312 @@
+"""
+CA Engine - Vectorized cellular automata for the AUTOMATA category
+===================================================================
+Shared core for hodge.py, hodgelab.py, cycliclab.py, slime.py, slimelab.py,
+wolfram.py and sandpile.py. (life.py runs on the bit-packed life_engine.)
+
+Grids are NumPy arrays indexed [y, x]. Neighborhood sums pad the grid once
+(toroidal wrap, edge clamp, or zero/open boundary) and add eight shifted
+views, so one generation is a handful of array ops instead of 4096 cells x
+8 Python lookups. Rules are small objects with a step() that maps a grid
+to the next one; Automaton holds a grid + rule and renders through a
+palette gather into a uint8 frame for framebuffer.blit_rgb().
+
+The AUTOMATA category is weighted 4x in the idle rotation, so this is
+where most idle CPU goes.
+"""
+
+import numpy as np
+
+from . import GRID_SIZE
+from .framebuffer import blit_rgb
+
+# Boundary modes (np.pad modes underneath)
+WRAP = 'wrap'      # toroidal
+CLAMP = 'edge'     # off-grid cells repeat the edge cell
+OPEN = 'constant'  # off-grid cells are 0 (grains/colonies fall off)
+
+MOORE = ((-1, -1), (-1, 0), (-1, 1),
+         (0, -1),           (0, 1),
+         (1, -1),  (1, 0),  (1, 1))
+VON_NEUMANN = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+
+def _shifted_views(grid, boundary, offsets):
+    """Yield grid[y+dy, x+dx] for each (dy, dx), honoring the boundary."""
+    h, w = grid.shape
+    padded = np.pad(grid, 1, mode=boundary)
+    for dy, dx in offsets:
+        yield padded[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+
+
+def neighbor_sum(grid, boundary=WRAP, offsets=MOORE, dtype=np.int16):
+    """Sum of each cell's neighbors (self excluded)."""
+    acc = np.zeros(grid.shape, dtype=dtype)
+    for view in _shifted_views(grid, boundary, offsets):
+        acc += view
+    return acc
+
+
+def neighbor_count(grid, target, boundary=WRAP, offsets=MOORE):
+    """Per cell, how many neighbors equal `target` (scalar or per-cell array)."""
+    acc = np.zeros(grid.shape, dtype=np.int8)
+    for view in _shifted_views(grid, boundary, offsets):
+        acc += view == target
+    return acc
+
+
+# ── Rules ─────────────────────────────────────────────────────────
+
+class LifeRule:
+    """Life-like outer-totalistic rule, e.g. B3/S23 (Conway)."""
+
+    def __init__(self, birth=(3,), survive=(2, 3), boundary=WRAP):
+        self.boundary = boundary
+        # table[alive, neighbors] -> next alive
+        self.table = np.zeros((2, 9), dtype=bool)
+        self.table[0, list(birth)] = True
+        self.table[1, list(survive)] = True
+
+    def step(self, grid):
+        n = neighbor_sum(grid.view(np.uint8), self.boundary, dtype=np.uint8)
+        return self.table[grid.view(np.uint8), n]
+
+
+class CyclicRule:
+    """Cyclic CA: a cell advances to (state + 1) % states when at least
+    `threshold` neighbors already hold that successor state."""
+
+    def __init__(self, states, threshold=1, boundary=WRAP):
+        self.states = states
+        self.threshold = threshold
+        self.boundary = boundary
+
+    def step(self, grid):
+        succ = (grid + 1) % self.states
+        count = neighbor_count(grid, succ, self.boundary)
+        return np.where(count >= self.threshold, succ, grid).astype(grid.dtype)
+
+
+class HodgepodgeRule:
+    """Gerhardt & Schuster's hodgepodge machine (BZ-reaction spirals).
+
+    State 0 is healthy, n is ill, anything between is infected.
+    """
+
+    def __init__(self, n, k1=2, k2=3, g=5.0, boundary=WRAP):
+        self.n = n
+        self.k1 = k1
+        self.k2 = k2
+        self.g = g
+        self.boundary = boundary
+
+    def step(self, grid):
+        n = self.n
+        g16 = grid.astype(np.int16)
+        total = g16 + neighbor_sum(g16, self.boundary)
+        ill = neighbor_count(grid, n, self.boundary)
+        sick = (grid > 0) & (grid < n)
+        infected = neighbor_sum(sick.view(np.uint8), self.boundary)
+        ill = ill.astype(np.int16)
+        healthy_next = np.minimum(infected // self.k1 + ill // self.k2, n)
+        infected_next = np.minimum(total // 9 + int(self.g), n)
+        out = np.where(grid == 0, healthy_next,
+                       np.where(grid == n, 0, infected_next))
+        return out.astype(grid.dtype)
+
+
+class ElementaryRule:
+    """Wolfram elementary 1D rule (0-255) on a wrapped row."""
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.table = np.array([(rule >> i) & 1 for i in range(8)], dtype=np.uint8)
+
+    def step(self, row):
+        idx = (np.roll(row, 1) << 2) | (row << 1) | np.roll(row, -1)
+        return self.table[idx]
+
+
+def topple(grid, max_steps, boundary=OPEN):
+    """Abelian sandpile: every cell with >= 4 grains sheds one grain to each
+    von Neumann neighbor, in synchronous passes, until stable or `max_steps`.
+
+    Modifies `grid` in place. Returns True if the pile is now stable.
+    """
+    for _ in range(max_steps):
+        unstable = grid >= 4
+        if not unstable.any():
+            return True
+        u = unstable.astype(grid.dtype)
+        grid -= 4 * u
+        grid += neighbor_sum(u, boundary, VON_NEUMANN, dtype=grid.dtype)
+    return not (grid >= 4).any()
+
+
+class ColonyRule:
+    """Competing slime-mold colonies (multi-state, with per-cell strength).
+
+    Colonies 1..k grow into empty neighbors, attack weaker enemy cells at
+    their borders, strengthen in their interior, and decay with age. The
+    power of a colony gets a "last stand" boost when small and a momentum
+    boost when large. Off-grid neighbors count as empty (OPEN boundary).
+    """
+
+    def __init__(self, num_colonies, growth_chance=0.15, attack_power=0.10,
+                 base_power=None, rng=None):
+        self.k = num_colonies
+        self.growth_chance = growth_chance
+        self.attack_power = attack_power
+        self.rng = rng if rng is not None else np.random.default_rng()
+        if base_power is None:
+            base_power = self.rng.uniform(0.95, 1.05, num_colonies)
+        # Index 0 (empty) is never used as an attacker
+        self.base_power = np.concatenate(([1.0], base_power)).astype(np.float32)
+
+    def seed(self, grid, strength, age):
+        """Clear the arrays and drop a small seed cluster per colony, each
+        at least 15 cells from the others where possible."""
+        rng = self.rng
+        grid[:] = 0
+        strength[:] = 0.0
+        age[:] = 0
+        h, w = grid.shape
+        centers = []
+        for colony_id in range(1, self.k + 1):
+            for _ in range(50):
+                cx = int(rng.integers(8, w - 7))
+                cy = int(rng.integers(8, h - 7))
+                if all((x - cx) ** 2 + (y - cy) ** 2 >= 15 ** 2 for x, y in centers):
+                    break
+            centers.append((cx, cy))
+            ys, xs = np.mgrid[max(0, cy - 1):min(h, cy + 2),
+                              max(0, cx - 1):min(w, cx + 2)]
+            keep = rng.random(ys.shape) < 0.7
+            ys, xs = ys[keep], xs[keep]
+            grid[ys, xs] = colony_id
+            strength[ys, xs] = 1.0
+
+    def counts(self, grid):
+        """Cells per colony, index 0 = empty."""
+        return np.bincount(grid.ravel(), minlength=self.k + 1)
+
+    def powers(self, counts):
+        total = counts[1:].sum()
+        power = self.base_power.copy()
+        if total == 0:
+            power[:] = 1.0
+            return power
+        share = counts / total
+        mod = np.ones_like(power)
+        small = share < 0.10
+        big = share > 0.40
+        mod[small] = 1.0 + (0.10 - share[small]) * 3
+        mod[big] = 1.0 + (share[big] - 0.40) * 0.5
+        power[1:] *= np.where(counts[1:] > 0, mod[1:], 1.0)
+        return power
+
+    def _strength_by_colony(self, grid, strength):
+        """(k+1, H, W): summed neighbor strength per colony."""
+        out = np.zeros((self.k + 1,) + grid.shape, dtype=np.float32)
+        for c in range(1, self.k + 1):
+            out[c] = neighbor_sum(np.where(grid == c, strength, 0).astype(np.float32),
+                                  OPEN, dtype=np.float32)
+        return out
+
+    def step(self, grid, strength, age, counts):
+        """Advance one generation in place. `counts` is self.counts(grid)
+        taken once per tick, before the step."""
+        rng = self.rng
+        power = self.powers(counts)
+
+        # Growth: empty cells next to a colony may be claimed by the
+        # strongest neighboring colony.
+        by_col = self._strength_by_colony(grid, strength)
+        winner = by_col.argmax(axis=0)
+        win_str = np.take_along_axis(by_col, winner[None], 0)[0]
+        frontier = (grid == 0) & (win_str > 0)
+        grow = frontier & (rng.random(grid.shape) <= self.growth_chance)
+        if grow.any():
+            same = np.zeros(grid.shape, dtype=np.int8)
+            for c in range(1, self.k + 1):
+                same += np.where(winner == c,
+                                 neighbor_count(grid, c, OPEN), 0).astype(np.int8)
+            crowded = (same > 3) & (rng.random(grid.shape) > 0.3)
+            grow &= ~crowded
+            grid[grow] = winner[grow]
+            strength[grow] = np.minimum(1.0, win_str[grow] * power[winner[grow]] * 0.3)
+            age[grow] = 0
+
+        # Competition: the strongest enemy neighbor may take a border cell.
+        by_col = self._strength_by_colony(grid, strength)
+        enemy_pow = by_col * power[:, None, None]
+        cols = np.arange(self.k + 1)[:, None, None]
+        enemy_pow[(cols == grid[None]) | (cols == 0)] = 0
+        enemy = enemy_pow.argmax(axis=0)
+        best = np.take_along_axis(enemy_pow, enemy[None], 0)[0]
+        mine = strength * power[grid]
+        occupied = grid > 0
+        attack = occupied & (best > mine * 1.2)
+        attack &= rng.random(grid.shape) < (best - mine) * self.attack_power
+        if attack.any():
+            grid[attack] = enemy[attack]
+            strength[attack] = 0.5
+            age[attack] = 0
+
+        # Interior cells strengthen, border cells weaken, old cells decay.
+        by_col = self._strength_by_colony(grid, strength)
+        total_nb = by_col.sum(axis=0)
+        same = np.take_along_axis(by_col, grid[None].astype(np.intp), 0)[0]
+        enemies = total_nb - same
+        occupied = grid > 0
+        at_war = enemies > 0
+        new = np.where(at_war, np.maximum(0.1, strength - 0.02),
+                       np.where(same > 3, np.minimum(1.0, strength + 0.01), strength))
+        old = age > 10
+        new = np.where(old, np.maximum(0.1, new - (age - 10) * 0.003), new)
+        unstable = at_war & (strength > 0.8) & (rng.random(grid.shape) < 0.01)
+        new[unstable] = 0.3
+        new[~occupied] = 0.0
+        dead = occupied & (new < 0.05)
+        grid[dead] = 0
+        new[dead] = 0.0
+        age[dead] = 0
+        strength[:] = new
+
+
+def colony_frame(grid, strength, colors):
+    """RGB frame for ColonyRule: colony color scaled by 0.3 + 0.7 * strength,
+    empty cells black. `colors` is an (N, 3) palette for colonies 1..N."""
+    palette = np.vstack(([0, 0, 0], colors)).astype(np.float32)
+    brightness = (0.3 + 0.7 * strength)[..., None]
+    frame = palette[grid] * brightness
+    frame[grid == 0] = 0
+    return frame.astype(np.uint8)
+
+
+# ── Container ─────────────────────────────────────────────────────
+
+class Automaton:
+    """A grid plus a rule, with a uniform step/render/draw API."""
+
+    def __init__(self, rule, shape=(GRID_SIZE, GRID_SIZE), dtype=np.uint8):
+        self.rule = rule
+        self.grid = np.zeros(shape, dtype=dtype)
+        self.generation = 0
+
+    def step(self, n=1):
+        for _ in range(n):
+            self.grid = self.rule.step(self.grid)
+            self.generation += 1
+        return self.grid
+
+    def population(self):
+        """Number of non-zero cells."""
+        return int(np.count_nonzero(self.grid))
+
+    def render(self, palette):
+        """Palette gather: (N, 3) uint8 palette indexed by cell state."""
+        return palette[self.grid]
+
+    def draw(self, display, palette):
+        blit_rgb(display, self.render(palette))
@@ -17,10 +17,7 @@ Controls:
 import math
 import numpy as np
 from . import Visual, Display, Colors, GRID_SIZE
-from .fluid import (
-    _new_field, _set_bnd, _diffuse, _advect, _project,
-    _velocity_step, _density_step, N as FLUID_N, S as FLUID_S,
-)
+from .fluid import FluidSolver, _new_field, N as FLUID_N
 
 
 # ── Color mapping: temperature -> RGB ────────────────────────────
@@ -94,17 +91,12 @@ class Convection(Visual):
         self.overlay_lines = []
 
         # Use fluid solver's padded grid (S x S where S = N + 2 = 66)
-        self.u = _new_field()      # x-velocity
-        self.v = _new_field()      # y-velocity
-        self.u0 = _new_field()     # scratch x-velocity
-        self.v0 = _new_field()     # scratch y-velocity
+        self.solver = FluidSolver()
+        self.u = self.solver.u     # x-velocity
+        self.v = self.solver.v     # y-velocity
         self.T = _new_field()      # temperature
         self.T0 = _new_field()     # scratch temperature
 
-        # Scratch buffers for pressure projection
-        self.p = _new_field()
-        self.div = _new_field()
-
         # Initialize temperature: linear gradient + tiny perturbation
         N = FLUID_N
         for i in range(1, N + 1):
@@ -164,9 +156,8 @@ class Convection(Visual):
         T = self.T
         u = self.u
         v = self.v
-        u0 = self.u0
-        v0 = self.v0
         T0 = self.T0
+        solver = self.solver
         grad = self.temp_gradient
 
         dt = 0.1  # physics timestep
@@ -184,13 +175,13 @@ class Convection(Visual):
         v[1:N+1, 1:N+1] += -buoyancy * (T[1:N+1, 1:N+1] - T_mean) * dt
 
         # --- Velocity step (Stam solver: diffuse, project, advect, project) ---
-        _velocity_step(u, v, u0, v0, viscosity, dt)
+        solver.velocity_step(viscosity, dt)
 
         # --- Temperature advection and diffusion ---
         T0[:] = T
-        _advect(0, T, T0, u, v, dt)
+        solver.advect(0, T, T0, u, v, dt)
         T0[:] = T
-        _diffuse(0, T, T0, temp_diffusion, dt)
+        solver.diffuse(0, T, T0, temp_diffusion, dt)
 
         # --- Boundary conditions for temperature ---
         # Bottom hot, top cold (scaled by gradient)
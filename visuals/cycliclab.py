@@ -11,8 +11,11 @@ Controls:
   Both       - Commit params to settings
 """
 
-import random
+import numpy as np
+
 from . import Visual, Display, GRID_SIZE
+from .ca_engine import Automaton, CyclicRule
+from .framebuffer import blit_rgb, palette_array
 import settings
 
 # Named regions
@@ -111,13 +114,6 @@ def _build_color_table(n, palette_name):
     return table
 
 
-NEIGHBORS = [
-    (-1, -1), (0, -1), (1, -1),
-    (-1,  0),          (1,  0),
-    (-1,  1), (0,  1), (1,  1),
-]
-
-
 class CyclicLab(Visual):
     name = "CYCLIC LAB"
     description = "Explore cyclic CA parameter space"
@@ -141,9 +137,8 @@ class CyclicLab(Visual):
         self.palette_idx = settings.get('cyclic_lab_palette', 0) % len(PALETTE_NAMES)
         self._rebuild_colors()
 
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.next_grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.prev_grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.ca = Automaton(CyclicRule(self.num_states, self.threshold))
+        self.prev_grid = self.ca.grid.copy()
         self.blend = 0.0
         self._randomize()
 
@@ -153,14 +148,16 @@ class CyclicLab(Visual):
         self._both_held_prev = False
 
     def _rebuild_colors(self):
-        self.color_table = _build_color_table(
-            self.num_states, PALETTE_NAMES[self.palette_idx])
+        self.color_table = palette_array(_build_color_table(
+            self.num_states, PALETTE_NAMES[self.palette_idx]))
+
+    @property
+    def grid(self):
+        return self.ca.grid
 
     def _randomize(self):
-        n = self.num_states
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.grid[y][x] = random.randint(0, n - 1)
+        self.ca.grid = np.random.randint(
+            0, self.num_states, (GRID_SIZE, GRID_SIZE)).astype(np.uint8)
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -210,12 +207,8 @@ class CyclicLab(Visual):
 
     def _clamp_grid(self):
         n = self.num_states
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x] >= n:
-                    self.grid[y][x] = self.grid[y][x] % n
-                if self.prev_grid[y][x] >= n:
-                    self.prev_grid[y][x] = self.prev_grid[y][x] % n
+        self.ca.grid %= n
+        self.prev_grid %= n
 
     def update(self, dt: float):
         self.time += dt
@@ -233,53 +226,18 @@ class CyclicLab(Visual):
             self.confirm_timer = max(0.0, self.confirm_timer - dt)
 
     def _step_ca(self):
-        n = self.num_states
-        th = self.threshold
-        grid = self.grid
-        nxt = self.next_grid
-
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.prev_grid[y][x] = grid[y][x]
-
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                state = grid[y][x]
-                successor = (state + 1) % n
-                count = 0
-                for dx, dy in NEIGHBORS:
-                    if grid[(y + dy) % GRID_SIZE][(x + dx) % GRID_SIZE] == successor:
-                        count += 1
-                        if count >= th:
-                            break
-                if count >= th:
-                    nxt[y][x] = successor
-                else:
-                    nxt[y][x] = state
-
-        self.grid, self.next_grid = self.next_grid, self.grid
+        rule = self.ca.rule
+        rule.states = self.num_states
+        rule.threshold = self.threshold
+        self.prev_grid = self.ca.grid
+        self.ca.step()
 
     def draw(self):
-        colors = self.color_table
-        grid = self.grid
-        prev = self.prev_grid
-        t = self.blend
-        sp = self.display.set_pixel
-
-        for y in range(GRID_SIZE):
-            row = grid[y]
-            prev_row = prev[y]
-            for x in range(GRID_SIZE):
-                cc = colors[row[x]]
-                pc = colors[prev_row[x]]
-                if pc == cc:
-                    sp(x, y, cc)
-                else:
-                    sp(x, y, (
-                        int(pc[0] + (cc[0] - pc[0]) * t),
-                        int(pc[1] + (cc[1] - pc[1]) * t),
-                        int(pc[2] + (cc[2] - pc[2]) * t),
-                    ))
+        # Cross-fade from the previous generation's colors
+        cc = self.ca.render(self.color_table).astype(np.float32)
+        pc = self.color_table[self.prev_grid]
+        frame = pc + (cc - pc) * self.blend
+        blit_rgb(self.display, frame.astype(np.uint8))
 
         if self.param_overlay_timer > 0:
             alpha = min(1.0, self.param_overlay_timer / 0.5)
@@ -15,7 +15,11 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .render3d import ZBuffer, project, rot_x, rot_y, transform
 
 # ── Base chemistry ─────────────────────────────────────────────
 
@@ -251,31 +255,47 @@ class DNA(Visual):
             min(255, int(color[2] * tint[2])),
         )
 
-    def _transform_point(self, x, y, z):
-        """Rotate around Y axis with gentle X tilt, project to screen."""
+    def _helix_points(self):
+        """Both strands of the double helix, rotated around Y with a gentle
+        X tilt and projected to screen: two (sx, sy, z) array triples."""
+        center_y = (NUM_BASES * HELIX_PITCH) / 2
+        i = np.arange(NUM_BASES)
+        y = (i * HELIX_PITCH - center_y) * 0.8
+        angle = i * HELIX_TWIST
         tilt = 0.3 * math.sin(self.time * 0.3)
-        cos_t, sin_t = math.cos(tilt), math.sin(tilt)
-        y2 = y * cos_t - z * sin_t
-        z2 = y * sin_t + z * cos_t
-        cos_r, sin_r = math.cos(self.rotation_y), math.sin(self.rotation_y)
-        x2 = x * cos_r + z2 * sin_r
-        z3 = -x * sin_r + z2 * cos_r
-        return GRID_SIZE // 2 + x2, 28 - y2, z3
-
-    def _depth_shade(self, color, z, z_range=30.0):
-        factor = 0.4 + 0.6 * ((z + z_range) / (2 * z_range))
-        factor = max(0.2, min(1.0, factor))
-        return (int(color[0] * factor), int(color[1] * factor),
-                int(color[2] * factor))
-
-    def _set2x2(self, x, y, color):
-        """Draw a 2x2 pixel block (used for bases)."""
-        d = self.display
-        for dx in range(2):
-            for dy in range(2):
-                px, py = x + dx, y + dy
-                if 0 <= px < 64 and 0 <= py < 64:
-                    d.set_pixel(px, py, color)
+        m = rot_y(self.rotation_y) @ rot_x(tilt)
+        strands = []
+        for a in (angle, angle + math.pi):
+            pts = np.stack((HELIX_RADIUS * np.cos(a), y, HELIX_RADIUS * np.sin(a)), axis=-1)
+            strands.append(project(transform(pts, m), GRID_SIZE // 2, 28))
+        return strands
+
+    @staticmethod
+    def _depth_shade(colors, z, z_range=30.0):
+        """Darken colors (one, or one per z) with distance."""
+        factor = np.clip(0.4 + 0.6 * ((z + z_range) / (2 * z_range)), 0.2, 1.0)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        return (colors * factor[:, np.newaxis]).astype(np.uint8)
+
+    def _render_helix(self, strand1, strand2, bc1, bc2, rung_colors, pal):
+        """Z-buffered helix: a backbone along each strand, a rung across
+        each base pair and a 2x2 pixel block per base."""
+        zb = ZBuffer(pal['bg'])
+        for x, y, z in (strand1, strand2):
+            x, y = np.trunc(x), np.trunc(y)
+            zb.lines(x[:-1], y[:-1], z[:-1], x[1:], y[1:], z[1:],
+                     self._depth_shade(pal['backbone'], z[:-1]))
+        (x1, y1, z1), (x2, y2, z2) = strand1, strand2
+        zb.lines(np.trunc(x1), np.trunc(y1), z1, np.trunc(x2), np.trunc(y2), z2,
+                 self._depth_shade(rung_colors, (z1 + z2) / 2))
+        xs = np.rint(np.concatenate((x1, x2)))
+        ys = np.rint(np.concatenate((y1, y2)))
+        zs = np.concatenate((z1, z2))
+        colors = self._depth_shade(list(bc1) + list(bc2), zs)
+        dx = np.array([0, 1, 0, 1])[:, np.newaxis]
+        dy = np.array([0, 0, 1, 1])[:, np.newaxis]
+        zb.points((xs + dx).ravel(), (ys + dy).ravel(), np.tile(zs, 4), np.tile(colors, (4, 1)))
+        zb.blit(self.display)
 
     # ── reset / setup ─────────────────────────────────────────
 
@@ -472,65 +492,11 @@ class DNA(Visual):
     # ── DOUBLE HELIX ──────────────────────────────────────────
 
     def _draw_helix(self, pal):
-        d = self.display
-        draw_list = []
-        center_y = (NUM_BASES * HELIX_PITCH) / 2
-
-        for i in range(NUM_BASES):
-            base = self.sequence[i % len(self.sequence)]
-            comp = COMPLEMENT[base]
-            y_pos = (i * HELIX_PITCH - center_y) * 0.8
-            angle = i * HELIX_TWIST
-
-            x1 = HELIX_RADIUS * math.cos(angle)
-            z1 = HELIX_RADIUS * math.sin(angle)
-            x2 = HELIX_RADIUS * math.cos(angle + math.pi)
-            z2 = HELIX_RADIUS * math.sin(angle + math.pi)
-
-            sx1, sy1, sz1 = self._transform_point(x1, y_pos, z1)
-            sx2, sy2, sz2 = self._transform_point(x2, y_pos, z2)
-
-            bc1 = self._tint(BASE_COLORS[base], pal)
-            bc2 = self._tint(BASE_COLORS[comp], pal)
-            draw_list.append(('base', sz1, sx1, sy1, bc1))
-            draw_list.append(('base', sz2, sx2, sy2, bc2))
-            draw_list.append(('rung', (sz1 + sz2) / 2, sx1, sy1, sx2, sy2,
-                              pal['dim']))
-
-            if i < NUM_BASES - 1:
-                na = (i + 1) * HELIX_TWIST
-                ny = ((i + 1) * HELIX_PITCH - center_y) * 0.8
-                for xr, zr, sz in [(x1, z1, sz1), (x2, z2, sz2)]:
-                    nxr = HELIX_RADIUS * math.cos(na + (math.pi if xr == x2 else 0))
-                    nzr = HELIX_RADIUS * math.sin(na + (math.pi if xr == x2 else 0))
-                    snx, sny, snz = self._transform_point(nxr, ny, nzr)
-                    sx_c = sx1 if xr == x1 else sx2
-                    sy_c = sy1 if xr == x1 else sy2
-                    draw_list.append(('bb', (sz + snz) / 2, sx_c, sy_c,
-                                      snx, sny, sz))
-
-        self._render_helix_list(draw_list, pal)
-
-    def _render_helix_list(self, draw_list, pal):
-        """Painter's algorithm render for 3D helix draw lists."""
-        d = self.display
-        draw_list.sort(key=lambda it: it[1])
-        for item in draw_list:
-            kind = item[0]
-            if kind == 'bb':
-                _, _, x1, y1, x2, y2, z = item
-                c = self._depth_shade(pal['backbone'], z)
-                d.draw_line(int(x1), int(y1), int(x2), int(y2), c)
-            elif kind == 'rung':
-                _, _, x1, y1, x2, y2, rc = item
-                z = item[1]
-                c = self._depth_shade(rc, z)
-                d.draw_line(int(x1), int(y1), int(x2), int(y2), c)
-            elif kind == 'base':
-                _, z, sx, sy, bc = item
-                c = self._depth_shade(bc, z)
-                ix, iy = int(round(sx)), int(round(sy))
-                self._set2x2(ix, iy, c)
+        bases = [self.sequence[i % len(self.sequence)] for i in range(NUM_BASES)]
+        bc1 = [self._tint(BASE_COLORS[base], pal) for base in bases]
+        bc2 = [self._tint(BASE_COLORS[COMPLEMENT[base]], pal) for base in bases]
+        strand1, strand2 = self._helix_points()
+        self._render_helix(strand1, strand2, bc1, bc2, pal['dim'], pal)
 
     # ── REPLICATION ───────────────────────────────────────────
 
@@ -769,23 +735,12 @@ class DNA(Visual):
     def _draw_mutation(self, pal):
         """3D helix with flashing mutations and mismatched bases."""
         d = self.display
-        draw_list = []
-        center_y = (NUM_BASES * HELIX_PITCH) / 2
+        bc1, bc2, rung_colors = [], [], []
 
         for i in range(NUM_BASES):
             seq_i = i % len(self.sequence)
             base = self.sequence[seq_i]
             comp = COMPLEMENT[base]
-            y_pos = (i * HELIX_PITCH - center_y) * 0.8
-            angle = i * HELIX_TWIST
-
-            x1 = HELIX_RADIUS * math.cos(angle)
-            z1 = HELIX_RADIUS * math.sin(angle)
-            x2 = HELIX_RADIUS * math.cos(angle + math.pi)
-            z2 = HELIX_RADIUS * math.sin(angle + math.pi)
-
-            sx1, sy1, sz1 = self._transform_point(x1, y_pos, z1)
-            sx2, sy2, sz2 = self._transform_point(x2, y_pos, z2)
 
             # Check for active mutation
             is_mutated = seq_i in self.mutations
@@ -793,43 +748,29 @@ class DNA(Visual):
             if is_mutated:
                 flash = int(self.mutations[seq_i]['timer'] * 6) % 2 == 0
 
-            bc1 = self._tint(BASE_COLORS[base], pal)
+            c1 = self._tint(BASE_COLORS[base], pal)
             if is_mutated and flash:
-                bc1 = (255, 255, 255)
+                c1 = (255, 255, 255)
 
             # Complement: if mutated, show OLD complement (mismatch)
             if is_mutated:
                 orig_comp = COMPLEMENT[self.mutations[seq_i]['original']]
-                bc2 = self._tint(BASE_COLORS[orig_comp], pal)
+                c2 = self._tint(BASE_COLORS[orig_comp], pal)
                 if flash:
-                    bc2 = (255, 0, 0)
+                    c2 = (255, 0, 0)
             else:
-                bc2 = self._tint(BASE_COLORS[comp], pal)
-
-            draw_list.append(('base', sz1, sx1, sy1, bc1))
-            draw_list.append(('base', sz2, sx2, sy2, bc2))
+                c2 = self._tint(BASE_COLORS[comp], pal)
+            bc1.append(c1)
+            bc2.append(c2)
 
             # Rung color: red if mutated
             rc = pal['dim']
             if is_mutated:
                 rc = (200, 50, 50) if not flash else (255, 100, 100)
-            draw_list.append(('rung', (sz1 + sz2) / 2, sx1, sy1, sx2, sy2,
-                              rc))
-
-            if i < NUM_BASES - 1:
-                na = (i + 1) * HELIX_TWIST
-                ny = ((i + 1) * HELIX_PITCH - center_y) * 0.8
-                for xr, zr, sz in [(x1, z1, sz1), (x2, z2, sz2)]:
-                    offset = math.pi if xr == x2 else 0
-                    nxr = HELIX_RADIUS * math.cos(na + offset)
-                    nzr = HELIX_RADIUS * math.sin(na + offset)
-                    snx, sny, snz = self._transform_point(nxr, ny, nzr)
-                    sx_c = sx1 if xr == x1 else sx2
-                    sy_c = sy1 if xr == x1 else sy2
-                    draw_list.append(('bb', (sz + snz) / 2, sx_c, sy_c,
-                                      snx, sny, sz))
-
-        self._render_helix_list(draw_list, pal)
+            rung_colors.append(rc)
+
+        strand1, strand2 = self._helix_points()
+        self._render_helix(strand1, strand2, bc1, bc2, rung_colors, pal)
 
         # Mutation count label
         n_mut = len(self.mutations)
@@ -929,8 +870,6 @@ class DNA(Visual):
 
     def _draw_crispr(self, pal):
         d = self.display
-        draw_list = []
-        center_y = (NUM_BASES * HELIX_PITCH) / 2
         scan_i = int(self.crispr_scan_pos)
         phase = self.crispr_phase
         target = self.crispr_target
@@ -941,70 +880,47 @@ class DNA(Visual):
         cut_color = (255, 80, 80)
         repair_color = (80, 255, 120)
 
+        (sx1, sy1, sz1), (sx2, sy2, sz2) = self._helix_points()
+        bc1, bc2, rung_colors = [], [], []
+        gaps = np.zeros(NUM_BASES)
+
         for i in range(NUM_BASES):
             seq_i = i % len(self.sequence)
             base = self.sequence[seq_i]
             comp = COMPLEMENT[base]
-            y_pos = (i * HELIX_PITCH - center_y) * 0.8
-            angle = i * HELIX_TWIST
-
-            x1 = HELIX_RADIUS * math.cos(angle)
-            z1 = HELIX_RADIUS * math.sin(angle)
-            x2 = HELIX_RADIUS * math.cos(angle + math.pi)
-            z2 = HELIX_RADIUS * math.sin(angle + math.pi)
-
-            sx1, sy1, sz1 = self._transform_point(x1, y_pos, z1)
-            sx2, sy2, sz2 = self._transform_point(x2, y_pos, z2)
 
             # Cut phase: split the strands at target
             if phase == 'cut' and abs(i - target) <= 1:
-                gap = min(4.0, cut_t * 3.0)
-                sx1 -= gap
-                sx2 += gap
+                gaps[i] = min(4.0, cut_t * 3.0)
 
             # Repair phase: close the gap back
             if phase == 'repair' and abs(i - target) <= 1:
-                gap = max(0.0, 4.0 - cut_t * 2.0)
-                sx1 -= gap
-                sx2 += gap
+                gaps[i] = max(0.0, 4.0 - cut_t * 2.0)
 
-            bc1 = self._tint(BASE_COLORS[base], pal)
-            bc2 = self._tint(BASE_COLORS[comp], pal)
+            c1 = self._tint(BASE_COLORS[base], pal)
+            c2 = self._tint(BASE_COLORS[comp], pal)
 
             # Highlight scanned region
             if phase == 'scan' and i <= scan_i and i >= max(0, scan_i - 2):
-                bc1 = grna_color
+                c1 = grna_color
             if phase in ('bind', 'cut') and abs(i - target) <= 1:
-                bc1 = cas9_color
-                bc2 = cas9_color
+                c1 = cas9_color
+                c2 = cas9_color
             if phase == 'repair' and abs(i - target) <= 1:
-                bc1 = repair_color
-                bc2 = repair_color
-
-            draw_list.append(('base', sz1, sx1, sy1, bc1))
-            draw_list.append(('base', sz2, sx2, sy2, bc2))
+                c1 = repair_color
+                c2 = repair_color
+            bc1.append(c1)
+            bc2.append(c2)
 
             rc = pal['dim']
             if phase == 'cut' and abs(i - target) <= 1:
                 rc = cut_color
             elif phase == 'repair' and abs(i - target) <= 1:
                 rc = repair_color
-            draw_list.append(('rung', (sz1 + sz2) / 2, sx1, sy1, sx2, sy2, rc))
-
-            if i < NUM_BASES - 1:
-                na = (i + 1) * HELIX_TWIST
-                ny = ((i + 1) * HELIX_PITCH - center_y) * 0.8
-                for xr, zr, sz in [(x1, z1, sz1), (x2, z2, sz2)]:
-                    offset = math.pi if xr == x2 else 0
-                    nxr = HELIX_RADIUS * math.cos(na + offset)
-                    nzr = HELIX_RADIUS * math.sin(na + offset)
-                    snx, sny, snz = self._transform_point(nxr, ny, nzr)
-                    sx_c = sx1 if xr == x1 else sx2
-                    sy_c = sy1 if xr == x1 else sy2
-                    draw_list.append(('bb', (sz + snz) / 2, sx_c, sy_c,
-                                      snx, sny, sz))
-
-        self._render_helix_list(draw_list, pal)
+            rung_colors.append(rc)
+
+        self._render_helix((sx1 - gaps, sy1, sz1), (sx2 + gaps, sy2, sz2),
+                           bc1, bc2, rung_colors, pal)
 
         labels = {
             'scan': ('SCANNING', grna_color),
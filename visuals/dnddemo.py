@@ -2,15 +2,15 @@
 D&D Demo - AI Attract Mode
 ===========================
 AI-controlled dungeon crawler for idle screen demos.
-Uses BFS pathfinding to navigate corridors, collect items,
+Uses A* pathfinding to navigate corridors, collect items,
 fight monsters with arrows, and descend deeper when the boss is slain.
 """
 
 from . import Visual, Display, Colors, GRID_SIZE
+from .maze_nav import astar
 from arcade import InputState, GameState
 import math
 import random
-from collections import deque
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from games.dnd import DnD
@@ -37,8 +37,8 @@ class DnDDemo(Visual):
     def handle_input(self, input_state):
         return False
 
-    def _bfs_path(self, sx, sy, tx, ty):
-        """BFS on dungeon grid. Returns list of (x, y) steps from start to target."""
+    def _find_path(self, sx, sy, tx, ty):
+        """A* on dungeon grid. Returns list of (x, y) steps from start to target."""
         sx, sy, tx, ty = int(sx), int(sy), int(tx), int(ty)
         dungeon = self.game.dungeon
         w = self.game.DUNGEON_WIDTH
@@ -46,39 +46,18 @@ class DnDDemo(Visual):
 
         if not (0 <= tx < w and 0 <= ty < h):
             return []
-        if dungeon[ty][tx] != 0:
+        if dungeon[ty][tx] != 0 or (abs(sx - tx) <= 1 and abs(sy - ty) <= 1):
             return []
 
-        visited = set()
-        visited.add((sx, sy))
-        parent = {}
-        queue = deque()
-        queue.append((sx, sy))
-
-        while queue:
-            cx, cy = queue.popleft()
-            if abs(cx - tx) <= 1 and abs(cy - ty) <= 1:
-                # Reconstruct path
-                path = [(cx, cy)]
-                while (cx, cy) in parent:
-                    cx, cy = parent[(cx, cy)]
-                    path.append((cx, cy))
-                path.reverse()
-                return path[1:]  # skip start position
-
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = cx + dx, cy + dy
-                if (nx, ny) in visited:
-                    continue
-                if not (0 <= nx < w and 0 <= ny < h):
-                    continue
-                if dungeon[ny][nx] != 0:
-                    continue
-                visited.add((nx, ny))
-                parent[(nx, ny)] = (cx, cy)
-                queue.append((nx, ny))
-
-        return []
+        def passable(x, y):
+            return 0 <= x < w and 0 <= y < h and dungeon[y][x] == 0
+
+        path = astar((sx, sy), (tx, ty), passable) or []
+        # Stop at the first step within a tile of the target
+        for i, (x, y) in enumerate(path):
+            if abs(x - tx) <= 1 and abs(y - ty) <= 1:
+                return path[:i + 1]
+        return path
 
     def _pick_target(self):
         """Choose target: items > exit (if boss dead) > boss > explore."""
@@ -121,10 +100,10 @@ class DnDDemo(Visual):
         return px, py
 
     def _recompute_path(self):
-        """Pick a target and compute BFS path to it."""
+        """Pick a target and compute a path to it."""
         tx, ty = self._pick_target()
         self.path_target = (tx, ty)
-        self.path = self._bfs_path(self.game.player_x, self.game.player_y, tx, ty)
+        self.path = self._find_path(self.game.player_x, self.game.player_y, tx, ty)
 
     def _find_nearby_monster(self, max_range=20):
         """Return closest visible monster within max_range, or None."""
@@ -184,7 +163,7 @@ class DnDDemo(Visual):
                 ai_input.action_l = True
                 self.shoot_cooldown = 0.35
         elif self.path:
-            # Follow BFS path
+            # Follow the path
             next_x, next_y = self.path[0]
             dx = next_x - px
             dy = next_y - py
@@ -10,10 +10,15 @@ import random
 import math
 import sys
 import os
+
+import numpy as np
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from games.drift_sim import (DriftSim, SPRING_FLOW_RATE, MAX_HEIGHT,
                              MIN_HEIGHT, _terrain_color, _water_color,
                              MIN_DEPTH)
+from raycast import column_fill, ray_offsets
+from .framebuffer import blit_rgb
 
 W = 64   # screen width = grid width
 H = 64   # screen height = grid height
@@ -61,28 +66,35 @@ EVAP_RESTORE = 0.00004   # added back per-cell per sec to counter evaporation
 # --- Pre-compute LUTs at module load ---
 
 # Terrain color: 256 entries mapping height bucket -> (r, g, b)
-_TERRAIN_LUT = []
-for _i in range(256):
-    _h = MIN_HEIGHT + (MAX_HEIGHT - MIN_HEIGHT) * _i / 255.0
-    _TERRAIN_LUT.append(_terrain_color(_h))
+_TERRAIN_LUT = np.array([
+    _terrain_color(MIN_HEIGHT + (MAX_HEIGHT - MIN_HEIGHT) * _i / 255.0)
+    for _i in range(256)], dtype=np.int64)
 
 # Water color: 64 entries mapping depth bucket -> (r, g, b)
-_WATER_LUT = []
-for _i in range(64):
-    _d = _i * 0.5  # 0..31.5 depth range
-    _WATER_LUT.append(_water_color(_d))
+_WATER_LUT = np.array([_water_color(_i * 0.5)   # 0..31.5 depth range
+                       for _i in range(64)], dtype=np.int64)
 
 # Per-column ray offsets (angle offset from center + cos correction)
-_COL_ANGLES = []
-_COL_COS = []
-for _c in range(W):
-    _ang = (_c / W - 0.5) * FOV
-    _COL_ANGLES.append(_ang)
-    _COL_COS.append(math.cos(_ang))
+_COL_ANGLES = ray_offsets(W, FOV)
+_COL_COS = np.cos(_COL_ANGLES)
+
+# Sample distances along every ray: fine near, coarse far. The schedule
+# is the same for all columns, so it is accumulated once here.
+def _march_distances():
+    dists = []
+    dist = 1.0
+    step = STEP_NEAR
+    while dist < DRAW_DIST and len(dists) < MAX_STEPS:
+        dists.append(dist)
+        dist += step
+        step += (STEP_FAR - STEP_NEAR) / MAX_STEPS
+    return np.array(dists)
+
+_DISTS = _march_distances()
 
 
 def _make_sky_grad(horizon):
-    """Build sky gradient for a given horizon row."""
+    """Build sky gradient for a given horizon row, as an (H, W, 3) frame."""
     grad = []
     for i in range(H):
         if i <= horizon:
@@ -96,30 +108,26 @@ def _make_sky_grad(horizon):
             g = int(12 + (FOG_COLOR[1] - 12) * t)
             b = int(30 + (FOG_COLOR[2] - 30) * t)
         grad.append((r, g, b))
-    return grad
+    return np.repeat(np.array(grad, dtype=np.uint8)[:, np.newaxis], W, axis=1)
 
 
 # Pre-build sky gradients for each view preset
 _SKY_GRADS = [_make_sky_grad(vp[1]) for vp in VIEW_PRESETS]
 
 
-def _fog_lerp(r, g, b, dist):
-    """Apply distance fog toward FOG_COLOR."""
-    if dist <= FOG_START:
-        return r, g, b
-    t = (dist - FOG_START) / (FOG_END - FOG_START)
-    if t >= 1.0:
-        return FOG_COLOR
-    fr, fg, fb = FOG_COLOR
-    return (int(r + (fr - r) * t),
-            int(g + (fg - g) * t),
-            int(b + (fb - b) * t))
+def _fog_lerp(rgb, dist):
+    """Apply distance fog toward FOG_COLOR; dist broadcasts against the
+    leading axes of rgb."""
+    t = (np.asarray(dist) - FOG_START) / (FOG_END - FOG_START)
+    t = np.clip(t, 0.0, 1.0)[..., np.newaxis]
+    fogged = (rgb + (np.array(FOG_COLOR) - rgb) * t).astype(np.int64)
+    return np.where(t > 0, fogged, rgb)
 
 
 def _find_slopes(sim, count=4):
     """Find spring positions on slopes — mid-height with steep gradient."""
     w, h = sim.width, sim.height
-    terrain = sim.terrain
+    terrain = sim.terrain.ravel().tolist()
     margin = max(3, w // 12)
     min_dist = max(8, w // 8)
 
@@ -262,151 +270,75 @@ class Drift3D:
         # Counteract evaporation so water accumulates and pools
         restore = EVAP_RESTORE * dt
         water = self.sim.water
-        for i in range(len(water)):
-            if water[i] > MIN_DEPTH:
-                water[i] += restore
+        water[water > MIN_DEPTH] += restore
 
     def draw(self):
         display = self.display
-        display.clear()
 
         # Current view settings
         cam_h, horizon, _ = VIEW_PRESETS[self.view_idx]
-        sky_grad = _SKY_GRADS[self.view_idx]
-
-        # Cache locals for speed
-        terrain = self.sim.terrain
-        water = self.sim.water
         gw = GW
         gh = GH
-        cam_angle = self.cam_angle
         time = self.time
-        set_pixel = display.set_pixel
-        gw_1 = gw - 1
-        gh_1 = gh - 1
 
         # Camera position (orbiting terrain center)
-        cx = gw * 0.5 + CAM_RADIUS * math.cos(cam_angle)
-        cy = gh * 0.5 + CAM_RADIUS * math.sin(cam_angle)
+        cx = gw * 0.5 + CAM_RADIUS * math.cos(self.cam_angle)
+        cy = gh * 0.5 + CAM_RADIUS * math.sin(self.cam_angle)
 
         # Direction camera is looking (toward center)
         look_angle = math.atan2(gh * 0.5 - cy, gw * 0.5 - cx)
-
-        sin_table = []
-        cos_table = []
-        for c in range(W):
-            a = look_angle + _COL_ANGLES[c]
-            sin_table.append(math.sin(a))
-            cos_table.append(math.cos(a))
-
-        # Sky: fill entire screen as backdrop (terrain overwrites below)
-        for row in range(H):
-            sr, sg, sb = sky_grad[row]
-            for c in range(W):
-                set_pixel(c, row, (sr, sg, sb))
-
-        # Projection constant
-        proj_k = SCALE_H / H
-
-        # Voxel space ray march with bilinear interpolation
-        for c in range(W):
-            ray_sin = sin_table[c]
-            ray_cos = cos_table[c]
-            cos_corr = _COL_COS[c]
-            max_y = H  # lowest unfilled row (draw upward from bottom)
-
-            dist = 1.0
-            step = STEP_NEAR
-            steps = 0
-
-            while dist < DRAW_DIST and steps < MAX_STEPS:
-                # Sample position on terrain grid
-                gx = cx + ray_cos * dist
-                gy = cy + ray_sin * dist
-
-                # Bilinear interpolation coords
-                ix = int(gx)
-                iy = int(gy)
-
-                if 0 <= ix < gw and 0 <= iy < gh:
-                    fx = gx - ix
-                    fy = gy - iy
-                    ix1 = ix + 1 if ix < gw_1 else ix
-                    iy1 = iy + 1 if iy < gh_1 else iy
-
-                    # Bilinear sample terrain height
-                    i00 = iy * gw + ix
-                    i10 = iy * gw + ix1
-                    i01 = iy1 * gw + ix
-                    i11 = iy1 * gw + ix1
-                    w00 = (1 - fx) * (1 - fy)
-                    w10 = fx * (1 - fy)
-                    w01 = (1 - fx) * fy
-                    w11 = fx * fy
-                    t_h = (terrain[i00] * w00 + terrain[i10] * w10 +
-                           terrain[i01] * w01 + terrain[i11] * w11)
-
-                    # Bilinear sample water depth
-                    w_d = (water[i00] * w00 + water[i10] * w10 +
-                           water[i01] * w01 + water[i11] * w11)
-
-                    # Determine surface height and color
-                    if w_d > MIN_DEPTH:
-                        surface_h = t_h + w_d
-                        # Water color from LUT
-                        wi = int(w_d * 2.0)
-                        if wi > 63:
-                            wi = 63
-                        cr, cg, cb = _WATER_LUT[wi]
-                        # Gentle shimmer
-                        shimmer = math.sin(gx * 3.0 + time * 2.5) * math.sin(gy * 2.5 + time * 2.0)
-                        shimmer_i = int(shimmer * 12)
-                        cr = max(0, min(255, cr + shimmer_i))
-                        cg = max(0, min(255, cg + shimmer_i))
-                        cb = max(0, min(255, cb + shimmer_i))
-                    else:
-                        surface_h = t_h
-                        # Terrain color from LUT
-                        ti = int((t_h - MIN_HEIGHT) / (MAX_HEIGHT - MIN_HEIGHT) * 255)
-                        if ti < 0:
-                            ti = 0
-                        elif ti > 255:
-                            ti = 255
-                        cr, cg, cb = _TERRAIN_LUT[ti]
-
-                    # Corrected distance for projection (remove fisheye)
-                    corr_dist = dist * cos_corr
-                    if corr_dist < 0.5:
-                        corr_dist = 0.5
-
-                    # Project to screen Y
-                    screen_y = horizon + (cam_h - surface_h) / corr_dist * proj_k
-
-                    draw_y = int(screen_y)
-                    if draw_y < 0:
-                        draw_y = 0
-
-                    if draw_y < max_y:
-                        # Apply fog
-                        cr, cg, cb = _fog_lerp(cr, cg, cb, dist)
-
-                        color = (cr, cg, cb)
-
-                        # Draw vertical strip from draw_y to max_y
-                        y = draw_y
-                        while y < max_y:
-                            if y >= 0:
-                                set_pixel(c, y, color)
-                            y += 1
-                        max_y = draw_y
-
-                    if max_y <= 0:
-                        break
-
-                # Variable step size: fine near, coarse far
-                dist += step
-                step += (STEP_FAR - STEP_NEAR) / MAX_STEPS
-                steps += 1
+        angles = look_angle + _COL_ANGLES
+
+        # Voxel space ray march: every sample of every column at once,
+        # (samples, columns), near to far
+        dist = _DISTS[:, np.newaxis]
+        gx = cx + np.cos(angles) * dist
+        gy = cy + np.sin(angles) * dist
+        ix = gx.astype(np.int64)
+        iy = gy.astype(np.int64)
+        inside = (ix >= 0) & (ix < gw) & (iy >= 0) & (iy < gh)
+        ix = np.clip(ix, 0, gw - 1)
+        iy = np.clip(iy, 0, gh - 1)
+
+        # Bilinear interpolation
+        fx = gx - ix
+        fy = gy - iy
+        ix1 = np.minimum(ix + 1, gw - 1)
+        iy1 = np.minimum(iy + 1, gh - 1)
+        w00 = (1 - fx) * (1 - fy)
+        w10 = fx * (1 - fy)
+        w01 = (1 - fx) * fy
+        w11 = fx * fy
+        terrain = self.sim.terrain
+        water = self.sim.water
+        t_h = (terrain[iy, ix] * w00 + terrain[iy, ix1] * w10 +
+               terrain[iy1, ix] * w01 + terrain[iy1, ix1] * w11)
+        w_d = (water[iy, ix] * w00 + water[iy, ix1] * w10 +
+               water[iy1, ix] * w01 + water[iy1, ix1] * w11)
+
+        # Surface height and color: terrain from its LUT, water from its
+        # LUT with a gentle shimmer
+        wet = w_d > MIN_DEPTH
+        surface_h = np.where(wet, t_h + w_d, t_h)
+        ti = ((t_h - MIN_HEIGHT) / (MAX_HEIGHT - MIN_HEIGHT) * 255).astype(np.int64)
+        color = _TERRAIN_LUT[np.clip(ti, 0, 255)]
+        wi = np.minimum((w_d[wet] * 2.0).astype(np.int64), 63)
+        shimmer = np.sin(gx[wet] * 3.0 + time * 2.5) * np.sin(gy[wet] * 2.5 + time * 2.0)
+        shimmer_i = (shimmer * 12).astype(np.int64)[:, np.newaxis]
+        color[wet] = np.clip(_WATER_LUT[wi] + shimmer_i, 0, 255)
+        color = _fog_lerp(color, dist)
+
+        # Project to screen Y, with corrected distance (remove fisheye)
+        corr_dist = np.maximum(dist * _COL_COS, 0.5)
+        screen_y = horizon + (cam_h - surface_h) / corr_dist * (SCALE_H / H)
+        draw_y = np.maximum(screen_y.astype(np.int64), 0)
+        draw_y[~inside] = H
+
+        # Each sample draws a strip from its top down to the nearer ones',
+        # over the sky backdrop
+        frame, filled = column_fill(draw_y, color, H)
+        frame[~filled] = _SKY_GRADS[self.view_idx][~filled]
+        blit_rgb(display, frame)
 
         # Overlay text
         if self.overlay_timer > 0 and self.overlay_text:
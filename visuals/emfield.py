@@ -14,7 +14,12 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, blit_rgb
+from .nbody import potential_at
 
 # Coulomb constant (tuned for display scale)
 K_COULOMB = 200.0
@@ -87,14 +92,11 @@ def _efield_at(charges, px, py):
 
 
 def _potential_at(charges, px, py):
-    """Compute electric potential at point (px, py)."""
-    v = 0.0
-    for c in charges:
-        dx = px - c.x
-        dy = py - c.y
-        dist = math.sqrt(dx * dx + dy * dy + 1.0)
-        v += K_COULOMB * c.q / dist
-    return v
+    """Compute electric potential at points (px, py) (arrays)."""
+    sx = np.array([c.x for c in charges], dtype=np.float64)
+    sy = np.array([c.y for c in charges], dtype=np.float64)
+    strength = K_COULOMB * np.array([c.q for c in charges], dtype=np.float64)
+    return potential_at(px, py, sx, sy, strength, 1.0)
 
 
 def _trace_field_line(charges, start_x, start_y):
@@ -163,46 +165,36 @@ def _draw_charges(display, charges, pal):
 
 def _draw_field_lines(display, lines, pal):
     """Draw cached field lines."""
-    line_color = pal['line']
-    for line in lines:
-        n = len(line)
-        for i, (x, y) in enumerate(line):
-            if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
-                t = 1.0 - (i / n) * 0.6
-                color = (
-                    int(line_color[0] * t),
-                    int(line_color[1] * t),
-                    int(line_color[2] * t),
-                )
-                display.set_pixel(x, y, color)
+    if not lines:
+        return
+    pts = np.concatenate([np.array(line) for line in lines])
+    # Each line fades from full to 40% along its length
+    t = np.concatenate([1.0 - (np.arange(len(line)) / len(line)) * 0.6 for line in lines])
+    rgb = (np.array(pal['line'], dtype=np.float64) * t[:, np.newaxis]).astype(np.int64)
+    blit_points(display, pts[:, 0], pts[:, 1], rgb)
+
+
+# Pixel centers, flattened in row-major order
+_CENTER_Y, _CENTER_X = (np.mgrid[0:GRID_SIZE, 0:GRID_SIZE] + 0.5).reshape(2, -1)
 
 
 def _draw_equipotential(display, charges, palette_idx):
     """Draw equipotential contour map."""
-    ramp = EQUIP_RAMPS[palette_idx % len(EQUIP_RAMPS)]
+    ramp = np.array(EQUIP_RAMPS[palette_idx % len(EQUIP_RAMPS)], dtype=np.float64)
     n_colors = len(ramp)
 
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            v = _potential_at(charges, x + 0.5, y + 0.5)
-            t = (math.atan(v * 0.02) / math.pi + 0.5)
+    v = _potential_at(charges, _CENTER_X, _CENTER_Y)
+    t = np.arctan(v * 0.02) / math.pi + 0.5
 
-            band = (t * 20) % 1.0
-            if band < 0.1:
-                brightness = 0.3
-            else:
-                brightness = 0.6 + 0.4 * band
-
-            idx = t * (n_colors - 1)
-            lo = int(idx)
-            hi = min(lo + 1, n_colors - 1)
-            f = idx - lo
-            c0 = ramp[lo]
-            c1 = ramp[hi]
-            r = int((c0[0] + (c1[0] - c0[0]) * f) * brightness)
-            g = int((c0[1] + (c1[1] - c0[1]) * f) * brightness)
-            b = int((c0[2] + (c1[2] - c0[2]) * f) * brightness)
-            display.set_pixel(x, y, (r, g, b))
+    band = (t * 20) % 1.0
+    brightness = np.where(band < 0.1, 0.3, 0.6 + 0.4 * band)
+
+    idx = t * (n_colors - 1)
+    lo = idx.astype(np.int64)
+    hi = np.minimum(lo + 1, n_colors - 1)
+    f = (idx - lo)[:, np.newaxis]
+    rgb = (ramp[lo] + (ramp[hi] - ramp[lo]) * f) * brightness[:, np.newaxis]
+    blit_rgb(display, rgb.astype(np.int64).reshape(GRID_SIZE, GRID_SIZE, 3))
 
 
 # ── EMMotor ──────────────────────────────────────────────────────
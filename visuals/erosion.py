@@ -11,8 +11,11 @@ Controls:
   Button      - New terrain
 """
 
-import random, math
+import random
+import numpy as np
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_rgb
+from heightfield import Droplets, diamond_square, hillshade, normalize
 
 RAIN_LEVELS = [
     (5,  'DRIZZLE'),
@@ -38,6 +41,12 @@ TERRAIN_PRESETS = [
     'CANYON',
 ]
 
+# Height-to-slope scale for hillshade (heights are 0..1 over 64 cells)
+SHADE_RELIEF = 24.0
+_FLAT_SHADE = hillshade(np.zeros((3, 3)))[1, 1]
+
+_YS, _XS = np.mgrid[0:GRID_SIZE, 0:GRID_SIZE].astype(np.float64)
+
 
 class Erosion(Visual):
     name = "EROSION"
@@ -64,6 +73,7 @@ class Erosion(Visual):
     GRAVITY = 4.0
     FRICTION = 0.05
     INERTIA = 0.3
+    DROPLET_STEPS_PER_TICK = 8
 
     def __init__(self, display: Display):
         super().__init__(display)
@@ -75,7 +85,7 @@ class Erosion(Visual):
         self.terrain_preset = 0
 
         self.height = None
-        self.flow = [[0.0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.flow = np.zeros((GRID_SIZE, GRID_SIZE))
         self._generate_terrain()
 
         self.rain_particles = []
@@ -102,7 +112,8 @@ class Erosion(Visual):
     # ------------------------------------------------------------------
 
     def _generate_terrain(self):
-        self.height = self._diamond_square()
+        grid = diamond_square(6)
+        self.height = normalize(grid[:GRID_SIZE, :GRID_SIZE])
         preset = TERRAIN_PRESETS[self.terrain_preset]
         if preset == 'MOUNTAIN':
             self._add_ridge()
@@ -114,243 +125,76 @@ class Erosion(Visual):
             self._add_plateau()
         elif preset == 'CANYON':
             self._add_canyon()
-        self.flow = [[0.0] * GRID_SIZE for _ in range(GRID_SIZE)]
-
-    def _diamond_square(self):
-        size = 65
-        grid = [[0.0] * size for _ in range(size)]
-        for cy in (0, size - 1):
-            for cx in (0, size - 1):
-                grid[cy][cx] = random.random()
-
-        step = size - 1
-        scale = 0.5
-        while step > 1:
-            half = step // 2
-            for y in range(0, size - 1, step):
-                for x in range(0, size - 1, step):
-                    avg = (grid[y][x] + grid[y][x + step] +
-                           grid[y + step][x] + grid[y + step][x + step]) / 4.0
-                    grid[y + half][x + half] = avg + (random.random() - 0.5) * scale
-            for y in range(0, size, half):
-                x_start = half if (y // half) % 2 == 0 else 0
-                for x in range(x_start, size, step):
-                    total = 0.0
-                    count = 0
-                    if y >= half:
-                        total += grid[y - half][x]
-                        count += 1
-                    if y + half < size:
-                        total += grid[y + half][x]
-                        count += 1
-                    if x >= half:
-                        total += grid[y][x - half]
-                        count += 1
-                    if x + half < size:
-                        total += grid[y][x + half]
-                        count += 1
-                    grid[y][x] = total / count + (random.random() - 0.5) * scale
-            step = half
-            scale *= 0.5
-
-        hmin = float('inf')
-        hmax = float('-inf')
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                v = grid[y][x]
-                if v < hmin:
-                    hmin = v
-                if v > hmax:
-                    hmax = v
-        rng = hmax - hmin if hmax > hmin else 1.0
-        result = []
-        for y in range(GRID_SIZE):
-            row = []
-            for x in range(GRID_SIZE):
-                row.append((grid[y][x] - hmin) / rng)
-            result.append(row)
-        return result
+        self.flow = np.zeros((GRID_SIZE, GRID_SIZE))
+        self.droplets = Droplets(max_steps=self.MAX_DROPLET_STEPS,
+                                 inertia=self.INERTIA, gravity=self.GRAVITY,
+                                 friction=self.FRICTION,
+                                 evaporation=self.EVAPORATION,
+                                 deposit_rate=self.DEPOSIT_RATE,
+                                 min_capacity=self.MIN_CAPACITY)
+        self._shade_terrain()
 
     def _add_ridge(self):
-        mid_y = GRID_SIZE // 2
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                dy = abs(y - mid_y)
-                ridge = 0.25 * math.exp(-(dy * dy) / 18.0)
-                wave = 0.5 + 0.5 * math.sin(x * 0.3)
-                self.height[y][x] = min(1.0, self.height[y][x] + ridge * wave)
+        dy = np.abs(_YS - GRID_SIZE // 2)
+        ridge = 0.25 * np.exp(-(dy * dy) / 18.0)
+        wave = 0.5 + 0.5 * np.sin(_XS * 0.3)
+        self.height = np.minimum(1.0, self.height + ridge * wave)
 
     def _add_coastal(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                slope = x / GRID_SIZE
-                shore = 0.3 + 0.1 * math.sin(y * 0.4)
-                if slope < shore:
-                    self.height[y][x] = 0.05 + self.height[y][x] * 0.1
-                else:
-                    cliff = min(1.0, (slope - shore) * 3.0)
-                    self.height[y][x] = 0.1 + self.height[y][x] * 0.5 * cliff + cliff * 0.3
+        h = self.height
+        slope = _XS / GRID_SIZE
+        shore = 0.3 + 0.1 * np.sin(_YS * 0.4)
+        cliff = np.minimum(1.0, (slope - shore) * 3.0)
+        self.height = np.where(slope < shore, 0.05 + h * 0.1,
+                               0.1 + h * 0.5 * cliff + cliff * 0.3)
 
     def _add_volcano(self):
-        cx, cy = GRID_SIZE // 2, GRID_SIZE // 2
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                dx = x - cx
-                dy = y - cy
-                dist = math.sqrt(dx * dx + dy * dy)
-                cone = max(0, 1.0 - dist / 28.0)
-                crater = 0.0
-                if dist < 5:
-                    crater = 0.15 * (1.0 - dist / 5.0)
-                self.height[y][x] = min(1.0, self.height[y][x] * 0.3 + cone * 0.7 - crater)
+        c = GRID_SIZE // 2
+        dist = np.sqrt((_XS - c) ** 2 + (_YS - c) ** 2)
+        cone = np.maximum(0.0, 1.0 - dist / 28.0)
+        crater = np.where(dist < 5, 0.15 * (1.0 - dist / 5.0), 0.0)
+        self.height = np.minimum(1.0, self.height * 0.3 + cone * 0.7 - crater)
 
     def _add_plateau(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                dx = abs(x - GRID_SIZE // 2) / (GRID_SIZE // 2)
-                dy = abs(y - GRID_SIZE // 2) / (GRID_SIZE // 2)
-                edge = max(dx, dy)
-                if edge < 0.6:
-                    self.height[y][x] = 0.6 + self.height[y][x] * 0.15
-                else:
-                    drop = (edge - 0.6) / 0.4
-                    self.height[y][x] = max(0.1, 0.6 - drop * 0.5 + self.height[y][x] * 0.2)
+        half = GRID_SIZE // 2
+        edge = np.maximum(np.abs(_XS - half), np.abs(_YS - half)) / half
+        drop = (edge - 0.6) / 0.4
+        self.height = np.where(edge < 0.6, 0.6 + self.height * 0.15,
+                               np.maximum(0.1, 0.6 - drop * 0.5 + self.height * 0.2))
 
     def _add_canyon(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.height[y][x] = 0.5 + self.height[y][x] * 0.3
-                cx = GRID_SIZE // 2 + int(8 * math.sin(y * 0.15))
-                dist = abs(x - cx)
-                if dist < 6:
-                    depth = (1.0 - dist / 6.0) * 0.45
-                    self.height[y][x] = max(0.05, self.height[y][x] - depth)
+        h = 0.5 + self.height * 0.3
+        cx = GRID_SIZE // 2 + (8 * np.sin(_YS * 0.15)).astype(int)
+        dist = np.abs(_XS - cx)
+        depth = (1.0 - dist / 6.0) * 0.45
+        self.height = np.where(dist < 6, np.maximum(0.05, h - depth), h)
+
+    def _shade_terrain(self):
+        """Cache the banded terrain colors, lit by hillshade(); redone
+        only when the height changes."""
+        band_rgb = np.array([c for _, c in self.TERRAIN_COLORS], dtype=np.float64)
+        bands = np.full(self.height.shape, len(self.TERRAIN_COLORS) - 1)
+        for i in range(len(self.TERRAIN_COLORS) - 1, -1, -1):
+            bands[self.height >= self.TERRAIN_COLORS[i][0]] = i
+        light = hillshade(self.height, z_scale=SHADE_RELIEF) / _FLAT_SHADE
+        light = np.clip(light, 0.6, 1.3)[:, :, np.newaxis]
+        self.terrain_rgb = np.minimum(band_rgb[bands] * light, 255.0)
 
     # ------------------------------------------------------------------
     # Hydraulic erosion
     # ------------------------------------------------------------------
 
-    def _gradient(self, fx, fy):
-        ix = int(fx)
-        iy = int(fy)
-        ix = max(0, min(ix, GRID_SIZE - 2))
-        iy = max(0, min(iy, GRID_SIZE - 2))
-        u = fx - ix
-        v = fy - iy
-
-        h = self.height
-        h00 = h[iy][ix]
-        h10 = h[iy][ix + 1]
-        h01 = h[iy + 1][ix]
-        h11 = h[iy + 1][ix + 1]
-
-        gx = (h10 - h00) * (1.0 - v) + (h11 - h01) * v
-        gy = (h01 - h00) * (1.0 - u) + (h11 - h10) * u
-
-        height = h00 * (1.0 - u) * (1.0 - v) + h10 * u * (1.0 - v) + \
-                 h01 * (1.0 - u) * v + h11 * u * v
-
-        return gx, gy, height
-
-    def _erode_droplet(self, start_x, start_y):
-        px = float(start_x)
-        py = float(start_y)
-        dx = 0.0
-        dy = 0.0
-        speed = 1.0
-        volume = 1.0
-        sediment = 0.0
-        h = self.height
-        flow = self.flow
-        size = GRID_SIZE
-        inertia = self.INERTIA
-        hardness = ROCK_TYPES[self.rock_idx][0]
-
-        for _ in range(self.MAX_DROPLET_STEPS):
-            ix = int(px)
-            iy = int(py)
-            if ix < 0 or ix >= size or iy < 0 or iy >= size:
-                break
-
-            flow[iy][ix] += 1.0
-
-            gx, gy, old_h = self._gradient(px, py)
-
-            dx = dx * inertia - gx * (1.0 - inertia)
-            dy = dy * inertia - gy * (1.0 - inertia)
-
-            dl = math.sqrt(dx * dx + dy * dy)
-            if dl < 1e-6:
-                angle = random.random() * 2.0 * math.pi
-                dx = math.cos(angle)
-                dy = math.sin(angle)
-            else:
-                dx /= dl
-                dy /= dl
-
-            new_px = px + dx
-            new_py = py + dy
-
-            if new_px < 0 or new_px >= size - 1 or new_py < 0 or new_py >= size - 1:
-                break
-
-            _, _, new_h = self._gradient(new_px, new_py)
-            height_diff = new_h - old_h
-
-            slope = max(-height_diff, 0.0)
-            capacity = max(slope * speed * volume, self.MIN_CAPACITY)
-
-            if sediment < capacity:
-                amount = min((capacity - sediment) * (1.0 - hardness),
-                             -height_diff if height_diff < 0 else capacity * 0.1)
-                amount = max(0.0, amount)
-                cix = max(0, min(ix, size - 1))
-                ciy = max(0, min(iy, size - 1))
-                h[ciy][cix] = max(0.0, h[ciy][cix] - amount)
-                sediment += amount
-            else:
-                amount = self.DEPOSIT_RATE * (sediment - capacity)
-                cix = max(0, min(ix, size - 1))
-                ciy = max(0, min(iy, size - 1))
-                h[ciy][cix] = min(1.0, h[ciy][cix] + amount)
-                sediment -= amount
-
-            speed = math.sqrt(max(0.0, speed * speed + height_diff * self.GRAVITY))
-            speed *= (1.0 - self.FRICTION)
-            speed = max(speed, 0.1)
-
-            volume -= self.EVAPORATION
-            if volume < 0.01:
-                cix = int(new_px)
-                ciy = int(new_py)
-                if 0 <= cix < size and 0 <= ciy < size:
-                    h[ciy][cix] = min(1.0, h[ciy][cix] + sediment)
-                break
-
-            px = new_px
-            py = new_py
-
     def _run_erosion(self, count):
-        size = GRID_SIZE
-        for _ in range(count):
-            x = random.random() * (size - 1)
-            y = random.random() * (size - 1)
-            self._erode_droplet(x, y)
+        """Rain `count` new droplets and advance every droplet in flight
+        DROPLET_STEPS_PER_TICK steps."""
+        self.droplets.add(np.random.random_sample(count) * (GRID_SIZE - 1),
+                          np.random.random_sample(count) * (GRID_SIZE - 1))
+        self.droplets.step(self.height, ROCK_TYPES[self.rock_idx][0],
+                           steps=self.DROPLET_STEPS_PER_TICK, flow=self.flow)
+        self._shade_terrain()
 
     def _check_flatness(self):
-        total = 0.0
-        total_sq = 0.0
-        n = GRID_SIZE * GRID_SIZE
-        h = self.height
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                v = h[y][x]
-                total += v
-                total_sq += v * v
-        mean = total / n
-        var = total_sq / n - mean * mean
-        std = math.sqrt(max(0.0, var))
-        if std < 0.05:
+        if self.height.std() < 0.05:
             self.terrain_preset = (self.terrain_preset + 1) % len(TERRAIN_PRESETS)
             self._generate_terrain()
             self.overlay_text = TERRAIN_PRESETS[self.terrain_preset]
@@ -411,11 +255,7 @@ class Erosion(Visual):
             self.update_timer -= self.update_interval
             rainfall = RAIN_LEVELS[self.rain_idx][0]
             self._run_erosion(rainfall)
-
-            for y in range(GRID_SIZE):
-                row = self.flow[y]
-                for x in range(GRID_SIZE):
-                    row[x] *= 0.95
+            self.flow *= 0.95
 
         # Rain particles
         for rp in self.rain_particles:
@@ -430,34 +270,14 @@ class Erosion(Visual):
             self.flat_check_timer = 0.0
             self._check_flatness()
 
-    def _terrain_color(self, h):
-        for threshold, color in self.TERRAIN_COLORS:
-            if h >= threshold:
-                return color
-        return self.TERRAIN_COLORS[-1][1]
-
     def draw(self):
         set_pixel = self.display.set_pixel
-        h = self.height
-        flow = self.flow
-        wc = self.WATER_COLOR
-
-        for y in range(GRID_SIZE):
-            h_row = h[y]
-            f_row = flow[y]
-            for x in range(GRID_SIZE):
-                hv = h_row[x]
-                tr, tg, tb = self._terrain_color(hv)
-
-                fv = f_row[x]
-                if fv > 0.5:
-                    blend = min(fv / 20.0, 0.8)
-                    r = int(tr * (1.0 - blend) + wc[0] * blend)
-                    g = int(tg * (1.0 - blend) + wc[1] * blend)
-                    b = int(tb * (1.0 - blend) + wc[2] * blend)
-                    set_pixel(x, y, (r, g, b))
-                else:
-                    set_pixel(x, y, (tr, tg, tb))
+        rgb = self.terrain_rgb
+        blend = np.minimum(self.flow / 20.0, 0.8)
+        blend[self.flow <= 0.5] = 0.0
+        blend = blend[:, :, np.newaxis]
+        rgb = rgb * (1.0 - blend) + np.array(self.WATER_COLOR) * blend
+        blit_rgb(self.display, rgb.astype(np.uint8))
 
         # Rain particles
         for rp in self.rain_particles:
@@ -14,67 +14,13 @@ Controls:
 
 import random
 import math
-from . import Visual, Display, Colors, GRID_SIZE
-
-
-# --- Spatial hashing for fast neighbor lookups ---
-
-class SpatialGrid:
-    """Partitions the grid into cells for O(1) neighbor queries."""
-
-    def __init__(self, cell_size):
-        self.cell_size = cell_size
-        self.cols = math.ceil(GRID_SIZE / cell_size)
-        self.rows = math.ceil(GRID_SIZE / cell_size)
-        self.cells = {}
-
-    def clear(self):
-        self.cells.clear()
-
-    def _key(self, x, y):
-        return (int(x // self.cell_size), int(y // self.cell_size))
-
-    def insert(self, firefly):
-        key = self._key(firefly.x, firefly.y)
-        if key not in self.cells:
-            self.cells[key] = []
-        self.cells[key].append(firefly)
-
-    def query(self, x, y, radius):
-        """Return all fireflies within radius of (x, y)."""
-        results = []
-        r_cells = int(math.ceil(radius / self.cell_size))
-        cx, cy = int(x // self.cell_size), int(y // self.cell_size)
-
-        for dy in range(-r_cells, r_cells + 1):
-            for dx in range(-r_cells, r_cells + 1):
-                key = (cx + dx, cy + dy)
-                bucket = self.cells.get(key)
-                if bucket:
-                    for f in bucket:
-                        ddx = f.x - x
-                        ddy = f.y - y
-                        if ddx * ddx + ddy * ddy <= radius * radius:
-                            results.append(f)
-        return results
-
 
-# --- Individual firefly ---
+import numpy as np
 
-class Firefly:
-    """A single firefly oscillator with position, phase, and frequency."""
-
-    __slots__ = ('x', 'y', 'phase', 'natural_freq', 'brightness',
-                 'flash_age', 'nudge_accum')
-
-    def __init__(self, x, y, phase, natural_freq):
-        self.x = x
-        self.y = y
-        self.phase = phase
-        self.natural_freq = natural_freq
-        self.brightness = 0.0      # cached brightness for drawing
-        self.flash_age = 1.0       # time since last flash (starts old)
-        self.nudge_accum = 0.0     # accumulated phase nudge this frame
+from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, blit_rgb
+from .particles import ParticleStore
+from .spatial import CellList
 
 
 # --- Main visual ---
@@ -140,11 +86,10 @@ class Fireflies(Visual):
         # Color palette
         self.palette_index = 0
 
-        # Spatial acceleration structure
-        self.spatial = SpatialGrid(self.SPATIAL_CELL_SIZE)
-
-        # Create firefly population
-        self.fireflies = []
+        # Firefly population: fixed positions plus oscillator state
+        self.fireflies = ParticleStore(
+            self.NUM_FIREFLIES,
+            extra=('phase', 'natural_freq', 'brightness', 'flash_age'))
         self._populate()
 
         # Pre-compute background nighttime canvas
@@ -152,27 +97,35 @@ class Fireflies(Visual):
 
     def _populate(self):
         """Scatter fireflies across the grid with random initial phases."""
-        self.fireflies.clear()
-
         # Use a Poisson-disk-ish scatter: random but avoiding exact overlap
         occupied = set()
         attempts = 0
         max_attempts = self.NUM_FIREFLIES * 6
 
-        while len(self.fireflies) < self.NUM_FIREFLIES and attempts < max_attempts:
+        while len(occupied) < self.NUM_FIREFLIES and attempts < max_attempts:
             x = random.randint(0, GRID_SIZE - 1)
             y = random.randint(0, GRID_SIZE - 1)
-            key = (x, y)
             attempts += 1
-            if key in occupied:
-                continue
-            occupied.add(key)
+            occupied.add((x, y))
+
+        n = len(occupied)
+        xs, ys = np.array(sorted(occupied), dtype=float).reshape(-1, 2).T
+        flies = self.fireflies
+        flies.clear()
+        flies.spawn(
+            n, x=xs, y=ys,
+            phase=np.random.uniform(0.0, self.TWO_PI, n),
+            natural_freq=self.BASE_FREQUENCY + np.random.uniform(
+                -self.FREQ_SPREAD, self.FREQ_SPREAD, n),
+            flash_age=1.0,     # time since last flash (starts old)
+        )
 
-            phase = random.uniform(0.0, self.TWO_PI)
-            freq = self.BASE_FREQUENCY + random.uniform(
-                -self.FREQ_SPREAD, self.FREQ_SPREAD
-            )
-            self.fireflies.append(Firefly(x, y, phase, freq))
+        # Fireflies never move, so who-sees-whom is worked out once here:
+        # every (flasher, neighbor) pair within the coupling radius
+        # (inclusive, as integer positions often sit exactly on it).
+        cells = CellList(self.SPATIAL_CELL_SIZE, wrap=False)
+        i, j, _dx, _dy, _d2 = cells.rebuild(xs, ys).pairs(self.coupling_radius + 1e-6)
+        self.links = (i, j)
 
     def _build_background(self):
         """Pre-compute a subtle nighttime background texture."""
@@ -187,6 +140,7 @@ class Fireflies(Visual):
                 b = random.randint(0, max(1, bg_tint[2]))
                 self.bg[y][x] = (r, g, b)
         random.seed()  # restore true randomness
+        self.bg = np.array(self.bg, dtype=np.uint8)
 
     # ------------------------------------------------------------------
     # Input
@@ -198,9 +152,9 @@ class Fireflies(Visual):
 
         # Space: randomize all phases (restart synchronization from chaos)
         if (input_state.action_l or input_state.action_r):
-            for f in self.fireflies:
-                f.phase = random.uniform(0.0, self.TWO_PI)
-                f.flash_age = 1.0
+            flies = self.fireflies
+            flies.phase = np.random.uniform(0.0, self.TWO_PI, len(flies))
+            flies.flash_age = 1.0
             consumed = True
 
         # Up/Down: cycle color palette
@@ -232,56 +186,36 @@ class Fireflies(Visual):
         self.time += dt
         scaled_dt = dt * self.speed
 
-        # Rebuild spatial hash each frame
-        self.spatial.clear()
-        for f in self.fireflies:
-            self.spatial.insert(f)
-
+        flies = self.fireflies
         coupling = self.coupling_strength
-        radius = self.coupling_radius
         two_pi = self.TWO_PI
 
         # --- Phase 1: Advance phases and detect flashes ---
-        flashers = []
-        for f in self.fireflies:
-            f.nudge_accum = 0.0
-            f.phase += f.natural_freq * scaled_dt
-            f.flash_age += scaled_dt
-
-            # Check for flash (phase crosses 2pi)
-            if f.phase >= two_pi:
-                f.phase -= two_pi
-                f.flash_age = 0.0
-                flashers.append(f)
+        flies.phase += flies.natural_freq * scaled_dt
+        flies.flash_age += scaled_dt
+
+        # Check for flash (phase crosses 2pi)
+        flashing = flies.phase >= two_pi
+        flies.phase[flashing] -= two_pi
+        flies.flash_age[flashing] = 0.0
 
         # --- Phase 2: Coupling — flashers nudge neighbors ---
-        if coupling > 0.0:
-            sin = math.sin
-            for flasher in flashers:
-                neighbors = self.spatial.query(
-                    flasher.x, flasher.y, radius
-                )
-                fp = flasher.phase
-                for nb in neighbors:
-                    if nb is not flasher:
-                        # Kuramoto coupling: nudge toward flasher's phase
-                        nb.nudge_accum += coupling * sin(fp - nb.phase)
-
-            # Apply accumulated nudges
-            for f in self.fireflies:
-                if f.nudge_accum != 0.0:
-                    f.phase += f.nudge_accum
-                    # Keep phase in [0, 2pi)
-                    if f.phase < 0.0:
-                        f.phase += two_pi
-                    elif f.phase >= two_pi:
-                        f.phase -= two_pi
+        if coupling > 0.0 and flashing.any():
+            i, j = self.links
+            active = flashing[i]
+            i, j = i[active], j[active]
+            phase = flies.phase
+            # Kuramoto coupling: nudge toward flasher's phase
+            nudge = np.bincount(j, weights=coupling * np.sin(phase[i] - phase[j]),
+                                minlength=len(flies))
+            phase += nudge
+            # Keep phase in [0, 2pi)
+            phase[phase < 0.0] += two_pi
+            phase[phase >= two_pi] -= two_pi
 
         # --- Phase 3: Compute brightness for drawing ---
-        cos = math.cos
-        for f in self.fireflies:
-            # Smooth brightness: peaks at phase=0 (flash moment)
-            f.brightness = (1.0 + cos(f.phase)) * 0.5
+        # Smooth brightness: peaks at phase=0 (flash moment)
+        flies.brightness = (1.0 + np.cos(flies.phase)) * 0.5
 
     # ------------------------------------------------------------------
     # Draw
@@ -294,61 +228,37 @@ class Fireflies(Visual):
 
         # Paint nighttime background
         bg = self.bg
-        for y in range(GRID_SIZE):
-            row = bg[y]
-            for x in range(GRID_SIZE):
-                display.set_pixel(x, y, row[x])
-
-        # Draw each firefly
-        br, bg_r, bb = bright_color
-        dr, dg, db = dim_color
-        # Precompute delta for interpolation
-        delta_r = br - dr
-        delta_g = bg_r - dg
-        delta_b = bb - db
-
-        for f in self.fireflies:
-            b = f.brightness
-
-            if b < 0.01:
-                continue
-
-            # Nonlinear ramp so the flash pops
-            b2 = b * b
-
-            r = int(dr + delta_r * b2)
-            g = int(dg + delta_g * b2)
-            bl = int(db + delta_b * b2)
-
-            display.set_pixel(f.x, f.y, (r, g, bl))
-
-            # Glow halo for bright fireflies
-            if b2 > 0.25:
-                glow = b2 * 0.35
-                gr = int(dr * glow)
-                gg = int(dg * glow) if dg > 0 else int(delta_g * glow * 0.15)
-                gb = int(db * glow) if db > 0 else int(delta_b * glow * 0.1)
-                halo_color = (max(1, gr), max(1, gg), max(1, gb))
-
-                fx, fy = f.x, f.y
-                if fx > 0:
-                    display.set_pixel(fx - 1, fy, self._add_color(
-                        bg[fy][fx - 1], halo_color))
-                if fx < GRID_SIZE - 1:
-                    display.set_pixel(fx + 1, fy, self._add_color(
-                        bg[fy][fx + 1], halo_color))
-                if fy > 0:
-                    display.set_pixel(fx, fy - 1, self._add_color(
-                        bg[fy - 1][fx], halo_color))
-                if fy < GRID_SIZE - 1:
-                    display.set_pixel(fx, fy + 1, self._add_color(
-                        bg[fy + 1][fx], halo_color))
-
-    @staticmethod
-    def _add_color(base, add):
-        """Additive blend two RGB tuples, clamped to 255."""
-        return (
-            min(255, base[0] + add[0]),
-            min(255, base[1] + add[1]),
-            min(255, base[2] + add[2]),
-        )
+        blit_rgb(display, bg)
+
+        flies = self.fireflies
+        b = flies.brightness
+        lit = b >= 0.01
+        if not lit.any():
+            return
+        fx = flies.x[lit].astype(int)
+        fy = flies.y[lit].astype(int)
+
+        # Nonlinear ramp so the flash pops
+        b2 = b[lit] ** 2
+        dim = np.array(dim_color, dtype=float)
+        delta = np.array(bright_color, dtype=float) - dim
+        color = (dim + delta * b2[:, None]).astype(int)
+
+        # Glow halo for bright fireflies: the dim color (or a sliver of
+        # the flash color on channels where dim is 0), added onto the
+        # background at the four neighbors
+        glow = (b2 * 0.35)[:, None]
+        fallback = delta * np.array([0.0, 0.15, 0.1])
+        halo = np.where(dim > 0, dim, fallback) * glow
+        halo = np.maximum(1, halo.astype(int))
+
+        # Each firefly followed by its halo, so overlaps layer as if
+        # drawn one by one
+        xs = fx[:, None] + [0, -1, 1, 0, 0]
+        ys = fy[:, None] + [0, 0, 0, -1, 1]
+        under = bg[np.clip(ys, 0, GRID_SIZE - 1), np.clip(xs, 0, GRID_SIZE - 1)]
+        rgb = np.minimum(255, under + halo[:, None, :])
+        rgb[:, 0] = color
+        show = np.ones(xs.shape, dtype=bool)
+        show[:, 1:] = (b2 > 0.25)[:, None]
+        blit_points(display, xs[show], ys[show], rgb[show])
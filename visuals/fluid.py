@@ -2,9 +2,14 @@
 Fluid - Stable Fluids Solver (numpy-accelerated)
 ==============================
 Jos Stam's "Stable Fluids" on a 64x64 grid: semi-Lagrangian
-advection with Gauss-Seidel pressure projection.
+advection with iterative pressure projection.
 
-Five standalone visuals share the solver:
+FluidSolver keeps every field and work buffer as preallocated float32
+arrays and steps them in place; the relaxation sweeps are warm-started
+and exit early once converged. Draw helpers map fields through 256-entry
+palette LUTs and blit whole frames (framebuffer.blit_rgb).
+
+Five standalone visuals share the solver (convection.py uses it too):
   Wind Tunnel  - Flow past obstacle, vortex shedding
   Ink Drops    - Colored density injected at random points
   Color Mix    - Two colored fluids stirred together
@@ -21,6 +26,7 @@ import math
 import random
 import numpy as np
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, blit_rgb
 
 N = GRID_SIZE
 S = N + 2  # Padded grid side length
@@ -41,6 +47,8 @@ PALETTES = [
 # Precompute palette arrays for fast LUT drawing
 _PAL_ARRAYS = [np.array(p, dtype=np.float64) for p in PALETTES]
 
+_OBSTACLE_COLOR = np.array((60, 60, 70), dtype=np.uint8)
+
 # Precompute interior coordinate meshgrid (reused by advect / stirring)
 _I_COORDS = np.arange(1, N + 1, dtype=np.float64)
 _J_COORDS = np.arange(1, N + 1, dtype=np.float64)
@@ -48,10 +56,10 @@ _II, _JJ = np.meshgrid(_I_COORDS, _J_COORDS, indexing='ij')
 
 
 def _new_field():
-    return np.zeros((S, S), dtype=np.float64)
+    return np.zeros((S, S), dtype=np.float32)
 
 
-# ── Shared Stam solver (numpy) ──────────────────────────────────
+# ── Shared Stam solver (numpy, float32, in place) ────────────────
 
 def _set_bnd(b, x):
     """Set boundary conditions. b=1 for x-vel, b=2 for y-vel, b=0 for scalar."""
@@ -75,99 +83,200 @@ def _set_bnd(b, x):
     x[N+1, N+1] = 0.5 * (x[N, N+1] + x[N+1, N])
 
 
-def _diffuse(b, x, x0, diff, dt, iters=4):
-    a = dt * diff * N * N
-    if a < 0.00001:
+class FluidSolver:
+    """Stable Fluids state for one N x N tank, float32 throughout.
+
+    Owns the velocity field (u, v), its scratch pair (u_prev, v_prev) and
+    every work buffer a step needs, so stepping allocates nothing and all
+    updates happen in place. Diffusion and pressure are relaxed with
+    Jacobi sweeps warm-started from the previous solution (last frame's
+    pressure, the undiffused field), which stop early once a sweep moves
+    no cell by more than `tol` of the field's peak. Warm-starting lets the
+    slow, large-scale pressure modes keep converging across frames instead
+    of being rebuilt from zero every projection.
+    """
+
+    def __init__(self, pressure_iters=14, diffuse_iters=4, tol=1e-2):
+        self.pressure_iters = pressure_iters
+        self.diffuse_iters = diffuse_iters
+        self.tol = tol
+        self.u = _new_field()
+        self.v = _new_field()
+        self.u_prev = _new_field()
+        self.v_prev = _new_field()
+        # One pressure field per projection in a step; each is the next
+        # step's starting guess for the same projection
+        self._p = (_new_field(), _new_field())
+        self._div = _new_field()
+        self._next = np.empty((N, N), dtype=np.float32)
+        self._delta = np.empty((N, N), dtype=np.float32)
+        # Advection buffers
+        self._ii = _II.astype(np.float32)
+        self._jj = _JJ.astype(np.float32)
+        self._x = np.empty((N, N), dtype=np.float32)
+        self._y = np.empty((N, N), dtype=np.float32)
+        self._i0 = np.empty((N, N), dtype=np.intp)
+        self._j0 = np.empty((N, N), dtype=np.intp)
+        self._idx = np.empty((N, N), dtype=np.intp)
+        self._corners = [np.empty((N, N), dtype=np.float32) for _ in range(4)]
+        self.pressure_sweeps = 0   # sweeps used by the last projection
+
+    @staticmethod
+    def field():
+        """A zeroed field shaped and typed like the solver's own."""
+        return _new_field()
+
+    def _relax(self, b, x, x0, a, inv, iters):
+        """Jacobi sweeps on x = (x0 + a * (sum of 4 neighbors)) * inv.
+        Returns the number of sweeps taken."""
+        nxt, delta = self._next, self._delta
+        inner = x[1:N+1, 1:N+1]
+        src = x0[1:N+1, 1:N+1]
+        limit = self.tol
+        for sweep in range(1, iters + 1):
+            np.add(x[0:N, 1:N+1], x[2:N+2, 1:N+1], out=nxt)
+            nxt += x[1:N+1, 0:N]
+            nxt += x[1:N+1, 2:N+2]
+            nxt *= a
+            nxt += src
+            nxt *= inv
+            np.subtract(nxt, inner, out=delta)
+            change = np.abs(delta, out=delta).max()
+            inner[...] = nxt
+            _set_bnd(b, x)
+            if change <= limit * np.abs(nxt, out=nxt).max():
+                return sweep
+        return iters
+
+    def diffuse(self, b, x, x0, diff, dt):
+        a = dt * diff * N * N
         x[:] = x0
-        return
-    inv = 1.0 / (1 + 4 * a)
-    for _ in range(iters):
-        x[1:N+1, 1:N+1] = (x0[1:N+1, 1:N+1] + a * (
-            x[0:N, 1:N+1] + x[2:N+2, 1:N+1] +
-            x[1:N+1, 0:N] + x[1:N+1, 2:N+2]
-        )) * inv
-        _set_bnd(b, x)
-
-
-def _advect(b, d, d0, u, v, dt):
-    dt0 = dt * N
-    # Backtrack positions
-    x = _II - dt0 * u[1:N+1, 1:N+1]
-    y = _JJ - dt0 * v[1:N+1, 1:N+1]
-    np.clip(x, 0.5, N + 0.5, out=x)
-    np.clip(y, 0.5, N + 0.5, out=y)
-
-    i0 = x.astype(np.intp)
-    j0 = y.astype(np.intp)
-    s1 = x - i0
-    s0 = 1.0 - s1
-    t1 = y - j0
-    t0 = 1.0 - t1
-
-    d[1:N+1, 1:N+1] = (
-        s0 * (t0 * d0[i0, j0] + t1 * d0[i0, j0 + 1]) +
-        s1 * (t0 * d0[i0 + 1, j0] + t1 * d0[i0 + 1, j0 + 1]))
-    _set_bnd(b, d)
-
-
-def _project(u, v, p, div, iters=14):
-    h = 1.0 / N
-    div[1:N+1, 1:N+1] = -0.5 * h * (
-        u[2:N+2, 1:N+1] - u[0:N, 1:N+1] +
-        v[1:N+1, 2:N+2] - v[1:N+1, 0:N])
-    p[1:N+1, 1:N+1] = 0.0
-    _set_bnd(0, div)
-    _set_bnd(0, p)
-
-    for _ in range(iters):
-        p[1:N+1, 1:N+1] = (
-            div[1:N+1, 1:N+1] +
-            p[0:N, 1:N+1] + p[2:N+2, 1:N+1] +
-            p[1:N+1, 0:N] + p[1:N+1, 2:N+2]) * 0.25
+        if a < 0.00001:
+            return
+        self._relax(b, x, x0, a, 1.0 / (1 + 4 * a), self.diffuse_iters)
+
+    def advect(self, b, d, d0, u, v, dt):
+        """Semi-Lagrangian advection of d0 into d (d0 must be a whole,
+        contiguous field)."""
+        dt0 = dt * N
+        x, y, i0, j0, idx = self._x, self._y, self._i0, self._j0, self._idx
+        # Backtrack positions
+        np.multiply(u[1:N+1, 1:N+1], -dt0, out=x)
+        x += self._ii
+        np.multiply(v[1:N+1, 1:N+1], -dt0, out=y)
+        y += self._jj
+        np.clip(x, 0.5, N + 0.5, out=x)
+        np.clip(y, 0.5, N + 0.5, out=y)
+
+        # Integer cell and fractional offset within it
+        np.copyto(i0, x, casting='unsafe')
+        np.copyto(j0, y, casting='unsafe')
+        np.subtract(x, i0, out=x, casting='unsafe')
+        np.subtract(y, j0, out=y, casting='unsafe')
+
+        # Gather the four corners by flat index, then blend bilinearly
+        np.multiply(i0, S, out=idx)
+        idx += j0
+        flat = d0.ravel()
+        c00, c01, c10, c11 = self._corners
+        np.take(flat, idx, out=c00, mode='clip')
+        np.take(flat[1:], idx, out=c01, mode='clip')
+        np.take(flat[S:], idx, out=c10, mode='clip')
+        np.take(flat[S + 1:], idx, out=c11, mode='clip')
+        c01 -= c00
+        c01 *= y
+        c00 += c01
+        c11 -= c10
+        c11 *= y
+        c10 += c11
+        c10 -= c00
+        c10 *= x
+        c00 += c10
+        d[1:N+1, 1:N+1] = c00
+        _set_bnd(b, d)
+
+    def project(self, u, v, p):
+        """Subtract the pressure gradient so (u, v) is divergence-free."""
+        div = self._div
+        inner = div[1:N+1, 1:N+1]
+        np.subtract(u[2:N+2, 1:N+1], u[0:N, 1:N+1], out=inner)
+        inner += v[1:N+1, 2:N+2]
+        inner -= v[1:N+1, 0:N]
+        inner *= -0.5 / N
+        _set_bnd(0, div)
         _set_bnd(0, p)
 
-    u[1:N+1, 1:N+1] -= 0.5 * (p[2:N+2, 1:N+1] - p[0:N, 1:N+1]) * N
-    v[1:N+1, 1:N+1] -= 0.5 * (p[1:N+1, 2:N+2] - p[1:N+1, 0:N]) * N
-    _set_bnd(1, u)
-    _set_bnd(2, v)
+        self.pressure_sweeps = self._relax(0, p, div, 1.0, 0.25,
+                                           self.pressure_iters)
+
+        grad = self._corners[0]
+        np.subtract(p[2:N+2, 1:N+1], p[0:N, 1:N+1], out=grad)
+        grad *= 0.5 * N
+        u[1:N+1, 1:N+1] -= grad
+        np.subtract(p[1:N+1, 2:N+2], p[1:N+1, 0:N], out=grad)
+        grad *= 0.5 * N
+        v[1:N+1, 1:N+1] -= grad
+        _set_bnd(1, u)
+        _set_bnd(2, v)
+
+    def velocity_step(self, viscosity, dt):
+        """Full velocity step: diffuse, project, advect, project."""
+        u, v, u0, v0 = self.u, self.v, self.u_prev, self.v_prev
+        self.diffuse(1, u0, u, viscosity, dt)
+        self.diffuse(2, v0, v, viscosity, dt)
+        self.project(u0, v0, self._p[0])
+        self.advect(1, u, u0, u0, v0, dt)
+        self.advect(2, v, v0, u0, v0, dt)
+        self.project(u, v, self._p[1])
+
+    def density_step(self, d, d0, diffusion, dt):
+        """Full density step: diffuse, advect (d0 is scratch)."""
+        self.diffuse(0, d0, d, diffusion, dt)
+        self.advect(0, d, d0, self.u, self.v, dt)
 
 
-def _velocity_step(u, v, u0, v0, viscosity, dt, iters=14):
-    """Full velocity step: diffuse, project, advect, project."""
-    _diffuse(1, u0, u, viscosity, dt)
-    _diffuse(2, v0, v, viscosity, dt)
-    _project(u0, v0, u, v, iters)
-    _advect(1, u, u0, u0, v0, dt)
-    _advect(2, v, v0, u0, v0, dt)
-    _project(u, v, u0, v0, iters)
+# ── Drawing ───────────────────────────────────────────────────────
 
+_LUT_SIZE = 256
+_LUTS = {}
 
-def _density_step(d, d0, u, v, diffusion, dt):
-    """Full density step: diffuse, advect."""
-    _diffuse(0, d0, d, diffusion, dt)
-    _advect(0, d, d0, u, v, dt)
+
+def _ramp_lut(pal):
+    """Palette ramp resampled to a _LUT_SIZE-entry uint8 table, so mapping
+    a 0..1 field to color is one gather. Cached per palette array."""
+    lut = _LUTS.get(id(pal))
+    if lut is None:
+        idx_f = np.linspace(0.0, len(pal) - 1, _LUT_SIZE)
+        lo = idx_f.astype(np.intp)
+        hi = np.minimum(lo + 1, len(pal) - 1)
+        frac = (idx_f - lo)[:, np.newaxis]
+        lut = np.clip(pal[lo] + (pal[hi] - pal[lo]) * frac, 0, 255).astype(np.uint8)
+        _LUTS[id(pal)] = lut
+    return lut
+
+
+def _ramp_index(t):
+    """0..1 field -> LUT indices."""
+    return (t * (_LUT_SIZE - 1) + 0.5).astype(np.intp)
+
+
+def _blit(display, pixels):
+    """Fields are indexed [i, j] = [x, y]; the framebuffer is [y, x]."""
+    blit_rgb(display, pixels.transpose(1, 0, 2))
 
 
 def _draw_density(display, dens, palette_idx, scale=0.3, sqrt_map=False):
     """Map density field to palette and draw."""
-    pal_arr = _PAL_ARRAYS[palette_idx]
-    n_colors = len(pal_arr)
-
     t = np.clip(dens[1:N+1, 1:N+1] * scale, 0.0, 1.0)
     if sqrt_map:
         np.sqrt(t, out=t)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    colors = pal_arr[lo] + (pal_arr[hi] - pal_arr[lo]) * frac
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
+    _blit(display, _ramp_lut(_PAL_ARRAYS[palette_idx])[_ramp_index(t)])
 
-    for i in range(N):
-        col = pixels[i]
-        for j in range(N):
-            p = col[j]
-            display.set_pixel(i, j, (int(p[0]), int(p[1]), int(p[2])))
+
+def _draw_obstacle(display, obstacle):
+    obs_ij = np.argwhere(obstacle[1:N+1, 1:N+1])
+    blit_points(display, obs_ij[:, 0], obs_ij[:, 1],
+                np.broadcast_to(_OBSTACLE_COLOR, (len(obs_ij), 3)))
 
 
 # ── Velocity / Vorticity visualization helpers ────────────────────
@@ -233,21 +342,11 @@ _VORT_PALETTE = VORT_PALETTES['FIRE-ICE']  # default for legacy callers
 def _draw_velocity(display, u, v, palette=None, scale=0.3):
     """Map velocity magnitude to palette and draw."""
     pal = palette if palette is not None else _VEL_PALETTE
-    mag = np.sqrt(u[1:N+1, 1:N+1]**2 + v[1:N+1, 1:N+1]**2)
-    t = np.clip(mag * scale, 0.0, 1.0)
+    t = np.hypot(u[1:N+1, 1:N+1], v[1:N+1, 1:N+1])
+    t *= scale
+    np.clip(t, 0.0, 1.0, out=t)
     np.sqrt(t, out=t)
-    n_colors = len(pal)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    colors = pal[lo] + (pal[hi] - pal[lo]) * frac
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
-    for i in range(N):
-        col = pixels[i]
-        for j in range(N):
-            p = col[j]
-            display.set_pixel(i, j, (int(p[0]), int(p[1]), int(p[2])))
+    _blit(display, _ramp_lut(pal)[_ramp_index(t)])
 
 
 def _draw_velocity_direction(display, u, v, palette=None, scale=0.4):
@@ -255,50 +354,32 @@ def _draw_velocity_direction(display, u, v, palette=None, scale=0.4):
     pal = palette if palette is not None else DIR_PALETTES['RAINBOW']
     uu = u[1:N+1, 1:N+1]
     vv = v[1:N+1, 1:N+1]
-    mag = np.sqrt(uu**2 + vv**2)
-    brightness = np.clip(mag * scale, 0.0, 1.0)
+    brightness = np.hypot(uu, vv)
+    brightness *= scale
+    np.clip(brightness, 0.0, 1.0, out=brightness)
     np.sqrt(brightness, out=brightness)
 
     # Angle → 0..1 mapped to hue wheel
     angle = np.arctan2(vv, uu)  # -pi..pi
     t = (angle / (2 * np.pi) + 0.5) % 1.0  # 0..1
-    n_colors = len(pal)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    hue_colors = pal[lo] + (pal[hi] - pal[lo]) * frac
+    hue_colors = _ramp_lut(pal)[_ramp_index(t)]
 
     colors = hue_colors * brightness[:, :, np.newaxis]
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
-    for i in range(N):
-        col = pixels[i]
-        for j in range(N):
-            p = col[j]
-            display.set_pixel(i, j, (int(p[0]), int(p[1]), int(p[2])))
+    _blit(display, colors.astype(np.uint8))
 
 
 def _draw_vorticity(display, u, v, palette=None, scale=0.5):
     """Map vorticity (curl) to diverging palette and draw."""
     pal = palette if palette is not None else _VORT_PALETTE
     # curl = dv/dx - du/dy (central differences on interior)
-    dvdx = (v[2:N+2, 1:N+1] - v[0:N, 1:N+1]) * 0.5
-    dudy = (u[1:N+1, 2:N+2] - u[1:N+1, 0:N]) * 0.5
-    curl = dvdx - dudy
+    curl = v[2:N+2, 1:N+1] - v[0:N, 1:N+1]
+    curl -= u[1:N+1, 2:N+2]
+    curl += u[1:N+1, 0:N]
     # Map to 0..1 with 0.5 = zero curl
-    t = np.clip(curl * scale + 0.5, 0.0, 1.0)
-    n_colors = len(pal)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    colors = pal[lo] + (pal[hi] - pal[lo]) * frac
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
-    for i in range(N):
-        col = pixels[i]
-        for j in range(N):
-            p = col[j]
-            display.set_pixel(i, j, (int(p[0]), int(p[1]), int(p[2])))
+    curl *= 0.5 * scale
+    curl += 0.5
+    np.clip(curl, 0.0, 1.0, out=curl)
+    _blit(display, _ramp_lut(pal)[_ramp_index(curl)])
 
 
 # ── Obstacle shapes ───────────────────────────────────────────────
@@ -394,10 +475,9 @@ class FluidTunnel(Visual):
         self._init_fields()
 
     def _init_fields(self):
-        self.u = _new_field()
-        self.v = _new_field()
-        self.u_prev = _new_field()
-        self.v_prev = _new_field()
+        self.solver = FluidSolver()
+        self.u = self.solver.u
+        self.v = self.solver.v
         self.dens = _new_field()
         self.dens_prev = _new_field()
         self.obstacle = _make_obstacle(self.shape_idx)
@@ -470,15 +550,9 @@ class FluidTunnel(Visual):
         if self.overlay_timer > 0:
             self.overlay_timer = max(0.0, self.overlay_timer - dt)
 
-        self.u_prev[:] = 0.0
-        self.v_prev[:] = 0.0
-        self.dens_prev[:] = 0.0
-
         self._add_forces()
-        _velocity_step(self.u, self.v, self.u_prev, self.v_prev,
-                       self.viscosity, sim_dt)
-        _density_step(self.dens, self.dens_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
+        self.solver.velocity_step(self.viscosity, sim_dt)
+        self.solver.density_step(self.dens, self.dens_prev, self.diffusion, sim_dt)
         self._apply_obstacle()
 
         self.dens *= 0.995
@@ -491,10 +565,7 @@ class FluidTunnel(Visual):
             _draw_velocity(self.display, self.u, self.v)
         else:
             _draw_vorticity(self.display, self.u, self.v)
-        # Draw obstacle pixels
-        obs_ij = np.argwhere(self.obstacle[1:N+1, 1:N+1])
-        for k in range(len(obs_ij)):
-            self.display.set_pixel(int(obs_ij[k, 0]), int(obs_ij[k, 1]), (60, 60, 70))
+        _draw_obstacle(self.display, self.obstacle)
         # Transient parameter overlay
         if self.overlay_timer > 0 and self.overlay_text:
             alpha = min(1.0, self.overlay_timer / 0.5)
@@ -525,10 +596,9 @@ class FluidInk(Visual):
         self._init_fields()
 
     def _init_fields(self):
-        self.u = _new_field()
-        self.v = _new_field()
-        self.u_prev = _new_field()
-        self.v_prev = _new_field()
+        self.solver = FluidSolver()
+        self.u = self.solver.u
+        self.v = self.solver.v
         self.dens = _new_field()
         self.dens_prev = _new_field()
 
@@ -575,15 +645,9 @@ class FluidInk(Visual):
         self.time += dt
         sim_dt = 0.1
 
-        self.u_prev[:] = 0.0
-        self.v_prev[:] = 0.0
-        self.dens_prev[:] = 0.0
-
         self._add_forces()
-        _velocity_step(self.u, self.v, self.u_prev, self.v_prev,
-                       self.viscosity, sim_dt)
-        _density_step(self.dens, self.dens_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
+        self.solver.velocity_step(self.viscosity, sim_dt)
+        self.solver.density_step(self.dens, self.dens_prev, self.diffusion, sim_dt)
 
         self.dens *= 0.995
 
@@ -650,10 +714,9 @@ class FluidMixing(Visual):
         self._init_fields()
 
     def _init_fields(self):
-        self.u = _new_field()
-        self.v = _new_field()
-        self.u_prev = _new_field()
-        self.v_prev = _new_field()
+        self.solver = FluidSolver()
+        self.u = self.solver.u
+        self.v = self.solver.v
         self.dens_a = _new_field()
         self.dens_b = _new_field()
         self.dens_a_prev = _new_field()
@@ -775,19 +838,11 @@ class FluidMixing(Visual):
 
         self.age += dt
 
-        self.u_prev[:] = 0.0
-        self.v_prev[:] = 0.0
-        self.dens_a_prev[:] = 0.0
-        self.dens_b_prev[:] = 0.0
-
         self._add_stirring()
 
-        _velocity_step(self.u, self.v, self.u_prev, self.v_prev,
-                       self.viscosity, sim_dt)
-        _density_step(self.dens_a, self.dens_a_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
-        _density_step(self.dens_b, self.dens_b_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
+        self.solver.velocity_step(self.viscosity, sim_dt)
+        self.solver.density_step(self.dens_a, self.dens_a_prev, self.diffusion, sim_dt)
+        self.solver.density_step(self.dens_b, self.dens_b_prev, self.diffusion, sim_dt)
 
         # Pigment conservation: zero ghost cells, rescale interior
         # to preserve exact initial totals (closed system)
@@ -838,13 +893,7 @@ class FluidMixing(Visual):
         if self.fade_alpha < 1.0:
             colors *= max(0.0, self.fade_alpha)
 
-        pixels = np.clip(colors, 0, 255).astype(np.uint8)
-
-        for i in range(N):
-            col = pixels[i]
-            for j in range(N):
-                p = col[j]
-                self.display.set_pixel(i, j, (int(p[0]), int(p[1]), int(p[2])))
+        _blit(self.display, np.clip(colors, 0, 255).astype(np.uint8))
 
 
 # ── FluidPlay ────────────────────────────────────────────────────
@@ -917,10 +966,9 @@ class FluidPlay(Visual):
         self._init_fields()
 
     def _init_fields(self):
-        self.u = _new_field()
-        self.v = _new_field()
-        self.u_prev = _new_field()
-        self.v_prev = _new_field()
+        self.solver = FluidSolver()
+        self.u = self.solver.u
+        self.v = self.solver.v
         self.dens = _new_field()
         self.dens_prev = _new_field()
 
@@ -1066,14 +1114,8 @@ class FluidPlay(Visual):
             if random.random() < dt * 0.8:
                 self._auto_perturb()
 
-        self.u_prev[:] = 0.0
-        self.v_prev[:] = 0.0
-        self.dens_prev[:] = 0.0
-
-        _velocity_step(self.u, self.v, self.u_prev, self.v_prev,
-                       self.viscosity, sim_dt)
-        _density_step(self.dens, self.dens_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
+        self.solver.velocity_step(self.viscosity, sim_dt)
+        self.solver.density_step(self.dens, self.dens_prev, self.diffusion, sim_dt)
         self.dens *= 0.997
 
     def draw(self):
@@ -1183,10 +1225,9 @@ class FluidSculpt(Visual):
         self._init_fields()
 
     def _init_fields(self):
-        self.u = _new_field()
-        self.v = _new_field()
-        self.u_prev = _new_field()
-        self.v_prev = _new_field()
+        self.solver = FluidSolver()
+        self.u = self.solver.u
+        self.v = self.solver.v
         self.dens = _new_field()
         self.dens_prev = _new_field()
         self.obstacle = _make_obstacle_at(self.shape_idx, self.cx, self.cy)
@@ -1258,15 +1299,9 @@ class FluidSculpt(Visual):
                           self.cy + self._input_dy * self._CURSOR_SPEED * dt))
             self._rebuild_obstacle()
 
-        self.u_prev[:] = 0.0
-        self.v_prev[:] = 0.0
-        self.dens_prev[:] = 0.0
-
         self._add_inflow()
-        _velocity_step(self.u, self.v, self.u_prev, self.v_prev,
-                       self.viscosity, sim_dt)
-        _density_step(self.dens, self.dens_prev, self.u, self.v,
-                      self.diffusion, sim_dt)
+        self.solver.velocity_step(self.viscosity, sim_dt)
+        self.solver.density_step(self.dens, self.dens_prev, self.diffusion, sim_dt)
         self._apply_obstacle()
         self.dens *= 0.995
 
@@ -1282,10 +1317,7 @@ class FluidSculpt(Visual):
             _draw_vorticity(self.display, self.u, self.v,
                             VORT_PALETTES[name])
 
-        # Draw obstacle pixels
-        obs_ij = np.argwhere(self.obstacle[1:N+1, 1:N+1])
-        for k in range(len(obs_ij)):
-            self.display.set_pixel(int(obs_ij[k, 0]), int(obs_ij[k, 1]), (60, 60, 70))
+        _draw_obstacle(self.display, self.obstacle)
 
         # Overlay
         if self.overlay_timer > 0 and self.overlay_text:
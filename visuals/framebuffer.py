@@ -0,0 +1,72 @@
+"""
+Framebuffer - Bulk blit of NumPy frames to the display
+=======================================================
+Visuals that compute a whole frame as a (GRID_SIZE, GRID_SIZE, 3) uint8
+array hand it to blit_rgb() instead of calling set_pixel 4096 times.
+
+On the cabinet, HardwareDisplay keeps a flat RGB bytearray (_fb), and the
+web emulator's Display keeps one as its buffer; either way the blit is
+one memcpy. The desktop sim keeps a 2D list of tuples, so the frame is
+unpacked row by row. This is the same split atlas.py and globe.py
+already use for their rendered maps.
+"""
+
+import numpy as np
+
+from . import GRID_SIZE
+
+
+def _flat(display):
+    """The display's flat RGB bytearray, or None for a 2D list buffer."""
+    fb = getattr(display, '_fb', None)
+    if fb is None and isinstance(display.buffer, (bytearray, memoryview)):
+        fb = display.buffer
+    return fb
+
+
+def blit_rgb(display, rgb):
+    """Copy a full (GRID_SIZE, GRID_SIZE, 3) frame to the display."""
+    rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+    fb = _flat(display)
+    if fb is not None:
+        # Hardware / web emulator: single memcpy into flat bytearray
+        fb[:] = rgb.tobytes()
+        return
+    # Desktop sim: write to 2D buffer list
+    buf = display.buffer
+    for y, row in enumerate(rgb.tolist()):
+        buf[y][:] = map(tuple, row)
+
+
+def read_rgb(display):
+    """The display's current frame as a (GRID_SIZE, GRID_SIZE, 3) uint8
+    array, for rendering a visual into a texture."""
+    fb = _flat(display)
+    if fb is not None:
+        return np.frombuffer(fb, dtype=np.uint8).reshape(GRID_SIZE, GRID_SIZE, 3).copy()
+    return np.array(display.buffer, dtype=np.uint8)
+
+
+def blit_points(display, xs, ys, rgb):
+    """Plot many pixels at once: xs/ys int arrays, rgb an (N, 3) array.
+
+    Points outside the grid are dropped. Later points win on overlap.
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    keep = (xs >= 0) & (xs < GRID_SIZE) & (ys >= 0) & (ys < GRID_SIZE)
+    xs, ys, rgb = xs[keep], ys[keep], rgb[keep]
+    fb = _flat(display)
+    if fb is not None:
+        view = np.frombuffer(fb, dtype=np.uint8).reshape(GRID_SIZE, GRID_SIZE, 3)
+        view[ys, xs] = rgb
+        return
+    buf = display.buffer
+    for x, y, c in zip(xs.tolist(), ys.tolist(), rgb.tolist()):
+        buf[y][x] = tuple(c)
+
+
+def palette_array(colors):
+    """List of (r, g, b) tuples -> (N, 3) uint8 array for palette gathers."""
+    return np.array(colors, dtype=np.uint8).reshape(-1, 3)
@@ -120,7 +120,7 @@ class FroggerDemo(Visual):
             for turtle in game.turtles:
                 if turtle['row'] == row and not turtle['diving']:
                     # Also check if turtle might dive soon
-                    if turtle['dive_timer'] < 0.5:
+                    if turtle['warning']:
                         continue  # About to dive, not safe
                     future_x = turtle['x'] + turtle['speed'] * look_ahead_time
                     turtle_left = future_x - 2
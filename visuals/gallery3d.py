@@ -15,8 +15,13 @@ Controls:
 
 import math
 import os
-import pickle
+
+import numpy as np
+
+from raycast import cast, ray_offsets, shade, wall_rows
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_rgb, read_rgb
+from .texture_cache import TEXTURES, bake_frames, load_baked, mip_level
 
 try:
     from PIL import Image
@@ -24,7 +29,8 @@ try:
 except ImportError:
     HAS_PIL = False
 
-# Pre-loaded texture data for emulator mode (injected before this module loads)
+# Pre-loaded texture data for emulator mode (injected before this module loads):
+# {gallery class: {cell id: visuals.atlas_pack.AtlasEntry}} from gallery_atlas.bin
 _PRELOADED_GALLERY = globals().get('_GALLERY_PIXELS', {})
 # Painting atlas (shared with painting.py, for Salon)
 _PRELOADED_PAINTINGS = globals().get('_PAINTING_PIXELS', {})
@@ -41,9 +47,40 @@ IMMERSIVE_FRAMES = 24
 SPRITE_FPS = 6
 
 
-# ══════════════════════════════════════════════════════════════════
-#  Base class — all raycaster logic lives here
-# ══════════════════════════════════════════════════════════════════
+def _marble_room():
+    """Salon/Museum backdrop: emissive ceiling over a white marble floor
+    that brightens toward the viewer."""
+    half = GRID_SIZE // 2
+    room = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+    room[:half] = (220, 215, 200)
+    for y in range(half, GRID_SIZE):
+        f = (y - half) / (GRID_SIZE - half)   # 0 at horizon, 1 at viewer
+        v = int(160 + 60 * f)                  # 160 (far) → 220 (near)
+        room[y] = (v, v, v - 5)
+    return room
+
+_MARBLE_ROOM = _marble_room()
+
+
+def _gold_framed(frames):
+    """Copy of painting frames (..., GRID_SIZE, GRID_SIZE, 3) with the
+    checkered gold frame over the outer two texels, baked in before
+    mipmapping so it filters with the painting at a distance."""
+    frames = np.array(frames, dtype=np.uint8)
+    tex_y, tex_x = np.indices((GRID_SIZE, GRID_SIZE))
+    edge = ((tex_x <= 1) | (tex_x >= GRID_SIZE - 2)
+            | (tex_y <= 1) | (tex_y >= GRID_SIZE - 2))
+    light = (tex_x + tex_y) % 2 == 0
+    frames[..., edge & light, :] = GOLD
+    frames[..., edge & ~light, :] = GOLD_DARK
+    return frames
+
+
+def _solid_texture(color):
+    tex = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+    tex[:] = color
+    return tex
+
 
 class _Gallery3DBase(Visual):
     """Shared raycaster engine. Subclasses set class-level data."""
@@ -65,7 +102,7 @@ class _Gallery3DBase(Visual):
     IMMERSIVE = {}
 
     def __init__(self, display: Display):
-        self.textures = {}
+        self.textures = {}   # cell_id -> texture_cache.Texture
         super().__init__(display)
 
     def reset(self):
@@ -77,17 +114,17 @@ class _Gallery3DBase(Visual):
         self.move_speed = 3.0
         self.rot_speed = 2.5
         self.fov = math.pi / 3
-        self.ray_offsets = []
-        for col in range(GRID_SIZE):
-            offset = (col / GRID_SIZE - 0.5) * self.fov
-            self.ray_offsets.append(offset)
+        self.ray_offsets = ray_offsets(GRID_SIZE, self.fov)
+        self._grid = np.array(self.MAP, dtype=np.int64)
         self.auto_walk = True
         self.wp_idx = 0
         self.wp_pause = 0.0
         self._load_textures()
 
     # ------------------------------------------------------------------
-    # Generic texture loading — reads PAINTINGS + IMMERSIVE dicts
+    # Generic texture loading — reads PAINTINGS + IMMERSIVE dicts.
+    # Textures come from the process-wide texture_cache, so a painting
+    # hung in several galleries is decoded once.
     # ------------------------------------------------------------------
 
     def _load_textures(self):
@@ -95,7 +132,7 @@ class _Gallery3DBase(Visual):
         cls_name = type(self).__name__
         preloaded = _PRELOADED_GALLERY.get(cls_name)
         if preloaded:
-            self._decode_preloaded(preloaded)
+            self._decode_preloaded(cls_name, preloaded)
             return
 
         project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -116,19 +153,22 @@ class _Gallery3DBase(Visual):
 
         self._load_immersive_textures()
 
-    def _decode_preloaded(self, preloaded):
-        """Decode pre-loaded base64 texture data into self.textures."""
-        import base64 as b64mod
-        for cell_id_str, frames_b64 in preloaded.items():
+    def _set_texture(self, slot, key, loader, framed=True):
+        """Fill a slot from the shared cache; paintings get their gold
+        frame, immersive rooms are shown edge to edge."""
+        if framed:
+            self.textures[slot] = TEXTURES.get(key + ('framed',),
+                                               lambda: _gold_framed(loader()))
+        else:
+            self.textures[slot] = TEXTURES.get(key, loader)
+
+    def _decode_preloaded(self, cls_name, preloaded):
+        """Expand pre-loaded packed atlas entries into self.textures."""
+        for cell_id_str, entry in preloaded.items():
             cell_id = int(cell_id_str)
-            frames = []
-            for b64_data in frames_b64:
-                raw = b64mod.b64decode(b64_data)
-                tex = []
-                for i in range(0, len(raw), 3):
-                    tex.append((raw[i], raw[i + 1], raw[i + 2]))
-                frames.append(tex)
-            self.textures[cell_id] = frames
+            self._set_texture(
+                cell_id, ("preloaded", cls_name, cell_id), entry.array,
+                framed=cell_id not in self.IMMERSIVE)
 
     def _load_png_or_atlas(self, slot, path):
         """Load PNG from file, or fall back to paintings atlas for emulator."""
@@ -137,43 +177,39 @@ class _Gallery3DBase(Visual):
             basename = os.path.basename(path)
             if basename.endswith('.png'):
                 pid = basename[:-4]
-                b64 = _PRELOADED_PAINTINGS.get(pid)
-                if b64:
-                    import base64 as b64mod
-                    raw = b64mod.b64decode(b64)
-                    tex = []
-                    for i in range(0, len(raw), 3):
-                        tex.append((raw[i], raw[i + 1], raw[i + 2]))
-                    self.textures[slot] = [tex]
+                entry = _PRELOADED_PAINTINGS.get(pid)
+                if entry:
+                    self._set_texture(slot, ("atlas", pid),
+                                      lambda: entry.array(0))
                     return
-        self.textures[slot] = [self._read_png(path)]
+        self._load_png(slot, path)
 
     def _load_png(self, slot, path):
-        self.textures[slot] = [self._read_png(path)]
+        self._set_texture(slot, ("png", path), lambda: self._read_png(path))
 
     def _load_png_sequence(self, slot, paths):
-        self.textures[slot] = [self._read_png(p) for p in paths]
+        self._set_texture(slot, ("png_seq",) + tuple(paths),
+                          lambda: np.stack([self._read_png(p) for p in paths]))
 
     def _read_png(self, path):
         if not HAS_PIL or not os.path.exists(path):
-            return self._solid_texture((80, 80, 80))
+            return _solid_texture((80, 80, 80))
         try:
             img = Image.open(path).convert("RGB")
             img = img.resize((GRID_SIZE, GRID_SIZE), Image.Resampling.NEAREST)
-            tex = []
-            for y in range(GRID_SIZE):
-                for x in range(GRID_SIZE):
-                    tex.append(img.getpixel((x, y)))
-            return tex
+            return np.asarray(img, dtype=np.uint8)
         except Exception:
-            return self._solid_texture((80, 80, 80))
+            return _solid_texture((80, 80, 80))
 
     def _load_gif_frames(self, slot, path, max_frames=12):
+        self._set_texture(slot, ("gif", path, max_frames),
+                          lambda: self._read_gif(path, max_frames))
+
+    def _read_gif(self, path, max_frames):
         if not HAS_PIL or not os.path.exists(path):
-            self.textures[slot] = [self._solid_texture((80, 80, 80))]
-            return
+            return _solid_texture((80, 80, 80))
         try:
-            bg = (20, 20, 30)
+            bg = np.array((20, 20, 30), dtype=np.uint8)
             gif = Image.open(path)
             n_frames = getattr(gif, 'n_frames', 1)
             step = max(1, n_frames // max_frames)
@@ -182,79 +218,65 @@ class _Gallery3DBase(Visual):
                 gif.seek(i)
                 frame = gif.convert("RGBA")
                 frame = frame.resize((GRID_SIZE, GRID_SIZE), Image.Resampling.NEAREST)
-                tex = []
-                for y in range(GRID_SIZE):
-                    for x in range(GRID_SIZE):
-                        r, g, b, a = frame.getpixel((x, y))
-                        if a > 128:
-                            tex.append((r, g, b))
-                        else:
-                            tex.append(bg)
-                frames.append(tex)
+                rgba = np.asarray(frame, dtype=np.uint8)
+                frames.append(np.where(rgba[..., 3:] > 128, rgba[..., :3], bg))
                 if len(frames) >= max_frames:
                     break
-            self.textures[slot] = frames if frames else [self._solid_texture((80, 80, 80))]
+            return np.stack(frames) if frames else _solid_texture((80, 80, 80))
         except Exception:
-            self.textures[slot] = [self._solid_texture((80, 80, 80))]
+            return _solid_texture((80, 80, 80))
 
     def _capture_visual(self, slot, module_name, class_name):
-        try:
-            import importlib
-            mod = importlib.import_module(f".{module_name}", package="visuals")
-            cls = getattr(mod, class_name)
-            vis = cls(self.display)
-            vis.update(0.5)
-            vis.draw()
-            tex = []
-            for y in range(GRID_SIZE):
-                for x in range(GRID_SIZE):
-                    tex.append(self.display.get_pixel(x, y))
-            self.textures[slot] = [tex]
-        except Exception:
-            self.textures[slot] = [self._solid_texture((80, 80, 80))]
+        def render():
+            try:
+                import importlib
+                mod = importlib.import_module(f".{module_name}", package="visuals")
+                cls = getattr(mod, class_name)
+                vis = cls(self.display)
+                vis.update(0.5)
+                vis.draw()
+                return read_rgb(self.display)
+            except Exception:
+                return _solid_texture((80, 80, 80))
+        self._set_texture(slot, ("visual", module_name, class_name), render)
 
     def _load_immersive_textures(self):
         if not self.IMMERSIVE:
             return
-        import importlib
         visuals_dir = os.path.dirname(os.path.abspath(__file__))
         cache_dir = os.path.join(visuals_dir, ".gallery_cache")
-        os.makedirs(cache_dir, exist_ok=True)
 
         for cell_id, (mod_name, cls_name, _, _) in self.IMMERSIVE.items():
-            try:
-                src_path = os.path.join(visuals_dir, f"{mod_name}.py")
-                cache_path = os.path.join(cache_dir, f"{mod_name}.cache")
-                if os.path.exists(cache_path) and os.path.exists(src_path):
-                    if os.path.getmtime(cache_path) >= os.path.getmtime(src_path):
-                        with open(cache_path, 'rb') as f:
-                            self.textures[cell_id] = pickle.load(f)
-                            continue
-                mod = importlib.import_module(f".{mod_name}", package="visuals")
-                cls = getattr(mod, cls_name)
-                vis = cls(self.display)
-                dt = 1.0 / IMMERSIVE_FPS
-                frames = []
-                for _ in range(IMMERSIVE_FRAMES):
-                    vis.update(dt)
-                    vis.draw()
-                    tex = []
-                    for y in range(GRID_SIZE):
-                        for x in range(GRID_SIZE):
-                            tex.append(self.display.get_pixel(x, y))
-                    frames.append(tex)
-                self.textures[cell_id] = frames
-                try:
-                    with open(cache_path, 'wb') as f:
-                        pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
-                except Exception:
-                    pass
-            except Exception:
-                self.textures[cell_id] = [self._solid_texture((80, 80, 80))]
-
-    @staticmethod
-    def _solid_texture(color):
-        return [color] * (GRID_SIZE * GRID_SIZE)
+            src_path = os.path.join(visuals_dir, f"{mod_name}.py")
+            cache_path = os.path.join(cache_dir, f"{mod_name}.npy")
+            self._set_texture(
+                cell_id, ("immersive", mod_name, cls_name),
+                lambda m=mod_name, c=cls_name, s=src_path, p=cache_path:
+                    self._bake_immersive(m, c, s, p),
+                framed=False)
+
+    def _bake_immersive(self, mod_name, cls_name, src_path, cache_path):
+        """The room's animation loop: read back from the on-disk bake, or
+        rendered from the live visual and baked for next time."""
+        frames = load_baked(cache_path, src_path)
+        if frames is not None:
+            return frames
+        try:
+            import importlib
+            mod = importlib.import_module(f".{mod_name}", package="visuals")
+            cls = getattr(mod, cls_name)
+            vis = cls(self.display)
+            dt = 1.0 / IMMERSIVE_FPS
+            frames = []
+            for _ in range(IMMERSIVE_FRAMES):
+                vis.update(dt)
+                vis.draw()
+                frames.append(read_rgb(self.display))
+            frames = np.stack(frames)
+        except Exception:
+            return _solid_texture((80, 80, 80))
+        bake_frames(cache_path, frames)
+        return frames
 
     # ------------------------------------------------------------------
     # Input
@@ -407,120 +429,75 @@ class _Gallery3DBase(Visual):
             ceil_color = (30, 30, 50)
             floor_color = (50, 40, 35)
         half = GRID_SIZE // 2
+        frame = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        frame[:half] = ceil_color
+        frame[half:] = floor_color
+
+        hits = self._cast_rays(64)
+        dist = hits.dist
+
+        line_height = np.maximum((GRID_SIZE / dist).astype(np.int64), 1)
+        top = half - line_height // 2
+        wall = wall_rows(np.maximum(0, top),
+                         np.minimum(GRID_SIZE - 1, half + line_height // 2),
+                         GRID_SIZE) & hits.hit
+
+        fog = np.minimum(1.0, 2.0 / (dist + 0.5))
+        fog[hits.side == 1] *= 0.75
+
+        tex_col = self._tex_columns(hits)
+        ys = np.arange(GRID_SIZE)[:, np.newaxis]
+        tex_y = np.clip(((ys - top) * GRID_SIZE / line_height).astype(np.int64),
+                        0, GRID_SIZE - 1)
+        lod = mip_level(dist)
+
+        rgb = np.empty_like(frame)
+        rgb[:] = (100, 100, 110)
+        for cell in np.unique(hits.cell[hits.hit]).tolist():
+            if cell < 2 or cell not in self.textures:
+                continue
+            cols = hits.hit & (hits.cell == cell)
+            tex = self.textures[cell]
+            fps = IMMERSIVE_FPS if cell in self.IMMERSIVE else SPRITE_FPS
+            frame_idx = int(self.time * fps) % len(tex)
+            rgb[:, cols] = tex.sample(frame_idx, tex_y[:, cols], tex_col[cols], lod[cols])
+
+        frame[wall] = shade(rgb, fog)[wall]
+        blit_rgb(self.display, frame)
+
+    def _cast_rays(self, max_steps):
+        """DDA for every screen column at once."""
+        return cast(self._grid, self.px, self.py, self.pa + self.ray_offsets,
+                    max_steps)
 
-        for y in range(half):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, ceil_color)
-        for y in range(half, GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, floor_color)
-
-        for col in range(GRID_SIZE):
-            ray_angle = self.pa + self.ray_offsets[col]
-            self._cast_ray(col, ray_angle)
-
-    def _cast_ray(self, col, angle):
-        cos_a = math.cos(angle)
-        sin_a = math.sin(angle)
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        map_x = int(self.px)
-        map_y = int(self.py)
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
-        else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        hit = False
-        side = 0
-        for _ in range(64):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-
-            if map_x < 0 or map_x >= self.MAP_W or map_y < 0 or map_y >= self.MAP_H:
-                break
-            cell = self.MAP[map_y][map_x]
-            if cell != 0:
-                hit = True
-                break
-
-        if not hit:
-            return
-
-        if side == 0:
-            perp_dist = (map_x - self.px + (1 - step_x) / 2) / cos_a
-        else:
-            perp_dist = (map_y - self.py + (1 - step_y) / 2) / sin_a
-        if perp_dist < 0.01:
-            perp_dist = 0.01
+    @staticmethod
+    def _tex_columns(hits):
+        return np.minimum((hits.wall_x * GRID_SIZE).astype(np.int64), GRID_SIZE - 1)
+
+    def _panel_walls(self, hits):
+        """Wall rows for Salon/Museum walls _WALL_SCALE panels high, with
+        the camera half a unit above the floor. Returns the (H, W) wall
+        mask, panel index and texture row per pixel, and fog per column.
+        Well-lit gallery: much brighter than the base class fog."""
+        scale = self._WALL_SCALE
+        dist = hits.dist
+        unit_h = GRID_SIZE / dist                # screen pixels per world unit
+        half = GRID_SIZE // 2
+        draw_top = half - (scale - 0.5) * unit_h
+        draw_bot = half + 0.5 * unit_h
+        wall = wall_rows(np.maximum(0, draw_top.astype(np.int64)),
+                         np.minimum(GRID_SIZE - 1, draw_bot.astype(np.int64)),
+                         GRID_SIZE) & hits.hit
 
-        line_height = int(GRID_SIZE / perp_dist)
-        draw_start = max(0, GRID_SIZE // 2 - line_height // 2)
-        draw_end = min(GRID_SIZE - 1, GRID_SIZE // 2 + line_height // 2)
+        # World height from floor (0 = floor, scale = ceiling)
+        world_h = (draw_bot - np.arange(GRID_SIZE)[:, np.newaxis]) / unit_h
+        panel = np.clip(world_h.astype(np.int64), 0, scale - 1)
+        frac = world_h - panel                   # 0 at panel bottom, ~1 at top
+        tex_y = np.clip(((1.0 - frac) * GRID_SIZE).astype(np.int64), 0, GRID_SIZE - 1)
 
-        if side == 0:
-            wall_x = self.py + perp_dist * sin_a
-        else:
-            wall_x = self.px + perp_dist * cos_a
-        wall_x -= int(wall_x)
-
-        fog = min(1.0, 2.0 / (perp_dist + 0.5))
-        if side == 1:
-            fog *= 0.75
-
-        is_textured = cell >= 2
-        is_immersive = cell in self.IMMERSIVE
-        tex_col = int(wall_x * GRID_SIZE)
-        if tex_col >= GRID_SIZE:
-            tex_col = GRID_SIZE - 1
-
-        tex = None
-        if is_textured and cell in self.textures:
-            frames = self.textures[cell]
-            fps = IMMERSIVE_FPS if is_immersive else SPRITE_FPS
-            frame_idx = int(self.time * fps) % len(frames)
-            tex = frames[frame_idx]
-
-        for y in range(draw_start, draw_end + 1):
-            tex_y = int((y - (GRID_SIZE // 2 - line_height // 2)) * GRID_SIZE / line_height)
-            if tex_y >= GRID_SIZE:
-                tex_y = GRID_SIZE - 1
-            if tex_y < 0:
-                tex_y = 0
-
-            if tex is not None:
-                r, g, b = tex[tex_y * GRID_SIZE + tex_col]
-                if not is_immersive:
-                    if tex_col <= 1 or tex_col >= GRID_SIZE - 2 or tex_y <= 1 or tex_y >= GRID_SIZE - 2:
-                        r, g, b = GOLD if (tex_col + tex_y) % 2 == 0 else GOLD_DARK
-            else:
-                r, g, b = 100, 100, 110
-
-            r = int(r * fog)
-            g = int(g * fog)
-            b = int(b * fog)
-            self.display.set_pixel(col, y, (r, g, b))
+        fog = np.minimum(1.0, 5.0 / (dist + 1.0))
+        fog[hits.side == 1] *= 0.85
+        return wall, panel, tex_y, fog
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -1226,143 +1203,38 @@ class GallerySalon(_Gallery3DBase):
             diff += 2 * math.pi
         self.pa += diff * min(1.0, 3.0 * dt)
 
-    # -- Emissive ceiling + white marble floor --
+    # -- 5-panel stacked paintings under bright gallery lighting --
 
     def _render_frame(self):
-        half = GRID_SIZE // 2
-        # Bright emissive ceiling (gallery lighting)
-        ceil = (220, 215, 200)
-        for y in range(half):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, ceil)
-        # White marble floor with perspective gradient
-        for y in range(half, GRID_SIZE):
-            f = (y - half) / (GRID_SIZE - half)   # 0 at horizon, 1 at viewer
-            v = int(160 + 60 * f)                  # 160 (far) → 220 (near)
-            marble = (v, v, v - 5)
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, marble)
-        for col in range(GRID_SIZE):
-            self._cast_ray(col, self.pa + self.ray_offsets[col])
-
-    # -- Raycaster with 5-panel stacking + bright gallery lighting --
-
-    def _cast_ray(self, col, angle):
-        cos_a = math.cos(angle)
-        sin_a = math.sin(angle)
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        map_x = int(self.px)
-        map_y = int(self.py)
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
-        else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        hit = False
-        side = 0
-        for _ in range(48):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-            if (map_x < 0 or map_x >= self.MAP_W
-                    or map_y < 0 or map_y >= self.MAP_H):
-                break
-            cell = self.MAP[map_y][map_x]
-            if cell != 0:
-                hit = True
-                break
-
-        if not hit:
-            return
-
-        if side == 0:
-            perp_dist = (map_x - self.px + (1 - step_x) / 2) / cos_a
-        else:
-            perp_dist = (map_y - self.py + (1 - step_y) / 2) / sin_a
-        if perp_dist < 0.01:
-            perp_dist = 0.01
-
-        # Texture column
-        if side == 0:
-            wall_x = self.py + perp_dist * sin_a
-        else:
-            wall_x = self.px + perp_dist * cos_a
-        wall_x -= int(wall_x)
-        tex_col = int(wall_x * GRID_SIZE)
-        if tex_col >= GRID_SIZE:
-            tex_col = GRID_SIZE - 1
-
-        # Well-lit gallery: much brighter than base class fog
-        fog = min(1.0, 5.0 / (perp_dist + 1.0))
-        if side == 1:
-            fog *= 0.85
-
-        # --- 5-panel stacked wall ---
-        scale = self._WALL_SCALE
-        unit_h = GRID_SIZE / perp_dist          # screen pixels per world unit
-        half = GRID_SIZE // 2
-        # Camera at 0.5 units; wall spans 0 (floor) to scale (top)
-        draw_top = half - (scale - 0.5) * unit_h
-        draw_bot = half + 0.5 * unit_h
-        ds = max(0, int(draw_top))
-        de = min(GRID_SIZE - 1, int(draw_bot))
-
-        is_painting = cell >= 2 and cell in self.textures
-
-        for y in range(ds, de + 1):
-            # World height from floor (0 = floor, scale = ceiling)
-            world_h = (draw_bot - y) / unit_h
-            panel = int(world_h)
-            panel = max(0, min(scale - 1, panel))
-            frac = world_h - panel           # 0 at panel bottom, ~1 at top
-            tex_y = int((1.0 - frac) * GRID_SIZE)
-            tex_y = max(0, min(GRID_SIZE - 1, tex_y))
-
-            tex = None
-            if is_painting:
-                if panel == 0:
-                    tex_cell = cell          # ground level = actual painting
-                else:
-                    stack = self._stack_map.get(cell)
-                    tex_cell = stack[panel - 1] if stack else cell
-                frames = self.textures.get(tex_cell)
-                if frames:
-                    tex = frames[0]
-
-            if tex is not None:
-                r, g, b = tex[tex_y * GRID_SIZE + tex_col]
-                # Gold frame at panel edges
-                if (tex_col <= 1 or tex_col >= GRID_SIZE - 2
-                        or tex_y <= 1 or tex_y >= GRID_SIZE - 2):
-                    r, g, b = GOLD if (tex_col + tex_y) % 2 == 0 else GOLD_DARK
-            else:
-                r, g, b = 210, 205, 195      # bright warm plaster
-
-            r = int(r * fog)
-            g = int(g * fog)
-            b = int(b * fog)
-            self.display.set_pixel(col, y, (r, g, b))
+        frame = _MARBLE_ROOM.copy()
+        hits = self._cast_rays(48)
+        wall, panel, tex_y, fog = self._panel_walls(hits)
+        tex_col = self._tex_columns(hits)
+
+        rgb = np.empty_like(frame)
+        rgb[:] = (210, 205, 195)                 # bright warm plaster
+        lod = mip_level(hits.dist)
+        for cell in np.unique(hits.cell[hits.hit]).tolist():
+            if cell < 2 or cell not in self.textures:
+                continue
+            cols = hits.hit & (hits.cell == cell)
+            ty = tex_y[:, cols]
+            tc = np.broadcast_to(tex_col[cols], ty.shape)
+            cl = np.broadcast_to(lod[cols], ty.shape)
+            cell_panel = panel[:, cols]
+            texels = rgb[:, cols]
+            stack = self._stack_map.get(cell)
+            for p in range(self._WALL_SCALE):
+                # Ground level = actual painting, stacked ones above
+                tex_cell = cell if p == 0 or not stack else stack[p - 1]
+                if not self.textures.get(tex_cell):
+                    continue
+                sel = cell_panel == p
+                texels[sel] = self.textures[tex_cell].sample(0, ty[sel], tc[sel], cl[sel])
+            rgb[:, cols] = texels
+
+        frame[wall] = shade(rgb, fog)[wall]
+        blit_rgb(self.display, frame)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -1543,6 +1415,8 @@ class GalleryMuseum(_Gallery3DBase):
             x_end = (room_idx + n) * RW
             self._wing_boundaries.append((x_start, x_end, WING_COLORS[w]))
             room_idx += n
+        self._wing_rgb = np.array([self._get_wall_color(x) for x in range(W)],
+                                  dtype=np.uint8)
 
         # Build ordered PID list: wing by wing
         ordered_pids = []
@@ -1754,127 +1628,30 @@ class GalleryMuseum(_Gallery3DBase):
         return (210, 205, 195)
 
     def _render_frame(self):
-        half = GRID_SIZE // 2
-        ceil = (220, 215, 200)
-        for y in range(half):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, ceil)
-        for y in range(half, GRID_SIZE):
-            f = (y - half) / (GRID_SIZE - half)
-            v = int(160 + 60 * f)
-            marble = (v, v, v - 5)
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, marble)
-        for col in range(GRID_SIZE):
-            self._cast_ray(col, self.pa + self.ray_offsets[col])
-
-    def _cast_ray(self, col, angle):
-        cos_a = math.cos(angle)
-        sin_a = math.sin(angle)
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        map_x = int(self.px)
-        map_y = int(self.py)
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
-        else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        hit = False
-        side = 0
-        for _ in range(48):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-            if (map_x < 0 or map_x >= self.MAP_W
-                    or map_y < 0 or map_y >= self.MAP_H):
-                break
-            cell = self.MAP[map_y][map_x]
-            if cell != 0:
-                hit = True
-                break
-
-        if not hit:
-            return
-
-        if side == 0:
-            perp_dist = (map_x - self.px + (1 - step_x) / 2) / cos_a
-        else:
-            perp_dist = (map_y - self.py + (1 - step_y) / 2) / sin_a
-        if perp_dist < 0.01:
-            perp_dist = 0.01
-
-        if side == 0:
-            wall_x = self.py + perp_dist * sin_a
-        else:
-            wall_x = self.px + perp_dist * cos_a
-        wall_x -= int(wall_x)
-        tex_col = int(wall_x * GRID_SIZE)
-        if tex_col >= GRID_SIZE:
-            tex_col = GRID_SIZE - 1
-
-        fog = min(1.0, 5.0 / (perp_dist + 1.0))
-        if side == 1:
-            fog *= 0.85
-
-        # 2-panel wall: panel 0 = painting, panel 1 = plaster
-        scale = self._WALL_SCALE
-        unit_h = GRID_SIZE / perp_dist
-        half = GRID_SIZE // 2
-        draw_top = half - (scale - 0.5) * unit_h
-        draw_bot = half + 0.5 * unit_h
-        ds = max(0, int(draw_top))
-        de = min(GRID_SIZE - 1, int(draw_bot))
-
-        is_painting = cell >= 2 and cell in self.textures
-        wall_color = self._get_wall_color(map_x)
-
-        for y in range(ds, de + 1):
-            world_h = (draw_bot - y) / unit_h
-            panel = int(world_h)
-            panel = max(0, min(scale - 1, panel))
-            frac = world_h - panel
-            tex_y = int((1.0 - frac) * GRID_SIZE)
-            tex_y = max(0, min(GRID_SIZE - 1, tex_y))
-
-            tex = None
-            if is_painting and panel == 0:
-                frames = self.textures.get(cell)
-                if frames:
-                    tex = frames[0]
-
-            if tex is not None:
-                r, g, b = tex[tex_y * GRID_SIZE + tex_col]
-                if (tex_col <= 1 or tex_col >= GRID_SIZE - 2
-                        or tex_y <= 1 or tex_y >= GRID_SIZE - 2):
-                    r, g, b = GOLD if (tex_col + tex_y) % 2 == 0 else GOLD_DARK
-            else:
-                r, g, b = wall_color
-
-            r = int(r * fog)
-            g = int(g * fog)
-            b = int(b * fog)
-            self.display.set_pixel(col, y, (r, g, b))
+        frame = _MARBLE_ROOM.copy()
+        hits = self._cast_rays(48)
+        wall, panel, tex_y, fog = self._panel_walls(hits)
+        tex_col = self._tex_columns(hits)
+
+        lod = mip_level(hits.dist)
+
+        # Plaster in the wing color; the painting on the bottom panel
+        rgb = np.broadcast_to(self._wing_rgb[np.clip(hits.map_x, 0, self.MAP_W - 1)],
+                              frame.shape).copy()
+        for cell in np.unique(hits.cell[hits.hit]).tolist():
+            if cell < 2 or not self.textures.get(cell):
+                continue
+            cols = hits.hit & (hits.cell == cell)
+            ty = tex_y[:, cols]
+            tc = np.broadcast_to(tex_col[cols], ty.shape)
+            cl = np.broadcast_to(lod[cols], ty.shape)
+            texels = rgb[:, cols]
+            sel = panel[:, cols] == 0
+            texels[sel] = self.textures[cell].sample(0, ty[sel], tc[sel], cl[sel])
+            rgb[:, cols] = texels
+
+        frame[wall] = shade(rgb, fog)[wall]
+        blit_rgb(self.display, frame)
 
 
 # Legacy alias — keep old import working
@@ -10,7 +10,7 @@ Controls:
 """
 
 from . import Visual, Display, GRID_SIZE
-from .turing import (PALETTES, _init_grid, _step_gray_scott, _draw_turing)
+from .turing import PALETTES, _init_grid, _draw_turing
 import settings
 
 
@@ -31,8 +31,8 @@ class GrayScott(Visual):
         self.f = settings.get('gs_lab_f', 0.035)
         self.k = settings.get('gs_lab_k', 0.065)
         self.palette_idx = settings.get('gs_lab_palette', 0) % len(PALETTES)
-        self.steps_per_frame = 8
-        self.u, self.v = _init_grid()
+        self.steps_per_frame = 16
+        self.rd = _init_grid()
         self._both_pressed_prev = False
 
     def handle_input(self, input_state) -> bool:
@@ -46,15 +46,14 @@ class GrayScott(Visual):
         both = input_state.action_l and input_state.action_r
         if not both and (input_state.action_l or input_state.action_r):
             if not self._both_pressed_prev:
-                self.u, self.v = _init_grid()
+                self.rd = _init_grid()
                 consumed = True
         self._both_pressed_prev = both
         return consumed
 
     def update(self, dt: float):
         self.time += dt
-        self.u, self.v = _step_gray_scott(self.u, self.v, self.f, self.k,
-                                           self.steps_per_frame)
+        self.rd.step(self.f, self.k, self.steps_per_frame)
 
     def draw(self):
-        _draw_turing(self.display, self.v, self.palette_idx)
+        _draw_turing(self.display, self.rd.v, self.palette_idx)
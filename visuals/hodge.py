@@ -15,8 +15,11 @@ Controls:
   Space      - Reset with random pattern
 """
 
-import random
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .ca_engine import Automaton, HodgepodgeRule
+from .framebuffer import palette_array
 
 
 class Hodge(Visual):
@@ -62,12 +65,12 @@ class Hodge(Visual):
             self.make_mono_bands((255, 50, 50), 6),
             self.make_mono_bands((50, 255, 100), 6),
         ]
+        self.palettes = [palette_array(p) for p in self.palettes]
         self.current_palette = 0
         self.colors = self.palettes[self.current_palette]
 
         # Initialize grid
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.next_grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.ca = Automaton(HodgepodgeRule(self.n, self.k1, self.k2, self.g))
 
         self.init_random()
 
@@ -134,15 +137,17 @@ class Hodge(Visual):
             ))
         return gradient
 
+    @property
+    def grid(self):
+        return self.ca.grid
+
     def init_random(self):
         """Initialize with random states."""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                # Mostly healthy with some infected
-                if random.random() < 0.2:
-                    self.grid[y][x] = random.randint(1, self.n)
-                else:
-                    self.grid[y][x] = 0
+        shape = (GRID_SIZE, GRID_SIZE)
+        # Mostly healthy with some infected
+        infected = np.random.random(shape) < 0.2
+        states = np.random.randint(1, self.n + 1, shape)
+        self.ca.grid = np.where(infected, states, 0).astype(np.uint8)
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -183,66 +188,12 @@ class Hodge(Visual):
 
     def step_ca(self):
         """Perform one step of the Hodgepodge cellular automaton."""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                state = self.grid[y][x]
-
-                # Count neighbors
-                infected = 0  # States 1 to n-1
-                ill = 0       # State n
-                total = state  # Sum including self
-
-                for dy in [-1, 0, 1]:
-                    for dx in [-1, 0, 1]:
-                        if dx == 0 and dy == 0:
-                            continue
-                        nx = (x + dx) % GRID_SIZE
-                        ny = (y + dy) % GRID_SIZE
-                        neighbor = self.grid[ny][nx]
-                        total += neighbor
-
-                        if neighbor == self.n:
-                            ill += 1
-                        elif neighbor > 0:
-                            infected += 1
-
-                # Apply rules based on current state
-                if state == 0:
-                    # Healthy cell - can become infected
-                    new_state = (infected // self.k1) + (ill // self.k2)
-                    self.next_grid[y][x] = min(new_state, self.n)
-
-                elif state == self.n:
-                    # Ill cell - becomes healthy
-                    self.next_grid[y][x] = 0
-
-                else:
-                    # Infected cell - gets sicker
-                    # Average of 9-cell neighborhood + g
-                    avg = total // 9
-                    new_state = avg + int(self.g)
-                    self.next_grid[y][x] = min(new_state, self.n)
-
-        # Swap grids
-        self.grid, self.next_grid = self.next_grid, self.grid
-
-        # Check if simulation has died out (all cells healthy)
-        alive = False
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x] > 0:
-                    alive = True
-                    break
-            if alive:
-                break
-
-        if not alive:
-            # Auto-reset when everything dies
+        self.ca.rule.g = self.g
+        self.ca.step()
+
+        # Auto-reset when everything dies (all cells healthy)
+        if not self.ca.population():
             self.init_random()
 
     def draw(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                state = self.grid[y][x]
-                color = self.colors[state]
-                self.display.set_pixel(x, y, color)
+        self.ca.draw(self.display, self.colors)
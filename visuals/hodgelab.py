@@ -11,9 +11,13 @@ Controls:
   Both       - Commit params to settings
 """
 
-import random
 import math
+
+import numpy as np
+
 from . import Visual, Display, GRID_SIZE
+from .ca_engine import Automaton, HodgepodgeRule
+from .framebuffer import palette_array
 import settings
 
 # Named regions in g x n space
@@ -62,8 +66,7 @@ class HodgeLab(Visual):
         self.palette_idx = self.palette_idx % len(self.palettes)
         self.colors = self.palettes[self.palette_idx]
 
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.next_grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.ca = Automaton(HodgepodgeRule(self.n, self.k1, self.k2, self.g))
         self._randomize()
 
         self.param_overlay_timer = 2.0
@@ -91,6 +94,7 @@ class HodgeLab(Visual):
             self._make_banded_rainbow(8, n),
             self._make_banded_rainbow(4, n),
         ]
+        self.palettes = [palette_array(p) for p in self.palettes]
 
     @staticmethod
     def _make_gradient(key_colors, n):
@@ -132,13 +136,15 @@ class HodgeLab(Visual):
             ))
         return gradient
 
+    @property
+    def grid(self):
+        return self.ca.grid
+
     def _randomize(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if random.random() < 0.2:
-                    self.grid[y][x] = random.randint(1, self.n)
-                else:
-                    self.grid[y][x] = 0
+        shape = (GRID_SIZE, GRID_SIZE)
+        infected = np.random.random(shape) < 0.2
+        states = np.random.randint(1, self.n + 1, shape)
+        self.ca.grid = np.where(infected, states, 0).astype(np.uint8)
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -192,11 +198,7 @@ class HodgeLab(Visual):
         return consumed
 
     def _clamp_grid(self):
-        n = self.n
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x] > n:
-                    self.grid[y][x] = n
+        np.minimum(self.ca.grid, self.n, out=self.ca.grid)
 
     def update(self, dt: float):
         self.time += dt
@@ -212,55 +214,16 @@ class HodgeLab(Visual):
             self.confirm_timer = max(0.0, self.confirm_timer - dt)
 
     def _step_ca(self):
-        n = self.n
-        k1 = self.k1
-        k2 = self.k2
-        g = int(self.g)
-        grid = self.grid
-        nxt = self.next_grid
-
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                state = grid[y][x]
-                infected = 0
-                ill = 0
-                total = state
-
-                for dy in (-1, 0, 1):
-                    for dx in (-1, 0, 1):
-                        if dx == 0 and dy == 0:
-                            continue
-                        nb = grid[(y + dy) % GRID_SIZE][(x + dx) % GRID_SIZE]
-                        total += nb
-                        if nb == n:
-                            ill += 1
-                        elif nb > 0:
-                            infected += 1
-
-                if state == 0:
-                    new_state = (infected // k1) + (ill // k2)
-                    nxt[y][x] = min(new_state, n)
-                elif state == n:
-                    nxt[y][x] = 0
-                else:
-                    avg = total // 9
-                    nxt[y][x] = min(avg + g, n)
-
-        self.grid, self.next_grid = self.next_grid, self.grid
+        rule = self.ca.rule
+        rule.n = self.n
+        rule.g = self.g
+        self.ca.step()
 
-        alive = any(self.grid[y][x] > 0
-                     for y in range(GRID_SIZE) for x in range(GRID_SIZE))
-        if not alive:
+        if not self.ca.population():
             self._randomize()
 
     def draw(self):
-        colors = self.colors
-        grid = self.grid
-        sp = self.display.set_pixel
-        for y in range(GRID_SIZE):
-            row = grid[y]
-            for x in range(GRID_SIZE):
-                sp(x, y, colors[row[x]])
+        self.ca.draw(self.display, self.colors)
 
         if self.param_overlay_timer > 0:
             alpha = min(1.0, self.param_overlay_timer / 0.5)
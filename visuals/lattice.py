@@ -12,8 +12,12 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
 from .molecule import CPK_COLORS, CPK_RADIUS
+from .render3d import ZBuffer, ball_sprites, project, rot_x, rot_y, rot_z, transform
 
 
 # Extend CPK colors with additional elements for crystals
@@ -1201,28 +1205,32 @@ class Lattice(Visual):
         self.scale = target_radius / max_r if max_r > 0 else 10.0
         self._base_scale = self.scale
 
+        # Vertex arrays for the renderer
+        atoms = self.tiled_atoms
+        self._coords = np.array([atom[1:4] for atom in atoms], dtype=np.float64).reshape(-1, 3)
+        self._fade = np.array([atom[4] for atom in atoms], dtype=np.float64)
+        self._radii = np.array([LATTICE_RADIUS.get(atom[0], 3) for atom in atoms], dtype=np.int64)
+        base = np.array([LATTICE_COLORS.get(atom[0], (200, 200, 200)) for atom in atoms],
+                        dtype=np.float64).reshape(-1, 3)
+        self._colors = (base * self._fade[:, np.newaxis]).astype(np.uint8)
+        # Pre-shaded stamps for the atoms faded in enough to draw
+        self._shown = self._fade >= 0.15
+        self._sprites = ball_sprites(self._radii[self._shown], self._colors[self._shown])
+
         self._generate_bonds(crystal)
         self.label_timer = 0.0
         self.scroll_offset = 0.0
 
     def _generate_bonds(self, crystal):
         """Generate bonds between atoms within cutoff distance."""
-        self.bonds = []
         cutoff = crystal['bond_cutoff'] * crystal['a']
-
-        n = len(self.tiled_atoms)
-        for i in range(n):
-            _, x1, y1, z1, f1 = self.tiled_atoms[i]
-            for j in range(i + 1, n):
-                _, x2, y2, z2, f2 = self.tiled_atoms[j]
-                dist = math.sqrt(
-                    (x2 - x1) ** 2 +
-                    (y2 - y1) ** 2 +
-                    (z2 - z1) ** 2
-                )
-                if dist < cutoff and dist > 0.01:
-                    bond_fade = min(f1, f2)
-                    self.bonds.append((i, j, bond_fade))
+        p = self._coords
+        diff = p[:, np.newaxis, :] - p[np.newaxis, :, :]
+        dist = np.sqrt((diff * diff).sum(axis=2))
+        # Each pair once (i < j), in the order a nested loop finds them
+        near = np.triu((dist < cutoff) & (dist > 0.01), k=1)
+        self._bond_i, self._bond_j = np.nonzero(near)
+        self._bond_fade = np.minimum(self._fade[self._bond_i], self._fade[self._bond_j])
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -1317,72 +1325,32 @@ class Lattice(Visual):
                     self.crystal_pos = (self.crystal_pos + 1) % len(crystal_list)
                 self._prepare_crystal()
 
-    def _transform_point(self, x, y, z):
-        """Apply rotation and project to screen coords."""
-        x -= self.offset[0]
-        y -= self.offset[1]
-        z -= self.offset[2]
-        x *= self.scale
-        y *= self.scale
-        z *= self.scale
-
-        # Auto-rotation around Z axis (constant tumble)
-        cos_z, sin_z = math.cos(self.rotation_z), math.sin(self.rotation_z)
-        x1 = x * cos_z - y * sin_z
-        y1 = x * sin_z + y * cos_z
-
-        # Manual tilt (rotation around X axis) - controlled by up/down
-        cos_t, sin_t = math.cos(self.tilt_x), math.sin(self.tilt_x)
-        y2 = y1 * cos_t - z * sin_t
-        z2 = y1 * sin_t + z * cos_t
-
-        # Manual rotation around Y axis - controlled by left/right
-        cos_r, sin_r = math.cos(self.rotation_y), math.sin(self.rotation_y)
-        x2 = x1 * cos_r + z2 * sin_r
-        z3 = -x1 * sin_r + z2 * cos_r
-
-        screen_x = GRID_SIZE // 2 + x2
-        screen_y = 28 - y2
-        return screen_x, screen_y, z3
+    def _transform(self, points):
+        """Rotate (N, 3) atom positions and project to screen: (sx, sy, z)."""
+        # Auto-rotation around Z (constant tumble), then the manual tilt
+        # around X (up/down) and rotation around Y (left/right)
+        m = rot_y(self.rotation_y) @ rot_x(self.tilt_x) @ rot_z(self.rotation_z)
+        cam = transform(points, m, self.offset, self.scale)
+        return project(cam, GRID_SIZE // 2, 28)
 
     def draw(self):
-        self.display.clear(Colors.BLACK)
-
         crystal = CRYSTALS[self._current_crystal_index()]
 
-        transformed = []
-        for elem, ax, ay, az, fade in self.tiled_atoms:
-            if fade < 0.15:
-                continue
-            sx, sy, sz = self._transform_point(ax, ay, az)
-            transformed.append((elem, sx, sy, sz, fade))
+        zb = ZBuffer(Colors.BLACK)
+        sx, sy, sz = self._transform(self._coords)
 
-        draw_list = []
+        # Bonds and atoms fade toward the edge of the tiling; the faintest
+        # are left out
+        shown = self._bond_fade >= 0.15
+        i, j = self._bond_i[shown], self._bond_j[shown]
+        bond_colors = (np.array(BOND_COLOR, dtype=np.float64)
+                       * self._bond_fade[shown][:, np.newaxis]).astype(np.uint8)
+        zb.lines(sx[i], sy[i], sz[i], sx[j], sy[j], sz[j], bond_colors)
 
-        for i, j, bond_fade in self.bonds:
-            if bond_fade < 0.15:
-                continue
-            e1, x1, y1, z1, f1 = self.tiled_atoms[i]
-            e2, x2, y2, z2, f2 = self.tiled_atoms[j]
-            sx1, sy1, sz1 = self._transform_point(x1, y1, z1)
-            sx2, sy2, sz2 = self._transform_point(x2, y2, z2)
-            avg_z = (sz1 + sz2) / 2
-            draw_list.append(('bond', avg_z, sx1, sy1, sx2, sy2, bond_fade))
-
-        for elem, sx, sy, sz, fade in transformed:
-            r = LATTICE_RADIUS.get(elem, 3)
-            color = LATTICE_COLORS.get(elem, (200, 200, 200))
-            draw_list.append(('atom', sz, sx, sy, r, color, fade))
-
-        draw_list.sort(key=lambda item: item[1])
-
-        for item in draw_list:
-            if item[0] == 'bond':
-                _, _, x1, y1, x2, y2, fade = item
-                self._draw_bond(x1, y1, x2, y2, fade)
-            else:
-                _, _, sx, sy, r, color, fade = item
-                self._draw_atom(sx, sy, r, color, fade)
+        shown = self._shown
+        sheet, which = self._sprites
+        zb.sprites(sheet, which, sx[shown], sy[shown], sz[shown])
+        zb.blit(self.display)
 
         # Bottom label: cycle between name, system, color-coded formula
         label_phase = int(self.label_timer / 4) % 3
@@ -1456,41 +1424,3 @@ class Lattice(Visual):
             color = LATTICE_COLORS.get(elem, (200, 200, 200)) if elem else Colors.WHITE
             self.display.draw_text_small(cursor, y, text, color)
             cursor += len(text) * 4
-
-    def _draw_atom(self, cx, cy, r, color, fade):
-        """Draw a filled circle with simple shading and fade."""
-        icx = int(round(cx))
-        icy = int(round(cy))
-
-        color = (
-            int(color[0] * fade),
-            int(color[1] * fade),
-            int(color[2] * fade),
-        )
-
-        for dy in range(-r, r + 1):
-            for dx in range(-r, r + 1):
-                if dx * dx + dy * dy <= r * r:
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    if dist < r * 0.4:
-                        t = dist / (r * 0.4)
-                        shade = 1.0 + (1.0 - t) * 0.4
-                    else:
-                        shade = 1.0 - (dist / r) * 0.3
-                    c = (
-                        min(255, int(color[0] * shade)),
-                        min(255, int(color[1] * shade)),
-                        min(255, int(color[2] * shade)),
-                    )
-                    self.display.set_pixel(icx + dx, icy + dy, c)
-
-    def _draw_bond(self, x1, y1, x2, y2, fade):
-        """Draw a bond line with fade applied."""
-        ix1, iy1 = int(round(x1)), int(round(y1))
-        ix2, iy2 = int(round(x2)), int(round(y2))
-        color = (
-            int(BOND_COLOR[0] * fade),
-            int(BOND_COLOR[1] * fade),
-            int(BOND_COLOR[2] * fade),
-        )
-        self.display.draw_line(ix1, iy1, ix2, iy2, color)
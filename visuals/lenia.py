@@ -20,7 +20,8 @@ Controls (LENIA LAB):
 
 import numpy as np
 from . import Visual, Display, GRID_SIZE
-from .turing import PALETTES, _PAL_ARRAYS
+from .turing import PALETTES, _PAL_LUTS
+from .rd_engine import LeniaModel, draw_field
 import settings
 
 N = GRID_SIZE       # Display resolution (64)
@@ -28,72 +29,17 @@ SIM = 128           # Internal simulation resolution
 R = 13              # Kernel radius (proper scale for 128x128)
 
 
-def _bell(x, mu, sigma):
-    """Bell-shaped function."""
-    return np.exp(-((x - mu) ** 2) / (2.0 * sigma ** 2))
-
-
-def _make_kernel(R):
-    """Create ring-shaped bell kernel."""
-    y, x = np.mgrid[-R:R+1, -R:R+1]
-    dist = np.sqrt(x * x + y * y) / R
-    kernel = _bell(dist, 0.5, 0.15)
-    kernel[dist > 1.0] = 0.0
-    kernel /= kernel.sum()
-    return kernel
-
-
 def _init_lenia_grid():
-    """Initialize 128x128 grid with 35% random soup."""
-    grid = np.zeros((SIM, SIM), dtype=np.float64)
+    """New 128x128 Lenia model seeded with 35% random soup."""
+    model = LeniaModel(SIM, R)
     mask = np.random.random((SIM, SIM)) < 0.35
-    grid[mask] = np.random.random(mask.sum())
-    return grid
-
-
-# Precompute kernel and its FFT at SIM resolution
-_KERNEL = _make_kernel(R)
-_KERNEL_PAD = np.zeros((SIM, SIM), dtype=np.float64)
-_kh, _kw = _KERNEL.shape
-_KERNEL_PAD[:_kh, :_kw] = _KERNEL
-_KERNEL_PAD = np.roll(np.roll(_KERNEL_PAD, -(_kh // 2), axis=0),
-                       -(_kw // 2), axis=1)
-_KERNEL_FFT = np.fft.rfft2(_KERNEL_PAD)
-
-
-def _step_lenia(grid, mu, sigma, dt, steps):
-    """Run steps iterations of Lenia using FFT convolution at 128x128."""
-    kfft = _KERNEL_FFT
-    for _ in range(steps):
-        gfft = np.fft.rfft2(grid)
-        potential = np.fft.irfft2(gfft * kfft, s=(SIM, SIM))
-        growth = 2.0 * np.exp(-((potential - mu) ** 2) / (2.0 * sigma ** 2)) - 1.0
-        grid = np.clip(grid + dt * growth, 0.0, 1.0)
-    return grid
-
-
-def _downsample(grid):
-    """2x2 average downsample from SIM (128) to N (64)."""
-    return grid.reshape(N, SIM // N, N, SIM // N).mean(axis=(1, 3))
+    model.grid[mask] = np.random.random(mask.sum())
+    return model
 
 
-def _draw_lenia(display, grid, palette_idx):
-    """Downsample and draw through a color palette (vectorized)."""
-    small = _downsample(grid)
-    pal_arr = _PAL_ARRAYS[palette_idx]
-    n_colors = len(pal_arr)
-    t = np.clip(small, 0.0, 1.0)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    colors = pal_arr[lo] + (pal_arr[hi] - pal_arr[lo]) * frac
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
-    for y in range(N):
-        row = pixels[y]
-        for x in range(N):
-            p = row[x]
-            display.set_pixel(x, y, (int(p[0]), int(p[1]), int(p[2])))
+def _draw_lenia(display, model, palette_idx):
+    """Downsample to the display and draw through a color palette."""
+    draw_field(display, model.downsample(N), _PAL_LUTS[palette_idx])
 
 
 # Named regions in mu x sigma space (tuned for R=13 on 128x128)
@@ -138,8 +84,8 @@ class Lenia(Visual):
         self.sigma = settings.get('lenia_lab_sigma', 0.022)
         self.palette_idx = settings.get('lenia_lab_palette', 0) % len(PALETTES)
         self.dt = 0.1
-        self.steps_per_frame = 2
-        self.grid = _init_lenia_grid()
+        self.steps_per_frame = 4
+        self.model = _init_lenia_grid()
         self._both_pressed_prev = False
         self._dead_frames = 0
 
@@ -154,7 +100,7 @@ class Lenia(Visual):
         both = input_state.action_l and input_state.action_r
         if not both and (input_state.action_l or input_state.action_r):
             if not self._both_pressed_prev:
-                self.grid = _init_lenia_grid()
+                self.model = _init_lenia_grid()
                 self._dead_frames = 0
                 consumed = True
         self._both_pressed_prev = both
@@ -162,18 +108,17 @@ class Lenia(Visual):
 
     def update(self, dt: float):
         self.time += dt
-        self.grid = _step_lenia(self.grid, self.mu, self.sigma,
-                                 self.dt, self.steps_per_frame)
-        if self.grid.sum() < 2.0:
+        self.model.step(self.mu, self.sigma, self.dt, self.steps_per_frame)
+        if self.model.grid.sum() < 2.0:
             self._dead_frames += 1
             if self._dead_frames > 3:
-                self.grid = _init_lenia_grid()
+                self.model = _init_lenia_grid()
                 self._dead_frames = 0
         else:
             self._dead_frames = 0
 
     def draw(self):
-        _draw_lenia(self.display, self.grid, self.palette_idx)
+        _draw_lenia(self.display, self.model, self.palette_idx)
 
 
 class LeniaLab(Visual):
@@ -200,8 +145,8 @@ class LeniaLab(Visual):
         self.sigma = settings.get('lenia_lab_sigma', 0.022)
         self.palette_idx = settings.get('lenia_lab_palette', 0) % len(PALETTES)
         self.dt = 0.1
-        self.steps_per_frame = 2
-        self.grid = _init_lenia_grid()
+        self.steps_per_frame = 4
+        self.model = _init_lenia_grid()
         self._dead_frames = 0
         self.param_overlay_timer = 2.0
         self.saved_timer = 0.0
@@ -245,19 +190,18 @@ class LeniaLab(Visual):
         elif not both_held:
             if input_state.action_l or input_state.action_r:
                 self.palette_idx = (self.palette_idx + 1) % len(PALETTES)
-                self.grid = _init_lenia_grid()
+                self.model = _init_lenia_grid()
                 consumed = True
         self._both_held_prev = both_held
         return consumed
 
     def update(self, dt: float):
         self.time += dt
-        self.grid = _step_lenia(self.grid, self.mu, self.sigma,
-                                 self.dt, self.steps_per_frame)
-        if self.grid.sum() < 2.0:
+        self.model.step(self.mu, self.sigma, self.dt, self.steps_per_frame)
+        if self.model.grid.sum() < 2.0:
             self._dead_frames += 1
             if self._dead_frames > 3:
-                self.grid = _init_lenia_grid()
+                self.model = _init_lenia_grid()
                 self._dead_frames = 0
         else:
             self._dead_frames = 0
@@ -269,7 +213,7 @@ class LeniaLab(Visual):
             self.confirm_timer = max(0.0, self.confirm_timer - dt)
 
     def draw(self):
-        _draw_lenia(self.display, self.grid, self.palette_idx)
+        _draw_lenia(self.display, self.model, self.palette_idx)
 
         if self.param_overlay_timer > 0:
             alpha = min(1.0, self.param_overlay_timer / 0.5)
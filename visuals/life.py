@@ -7,13 +7,16 @@ Controls:
   Space     - Pause/Resume
   Left      - Step backward (when paused)
   Right     - Step forward (when paused)
-  Up        - Randomize (dense)
-  Down      - Randomize (sparse)
+  Up        - Randomize (dense) / Skip to stable (when paused)
+  Down      - Randomize (sparse) / Jump 4096 generations (when paused)
   Escape    - Exit
 """
 
-import random
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_rgb
+from .life_engine import BitLife, HashLife
 
 
 class Life(Visual):
@@ -25,83 +28,94 @@ class Life(Visual):
         'credit': 'John Conway, 1970',
     }
 
-    MAX_HISTORY = 100  # How many states to remember for rewinding
+    MAX_HISTORY = 1000  # Rewind steps (XOR deltas, a few hundred bytes each)
+    SKIP_CHUNK = 400    # Generations searched per frame while skipping
+    JUMP_GENS = 4096    # Down while paused
+    MAX_SKIP = 20000    # Give up looking for a cycle after this many
 
     def __init__(self, display: Display):
         super().__init__(display)
+        self.hashlife = HashLife()
 
     def reset(self):
         self.time = 0.0
         self.step_timer = 0.0
         self.step_interval = 0.1  # Time between generations
         self.paused = False
-        self.generation = 0
 
-        # Grid of cells (True = alive, False = dead)
-        self.grid = [[False] * GRID_SIZE for _ in range(GRID_SIZE)]
+        # Toroidal B3/S23, bit-packed; history is the engine's XOR ring
+        self.engine = BitLife(GRID_SIZE, GRID_SIZE, history=self.MAX_HISTORY)
 
-        # History for stepping backward
-        self.history = []
+        # Census: cycle period once a skip has found one
+        self.period = None
+        self._skip = None
 
         self._randomize(0.3)
 
+    @property
+    def grid(self):
+        return self.engine.grid
+
+    @property
+    def generation(self):
+        return self.engine.generation
+
     def _randomize(self, density):
         """Fill grid with random cells at given density."""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.grid[y][x] = random.random() < density
-        self.generation = 0
-        self.history = []  # Clear history on randomize
-
-    def _copy_grid(self):
-        """Return a copy of the current grid."""
-        return [row[:] for row in self.grid]
-
-    def _count_neighbors(self, x, y):
-        """Count live neighbors with edge wrapping."""
-        count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                # Wrap at edges
-                nx = (x + dx) % GRID_SIZE
-                ny = (y + dy) % GRID_SIZE
-                if self.grid[ny][nx]:
-                    count += 1
-        return count
+        # set_grid also clears history
+        self.engine.set_grid(np.random.random((GRID_SIZE, GRID_SIZE)) < density)
+        self.engine.generation = 0
+        self.period = None
+        self._skip = None
 
     def _step_forward(self):
         """Advance one generation."""
-        # Save current state to history
-        if len(self.history) >= self.MAX_HISTORY:
-            self.history.pop(0)
-        self.history.append(self._copy_grid())
-
-        new_grid = [[False] * GRID_SIZE for _ in range(GRID_SIZE)]
-
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                neighbors = self._count_neighbors(x, y)
-                alive = self.grid[y][x]
-
-                # Conway's rules:
-                # - Live cell with 2-3 neighbors survives
-                # - Dead cell with exactly 3 neighbors becomes alive
-                # - All other cells die or stay dead
-                if alive:
-                    new_grid[y][x] = neighbors in (2, 3)
-                else:
-                    new_grid[y][x] = neighbors == 3
-
-        self.grid = new_grid
-        self.generation += 1
+        # Conway's rules (B3/S23):
+        # - Live cell with 2-3 neighbors survives
+        # - Dead cell with exactly 3 neighbors becomes alive
+        # - All other cells die or stay dead
+        self.engine.step()
 
     def _step_backward(self):
-        """Go back one generation if history available."""
-        if self.history:
-            self.grid = self.history.pop()
-            self.generation = max(0, self.generation - 1)
+        """Go back one generation (or one skip/jump) if history available."""
+        if self.engine.step_back():
+            self.period = None
+
+    def _start_skip(self, target=None):
+        """Search for a cycle (target None) or run to a target generation,
+        a chunk per frame so the display keeps drawing."""
+        engine = self.engine
+        self._skip = {'from': engine.bits, 'gen': engine.generation,
+                      'target': target, 'seen': {}}
+
+    def _finish_skip(self):
+        skip = self._skip
+        self._skip = None
+        self.engine.record(skip['from'], self.engine.generation - skip['gen'])
+
+    def _run_skip(self):
+        skip = self._skip
+        engine = self.engine
+        if skip['target'] is not None:
+            n = min(self.SKIP_CHUNK, skip['target'] - engine.generation)
+            engine.step(n, record=False)
+            if engine.generation >= skip['target']:
+                self._finish_skip()
+            return
+        period = engine.find_cycle(self.SKIP_CHUNK, skip['seen'])
+        if period is not None:
+            self.period = period
+            self._finish_skip()
+        elif engine.generation - skip['gen'] >= self.MAX_SKIP:
+            self._finish_skip()
+
+    def _jump(self):
+        """Jump ahead JUMP_GENS generations."""
+        if self.period is not None:
+            # Settled ash: HashLife makes this a few cache lookups
+            self.engine.fast_forward(self.JUMP_GENS, self.hashlife)
+        else:
+            self._start_skip(self.engine.generation + self.JUMP_GENS)
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -112,16 +126,22 @@ class Life(Visual):
             consumed = True
 
         if input_state.up_pressed:
-            # Dense randomize
-            self._randomize(0.45)
+            if self.paused:
+                self._start_skip()
+            else:
+                # Dense randomize
+                self._randomize(0.45)
             consumed = True
 
         if input_state.down_pressed:
-            # Sparse randomize
-            self._randomize(0.15)
+            if self.paused:
+                self._jump()
+            else:
+                # Sparse randomize
+                self._randomize(0.15)
             consumed = True
 
-        if self.paused:
+        if self.paused and self._skip is None:
             if input_state.right:
                 self._step_forward()
                 consumed = True
@@ -134,20 +154,20 @@ class Life(Visual):
     def update(self, dt: float):
         self.time += dt
 
-        if not self.paused:
+        if self._skip is not None:
+            self._run_skip()
+        elif not self.paused:
             self.step_timer += dt
             if self.step_timer >= self.step_interval:
                 self.step_timer = 0
                 self._step_forward()
 
                 # Auto-randomize if population too low
-                population = sum(sum(row) for row in self.grid)
+                population = self.engine.population()
                 if population < 10:
                     self._randomize(0.3)
 
     def draw(self):
-        self.display.clear(Colors.BLACK)
-
         # Color based on time for visual interest
         hue = (self.time * 0.05) % 1.0
         h = hue * 6.0
@@ -167,11 +187,16 @@ class Life(Visual):
         else:
             color = (255, 0, int(255 * (1 - f)))
 
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x]:
-                    self.display.set_pixel(x, y, color)
+        frame = np.zeros((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        frame[self.grid] = color
+        blit_rgb(self.display, frame)
 
-        # Show pause indicator
+        # Show pause indicator and census
         if self.paused:
             self.display.draw_text_small(2, 2, "||", Colors.WHITE)
+            self.display.draw_text_small(2, 8, "G%d" % self.generation, Colors.GRAY)
+            self.display.draw_text_small(2, 14, "N%d" % self.engine.population(), Colors.GRAY)
+            if self._skip is not None:
+                self.display.draw_text_small(2, 20, "SKIP", Colors.WHITE)
+            elif self.period is not None:
+                self.display.draw_text_small(2, 20, "P%d" % self.period, Colors.GRAY)
@@ -9,7 +9,11 @@ STATES OF MATTER - Particle Simulation with Emergent Phases
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors
+from .spatial import CellList
 
 NUM_PARTICLES = 60
 WORK_W = 60  # leave 4px for temp bar on right
@@ -80,6 +84,9 @@ class MatterPhases(Visual):
         self.show_labels = True
         self.overlay_timer = 0.0
 
+        # Pair-force neighbor index over the (walled, non-wrapping) chamber
+        self.cells = CellList(R_CUT, WORK_W, WORK_H, wrap=False)
+
         # Build hexagonal lattice — roughly square block, centered
         self.particles = []  # [x, y, vx, vy]
         spacing = R_EQ
@@ -139,33 +146,23 @@ class MatterPhases(Visual):
         particles = self.particles
         n = len(particles)
         dt60 = dt * 60
-        cut2 = R_CUT * R_CUT
         _sqrt = math.sqrt
 
         # --- Pair forces: soft repulsion + attractive well ---
-        for i in range(n):
-            p = particles[i]
-            pxi, pyi = p[0], p[1]
-            for j in range(i + 1, n):
-                q = particles[j]
-                dx = pxi - q[0]
-                dy = pyi - q[1]
-                r2 = dx * dx + dy * dy
-                if r2 < 0.25:
-                    r2 = 0.25
-                if r2 < cut2:
-                    r = _sqrt(r2)
-                    if r < R_EQ:
-                        # Linear repulsion (pushes apart when too close)
-                        f = K_REP * (R_EQ - r) / r
-                    else:
-                        # Parabolic attractive well (pulls together)
-                        wp = (r - R_EQ) / R_RANGE
-                        f = -WELL * 4.0 * wp * (1.0 - wp) / r
-                    fx = f * dx * dt60
-                    fy = f * dy * dt60
-                    p[2] += fx;  p[3] += fy
-                    q[2] -= fx;  q[3] -= fy
+        xs = np.fromiter((p[0] for p in particles), float, n)
+        ys = np.fromiter((p[1] for p in particles), float, n)
+        i, _j, dx, dy, r2 = self.cells.rebuild(xs, ys).pairs(R_CUT)
+        r = np.sqrt(np.maximum(r2, 0.25))
+        wp = (r - R_EQ) / R_RANGE
+        # Linear repulsion inside R_EQ (pushes apart when too close),
+        # parabolic attractive well beyond it (pulls together)
+        f = np.where(r < R_EQ, K_REP * (R_EQ - r), -WELL * 4.0 * wp * (1.0 - wp)) / r
+        # dx/dy point from i to its neighbor; the force acts along i - j
+        fx = np.bincount(i, weights=-f * dx, minlength=n) * dt60
+        fy = np.bincount(i, weights=-f * dy, minlength=n) * dt60
+        for p, pfx, pfy in zip(particles, fx.tolist(), fy.tolist()):
+            p[2] += pfx
+            p[3] += pfy
 
         # --- Gravity, noise, damping, integration ---
         for p in particles:
@@ -0,0 +1,353 @@
+"""
+Maze Nav - Shared path finding for the maze demo AIs
+====================================================
+Shared by visuals/pacmandemo.py, mspacmandemo.py, qbertdemo.py,
+monstermazedemo.py, snakedemo.py, bombermandemo.py and dnddemo.py.
+
+MazeGraph
+    The walkable cells of a static maze as nodes 0..n-1, each with its
+    neighbours and the move that reaches them: a grid (optionally with
+    wrap-around tunnels) or any graph from a neighbour function.
+    precompute() runs a BFS from every node at once with numpy and
+    keeps an all-pairs distance table plus a next-hop table, so
+    distance() and step() are lookups. for_grid() caches graphs by maze
+    layout, so each maze is tabled once per process. Graphs are treated
+    as undirected.
+
+DistanceField
+    Distances to the nearest of a set of sources (pellets, ghosts) that
+    follow the set as it changes: add() relaxes outwards from the new
+    source only as far as it is the nearest, remove() clears the region
+    the old source owned and re-grows it from its border. step() walks
+    downhill to the nearest source.
+
+astar() / nearest_path()
+    Searches on a grid whose walkable cells change every move (bombs,
+    bricks, a snake's body) or that is too big to table: A* to one cell
+    with the Manhattan heuristic, and BFS to the nearest cell passing a
+    test. Both return the path without the start.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+FAR = 30000                    # distance of an unreachable node (fits int16)
+MAX_TABLE_NODES = 1500         # bigger graphs skip the all-pairs table
+STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+_grid_graphs = {}
+_GRID_CACHE = 16               # layouts kept by for_grid()
+
+
+class MazeGraph:
+    """Static maze graph with all-pairs distance and next-hop tables."""
+
+    def __init__(self, cells, neighbours):
+        """cells: hashable cell ids; neighbours(cell): (cell, move) pairs."""
+        self.cells = list(cells)
+        self.index = {c: i for i, c in enumerate(self.cells)}
+        index = self.index
+        self.links = [tuple((index[c], move) for c, move in neighbours(cell) if c in index)
+                      for cell in self.cells]
+        self.dist = None
+        self.hop = None
+
+    @classmethod
+    def from_grid(cls, width, height, passable, wrap=False):
+        """Cells (x, y) where passable(x, y); moves are (dx, dy). With
+        wrap, the left and right edges connect where both are open."""
+        cells = [(x, y) for y in range(height) for x in range(width) if passable(x, y)]
+
+        def neighbours(cell):
+            x, y = cell
+            for dx, dy in STEPS:
+                nx = x + dx
+                if wrap:
+                    nx %= width
+                yield (nx, y + dy), (dx, dy)
+
+        return cls(cells, neighbours)
+
+    @classmethod
+    def for_grid(cls, grid, passable, wrap=False):
+        """The tabled graph of grid[y][x] rows, where passable(tile) says
+        which tiles are open; cached by the layout of open tiles."""
+        key = (wrap,) + tuple(tuple(passable(t) for t in row) for row in grid)
+        graph = _grid_graphs.get(key)
+        if graph is None:
+            if len(_grid_graphs) >= _GRID_CACHE:
+                _grid_graphs.clear()
+            open_ = key[1:]
+            graph = cls.from_grid(len(grid[0]), len(grid), lambda x, y: open_[y][x], wrap)
+            graph.precompute()
+            _grid_graphs[key] = graph
+        return graph
+
+    def neighbour_array(self):
+        """(n, k) neighbour node indices, padded with n."""
+        n = len(self.cells)
+        k = max((len(links) for links in self.links), default=0)
+        nb = np.full((n, max(k, 1)), n, dtype=np.intp)
+        for i, links in enumerate(self.links):
+            nb[i, :len(links)] = [j for j, _ in links]
+        return nb
+
+    def precompute(self):
+        """Fill the all-pairs distance and next-hop tables."""
+        n = len(self.cells)
+        if not n or n > MAX_TABLE_NODES:
+            return
+        nb = self.neighbour_array()
+        dist = np.full((n, n), FAR, dtype=np.int16)
+        reached = np.eye(n, dtype=bool)
+        dist[reached] = 0
+        frontier = np.zeros((n, n + 1), dtype=bool)
+        frontier[:, :n] = reached
+        d = 0
+        # Row s is a BFS from s; every row advances one ring per pass
+        while True:
+            d += 1
+            new = frontier[:, nb].any(axis=2) & ~reached
+            if not new.any():
+                break
+            dist[new] = d
+            reached |= new
+            frontier[:, :n] = new
+        # Next hop from a towards b: the neighbour of a nearest to b
+        padded = np.vstack([dist, np.full((1, n), FAR, dtype=np.int16)])
+        best = padded[nb].argmin(axis=1)                     # (n, n)
+        hop = nb[np.arange(n)[:, None], best]
+        hop[(dist >= FAR) | np.eye(n, dtype=bool)] = -1
+        self.dist = dist
+        self.hop = hop
+
+    def field(self, target):
+        """BFS distances from every node to target's node (a list)."""
+        n = len(self.cells)
+        dist = [FAR] * n
+        start = self.index.get(target)
+        if start is None:
+            return dist
+        dist[start] = 0
+        queue = deque([start])
+        links = self.links
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for j, _ in links[i]:
+                if dist[j] > d:
+                    dist[j] = d
+                    queue.append(j)
+        return dist
+
+    def distance(self, a, b):
+        """Path length from cell a to cell b, FAR if there is none."""
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None:
+            return FAR
+        if self.dist is not None:
+            return int(self.dist[i, j])
+        return self.field(b)[i]
+
+    def step(self, a, b):
+        """(next cell, move) on a shortest path from a to b, or None when
+        a is b or b can't be reached."""
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None or i == j:
+            return None
+        if self.hop is not None:
+            k = int(self.hop[i, j])
+        else:
+            field = self.field(b)
+            k = min((n for n, _ in self.links[i]), key=field.__getitem__, default=-1)
+            if k < 0 or field[k] >= FAR:
+                k = -1
+        if k < 0:
+            return None
+        return self.cells[k], self.move(i, k)
+
+    def neighbours(self, cell):
+        """(cell, move) for each node next to cell."""
+        i = self.index.get(cell)
+        if i is None:
+            return []
+        return [(self.cells[j], move) for j, move in self.links[i]]
+
+    def move(self, i, k):
+        for j, move in self.links[i]:
+            if j == k:
+                return move
+        return None
+
+
+class DistanceField:
+    """Distance from every node of a MazeGraph to its nearest source."""
+
+    def __init__(self, graph, sources=()):
+        self.graph = graph
+        self.reset(sources)
+
+    def reset(self, sources=()):
+        """Multi-source BFS from scratch."""
+        n = len(self.graph.cells)
+        self.dist = [FAR] * n
+        self.owner = [-1] * n
+        self.sources = set()
+        index = self.graph.index
+        queue = deque()
+        for cell in sources:
+            i = index.get(cell)
+            if i is not None and i not in self.sources:
+                self.sources.add(i)
+                self.dist[i] = 0
+                self.owner[i] = i
+                queue.append(i)
+        self._grow(queue)
+
+    def _grow(self, queue):
+        dist, owner, links = self.dist, self.owner, self.graph.links
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for j, _ in links[i]:
+                if dist[j] > d:
+                    dist[j] = d
+                    owner[j] = owner[i]
+                    queue.append(j)
+
+    def add(self, cell):
+        i = self.graph.index.get(cell)
+        if i is None or i in self.sources:
+            return
+        self.sources.add(i)
+        self.dist[i] = 0
+        self.owner[i] = i
+        self._grow(deque([i]))
+
+    def remove(self, cell):
+        i = self.graph.index.get(cell)
+        if i is None or i not in self.sources:
+            return
+        self.sources.discard(i)
+        dist, owner, links = self.dist, self.owner, self.graph.links
+        # The nodes i was nearest to form a tree around it
+        region = [i]
+        owner[i] = -1
+        for k in region:
+            for j, _ in links[k]:
+                if owner[j] == i:
+                    owner[j] = -1
+                    region.append(j)
+        for k in region:
+            dist[k] = FAR
+        # Re-grow from the nodes bordering the region, nearest first
+        heap = []
+        for k in region:
+            for j, _ in links[k]:
+                if dist[j] < FAR:
+                    heap.append((dist[j], j))
+        heapq.heapify(heap)
+        while heap:
+            d, k = heapq.heappop(heap)
+            if d > dist[k]:
+                continue
+            for j, _ in links[k]:
+                if dist[j] > d + 1:
+                    dist[j] = d + 1
+                    owner[j] = owner[k]
+                    heapq.heappush(heap, (d + 1, j))
+
+    def update(self, cells):
+        """Make the sources exactly cells, adding and removing the
+        difference."""
+        index = self.graph.index
+        wanted = {index[c] for c in cells if c in index}
+        cells_of = self.graph.cells
+        for i in self.sources - wanted:
+            self.remove(cells_of[i])
+        for i in wanted - self.sources:
+            self.add(cells_of[i])
+
+    def __getitem__(self, cell):
+        i = self.graph.index.get(cell)
+        return FAR if i is None else self.dist[i]
+
+    def nearest(self, cell):
+        """The source nearest to cell, or None."""
+        i = self.graph.index.get(cell)
+        if i is None or self.owner[i] < 0:
+            return None
+        return self.graph.cells[self.owner[i]]
+
+    def step(self, cell):
+        """(next cell, move) towards the nearest source, or None at a
+        source or with none reachable."""
+        i = self.graph.index.get(cell)
+        if i is None or self.dist[i] in (0, FAR):
+            return None
+        j, move = min(self.graph.links[i], key=lambda link: self.dist[link[0]])
+        return self.graph.cells[j], move
+
+
+def _path(parent, cell):
+    path = []
+    while parent[cell] is not None:
+        path.append(cell)
+        cell = parent[cell]
+    path.reverse()
+    return path
+
+
+def astar(start, goal, passable, wrap_width=None):
+    """Shortest 4-connected path of cells from start to goal (start not
+    included) through cells where passable(x, y), or None. goal itself
+    must be passable. With wrap_width, x wraps around."""
+    if start == goal:
+        return []
+    gx, gy = goal
+    parent = {start: None}
+    cost = {start: 0}
+    heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+    while heap:
+        _, g, cell = heapq.heappop(heap)
+        if cell == goal:
+            return _path(parent, cell)
+        if g > cost[cell]:
+            continue
+        x, y = cell
+        for dx, dy in STEPS:
+            nx, ny = x + dx, y + dy
+            if wrap_width:
+                nx %= wrap_width
+            nxt = (nx, ny)
+            if g + 1 < cost.get(nxt, FAR) and passable(nx, ny):
+                cost[nxt] = g + 1
+                parent[nxt] = cell
+                h = abs(nx - gx) + abs(ny - gy)
+                if wrap_width:
+                    h = min(h, wrap_width - abs(nx - gx) + abs(ny - gy))
+                heapq.heappush(heap, (g + 1 + h, g + 1, nxt))
+    return None
+
+
+def nearest_path(start, is_goal, passable, wrap_width=None):
+    """BFS path from start to the nearest other cell where is_goal(x, y),
+    through cells where passable(x, y); None if there is none."""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell != start and is_goal(*cell):
+            return _path(parent, cell)
+        x, y = cell
+        for dx, dy in STEPS:
+            nx, ny = x + dx, y + dy
+            if wrap_width:
+                nx %= wrap_width
+            nxt = (nx, ny)
+            if nxt not in parent and passable(nx, ny):
+                parent[nxt] = cell
+                queue.append(nxt)
+    return None
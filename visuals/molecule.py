@@ -12,7 +12,11 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .render3d import ZBuffer, ball_sprites, project, rot_x, rot_y, rot_z, transform
 
 
 # CPK atom colors (LED-bright versions)
@@ -5298,6 +5302,19 @@ class Molecule(Visual):
         mol = MOLECULES[self._current_mol_index()]
         atoms = mol['atoms']
 
+        # Vertex arrays for the renderer
+        self._coords = np.array([a[1:] for a in atoms], dtype=np.float64).reshape(-1, 3)
+        self._radii = np.array([CPK_RADIUS.get(a[0], 3) for a in atoms], dtype=np.int64)
+        self._colors = np.array([CPK_COLORS.get(a[0], (200, 200, 200)) for a in atoms],
+                                dtype=np.uint8).reshape(-1, 3)
+        self._bonds = np.array(mol['bonds'], dtype=np.int64).reshape(-1, 3)
+        self._bond_colors = np.array([BOND_COLORS.get(o, BOND_COLORS[1])
+                                      for o in self._bonds[:, 2].tolist()],
+                                     dtype=np.uint8).reshape(-1, 3)
+        # Pre-shaded atom stamps, normal and large-model radius
+        self._sprites = ball_sprites(self._radii, self._colors)
+        self._large_sprites = ball_sprites(np.maximum(self._radii - 1, 1), self._colors)
+
         if len(atoms) == 0:
             self.scale = 1.0
             self.offset = (0, 0, 0)
@@ -5414,70 +5431,25 @@ class Molecule(Visual):
                     self.mol_pos = (self.mol_pos + 1) % len(mol_list)
                 self._prepare_molecule()
 
-    def _transform_point(self, x, y, z):
-        """Apply rotation and project to screen coords."""
-        x -= self.offset[0]
-        y -= self.offset[1]
-        z -= self.offset[2]
-        x *= self.scale
-        y *= self.scale
-        z *= self.scale
-
-        # Auto-rotation around Z axis (constant tumble)
-        cos_z, sin_z = math.cos(self.rotation_z), math.sin(self.rotation_z)
-        x1 = x * cos_z - y * sin_z
-        y1 = x * sin_z + y * cos_z
-
-        # Manual tilt (rotation around X axis) - controlled by up/down
-        cos_t, sin_t = math.cos(self.tilt_x), math.sin(self.tilt_x)
-        y2 = y1 * cos_t - z * sin_t
-        z2 = y1 * sin_t + z * cos_t
-
-        # Manual rotation around Y axis - controlled by left/right
-        cos_r, sin_r = math.cos(self.rotation_y), math.sin(self.rotation_y)
-        x2 = x1 * cos_r + z2 * sin_r
-        z3 = -x1 * sin_r + z2 * cos_r
-
-        screen_x = GRID_SIZE // 2 + x2
-        screen_y = 28 - y2
-        return screen_x, screen_y, z3
+    def _transform(self, points):
+        """Rotate (N, 3) atom positions and project to screen: (sx, sy, z)."""
+        # Auto-rotation around Z (constant tumble), then the manual tilt
+        # around X (up/down) and rotation around Y (left/right)
+        m = rot_y(self.rotation_y) @ rot_x(self.tilt_x) @ rot_z(self.rotation_z)
+        cam = transform(points, m, self.offset, self.scale)
+        return project(cam, GRID_SIZE // 2, 28)
 
     def draw(self):
-        self.display.clear(Colors.BLACK)
-
         mol = MOLECULES[self._current_mol_index()]
-        atoms = mol['atoms']
-        bonds = mol['bonds']
 
-        transformed = []
-        for elem, ax, ay, az in atoms:
-            sx, sy, sz = self._transform_point(ax, ay, az)
-            transformed.append((elem, sx, sy, sz))
-
-        draw_list = []
-
-        for a_idx, b_idx, order in bonds:
-            e1, x1, y1, z1 = transformed[a_idx]
-            e2, x2, y2, z2 = transformed[b_idx]
-            avg_z = (z1 + z2) / 2
-            draw_list.append(('bond', avg_z, x1, y1, x2, y2, order))
-
-        for i, (elem, sx, sy, sz) in enumerate(transformed):
-            r = CPK_RADIUS.get(elem, 3)
-            if self.large:
-                r = max(1, r - 1)
-            color = CPK_COLORS.get(elem, (200, 200, 200))
-            draw_list.append(('atom', sz, sx, sy, r, color, elem))
-
-        draw_list.sort(key=lambda item: item[1])
-
-        for item in draw_list:
-            if item[0] == 'bond':
-                _, _, x1, y1, x2, y2, order = item
-                self._draw_bond(x1, y1, x2, y2, order)
-            else:
-                _, _, sx, sy, r, color, elem = item
-                self._draw_atom(sx, sy, r, color)
+        zb = ZBuffer(Colors.BLACK)
+        if len(self._coords):
+            sx, sy, sz = self._transform(self._coords)
+            a, b = self._bonds[:, 0], self._bonds[:, 1]
+            zb.lines(sx[a], sy[a], sz[a], sx[b], sy[b], sz[b], self._bond_colors)
+            sheet, which = self._large_sprites if self.large else self._sprites
+            zb.sprites(sheet, which, sx, sy, sz)
+        zb.blit(self.display)
 
         # Bottom label: common name first 4s, then color-coded formula for 4s, repeat
         if int(self.label_timer / 4) % 2 == 0:
@@ -5521,33 +5493,3 @@ class Molecule(Visual):
             color = CPK_COLORS.get(elem, (200, 200, 200)) if elem else Colors.WHITE
             self.display.draw_text_small(cursor, y, text, color)
             cursor += len(text) * 4
-
-    def _draw_atom(self, cx, cy, r, color):
-        """Draw a filled circle for an atom with simple shading."""
-        icx = int(round(cx))
-        icy = int(round(cy))
-
-        for dy in range(-r, r + 1):
-            for dx in range(-r, r + 1):
-                if dx * dx + dy * dy <= r * r:
-                    # Simple highlight shading
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    if dist < r * 0.4:
-                        # Highlight center
-                        t = dist / (r * 0.4)
-                        shade = 1.0 + (1.0 - t) * 0.4
-                    else:
-                        shade = 1.0 - (dist / r) * 0.3
-                    c = (
-                        min(255, int(color[0] * shade)),
-                        min(255, int(color[1] * shade)),
-                        min(255, int(color[2] * shade)),
-                    )
-                    self.display.set_pixel(icx + dx, icy + dy, c)
-
-    def _draw_bond(self, x1, y1, x2, y2, order):
-        """Draw a bond line. Brightness indicates bond order."""
-        ix1, iy1 = int(round(x1)), int(round(y1))
-        ix2, iy2 = int(round(x2)), int(round(y2))
-        color = BOND_COLORS.get(order, BOND_COLORS[1])
-        self.display.draw_line(ix1, iy1, ix2, iy2, color)
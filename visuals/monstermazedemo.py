@@ -1,18 +1,19 @@
 """
 3D Monster Maze Demo - AI Attract Mode
 ========================================
-AI navigates the maze using BFS to find the exit while fleeing the Rex.
+AI navigates the maze to the exit while fleeing the Rex, reading
+distances and next steps from precomputed maze tables.
 Auto-restarts on game over.
 """
 
-from collections import deque
 from . import Visual, Display, Colors, GRID_SIZE
+from .maze_nav import MazeGraph
 from arcade import InputState, GameState
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from games.monstermaze import MonsterMaze, MAZE_SIZE, DX, DY, RexState
+from games.monstermaze import MonsterMaze, DX, DY, RexState
 
 
 class MonsterMazeDemo(Visual):
@@ -77,6 +78,7 @@ class MonsterMazeDemo(Visual):
         if g.phase != 'playing':
             return inp
 
+        graph = MazeGraph.for_grid(g.walls, lambda wall: not wall)
         px, py = g.px, g.py
         facing = g.facing
 
@@ -85,20 +87,18 @@ class MonsterMazeDemo(Visual):
 
         # If Rex is close and in pursuit, flee
         if g.rex_state in (RexState.SEEN, RexState.BEHIND):
-            rex_dist = _bfs_dist(g.walls, px, py, g.rex_x, g.rex_y)
-            if rex_dist != -1 and rex_dist <= 3:
-                flee_target = self._flee_target(g)
+            if graph.distance((px, py), (g.rex_x, g.rex_y)) <= 3:
+                flee_target = self._flee_target(g, graph)
                 if flee_target:
                     target_x, target_y = flee_target
 
-        # BFS next step toward target
-        nxt = _bfs_next(g.walls, px, py, target_x, target_y)
-        if nxt is None:
+        # Next step toward target
+        step = graph.step((px, py), (target_x, target_y))
+        if step is None:
             return inp
 
-        nx, ny = nxt
         # Determine required facing
-        ddx, ddy = nx - px, ny - py
+        ddx, ddy = step[1]
         needed_facing = -1
         for d in range(4):
             if DX[d] == ddx and DY[d] == ddy:
@@ -120,67 +120,18 @@ class MonsterMazeDemo(Visual):
 
         return inp
 
-    def _flee_target(self, g):
-        """Find an open cell far from Rex to flee toward."""
-        best = None
-        best_dist = -1
-        for y in range(MAZE_SIZE):
-            for x in range(MAZE_SIZE):
-                if g.walls[y][x]:
-                    continue
-                rd = abs(x - g.rex_x) + abs(y - g.rex_y)
-                pd = abs(x - g.px) + abs(y - g.py)
-                score = rd - pd
-                if score > best_dist:
-                    best_dist = score
-                    best = (x, y)
-        return best
+    def _flee_target(self, g, graph):
+        """Find an open cell far from Rex (and near us) to flee toward."""
+        rex = graph.index.get((g.rex_x, g.rex_y))
+        me = graph.index.get((g.px, g.py))
+        if rex is None or me is None:
+            return None
+        # By path length, both whole table rows at once
+        score = graph.dist[rex].astype(int) - graph.dist[me]
+        best = int(score.argmax())
+        return graph.cells[best] if score[best] > 0 else None
 
 
 # Status bar y for "DEMO" overlay
 STATUS_Y = 44
 
-
-def _bfs_dist(walls, sx, sy, tx, ty):
-    if walls[sy][sx] or walls[ty][tx]:
-        return -1
-    if sx == tx and sy == ty:
-        return 0
-    visited = set()
-    visited.add((sx, sy))
-    q = deque([(sx, sy, 0)])
-    while q:
-        cx, cy, d = q.popleft()
-        for i in range(4):
-            nx, ny = cx + DX[i], cy + DY[i]
-            if 0 <= nx < MAZE_SIZE and 0 <= ny < MAZE_SIZE and not walls[ny][nx] and (nx, ny) not in visited:
-                if nx == tx and ny == ty:
-                    return d + 1
-                visited.add((nx, ny))
-                q.append((nx, ny, d + 1))
-    return -1
-
-
-def _bfs_next(walls, sx, sy, tx, ty):
-    if sx == tx and sy == ty:
-        return None
-    if walls[sy][sx] or walls[ty][tx]:
-        return None
-    visited = set()
-    visited.add((sx, sy))
-    parent = {}
-    q = deque([(sx, sy)])
-    while q:
-        cx, cy = q.popleft()
-        for i in range(4):
-            nx, ny = cx + DX[i], cy + DY[i]
-            if 0 <= nx < MAZE_SIZE and 0 <= ny < MAZE_SIZE and not walls[ny][nx] and (nx, ny) not in visited:
-                visited.add((nx, ny))
-                parent[(nx, ny)] = (cx, cy)
-                if nx == tx and ny == ty:
-                    cur = (tx, ty)
-                    while parent[cur] != (sx, sy):
-                        cur = parent[cur]
-                    return cur
-                q.append((nx, ny))
-    return None
@@ -0,0 +1,322 @@
+"""
+NBody - Vectorized gravity and inverse-square field core
+=========================================================
+Shared by orbits.py (SOLAR SYSTEM, 3 BODY PROBLEM and its 800-star
+cluster) and emfield.py.
+
+NBodySystem keeps its bodies in a ParticleStore (x, y, vx, vy, color
+plus mass, radius, ax, ay) and advances them with kick-drift-kick
+leapfrog: symplectic, so orbits hold their energy over thousands of
+steps instead of slowly spiralling, and one force evaluation per
+sub-step.
+
+Forces come from one of two evaluators:
+
+direct_accel() - every pair at once through (n, n) broadcasting. Exact,
+    and the faster choice up to a few hundred bodies.
+barnes_hut_accel() - a quadtree of center-of-mass cells, walked level by
+    level for all bodies together: a cell small enough for its distance
+    (size / distance < theta) counts as one point mass; other cells are
+    opened into their children, or summed body by body once they hold
+    only a few. O(n log n).
+
+sweep_pairs() finds close pairs by sorting along x and sweeping a
+window, and NBodySystem.merge() folds each touching group into one body,
+conserving mass and momentum.
+
+field_at() / potential_at() evaluate a softened inverse-square field
+from point sources (masses or charges) at any number of sample points;
+direct_accel() is field_at() with the bodies as both.
+"""
+
+import math
+
+import numpy as np
+
+from .particles import ParticleStore
+
+# Above this many bodies NBodySystem switches to Barnes-Hut
+BARNES_HUT_MIN = 512
+
+# Quadtree levels below the root (finest cell = root / 2**_BH_DEPTH)
+_BH_DEPTH = 12
+
+
+# ── Fields ────────────────────────────────────────────────────────
+
+def field_at(px, py, sx, sy, strength, softening2):
+    """Softened inverse-square field at points (px, py) from sources at
+    (sx, sy): sum of strength * r / (|r|^2 + softening2)^1.5, with r
+    pointing from source to point. Returns (ex, ey)."""
+    dx = np.subtract.outer(px, sx)
+    dy = np.subtract.outer(py, sy)
+    w = dx * dx
+    w += dy * dy
+    w += softening2
+    w *= np.sqrt(w)
+    np.divide(strength, w, out=w)
+    return np.einsum('ij,ij->i', w, dx), np.einsum('ij,ij->i', w, dy)
+
+
+def potential_at(px, py, sx, sy, strength, softening2):
+    """Softened potential sum of strength / sqrt(|r|^2 + softening2)."""
+    dx = np.subtract.outer(px, sx)
+    dy = np.subtract.outer(py, sy)
+    d2 = dx * dx
+    d2 += dy * dy
+    d2 += softening2
+    return (strength / np.sqrt(d2)).sum(axis=1)
+
+
+def direct_accel(x, y, mass, g, softening2):
+    """Gravitational acceleration of every body from every other."""
+    return field_at(x, y, x, y, -g * mass, softening2)
+
+
+# ── Barnes-Hut ────────────────────────────────────────────────────
+
+def _spread_bits(v):
+    """Insert a zero bit after each of the low 16 bits (Morton order)."""
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    return (v | (v << 1)) & 0x55555555
+
+
+def _point_masses(ax, ay, bodies, px, py, m, cx, cy, g, softening2):
+    """Accumulate the pull of point masses m at (cx, cy) on bodies at
+    (px, py) into ax/ay[bodies]."""
+    dx = cx - px
+    dy = cy - py
+    w = dx * dx + dy * dy + softening2
+    w *= np.sqrt(w)
+    w = g * m / w
+    n = len(ax)
+    ax += np.bincount(bodies, weights=w * dx, minlength=n)
+    ay += np.bincount(bodies, weights=w * dy, minlength=n)
+
+
+def barnes_hut_accel(x, y, mass, g, softening2, theta=0.6, leaf_size=16):
+    """Barnes-Hut approximation of direct_accel(). theta is the opening
+    angle (0 is exact); an opened cell of at most leaf_size bodies is
+    summed body by body instead of being split further."""
+    n = len(x)
+    ax = np.zeros(n)
+    ay = np.zeros(n)
+    if n < 2:
+        return ax, ay
+
+    # Square root cell, quantized into 4**_BH_DEPTH finest cells
+    x0, y0 = x.min(), y.min()
+    size = max(x.max() - x0, y.max() - y0, 1e-9) * (1.0 + 1e-9)
+    q = 1 << _BH_DEPTH
+    ix = np.minimum(((x - x0) * (q / size)).astype(np.int64), q - 1)
+    iy = np.minimum(((y - y0) * (q / size)).astype(np.int64), q - 1)
+    code = _spread_bits(ix) | (_spread_bits(iy) << 1)
+    order = np.argsort(code, kind='stable')
+    code = code[order]
+    sm = mass[order]
+    smx = sm * x[order]
+    smy = sm * y[order]
+
+    def level_cells(level):
+        """Sorted cell keys, first body, count, mass and center of mass."""
+        keys = code >> (2 * (_BH_DEPTH - level))
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        m = np.add.reduceat(sm, starts)
+        safe = np.where(m > 0, m, 1.0)
+        return (keys[starts], starts, np.diff(np.r_[starts, n]), m,
+                np.add.reduceat(smx, starts) / safe,
+                np.add.reduceat(smy, starts) / safe)
+
+    # Walk all (body, cell) interactions down the tree together
+    pb = np.arange(n)
+    pc = np.zeros(n, dtype=np.intp)
+    cells = level_cells(0)
+    theta2 = theta * theta
+    for level in range(_BH_DEPTH + 1):
+        keys, starts, counts, m, cx, cy = cells
+        bx, by = x[pb], y[pb]
+        dx = cx[pc] - bx
+        dy = cy[pc] - by
+        side = size / (1 << level)
+        accept = side * side < theta2 * (dx * dx + dy * dy)
+        _point_masses(ax, ay, pb[accept], bx[accept], by[accept], m[pc[accept]],
+                      cx[pc[accept]], cy[pc[accept]], g, softening2)
+
+        # Small (or finest) cells: sum their bodies one by one (a body's
+        # own term is zero)
+        cnt = counts[pc]
+        small = ~accept & ((cnt <= leaf_size) | (level == _BH_DEPTH))
+        if small.any():
+            sb, sc, scnt = pb[small], pc[small], cnt[small]
+            pair = np.repeat(np.arange(len(sb)), scnt)
+            offset = np.arange(len(pair)) - np.repeat(np.cumsum(scnt) - scnt, scnt)
+            other = order[starts[sc][pair] + offset]
+            body = sb[pair]
+            _point_masses(ax, ay, body, x[body], y[body], mass[other],
+                          x[other], y[other], g, softening2)
+
+        # The rest: replace each cell by its non-empty children
+        opened = ~(accept | small)
+        if not opened.any():
+            break
+        pb, pc = pb[opened], pc[opened]
+        cells = level_cells(level + 1)
+        child_keys = cells[0]
+        cand = (keys[pc][:, np.newaxis] * 4 + np.arange(4)).ravel()
+        pos = np.minimum(np.searchsorted(child_keys, cand), len(child_keys) - 1)
+        exists = child_keys[pos] == cand
+        pb = np.repeat(pb, 4)[exists]
+        pc = pos[exists]
+    return ax, ay
+
+
+# ── Close pairs ───────────────────────────────────────────────────
+
+def sweep_pairs(x, y, reach):
+    """All index pairs (i, j), i < j, closer than reach, by sort and
+    sweep along x. Returns (i, j, dist2)."""
+    n = len(x)
+    order = np.argsort(x, kind='stable')
+    sx = x[order]
+    found_i, found_j = [], []
+    for k in range(1, n):
+        near = sx[k:] - sx[:-k] < reach
+        if not near.any():
+            break
+        found_i.append(order[:-k][near])
+        found_j.append(order[k:][near])
+    if not found_i:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros(0)
+    i = np.concatenate(found_i)
+    j = np.concatenate(found_j)
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    d2 = (x[j] - x[i]) ** 2 + (y[j] - y[i]) ** 2
+    close = d2 < reach * reach
+    return i[close], j[close], d2[close]
+
+
+def _group_labels(n, i, j):
+    """Connected components of the pairs graph, labeled by their lowest
+    member index."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[i], labels[j])
+        before = labels.copy()
+        np.minimum.at(labels, i, low)
+        np.minimum.at(labels, j, low)
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+
+# ── System ────────────────────────────────────────────────────────
+
+class NBodySystem:
+    """Self-gravitating bodies with leapfrog integration.
+
+    bodies is a ParticleStore with extra fields mass, radius, ax, ay;
+    radius follows mass as max(1, int(sqrt(mass) * radius_scale)).
+    """
+
+    def __init__(self, g, softening2, theta=0.6, radius_scale=0.8,
+                 barnes_hut_min=BARNES_HUT_MIN, capacity=16):
+        self.g = g
+        self.softening2 = softening2
+        self.theta = theta
+        self.radius_scale = radius_scale
+        self.barnes_hut_min = barnes_hut_min
+        self.bodies = ParticleStore(capacity, extra=('mass', 'radius', 'ax', 'ay'))
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def radius_for(self, mass):
+        return np.maximum(1, (np.sqrt(mass) * self.radius_scale).astype(np.int64))
+
+    def add(self, x, y, vx, vy, mass, color=0):
+        """Add bodies (scalars or equal-length arrays)."""
+        mass = np.asarray(mass, dtype=np.float64)
+        count = max(np.size(x), np.size(mass))
+        return self.bodies.spawn(count, x=x, y=y, vx=vx, vy=vy, mass=mass,
+                                 color=color, radius=self.radius_for(mass))
+
+    def clear(self):
+        self.bodies.clear()
+
+    def accelerations(self):
+        """Fill bodies.ax / bodies.ay for the current positions and
+        return them."""
+        b = self.bodies
+        if len(b) >= self.barnes_hut_min:
+            ax, ay = barnes_hut_accel(b.x, b.y, b.mass, self.g,
+                                      self.softening2, self.theta)
+        else:
+            ax, ay = direct_accel(b.x, b.y, b.mass, self.g, self.softening2)
+        b.ax = ax
+        b.ay = ay
+        return ax, ay
+
+    def step(self, h, substeps=1):
+        """Kick-drift-kick leapfrog: `substeps` steps of size h."""
+        b = self.bodies
+        if not len(b):
+            return
+        # Views write through to the store
+        x, y, vx, vy = b.x, b.y, b.vx, b.vy
+        half = 0.5 * h
+        ax, ay = self.accelerations()
+        for _ in range(substeps):
+            vx += half * ax
+            vy += half * ay
+            x += h * vx
+            y += h * vy
+            ax, ay = self.accelerations()
+            vx += half * ax
+            vy += half * ay
+
+    def energy(self):
+        """Total kinetic plus (softened) potential energy."""
+        b = self.bodies
+        kinetic = 0.5 * float((b.mass * (b.vx ** 2 + b.vy ** 2)).sum())
+        pot = potential_at(b.x, b.y, b.x, b.y, b.mass, self.softening2)
+        # Drop each body's softened self-term
+        pot -= b.mass / math.sqrt(self.softening2)
+        return kinetic - 0.5 * self.g * float((b.mass * pot).sum())
+
+    def touching(self, min_dist, overlap=0.8):
+        """Pairs (i, j) closer than max(min_dist, (ri + rj) * overlap)."""
+        b = self.bodies
+        if len(b) < 2:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        reach = max(min_dist, 2.0 * float(b.radius.max()) * overlap)
+        i, j, d2 = sweep_pairs(b.x, b.y, reach)
+        limit = np.maximum(min_dist, (b.radius[i] + b.radius[j]) * overlap)
+        hit = d2 < limit * limit
+        return i[hit], j[hit]
+
+    def merge(self, i, j):
+        """Merge every group of bodies linked by the pairs (i, j) into its
+        lowest-index member, conserving mass, momentum and center of
+        mass. Returns the keep mask (for compacting parallel arrays), or
+        None when nothing merged."""
+        if not len(i):
+            return None
+        b = self.bodies
+        n = len(b)
+        label = _group_labels(n, i, j)
+        m = b.mass
+        total = np.bincount(label, weights=m, minlength=n)
+        keep = label == np.arange(n)
+        tm = total[keep]
+        for name in ('x', 'y', 'vx', 'vy'):
+            vals = getattr(b, name)
+            weighted = np.bincount(label, weights=vals * m, minlength=n)
+            vals[keep] = weighted[keep] / tm
+        b.mass[keep] = tm
+        b.radius[keep] = self.radius_for(tm)
+        b.kill(~keep)
+        return keep
@@ -2,12 +2,14 @@
 Orbits - N-Body Gravity Simulation
 ====================================
 Bodies orbit, slingshot, and merge under Newtonian gravity.
-Velocity Verlet integration with softened potential prevents
-singularities. Trails fade behind each body.
+Leapfrog integration with softened potential prevents
+singularities. Trails fade behind each body. The physics lives in
+nbody.py.
 
 Two standalone visuals:
   Solar System   - Sun + planets in near-circular orbits
-  N-Body         - Equal-mass bodies in gravitational dance
+  3 Body Problem - Equal-mass bodies in gravitational dance, or a
+                   cluster of 800 (Barnes-Hut gravity)
 
 Controls:
   Up/Down    - Cycle color palette
@@ -17,7 +19,13 @@ Controls:
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, palette_array
+from .nbody import BARNES_HUT_MIN, NBodySystem
+from .particles import ParticleStore
 
 # Softening length squared (prevents 1/r^2 singularity)
 SOFTENING2 = 4.0
@@ -25,9 +33,6 @@ SOFTENING2 = 4.0
 # Gravitational constant (tuned for display)
 G_CONST = 800.0
 
-# Merge distance squared
-MERGE_DIST2 = 9.0
-
 PALETTES = [
     # Solar: yellow sun, rocky to icy
     [(255, 220, 50), (200, 100, 50), (150, 150, 180), (80, 160, 255), (100, 200, 100), (220, 180, 120)],
@@ -44,122 +49,61 @@ PALETTES = [
 
 # ── Shared physics ────────────────────────────────────────────────
 
-class Body:
-    __slots__ = ('x', 'y', 'vx', 'vy', 'ax', 'ay', 'mass', 'radius', 'trail', 'color_idx')
-
-    def __init__(self, x, y, vx, vy, mass, color_idx=0):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.ax = 0.0
-        self.ay = 0.0
-        self.mass = mass
-        self.radius = max(1, int(math.sqrt(mass) * 0.8))
-        self.trail = []
-        self.color_idx = color_idx
-
-
-def _compute_accelerations(bodies, softening2=SOFTENING2):
-    n = len(bodies)
-    for b in bodies:
-        b.ax = 0.0
-        b.ay = 0.0
-    for i in range(n):
-        bi = bodies[i]
-        for j in range(i + 1, n):
-            bj = bodies[j]
-            dx = bj.x - bi.x
-            dy = bj.y - bi.y
-            dist2 = dx * dx + dy * dy + softening2
-            inv_dist = 1.0 / math.sqrt(dist2)
-            inv_dist3 = inv_dist * inv_dist * inv_dist
-            f = G_CONST * inv_dist3
-            fx = f * dx
-            fy = f * dy
-            bi.ax += fx * bj.mass
-            bi.ay += fy * bj.mass
-            bj.ax -= fx * bi.mass
-            bj.ay -= fy * bi.mass
-
-
-def _merge_bodies(bodies):
-    """Merge bodies that are very close, conserving momentum."""
-    to_remove = set()
-    n = len(bodies)
-    for i in range(n):
-        if i in to_remove:
-            continue
-        bi = bodies[i]
-        for j in range(i + 1, n):
-            if j in to_remove:
-                continue
-            bj = bodies[j]
-            dx = bj.x - bi.x
-            dy = bj.y - bi.y
-            dist2 = dx * dx + dy * dy
-            min_r = (bi.radius + bj.radius) * 0.8
-            if dist2 < max(MERGE_DIST2, min_r * min_r):
-                total_mass = bi.mass + bj.mass
-                bi.vx = (bi.vx * bi.mass + bj.vx * bj.mass) / total_mass
-                bi.vy = (bi.vy * bi.mass + bj.vy * bj.mass) / total_mass
-                bi.x = (bi.x * bi.mass + bj.x * bj.mass) / total_mass
-                bi.y = (bi.y * bi.mass + bj.y * bj.mass) / total_mass
-                bi.mass = total_mass
-                bi.radius = max(1, int(math.sqrt(total_mass) * 0.8))
-                to_remove.add(j)
-    if to_remove:
-        bodies[:] = [b for i, b in enumerate(bodies) if i not in to_remove]
-
-
-def _verlet_step(bodies, h, steps, softening2=SOFTENING2):
-    """Velocity Verlet integration for *steps* sub-steps."""
-    for _ in range(steps):
-        _compute_accelerations(bodies, softening2)
-        for b in bodies:
-            b.vx += 0.5 * h * b.ax
-            b.vy += 0.5 * h * b.ay
-            b.x += h * b.vx
-            b.y += h * b.vy
-        _compute_accelerations(bodies, softening2)
-        for b in bodies:
-            b.vx += 0.5 * h * b.ax
-            b.vy += 0.5 * h * b.ay
-
-
-def _record_trails(bodies, trail_length):
-    for b in bodies:
-        b.trail.append((b.x, b.y))
-        if len(b.trail) > trail_length:
-            b.trail.pop(0)
-
-
-def _draw_bodies(display, bodies, palette_idx):
+class Trails:
+    """Last `length` positions of each body as (n, length) arrays, oldest
+    column first."""
+
+    def __init__(self, length):
+        self.length = length
+        self.clear(0)
+
+    def clear(self, n):
+        self.xs = np.zeros((n, self.length))
+        self.ys = np.zeros((n, self.length))
+        self.count = 0
+
+    def record(self, x, y):
+        self.xs[:, :-1] = self.xs[:, 1:]
+        self.ys[:, :-1] = self.ys[:, 1:]
+        self.xs[:, -1] = x
+        self.ys[:, -1] = y
+        self.count = min(self.count + 1, self.length)
+
+    def compact(self, keep):
+        """Drop the trails of removed bodies (keep: NBodySystem.merge mask)."""
+        self.xs = self.xs[keep]
+        self.ys = self.ys[keep]
+
+    def points(self):
+        """(xs, ys, t): recorded positions and their age ramp, 1/count for
+        the oldest up to 1 for the newest."""
+        k = self.count
+        t = np.arange(1, k + 1) / max(1, k)
+        return self.xs[:, self.length - k:], self.ys[:, self.length - k:], t
+
+
+def _draw_trails(display, xs, ys, t, colors, fade):
+    """Plot every trail point in one blit: colors is (n, 3), dimmed by
+    t * fade along each trail."""
+    if not xs.size:
+        return
+    rgb = (colors[:, np.newaxis, :] * (t * fade)[np.newaxis, :, np.newaxis]).astype(np.int64)
+    blit_points(display, xs.astype(np.int64).ravel(), ys.astype(np.int64).ravel(),
+                rgb.reshape(-1, 3))
+
+
+def _draw_bodies(display, system, palette_idx):
     palette = PALETTES[palette_idx]
-
-    for b in bodies:
-        color = palette[b.color_idx % len(palette)]
-
-        # Draw trail
-        trail_len = len(b.trail)
-        for i, (tx, ty) in enumerate(b.trail):
-            ix, iy = int(tx), int(ty)
-            if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
-                t = (i + 1) / trail_len
-                dim = (
-                    int(color[0] * t * 0.4),
-                    int(color[1] * t * 0.4),
-                    int(color[2] * t * 0.4),
-                )
-                display.set_pixel(ix, iy, dim)
-
-        # Draw body
-        ix, iy = int(b.x), int(b.y)
-        if b.radius <= 1:
+    b = system.bodies
+    for x, y, radius, color_idx in zip(b.x.tolist(), b.y.tolist(),
+                                       b.radius.tolist(), b.color.tolist()):
+        color = palette[color_idx % len(palette)]
+        ix, iy = int(x), int(y)
+        if radius <= 1:
             if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
                 display.set_pixel(ix, iy, color)
         else:
-            display.draw_circle(ix, iy, b.radius, color, filled=True)
+            display.draw_circle(ix, iy, int(radius), color, filled=True)
             if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
                 bright = (min(255, color[0] + 80), min(255, color[1] + 80), min(255, color[2] + 80))
                 display.set_pixel(ix, iy, bright)
@@ -219,7 +163,7 @@ class OrbitsSolar(Visual):
     description = "Sun and planets"
     category = "science_macro"
     GUIDE = {
-        'desc': 'Newtonian gravity with Velocity Verlet integration. Planets orbit at correct relative speeds around a central star.',
+        'desc': 'Newtonian gravity with leapfrog integration. Planets orbit at correct relative speeds around a central star.',
     }
     TRAIL_LENGTH = 80
 
@@ -270,13 +214,12 @@ class OrbitsSolar(Visual):
         self._init_bodies()
 
     def _init_bodies(self):
-        self.bodies = []
+        self.system = NBodySystem(G_CONST, SOFTENING2)
 
         # Sun (index 0)
-        sun = Body(self.cx, self.cy, 0, 0, SUN_MASS, 0)
-        self.bodies.append(sun)
+        self.system.add(self.cx, self.cy, 0.0, 0.0, SUN_MASS)
 
-        # Planet colors and draw radii (parallel to self.bodies, index 0 = sun)
+        # Planet colors and draw radii (parallel to the bodies, index 0 = sun)
         self.body_colors = [SUN_COLOR]
         self.body_draw_radii = [3]
 
@@ -289,17 +232,19 @@ class OrbitsSolar(Visual):
             v = math.sqrt(G_CONST * SUN_MASS / orbit_r)
             vx = -v * math.sin(angle)
             vy = v * math.cos(angle)
-            self.bodies.append(Body(x, y, vx, vy, mass, 0))
+            self.system.add(x, y, vx, vy, mass)
             self.body_colors.append(color)
             self.body_draw_radii.append(draw_r)
+        self.trails = Trails(self.TRAIL_LENGTH)
+        self.trails.clear(len(self.system))
 
     def _pin_sun(self):
         """Keep the sun fixed at center."""
-        sun = self.bodies[0]
-        sun.x = self.cx
-        sun.y = self.cy
-        sun.vx = 0.0
-        sun.vy = 0.0
+        b = self.system.bodies
+        b.x[0] = self.cx
+        b.y[0] = self.cy
+        b.vx[0] = 0.0
+        b.vy[0] = 0.0
 
     # ── Camera ───────────────────────────────────────────────────
 
@@ -321,13 +266,17 @@ class OrbitsSolar(Visual):
             self.target_cam_scale = 2.5
         elif self.view_mode == _VIEW_FOLLOW:
             # Follow a specific planet (body index = planet_idx + 1)
-            body_idx = self.follow_planet_idx + 1
-            if body_idx < len(self.bodies):
-                b = self.bodies[body_idx]
-                self.target_cam_x = b.x
-                self.target_cam_y = b.y
+            self._follow_target()
             self.target_cam_scale = 3.5
 
+    def _follow_target(self):
+        """Aim the camera at the followed planet (body index = planet_idx + 1)."""
+        body_idx = self.follow_planet_idx + 1
+        b = self.system.bodies
+        if body_idx < len(b):
+            self.target_cam_x = float(b.x[body_idx])
+            self.target_cam_y = float(b.y[body_idx])
+
     def _advance_view(self):
         """Move to the next view mode."""
         if self.view_mode == _VIEW_FOLLOW:
@@ -380,9 +329,9 @@ class OrbitsSolar(Visual):
 
         # Physics
         h = self.dt_sim * self.speed
-        _verlet_step(self.bodies, h, self.steps_per_frame)
+        self.system.step(h, self.steps_per_frame)
         self._pin_sun()
-        _record_trails(self.bodies, self.TRAIL_LENGTH)
+        self.trails.record(self.system.bodies.x, self.system.bodies.y)
 
         # View auto-cycling
         self.view_timer += dt
@@ -393,11 +342,7 @@ class OrbitsSolar(Visual):
 
         # Keep follow-mode camera locked on moving planet
         if self.view_mode == _VIEW_FOLLOW:
-            body_idx = self.follow_planet_idx + 1
-            if body_idx < len(self.bodies):
-                b = self.bodies[body_idx]
-                self.target_cam_x = b.x
-                self.target_cam_y = b.y
+            self._follow_target()
 
         # Label timer (name vs fact toggle every 4s)
         self.label_timer += dt
@@ -492,31 +437,20 @@ class OrbitsSolar(Visual):
 
     def _draw_trails(self):
         """Draw body trails through camera transform."""
-        for idx, b in enumerate(self.bodies):
-            color = self._get_body_color(idx)
-            trail_len = len(b.trail)
-            if trail_len == 0:
-                continue
-            for i, (tx, ty) in enumerate(b.trail):
-                sx, sy = self._world_to_screen(tx, ty)
-                ix, iy = int(sx), int(sy)
-                if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
-                    t = (i + 1) / trail_len
-                    dim = (
-                        int(color[0] * t * 0.35),
-                        int(color[1] * t * 0.35),
-                        int(color[2] * t * 0.35),
-                    )
-                    self.display.set_pixel(ix, iy, dim)
+        xs, ys, t = self.trails.points()
+        sx, sy = self._world_to_screen(xs, ys)
+        colors = palette_array([self._get_body_color(i) for i in range(len(xs))])
+        _draw_trails(self.display, sx, sy, t, colors, 0.35)
 
     def _draw_bodies_solar(self):
         """Draw sun and planets with enhanced zoom rendering."""
-        for idx, b in enumerate(self.bodies):
+        b = self.system.bodies
+        for idx, (x, y) in enumerate(zip(b.x.tolist(), b.y.tolist())):
             color = self._get_body_color(idx)
             base_r = self.body_draw_radii[idx]
             effective_r = max(1, int(base_r * self.cam_scale))
 
-            sx, sy = self._world_to_screen(b.x, b.y)
+            sx, sy = self._world_to_screen(x, y)
             ix, iy = int(sx), int(sy)
 
             # Skip if completely off-screen (with margin for large bodies)
@@ -679,12 +613,16 @@ class OrbitsMulti(Visual):
     description = "Gravitational dance"
     category = "science_macro"
     GUIDE = {
-        'desc': 'Three bodies orbiting under mutual gravitational attraction. No closed-form solution exists — the system is inherently chaotic. Watch them dance, fling each other away, and sometimes find temporary stability.',
+        'desc': 'Three bodies orbiting under mutual gravitational attraction. No closed-form solution exists — the system is inherently chaotic. Watch them dance, fling each other away, and sometimes find temporary stability. Press the button to switch to a spinning cloud of 800 stars that collapses into a cluster.',
     }
     TRAIL_LENGTH = 120
     SOFT2 = 25.0       # Higher softening → gentler close passes
     MIN_MASS = 3.0     # Below this, full merge
     DEBRIS_LIFE = 50   # Frames before debris fades
+    BODY_COUNTS = (3, 800)  # Button cycles; 800 runs on Barnes-Hut
+    CLUSTER_MASS = 30.0     # Total, spread evenly over the cluster
+    CLUSTER_RADIUS = 20.0
+    CLUSTER_TRAIL = 6
 
     def __init__(self, display: Display):
         super().__init__(display)
@@ -695,12 +633,19 @@ class OrbitsMulti(Visual):
         self.palette_idx = 1  # Neon looks good for this
         self.dt_sim = 0.0005
         self.steps_per_frame = 8
-        self.debris = []      # [(x, y, vx, vy, color, life)]
+        self.count_idx = 0
+        # Visual-only sparks: color is a palette index, age counts frames
+        self.debris = ParticleStore(32)
         self._init_bodies()
 
     def _init_bodies(self):
-        self.bodies = []
-        self.debris = []
+        self.debris.clear()
+        count = self.BODY_COUNTS[self.count_idx]
+        self.cluster = count >= BARNES_HUT_MIN
+        if self.cluster:
+            self._init_cluster(count)
+            return
+        self.system = NBodySystem(G_CONST, self.SOFT2)
         cx, cy = GRID_SIZE / 2, GRID_SIZE / 2
 
         for i in range(3):
@@ -711,103 +656,95 @@ class OrbitsMulti(Visual):
             v_mag = math.sqrt(G_CONST * 10.0 * 2 / (2 * r + 2)) * 0.65
             vx = -v_mag * math.sin(angle) + random.uniform(-0.5, 0.5)
             vy = v_mag * math.cos(angle) + random.uniform(-0.5, 0.5)
-            self.bodies.append(Body(x, y, vx, vy, 10.0, i % 6))
+            self.system.add(x, y, vx, vy, 10.0, color=i % 6)
+        self.trails = Trails(self.TRAIL_LENGTH)
+        self.trails.clear(len(self.system))
+
+    def _init_cluster(self, count):
+        """Equal-mass stars spread evenly over a disc, spinning slower than
+        circular speed, so the cloud collapses into a core and halo."""
+        self.system = NBodySystem(G_CONST, SOFTENING2, capacity=count)
+        radius = self.CLUSTER_RADIUS
+        r = radius * np.sqrt(np.random.uniform(0, 1, count))
+        a = np.random.uniform(0, 2 * math.pi, count)
+        # Circular speed inside a uniform disc: sqrt(G * M * r) / R
+        v = 0.6 * np.sqrt(G_CONST * self.CLUSTER_MASS * r) / radius
+        self.system.add(GRID_SIZE / 2 + r * np.cos(a), GRID_SIZE / 2 + r * np.sin(a),
+                        -v * np.sin(a), v * np.cos(a),
+                        np.full(count, self.CLUSTER_MASS / count),
+                        color=np.random.randint(0, 6, count))
+        self.trails = Trails(self.CLUSTER_TRAIL)
+        self.trails.clear(count)
 
     def _handle_collisions(self):
         """Partial mass transfer + debris sparks on close approach."""
-        bodies = self.bodies
-        n = len(bodies)
-        to_remove = set()
+        b = self.system.bodies
+        merge_i, merge_j = [], []
+        merged = set()
 
-        for i in range(n):
-            if i in to_remove:
+        touch_i, touch_j = self.system.touching(0.0, overlap=0.9)
+        for i, j in zip(touch_i.tolist(), touch_j.tolist()):
+            if i in merged or j in merged:
                 continue
-            bi = bodies[i]
-            for j in range(i + 1, n):
-                if j in to_remove:
-                    continue
-                bj = bodies[j]
-                dx = bj.x - bi.x
-                dy = bj.y - bi.y
-                dist2 = dx * dx + dy * dy
-                touch = (bi.radius + bj.radius) * 0.9
-                if dist2 >= touch * touch:
-                    continue
-
-                # Pick smaller body
-                if bi.mass <= bj.mass:
-                    smaller, larger = bi, bj
-                    sign = 1
-                else:
-                    smaller, larger = bj, bi
-                    sign = -1
-
-                if smaller.mass < self.MIN_MASS:
-                    # Full merge
-                    total = larger.mass + smaller.mass
-                    larger.vx = (larger.vx * larger.mass + smaller.vx * smaller.mass) / total
-                    larger.vy = (larger.vy * larger.mass + smaller.vy * smaller.mass) / total
-                    larger.x = (larger.x * larger.mass + smaller.x * smaller.mass) / total
-                    larger.y = (larger.y * larger.mass + smaller.y * smaller.mass) / total
-                    larger.mass = total
-                    larger.radius = max(1, int(math.sqrt(total) * 0.8))
-                    to_remove.add(bodies.index(smaller))
-                else:
-                    # Partial transfer: 20% of smaller → debris sparks
-                    transfer = smaller.mass * 0.2
-                    smaller.mass -= transfer
-                    smaller.radius = max(1, int(math.sqrt(smaller.mass) * 0.8))
-
-                    # Spawn debris sparks
-                    palette = PALETTES[self.palette_idx]
-                    mid_x = (bi.x + bj.x) / 2
-                    mid_y = (bi.y + bj.y) / 2
-                    for _ in range(4):
-                        a = random.uniform(0, 2 * math.pi)
-                        spd = random.uniform(15, 35)
-                        c = palette[random.randint(0, len(palette) - 1)]
-                        self.debris.append([
-                            mid_x, mid_y,
-                            spd * math.cos(a), spd * math.sin(a),
-                            c, self.DEBRIS_LIFE,
-                        ])
-
-                    # Deflection impulse — push apart
-                    dist = math.sqrt(dist2) + 0.1
-                    push = 10.0
-                    nx, ny = dx / dist, dy / dist
-                    bi.vx -= push * nx * sign
-                    bi.vy -= push * ny * sign
-                    bj.vx += push * nx * sign
-                    bj.vy += push * ny * sign
-
-        if to_remove:
-            self.bodies = [b for i, b in enumerate(bodies) if i not in to_remove]
+
+            # Pick smaller body
+            if b.mass[i] <= b.mass[j]:
+                smaller, larger = i, j
+                sign = 1
+            else:
+                smaller, larger = j, i
+                sign = -1
+
+            if b.mass[smaller] < self.MIN_MASS:
+                # Full merge; the merged body keeps the larger's color
+                b.color[min(i, j)] = b.color[larger]
+                merge_i.append(i)
+                merge_j.append(j)
+                merged.add(max(i, j))
+            else:
+                # Partial transfer: 20% of smaller → debris sparks
+                b.mass[smaller] *= 0.8
+                b.radius[smaller] = self.system.radius_for(b.mass[smaller])
+
+                # Spawn debris sparks
+                a = np.random.uniform(0, 2 * math.pi, 4)
+                spd = np.random.uniform(15, 35, 4)
+                self.debris.spawn(4, x=(b.x[i] + b.x[j]) / 2, y=(b.y[i] + b.y[j]) / 2,
+                                  vx=spd * np.cos(a), vy=spd * np.sin(a),
+                                  color=np.random.randint(0, len(PALETTES[self.palette_idx]), 4))
+
+                # Deflection impulse — push apart
+                dx = b.x[j] - b.x[i]
+                dy = b.y[j] - b.y[i]
+                dist = math.hypot(dx, dy) + 0.1
+                push = 10.0 * sign / dist
+                b.vx[i] -= push * dx
+                b.vy[i] -= push * dy
+                b.vx[j] += push * dx
+                b.vy[j] += push * dy
+
+        keep = self.system.merge(np.array(merge_i, dtype=np.intp),
+                                 np.array(merge_j, dtype=np.intp))
+        if keep is not None:
+            self.trails.compact(keep)
 
     def _apply_edge_force(self):
         """Push bodies toward screen center when they stray too far."""
         margin = 12.0
         strength = 80.0
         cx, cy = GRID_SIZE / 2, GRID_SIZE / 2
-        for b in self.bodies:
-            # How deep into the margin zone (0 = inside safe area, 1 = at edge)
-            t = 0.0
-            if b.x < margin:
-                t = max(t, (margin - b.x) / margin)
-            elif b.x > GRID_SIZE - margin:
-                t = max(t, (b.x - (GRID_SIZE - margin)) / margin)
-            if b.y < margin:
-                t = max(t, (margin - b.y) / margin)
-            elif b.y > GRID_SIZE - margin:
-                t = max(t, (b.y - (GRID_SIZE - margin)) / margin)
-            if t > 0:
-                # Vector toward center
-                dx = cx - b.x
-                dy = cy - b.y
-                dist = math.sqrt(dx * dx + dy * dy) + 0.1
-                force = strength * t * t
-                b.vx += (dx / dist) * force * self.dt_sim * self.speed
-                b.vy += (dy / dist) * force * self.dt_sim * self.speed
+        b = self.system.bodies
+        # How deep into the margin zone (0 = inside safe area, 1 = at edge)
+        far = GRID_SIZE - margin
+        t = np.maximum.reduce([margin - b.x, b.x - far, margin - b.y, b.y - far,
+                               np.zeros(len(b))]) / margin
+        # Vector toward center
+        dx = cx - b.x
+        dy = cy - b.y
+        dist = np.sqrt(dx * dx + dy * dy) + 0.1
+        force = strength * t * t * self.dt_sim * self.speed / dist
+        b.vx += dx * force
+        b.vy += dy * force
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -824,6 +761,7 @@ class OrbitsMulti(Visual):
             self.speed = min(3.0, self.speed + 0.1)
             consumed = True
         if input_state.action_l or input_state.action_r:
+            self.count_idx = (self.count_idx + 1) % len(self.BODY_COUNTS)
             self._init_bodies()
             consumed = True
         return consumed
@@ -831,35 +769,42 @@ class OrbitsMulti(Visual):
     def update(self, dt: float):
         self.time += dt
         h = self.dt_sim * self.speed
-        _verlet_step(self.bodies, h, self.steps_per_frame, self.SOFT2)
-        self._apply_edge_force()
-        self._handle_collisions()
-        _record_trails(self.bodies, self.TRAIL_LENGTH)
+        if self.cluster:
+            # One long step per frame (each force pass is a tree walk);
+            # the stars are softened points that never collide
+            self.system.step(h * self.steps_per_frame)
+            self._apply_edge_force()
+        else:
+            self.system.step(h, self.steps_per_frame)
+            self._apply_edge_force()
+            self._handle_collisions()
+        self.trails.record(self.system.bodies.x, self.system.bodies.y)
 
         # Update debris (purely visual, no gravity)
-        new_debris = []
-        for d in self.debris:
-            d[0] += d[2] * h * 8  # x += vx
-            d[1] += d[3] * h * 8  # y += vy
-            d[5] -= 1             # life--
-            if d[5] > 0:
-                new_debris.append(d)
-        self.debris = new_debris
+        d = self.debris
+        d.x += d.vx * h * 8
+        d.y += d.vy * h * 8
+        d.age += 1
+        d.kill(d.age >= self.DEBRIS_LIFE)
 
         # Reset when down to 1 body
-        if len(self.bodies) < 2:
+        if len(self.system) < 2:
             self._init_bodies()
 
     def draw(self):
         self.display.clear(Colors.BLACK)
-        _draw_bodies(self.display, self.bodies, self.palette_idx)
+        palette = palette_array(PALETTES[self.palette_idx])
+        b = self.system.bodies
+        xs, ys, t = self.trails.points()
+        _draw_trails(self.display, xs, ys, t, palette[b.color % len(palette)], 0.4)
+        if self.cluster:
+            blit_points(self.display, b.x.astype(np.int64), b.y.astype(np.int64),
+                        palette[b.color % len(palette)])
+        else:
+            _draw_bodies(self.display, self.system, self.palette_idx)
 
         # Draw debris sparks
-        for d in self.debris:
-            ix, iy = int(d[0]), int(d[1])
-            if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
-                t = d[5] / self.DEBRIS_LIFE
-                c = d[4]
-                color = (int(c[0] * t), int(c[1] * t), int(c[2] * t))
-                self.display.set_pixel(ix, iy, color)
-
+        d = self.debris
+        fade = (self.DEBRIS_LIFE - d.age) / self.DEBRIS_LIFE
+        rgb = (palette[d.color % len(palette)] * fade[:, np.newaxis]).astype(np.int64)
+        blit_points(self.display, d.x.astype(np.int64), d.y.astype(np.int64), rgb)
@@ -2,7 +2,8 @@
 Paint - Pixel Art Editor
 ========================
 64x64 pixel art editor with a 2x2 brush.
-Create sprites, save/load PNG files.
+Create sprites, save/load PNG files. Saves run in the background
+(paint_store.ExportJob), so drawing never waits on the SD card.
 
 Controls:
   Joystick      - Move cursor (2px steps)
@@ -14,6 +15,7 @@ Controls:
 import os
 from collections import deque
 from . import Visual, Display, Colors, GRID_SIZE
+from .paint_store import UndoHistory, ExportJob, next_free_path
 
 try:
     from PIL import Image
@@ -171,9 +173,12 @@ class Paint(Visual):
         self.load_files = []
         self.load_idx = 0
 
-        # Undo/redo stacks
-        self.undo_stack = []
-        self.redo_stack = []
+        # Undo/redo (per-pixel deltas, see paint_store.UndoHistory)
+        self.history = UndoHistory(UNDO_MAX)
+
+        # Background save/export in flight, and its completion message
+        self.export_job = None
+        self.export_label = ""
 
         # Overlay text feedback
         self.overlay_text = ""
@@ -186,6 +191,7 @@ class Paint(Visual):
     def update(self, dt: float):
         self.time += dt
         self.blink_timer += dt
+        self._poll_export()
 
         inp = getattr(self, '_input', None)
         if not inp:
@@ -322,34 +328,22 @@ class Paint(Visual):
             queue.append((x, y + 1))
 
     def _snapshot(self):
-        """Save current canvas to undo stack, clear redo."""
-        snap = [row[:] for row in self.canvas]
-        self.undo_stack.append(snap)
-        if len(self.undo_stack) > UNDO_MAX:
-            self.undo_stack.pop(0)
-        self.redo_stack.clear()
+        """Start an undo step for the current canvas, clear redo."""
+        self.history.checkpoint(self.canvas)
 
     def _do_undo(self):
-        if not self.undo_stack:
+        if not self.history.undo(self.canvas):
             self.overlay_text = "NO UNDO"
             self.overlay_timer = 1.5
             return
-        self.redo_stack.append([row[:] for row in self.canvas])
-        if len(self.redo_stack) > UNDO_MAX:
-            self.redo_stack.pop(0)
-        self.canvas = self.undo_stack.pop()
         self.overlay_text = "UNDO"
         self.overlay_timer = 1.0
 
     def _do_redo(self):
-        if not self.redo_stack:
+        if not self.history.redo(self.canvas):
             self.overlay_text = "NO REDO"
             self.overlay_timer = 1.5
             return
-        self.undo_stack.append([row[:] for row in self.canvas])
-        if len(self.undo_stack) > UNDO_MAX:
-            self.undo_stack.pop(0)
-        self.canvas = self.redo_stack.pop()
         self.overlay_text = "REDO"
         self.overlay_timer = 1.0
 
@@ -403,8 +397,7 @@ class Paint(Visual):
                 self.debounce = 0.12
             elif t == TOOL_NEW:
                 self.canvas = [[None] * CANVAS_SIZE for _ in range(CANVAS_SIZE)]
-                self.undo_stack.clear()
-                self.redo_stack.clear()
+                self.history.clear()
                 self.overlay_text = "NEW!"
                 self.overlay_timer = 1.5
                 self.mode = MODE_DRAW
@@ -456,25 +449,35 @@ class Paint(Visual):
         self.mode = MODE_LOAD
         self.debounce = 0.12
 
+    def _start_export(self, job, label):
+        """Run `job` in the background; `label` is shown when it finishes."""
+        if self.export_job is not None:
+            self.overlay_text = "BUSY"
+            self.overlay_timer = 1.0
+            return
+        self.export_job = job.start()
+        self.export_label = label
+
+    def _poll_export(self):
+        job = self.export_job
+        if job is None:
+            return
+        if job.done:
+            self.export_job = None
+            self.overlay_text = "SAVE FAILED" if job.error else self.export_label
+            self.overlay_timer = 1.5
+        else:
+            self.overlay_text = f"SAVING {int(job.progress * 100)}%"
+            self.overlay_timer = 0.5
+
     def _do_save(self):
         if not HAS_PIL:
             self.overlay_text = "NO PIL!"
             self.overlay_timer = 1.5
             return
-        os.makedirs(SAVE_DIR, exist_ok=True)
-        num = 1
-        while os.path.exists(os.path.join(SAVE_DIR, f"paint_{num:03d}.png")):
-            num += 1
-        img = Image.new("RGB", (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0))
-        for y in range(CANVAS_SIZE):
-            for x in range(CANVAS_SIZE):
-                c = self.canvas[y][x]
-                if c:
-                    img.putpixel((x, y), c)
-        path = os.path.join(SAVE_DIR, f"paint_{num:03d}.png")
-        img.save(path)
-        self.overlay_text = f"SAVED {num:03d}"
-        self.overlay_timer = 1.5
+        num, path = next_free_path(SAVE_DIR, "paint_{:03d}.png")
+        self._start_export(ExportJob("png", [self.canvas], path),
+                           f"SAVED {num:03d}")
 
     def _do_export(self):
         """Export canvas as single-frame GIF to CUSTOMS playlist."""
@@ -482,20 +485,9 @@ class Paint(Visual):
             self.overlay_text = "NO PIL!"
             self.overlay_timer = 1.5
             return
-        os.makedirs(GIF_DIR, exist_ok=True)
-        num = 1
-        while os.path.exists(os.path.join(GIF_DIR, f"sprite_{num:03d}.gif")):
-            num += 1
-        img = Image.new("RGB", (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0))
-        for y in range(CANVAS_SIZE):
-            for x in range(CANVAS_SIZE):
-                c = self.canvas[y][x]
-                if c:
-                    img.putpixel((x, y), c)
-        path = os.path.join(GIF_DIR, f"sprite_{num:03d}.gif")
-        img.save(path, save_all=True, duration=1000, loop=0)
-        self.overlay_text = f"GIF {num:03d}"
-        self.overlay_timer = 1.5
+        num, path = next_free_path(GIF_DIR, "sprite_{:03d}.gif")
+        self._start_export(ExportJob("gif", [self.canvas], path, duration=1000),
+                           f"GIF {num:03d}")
 
     def _do_load(self, filename):
         self._snapshot()
@@ -14,6 +14,7 @@ Controls:
 import os
 from collections import deque
 from . import Visual, Display, Colors, GRID_SIZE
+from .paint_store import UndoHistory, ExportJob, next_free_path
 
 from .paint import (
     PALETTE, PALETTE_COLS, PALETTE_ROWS,
@@ -66,7 +67,7 @@ TOOL_INITIALS = [
 # Draw tools (tools that paint on canvas)
 _DRAW_TOOLS = {TOOL_PENCIL, TOOL_MARKER, TOOL_BRUSH, TOOL_ERASER, TOOL_FILL, TOOL_EYEDROP}
 
-# Per-frame undo limit (reduced to manage memory across frames)
+# Per-frame undo limit (steps are pixel deltas, but many frames add up)
 FRAME_UNDO_MAX = 16
 
 # Modes
@@ -102,9 +103,12 @@ class PaintGif(Visual):
         self.frames = [self._blank_canvas()]
         self.frame_idx = 0
 
-        # Per-frame undo/redo stacks
-        self.undo_stacks = {}  # {frame_idx: [snapshot, ...]}
-        self.redo_stacks = {}  # {frame_idx: [snapshot, ...]}
+        # Per-frame undo/redo
+        self.histories = {}  # {frame_idx: UndoHistory}
+
+        # Background save/export in flight, and its completion message
+        self.export_job = None
+        self.export_label = ""
 
         # Onion skin
         self.onion_skin = False
@@ -182,6 +186,7 @@ class PaintGif(Visual):
     def update(self, dt: float):
         self.time += dt
         self.blink_timer += dt
+        self._poll_export()
 
         inp = getattr(self, '_input', None)
         if not inp:
@@ -319,59 +324,45 @@ class PaintGif(Visual):
 
     # ── Per-frame undo/redo ───────────────────────────────────────────
 
-    def _snapshot(self):
+    def _history(self):
         idx = self.frame_idx
-        stack = self.undo_stacks.setdefault(idx, [])
-        stack.append([row[:] for row in self.canvas])
-        if len(stack) > FRAME_UNDO_MAX:
-            stack.pop(0)
-        self.redo_stacks.pop(idx, None)
+        if idx not in self.histories:
+            self.histories[idx] = UndoHistory(FRAME_UNDO_MAX)
+        return self.histories[idx]
+
+    def _snapshot(self):
+        self._history().checkpoint(self.canvas)
 
     def _do_undo(self):
-        idx = self.frame_idx
-        stack = self.undo_stacks.get(idx, [])
-        if not stack:
+        if not self._history().undo(self.canvas):
             self.overlay_text = "NO UNDO"
             self.overlay_timer = 1.5
             return
-        redo = self.redo_stacks.setdefault(idx, [])
-        redo.append([row[:] for row in self.canvas])
-        if len(redo) > FRAME_UNDO_MAX:
-            redo.pop(0)
-        self.canvas = stack.pop()
         self.overlay_text = "UNDO"
         self.overlay_timer = 1.0
 
     def _do_redo(self):
-        idx = self.frame_idx
-        redo = self.redo_stacks.get(idx, [])
-        if not redo:
+        if not self._history().redo(self.canvas):
             self.overlay_text = "NO REDO"
             self.overlay_timer = 1.5
             return
-        stack = self.undo_stacks.setdefault(idx, [])
-        stack.append([row[:] for row in self.canvas])
-        if len(stack) > FRAME_UNDO_MAX:
-            stack.pop(0)
-        self.canvas = redo.pop()
         self.overlay_text = "REDO"
         self.overlay_timer = 1.0
 
     # ── Frame management ──────────────────────────────────────────────
 
     def _shift_stacks(self, from_idx, delta):
-        """Shift undo/redo stack keys >= from_idx by delta (+1 or -1)."""
-        for stacks in (self.undo_stacks, self.redo_stacks):
-            new = {}
-            for k, v in stacks.items():
-                if k >= from_idx:
-                    nk = k + delta
-                    if nk >= 0:
-                        new[nk] = v
-                else:
-                    new[k] = v
-            stacks.clear()
-            stacks.update(new)
+        """Shift undo history keys >= from_idx by delta (+1 or -1)."""
+        new = {}
+        for k, v in self.histories.items():
+            if k >= from_idx:
+                nk = k + delta
+                if nk >= 0:
+                    new[nk] = v
+            else:
+                new[k] = v
+        self.histories.clear()
+        self.histories.update(new)
 
     def _go_prev_frame(self):
         self.frame_idx = (self.frame_idx - 1) % len(self.frames)
@@ -407,9 +398,8 @@ class PaintGif(Visual):
             return
         del_idx = self.frame_idx
         self.frames.pop(del_idx)
-        # Remove stacks for deleted frame
-        self.undo_stacks.pop(del_idx, None)
-        self.redo_stacks.pop(del_idx, None)
+        # Remove history for deleted frame
+        self.histories.pop(del_idx, None)
         # Shift stacks above deleted frame down
         self._shift_stacks(del_idx + 1, -1)
         if self.frame_idx >= len(self.frames):
@@ -427,14 +417,13 @@ class PaintGif(Visual):
             return
         # Swap frames
         self.frames[idx], self.frames[new_idx] = self.frames[new_idx], self.frames[idx]
-        # Swap undo/redo stacks
-        for stacks in (self.undo_stacks, self.redo_stacks):
-            a = stacks.pop(idx, None)
-            b = stacks.pop(new_idx, None)
-            if a is not None:
-                stacks[new_idx] = a
-            if b is not None:
-                stacks[idx] = b
+        # Swap undo histories
+        a = self.histories.pop(idx, None)
+        b = self.histories.pop(new_idx, None)
+        if a is not None:
+            self.histories[new_idx] = a
+        if b is not None:
+            self.histories[idx] = b
         self.frame_idx = new_idx
         self.overlay_text = f"MOVED {new_idx+1}/{len(self.frames)}"
         self.overlay_timer = 1.0
@@ -588,27 +577,35 @@ class PaintGif(Visual):
                 self._do_load_paint(item)
             self._to_draw()
 
+    def _start_export(self, job, label):
+        """Run `job` in the background; `label` is shown when it finishes."""
+        if self.export_job is not None:
+            self.overlay_text = "BUSY"
+            self.overlay_timer = 1.0
+            return
+        self.export_job = job.start()
+        self.export_label = label
+
+    def _poll_export(self):
+        job = self.export_job
+        if job is None:
+            return
+        if job.done:
+            self.export_job = None
+            self.overlay_text = "SAVE FAILED" if job.error else self.export_label
+            self.overlay_timer = 2.0
+        else:
+            self.overlay_text = f"SAVING {int(job.progress * 100)}%"
+            self.overlay_timer = 0.5
+
     def _do_save(self):
         if not HAS_PIL:
             self.overlay_text = "NO PIL!"
             self.overlay_timer = 1.5
             return
-        os.makedirs(SAVE_DIR, exist_ok=True)
-        num = 1
-        while os.path.exists(os.path.join(SAVE_DIR, f"proj_{num:03d}")):
-            num += 1
-        proj_dir = os.path.join(SAVE_DIR, f"proj_{num:03d}")
-        os.makedirs(proj_dir)
-        for i, frame in enumerate(self.frames):
-            img = Image.new("RGB", (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0))
-            for y in range(CANVAS_SIZE):
-                for x in range(CANVAS_SIZE):
-                    c = frame[y][x]
-                    if c:
-                        img.putpixel((x, y), c)
-            img.save(os.path.join(proj_dir, f"frame_{i:03d}.png"))
-        self.overlay_text = f"SAVED {num:03d}"
-        self.overlay_timer = 1.5
+        num, proj_dir = next_free_path(SAVE_DIR, "proj_{:03d}")
+        self._start_export(ExportJob("frames", self.frames, proj_dir),
+                           f"SAVED {num:03d}")
 
     def _do_load(self, dirname):
         if not HAS_PIL:
@@ -636,8 +633,7 @@ class PaintGif(Visual):
             new_frames.append(canvas)
         self.frames = new_frames
         self.frame_idx = 0
-        self.undo_stacks.clear()
-        self.redo_stacks.clear()
+        self.histories.clear()
         self.overlay_text = f"LOADED {len(self.frames)}F"
         self.overlay_timer = 1.5
 
@@ -659,8 +655,7 @@ class PaintGif(Visual):
                     canvas[y][x] = (r, g, b)
         self.frames = [canvas]
         self.frame_idx = 0
-        self.undo_stacks.clear()
-        self.redo_stacks.clear()
+        self.histories.clear()
         label = filename.replace(".png", "")
         self.overlay_text = f"LOADED {label}"
         self.overlay_timer = 1.5
@@ -729,25 +724,10 @@ class PaintGif(Visual):
         if not name:
             name = "anim"
 
-        os.makedirs(SAVE_DIR, exist_ok=True)
         path = os.path.join(SAVE_DIR, f"{name}.gif")
-
-        images = []
-        for frame in self.frames:
-            img = Image.new("RGB", (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0))
-            for y in range(CANVAS_SIZE):
-                for x in range(CANVAS_SIZE):
-                    c = frame[y][x]
-                    if c:
-                        img.putpixel((x, y), c)
-            images.append(img)
-
         duration = int(1000 / self.preview_fps)
-        images[0].save(path, save_all=True, append_images=images[1:],
-                       duration=duration, loop=0)
-
-        self.overlay_text = f"GIF {name}"
-        self.overlay_timer = 2.0
+        self._start_export(ExportJob("gif", self.frames, path, duration=duration),
+                           f"GIF {name}")
         self._to_draw()
 
     # ── Drawing ───────────────────────────────────────────────────────
@@ -0,0 +1,228 @@
+"""
+Paint Store - Undo deltas and off-thread export for the paint editors
+=====================================================================
+Shared by paint.py and paint_gif.py.
+
+UndoHistory keeps each undo step as the list of pixels a stroke changed
+(before and after), not a full copy of the canvas. Only one full copy is
+held at a time: the canvas as it was when the current stroke began, which
+is diffed into a delta when the next step starts or undo is pressed.
+
+ExportJob encodes canvases to PNG/GIF on a daemon thread, reporting
+progress as it goes, so a 64-frame GIF export doesn't freeze the display.
+Files are written to a hidden temp name in the target directory, fsynced,
+then os.replace()d into place (the same pattern as atomic_io), so a power
+cut never leaves a truncated image for the slideshow to choke on.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+_BLACK = (0, 0, 0)
+
+
+def copy_canvas(canvas):
+    """Copy a canvas (rows are lists of immutable color tuples / None)."""
+    return [row[:] for row in canvas]
+
+
+def canvas_to_image(canvas):
+    """Build an RGB PIL image from a canvas in one putdata call."""
+    size = len(canvas)
+    img = Image.new("RGB", (len(canvas[0]), size), _BLACK)
+    img.putdata([c or _BLACK for row in canvas for c in row])
+    return img
+
+
+# ── Undo ──────────────────────────────────────────────────────────
+
+def _diff(before, after):
+    """Pixels that differ: tuple of (x, y, before, after)."""
+    delta = []
+    for y, (row_b, row_a) in enumerate(zip(before, after)):
+        if row_b == row_a:
+            continue
+        for x, (b, a) in enumerate(zip(row_b, row_a)):
+            if b != a:
+                delta.append((x, y, b, a))
+    return tuple(delta)
+
+
+class UndoHistory:
+    """Bounded undo/redo of canvas edits stored as per-pixel deltas."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.undo_stack = []
+        self.redo_stack = []
+        self._base = None  # canvas copy at the start of the open step
+
+    def checkpoint(self, canvas):
+        """Start a new undoable step (call before modifying `canvas`)."""
+        self._commit(canvas)
+        self._base = copy_canvas(canvas)
+        self.redo_stack.clear()
+
+    def _commit(self, canvas):
+        if self._base is None:
+            return
+        delta = _diff(self._base, canvas)
+        self._base = None
+        if delta:
+            self.undo_stack.append(delta)
+            if len(self.undo_stack) > self.limit:
+                self.undo_stack.pop(0)
+
+    def undo(self, canvas):
+        """Revert the last step in place. Returns False if nothing to undo."""
+        self._commit(canvas)
+        if not self.undo_stack:
+            return False
+        delta = self.undo_stack.pop()
+        for x, y, before, _after in delta:
+            canvas[y][x] = before
+        self.redo_stack.append(delta)
+        if len(self.redo_stack) > self.limit:
+            self.redo_stack.pop(0)
+        return True
+
+    def redo(self, canvas):
+        """Re-apply the last undone step in place. False if none."""
+        self._commit(canvas)
+        if not self.redo_stack:
+            return False
+        delta = self.redo_stack.pop()
+        for x, y, _before, after in delta:
+            canvas[y][x] = after
+        self.undo_stack.append(delta)
+        if len(self.undo_stack) > self.limit:
+            self.undo_stack.pop(0)
+        return True
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._base = None
+
+
+# ── Export ────────────────────────────────────────────────────────
+
+def _fsync_path(path):
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _replace_atomic(path, write):
+    """Call write(tmp_path) on a hidden temp file, then move it over `path`."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".part")
+    os.close(fd)
+    try:
+        write(tmp)
+        _fsync_path(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ExportJob:
+    """Encode canvases to disk on a background thread.
+
+    kind:
+        "png"   - frames[0] to `path`
+        "gif"   - all frames to one animated GIF at `path`
+        "frames" - each frame to frame_NNN.png inside directory `path`
+
+    Poll `progress` (0..1) and `done`; `error` is set if the write failed.
+    The frames are copied up front, so the editor can keep drawing.
+    """
+
+    def __init__(self, kind, frames, path, duration=1000):
+        self.kind = kind
+        self.frames = [copy_canvas(f) for f in frames]
+        self.path = path
+        self.duration = duration
+        self.progress = 0.0
+        self.done = False
+        self.error = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="paint-export",
+                                        daemon=True)
+        try:
+            self._thread.start()
+        except RuntimeError:
+            # No threads (the web emulator's Pyodide): encode inline
+            self._thread = None
+            self._run()
+        return self
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def _images(self):
+        # Encoding is the slow part for GIFs; report it as the first 80%
+        n = len(self.frames)
+        for i, frame in enumerate(self.frames):
+            yield canvas_to_image(frame)
+            self.progress = 0.8 * (i + 1) / n
+
+    def _run(self):
+        try:
+            parent = os.path.dirname(self.path) or "."
+            os.makedirs(parent, exist_ok=True)
+            if self.kind == "png":
+                img = canvas_to_image(self.frames[0])
+                _replace_atomic(self.path, lambda p: img.save(p, format="PNG"))
+            elif self.kind == "gif":
+                images = list(self._images())
+                _replace_atomic(self.path, lambda p: images[0].save(
+                    p, format="GIF", save_all=True, append_images=images[1:],
+                    duration=self.duration, loop=0))
+            elif self.kind == "frames":
+                self._write_frames(parent)
+            else:
+                raise ValueError(f"unknown export kind {self.kind!r}")
+            self.progress = 1.0
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def _write_frames(self, parent):
+        # Build the whole project in a hidden dir, then rename it into place
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+        try:
+            for i, img in enumerate(self._images()):
+                frame_path = os.path.join(tmp_dir, f"frame_{i:03d}.png")
+                img.save(frame_path, format="PNG")
+                _fsync_path(frame_path)
+            os.rename(tmp_dir, self.path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+
+def next_free_path(directory, pattern):
+    """First (num, path) with path = pattern.format(num) not on disk yet."""
+    num = 1
+    while True:
+        path = os.path.join(directory, pattern.format(num))
+        if not os.path.exists(path):
+            return num, path
+        num += 1
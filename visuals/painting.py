@@ -25,7 +25,8 @@ try:
 except ImportError:
     HAS_PIL = False
 
-# Pre-loaded pixel data for emulator mode (injected before this module loads)
+# Pre-loaded atlas for emulator mode (injected before this module loads):
+# a visuals.atlas_pack.PackedAtlas of the site/*_atlas.bin file
 _PRELOADED = globals().get('_PAINTING_PIXELS', {})
 
 # Metadata: pid -> (title, artist, year)
@@ -309,17 +310,10 @@ class _PaintingBase(Visual):
 
     def _load(self):
         self.pixels = None
-        # Emulator mode: decode from pre-loaded base64 atlas
-        b64 = _PRELOADED.get(self._current_pid)
-        if b64:
-            import base64
-            d = base64.b64decode(b64)
-            S = GRID_SIZE
-            self.pixels = [
-                [(d[(y * S + x) * 3], d[(y * S + x) * 3 + 1], d[(y * S + x) * 3 + 2])
-                 for x in range(S)]
-                for y in range(S)
-            ]
+        # Emulator mode: expand from the pre-loaded packed atlas
+        entry = _PRELOADED.get(self._current_pid)
+        if entry:
+            self.pixels = entry.rows()
             return
         # Hardware mode: load PNG via PIL
         if not HAS_PIL:
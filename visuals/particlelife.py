@@ -18,21 +18,13 @@ Controls:
 """
 
 import random
-import math
-from . import Visual, Display, Colors, GRID_SIZE
-
 
-class Particle:
-    """A single particle with position, velocity, and species."""
+import numpy as np
 
-    __slots__ = ('x', 'y', 'vx', 'vy', 'species')
-
-    def __init__(self, x: float, y: float, species: int):
-        self.x = x
-        self.y = y
-        self.vx = 0.0
-        self.vy = 0.0
-        self.species = species
+from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, palette_array
+from .particles import ParticleStore
+from .spatial import CellList
 
 
 class ParticleLife(Visual):
@@ -76,6 +68,11 @@ class ParticleLife(Visual):
         self.num_particles = self.DEFAULT_NUM_PARTICLES
         self.interaction_radius = self.DEFAULT_INTERACTION_RADIUS
 
+        # Neighbor index, rebuilt from particle positions each frame
+        self.cells = CellList(self.interaction_radius)
+        self.particles = ParticleStore(self.num_particles)
+        self.palette = palette_array(self.SPECIES_COLORS)
+
         self._generate_rules()
         self._spawn_particles()
 
@@ -91,12 +88,14 @@ class ParticleLife(Visual):
 
     def _spawn_particles(self):
         """Create particles distributed randomly across the grid."""
-        self.particles = []
-        for i in range(self.num_particles):
-            species = i % self.num_species
-            x = random.uniform(0, GRID_SIZE)
-            y = random.uniform(0, GRID_SIZE)
-            self.particles.append(Particle(x, y, species))
+        n = self.num_particles
+        self.particles.clear()
+        self.particles.spawn(
+            n,
+            x=np.random.uniform(0, GRID_SIZE, n),
+            y=np.random.uniform(0, GRID_SIZE, n),
+            species=np.arange(n) % self.num_species,
+        )
 
     def handle_input(self, input_state) -> bool:
         """Handle user input for adjusting parameters."""
@@ -138,119 +137,53 @@ class ParticleLife(Visual):
         self.time += dt
         scaled_dt = dt * self.speed
 
-        particles = self.particles
-        attraction = self.attraction
+        p = self.particles
+        n = len(p)
         radius = self.interaction_radius
-        radius_sq = radius * radius
         min_dist = self.MIN_DISTANCE
         force_scale = self.FORCE_SCALE
-        grid = GRID_SIZE
-        half_grid = grid * 0.5
-
-        # For each particle, accumulate forces from all others
-        for p in particles:
-            fx = 0.0
-            fy = 0.0
-
-            for q in particles:
-                if p is q:
-                    continue
-
-                # Toroidal delta
-                dx = q.x - p.x
-                if dx > half_grid:
-                    dx -= grid
-                elif dx < -half_grid:
-                    dx += grid
-
-                dy = q.y - p.y
-                if dy > half_grid:
-                    dy -= grid
-                elif dy < -half_grid:
-                    dy += grid
-
-                dist_sq = dx * dx + dy * dy
-
-                # Skip if beyond interaction radius
-                if dist_sq > radius_sq or dist_sq < 0.01:
-                    continue
-
-                dist = math.sqrt(dist_sq)
-
-                if dist < min_dist:
-                    # Universal short-range repulsion
-                    repel = (min_dist - dist) / min_dist
-                    inv_dist = 1.0 / dist
-                    fx -= dx * inv_dist * repel * force_scale
-                    fy -= dy * inv_dist * repel * force_scale
-                else:
-                    # Attraction/repulsion zone
-                    g = attraction[p.species][q.species]
-
-                    # Normalized distance within the interaction zone [0, 1]
-                    norm_dist = (dist - min_dist) / (radius - min_dist)
-
-                    # Bell-shaped force envelope
-                    if norm_dist < 0.3:
-                        envelope = norm_dist / 0.3
-                    else:
-                        envelope = (1.0 - norm_dist) / 0.7
-
-                    force_magnitude = g * envelope * force_scale
-                    inv_dist = 1.0 / dist
-                    fx += dx * inv_dist * force_magnitude
-                    fy += dy * inv_dist * force_magnitude
-
-            # Apply accumulated force to velocity
-            p.vx += fx * scaled_dt
-            p.vy += fy * scaled_dt
-
-            # Clamp velocity to prevent runaway
-            speed_sq = p.vx * p.vx + p.vy * p.vy
-            max_spd = self.MAX_SPEED
-            if speed_sq > max_spd * max_spd:
-                speed = math.sqrt(speed_sq)
-                p.vx = (p.vx / speed) * max_spd
-                p.vy = (p.vy / speed) * max_spd
-
-        # Update positions and apply friction
-        friction = self.FRICTION
-        for p in particles:
-            # Apply friction (damping)
-            p.vx *= friction
-            p.vy *= friction
-
-            # Update position
-            p.x += p.vx
-            p.y += p.vy
-
-            # Toroidal wrapping
-            p.x %= grid
-            p.y %= grid
+        species = p.species
+
+        # Every pair within the interaction radius (toroidal delta i -> j)
+        i, j, dx, dy, dist_sq = self.cells.rebuild(p.x, p.y).pairs(radius)
+        keep = dist_sq >= 0.01
+        i, j, dx, dy, dist_sq = i[keep], j[keep], dx[keep], dy[keep], dist_sq[keep]
+        dist = np.sqrt(dist_sq)
+
+        # Universal short-range repulsion inside min_dist, otherwise the
+        # species-pair attraction with a bell-shaped envelope over
+        # normalized distance [0, 1] within the interaction zone
+        g = np.asarray(self.attraction)[species[i], species[j]]
+        norm_dist = (dist - min_dist) / (radius - min_dist)
+        envelope = np.where(norm_dist < 0.3, norm_dist / 0.3, (1.0 - norm_dist) / 0.7)
+        magnitude = np.where(dist < min_dist,
+                             -(min_dist - dist) / min_dist,
+                             g * envelope) * force_scale / dist
+
+        # Apply accumulated force to velocity, clamped to prevent runaway
+        p.vx += np.bincount(i, weights=dx * magnitude, minlength=n) * scaled_dt
+        p.vy += np.bincount(i, weights=dy * magnitude, minlength=n) * scaled_dt
+        p.limit_speed(self.MAX_SPEED)
+
+        # Friction (damping), then move one step and wrap
+        p.vx *= self.FRICTION
+        p.vy *= self.FRICTION
+        p.integrate()
+        p.wrap()
 
     def draw(self):
         """Draw all particles to the display."""
         self.display.clear(Colors.BLACK)
 
-        colors = self.SPECIES_COLORS
-
-        for p in self.particles:
-            px = int(p.x) % GRID_SIZE
-            py = int(p.y) % GRID_SIZE
-            color = colors[p.species]
-
-            self.display.set_pixel(px, py, color)
-
-            # Draw a faint glow around faster-moving particles for visual richness
-            speed_sq = p.vx * p.vx + p.vy * p.vy
-            if speed_sq > 0.5:
-                # Dim secondary pixel in direction of movement
-                glow_r = color[0] // 3
-                glow_g = color[1] // 3
-                glow_b = color[2] // 3
-                glow = (glow_r, glow_g, glow_b)
-
-                # Trail pixel behind the particle
-                trail_x = int(p.x - p.vx * 0.8) % GRID_SIZE
-                trail_y = int(p.y - p.vy * 0.8) % GRID_SIZE
-                self.display.set_pixel(trail_x, trail_y, glow)
+        p = self.particles
+        color = self.palette[p.species]
+
+        # Each particle, then a dim trail pixel behind the faster-moving
+        # ones for visual richness (interleaved so overlaps layer the same
+        # way as drawing them one by one)
+        xs = np.stack((p.x, p.x - p.vx * 0.8), axis=1).astype(np.int64) % GRID_SIZE
+        ys = np.stack((p.y, p.y - p.vy * 0.8), axis=1).astype(np.int64) % GRID_SIZE
+        rgb = np.stack((color, color // 3), axis=1)
+        show = np.ones(xs.shape, dtype=bool)
+        show[:, 1] = p.vx * p.vx + p.vy * p.vy > 0.5
+        blit_points(self.display, xs[show], ys[show], rgb[show])
@@ -0,0 +1,156 @@
+"""
+Particles - Structure-of-arrays particle store
+===============================================
+Shared by particlelife.py, boids.py, starfield.py and fireflies.py.
+
+Instead of a list of small Python objects (one per particle, attribute
+lookups in every inner loop, garbage for the collector every time one
+dies), a ParticleStore keeps each field in its own NumPy array:
+
+    x, y      position
+    vx, vy    velocity
+    species   small int (particle life species, flock id, ...)
+    age       seconds since spawn
+    color     palette index for draw()
+
+plus any extra float fields a visual asks for (a starfield's depth, a
+firefly's phase). Live particles always occupy the first `n` slots, so
+every field view is a plain slice and whole-population updates are single
+array expressions. kill() compacts survivors to the front in their
+original order (oldest first), which frees the tail for the next spawn();
+capacity doubles when full and is never given back, so a steady
+population allocates nothing per frame.
+
+draw() plots every particle with one framebuffer.blit_points() call.
+"""
+
+import numpy as np
+
+from . import GRID_SIZE
+from .framebuffer import blit_points
+
+# Field name -> dtype for the built-in fields
+FIELDS = {
+    'x': np.float64,
+    'y': np.float64,
+    'vx': np.float64,
+    'vy': np.float64,
+    'species': np.int32,
+    'age': np.float64,
+    'color': np.int32,
+}
+
+
+class ParticleStore:
+    """Growable SoA particle arrays. Field views (store.x, store.vy, ...)
+    cover the live particles only and update in place."""
+
+    def __init__(self, capacity=64, extra=()):
+        self.n = 0
+        self.fields = dict(FIELDS)
+        for name in extra:
+            self.fields[name] = np.float64
+        self._data = {name: np.zeros(max(1, capacity), dtype=dtype)
+                      for name, dtype in self.fields.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getattr__(self, name):
+        # Only reached for names that are not regular attributes
+        data = self.__dict__.get('_data')
+        if data is not None and name in data:
+            return data[name][:self.n]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        # store.vx = ... (and store.vx *= ...) write through to the array
+        data = self.__dict__.get('_data')
+        if data is not None and name in data:
+            data[name][:self.n] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    @property
+    def capacity(self):
+        return len(self._data['x'])
+
+    def _reserve(self, total):
+        cap = self.capacity
+        if total <= cap:
+            return
+        while cap < total:
+            cap *= 2
+        for name, arr in self._data.items():
+            grown = np.zeros(cap, dtype=arr.dtype)
+            grown[:self.n] = arr[:self.n]
+            self._data[name] = grown
+
+    def spawn(self, count=1, **values):
+        """Append `count` particles. Each keyword is a scalar or a length
+        `count` array for that field; unnamed fields start at 0.
+
+        Returns the slice of the new particles.
+        """
+        start, end = self.n, self.n + count
+        self._reserve(end)
+        for name, arr in self._data.items():
+            arr[start:end] = values.pop(name, 0)
+        if values:
+            raise KeyError('unknown particle field(s): %s' % ', '.join(values))
+        self.n = end
+        return slice(start, end)
+
+    def kill(self, dead):
+        """Remove particles by boolean mask or index array, keeping the
+        survivors' order. Returns how many were removed."""
+        n = self.n
+        keep = np.ones(n, dtype=bool)
+        keep[dead] = False
+        alive = int(keep.sum())
+        if alive == n:
+            return 0
+        for arr in self._data.values():
+            arr[:alive] = arr[:n][keep]
+        self.n = alive
+        return n - alive
+
+    def keep_newest(self, count):
+        """Drop the oldest particles (front of the store) beyond `count`."""
+        extra = self.n - count
+        if extra > 0:
+            self.kill(np.arange(extra))
+
+    def clear(self):
+        self.n = 0
+
+    def speed(self):
+        return np.hypot(self.vx, self.vy)
+
+    def integrate(self, dt=1.0):
+        """Euler step: position += velocity * dt, age += dt."""
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.age += dt
+
+    def wrap(self, width=GRID_SIZE, height=GRID_SIZE):
+        """Toroidal wrap of positions into [0, width) x [0, height)."""
+        self.x %= width
+        self.y %= height
+
+    def limit_speed(self, max_speed, min_speed=0.0):
+        """Rescale velocities into [min_speed, max_speed] (stationary
+        particles are left alone)."""
+        speed = self.speed()
+        moving = speed > 0
+        clamped = np.clip(speed, min_speed, max_speed)
+        scale = np.where(moving, clamped / np.where(moving, speed, 1.0), 1.0)
+        self.vx *= scale
+        self.vy *= scale
+
+    def draw(self, display, palette):
+        """Plot each particle at its (truncated, wrapped) position in
+        palette[color]. Later particles win where two share a pixel."""
+        xs = self.x.astype(np.int64) % GRID_SIZE
+        ys = self.y.astype(np.int64) % GRID_SIZE
+        blit_points(display, xs, ys, np.asarray(palette)[self.color])
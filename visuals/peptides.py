@@ -13,7 +13,11 @@ Controls:
 """
 
 import math
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .render3d import SpriteSheet, ZBuffer, project, rot_x, rot_y, rot_z, transform
 
 # =============================================================================
 # AMINO ACID DATA TABLES
@@ -122,6 +126,9 @@ def compute_pI(sequence):
 
 COLOR_MODES = ['PROPERTY', 'HYDROPATHY', 'CHARGE']
 
+# Depth shading steps for the pre-shaded bead stamps
+BEAD_DEPTH_LEVELS = 32
+
 def _lerp_color(c1, c2, t):
     """Linearly interpolate between two RGB colors."""
     t = max(0.0, min(1.0, t))
@@ -5447,6 +5454,7 @@ class Peptides(Visual):
         self._l_was_held = False
         self._r_was_held = False
         self._zoom_used = False
+        self._sprite_key = None
         self._prepare_peptide()
 
     def _prepare_peptide(self):
@@ -5627,157 +5635,73 @@ class Peptides(Visual):
         # Cosine smoothstep interpolation
         t = 0.5 - 0.5 * math.cos(self.nmr_t * math.pi)
 
-        return [(a[i][0] + (b[i][0] - a[i][0]) * t,
-                 a[i][1] + (b[i][1] - a[i][1]) * t,
-                 a[i][2] + (b[i][2] - a[i][2]) * t)
-                for i in range(len(a))]
-
-    def _transform_point(self, x, y, z):
-        """Apply rotation and project to screen coords in upper 48-row region."""
-        x -= self.center[0]
-        y -= self.center[1]
-        z -= self.center[2]
-
-        x *= self.scale
-        y *= self.scale
-        z *= self.scale
-
-        # Auto-rotation around Z
-        cos_z = math.cos(self.rotation_z)
-        sin_z = math.sin(self.rotation_z)
-        x1 = x * cos_z - y * sin_z
-        y1 = x * sin_z + y * cos_z
-
-        # Manual tilt (X axis)
-        cos_t = math.cos(self.tilt_x)
-        sin_t = math.sin(self.tilt_x)
-        y2 = y1 * cos_t - z * sin_t
-        z2 = y1 * sin_t + z * cos_t
-
-        # Manual rotation (Y axis)
-        cos_r = math.cos(self.rotation_y)
-        sin_r = math.sin(self.rotation_y)
-        x2 = x1 * cos_r + z2 * sin_r
-        z3 = -x1 * sin_r + z2 * cos_r
+        a = np.asarray(a, dtype=np.float64)
+        return a + (np.asarray(b, dtype=np.float64) - a) * t
 
-        # Project into upper 48 rows, centered
-        screen_x = GRID_SIZE // 2 + x2
-        screen_y = 22 - y2  # Center vertically in upper region
+    def _transform(self, points):
+        """Rotate (N, 3) residue positions and project into the upper
+        48-row region: (sx, sy, z)."""
+        # Auto-rotation around Z, manual tilt (X axis), manual rotation (Y axis)
+        m = rot_y(self.rotation_y) @ rot_x(self.tilt_x) @ rot_z(self.rotation_z)
+        cam = transform(points, m, self.center, self.scale)
+        # Centered vertically in the upper region
+        return project(cam, GRID_SIZE // 2, 22)
 
-        return screen_x, screen_y, z3
-
-    def _draw_bead(self, cx, cy, r, color):
-        """Draw a shaded sphere (bead) using gradient technique from molecule.py."""
-        icx = int(round(cx))
-        icy = int(round(cy))
-        for dy in range(-r, r + 1):
-            for dx in range(-r, r + 1):
-                if dx * dx + dy * dy <= r * r:
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    if dist < r * 0.4:
-                        t = dist / (r * 0.4) if r > 0 else 0
-                        shade = 1.0 + (1.0 - t) * 0.4
-                    else:
-                        shade = 1.0 - (dist / r) * 0.3 if r > 0 else 1.0
-                    px = icx + dx
-                    py = icy + dy
-                    if 0 <= px < GRID_SIZE and 0 <= py < 48:
-                        c = (
-                            min(255, int(color[0] * shade)),
-                            min(255, int(color[1] * shade)),
-                            min(255, int(color[2] * shade)),
-                        )
-                        self.display.set_pixel(px, py, c)
+    def _bead_sprites(self, bead_colors):
+        """Pre-shaded bead stamps for these colors at every depth level in
+        both sizes, and each bead's color. Rebuilt when the colors change
+        (another peptide or color mode)."""
+        key = tuple(bead_colors)
+        if key != self._sprite_key:
+            colors, self._bead_color_idx = np.unique(
+                np.array(bead_colors, dtype=np.float64).reshape(-1, 3),
+                axis=0, return_inverse=True)
+            levels = 0.35 + 0.65 * np.arange(BEAD_DEPTH_LEVELS) / (BEAD_DEPTH_LEVELS - 1)
+            # Entry (color, level, size): size 0 is radius 2, 1 is radius 3
+            shaded = (colors[:, np.newaxis, :] * levels[:, np.newaxis]).astype(np.uint8)
+            shaded = np.repeat(shaded[:, :, np.newaxis, :], 2, axis=2)
+            radii = np.broadcast_to([2, 3], shaded.shape[:3])
+            self._bead_sheet = SpriteSheet(radii.ravel(), shaded.reshape(-1, 3))
+            self._bead_color_idx = self._bead_color_idx.reshape(-1)
+            self._sprite_key = key
+        return self._bead_sheet, self._bead_color_idx
 
     def draw(self):
-        self.display.clear(Colors.BLACK)
-
         pep = PEPTIDES[self.peptide_idx]
         coords = self._get_current_coords()
         seq = pep['sequence']
         mode = COLOR_MODES[self.color_mode_idx]
         bead_colors = get_bead_colors(seq, mode)
 
-        # Transform all points
-        transformed = []
-        for i, (x, y, z) in enumerate(coords):
-            sx, sy, sz = self._transform_point(x, y, z)
-            transformed.append((sx, sy, sz, i))
-
-        # Build draw list: beads + bonds, sorted back-to-front by z
-        # First collect all drawable items with their z for sorting
-        draw_items = []  # (z, type, data)
-
-        # Backbone bonds
-        for i in range(len(transformed) - 1):
-            sx1, sy1, sz1, _ = transformed[i]
-            sx2, sy2, sz2, _ = transformed[i + 1]
-            avg_z = (sz1 + sz2) / 2.0
-            draw_items.append((avg_z, 'bond', (sx1, sy1, sx2, sy2, avg_z)))
-
-        # Cyclic closure bond (last → first)
-        if pep['cyclic'] and len(transformed) > 2:
-            sx1, sy1, sz1, _ = transformed[-1]
-            sx2, sy2, sz2, _ = transformed[0]
-            avg_z = (sz1 + sz2) / 2.0
-            draw_items.append((avg_z, 'bond', (sx1, sy1, sx2, sy2, avg_z)))
-
-        # Disulfide bridges
-        for i1, i2 in pep.get('disulfide', []):
-            if i1 < len(transformed) and i2 < len(transformed):
-                sx1, sy1, sz1, _ = transformed[i1]
-                sx2, sy2, sz2, _ = transformed[i2]
-                avg_z = (sz1 + sz2) / 2.0
-                draw_items.append((avg_z, 'disulfide', (sx1, sy1, sx2, sy2)))
-
-        # Beads
-        for sx, sy, sz, idx in transformed:
-            draw_items.append((sz, 'bead', (sx, sy, sz, idx)))
-
-        # Sort back-to-front (smallest z first = farthest)
-        draw_items.sort(key=lambda item: item[0])
+        # The 3D view stops at the info panel
+        zb = ZBuffer(Colors.BLACK, rows=48)
+        sx, sy, sz = self._transform(coords)
+        n = len(sx)
 
-        # Draw
-        for z_val, item_type, data in draw_items:
-            if item_type == 'bond':
-                sx1, sy1, sx2, sy2, avg_z = data
-                # Depth shading for bonds
-                depth = 0.4 + 0.4 * ((avg_z / 20.0) + 0.5)
-                depth = max(0.2, min(0.7, depth))
-                bc = (int(100 * depth), int(100 * depth), int(110 * depth))
-                ix1, iy1 = int(round(sx1)), int(round(sy1))
-                ix2, iy2 = int(round(sx2)), int(round(sy2))
-                self.display.draw_line(ix1, iy1, ix2, iy2, bc)
+        # Backbone bonds, plus the closure bond (last -> first) if cyclic
+        a = np.arange(n - 1)
+        b = a + 1
+        if pep['cyclic'] and n > 2:
+            a = np.append(a, n - 1)
+            b = np.append(b, 0)
+        # Depth shading for bonds
+        depth = np.clip(0.4 + 0.4 * ((sz[a] + sz[b]) / 2 / 20.0 + 0.5), 0.2, 0.7)
+        bond_colors = (np.array([100, 100, 110]) * depth[:, np.newaxis]).astype(np.uint8)
+        zb.lines(sx[a], sy[a], sz[a], sx[b], sy[b], sz[b], bond_colors)
 
-            elif item_type == 'disulfide':
-                sx1, sy1, sx2, sy2 = data
-                # Bright yellow dotted line
-                ix1, iy1 = int(round(sx1)), int(round(sy1))
-                ix2, iy2 = int(round(sx2)), int(round(sy2))
-                dx = ix2 - ix1
-                dy = iy2 - iy1
-                steps = max(abs(dx), abs(dy), 1)
-                for s in range(0, steps + 1, 2):  # Every other pixel = dotted
-                    t = s / steps if steps > 0 else 0
-                    px = int(ix1 + dx * t)
-                    py = int(iy1 + dy * t)
-                    if 0 <= px < GRID_SIZE and 0 <= py < 48:
-                        self.display.set_pixel(px, py, (255, 220, 40))
+        # Disulfide bridges: bright yellow dotted lines
+        bridges = np.array([(i1, i2) for i1, i2 in pep.get('disulfide', [])
+                            if i1 < n and i2 < n], dtype=np.int64).reshape(-1, 2)
+        i1, i2 = bridges[:, 0], bridges[:, 1]
+        zb.lines(sx[i1], sy[i1], sz[i1], sx[i2], sy[i2], sz[i2], (255, 220, 40), step=2)
 
-            elif item_type == 'bead':
-                sx, sy, sz, idx = data
-                # Depth-based shading
-                depth_factor = 0.5 + 0.5 * ((sz / 20.0) + 0.5)
-                depth_factor = max(0.35, min(1.0, depth_factor))
-                base_color = bead_colors[idx]
-                shaded = (
-                    int(base_color[0] * depth_factor),
-                    int(base_color[1] * depth_factor),
-                    int(base_color[2] * depth_factor),
-                )
-                # Bead radius: 2 for most, 3 for close beads
-                r = 3 if depth_factor > 0.75 else 2
-                self._draw_bead(sx, sy, r, shaded)
+        # Beads: depth-shaded, radius 3 for close beads, 2 for the rest
+        depth_factor = np.clip(0.5 + 0.5 * ((sz / 20.0) + 0.5), 0.35, 1.0)
+        level = np.rint((depth_factor - 0.35) / 0.65 * (BEAD_DEPTH_LEVELS - 1)).astype(np.int64)
+        sheet, color_idx = self._bead_sprites(bead_colors[:n])
+        which = (color_idx * BEAD_DEPTH_LEVELS + level) * 2 + (depth_factor > 0.75)
+        zb.sprites(sheet, which, sx, sy, sz)
+        zb.blit(self.display)
 
         # === INFO PANEL (y=48-63): two text lines ===
         self._draw_info_panel(seq, bead_colors)
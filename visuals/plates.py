@@ -30,7 +30,8 @@ try:
 except ImportError:
     HAS_PIL = False
 
-# Pre-loaded pixel data for emulator mode (injected before this module loads)
+# Pre-loaded atlas for emulator mode (injected before this module loads):
+# a visuals.atlas_pack.PackedAtlas of the site/*_atlas.bin file
 _HAECKEL_ATLAS = globals().get('_HAECKEL_PIXELS', {})
 _AUDUBON_ATLAS = globals().get('_AUDUBON_PIXELS', {})
 _MERIAN_ATLAS = globals().get('_MERIAN_PIXELS', {})
@@ -68,7 +69,7 @@ class _PlatesBase(Visual):
     category = "nature"
     _collection = ""     # e.g. "haeckel"
     _manifest_file = ""  # e.g. "haeckel_plates.json"
-    _atlas_ref = None    # reference to atlas dict
+    _atlas_ref = None    # reference to the collection's atlas
 
     def reset(self):
         self._plates = []       # list of {"id": ..., "title": ...}
@@ -115,7 +116,7 @@ class _PlatesBase(Visual):
                             for k in atlas]
 
     def _get_atlas(self):
-        """Get the atlas dict for this collection."""
+        """Get the packed atlas for this collection ({} when not loaded)."""
         return {
             "haeckel": _HAECKEL_ATLAS,
             "audubon": _AUDUBON_ATLAS,
@@ -133,20 +134,11 @@ class _PlatesBase(Visual):
         pid = self._plates[self._plate_idx]["id"]
         atlas = self._get_atlas()
 
-        # Emulator mode: decode from pre-loaded base64 atlas
+        # Emulator mode: expand from the pre-loaded packed atlas
         atlas_entry = atlas.get(pid)
-        if atlas_entry and isinstance(atlas_entry, dict):
-            import base64
-            h = atlas_entry["h"]
-            d = base64.b64decode(atlas_entry["data"])
-            self._img_height = h
-            self.pixels = [
-                [(d[(y * GRID_SIZE + x) * 3],
-                  d[(y * GRID_SIZE + x) * 3 + 1],
-                  d[(y * GRID_SIZE + x) * 3 + 2])
-                 for x in range(GRID_SIZE)]
-                for y in range(h)
-            ]
+        if atlas_entry:
+            self._img_height = atlas_entry.height
+            self.pixels = atlas_entry.rows()
             return
 
         # Hardware mode: load PNG via PIL
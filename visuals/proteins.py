@@ -24,7 +24,11 @@ Auto-rotates around Z-axis. Manual rotation pauses cycling until you move on.
 
 import math
 import random
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .render3d import ZBuffer, project, rot_x, rot_y, rot_z, transform
 
 
 # Secondary structure colors (classic ribbon diagram scheme)
@@ -39,6 +43,9 @@ SS_COLORS = {
     'C': (180, 180, 180),  # Coil/loop - light gray
 }
 
+# Secondary structures drawn as a thicker ribbon
+THICK_SS = ('H', 'G', 'I', 'E', 'B')
+
 # =============================================================================
 # PROTEIN DATA - Real Cα coordinates from RCSB Protein Data Bank
 # Generated with tools/pdb_parser.py
@@ -3621,6 +3628,12 @@ class Proteins(Visual):
         protein = self.playlist[self.playlist_idx]
         backbone = protein['backbone']
 
+        # Vertex arrays for the renderer
+        self._coords = np.array([r[:3] for r in backbone], dtype=np.float64).reshape(-1, 3)
+        self._ss_colors = np.array([SS_COLORS.get(r[3], SS_COLORS['C']) for r in backbone],
+                                   dtype=np.float64).reshape(-1, 3)
+        self._thick = np.array([r[3] in THICK_SS for r in backbone], dtype=bool)
+
         if len(backbone) == 0:
             self.scale = 1.0
             self.offset = (0, 0, 0)
@@ -3736,100 +3749,52 @@ class Proteins(Visual):
                 self.playlist_idx = (self.playlist_idx + 1) % len(self.playlist)
                 self._prepare_protein()
 
-    def _transform_point(self, x, y, z):
-        """Apply rotation and project to screen coords."""
-        # Center
-        x -= self.offset[0]
-        y -= self.offset[1]
-        z -= self.offset[2]
-
-        # Scale
-        x *= self.scale
-        y *= self.scale
-        z *= self.scale
-
-        # Auto-rotation around Z axis (constant tumble)
-        cos_z, sin_z = math.cos(self.rotation_z), math.sin(self.rotation_z)
-        x1 = x * cos_z - y * sin_z
-        y1 = x * sin_z + y * cos_z
-
-        # Manual tilt (rotation around X axis) - controlled by up/down
-        cos_t, sin_t = math.cos(self.tilt_x), math.sin(self.tilt_x)
-        y2 = y1 * cos_t - z * sin_t
-        z2 = y1 * sin_t + z * cos_t
-
-        # Manual rotation around Y axis - controlled by left/right
-        cos_r, sin_r = math.cos(self.rotation_y), math.sin(self.rotation_y)
-        x2 = x1 * cos_r + z2 * sin_r
-        z3 = -x1 * sin_r + z2 * cos_r
-
-        # Orthographic projection
-        screen_x = GRID_SIZE // 2 + x2
-        screen_y = 28 - y2  # Slight offset from center for label room
-
-        return screen_x, screen_y, z3
+    def _transform(self, points):
+        """Rotate (N, 3) Cα positions and project to screen: (sx, sy, z)."""
+        # Auto-rotation around Z (constant tumble), then the manual tilt
+        # around X (up/down) and rotation around Y (left/right)
+        m = rot_y(self.rotation_y) @ rot_x(self.tilt_x) @ rot_z(self.rotation_z)
+        cam = transform(points, m, self.offset, self.scale)
+        # Orthographic, slightly above center for label room
+        return project(cam, GRID_SIZE // 2, 28)
+
+    @staticmethod
+    def _depth_shade(colors, z):
+        """Darken (N, 3) colors with distance: nearer residues are brighter."""
+        factor = np.clip(0.5 + 0.5 * (z / 30.0 + 0.5), 0.3, 1.0)
+        return (colors * factor[:, np.newaxis]).astype(np.uint8)
 
     def draw(self):
-        self.display.clear(Colors.BLACK)
-
         protein = self.playlist[self.playlist_idx]
-        backbone = protein['backbone']
 
-        if len(backbone) < 2:
+        if len(self._coords) < 2:
+            self.display.clear(Colors.BLACK)
             return
 
-        # Transform all backbone points
-        transformed = []
-        for x, y, z, ss in backbone:
-            sx, sy, sz = self._transform_point(x, y, z)
-            transformed.append((sx, sy, sz, ss))
-
-        # Build draw list: segments between consecutive residues
-        # We'll draw back-to-front for proper occlusion
-        segments = []
-        for i in range(len(transformed) - 1):
-            x1, y1, z1, ss1 = transformed[i]
-            x2, y2, z2, ss2 = transformed[i + 1]
-            avg_z = (z1 + z2) / 2
-            # Use the secondary structure of the first residue for color
-            segments.append((avg_z, x1, y1, x2, y2, ss1, i))
-
-        # Sort by z (back to front)
-        segments.sort(key=lambda s: s[0])
-
-        # Draw backbone segments
-        for seg in segments:
-            _, x1, y1, x2, y2, ss, idx = seg
-            color = SS_COLORS.get(ss, SS_COLORS['C'])
-
-            # Apply depth shading
-            avg_z = seg[0]
-            depth_factor = 0.5 + 0.5 * (avg_z / 30.0 + 0.5)
-            depth_factor = max(0.3, min(1.0, depth_factor))
-
-            shaded = (
-                int(color[0] * depth_factor),
-                int(color[1] * depth_factor),
-                int(color[2] * depth_factor),
-            )
-
-            # Draw thicker line for helices and sheets
-            self._draw_backbone_segment(x1, y1, x2, y2, shaded, ss)
-
-        # Draw small dots at Cα positions for structure
-        for i, (sx, sy, sz, ss) in enumerate(transformed):
-            color = SS_COLORS.get(ss, SS_COLORS['C'])
-            depth_factor = 0.5 + 0.5 * (sz / 30.0 + 0.5)
-            depth_factor = max(0.3, min(1.0, depth_factor))
-            dot_color = (
-                int(color[0] * depth_factor),
-                int(color[1] * depth_factor),
-                int(color[2] * depth_factor),
-            )
-            # Just the center pixel for Cα
-            ix, iy = int(round(sx)), int(round(sy))
-            if 0 <= ix < GRID_SIZE and 0 <= iy < GRID_SIZE:
-                self.display.set_pixel(ix, iy, dot_color)
+        zb = ZBuffer(Colors.BLACK)
+        sx, sy, sz = self._transform(self._coords)
+
+        # Backbone segment i joins residues i and i + 1, colored by the
+        # secondary structure of the first and shaded by its mean depth
+        x1, y1, z1 = sx[:-1], sy[:-1], sz[:-1]
+        x2, y2, z2 = sx[1:], sy[1:], sz[1:]
+        seg_colors = self._depth_shade(self._ss_colors[:-1], (z1 + z2) / 2)
+
+        # Helices and sheets are thicker: half-bright lines either side
+        dx, dy = x2 - x1, y2 - y1
+        length = np.sqrt(dx * dx + dy * dy)
+        thick = np.flatnonzero(self._thick[:-1] & (length > 0))
+        px = -dy[thick] / length[thick]
+        py = dx[thick] / length[thick]
+        for side in (1, -1):
+            zb.lines(x1[thick] + side * px, y1[thick] + side * py, z1[thick],
+                     x2[thick] + side * px, y2[thick] + side * py, z2[thick],
+                     seg_colors[thick] // 2)
+        zb.lines(x1, y1, z1, x2, y2, z2, seg_colors)
+
+        # Small dots at Cα positions for structure
+        zb.points(sx, sy, sz, self._depth_shade(self._ss_colors, sz))
+        zb.blit(self.display)
 
         # Category overlay at top (fades after switching categories)
         if self.overlay_timer > 0:
@@ -3865,35 +3830,3 @@ class Proteins(Visual):
             self.display.draw_text_small(2 - offset, 58, padded, Colors.WHITE)
         else:
             self.display.draw_text_small(2, 58, label, Colors.WHITE)
-
-    def _draw_backbone_segment(self, x1, y1, x2, y2, color, ss):
-        """Draw a backbone segment with thickness based on secondary structure."""
-        ix1, iy1 = int(round(x1)), int(round(y1))
-        ix2, iy2 = int(round(x2)), int(round(y2))
-
-        # Draw main line
-        self.display.draw_line(ix1, iy1, ix2, iy2, color)
-
-        # For helices and sheets, draw thicker (offset lines)
-        if ss in ('H', 'G', 'I', 'E', 'B'):
-            # Calculate perpendicular offset for thickness
-            dx = x2 - x1
-            dy = y2 - y1
-            length = math.sqrt(dx * dx + dy * dy)
-            if length > 0:
-                # Perpendicular unit vector
-                px = -dy / length
-                py = dx / length
-
-                # Draw parallel lines for thickness
-                dimmed = (color[0] // 2, color[1] // 2, color[2] // 2)
-                self.display.draw_line(
-                    int(round(x1 + px)), int(round(y1 + py)),
-                    int(round(x2 + px)), int(round(y2 + py)),
-                    dimmed
-                )
-                self.display.draw_line(
-                    int(round(x1 - px)), int(round(y1 - py)),
-                    int(round(x2 - px)), int(round(y2 - py)),
-                    dimmed
-                )
@@ -7,12 +7,13 @@ The AI hops around the pyramid coloring cubes while avoiding enemies.
 AI Strategy:
 - Avoid Coily (purple snake) - move away if on same row or adjacent
 - Catch Slick/Sam if close (worth 300 points)
-- Find nearest uncolored cube using BFS on pyramid graph
-- Move in direction that gets closer to target
+- Head for the nearest unfinished cube by hop distance, re-decided
+  every time Q*bert lands
 """
 
-from collections import deque
+import random
 from . import Visual, Display, Colors, GRID_SIZE
+from .maze_nav import MazeGraph, DistanceField
 from arcade import InputState, GameState
 
 # Import the actual game
@@ -35,8 +36,12 @@ class QBertDemo(Visual):
         self.game = QBert(self.display)
         self.game.reset()
         self.decision_timer = 0.0
-        self.decision_interval = 0.2  # Q*bert moves slowly with hops
         self.target_move = None  # (row, col) of intended move
+        self.graph = MazeGraph(
+            [(r, c) for r in range(QBert.PYRAMID_ROWS) for c in range(r + 1)],
+            lambda cell: [(m, m) for m in self._get_valid_moves(*cell)])
+        self.graph.precompute()
+        self.unfinished = DistanceField(self.graph)
 
     def handle_input(self, input_state):
         # Demo doesn't respond to input (auto-plays)
@@ -53,11 +58,7 @@ class QBertDemo(Visual):
                 self.decision_timer = 0.0
             return
 
-        # Make AI decisions periodically
-        self.decision_timer += dt
-        if self.decision_timer >= self.decision_interval:
-            self.decision_timer = 0.0
-            self.target_move = self._decide_move()
+        self.target_move = self._decide_move()
 
         # Create input state with AI's chosen direction
         ai_input = InputState()
@@ -123,20 +124,16 @@ class QBertDemo(Visual):
         if catch_target:
             return catch_target
 
-        # Find nearest uncolored cube
-        target = self._find_nearest_uncolored(qrow, qcol)
-        if target:
-            # Get direction toward target using BFS
-            next_move = self._get_move_toward_target(qrow, qcol, target)
-            if next_move and next_move in valid_moves:
-                return next_move
+        # Head for the nearest unfinished cube
+        done = game.cube_target()
+        self.unfinished.update([(r, c) for r, row in enumerate(game.cubes)
+                                for c, cube in enumerate(row) if cube != done])
+        step = self.unfinished.step((qrow, qcol))
+        if step:
+            return step[0]
 
-        # If no uncolored cubes, just pick a random valid move
-        if valid_moves:
-            import random
-            return random.choice(valid_moves)
-
-        return None
+        # Standing on the last one (or none left): hop anywhere
+        return random.choice(valid_moves)
 
     def _get_valid_moves(self, row, col):
         """Get all valid adjacent cube positions."""
@@ -168,8 +165,9 @@ class QBertDemo(Visual):
         """Find a move that increases distance from Coily."""
         crow, ccol = coily['row'], coily['col']
 
-        # Calculate Manhattan distance from Coily
-        current_dist = abs(qrow - crow) + abs(qcol - ccol)
+        # Hops between us and Coily
+        distance = self.graph.distance
+        current_dist = distance((qrow, qcol), (crow, ccol))
 
         # If Coily is close (within 2 tiles), try to escape
         if current_dist <= 3:
@@ -177,8 +175,7 @@ class QBertDemo(Visual):
             best_dist = current_dist
 
             for move in valid_moves:
-                mrow, mcol = move
-                dist = abs(mrow - crow) + abs(mcol - ccol)
+                dist = distance(move, (crow, ccol))
                 if dist > best_dist:
                     best_dist = dist
                     best_move = move
@@ -195,52 +192,3 @@ class QBertDemo(Visual):
                 if (erow, ecol) in valid_moves:
                     return (erow, ecol)
         return None
-
-    def _find_nearest_uncolored(self, start_row, start_col):
-        """BFS to find nearest uncolored cube."""
-        game = self.game
-
-        # If current cube is uncolored, stay (but we should still hop to trigger)
-        # Actually, we need to find a target to move toward
-
-        queue = deque([(start_row, start_col, 0)])
-        visited = {(start_row, start_col)}
-
-        while queue:
-            row, col, dist = queue.popleft()
-
-            # Check if this cube is uncolored (skip starting position)
-            if dist > 0 and game.cubes[row][col] == 0:
-                return (row, col)
-
-            # Explore neighbors
-            for nrow, ncol in self._get_valid_moves(row, col):
-                if (nrow, ncol) not in visited:
-                    visited.add((nrow, ncol))
-                    queue.append((nrow, ncol, dist + 1))
-
-        return None
-
-    def _get_move_toward_target(self, start_row, start_col, target):
-        """BFS to find the first move toward target."""
-        target_row, target_col = target
-        game = self.game
-
-        # BFS storing the first move taken
-        queue = deque([(start_row, start_col, None)])
-        visited = {(start_row, start_col)}
-
-        while queue:
-            row, col, first_move = queue.popleft()
-
-            if row == target_row and col == target_col:
-                return first_move
-
-            for nrow, ncol in self._get_valid_moves(row, col):
-                if (nrow, ncol) not in visited:
-                    visited.add((nrow, ncol))
-                    # Track first move
-                    move = first_move if first_move else (nrow, ncol)
-                    queue.append((nrow, ncol, move))
-
-        return None
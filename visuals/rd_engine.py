@@ -0,0 +1,194 @@
+"""
+RD Engine - Float32 reaction-diffusion and continuous-CA core
+==============================================================
+Shared by turing.py, grayscott.py and lenia.py.
+
+Both models step in place on preallocated float32 buffers, so a frame of
+simulation allocates nothing:
+
+GrayScottModel - u and v live in one stacked (2, S, S) array with a
+    one-cell toroidal border, so each step wraps, takes the Laplacian of
+    and diffuses both chemicals in a single set of array ops.
+
+LeniaModel - FFT convolution with the kernel spectrum computed once and
+    the transform split into a row rfft and a column fft (numpy keeps
+    its own plan cache but has no plan objects; the split skips rfft2's
+    generic n-d dispatch). The growth function is read from a lookup
+    table that is rebuilt only when mu, sigma or dt change.
+
+Rendering is a palette LUT gather straight into framebuffer.blit_rgb().
+"""
+
+import numpy as np
+
+from . import GRID_SIZE
+from .framebuffer import blit_rgb
+
+N = GRID_SIZE
+S = N + 2  # Padded grid side length
+
+_LUT_SIZE = 256
+
+
+def palette_lut(colors, size=_LUT_SIZE):
+    """(n, 3) color ramp resampled to a (size, 3) uint8 table."""
+    pal = np.asarray(colors, dtype=np.float64)
+    idx_f = np.linspace(0.0, len(pal) - 1, size)
+    lo = idx_f.astype(np.intp)
+    hi = np.minimum(lo + 1, len(pal) - 1)
+    frac = (idx_f - lo)[:, np.newaxis]
+    return np.clip(pal[lo] + (pal[hi] - pal[lo]) * frac, 0, 255).astype(np.uint8)
+
+
+def draw_field(display, field, lut):
+    """Draw a (GRID_SIZE, GRID_SIZE) field of 0..1 values (clipped)
+    through a palette_lut()."""
+    idx = np.clip(field, 0.0, 1.0) * (len(lut) - 1)
+    idx += 0.5
+    blit_rgb(display, lut[idx.astype(np.intp)])
+
+
+# ── Gray-Scott ────────────────────────────────────────────────────
+
+class GrayScottModel:
+    """Gray-Scott reaction-diffusion on an N x N torus.
+
+    u and v are padded (S, S) views into one stacked array; the interior
+    is [1:N+1, 1:N+1].
+    """
+
+    def __init__(self, du=0.16, dv=0.08, n=N):
+        self.n = n
+        s = n + 2
+        self.uv = np.zeros((2, s, s), dtype=np.float32)
+        self.uv[0] = 1.0
+        self.u = self.uv[0]
+        self.v = self.uv[1]
+        self.rates = np.array([du, dv], dtype=np.float32).reshape(2, 1, 1)
+        self._lap = np.empty((2, n, n), dtype=np.float32)
+        self._uvv = np.empty((n, n), dtype=np.float32)
+
+    def wrap(self):
+        """Copy interior edges to the border cells (toroidal wrap)."""
+        n, x = self.n, self.uv
+        x[:, 0, 1:n+1] = x[:, n, 1:n+1]
+        x[:, n+1, 1:n+1] = x[:, 1, 1:n+1]
+        x[:, :, 0] = x[:, :, n]
+        x[:, :, n+1] = x[:, :, 1]
+
+    def step(self, f, k, steps=1):
+        """Advance `steps` explicit Euler steps in place."""
+        n, x = self.n, self.uv
+        lap, uvv = self._lap, self._uvv
+        inner = x[:, 1:n+1, 1:n+1]
+        u, v = inner[0], inner[1]
+        lap_u, lap_v = lap[0], lap[1]
+        keep_u = np.float32(1.0 - f)
+        keep_v = np.float32(1.0 - f - k)
+        f = np.float32(f)
+        for _ in range(steps):
+            self.wrap()
+            # Laplacian of both chemicals, times their diffusion rates
+            np.add(x[:, 0:n, 1:n+1], x[:, 2:n+2, 1:n+1], out=lap)
+            lap += x[:, 1:n+1, 0:n]
+            lap += x[:, 1:n+1, 2:n+2]
+            lap -= inner
+            lap -= inner
+            lap -= inner
+            lap -= inner
+            lap *= self.rates
+            # Reaction term u * v^2 (from the old values)
+            np.multiply(v, v, out=uvv)
+            uvv *= u
+            # u' = u + Du lap(u) - uv^2 + f (1 - u)
+            lap_u -= uvv
+            lap_u += f
+            u *= keep_u
+            u += lap_u
+            # v' = v + Dv lap(v) + uv^2 - (f + k) v
+            lap_v += uvv
+            v *= keep_v
+            v += lap_v
+        self.wrap()
+
+
+# ── Lenia ─────────────────────────────────────────────────────────
+
+def _bell(x, mu, sigma):
+    """Bell-shaped function."""
+    return np.exp(-((x - mu) ** 2) / (2.0 * sigma ** 2))
+
+
+def ring_kernel(radius, size):
+    """Ring-shaped bell kernel, normalized, centered on (0, 0) of a
+    (size, size) torus (ready for FFT convolution)."""
+    y, x = np.mgrid[-radius:radius+1, -radius:radius+1]
+    dist = np.sqrt(x * x + y * y) / radius
+    kernel = _bell(dist, 0.5, 0.15)
+    kernel[dist > 1.0] = 0.0
+    kernel /= kernel.sum()
+    pad = np.zeros((size, size), dtype=np.float64)
+    k = kernel.shape[0]
+    pad[:k, :k] = kernel
+    return np.roll(pad, (-(k // 2), -(k // 2)), axis=(0, 1))
+
+
+class LeniaModel:
+    """Lenia on a size x size torus with a ring kernel of `radius`.
+
+    grid holds cell states 0..1 (float32) and is updated in place.
+    """
+
+    GROWTH_LUT_SIZE = 16384
+
+    def __init__(self, size=128, radius=13):
+        self.size = size
+        self.grid = np.zeros((size, size), dtype=np.float32)
+        kernel = ring_kernel(radius, size)
+        self._kfft = np.fft.fft(np.fft.rfft(kernel, axis=1), axis=0)
+        self._fft_in = np.empty((size, size), dtype=np.float64)
+        self._potential = np.empty((size, size), dtype=np.float32)
+        self._idx = np.empty((size, size), dtype=np.intp)
+        self._growth = np.empty((size, size), dtype=np.float32)
+        self._lut_params = None
+        self._lut = None
+
+    def growth_lut(self, mu, sigma, dt):
+        """dt * growth(potential) sampled over potential 0..1."""
+        params = (mu, sigma, dt)
+        if params != self._lut_params:
+            p = np.linspace(0.0, 1.0, self.GROWTH_LUT_SIZE)
+            self._lut = (dt * (2.0 * _bell(p, mu, sigma) - 1.0)).astype(np.float32)
+            self._lut_params = params
+        return self._lut
+
+    def potential(self):
+        """Kernel-weighted neighborhood of every cell (FFT convolution)."""
+        # numpy's double-precision transforms are the fast path (single
+        # precision is either upcast anyway or slower), so widen first
+        np.copyto(self._fft_in, self.grid)
+        spec = np.fft.fft(np.fft.rfft(self._fft_in, axis=1), axis=0)
+        spec *= self._kfft
+        out = np.fft.irfft(np.fft.ifft(spec, axis=0), n=self.size, axis=1)
+        np.copyto(self._potential, out, casting='same_kind')
+        return self._potential
+
+    def step(self, mu, sigma, dt, steps=1):
+        lut = self.growth_lut(mu, sigma, dt)
+        top = len(lut) - 1
+        grid, idx, growth = self.grid, self._idx, self._growth
+        for _ in range(steps):
+            pot = self.potential()
+            # Potential is a kernel-weighted mean of 0..1 cells, so 0..1
+            np.clip(pot, 0.0, 1.0, out=pot)
+            pot *= top
+            pot += 0.5
+            np.copyto(idx, pot, casting='unsafe')
+            np.take(lut, idx, out=growth)
+            grid += growth
+            np.clip(grid, 0.0, 1.0, out=grid)
+
+    def downsample(self, n=N):
+        """Block-average down to n x n for display."""
+        f = self.size // n
+        return self.grid.reshape(n, f, n, f).mean(axis=(1, 3))
@@ -15,6 +15,8 @@ import re
 import sys
 import subprocess
 import threading
+
+import persistence
 from . import Visual, Display, Colors, GRID_SIZE
 
 
@@ -217,6 +219,8 @@ class Refresh(Visual):
         if self.pull_done:
             self.restart_timer += dt
             if self.restart_timer >= 1.5:
+                # execv skips atexit, so land queued saves first
+                persistence.flush()
                 os.execv(sys.executable, [sys.executable] + sys.argv)
 
     def _update_rollback(self, dt):
@@ -242,6 +246,8 @@ class Refresh(Visual):
         if self.rollback_done:
             self.restart_timer += dt
             if self.restart_timer >= 1.5:
+                # execv skips atexit, so land queued saves first
+                persistence.flush()
                 os.execv(sys.executable, [sys.executable] + sys.argv)
 
     def draw(self):
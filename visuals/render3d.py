@@ -0,0 +1,294 @@
+"""
+Render3D - Batched transforms and a z-buffer for the model viewers
+==================================================================
+Shared by molecule.py, proteins.py, peptides.py, lattice.py, solids.py,
+mobius.py and dna.py.
+
+Transforms
+    rot_x() / rot_y() / rot_z() build 3x3 rotation matrices in the sign
+    convention the viewers always used; compose them with @ (rightmost is
+    applied first) and transform() rotates a whole (N, 3) vertex array in
+    one matrix product. project() maps camera space to screen x/y with
+    the depth kept as z, larger z nearer the viewer.
+
+ZBuffer
+    Color and depth for one frame. spheres(), lines(), triangles() and
+    points() turn whole batches of primitives into fragments with NumPy
+    and keep, per pixel, the nearest one. This replaces sorting a Python
+    draw list back to front: occlusion is resolved per pixel, so a bond
+    passing behind an atom is hidden where it is behind and nowhere else.
+    Equal depths go to the later primitive, the same as a stable painter's
+    sort. blit() puts the frame on the display; text overlays are drawn
+    after it.
+
+SpriteSheet
+    Pre-shaded ball stamps (impostors) for the (radius, color) pairs a
+    model uses, built once when the model is loaded. ZBuffer.sprites()
+    stamps them at each ball's screen position with a single gather, so
+    a frame no longer re-shades every atom pixel.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from . import GRID_SIZE
+from .framebuffer import blit_rgb
+
+
+# ── Transforms ────────────────────────────────────────────────────
+
+def rot_x(a):
+    """Rotation about X: y' = y cos - z sin, z' = y sin + z cos."""
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+
+
+def rot_y(a):
+    """Rotation about Y: x' = x cos + z sin, z' = -x sin + z cos."""
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]])
+
+
+def rot_z(a):
+    """Rotation about Z: x' = x cos - y sin, y' = x sin + y cos."""
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def transform(points, matrix, offset=None, scale=1.0):
+    """(points - offset) * scale, rotated by matrix: (N, 3) -> (N, 3)."""
+    p = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if offset is not None:
+        p = p - np.asarray(offset, dtype=np.float64)
+    return (p * scale) @ np.asarray(matrix).T
+
+
+def project(cam, cx, cy, scale=1.0):
+    """Camera-space (N, 3) points to screen (sx, sy, z) arrays. scale may
+    be per point (a perspective divide); screen y grows downward."""
+    cam = np.asarray(cam, dtype=np.float64)
+    return cx + cam[:, 0] * scale, cy - cam[:, 1] * scale, cam[:, 2]
+
+
+# ── Rasterizer ────────────────────────────────────────────────────
+
+@lru_cache(maxsize=16)
+def _disc(r):
+    """Pixel offsets of a radius-r disc, their distance from the center
+    and the ball shading (bright core, darker rim)."""
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = dx * dx + dy * dy <= r * r
+    dx, dy = dx[inside], dy[inside]
+    dist = np.sqrt(dx * dx + dy * dy)
+    if r > 0:
+        shade = np.where(dist < r * 0.4,
+                         1.0 + (1.0 - dist / (r * 0.4)) * 0.4,
+                         1.0 - (dist / r) * 0.3)
+    else:
+        shade = np.ones(len(dist))
+    bulge = np.sqrt(np.maximum(r * r - dist * dist, 0.0))
+    for a in (dx, dy, shade, bulge):
+        a.flags.writeable = False
+    return dx, dy, shade, bulge
+
+
+@lru_cache(maxsize=2048)
+def _stamp(r, color):
+    """Shaded pixels of one ball: (dx, dy, bulge, rgb)."""
+    dx, dy, shade, bulge = _disc(r)
+    rgb = np.minimum(np.array(color, dtype=np.float64) * shade[:, np.newaxis], 255)
+    rgb = rgb.astype(np.uint8)
+    rgb.flags.writeable = False
+    return dx, dy, bulge, rgb
+
+
+class SpriteSheet:
+    """Ball stamps, one per (radius, color) entry, packed end to end.
+
+    ZBuffer.sprites() picks an entry per ball; the same entry may be used
+    by any number of balls.
+    """
+
+    __slots__ = ('sizes', 'starts', 'dx', 'dy', 'bulge', 'rgb')
+
+    def __init__(self, radii, colors):
+        colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.int64), (len(colors),))
+        stamps = [_stamp(r, tuple(c)) for r, c in zip(radii.tolist(), colors.tolist())]
+        self.sizes = np.array([len(st[0]) for st in stamps], dtype=np.int64)
+        self.starts = np.cumsum(self.sizes) - self.sizes
+        if stamps:
+            self.dx, self.dy, self.bulge, self.rgb = (np.concatenate(part) for part in zip(*stamps))
+        else:
+            self.dx = self.dy = np.empty(0, dtype=np.int64)
+            self.bulge = np.empty(0)
+            self.rgb = np.empty((0, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.sizes)
+
+
+def ball_sprites(radii, colors):
+    """SpriteSheet of the distinct (radius, color) pairs among a model's
+    balls, and each ball's entry in it."""
+    colors = np.asarray(colors, dtype=np.int64).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.int64), (len(colors),))
+    keys, which = np.unique(np.column_stack((radii, colors)), axis=0, return_inverse=True)
+    return SpriteSheet(keys[:, 0], keys[:, 1:]), which.reshape(-1)
+
+
+def _runs(counts):
+    """Runs of the given lengths laid end to end: for every slot, the run
+    it belongs to and its position within that run."""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    pos = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, pos
+
+
+def _rgb(colors, n):
+    return np.broadcast_to(np.asarray(colors, dtype=np.uint8).reshape(-1, 3), (n, 3))
+
+
+class ZBuffer:
+    """A frame of color plus depth. Only the top `rows` rows are drawn
+    into, for viewers with a panel below the model."""
+
+    def __init__(self, bg=(0, 0, 0), width=GRID_SIZE, height=GRID_SIZE, rows=None):
+        self.width = width
+        self.height = height
+        self.rows = height if rows is None else rows
+        self.color = np.empty((height, width, 3), dtype=np.uint8)
+        self.depth = np.empty((height, width))
+        self.clear(bg)
+
+    def clear(self, bg=(0, 0, 0)):
+        self.color[:] = bg
+        self.depth.fill(-np.inf)
+
+    def fragments(self, xs, ys, zs, rgb):
+        """Depth-test pixel fragments in submission order: per pixel the
+        largest z wins, later fragments winning ties."""
+        xs = np.atleast_1d(np.asarray(xs, dtype=np.int64))
+        ys = np.atleast_1d(np.asarray(ys, dtype=np.int64))
+        zs = np.broadcast_to(np.asarray(zs, dtype=np.float64), xs.shape)
+        rgb = _rgb(rgb, len(xs))
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.rows)
+        if not keep.any():
+            return
+        idx = (ys * self.width + xs)[keep]
+        zs = zs[keep]
+        rgb = rgb[keep]
+        # Sort by pixel, then depth, then submission; the last of each
+        # pixel's run is its winner
+        order = np.lexsort((np.arange(len(idx)), zs, idx))
+        run_end = np.ones(len(order), dtype=bool)
+        run_end[:-1] = idx[order[1:]] != idx[order[:-1]]
+        win = order[run_end]
+        depth = self.depth.reshape(-1)
+        win = win[zs[win] >= depth[idx[win]]]
+        depth[idx[win]] = zs[win]
+        self.color.reshape(-1, 3)[idx[win]] = rgb[win]
+
+    def points(self, x, y, z, colors):
+        """Single pixels at the rounded screen positions."""
+        self.fragments(np.rint(x), np.rint(y), z, colors)
+
+    def spheres(self, x, y, z, r, colors):
+        """Shaded balls: integer radius r at the rounded centers, each
+        pixel's depth on the ball's front surface."""
+        x = np.rint(np.atleast_1d(x)).astype(np.int64)
+        y = np.rint(np.atleast_1d(y)).astype(np.int64)
+        z = np.atleast_1d(np.asarray(z, dtype=np.float64))
+        r = np.broadcast_to(np.asarray(r, dtype=np.int64), x.shape)
+        colors = _rgb(colors, len(x)).astype(np.float64)
+        xs, ys, zs, rgb, owner = [], [], [], [], []
+        for radius in np.unique(r).tolist():
+            sel = np.flatnonzero(r == radius)
+            dx, dy, shade, bulge = _disc(radius)
+            xs.append((x[sel, np.newaxis] + dx).ravel())
+            ys.append((y[sel, np.newaxis] + dy).ravel())
+            zs.append((z[sel, np.newaxis] + bulge).ravel())
+            lit = colors[sel, np.newaxis, :] * shade[:, np.newaxis]
+            rgb.append(np.minimum(lit, 255).astype(np.uint8).reshape(-1, 3))
+            owner.append(np.repeat(sel, len(dx)))
+        if not xs:
+            return
+        # Back in the caller's order, so equal depths go to the later ball
+        seq = np.argsort(np.concatenate(owner), kind='stable')
+        self.fragments(np.concatenate(xs)[seq], np.concatenate(ys)[seq],
+                       np.concatenate(zs)[seq], np.concatenate(rgb)[seq])
+
+    def sprites(self, sheet, which, x, y, z):
+        """Stamp SpriteSheet entry which[i] at each rounded center, depth
+        on the ball's front surface like spheres()."""
+        which = np.atleast_1d(np.asarray(which, dtype=np.int64))
+        ball, pos = _runs(sheet.sizes[which])
+        k = sheet.starts[which][ball] + pos
+        x = np.rint(np.atleast_1d(x)).astype(np.int64)
+        y = np.rint(np.atleast_1d(y)).astype(np.int64)
+        z = np.atleast_1d(np.asarray(z, dtype=np.float64))
+        self.fragments(x[ball] + sheet.dx[k], y[ball] + sheet.dy[k],
+                       z[ball] + sheet.bulge[k], sheet.rgb[k])
+
+    def lines(self, x0, y0, z0, x1, y1, z1, colors, step=1):
+        """Segments between rounded endpoints, depth interpolated along
+        each. step=2 draws every other pixel (dotted)."""
+        x0 = np.rint(np.atleast_1d(x0)).astype(np.int64)
+        y0 = np.rint(np.atleast_1d(y0)).astype(np.int64)
+        x1 = np.rint(np.atleast_1d(x1)).astype(np.int64)
+        y1 = np.rint(np.atleast_1d(y1)).astype(np.int64)
+        n = len(x0)
+        if not n:
+            return
+        z0 = np.broadcast_to(np.asarray(z0, dtype=np.float64), (n,))
+        z1 = np.broadcast_to(np.asarray(z1, dtype=np.float64), (n,))
+        dx, dy = x1 - x0, y1 - y0
+        steps = np.maximum(np.abs(dx), np.abs(dy))
+        line, k = _runs(steps // step + 1)
+        k = k * step
+        span = np.maximum(steps, 1)[line]
+        # Nearest pixel on the minor axis, rounded half away from the start
+        xs = x0[line] + np.sign(dx[line]) * ((2 * k * np.abs(dx[line]) + span) // (2 * span))
+        ys = y0[line] + np.sign(dy[line]) * ((2 * k * np.abs(dy[line]) + span) // (2 * span))
+        t = k / span
+        zs = z0[line] + (z1 - z0)[line] * t
+        self.fragments(xs, ys, zs, _rgb(colors, n)[line])
+
+    def triangles(self, v0, v1, v2, colors):
+        """Filled triangles from (N, 3) screen-space corners (x, y, z),
+        pixel centers on or inside the edges, depth interpolated across
+        the face. A triangle seen edge-on still draws as its line."""
+        v0, v1, v2 = (np.asarray(v, dtype=np.float64).reshape(-1, 3) for v in (v0, v1, v2))
+        n = len(v0)
+        if not n:
+            return
+        corners = np.stack((v0, v1, v2))
+        lo = np.floor(corners[:, :, :2].min(axis=0)).astype(np.int64)
+        hi = np.ceil(corners[:, :, :2].max(axis=0)).astype(np.int64)
+        lo = np.maximum(lo, 0)
+        hi[:, 0] = np.minimum(hi[:, 0], self.width - 1)
+        hi[:, 1] = np.minimum(hi[:, 1], self.rows - 1)
+        w = np.maximum(hi[:, 0] - lo[:, 0] + 1, 0)
+        h = np.maximum(hi[:, 1] - lo[:, 1] + 1, 0)
+        tri, k = _runs(w * h)
+        px = lo[tri, 0] + k % w[tri]
+        py = lo[tri, 1] + k // w[tri]
+
+        def edge(a, b):
+            return ((b[tri, 0] - a[tri, 0]) * (py - a[tri, 1])
+                    - (b[tri, 1] - a[tri, 1]) * (px - a[tri, 0]))
+
+        e0, e1, e2 = edge(v1, v2), edge(v2, v0), edge(v0, v1)
+        inside = (((e0 >= 0) & (e1 >= 0) & (e2 >= 0))
+                  | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0)))
+        area = e0 + e1 + e2
+        flat = area == 0
+        zs = np.where(flat, (v0[tri, 2] + v1[tri, 2] + v2[tri, 2]) / 3,
+                      (e0 * v0[tri, 2] + e1 * v1[tri, 2] + e2 * v2[tri, 2])
+                      / np.where(flat, 1.0, area))
+        self.fragments(px[inside], py[inside], zs[inside],
+                       _rgb(colors, n)[tri[inside]])
+
+    def blit(self, display):
+        blit_rgb(display, self.color)
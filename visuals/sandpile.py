@@ -22,8 +22,11 @@ Controls:
   Escape      - Exit
 """
 
-import random
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .ca_engine import topple
+from .framebuffer import blit_rgb, palette_array
 
 
 class Sandpile(Visual):
@@ -50,6 +53,7 @@ class Sandpile(Visual):
         # Grayscale: black, dark, medium, light, white
         ((10, 10, 10), (80, 80, 80), (150, 150, 150), (220, 220, 220), (255, 255, 255)),
     ]
+    _PALETTE_ARRAYS = [palette_array(p) for p in PALETTES]
 
     def __init__(self, display: Display):
         super().__init__(display)
@@ -59,7 +63,7 @@ class Sandpile(Visual):
         self.speed = 1.0
 
         # Grid of grain counts, indexed [y][x]
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.int32)
 
         # Drop mode: True = center, False = random
         self.center_mode = True
@@ -92,7 +96,7 @@ class Sandpile(Visual):
             # Toggle between center and random drop mode
             self.center_mode = not self.center_mode
             # Reset grid when switching modes so the new pattern is clean
-            self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+            self.grid[:] = 0
             self.total_dropped = 0
             consumed = True
 
@@ -116,50 +120,24 @@ class Sandpile(Visual):
 
     def _drop_grains(self):
         """Add grains to the grid."""
-        for _ in range(self.drop_rate):
-            if self.center_mode:
-                x, y = self.cx, self.cy
-            else:
-                x = random.randint(0, GRID_SIZE - 1)
-                y = random.randint(0, GRID_SIZE - 1)
-            self.grid[y][x] += 1
-            self.total_dropped += 1
+        if self.center_mode:
+            self.grid[self.cy, self.cx] += self.drop_rate
+        else:
+            xs = np.random.randint(0, GRID_SIZE, self.drop_rate)
+            ys = np.random.randint(0, GRID_SIZE, self.drop_rate)
+            np.add.at(self.grid, (ys, xs), 1)
+        self.total_dropped += self.drop_rate
 
     def _topple(self, max_steps):
         """Run toppling until stable or max_steps exhausted.
 
-        Each step scans the entire grid once. Any cell with >= 4 grains
-        topples: loses 4 grains, each cardinal neighbor gains 1.
-        Grains that would go off-edge are lost (open boundary).
+        Each step topples every cell with >= 4 grains at once (so there is
+        no directional asymmetry): it loses 4 grains and each cardinal
+        neighbor gains 1. Grains that would go off-edge are lost.
 
         Returns True if the grid is now stable (no cell >= 4).
         """
-        size = GRID_SIZE
-        grid = self.grid
-
-        for _ in range(max_steps):
-            stable = True
-            # Double-buffer: snapshot the grid so all topplings read
-            # from the same state (eliminates directional asymmetry).
-            snap = [row[:] for row in grid]
-            for y in range(size):
-                for x in range(size):
-                    if snap[y][x] >= 4:
-                        stable = False
-                        # Topple this cell
-                        grid[y][x] -= 4
-                        # Distribute to cardinal neighbors (open boundary)
-                        if y > 0:
-                            grid[y - 1][x] += 1
-                        if y < size - 1:
-                            grid[y + 1][x] += 1
-                        if x > 0:
-                            grid[y][x - 1] += 1
-                        if x < size - 1:
-                            grid[y][x + 1] += 1
-            if stable:
-                return True
-        return False
+        return topple(self.grid, max_steps)
 
     def update(self, dt: float):
         self.time += dt
@@ -179,16 +157,6 @@ class Sandpile(Visual):
             self._topple(steps)
 
     def draw(self):
-        colors = self.PALETTES[self.palette_index]
-        grid = self.grid
-        set_pixel = self.display.set_pixel
-
-        for y in range(GRID_SIZE):
-            row = grid[y]
-            for x in range(GRID_SIZE):
-                grains = row[x]
-                if grains >= 4:
-                    # Mid-avalanche: white flash
-                    set_pixel(x, y, colors[4])
-                else:
-                    set_pixel(x, y, colors[grains])
+        # Mid-avalanche cells (4+) flash with the overflow color
+        colors = self._PALETTE_ARRAYS[self.palette_index]
+        blit_rgb(self.display, colors[np.minimum(self.grid, 4)])
@@ -9,6 +9,8 @@ Controls:
 """
 
 import os
+
+import persistence
 from . import Visual, Display, Colors, GRID_SIZE
 
 
@@ -60,6 +62,7 @@ class Shutdown(Visual):
             self.shutdown_timer += dt
             # Show message briefly, then shut down
             if self.shutdown_timer >= 2.0:
+                persistence.flush()
                 os.system("sudo shutdown -h now")
 
     def draw(self):
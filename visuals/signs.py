@@ -15,7 +15,8 @@ except ImportError:
     HAS_PIL = False
 from . import Visual, Colors
 
-# Pre-loaded pixel data for emulator mode (injected before this module loads)
+# Pre-loaded atlas for emulator mode (injected before this module loads):
+# a visuals.atlas_pack.PackedAtlas of the site/*_atlas.bin file
 _PRELOADED_SIGNS = globals().get('_SIGNS_PIXELS', {})
 
 # Sign dimensions and position
@@ -145,19 +146,10 @@ def _build_group_indices(manifest):
 
 def _load_sign_png(stem):
     """Load a sign PNG and return pixel rows as list of lists of RGB tuples."""
-    # Emulator mode: decode from pre-loaded base64 atlas
-    b64 = _PRELOADED_SIGNS.get(stem)
-    if b64:
-        import base64
-        raw = base64.b64decode(b64)
-        pixels = []
-        for y in range(SIGN_SIZE):
-            row = []
-            for x in range(SIGN_SIZE):
-                i = (y * SIGN_SIZE + x) * 3
-                row.append((raw[i], raw[i + 1], raw[i + 2]))
-            pixels.append(row)
-        return pixels
+    # Emulator mode: expand from the pre-loaded packed atlas
+    entry = _PRELOADED_SIGNS.get(stem)
+    if entry:
+        return entry.rows()
     # Hardware mode: load PNG via PIL
     path = os.path.join(ASSETS_DIR, f"{stem}.png")
     img = Image.open(path).convert('RGB')
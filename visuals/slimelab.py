@@ -12,8 +12,12 @@ Controls:
 """
 
 import random
-import math
+
+import numpy as np
+
 from . import Visual, Display, GRID_SIZE
+from .ca_engine import ColonyRule, colony_frame
+from .framebuffer import blit_rgb, palette_array
 import settings
 
 COLONY_COLORS = [
@@ -24,6 +28,7 @@ COLONY_COLORS = [
     (255, 50, 255),   # Magenta
     (50, 255, 255),   # Cyan
 ]
+_COLONY_PALETTE = palette_array(COLONY_COLORS)
 
 # Named regions in growth_chance x attack_power space
 _REGIONS = [
@@ -64,16 +69,13 @@ class SlimeLab(Visual):
 
         self.num_colonies = 6
 
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.strength = [[0.0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.age = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-
-        self.colony_base_power = {}
-        for i in range(1, self.num_colonies + 1):
-            self.colony_base_power[i] = random.uniform(0.95, 1.05)
+        shape = (GRID_SIZE, GRID_SIZE)
+        self.grid = np.zeros(shape, dtype=np.uint8)
+        self.strength = np.zeros(shape, dtype=np.float32)
+        self.age = np.zeros(shape, dtype=np.float32)
 
-        self._cached_counts = {}
-        self._cached_total = 0
+        self.rule = ColonyRule(self.num_colonies, self.growth_chance, self.attack_power)
+        self._cached_counts = self.rule.counts(self.grid)
 
         self._spawn_colonies()
 
@@ -83,36 +85,7 @@ class SlimeLab(Visual):
         self._both_held_prev = False
 
     def _spawn_colonies(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.grid[y][x] = 0
-                self.strength[y][x] = 0.0
-                self.age[y][x] = 0
-
-        for colony_id in range(1, self.num_colonies + 1):
-            for _ in range(50):
-                cx = random.randint(8, GRID_SIZE - 8)
-                cy = random.randint(8, GRID_SIZE - 8)
-                too_close = False
-                for y in range(GRID_SIZE):
-                    for x in range(GRID_SIZE):
-                        if self.grid[y][x] > 0:
-                            dist = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-                            if dist < 15:
-                                too_close = True
-                                break
-                    if too_close:
-                        break
-                if not too_close:
-                    break
-            for dy in range(-1, 2):
-                for dx in range(-1, 2):
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                        if random.random() < 0.7:
-                            self.grid[ny][nx] = colony_id
-                            self.strength[ny][nx] = 1.0
-                            self.age[ny][nx] = 0
+        self.rule.seed(self.grid, self.strength, self.age)
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -154,141 +127,23 @@ class SlimeLab(Visual):
         self._both_held_prev = both_held
         return consumed
 
-    def _get_colony_counts(self):
-        counts = {}
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                c = self.grid[y][x]
-                if c > 0:
-                    counts[c] = counts.get(c, 0) + 1
-        return counts
-
-    def _get_colony_power(self, colony_id):
-        total_cells = self._cached_total
-        if total_cells == 0:
-            return 1.0
-        my_cells = self._cached_counts.get(colony_id, 0)
-        base = self.colony_base_power.get(colony_id, 1.0)
-        if my_cells == 0:
-            return base
-        share = my_cells / total_cells
-        if share < 0.10:
-            modifier = 1.0 + (0.10 - share) * 3
-        elif share > 0.40:
-            modifier = 1.0 + (share - 0.40) * 0.5
-        else:
-            modifier = 1.0
-        return base * modifier
-
-    def _count_neighbors(self, x, y):
-        counts = {}
-        for dy in (-1, 0, 1):
-            for dx in (-1, 0, 1):
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                    colony = self.grid[ny][nx]
-                    if colony > 0:
-                        s = self.strength[ny][nx]
-                        counts[colony] = counts.get(colony, 0) + s
-        return counts
-
-    def _growth_step(self):
-        frontier = []
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x] == 0:
-                    neighbors = self._count_neighbors(x, y)
-                    if neighbors:
-                        frontier.append((x, y, neighbors))
-        random.shuffle(frontier)
-        for x, y, neighbors in frontier:
-            if random.random() > self.growth_chance:
-                continue
-            winner = max(neighbors, key=neighbors.get)
-            strength = neighbors[winner] * self._get_colony_power(winner)
-            same_count = sum(1 for dy in (-1, 0, 1) for dx in (-1, 0, 1)
-                             if (dx != 0 or dy != 0) and
-                             0 <= x + dx < GRID_SIZE and
-                             0 <= y + dy < GRID_SIZE and
-                             self.grid[y + dy][x + dx] == winner)
-            if same_count > 3 and random.random() > 0.3:
-                continue
-            self.grid[y][x] = winner
-            self.strength[y][x] = min(1.0, strength * 0.3)
-            self.age[y][x] = 0
-
-    def _competition_step(self):
-        attacks = []
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                colony = self.grid[y][x]
-                if colony == 0:
-                    continue
-                my_strength = self.strength[y][x] * self._get_colony_power(colony)
-                neighbors = self._count_neighbors(x, y)
-                for enemy, enemy_strength in neighbors.items():
-                    if enemy != colony:
-                        enemy_power = enemy_strength * self._get_colony_power(enemy)
-                        if enemy_power > my_strength * 1.2:
-                            attacks.append((x, y, colony, enemy, enemy_power - my_strength))
-        for x, y, old_colony, new_colony, advantage in attacks:
-            if random.random() < advantage * self.attack_power:
-                self.grid[y][x] = new_colony
-                self.strength[y][x] = 0.5
-                self.age[y][x] = 0
-
-        new_strength = [[0.0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                colony = self.grid[y][x]
-                if colony == 0:
-                    continue
-                neighbors = self._count_neighbors(x, y)
-                same = neighbors.get(colony, 0)
-                enemies = sum(s for c, s in neighbors.items() if c != colony)
-                cell_age = self.age[y][x]
-                if enemies > 0:
-                    new_strength[y][x] = max(0.1, self.strength[y][x] - 0.02)
-                elif same > 3:
-                    new_strength[y][x] = min(1.0, self.strength[y][x] + 0.01)
-                else:
-                    new_strength[y][x] = self.strength[y][x]
-                if cell_age > 10:
-                    decay = (cell_age - 10) * 0.003
-                    new_strength[y][x] = max(0.1, new_strength[y][x] - decay)
-                if enemies > 0 and self.strength[y][x] > 0.8:
-                    if random.random() < 0.01:
-                        new_strength[y][x] = 0.3
-                if new_strength[y][x] < 0.05:
-                    self.grid[y][x] = 0
-                    new_strength[y][x] = 0
-                    self.age[y][x] = 0
-        self.strength = new_strength
-
     def update(self, dt: float):
         self.time += dt
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.grid[y][x] > 0:
-                    self.age[y][x] += dt
+        self.age[self.grid > 0] += dt
 
         self.step_timer += dt
         if self.step_timer >= 0.08:
             self.step_timer = 0
-            self._cached_counts = self._get_colony_counts()
-            self._cached_total = sum(self._cached_counts.values())
-            self._growth_step()
-            self._competition_step()
+            rule = self.rule
+            rule.growth_chance = self.growth_chance
+            rule.attack_power = self.attack_power
+            self._cached_counts = rule.counts(self.grid)
+            rule.step(self.grid, self.strength, self.age, self._cached_counts)
 
         # Reset if one colony completely fills
-        total_area = GRID_SIZE * GRID_SIZE
-        for count in self._cached_counts.values():
-            if count >= total_area:
-                if random.random() < 0.02:
-                    self._spawn_colonies()
-                break
+        if self._cached_counts[1:].max() >= GRID_SIZE * GRID_SIZE:
+            if random.random() < 0.02:
+                self._spawn_colonies()
 
         if self.param_overlay_timer > 0:
             self.param_overlay_timer = max(0.0, self.param_overlay_timer - dt)
@@ -298,19 +153,7 @@ class SlimeLab(Visual):
             self.confirm_timer = max(0.0, self.confirm_timer - dt)
 
     def draw(self):
-        self.display.clear((0, 0, 0))
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                colony = self.grid[y][x]
-                if colony > 0:
-                    base = COLONY_COLORS[(colony - 1) % len(COLONY_COLORS)]
-                    s = self.strength[y][x]
-                    brightness = 0.3 + 0.7 * s
-                    self.display.set_pixel(x, y, (
-                        int(base[0] * brightness),
-                        int(base[1] * brightness),
-                        int(base[2] * brightness),
-                    ))
+        blit_rgb(self.display, colony_frame(self.grid, self.strength, _COLONY_PALETTE))
 
         if self.param_overlay_timer > 0:
             alpha = min(1.0, self.param_overlay_timer / 0.5)
@@ -1,17 +1,17 @@
 """
 Snake Demo - AI Attract Mode
 =============================
-Snake plays itself using BFS pathfinding for idle screen demos.
+Snake plays itself using A* pathfinding for idle screen demos.
 The AI navigates toward food while avoiding self-collision and walls.
 
-AI Strategy:
-- Use BFS from head to food
+AI Strategy (re-planned each time the snake steps):
+- Use A* from head to food
 - Avoid tiles occupied by snake body (except tail which will move)
 - If no path to food, follow tail to stay alive
 """
 
-from collections import deque
 from . import Visual, Display, Colors, GRID_SIZE
+from .maze_nav import astar
 from arcade import InputState, GameState
 
 # Import the actual game
@@ -34,8 +34,7 @@ class SnakeDemo(Visual):
         self.game = Snake(self.display)
         self.game.reset()
         self.ai_dir = (1, 0)  # Start moving right
-        self.decision_timer = 0.0
-        self.decision_interval = 0.05  # Recalculate frequently for responsive AI
+        self.planned_head = None  # Head position ai_dir was planned from
         self.game_over_timer = 0.0
 
     def handle_input(self, input_state):
@@ -52,12 +51,12 @@ class SnakeDemo(Visual):
                 self.game.reset()
                 self.game_over_timer = 0.0
                 self.ai_dir = (1, 0)
+                self.planned_head = None
             return
 
-        # Make AI decisions periodically
-        self.decision_timer += dt
-        if self.decision_timer >= self.decision_interval:
-            self.decision_timer = 0.0
+        # The board only changes when the snake steps
+        if self.game.snake[0] != self.planned_head:
+            self.planned_head = self.game.snake[0]
             self.ai_dir = self._decide_direction()
 
         # Create input state with AI's chosen direction
@@ -90,58 +89,20 @@ class SnakeDemo(Visual):
         # When snake eats food, tail doesn't move, so be conservative
         body_set = set(game.snake[:-1])
 
-        # Try to find path to food
-        direction = self._bfs_path_to_target(head, food, body_set)
+        def passable(x, y):
+            # Play area is 0 to GAME_WIDTH-1, 4 to GAME_HEIGHT-1
+            return (0 <= x < game.GAME_WIDTH and 4 <= y < game.GAME_HEIGHT
+                    and (x, y) not in body_set)
 
-        if direction:
-            return direction
-
-        # No path to food - try to follow tail to stay alive
-        tail = game.snake[-1]
-        direction = self._bfs_path_to_target(head, tail, body_set)
-
-        if direction:
-            return direction
+        # Try to find path to food, else follow tail to stay alive
+        for target in (food, game.snake[-1]):
+            path = astar(head, target, passable) if target and target != head else None
+            if path:
+                return (path[0][0] - head[0], path[0][1] - head[1])
 
         # Last resort: find any safe direction
         return self._get_safe_direction(head, body_set)
 
-    def _bfs_path_to_target(self, start, target, body_set):
-        """BFS to find direction toward target, avoiding body."""
-        game = self.game
-
-        queue = deque([(start[0], start[1], None)])  # x, y, first_direction
-        visited = {start}
-
-        while queue:
-            x, y, first_dir = queue.popleft()
-
-            if (x, y) == target:
-                return first_dir
-
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                nx, ny = x + dx, y + dy
-
-                # Check bounds (play area is 0 to GAME_WIDTH-1, 4 to GAME_HEIGHT-1)
-                if nx < 0 or nx >= game.GAME_WIDTH:
-                    continue
-                if ny < 4 or ny >= game.GAME_HEIGHT:
-                    continue
-
-                if (nx, ny) in visited:
-                    continue
-
-                # Avoid snake body
-                if (nx, ny) in body_set:
-                    continue
-
-                visited.add((nx, ny))
-                # Track the first direction taken from start
-                dir_to_use = first_dir if first_dir else (dx, dy)
-                queue.append((nx, ny, dir_to_use))
-
-        return None
-
     def _get_safe_direction(self, head, body_set):
         """Find any safe direction to move."""
         game = self.game
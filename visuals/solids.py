@@ -2,7 +2,7 @@
 SOLIDS - Rotating polyhedra from 4 families
 =============================================
 35 solids: Platonic, Archimedean, Kepler-Poinsot, and Catalan.
-Wireframe 3D rendering with depth-shaded edges and painter's algorithm.
+Wireframe 3D rendering with depth-shaded, z-buffered edges.
 
 Controls:
   Up/Down    - Cycle solid within current family
@@ -11,7 +11,11 @@ Controls:
 """
 
 import math
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .render3d import ZBuffer, project, rot_x, rot_y, transform
 from .solids_data import FAMILIES
 
 
@@ -49,6 +53,8 @@ class Solids(Visual):
         family_name, solids = FAMILIES[self.family_idx]
         name, builder = solids[self.solid_idx]
         self._verts, self._edges, self._nv, self._ne, self._nf = builder()
+        self._vert_array = np.array(self._verts, dtype=np.float64).reshape(-1, 3)
+        self._edge_array = np.array(self._edges, dtype=np.int64).reshape(-1, 2)
         # Auto-scale: normalize so max vertex radius maps to 22px
         max_r = max(math.sqrt(sum(c * c for c in v)) for v in self._verts)
         self.scale = 22.0 / max_r if max_r > 0 else 22.0
@@ -86,69 +92,44 @@ class Solids(Visual):
 
     def draw(self):
         d = self.display
-        d.clear()
 
         edge_color, vert_color = PALETTES[self.palette_idx]
-        cos_ry = math.cos(self.rotation_y)
-        sin_ry = math.sin(self.rotation_y)
-        cos_rx = math.cos(self.tilt)
-        sin_rx = math.sin(self.tilt)
         cx, cy = GRID_SIZE // 2, GRID_SIZE // 2
 
-        # Project all vertices
-        projected = []
-        depths = []
-        for vx, vy, vz in self._verts:
-            x, y, z = vx * self.scale, vy * self.scale, vz * self.scale
-            # Rotate Y
-            x2 = x * cos_ry + z * sin_ry
-            z2 = -x * sin_ry + z * cos_ry
-            # Rotate X (tilt)
-            y2 = y * cos_rx - z2 * sin_rx
-            z3 = y * sin_rx + z2 * cos_rx
-            # Perspective
-            persp = 80.0 / (80.0 + z3 * 0.3)
-            sx = int(cx + x2 * persp)
-            sy = int(cy - y2 * persp)
-            projected.append((sx, sy))
-            depths.append(z3)
-
-        # Sort edges by average depth (painter's algorithm)
-        edge_depths = []
-        for i, (a, b) in enumerate(self._edges):
-            avg_z = (depths[a] + depths[b]) / 2
-            edge_depths.append((avg_z, a, b))
-        edge_depths.sort(key=lambda e: e[0])
-
-        # Draw edges
-        for avg_z, a, b in edge_depths:
-            depth_factor = max(0.3, min(1.0, (avg_z + self.scale) / (2 * self.scale)))
-            c = (
-                int(edge_color[0] * depth_factor),
-                int(edge_color[1] * depth_factor),
-                int(edge_color[2] * depth_factor),
-            )
-            x1, y1 = projected[a]
-            x2, y2 = projected[b]
-            d.draw_line(x1, y1, x2, y2, c)
+        # Rotate Y, then tilt around X, with a gentle perspective
+        cam = transform(self._vert_array, rot_x(self.tilt) @ rot_y(self.rotation_y),
+                        scale=self.scale)
+        persp = 80.0 / (80.0 + cam[:, 2] * 0.3)
+        sx, sy, depths = project(cam, cx, cy, persp)
+        sx, sy = np.trunc(sx), np.trunc(sy)
+
+        zb = ZBuffer()
+
+        # Edges, shaded by average depth
+        a, b = self._edge_array[:, 0], self._edge_array[:, 1]
+        avg_z = (depths[a] + depths[b]) / 2
+        depth_factor = np.clip((avg_z + self.scale) / (2 * self.scale), 0.3, 1.0)
+        colors = (np.array(edge_color, dtype=np.float64)
+                  * depth_factor[:, np.newaxis]).astype(np.uint8)
+        zb.lines(sx[a], sy[a], depths[a], sx[b], sy[b], depths[b], colors)
 
         # Draw vertices as bright dots (skip for high-vertex solids to avoid clutter)
         if self._nv <= 60:
-            for i, (sx, sy) in enumerate(projected):
-                depth_factor = max(0.5, min(1.0, (depths[i] + self.scale) / (2 * self.scale)))
-                c = (
-                    int(vert_color[0] * depth_factor),
-                    int(vert_color[1] * depth_factor),
-                    int(vert_color[2] * depth_factor),
-                )
-                if 0 <= sx < GRID_SIZE and 0 <= sy < GRID_SIZE:
-                    d.set_pixel(sx, sy, c)
-                    if self._nv <= 30:
-                        for dx2, dy2 in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                            nx, ny = sx + dx2, sy + dy2
-                            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                                dim = (c[0] // 2, c[1] // 2, c[2] // 2)
-                                d.set_pixel(nx, ny, dim)
+            depth_factor = np.clip((depths + self.scale) / (2 * self.scale), 0.5, 1.0)
+            colors = (np.array(vert_color, dtype=np.float64)
+                      * depth_factor[:, np.newaxis]).astype(np.uint8)
+            on = (sx >= 0) & (sx < GRID_SIZE) & (sy >= 0) & (sy < GRID_SIZE)
+            px, py, pz, pc = sx[on], sy[on], depths[on], colors[on]
+            if self._nv <= 30:
+                # Half-bright neighbors first, so the dot itself wins ties
+                dx2 = np.array([-1, 1, 0, 0, 0])[:, np.newaxis]
+                dy2 = np.array([0, 0, -1, 1, 0])[:, np.newaxis]
+                dim = np.array([1, 1, 1, 1, 0])[:, np.newaxis, np.newaxis]
+                px, py = (px + dx2).ravel(), (py + dy2).ravel()
+                pz = np.tile(pz, 5)
+                pc = (pc >> dim).reshape(-1, 3)
+            zb.points(px, py, pz, pc)
+        zb.blit(d)
 
         # Solid name at bottom
         family_name, solids = FAMILIES[self.family_idx]
@@ -0,0 +1,153 @@
+"""
+Spatial - Uniform-grid neighbor index for particle and agent visuals
+====================================================================
+Shared by boids.py, particlelife.py, fireflies.py and matter.py.
+
+A cell list: bucket points by a grid of cells at least as wide as the
+search radius, then only compare against the surrounding cells.
+
+CellList - rebuilt from NumPy position arrays every frame. pairs() returns
+    every pair closer than `radius` as flat index/delta arrays, so a
+    simulation can accumulate forces with np.bincount instead of an
+    all-pairs Python loop. Cost is O(n * density) instead of O(n^2).
+
+    Handles toroidal wrap (deltas take the short way round) or a plain
+    bounded box. A population that never moves can build one CellList
+    and keep its pairs(), as fireflies.py does.
+"""
+
+import math
+
+import numpy as np
+
+from . import GRID_SIZE
+
+
+def _axis_offsets(ncells, reach, wrap):
+    """Neighbor cell offsets along one axis, without visiting a cell twice
+    when the grid is narrower than the search window."""
+    if wrap and ncells <= 2 * reach + 1:
+        return range(ncells)
+    return range(-reach, reach + 1)
+
+
+class CellList:
+    """Vectorized cell list over NumPy position arrays."""
+
+    def __init__(self, cell_size, width=GRID_SIZE, height=GRID_SIZE, wrap=True):
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        # Cells evenly divide the area (so the wrap seam has no sliver
+        # cell) and are never narrower than asked for.
+        self.cols = max(1, int(width // cell_size))
+        self.rows = max(1, int(height // cell_size))
+        self.cell_w = width / self.cols
+        self.cell_h = height / self.rows
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self._order = np.empty(0, dtype=np.intp)
+        self._start = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+        self._cx = np.empty(0, dtype=np.intp)
+        self._cy = np.empty(0, dtype=np.intp)
+
+    def rebuild(self, xs, ys):
+        """Re-bucket all points. Call once per frame before querying."""
+        self.xs = xs = np.asarray(xs, dtype=np.float64)
+        self.ys = ys = np.asarray(ys, dtype=np.float64)
+        if self.wrap:
+            xs = xs % self.width
+            ys = ys % self.height
+        cx = np.clip((xs // self.cell_w).astype(np.intp), 0, self.cols - 1)
+        cy = np.clip((ys // self.cell_h).astype(np.intp), 0, self.rows - 1)
+        cell = cy * self.cols + cx
+        # Counting sort: points grouped by cell, CSR-style start offsets
+        self._order = np.argsort(cell, kind='stable')
+        counts = np.bincount(cell, minlength=self.cols * self.rows)
+        self._start = np.concatenate(([0], np.cumsum(counts)))
+        self._cx = cx
+        self._cy = cy
+        return self
+
+    def _delta(self, d, size):
+        if self.wrap:
+            d = d - size * np.round(d / size)
+        return d
+
+    def _reach(self, radius):
+        return (max(1, math.ceil(radius / self.cell_w)),
+                max(1, math.ceil(radius / self.cell_h)))
+
+    def _candidates(self, cx, cy, reach):
+        """(query_index, point_index) for all points in the cells around
+        each query cell. `reach` is (cells in x, cells in y)."""
+        cols, rows = self.cols, self.rows
+        start, order = self._start, self._order
+        q_all = np.arange(len(cx))
+        qs, ps = [], []
+        reach_x, reach_y = reach
+        for oy in _axis_offsets(rows, reach_y, self.wrap):
+            ny = cy + oy
+            if self.wrap:
+                ny = ny % rows
+                qy = q_all
+            else:
+                ok = (ny >= 0) & (ny < rows)
+                ny, qy = ny[ok], q_all[ok]
+            for ox in _axis_offsets(cols, reach_x, self.wrap):
+                nx = cx[qy] + ox
+                if self.wrap:
+                    nx = nx % cols
+                    q, ny_q = qy, ny
+                else:
+                    ok = (nx >= 0) & (nx < cols)
+                    nx, q, ny_q = nx[ok], qy[ok], ny[ok]
+                cell = ny_q * cols + nx
+                lo = start[cell]
+                n = start[cell + 1] - lo
+                total = int(n.sum())
+                if not total:
+                    continue
+                # Expand each query into its cell's run of sorted points
+                rep_q = np.repeat(q, n)
+                first = np.repeat(np.cumsum(n) - n, n)
+                pos = np.repeat(lo, n) + (np.arange(total) - first)
+                qs.append(rep_q)
+                ps.append(order[pos])
+        if not qs:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(qs), np.concatenate(ps)
+
+    def pairs(self, radius):
+        """All ordered pairs (i, j), i != j, with |p_j - p_i| < radius.
+
+        Returns (i, j, dx, dy, dist2) where dx/dy point from i to j (the
+        short way round when wrapping). Each unordered pair appears twice,
+        once from each side, so per-point sums are a bincount over i.
+        """
+        i, j = self._candidates(self._cx, self._cy, self._reach(radius))
+        keep = i != j
+        i, j = i[keep], j[keep]
+        dx = self._delta(self.xs[j] - self.xs[i], self.width)
+        dy = self._delta(self.ys[j] - self.ys[i], self.height)
+        d2 = dx * dx + dy * dy
+        near = d2 < radius * radius
+        return i[near], j[near], dx[near], dy[near], d2[near]
+
+    def neighbor_counts(self, radius):
+        """Per point, how many other points lie within radius."""
+        i = self.pairs(radius)[0]
+        return np.bincount(i, minlength=len(self.xs))
+
+    def query(self, x, y, radius):
+        """Indices of points within radius of (x, y)."""
+        if self.wrap:
+            x, y = x % self.width, y % self.height
+        cx = np.array([min(self.cols - 1, max(0, int(x // self.cell_w)))])
+        cy = np.array([min(self.rows - 1, max(0, int(y // self.cell_h)))])
+        _q, p = self._candidates(cx, cy, self._reach(radius))
+        dx = self._delta(self.xs[p] - x, self.width)
+        dy = self._delta(self.ys[p] - y, self.height)
+        return p[dx * dx + dy * dy < radius * radius]
+
@@ -9,22 +9,26 @@ Controls:
   Escape     - Exit
 """
 
-import random
 import math
+
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .framebuffer import blit_points, blit_rgb
+from .particles import ParticleStore
 
+NUM_STARS = 100
 
-class Star:
-    def __init__(self):
-        self.reset()
 
-    def reset(self):
-        # Position in 3D space (z is depth, 0 = at viewer, 1 = far away)
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(0.1, 1.0)
-        self.x = math.cos(angle) * distance
-        self.y = math.sin(angle) * distance
-        self.z = random.uniform(0.5, 1.0)
+def _place(stars, idx):
+    """Random position in 3D space for the stars at idx (z is depth,
+    0 = at viewer, 1 = far away)."""
+    k = len(stars.x[idx])
+    angle = np.random.uniform(0, 2 * math.pi, k)
+    distance = np.random.uniform(0.1, 1.0, k)
+    stars.x[idx] = np.cos(angle) * distance
+    stars.y[idx] = np.sin(angle) * distance
+    stars.z[idx] = np.random.uniform(0.5, 1.0, k)
 
 
 class Starfield(Visual):
@@ -42,7 +46,11 @@ class Starfield(Visual):
         self.time = 0.0
         self.speed = 0.5  # Base speed
         self.warp = False
-        self.stars = [Star() for _ in range(100)]
+        self.stars = ParticleStore(NUM_STARS, extra=('z',))
+        _place(self.stars, self.stars.spawn(NUM_STARS))
+        # Nebula background is separable: sin(x) column term * sin(y) row term
+        self._cols = np.arange(GRID_SIZE) * 0.08
+        self._rows = np.arange(GRID_SIZE)[:, None] * 0.06
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -62,58 +70,60 @@ class Starfield(Visual):
 
         effective_speed = self.speed * (3.0 if self.warp else 1.0)
 
-        for star in self.stars:
-            # Move star toward viewer
-            star.z -= effective_speed * dt
+        # Move stars toward viewer
+        stars = self.stars
+        stars.z -= effective_speed * dt
 
-            # Reset star if it passes the viewer
-            if star.z <= 0.01:
-                star.reset()
-                star.z = 1.0
+        # Reset stars that pass the viewer, starting them far away
+        passed = stars.z <= 0.01
+        if passed.any():
+            _place(stars, passed)
+            stars.z[passed] = 1.0
 
     def draw(self):
         # Subtle nebula background instead of pure black
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                v1 = math.sin(x * 0.08 + self.time * 0.1) * math.sin(y * 0.06 + self.time * 0.07)
-                nebula = max(0, v1 * 12)  # very dim, 0-12 range
-                bg = (int(nebula * 0.3), 0, int(nebula * 0.8))  # deep blue/purple
-                self.display.set_pixel(x, y, bg)
+        t = self.time
+        v1 = np.sin(self._cols + t * 0.1) * np.sin(self._rows + t * 0.07)
+        nebula = np.maximum(0, v1 * 12)  # very dim, 0-12 range
+        bg = np.zeros((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        bg[..., 0] = nebula * 0.3  # deep blue/purple
+        bg[..., 2] = nebula * 0.8
+        blit_rgb(self.display, bg)
 
         cx, cy = GRID_SIZE // 2, GRID_SIZE // 2
 
         # Sort stars by depth (far to near) for proper layering
-        sorted_stars = sorted(self.stars, key=lambda s: -s.z)
-
-        for star in sorted_stars:
-            # Project 3D position to 2D screen
-            if star.z > 0.01:
-                screen_x = int(cx + (star.x / star.z) * cx)
-                screen_y = int(cy + (star.y / star.z) * cy)
-
-                # Brightness based on depth (closer = brighter)
-                brightness = int(255 * (1.0 - star.z))
-                brightness = max(50, min(255, brightness))
-
-                # Size based on depth (closer = larger)
-                if star.z < 0.2:
-                    size = 2
-                else:
-                    size = 1
-
-                # Draw star if on screen
-                if 0 <= screen_x < GRID_SIZE and 0 <= screen_y < GRID_SIZE:
-                    if self.warp:
-                        # Warp mode: draw trails
-                        color = (brightness, brightness, int(brightness * 0.8))
-                        # Draw a short line from current to previous position
-                        prev_z = star.z + self.speed * 0.1
-                        prev_x = int(cx + (star.x / prev_z) * cx)
-                        prev_y = int(cy + (star.y / prev_z) * cy)
-                        self.display.draw_line(prev_x, prev_y, screen_x, screen_y, color)
-                    else:
-                        color = (brightness, brightness, brightness)
-                        self.display.set_pixel(screen_x, screen_y, color)
-                        if size == 2:
-                            self.display.set_pixel(screen_x + 1, screen_y, color)
-                            self.display.set_pixel(screen_x, screen_y + 1, color)
+        stars = self.stars
+        order = np.argsort(-stars.z, kind='stable')
+        x, y, z = stars.x[order], stars.y[order], stars.z[order]
+
+        # Project 3D position to 2D screen
+        screen_x = np.trunc(cx + (x / z) * cx).astype(int)
+        screen_y = np.trunc(cy + (y / z) * cy).astype(int)
+
+        # Brightness based on depth (closer = brighter)
+        brightness = np.clip(np.trunc(255 * (1.0 - z)), 50, 255).astype(int)
+
+        # Draw stars that are on screen
+        on = ((screen_x >= 0) & (screen_x < GRID_SIZE) &
+              (screen_y >= 0) & (screen_y < GRID_SIZE))
+
+        if self.warp:
+            # Warp mode: a short line from previous to current position
+            prev_z = z + self.speed * 0.1
+            prev_x = np.trunc(cx + (x / prev_z) * cx).astype(int)
+            prev_y = np.trunc(cy + (y / prev_z) * cy).astype(int)
+            for k in np.flatnonzero(on).tolist():
+                b = int(brightness[k])
+                self.display.draw_line(int(prev_x[k]), int(prev_y[k]),
+                                       int(screen_x[k]), int(screen_y[k]),
+                                       (b, b, int(b * 0.8)))
+            return
+
+        # Close stars (z < 0.2) are drawn larger: two extra pixels
+        big = (z < 0.2)[:, None]
+        xs = screen_x[:, None] + [0, 1, 0]
+        ys = screen_y[:, None] + [0, 0, 1]
+        show = on[:, None] & (np.array([True, False, False]) | big)
+        rgb = np.broadcast_to(brightness[:, None, None], xs.shape + (3,))
+        blit_points(self.display, xs[show], ys[show], rgb[show])
@@ -9,7 +9,6 @@ Controls:
   Button     - Exit to menu
 """
 
-import json
 from collections import Counter
 from . import Visual, Display, Colors, GRID_SIZE
 
@@ -33,30 +32,25 @@ class Stats(Visual):
         super().__init__(display)
 
     def _load_data(self):
-        """Load play history and high scores from data dir."""
+        """Load play counts and high scores via the high score manager.
+
+        Play counts come from the history store's index, so opening STATS
+        costs the same however many plays have been logged.
+        """
         from highscores import get_high_score_manager
         mgr = get_high_score_manager()
-        data_dir = mgr.filepath.parent
-
-        # Load play history
-        plays = []
-        history_path = data_dir / "play_history.jsonl"
-        if history_path.exists():
-            try:
-                with open(history_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                plays.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                pass
-            except IOError:
-                pass
+
+        history = mgr.history
+        if history is not None:
+            total_plays = history.total_plays
+            game_counts = history.plays_per_game()
+        else:
+            total_plays = 0
+            game_counts = Counter()
 
         # High scores already loaded via manager
         scores = mgr.scores
-        return plays, scores
+        return total_plays, game_counts, scores
 
     def reset(self):
         self.time = 0.0
@@ -70,7 +64,7 @@ class Stats(Visual):
         self._section_scroll_y = 0.0
         self._scroll_dir = 0
 
-        plays, scores = self._load_data()
+        total_plays, game_counts, scores = self._load_data()
 
         C = Colors.CYAN
         W = Colors.WHITE
@@ -84,8 +78,6 @@ class Stats(Visual):
             ("", G),
         ]
 
-        total_plays = len(plays)
-        game_counts = Counter(p.get("game", "?") for p in plays)
         unique_games = len(game_counts)
 
         self.lines.append(("- OVERVIEW -", M))
@@ -0,0 +1,161 @@
+"""
+Texture Cache - Mipmapped wall textures for the 3D galleries
+=============================================================
+Shared by the gallery3d.py galleries.
+
+Texture holds every frame of a wall texture as one contiguous uint8
+array with its mip chain packed behind level 0 (64x64, 32x32, 16x16,
+8x8, each a 2x2 box average of the level above). sample() gathers any
+mix of levels in one indexing pass, so a renderer picks a level per
+column from the wall distance: far walls read a pre-filtered texel
+instead of skipping across the full-resolution one, which is what made
+distant paintings shimmer.
+
+TextureCache is a process-wide LRU keyed by texture source (file path,
+captured visual, immersive loop). Paintings shared between galleries
+(Art and Salon, Salon and Museum) are decoded once per process; the
+least recently used textures are dropped once the cache holds more than
+its byte budget.
+
+bake_frames() / load_baked() keep rendered immersive-room loops on disk
+as raw .npy arrays, so a loop is rendered once and then read back in a
+single read instead of re-running the source visual.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+MIP_LEVELS = 4
+
+# Cache budget: ~16 KB per still painting with mips, ~390 KB per
+# 24-frame immersive loop
+CACHE_BYTES = 48 * 1024 * 1024
+
+
+class Texture:
+    """Frames of one texture, each a packed mip chain.
+
+    texels  (frames, n, 3) uint8: level 0 row-major, then level 1, ...
+    size    level 0 edge length
+    """
+
+    __slots__ = ('texels', 'size', 'offsets', 'widths')
+
+    def __init__(self, frames):
+        frames = np.asarray(frames, dtype=np.uint8)
+        if frames.ndim == 3:
+            frames = frames[np.newaxis]
+        n, size = frames.shape[0], frames.shape[1]
+        levels = [frames]
+        while len(levels) < MIP_LEVELS and levels[-1].shape[1] > 1:
+            levels.append(_downsample(levels[-1]))
+        self.size = size
+        self.widths = np.array([lv.shape[1] for lv in levels])
+        self.offsets = np.concatenate(([0], np.cumsum(self.widths ** 2)[:-1]))
+        self.texels = np.ascontiguousarray(np.concatenate(
+            [lv.reshape(n, -1, 3) for lv in levels], axis=1))
+
+    def __len__(self):
+        return len(self.texels)
+
+    @property
+    def nbytes(self):
+        return self.texels.nbytes
+
+    def level(self, lod, frame=0):
+        """One mip level of one frame as a (w, w, 3) view."""
+        w = int(self.widths[lod])
+        start = int(self.offsets[lod])
+        return self.texels[frame, start:start + w * w].reshape(w, w, 3)
+
+    def sample(self, frame, tex_y, tex_x, lod=0):
+        """Texels at level-0 coordinates tex_y/tex_x, read from mip level
+        lod (all three broadcast together)."""
+        lod = np.minimum(lod, len(self.widths) - 1)
+        idx = (self.offsets[lod] + (tex_y >> lod) * self.widths[lod]
+               + (tex_x >> lod))
+        return self.texels[frame][idx]
+
+
+def _downsample(frames):
+    """2x2 box filter, rounded: (F, w, w, 3) -> (F, w/2, w/2, 3)."""
+    f = frames.astype(np.uint16)
+    total = f[:, 0::2, 0::2] + f[:, 1::2, 0::2] + f[:, 0::2, 1::2] + f[:, 1::2, 1::2]
+    return ((total + 2) >> 2).astype(np.uint8)
+
+
+def mip_level(footprint):
+    """Mip level for a wall column covering footprint texels per screen
+    pixel: floor(log2), 0 when magnified. A 64-texel unit wall at
+    distance d is 64 / d pixels tall, so its footprint is d."""
+    lod = np.floor(np.log2(np.maximum(footprint, 1.0))).astype(np.int64)
+    return np.minimum(lod, MIP_LEVELS - 1)
+
+
+class TextureCache:
+    """LRU of Textures by key, bounded by total texel bytes."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, loader):
+        """Cached Texture for key, or Texture(loader()) stored under it."""
+        tex = self._items.get(key)
+        if tex is not None:
+            self._items.move_to_end(key)
+            return tex
+        tex = loader()
+        if not isinstance(tex, Texture):
+            tex = Texture(tex)
+        self._items[key] = tex
+        self.nbytes += tex.nbytes
+        # Evict oldest first; the newest entry always stays
+        while self.nbytes > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= old.nbytes
+        return tex
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+
+# Process-wide cache shared by every gallery
+TEXTURES = TextureCache()
+
+
+def load_baked(path, source_path=None):
+    """(F, H, W, 3) frames baked at path, or None if missing or older
+    than source_path."""
+    try:
+        if source_path and os.path.getmtime(path) < os.path.getmtime(source_path):
+            return None
+        frames = np.load(path)
+    except (OSError, ValueError):
+        return None
+    if frames.dtype != np.uint8 or frames.ndim != 4:
+        return None
+    return frames
+
+
+def bake_frames(path, frames):
+    """Write frames to path for load_baked(); failures are ignored (a
+    read-only install just renders the loop every time)."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, np.asarray(frames, dtype=np.uint8))
+        os.replace(tmp, path)
+    except OSError:
+        pass
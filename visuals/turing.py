@@ -15,8 +15,8 @@ Controls:
 """
 
 import random
-import numpy as np
 from . import Visual, Display, Colors, GRID_SIZE
+from .rd_engine import GrayScottModel, palette_lut, draw_field
 import settings
 
 # Diffusion rates
@@ -38,31 +38,19 @@ PALETTES = [
     [(0, 0, 40), (0, 0, 150), (0, 180, 180), (0, 255, 0), (255, 255, 0), (255, 0, 0)],
 ]
 
-# Precompute palette arrays for vectorized color mapping
-_PAL_ARRAYS = [np.array(p, dtype=np.float64) for p in PALETTES]
-
 N = GRID_SIZE
-S = N + 2  # Padded grid side length
 
 
-# ── Shared Gray-Scott solver (numpy) ──────────────────────────────
+# ── Shared Gray-Scott setup and drawing ──────────────────────────
 
-def _wrap_boundaries(x):
-    """Copy interior edges to padding cells for toroidal wrapping."""
-    x[0, 1:N+1] = x[N, 1:N+1]
-    x[N+1, 1:N+1] = x[1, 1:N+1]
-    x[1:N+1, 0] = x[1:N+1, N]
-    x[1:N+1, N+1] = x[1:N+1, 1]
-    x[0, 0] = x[N, N]
-    x[0, N+1] = x[N, 1]
-    x[N+1, 0] = x[1, N]
-    x[N+1, N+1] = x[1, 1]
+# Palettes resampled to 256-entry lookup tables for draw_field()
+_PAL_LUTS = [palette_lut(p) for p in PALETTES]
 
 
 def _init_grid():
-    """Initialize U=1, V=0 with random seed patches of V."""
-    u = np.ones((S, S), dtype=np.float64)
-    v = np.zeros((S, S), dtype=np.float64)
+    """New Gray-Scott model: U=1, V=0 with random seed patches of V."""
+    model = GrayScottModel(DU, DV)
+    u, v = model.u, model.v
 
     n_seeds = random.randint(3, 6)
     for _ in range(n_seeds):
@@ -76,55 +64,13 @@ def _init_grid():
                     yi = (cy + dy) % N + 1
                     v[yi, xi] = 0.5 + random.uniform(-0.05, 0.05)
                     u[yi, xi] = 0.5 + random.uniform(-0.05, 0.05)
-    _wrap_boundaries(u)
-    _wrap_boundaries(v)
-    return u, v
-
-
-def _step_gray_scott(u, v, f, k, steps):
-    """Run *steps* iterations of the Gray-Scott reaction-diffusion (numpy)."""
-    du = DU
-    dv = DV
-    I = slice(1, N + 1)
-    Im = slice(0, N)
-    Ip = slice(2, N + 2)
-
-    for _ in range(steps):
-        _wrap_boundaries(u)
-        _wrap_boundaries(v)
-
-        u_c = u[I, I].copy()
-        v_c = v[I, I].copy()
-
-        lap_u = u[Im, I] + u[Ip, I] + u[I, Im] + u[I, Ip] - 4.0 * u_c
-        lap_v = v[Im, I] + v[Ip, I] + v[I, Im] + v[I, Ip] - 4.0 * v_c
-
-        uvv = u_c * v_c * v_c
-
-        u[I, I] = u_c + du * lap_u - uvv + f * (1.0 - u_c)
-        v[I, I] = v_c + dv * lap_v + uvv - (f + k) * v_c
-
-    return u, v
+    model.wrap()
+    return model
 
 
 def _draw_turing(display, v, palette_idx):
-    """Draw V concentration through a color palette (vectorized)."""
-    pal_arr = _PAL_ARRAYS[palette_idx]
-    n_colors = len(pal_arr)
-
-    t = np.clip(v[1:N+1, 1:N+1], 0.0, 1.0)
-    idx_f = t * (n_colors - 1)
-    lo = idx_f.astype(np.intp)
-    hi = np.minimum(lo + 1, n_colors - 1)
-    frac = (idx_f - lo)[:, :, np.newaxis]
-    colors = pal_arr[lo] + (pal_arr[hi] - pal_arr[lo]) * frac
-    pixels = np.clip(colors, 0, 255).astype(np.uint8)
-
-    for y in range(N):
-        row = pixels[y]
-        for x in range(N):
-            p = row[x]
-            display.set_pixel(x, y, (int(p[0]), int(p[1]), int(p[2])))
+    """Draw V concentration through a color palette."""
+    draw_field(display, v[1:N+1, 1:N+1], _PAL_LUTS[palette_idx])
 
 
 # ── Pearson classification (documented sample points) ────────────
@@ -205,10 +151,10 @@ class _TuringBase(Visual):
     def reset(self):
         self.time = 0.0
         self.palette_idx = 0
-        self.steps_per_frame = 8
+        self.steps_per_frame = 16
         self.f = self._f_center
         self.k = self._k_center
-        self.u, self.v = _init_grid()
+        self.rd = _init_grid()
         self.show_notes = False
         self.notes_scroll_offset = 0.0
         self.param_overlay_timer = 0.0
@@ -251,22 +197,21 @@ class _TuringBase(Visual):
             consumed = True
         elif input_state.action_l or input_state.action_r:
             if not both:
-                self.u, self.v = _init_grid()
+                self.rd = _init_grid()
                 consumed = True
         self._both_pressed_prev = both
         return consumed
 
     def update(self, dt: float):
         self.time += dt
-        self.u, self.v = _step_gray_scott(self.u, self.v, self.f, self.k,
-                                           self.steps_per_frame)
+        self.rd.step(self.f, self.k, self.steps_per_frame)
         if self.show_notes:
             self.notes_scroll_offset += dt * 18
         if self.param_overlay_timer > 0:
             self.param_overlay_timer = max(0.0, self.param_overlay_timer - dt)
 
     def draw(self):
-        _draw_turing(self.display, self.v, self.palette_idx)
+        _draw_turing(self.display, self.rd.v, self.palette_idx)
         if self.show_notes:
             self._draw_notes()
         if self.param_overlay_timer > 0:
@@ -443,7 +388,7 @@ class TuringPatterns(_TuringBase):
                 consumed = True
         elif not both_held:
             if input_state.action_l or input_state.action_r:
-                self.u, self.v = _init_grid()
+                self.rd = _init_grid()
                 self.palette_idx = (self.palette_idx + 1) % len(PALETTES)
                 consumed = True
         self._both_held_prev = both_held
@@ -457,7 +402,7 @@ class TuringPatterns(_TuringBase):
             self.confirm_timer = max(0.0, self.confirm_timer - dt)
 
     def draw(self):
-        _draw_turing(self.display, self.v, self.palette_idx)
+        _draw_turing(self.display, self.rd.v, self.palette_idx)
         if self.param_overlay_timer > 0:
             self._draw_param_overlay()
         if self.confirm_timer > 0 and self.saved_timer <= 0:
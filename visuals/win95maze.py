@@ -8,7 +8,12 @@ periodic maze regeneration with cycling wall themes.
 
 import math
 import random
+
+import numpy as np
+
+from raycast import cast, ray_offsets, shade, wall_rows
 from . import Visual, Display, GRID_SIZE
+from .framebuffer import blit_rgb
 
 # Maze grid dimensions (odd numbers ensure walls on borders and corridors on odd cells)
 MAZE_W = 21
@@ -49,9 +54,7 @@ class Win95Maze(Visual):
 
         # FOV and ray setup
         self.fov = math.pi / 3  # 60 degrees
-        self.ray_offsets = []
-        for col in range(GRID_SIZE):
-            self.ray_offsets.append((col / GRID_SIZE - 0.5) * self.fov)
+        self.ray_offsets = ray_offsets(GRID_SIZE, self.fov)
 
         # Movement
         self.move_speed = 2.5
@@ -64,6 +67,7 @@ class Win95Maze(Visual):
     def _new_maze(self):
         """Generate a new maze and reset player/navigation state."""
         self._generate_maze()
+        self.grid = np.array(self.maze, dtype=np.uint8)
         self._build_texture()
 
         # Find a random open cell to start in
@@ -116,7 +120,7 @@ class Win95Maze(Visual):
     def _build_texture(self):
         """Build a 16x16 procedural brick texture for current theme."""
         brick, mortar, self.ceil_color, self.floor_color = THEMES[self.theme_idx]
-        self.texture = []
+        texture = []
         for ty in range(TEX_SIZE):
             for tx in range(TEX_SIZE):
                 # Determine if this pixel is mortar
@@ -128,14 +132,15 @@ class Win95Maze(Visual):
                 col_band = (tx + offset) % 8
                 is_v_mortar = (col_band == 0)
                 if is_h_mortar or is_v_mortar:
-                    self.texture.append(mortar)
+                    texture.append(mortar)
                 else:
                     # Slight per-brick variation
                     variation = ((tx * 7 + ty * 13) % 5) - 2
                     r = max(0, min(255, brick[0] + variation * 3))
                     g = max(0, min(255, brick[1] + variation * 2))
                     b = max(0, min(255, brick[2] + variation * 2))
-                    self.texture.append((r, g, b))
+                    texture.append((r, g, b))
+        self.texture = np.array(texture, dtype=np.uint8).reshape(TEX_SIZE, TEX_SIZE, 3)
 
     def _solid(self, x, y, margin=0.2):
         """Check collision against maze walls."""
@@ -316,115 +321,31 @@ class Win95Maze(Visual):
 
     def draw(self):
         half = GRID_SIZE // 2
-
-        # Fill ceiling and floor
-        ceil = self.ceil_color
-        flr = self.floor_color
-        for y in range(half):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, ceil)
-        for y in range(half, GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.display.set_pixel(x, y, flr)
-
-        # Cast rays
-        for col in range(GRID_SIZE):
-            ray_angle = self.pa + self.ray_offsets[col]
-            self._cast_ray(col, ray_angle)
-
-    def _cast_ray(self, col, angle):
-        """DDA ray cast for one screen column."""
-        cos_a = math.cos(angle)
-        sin_a = math.sin(angle)
-
-        if abs(cos_a) < 1e-8:
-            cos_a = 1e-8
-        if abs(sin_a) < 1e-8:
-            sin_a = 1e-8
-
-        # DDA setup
-        map_x = int(self.px)
-        map_y = int(self.py)
-
-        delta_x = abs(1.0 / cos_a)
-        delta_y = abs(1.0 / sin_a)
-
-        if cos_a < 0:
-            step_x = -1
-            side_dist_x = (self.px - map_x) * delta_x
-        else:
-            step_x = 1
-            side_dist_x = (map_x + 1.0 - self.px) * delta_x
-
-        if sin_a < 0:
-            step_y = -1
-            side_dist_y = (self.py - map_y) * delta_y
-        else:
-            step_y = 1
-            side_dist_y = (map_y + 1.0 - self.py) * delta_y
-
-        # DDA loop
-        hit = False
-        side = 0
-        for _ in range(40):
-            if side_dist_x < side_dist_y:
-                side_dist_x += delta_x
-                map_x += step_x
-                side = 0
-            else:
-                side_dist_y += delta_y
-                map_y += step_y
-                side = 1
-
-            if map_x < 0 or map_x >= MAZE_W or map_y < 0 or map_y >= MAZE_H:
-                break
-            if self.maze[map_y][map_x]:
-                hit = True
-                break
-
-        if not hit:
-            return
-
-        # Perpendicular distance (fisheye correction)
-        if side == 0:
-            perp_dist = (map_x - self.px + (1 - step_x) / 2) / cos_a
-        else:
-            perp_dist = (map_y - self.py + (1 - step_y) / 2) / sin_a
-
-        if perp_dist < 0.01:
-            perp_dist = 0.01
-
-        # Wall strip
-        line_height = int(GRID_SIZE / perp_dist)
-        draw_start = max(0, GRID_SIZE // 2 - line_height // 2)
-        draw_end = min(GRID_SIZE - 1, GRID_SIZE // 2 + line_height // 2)
-
-        # Texture u coordinate
-        if side == 0:
-            wall_x = self.py + perp_dist * sin_a
-        else:
-            wall_x = self.px + perp_dist * cos_a
-        wall_x -= int(wall_x)
-
-        tex_u = int(wall_x * TEX_SIZE)
-        if tex_u >= TEX_SIZE:
-            tex_u = TEX_SIZE - 1
+        frame = np.empty((GRID_SIZE, GRID_SIZE, 3), dtype=np.uint8)
+        frame[:half] = self.ceil_color
+        frame[half:] = self.floor_color
+
+        # Cast every column at once
+        hits = cast(self.grid, self.px, self.py, self.pa + self.ray_offsets,
+                    max_steps=40)
+        dist = hits.dist
+
+        # Wall strips
+        line_height = np.maximum((GRID_SIZE / dist).astype(np.int64), 1)
+        top = half - line_height // 2
+        draw_start = np.maximum(0, top)
+        draw_end = np.minimum(GRID_SIZE - 1, half + line_height // 2)
+        wall = wall_rows(draw_start, draw_end, GRID_SIZE) & hits.hit
+
+        # Texture coordinates: u per column, v per row of each strip
+        tex_u = np.minimum((hits.wall_x * TEX_SIZE).astype(np.int64), TEX_SIZE - 1)
+        ys = np.arange(GRID_SIZE)[:, np.newaxis]
+        tex_v = np.clip(((ys - top) * TEX_SIZE / line_height).astype(np.int64),
+                        0, TEX_SIZE - 1)
 
         # Fog factor
-        fog = min(1.0, 2.0 / (perp_dist + 0.5))
-        if side == 1:
-            fog *= 0.75
-
-        for y in range(draw_start, draw_end + 1):
-            # Texture v coordinate
-            tex_v = int((y - (GRID_SIZE // 2 - line_height // 2)) * TEX_SIZE / line_height)
-            if tex_v >= TEX_SIZE:
-                tex_v = TEX_SIZE - 1
-            if tex_v < 0:
-                tex_v = 0
-
-            r, g, b = self.texture[tex_v * TEX_SIZE + tex_u]
-            r = int(r * fog)
-            g = int(g * fog)
-            b = int(b * fog)
-            self.display.set_pixel(col, y, (r, g, b))
+        fog = np.minimum(1.0, 2.0 / (dist + 0.5))
+        fog[hits.side == 1] *= 0.75
+
+        frame[wall] = shade(self.texture[tex_v, tex_u], fog)[wall]
+        blit_rgb(self.display, frame)
@@ -18,7 +18,11 @@ Controls:
   Space      - Change rule (new pattern rolls in from bottom)
 """
 
+import numpy as np
+
 from . import Visual, Display, Colors, GRID_SIZE
+from .ca_engine import ElementaryRule
+from .framebuffer import blit_rgb
 
 
 class Wolfram(Visual):
@@ -63,10 +67,10 @@ class Wolfram(Visual):
 
         # History buffer - stores GRID_SIZE rows of history
         # Each row is GRID_SIZE cells (0 or 1)
-        self.history = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.history = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
 
         # Current generation (bottom row of display)
-        self.current_gen = [0 for _ in range(GRID_SIZE)]
+        self.current_gen = np.zeros(GRID_SIZE, dtype=np.uint8)
 
         self.init_pattern()
 
@@ -77,32 +81,18 @@ class Wolfram(Visual):
         for one of the 8 possible 3-cell neighborhood patterns:
         111, 110, 101, 100, 011, 010, 001, 000
         """
-        self.rule_table = {}
-        for i in range(8):
-            # i represents the 3-bit neighborhood pattern
-            # Rule bit i determines output for pattern i
-            pattern = (
-                (i >> 2) & 1,  # left neighbor
-                (i >> 1) & 1,  # center
-                (i >> 0) & 1,  # right neighbor
-            )
-            # Get the corresponding bit from the rule number
-            self.rule_table[pattern] = (self.rule >> i) & 1
+        self.rule_table = ElementaryRule(self.rule)
 
     def init_pattern(self):
         """Initialize the automaton with starting pattern."""
         # Clear history
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.history[y][x] = 0
+        self.history[:] = 0
 
         # Initialize current generation - single cell in center
-        self.current_gen = [0 for _ in range(GRID_SIZE)]
-        self.current_gen[GRID_SIZE // 2] = 1
+        self._reset_current_gen()
 
         # Copy to bottom of history
-        for x in range(GRID_SIZE):
-            self.history[GRID_SIZE - 1][x] = self.current_gen[x]
+        self.history[-1] = self.current_gen
 
     def handle_input(self, input_state) -> bool:
         consumed = False
@@ -141,7 +131,7 @@ class Wolfram(Visual):
 
     def _reset_current_gen(self):
         """Reset just the current generation seed without clearing history."""
-        self.current_gen = [0 for _ in range(GRID_SIZE)]
+        self.current_gen = np.zeros(GRID_SIZE, dtype=np.uint8)
         # Always use single cell in center
         self.current_gen[GRID_SIZE // 2] = 1
 
@@ -155,36 +145,18 @@ class Wolfram(Visual):
 
     def step_generation(self):
         """Compute next generation and scroll display."""
-        # Compute next generation from current
-        next_gen = [0 for _ in range(GRID_SIZE)]
-
-        for x in range(GRID_SIZE):
-            # Get 3-cell neighborhood (wrap at edges)
-            left = self.current_gen[(x - 1) % GRID_SIZE]
-            center = self.current_gen[x]
-            right = self.current_gen[(x + 1) % GRID_SIZE]
-
-            # Look up result from rule table
-            pattern = (left, center, right)
-            next_gen[x] = self.rule_table[pattern]
+        # Compute next generation from current (wraps at edges)
+        next_gen = self.rule_table.step(self.current_gen)
 
         # Scroll history up (older generations move up)
-        for y in range(GRID_SIZE - 1):
-            for x in range(GRID_SIZE):
-                self.history[y][x] = self.history[y + 1][x]
+        self.history[:-1] = self.history[1:]
 
         # New generation goes at bottom
-        for x in range(GRID_SIZE):
-            self.history[GRID_SIZE - 1][x] = next_gen[x]
+        self.history[-1] = next_gen
 
         self.current_gen = next_gen
 
     def draw(self):
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.history[y][x]:
-                    # Cell is alive - use current color
-                    self.display.set_pixel(x, y, self.cell_color)
-                else:
-                    # Cell is dead - black
-                    self.display.set_pixel(x, y, (0, 0, 0))
+        # Alive cells use current color, dead cells are black
+        palette = np.array([(0, 0, 0), self.cell_color], dtype=np.uint8)
+        blit_rgb(self.display, palette[self.history])